@@ -1274,7 +1274,7 @@ function convertCloudToFocusViaSQL(
     const succeeded: string[] = []
 
     for (const provider of providers) {
-        const callSQL = `CALL \`${GCP_PROJECT_ID}.organizations.sp_cloud_1_convert_to_focus\`('${GCP_PROJECT_ID}', '${dataset}', DATE('${startDate}'), DATE('${endDate}'), '${provider}', 'demo_focus_convert_${provider}', 'demo_direct', 'demo_fallback_${Date.now().toString(36)}')`
+        const callSQL = `CALL \`${GCP_PROJECT_ID}.organizations.sp_cloud_1_convert_to_focus\`('${GCP_PROJECT_ID}', '${dataset}', DATE('${startDate}'), DATE('${endDate}'), '${provider}', 'demo_focus_convert_${provider}', 'demo_direct', 'demo_fallback_${Date.now().toString(36)}', [])`
 
         const result = spawnSync('bq', [
             'query', '--use_legacy_sql=false', '--nouse_cache', callSQL
@@ -432,6 +432,30 @@ class Settings(BaseSettings):
         default="http://localhost:8001",
         description="URL of the pipeline service for proxying pipeline triggers. In production, set to internal service URL."
     )
+    run_all_max_concurrency: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Maximum pipeline triggers in flight during an admin run-all batch"
+    )
+    run_all_max_concurrency_per_provider: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Maximum run-all pipeline triggers in flight per provider (spreads load on provider APIs)"
+    )
+    run_all_decrypt_concurrency: int = Field(
+        default=16,
+        ge=1,
+        le=100,
+        description="Parallel KMS decryptions of org API keys during a run-all batch"
+    )
+    run_all_progress_persist_seconds: float = Field(
+        default=15.0,
+        ge=1.0,
+        le=300.0,
+        description="How often a running run-all batch writes its progress to org_meta_pipeline_batch_runs"
+    )
 
     # ============================================
     # Maintenance Mode (#44)
@@ -519,6 +543,19 @@ class Settings(BaseSettings):
     bq_max_results_per_page: int = Field(default=10000, ge=100, le=100000)
     bq_query_timeout_seconds: int = Field(default=300, ge=10)
     bq_max_retry_attempts: int = Field(default=3, ge=1, le=10)
+    bigquery_backend: str = Field(
+        default="bigquery",
+        pattern="^(bigquery|duckdb)$",
+        description="'duckdb' serves BigQueryClient.client from the local DuckDB stand-in (offline benchmarks/tests)"
+    )
+    local_bigquery_data_dir: Optional[str] = Field(
+        default=None,
+        description="Parquet fixtures loaded by the duckdb backend ({dir}/{dataset}/{table}.parquet)"
+    )
+    local_bigquery_database: str = Field(
+        default=":memory:",
+        description="DuckDB database file for the duckdb backend (':memory:' for throwaway runs)"
+    )
 
     # ============================================
     # Polars Configuration
@@ -551,6 +588,34 @@ class Settings(BaseSettings):
         description="Maximum queue size for buffered logs (backpressure when full)"
     )
 
+    # ============================================
+    # BigQuery Write Buffer (micro-batched inserts)
+    # ============================================
+    bq_write_buffer_max_batch_rows: int = Field(
+        default=500,
+        ge=1,
+        le=10000,
+        description="Rows per table written in one BigQuery request; a full batch flushes immediately"
+    )
+    bq_write_buffer_flush_interval_seconds: float = Field(
+        default=2.0,
+        ge=0.01,
+        le=60.0,
+        description="Maximum time a fire-and-forget row waits in the buffer before its table is flushed"
+    )
+    bq_write_buffer_linger_ms: int = Field(
+        default=50,
+        ge=0,
+        le=5000,
+        description="Maximum time a caller awaiting its write waits for other rows to coalesce with"
+    )
+    bq_write_buffer_max_pending_rows: int = Field(
+        default=10000,
+        ge=100,
+        le=1000000,
+        description="Buffered rows per table before writers are blocked (backpressure)"
+    )
+
     # ============================================
     # Pipeline Parallel Processing
     # ============================================
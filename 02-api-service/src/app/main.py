@@ -223,6 +223,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping auth aggregator: {e}")
 
+    # Trigger debounced subscription cost recomputes still waiting in this process
+    try:
+        from src.core.utils.pipeline_trigger import get_subscription_recompute_coalescer
+        await asyncio.wait_for(get_subscription_recompute_coalescer().drain(flush_now=True), timeout=10.0)
+        logger.info("Subscription recompute coalescer drained")
+    except asyncio.TimeoutError:
+        logger.warning("Subscription recompute drain timed out during shutdown (10s); pending recomputes dropped")
+    except Exception as e:
+        logger.warning(f"Error draining subscription recompute coalescer: {e}")
+
+    # Flush micro-batched BigQuery writes (audit logs, alert history, hierarchy)
+    try:
+        from src.core.utils.bq_write_buffer import get_bq_write_buffer
+        write_buffer = get_bq_write_buffer()
+        await asyncio.wait_for(write_buffer.close(), timeout=10.0)
+        logger.info("BigQuery write buffer flushed", extra={"tables": write_buffer.metrics()})
+    except asyncio.TimeoutError:
+        logger.warning("BigQuery write buffer flush timed out during shutdown (10s)")
+    except Exception as e:
+        logger.warning(f"Error flushing BigQuery write buffer: {e}")
+
     # FIX #13: Close pipeline proxy httpx client
     try:
         from src.app.routers.pipelines_proxy import close_http_client
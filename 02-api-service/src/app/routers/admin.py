@@ -15,6 +15,7 @@ import time
 import uuid
 import httpx
 import os
+import asyncio
 
 from google.cloud import bigquery
 from src.core.engine.bq_client import get_bigquery_client, BigQueryClient
@@ -26,6 +27,19 @@ from src.app.dependencies.rate_limit_decorator import rate_limit_global
 from src.app.models.org_models import SUBSCRIPTION_LIMITS, SubscriptionPlan
 from src.core.utils.audit_logger import log_create, log_delete, AuditLogger
 from src.core.utils.error_handling import safe_error_response
+from src.core.utils.pipeline_fanout import (
+    STATUS_FAILED,
+    BatchRunProgress,
+    OrgPlan,
+    PipelineFanout,
+    decrypt_api_keys,
+    get_batch_run_registry,
+    load_batch_run,
+    new_batch_run_id,
+    persist_batch_run,
+    persist_progress_periodically,
+    resolve_org_plans,
+)
 # Note: validate_org_slug available if needed from src.core.utils.validators
 
 logger = logging.getLogger(__name__)
@@ -1044,7 +1058,6 @@ async def create_api_key(
         )
 
     # Generate unique API key ID
-    import uuid
     org_api_key_id = str(uuid.uuid4())
 
     # Insert into BigQuery with all required columns
@@ -1247,7 +1260,6 @@ async def regenerate_api_key(
             detail="Failed to encrypt API key. Please check KMS configuration."
         )
 
-    import uuid
     org_api_key_id = str(uuid.uuid4())
 
     # Step 4: Insert new API key with all required columns
@@ -2383,14 +2395,16 @@ class RunAllPipelinesRequest(BaseModel):
 
 
 class RunAllPipelinesResponse(BaseModel):
-    """Response from running pipelines for all organizations."""
+    """Progress of a run-all batch (returned on start and when polled)."""
     success: bool
     batch_run_id: str = ""
+    status: str = ""
     orgs_processed: int
     orgs_skipped: int
     pipelines_triggered: int
     pipelines_failed: int
     pipelines_skipped_quota: int
+    pipelines_pending: int = 0
     total_integrations: int
     results: List[Dict[str, Any]] = Field(default_factory=list)
     errors: List[Dict[str, Any]] = Field(default_factory=list)
@@ -2398,11 +2412,76 @@ class RunAllPipelinesResponse(BaseModel):
     elapsed_seconds: float
 
 
+def _batch_run_response(progress: BatchRunProgress) -> RunAllPipelinesResponse:
+    return RunAllPipelinesResponse(
+        success=progress.status != STATUS_FAILED,
+        batch_run_id=progress.batch_run_id,
+        status=progress.status,
+        orgs_processed=progress.orgs_processed,
+        orgs_skipped=progress.orgs_skipped,
+        pipelines_triggered=progress.pipelines_triggered,
+        pipelines_failed=progress.pipelines_failed,
+        pipelines_skipped_quota=progress.pipelines_skipped_quota,
+        pipelines_pending=progress.pipelines_pending,
+        total_integrations=progress.total_integrations,
+        results=list(progress.results),
+        errors=list(progress.errors),
+        message=progress.message(),
+        elapsed_seconds=progress.elapsed_seconds,
+    )
+
+
+async def _persist_batch_run(progress: BatchRunProgress, bq_client: BigQueryClient) -> None:
+    """Upsert the batch record to BigQuery, logging (not raising) on failure."""
+    try:
+        await asyncio.to_thread(persist_batch_run, bq_client.client, settings.gcp_project_id, progress)
+    except Exception as persist_err:
+        logger.warning(f"Failed to persist batch run {progress.batch_run_id}: {persist_err}")
+
+
+async def _execute_batch_run(
+    progress: BatchRunProgress,
+    plans: List[OrgPlan],
+    bq_client: BigQueryClient,
+) -> None:
+    """Decrypt org API keys, fan out pipeline triggers and persist the batch record."""
+    # Keep the persisted row current so pollers on other instances see progress
+    persister = asyncio.create_task(persist_progress_periodically(
+        lambda: _persist_batch_run(progress, bq_client),
+        progress,
+        settings.run_all_progress_persist_seconds,
+    ))
+    try:
+        api_keys = await decrypt_api_keys(plans, decrypt_value, settings.run_all_decrypt_concurrency)
+        async with httpx.AsyncClient(timeout=120.0) as pipeline_client:
+            fanout = PipelineFanout(
+                pipeline_client,
+                settings.pipeline_service_url,
+                max_concurrency=settings.run_all_max_concurrency,
+                max_per_provider=settings.run_all_max_concurrency_per_provider,
+            )
+            await fanout.run(plans, api_keys, progress)
+        progress.finish()
+    except Exception as e:
+        logger.error(f"Pipeline run-all batch {progress.batch_run_id} failed: {e}", exc_info=True)
+        progress.add_error(progress.org_slug, str(e)[:200])
+        progress.finish(failed=True)
+    finally:
+        # Stop periodic writes before the final one so they cannot overwrite it
+        persister.cancel()
+        await asyncio.gather(persister, return_exceptions=True)
+
+    logger.info(progress.message())
+    await _persist_batch_run(progress, bq_client)
+
+
 @router.post(
     "/admin/pipelines/run-all",
     response_model=RunAllPipelinesResponse,
     summary="Run cost pipelines for all organizations",
-    description="Triggers cost pipelines for all active orgs with valid integrations. "
+    description="Starts a background batch that triggers cost pipelines for all active orgs with "
+                "valid integrations and returns its batch_run_id immediately. Poll "
+                "GET /admin/pipelines/run-all/{batch_run_id} for progress. "
                 "Supports filtering by org, category, and provider."
 )
 async def run_all_pipelines(
@@ -2413,23 +2492,11 @@ async def run_all_pipelines(
     """
     Run cost pipelines for all active organizations.
 
-    For each org:
-    1. Find active, validated integration credentials
+    1. Resolve orgs, validated integrations and API keys in one query
     2. Map provider → pipeline path
-    3. Decrypt org API key
-    4. POST to Pipeline Service to trigger each pipeline
+    3. In the background: decrypt org API keys in parallel and trigger
+       pipelines with bounded concurrency (globally and per provider)
     """
-    start_time = time.time()
-    triggered_at_ts = datetime.now(timezone.utc).isoformat()
-    orgs_processed = 0
-    orgs_skipped = 0
-    pipelines_triggered = 0
-    pipelines_failed = 0
-    pipelines_skipped_quota = 0
-    total_integrations = 0
-    results: List[Dict[str, Any]] = []
-    errors: List[Dict[str, Any]] = []
-
     # Determine run date (default: yesterday)
     if request.date:
         run_date = request.date
@@ -2438,265 +2505,107 @@ async def run_all_pipelines(
         run_date = (date.today() - timedelta(days=1)).isoformat()
 
     try:
-        # 1. Get active organizations
-        if request.org_slug:
-            org_query = f"""
-            SELECT org_slug
-            FROM `{settings.gcp_project_id}.organizations.org_profiles`
-            WHERE status = 'ACTIVE' AND org_slug = @filter_org_slug
-            """
-            org_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("filter_org_slug", "STRING", request.org_slug),
-                ]
-            )
-            org_result = bq_client.client.query(org_query, job_config=org_config).result()
-        else:
-            org_query = f"""
-            SELECT org_slug
-            FROM `{settings.gcp_project_id}.organizations.org_profiles`
-            WHERE status = 'ACTIVE'
-            ORDER BY org_slug
-            """
-            org_result = bq_client.client.query(org_query).result()
-
-        org_slugs = [row.org_slug for row in org_result]
-
-        if request.org_slug and not org_slugs:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Organization '{request.org_slug}' not found or not active"
-            )
-
-        mode = f"single-org ({request.org_slug})" if request.org_slug else "all-orgs"
-        logger.info(f"Pipeline run-all: {len(org_slugs)} orgs ({mode}), date={run_date}, dry_run={request.dry_run}")
-
-        # 2. Process each org
-        pipeline_client = httpx.AsyncClient(timeout=120.0)
-        for org_slug in org_slugs:
-            try:
-                # 2a. Get active, validated integration credentials
-                creds_query = f"""
-                SELECT credential_id, provider
-                FROM `{settings.gcp_project_id}.organizations.org_integration_credentials`
-                WHERE org_slug = @org_slug
-                  AND is_active = TRUE
-                  AND validation_status = 'VALID'
-                """
-                creds_config = bigquery.QueryJobConfig(
-                    query_parameters=[
-                        bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
-                    ]
-                )
-                creds_result = bq_client.client.query(creds_query, job_config=creds_config).result()
-                creds = list(creds_result)
-
-                if not creds:
-                    orgs_skipped += 1
-                    continue
-
-                # 2b. Filter by categories/providers
-                matched_creds = []
-                for cred in creds:
-                    provider_key = cred.provider
-                    mapping = PROVIDER_PIPELINE_MAP.get(provider_key)
-                    if not mapping:
-                        continue
-                    if request.categories and mapping["category"] not in request.categories:
-                        continue
-                    if request.providers and provider_key not in request.providers:
-                        continue
-                    matched_creds.append((cred, mapping))
-
-                if not matched_creds:
-                    orgs_skipped += 1
-                    continue
+        org_slugs, plans = await asyncio.to_thread(
+            resolve_org_plans,
+            bq_client.client,
+            settings.gcp_project_id,
+            PROVIDER_PIPELINE_MAP,
+            request.org_slug,
+            request.categories,
+            request.providers,
+        )
+    except Exception as e:
+        logger.error(f"Pipeline run-all failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Pipeline run-all failed"
+        )
 
-                total_integrations += len(matched_creds)
+    if request.org_slug and not org_slugs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Organization '{request.org_slug}' not found or not active"
+        )
 
-                # 2c. Get org API key and decrypt
-                key_query = f"""
-                SELECT encrypted_org_api_key
-                FROM `{settings.gcp_project_id}.organizations.org_api_keys`
-                WHERE org_slug = @org_slug AND is_active = TRUE
-                LIMIT 1
-                """
-                key_config = bigquery.QueryJobConfig(
-                    query_parameters=[
-                        bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
-                    ]
-                )
-                key_result = bq_client.client.query(key_query, job_config=key_config).result()
-                key_row = next(key_result, None)
-
-                if not key_row or not key_row.encrypted_org_api_key:
-                    orgs_skipped += 1
-                    errors.append({
-                        "org_slug": org_slug,
-                        "error": "No active API key found"
-                    })
-                    continue
+    progress = BatchRunProgress(
+        batch_run_id=new_batch_run_id(),
+        org_slug=request.org_slug or "ALL",
+        run_date=run_date,
+        dry_run=request.dry_run,
+        categories=request.categories,
+        providers=request.providers,
+        orgs_skipped=len(org_slugs) - len(plans),
+        total_integrations=sum(len(plan.targets) for plan in plans),
+    )
 
-                try:
-                    org_api_key = decrypt_value(
-                        key_row.encrypted_org_api_key
-                    )
-                except Exception as decrypt_err:
-                    orgs_skipped += 1
-                    errors.append({
-                        "org_slug": org_slug,
-                        "error": f"API key decryption failed: {str(decrypt_err)[:100]}"
-                    })
-                    continue
+    mode = f"single-org ({request.org_slug})" if request.org_slug else "all-orgs"
+    logger.info(
+        f"Pipeline run-all {progress.batch_run_id}: {len(org_slugs)} orgs ({mode}), "
+        f"{progress.total_integrations} integrations, date={run_date}, dry_run={request.dry_run}"
+    )
 
-                # 2d. Trigger each pipeline
-                for cred, mapping in matched_creds:
-                    pipeline_path = mapping["path"]
-
-                    if request.dry_run:
-                        pipelines_triggered += 1
-                        if len(results) < 100:
-                            results.append({
-                                "org_slug": org_slug,
-                                "provider": cred.provider,
-                                "pipeline_path": pipeline_path,
-                                "date": run_date,
-                                "status": "dry_run",
-                            })
-                        continue
+    # Record the RUNNING batch before returning so any instance can answer polls
+    try:
+        await asyncio.to_thread(persist_batch_run, bq_client.client, settings.gcp_project_id, progress)
+    except Exception as e:
+        logger.error(f"Failed to record pipeline run-all batch {progress.batch_run_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Pipeline run-all failed"
+        )
 
-                    # POST to Pipeline Service
-                    pipeline_url = (
-                        f"{settings.pipeline_service_url}/api/v1/pipelines"
-                        f"/run/{org_slug}/{pipeline_path}"
-                    )
-                    try:
-                        resp = await pipeline_client.post(
-                            pipeline_url,
-                            headers={"X-API-Key": org_api_key},
-                            params={"date": run_date},
-                        )
-
-                        if resp.status_code == 200:
-                            pipelines_triggered += 1
-                            if len(results) < 100:
-                                results.append({
-                                    "org_slug": org_slug,
-                                    "provider": cred.provider,
-                                    "pipeline_path": pipeline_path,
-                                    "date": run_date,
-                                    "status": "triggered",
-                                })
-                        elif resp.status_code == 429:
-                            pipelines_skipped_quota += 1
-                            if len(results) < 100:
-                                results.append({
-                                    "org_slug": org_slug,
-                                    "provider": cred.provider,
-                                    "pipeline_path": pipeline_path,
-                                    "date": run_date,
-                                    "status": "quota_exceeded",
-                                })
-                        else:
-                            pipelines_failed += 1
-                            if len(results) < 100:
-                                results.append({
-                                    "org_slug": org_slug,
-                                    "provider": cred.provider,
-                                    "pipeline_path": pipeline_path,
-                                    "date": run_date,
-                                    "status": "failed",
-                                    "http_status": resp.status_code,
-                                    "detail": resp.text[:200],
-                                })
-                    except httpx.RequestError as req_err:
-                        pipelines_failed += 1
-                        if len(results) < 100:
-                            results.append({
-                                "org_slug": org_slug,
-                                "provider": cred.provider,
-                                "pipeline_path": pipeline_path,
-                                "date": run_date,
-                                "status": "error",
-                                "detail": str(req_err)[:200],
-                            })
+    task = asyncio.create_task(_execute_batch_run(progress, plans, bq_client))
+    get_batch_run_registry().register(progress, task)
+    return _batch_run_response(progress)
 
-                orgs_processed += 1
 
-            except Exception as org_error:
-                orgs_skipped += 1
-                if len(errors) < 20:
-                    errors.append({
-                        "org_slug": org_slug,
-                        "error": str(org_error)[:200]
-                    })
-                logger.warning(f"Pipeline run-all error for {org_slug}: {org_error}")
-
-        await pipeline_client.aclose()
-        elapsed = time.time() - start_time
-        dry_label = " (DRY RUN)" if request.dry_run else ""
-        message = (
-            f"Pipeline run-all{dry_label}: {orgs_processed} orgs processed, "
-            f"{orgs_skipped} skipped, {pipelines_triggered} triggered, "
-            f"{pipelines_failed} failed, {pipelines_skipped_quota} quota-skipped "
-            f"in {elapsed:.2f}s"
-        )
-        logger.info(message)
+@router.get(
+    "/admin/pipelines/run-all/{batch_run_id}",
+    response_model=RunAllPipelinesResponse,
+    summary="Get run-all batch progress",
+    description="Live progress of a run-all batch started on this instance, or its persisted "
+                "record (updated while the batch runs) from any instance."
+)
+async def get_run_all_status(
+    batch_run_id: str,
+    _: str = Depends(verify_admin_key),
+    bq_client: BigQueryClient = Depends(get_bigquery_client),
+):
+    """Poll a run-all batch by batch_run_id."""
+    progress = get_batch_run_registry().get(batch_run_id)
+    if progress is not None:
+        return _batch_run_response(progress)
 
-        # Persist batch run record to BigQuery
-        batch_run_id = str(uuid.uuid4())
-        now_ts = datetime.now(timezone.utc).isoformat()
-        batch_status = "COMPLETED" if pipelines_failed == 0 else "PARTIAL"
-        try:
-            batch_row = {
-                "batch_run_id": batch_run_id,
-                "org_slug": request.org_slug or "ALL",
-                "trigger_type": "MANUAL" if request.org_slug else "SCHEDULED",
-                "status": batch_status,
-                "run_date": run_date,
-                "dry_run": request.dry_run,
-                "categories_filter": json.dumps(request.categories) if request.categories else None,
-                "providers_filter": json.dumps(request.providers) if request.providers else None,
-                "orgs_processed": orgs_processed,
-                "orgs_skipped": orgs_skipped,
-                "pipelines_triggered": pipelines_triggered,
-                "pipelines_failed": pipelines_failed,
-                "pipelines_skipped_quota": pipelines_skipped_quota,
-                "total_integrations": total_integrations,
-                "results": json.dumps(results[:100]),
-                "errors": json.dumps(errors[:20]),
-                "elapsed_seconds": round(elapsed, 2),
-                "triggered_at": triggered_at_ts,
-                "completed_at": now_ts,
-                "created_at": now_ts,
-            }
-            table_ref = f"{settings.gcp_project_id}.organizations.org_meta_pipeline_batch_runs"
-            bq_errors = bq_client.client.insert_rows_json(table_ref, [batch_row])
-            if bq_errors:
-                logger.warning(f"Failed to persist batch run {batch_run_id}: {bq_errors}")
-        except Exception as persist_err:
-            logger.warning(f"Failed to persist batch run record: {persist_err}")
-
-        return RunAllPipelinesResponse(
-            success=True,
-            batch_run_id=batch_run_id,
-            orgs_processed=orgs_processed,
-            orgs_skipped=orgs_skipped,
-            pipelines_triggered=pipelines_triggered,
-            pipelines_failed=pipelines_failed,
-            pipelines_skipped_quota=pipelines_skipped_quota,
-            total_integrations=total_integrations,
-            results=results,
-            errors=errors,
-            message=message,
-            elapsed_seconds=round(elapsed, 2),
+    # Started on another instance (or before a restart): use the persisted record,
+    # which is RUNNING until the batch finishes
+    try:
+        row = await asyncio.to_thread(
+            load_batch_run, bq_client.client, settings.gcp_project_id, batch_run_id
         )
-
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Pipeline run-all failed: {e}", exc_info=True)
+        logger.error(f"Failed to fetch batch run {batch_run_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Pipeline run-all failed"
+            detail="Failed to fetch batch run"
         )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch run '{batch_run_id}' not found"
+        )
+
+    return RunAllPipelinesResponse(
+        success=row["status"] != STATUS_FAILED,
+        batch_run_id=row["batch_run_id"],
+        status=row["status"],
+        orgs_processed=row["orgs_processed"] or 0,
+        orgs_skipped=row["orgs_skipped"] or 0,
+        pipelines_triggered=row["pipelines_triggered"] or 0,
+        pipelines_failed=row["pipelines_failed"] or 0,
+        pipelines_skipped_quota=row["pipelines_skipped_quota"] or 0,
+        total_integrations=row["total_integrations"] or 0,
+        results=row["results"] or [],
+        errors=row["errors"] or [],
+        message=f"Pipeline run-all {row['status'].lower()}",
+        elapsed_seconds=row["elapsed_seconds"] or 0,
+    )
@@ -1476,7 +1476,7 @@ async def onboard_org(
                             "schema_file": "cost_data_standard_1_3.json",
                             "description": "Standardized billing data adhering to FinOps FOCUS 1.3 specification. Supports cloud (GCP/AWS/Azure), SaaS subscriptions, and LLM API costs with full cost allocation, commitment tracking, and multi-currency support.",
                             "partition_field": "ChargePeriodStart",
-                            "clustering_fields": ["SubAccountId", "ServiceProviderName", "ServiceCategory", "ChargeCategory"]
+                            "clustering_fields": ["x_cost_category", "SubAccountId", "ServiceProviderName", "ServiceCategory"]
                         },
                         # FOCUS 1.3 Contract Commitment Data (tracks reserved instances, savings plans, CUDs)
                         {
@@ -3180,7 +3180,7 @@ async def repair_org_tables(
             "table_name": "cost_data_standard_1_3",
             "schema_file": "cost_data_standard_1_3.json",
             "partition_field": "ChargePeriodStart",
-            "clustering_fields": ["SubAccountId", "ServiceProviderName", "ServiceCategory"]
+            "clustering_fields": ["x_cost_category", "SubAccountId", "ServiceProviderName", "ServiceCategory"]
         },
         {
             "table_name": "contract_commitment_1_3",
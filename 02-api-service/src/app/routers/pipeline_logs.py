@@ -8,6 +8,7 @@ URL Structure: /api/v1/pipelines/{org_slug}/runs
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
@@ -18,6 +19,19 @@ from google.cloud import bigquery
 from src.app.config import settings
 from src.app.dependencies.auth import get_current_org
 from src.core.engine.bq_client import BigQueryClient, get_bigquery_client
+from src.core.services._shared.pagination import (
+    InvalidCursorError,
+    KeysetSpec,
+    SortKey,
+    resolve_total,
+    split_page,
+)
+from src.core.services.pipeline_read.models import PIPELINE_RUNS_KEYSET
+from src.core.services.pipeline_read.log_export import (
+    EXPORT_FORMATS,
+    PipelineLogExporter,
+    encode_stream,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -81,6 +95,9 @@ class PipelineRunsResponse(BaseModel):
     total: int = Field(..., description="Total number of runs")
     limit: int = Field(..., description="Page size")
     offset: int = Field(..., description="Page offset")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+    has_more: bool = Field(default=False, description="Whether more runs follow this page")
+    total_is_estimate: bool = Field(default=False, description="Whether total was served from the cached counter")
 
 
 # Update forward reference
@@ -143,6 +160,83 @@ def _set_cached_status(org_slug: str, response: PipelineStatusResponse) -> None:
     _pipeline_status_cache[org_slug] = (time.time(), response)
 
 
+# ============================================
+# Keyset Pagination
+# ============================================
+# Each list endpoint seeks on its sort key plus a unique tiebreaker instead of
+# OFFSET. The leading key is the table's partition column where possible, so
+# deep pages prune partitions. offset is still accepted for older clients.
+
+RUNS_KEYSET = PIPELINE_RUNS_KEYSET
+STEP_LOGS_KEYSET = KeysetSpec(
+    kind="step_logs",
+    keys=(SortKey("step_index", "INT64"), SortKey("step_logging_id", "STRING")),
+    descending=False,
+)
+TRANSITIONS_KEYSET = KeysetSpec(
+    kind="state_transitions",
+    keys=(SortKey("transition_time", "TIMESTAMP"), SortKey("transition_id", "STRING")),
+    descending=False,
+)
+BATCH_RUNS_KEYSET = KeysetSpec(
+    kind="batch_runs",
+    keys=(SortKey("triggered_at", "TIMESTAMP"), SortKey("batch_run_id", "STRING")),
+)
+
+CURSOR_DESCRIPTION = "Opaque cursor from next_cursor of the previous page (use instead of offset)"
+TOTAL_MODE_DESCRIPTION = (
+    "exact: COUNT(*) on every request; estimate: cached count, refreshed every few minutes "
+    "(default when cursor is set)"
+)
+
+
+def _resolve_page_request(
+    spec: KeysetSpec,
+    filters: Dict[str, Any],
+    cursor: Optional[str],
+    offset: int,
+    total_mode: Optional[str],
+) -> tuple:
+    """
+    Resolve cursor/offset pagination for a list endpoint.
+
+    Returns:
+        (seek_sql, seek_parameters, signature, estimate_total). seek_sql is ""
+        for the first page or offset requests, else an "AND ..." fragment.
+    """
+    signature = spec.filter_signature(filters)
+    estimate = (total_mode or ("estimate" if cursor else "exact")) == "estimate"
+
+    if not cursor:
+        return "", [], signature, estimate
+
+    if offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both"
+        )
+    try:
+        values = spec.decode_cursor(cursor, signature)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    seek_sql, seek_parameters = spec.seek(values)
+    return f" AND {seek_sql}", seek_parameters, signature, estimate
+
+
+def _next_cursor(spec: KeysetSpec, rows: List[Any], has_more: bool, signature: str) -> Optional[str]:
+    """Cursor after the last row of the page, or None on the last page."""
+    if not has_more or not rows:
+        return None
+    return spec.encode_cursor(rows[-1], signature)
+
+
+def _count_rows(bq_client: BigQueryClient, count_query: str, parameters: List[Any]) -> int:
+    """Run a SELECT COUNT(*) AS total query."""
+    count_results = list(bq_client.query(count_query, parameters=parameters))
+    return count_results[0]["total"] if count_results else 0
+
+
 # ============================================
 # Pipeline Status Endpoint (for auto-trigger)
 # ============================================
@@ -302,12 +396,17 @@ async def list_pipeline_runs(
     end_date: Optional[date] = Query(None, description="Filter runs until this date"),
     limit: int = Query(20, ge=1, le=100, description="Number of results per page"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate)$", description=TOTAL_MODE_DESCRIPTION),
     org_context: dict = Depends(get_current_org),
     bq_client: BigQueryClient = Depends(get_bigquery_client)
 ):
     """
     List pipeline runs for an organization.
     Requires X-API-Key header for authentication.
+
+    Pages are ordered by (start_time, pipeline_logging_id) descending. Pass
+    next_cursor back as cursor to seek to the next page; offset still works.
     """
     # Verify org_slug matches authenticated org
     if org_context["org_slug"] != org_slug:
@@ -348,6 +447,11 @@ async def list_pipeline_runs(
 
     where_clause = " AND ".join(where_clauses)
 
+    filters = {param.name: param.value for param in parameters}
+    seek_sql, seek_parameters, signature, estimate_total = _resolve_page_request(
+        RUNS_KEYSET, filters, cursor, offset, total_mode
+    )
+
     # Count total
     count_query = f"""
     SELECT COUNT(*) as total
@@ -371,23 +475,25 @@ async def list_pipeline_runs(
         error_context,
         parameters
     FROM `{settings.gcp_project_id}.organizations.org_meta_pipeline_runs`
-    WHERE {where_clause}
-    ORDER BY start_time DESC
+    WHERE {where_clause}{seek_sql}
+    ORDER BY {RUNS_KEYSET.order_by}
     LIMIT @limit OFFSET @offset
     """
 
-    parameters.extend([
-        bigquery.ScalarQueryParameter("limit", "INT64", limit),
+    # One extra row tells us whether another page exists
+    page_parameters = parameters + seek_parameters + [
+        bigquery.ScalarQueryParameter("limit", "INT64", limit + 1),
         bigquery.ScalarQueryParameter("offset", "INT64", offset)
-    ])
+    ]
 
     try:
-        # Execute count query
-        count_results = list(bq_client.query(count_query, parameters=parameters[:-2]))
-        total = count_results[0]["total"] if count_results else 0
+        # Count total (cached counter on cursor pages)
+        total, total_is_estimate = resolve_total(
+            signature, lambda: _count_rows(bq_client, count_query, parameters), estimate_total
+        )
 
         # Execute runs query
-        runs_results = list(bq_client.query(runs_query, parameters=parameters))
+        runs_results, has_more = split_page(list(bq_client.query(runs_query, parameters=page_parameters)), limit)
 
         runs = []
         for row in runs_results:
@@ -437,7 +543,10 @@ async def list_pipeline_runs(
             runs=runs,
             total=total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=_next_cursor(RUNS_KEYSET, runs_results, has_more, signature),
+            has_more=has_more,
+            total_is_estimate=total_is_estimate
         )
 
     except Exception as e:
@@ -641,6 +750,9 @@ class StepLogsResponse(BaseModel):
     total: int = Field(..., description="Total number of steps")
     limit: int = Field(..., description="Page size")
     offset: int = Field(..., description="Page offset")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+    has_more: bool = Field(default=False, description="Whether more steps follow this page")
+    total_is_estimate: bool = Field(default=False, description="Whether total was served from the cached counter")
 
 
 @router.get(
@@ -655,6 +767,8 @@ async def get_step_logs(
     status_filter: Optional[str] = Query(None, description="Filter by step status"),
     limit: int = Query(100, ge=1, le=1000, description="Number of results per page"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate)$", description=TOTAL_MODE_DESCRIPTION),
     org_context: dict = Depends(get_current_org),
     bq_client: BigQueryClient = Depends(get_bigquery_client)
 ):
@@ -682,6 +796,11 @@ async def get_step_logs(
         # By default, exclude RUNNING duplicates - only show final status
         where_clause += " AND status IN ('COMPLETED', 'FAILED', 'SKIPPED', 'CANCELLED', 'TIMEOUT')"
 
+    filters = {param.name: param.value for param in parameters}
+    seek_sql, seek_parameters, signature, estimate_total = _resolve_page_request(
+        STEP_LOGS_KEYSET, filters, cursor, offset, total_mode
+    )
+
     # Count total query
     count_query = f"""
     SELECT COUNT(*) as total
@@ -705,26 +824,27 @@ async def get_step_logs(
         CAST(NULL AS JSON) as error_context,
         metadata
     FROM `{settings.gcp_project_id}.organizations.org_meta_step_logs`
-    WHERE {where_clause}
-    ORDER BY step_index ASC
+    WHERE {where_clause}{seek_sql}
+    ORDER BY {STEP_LOGS_KEYSET.order_by}
     LIMIT @limit OFFSET @offset
     """
 
-    # Add pagination parameters
-    parameters.extend([
-        bigquery.ScalarQueryParameter("limit", "INT64", limit),
+    # Add pagination parameters (one extra row detects the next page)
+    page_parameters = parameters + seek_parameters + [
+        bigquery.ScalarQueryParameter("limit", "INT64", limit + 1),
         bigquery.ScalarQueryParameter("offset", "INT64", offset)
-    ])
+    ]
 
     try:
         import json
 
-        # Get total count
-        count_results = list(bq_client.query(count_query, parameters=parameters[:-2]))
-        total = count_results[0]["total"] if count_results else 0
+        # Get total count (cached counter on cursor pages)
+        total, total_is_estimate = resolve_total(
+            signature, lambda: _count_rows(bq_client, count_query, parameters), estimate_total
+        )
 
         # Get paginated results
-        results = list(bq_client.query(query, parameters=parameters))
+        results, has_more = split_page(list(bq_client.query(query, parameters=page_parameters)), limit)
 
         steps = []
         for row in results:
@@ -773,7 +893,10 @@ async def get_step_logs(
             steps=steps,
             total=total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=_next_cursor(STEP_LOGS_KEYSET, results, has_more, signature),
+            has_more=has_more,
+            total_is_estimate=total_is_estimate
         )
 
     except Exception as e:
@@ -895,20 +1018,23 @@ class DownloadLogsFormat(str):
 @router.get(
     "/pipelines/{org_slug}/runs/{pipeline_logging_id}/download",
     summary="Download pipeline run logs",
-    description="Download pipeline run and step logs as JSON or CSV."
+    description="Stream pipeline run, step and state transition logs as JSON, CSV or NDJSON."
 )
 async def download_pipeline_logs(
     org_slug: str,
     pipeline_logging_id: str,
-    format: str = Query("json", description="Download format: json or csv"),
+    format: str = Query("json", description="Download format: json, csv or ndjson"),
+    compress: bool = Query(False, description="Gzip the download (.gz)"),
     org_context: dict = Depends(get_current_org),
     bq_client: BigQueryClient = Depends(get_bigquery_client)
 ):
     """
-    Download complete pipeline run logs including all steps.
-    """
-    from fastapi.responses import Response
+    Download complete pipeline run logs including all steps and state transitions.
 
+    Streams the response: step logs and transitions are paged from BigQuery
+    and written as they arrive, so long backfill runs don't build the whole
+    document in memory.
+    """
     # Verify org_slug matches authenticated org
     if org_context["org_slug"] != org_slug:
         raise HTTPException(
@@ -916,73 +1042,17 @@ async def download_pipeline_logs(
             detail="Access denied: org_slug mismatch"
         )
 
-    if format not in ["json", "csv"]:
+    if format not in ["json", "csv", "ndjson"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid format. Supported formats: json, csv"
+            detail="Invalid format. Supported formats: json, csv, ndjson"
         )
 
-    try:
-        # Get run details
-        run_detail = await get_pipeline_run_detail(org_slug, pipeline_logging_id, org_context, bq_client)
-
-        import json as json_module
-        import csv
-        import io
-
-        if format == "json":
-            content = json_module.dumps(run_detail.model_dump(mode='json'), indent=2, default=str)
-            media_type = "application/json"
-            filename = f"pipeline_run_{pipeline_logging_id}.json"
-        else:
-            # CSV format - flatten run + steps
-            output = io.StringIO()
-            writer = csv.writer(output)
-
-            # Write run summary
-            writer.writerow(["Run Summary"])
-            writer.writerow(["Field", "Value"])
-            writer.writerow(["pipeline_logging_id", run_detail.pipeline_logging_id])
-            writer.writerow(["pipeline_id", run_detail.pipeline_id])
-            writer.writerow(["status", run_detail.status])
-            writer.writerow(["trigger_type", run_detail.trigger_type])
-            writer.writerow(["trigger_by", run_detail.trigger_by])
-            writer.writerow(["start_time", str(run_detail.start_time)])
-            writer.writerow(["end_time", str(run_detail.end_time)])
-            writer.writerow(["duration_ms", run_detail.duration_ms])
-            writer.writerow(["error_message", run_detail.error_message])
-            writer.writerow([])
-
-            # Write steps
-            writer.writerow(["Steps"])
-            writer.writerow(["step_index", "step_name", "step_type", "status", "start_time", "end_time", "duration_ms", "rows_processed", "error_message"])
-            for step in run_detail.steps:
-                writer.writerow([
-                    step.step_index,
-                    step.step_name,
-                    step.step_type,
-                    step.status,
-                    str(step.start_time),
-                    str(step.end_time),
-                    step.duration_ms,
-                    step.rows_processed,
-                    step.error_message
-                ])
-
-            content = output.getvalue()
-            media_type = "text/csv"
-            filename = f"pipeline_run_{pipeline_logging_id}.csv"
-
-        return Response(
-            content=content,
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
-        )
+    exporter = PipelineLogExporter(bq_client, settings.gcp_project_id)
 
-    except HTTPException:
-        raise
+    try:
+        # Resolve the run before streaming so a missing run is still a 404
+        run = exporter.fetch_run(org_slug, pipeline_logging_id)
     except Exception as e:
         logger.error(f"Error downloading pipeline logs: {e}")
         raise HTTPException(
@@ -990,6 +1060,110 @@ async def download_pipeline_logs(
             detail="Failed to download pipeline logs. Please check server logs for details."
         )
 
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pipeline run {pipeline_logging_id} not found"
+        )
+
+    if format == "json":
+        chunks = exporter.stream_run_json(org_slug, run)
+    elif format == "csv":
+        chunks = exporter.stream_run_csv(org_slug, run)
+    else:
+        chunks = exporter.stream_records(org_slug, [[run]], "ndjson")
+
+    return _export_response(
+        _log_stream_errors(chunks, f"pipeline run {pipeline_logging_id}"),
+        format,
+        compress,
+        f"pipeline_run_{pipeline_logging_id}",
+    )
+
+
+@router.get(
+    "/pipelines/{org_slug}/logs/export",
+    summary="Export pipeline logs",
+    description="Stream runs, step logs and state transitions for several runs or a date range as one CSV/NDJSON file."
+)
+async def export_pipeline_logs(
+    org_slug: str,
+    pipeline_logging_ids: Optional[List[str]] = Query(None, description="Runs to export (repeat the parameter)"),
+    start_date: Optional[date] = Query(None, description="Export runs started on or after this date"),
+    end_date: Optional[date] = Query(None, description="Export runs started on or before this date"),
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    compress: bool = Query(True, description="Gzip the export (.gz)"),
+    org_context: dict = Depends(get_current_org),
+    bq_client: BigQueryClient = Depends(get_bigquery_client)
+):
+    """
+    Export logs for many runs in one download.
+
+    Every line is one record with record_type run, step or transition. At most
+    MAX_EXPORT_RUNS runs (newest first) are exported per request.
+    """
+    if org_context["org_slug"] != org_slug:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: org_slug mismatch"
+        )
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format. Supported formats: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    if not pipeline_logging_ids and not (start_date and end_date):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide pipeline_logging_ids or both start_date and end_date"
+        )
+
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+    exporter = PipelineLogExporter(bq_client, settings.gcp_project_id)
+    run_batches = exporter.iter_run_batches(
+        org_slug,
+        pipeline_logging_ids=pipeline_logging_ids,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    filename = f"pipeline_logs_{org_slug}_{start_date or ''}_{end_date or ''}".rstrip("_")
+
+    return _export_response(exporter.stream_records(org_slug, run_batches, format), format, compress, filename)
+
+
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _log_stream_errors(chunks, context: str):
+    """Log failures raised after the response has started (status is already sent)."""
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(f"Streaming export of {context} failed: {e}")
+
+
+def _export_response(chunks, format: str, compress: bool, basename: str) -> StreamingResponse:
+    """Wrap text chunks in a StreamingResponse download, optionally gzipped."""
+    filename = f"{basename}.{format}.gz" if compress else f"{basename}.{format}"
+    return StreamingResponse(
+        encode_stream(chunks, compress=compress),
+        media_type="application/gzip" if compress else EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
 
 # ============================================
 # State Transitions Endpoint
@@ -1017,6 +1191,9 @@ class StateTransitionsResponse(BaseModel):
     total: int = Field(..., description="Total number of transitions")
     limit: int = Field(..., description="Page size")
     offset: int = Field(..., description="Page offset")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+    has_more: bool = Field(default=False, description="Whether more transitions follow this page")
+    total_is_estimate: bool = Field(default=False, description="Whether total was served from the cached counter")
 
 
 @router.get(
@@ -1031,6 +1208,8 @@ async def get_state_transitions(
     entity_type: Optional[str] = Query(None, description="Filter by entity type: PIPELINE or STEP"),
     limit: int = Query(100, ge=1, le=1000, description="Number of results per page"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate)$", description=TOTAL_MODE_DESCRIPTION),
     org_context: dict = Depends(get_current_org),
     bq_client: BigQueryClient = Depends(get_bigquery_client)
 ):
@@ -1055,6 +1234,11 @@ async def get_state_transitions(
         where_clause += " AND entity_type = @entity_type"
         parameters.append(bigquery.ScalarQueryParameter("entity_type", "STRING", entity_type.upper()))
 
+    filters = {param.name: param.value for param in parameters}
+    seek_sql, seek_parameters, signature, estimate_total = _resolve_page_request(
+        TRANSITIONS_KEYSET, filters, cursor, offset, total_mode
+    )
+
     # Count total
     count_query = f"""
     SELECT COUNT(*) as total
@@ -1078,25 +1262,26 @@ async def get_state_transitions(
         CAST(duration_in_state_ms AS INT64) as duration_in_state_ms,
         metadata
     FROM `{settings.gcp_project_id}.organizations.org_meta_state_transitions`
-    WHERE {where_clause}
-    ORDER BY transition_time ASC
+    WHERE {where_clause}{seek_sql}
+    ORDER BY {TRANSITIONS_KEYSET.order_by}
     LIMIT @limit OFFSET @offset
     """
 
-    parameters.extend([
-        bigquery.ScalarQueryParameter("limit", "INT64", limit),
+    page_parameters = parameters + seek_parameters + [
+        bigquery.ScalarQueryParameter("limit", "INT64", limit + 1),
         bigquery.ScalarQueryParameter("offset", "INT64", offset)
-    ])
+    ]
 
     try:
         import json
 
-        # Get total count
-        count_results = list(bq_client.query(count_query, parameters=parameters[:-2]))
-        total = count_results[0]["total"] if count_results else 0
+        # Get total count (cached counter on cursor pages)
+        total, total_is_estimate = resolve_total(
+            signature, lambda: _count_rows(bq_client, count_query, parameters), estimate_total
+        )
 
         # Get paginated results
-        results = list(bq_client.query(query, parameters=parameters))
+        results, has_more = split_page(list(bq_client.query(query, parameters=page_parameters)), limit)
 
         transitions = []
         for row in results:
@@ -1128,7 +1313,10 @@ async def get_state_transitions(
             transitions=transitions,
             total=total,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=_next_cursor(TRANSITIONS_KEYSET, results, has_more, signature),
+            has_more=has_more,
+            total_is_estimate=total_is_estimate
         )
 
     except Exception as e:
@@ -1168,6 +1356,9 @@ class BatchRunsResponse(BaseModel):
     """Response for list of batch runs."""
     runs: List[BatchRunSummary] = Field(..., description="List of batch runs")
     total: int = Field(..., description="Total number of batch runs")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+    has_more: bool = Field(default=False, description="Whether more batch runs follow this page")
+    total_is_estimate: bool = Field(default=False, description="Whether total was served from the cached counter")
 
 
 @router.get(
@@ -1180,6 +1371,8 @@ async def list_batch_runs(
     org_slug: str,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    total_mode: Optional[str] = Query(None, pattern="^(exact|estimate)$", description=TOTAL_MODE_DESCRIPTION),
     org_context: dict = Depends(get_current_org),
     bq_client: BigQueryClient = Depends(get_bigquery_client),
 ):
@@ -1192,8 +1385,12 @@ async def list_batch_runs(
             detail="Access denied: org_slug mismatch"
         )
 
+    seek_sql, seek_parameters, signature, estimate_total = _resolve_page_request(
+        BATCH_RUNS_KEYSET, {"org_slug": org_slug}, cursor, offset, total_mode
+    )
+
     try:
-        # Count total
+        # Count total (cached counter on cursor pages)
         count_query = f"""
         SELECT COUNT(*) as total
         FROM `{settings.gcp_project_id}.organizations.org_meta_pipeline_batch_runs`
@@ -1204,25 +1401,29 @@ async def list_batch_runs(
                 bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
             ]
         )
-        count_result = bq_client.client.query(count_query, job_config=count_config).result()
-        total = next(count_result).total
 
-        # Fetch batch runs
+        def count_batch_runs() -> int:
+            count_result = bq_client.client.query(count_query, job_config=count_config).result()
+            return next(count_result).total
+
+        total, total_is_estimate = resolve_total(signature, count_batch_runs, estimate_total)
+
+        # Fetch batch runs (one extra row detects the next page)
         query = f"""
         SELECT *
         FROM `{settings.gcp_project_id}.organizations.org_meta_pipeline_batch_runs`
-        WHERE org_slug = @org_slug OR org_slug = 'ALL'
-        ORDER BY triggered_at DESC
+        WHERE (org_slug = @org_slug OR org_slug = 'ALL'){seek_sql}
+        ORDER BY {BATCH_RUNS_KEYSET.order_by}
         LIMIT @limit OFFSET @offset
         """
         job_config = bigquery.QueryJobConfig(
             query_parameters=[
                 bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
-                bigquery.ScalarQueryParameter("limit", "INT64", limit),
+                bigquery.ScalarQueryParameter("limit", "INT64", limit + 1),
                 bigquery.ScalarQueryParameter("offset", "INT64", offset),
-            ]
+            ] + seek_parameters
         )
-        result = bq_client.client.query(query, job_config=job_config).result()
+        result, has_more = split_page(list(bq_client.client.query(query, job_config=job_config).result()), limit)
 
         runs = []
         for row in result:
@@ -1256,7 +1457,13 @@ async def list_batch_runs(
                 completed_at=row.completed_at,
             ))
 
-        return BatchRunsResponse(runs=runs, total=total)
+        return BatchRunsResponse(
+            runs=runs,
+            total=total,
+            next_cursor=_next_cursor(BATCH_RUNS_KEYSET, result, has_more, signature),
+            has_more=has_more,
+            total_is_estimate=total_is_estimate,
+        )
 
     except Exception as e:
         logger.error(f"Error fetching batch runs: {e}")
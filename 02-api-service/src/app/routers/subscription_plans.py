@@ -138,7 +138,7 @@ from src.core.utils.cache import get_cache, invalidate_org_cache, invalidate_pro
 from src.core.utils.query_performance import QueryPerformanceMonitor, log_query_performance
 from src.core.utils.audit_logger import log_create, log_update, log_delete, AuditLogger
 from src.app.models.i18n_models import DEFAULT_CURRENCY, validate_currency
-from src.core.utils.pipeline_trigger import trigger_subscription_cost_pipeline, should_trigger_cost_backfill
+from src.core.utils.pipeline_trigger import get_subscription_recompute_coalescer, should_trigger_cost_backfill
 
 # SEC-005: Rate limiting is handled at the middleware level (see src/app/middleware/).
 # This router relies on global rate limiting configured in the FastAPI application
@@ -2188,11 +2188,12 @@ async def create_plan(
                     break
 
                 if org_api_key:
-                    # Trigger pipeline asynchronously (non-blocking)
-                    import asyncio
-                    pipeline_result = await trigger_subscription_cost_pipeline(
+                    # Queue a targeted recompute of this subscription only (non-blocking,
+                    # coalesced with other plan edits for the org)
+                    pipeline_result = get_subscription_recompute_coalescer().schedule(
                         org_slug=org_slug,
                         api_key=org_api_key,
+                        subscription_ids=[subscription_id],
                         start_date=effective_start_date,
                         pipeline_service_url=settings.pipeline_service_url
                     )
@@ -2945,11 +2946,13 @@ async def edit_plan_with_version(
                 break
 
             if org_api_key:
-                # Trigger pipeline asynchronously (non-blocking)
-                # Start from effective_date to recalculate costs with new pricing
-                pipeline_result = await trigger_subscription_cost_pipeline(
+                # Queue a targeted recompute (non-blocking, coalesced per org)
+                # from effective_date: the old version's rows past its new end_date
+                # are removed and the new version's rows are calculated
+                pipeline_result = get_subscription_recompute_coalescer().schedule(
                     org_slug=org_slug,
                     api_key=org_api_key,
+                    subscription_ids=[subscription_id, new_subscription_id],
                     start_date=request.effective_date,
                     pipeline_service_url=settings.pipeline_service_url
                 )
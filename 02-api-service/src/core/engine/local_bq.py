@@ -0,0 +1,1619 @@
+"""
+Local BigQuery Stand-in (DuckDB)
+
+Runs the BigQuery Standard SQL our services emit on DuckDB over local Parquet
+fixtures, so processors and read services can be benchmarked and
+regression-tested without a GCP project.
+
+LocalBigQueryClient implements the subset of google.cloud.bigquery.Client the
+services use (query, get_table, create_table, insert_rows_json,
+load_table_from_json/file, ...). BigQueryClient.client returns the shared
+instance when settings.bigquery_backend == "duckdb".
+
+Fixture layout (settings.local_bigquery_data_dir):
+    {data_dir}/{dataset}/{table}.parquet       single file
+    {data_dir}/{dataset}/{table}/*.parquet     multi-file table
+
+Mapping:
+- Datasets are DuckDB schemas; the project in `project.dataset.table` is dropped
+- @params bind as typed DuckDB named parameters
+- Scripts and stored procedures (DECLARE, SET, IF, BEGIN...EXCEPTION...END,
+  EXECUTE IMMEDIATE ... INTO ... USING, CALL, ASSERT, RAISE, transactions)
+  run through a small interpreter
+- Functions DuckDB spells differently are rewritten (DATE_ADD, FORMAT_DATE,
+  GENERATE_DATE_ARRAY, x IN UNNEST(@arr), MERGE without INTO, ...)
+
+This is a translation layer, not an emulator: bytes are not metered, REQUIRED
+modes are not enforced and unsupported syntax fails with BadRequest.
+
+Each service image is built from its own directory, so the module is vendored:
+03-data-pipeline-service/src/core/engine/local_bq.py is the source of truth
+(tests/engine/test_local_bq.py) and 02-api-service carries an identical copy,
+enforced by 02-api-service/tests/test_vendored_modules.py.
+"""
+
+import io
+import json
+import re
+import threading
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from google.api_core import exceptions as google_api_exceptions
+from google.cloud import bigquery
+from google.cloud.bigquery import SchemaField
+
+from src.app.config import settings
+from src.core.utils.logging import get_logger
+
+# Optional dependency: only needed for bigquery_backend="duckdb"
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+logger = get_logger(__name__)
+
+
+# ============================================
+# Type Mapping
+# ============================================
+
+BQ_TO_DUCKDB_TYPES = {
+    "STRING": "VARCHAR",
+    "BYTES": "BLOB",
+    "INTEGER": "BIGINT",
+    "INT64": "BIGINT",
+    "FLOAT": "DOUBLE",
+    "FLOAT64": "DOUBLE",
+    "NUMERIC": "DECIMAL(38, 9)",
+    "BIGNUMERIC": "DECIMAL(38, 9)",
+    "BOOLEAN": "BOOLEAN",
+    "BOOL": "BOOLEAN",
+    "TIMESTAMP": "TIMESTAMPTZ",
+    "DATETIME": "TIMESTAMP",
+    "DATE": "DATE",
+    "TIME": "TIME",
+    "JSON": "JSON",
+    "GEOGRAPHY": "VARCHAR",
+    "INTERVAL": "INTERVAL",
+}
+
+# Type keywords rewritten inside SQL text (identity mappings are left alone)
+_TYPE_KEYWORD_RE = re.compile(
+    r'(?<![\w."$])(INT64|FLOAT64|BIGNUMERIC|NUMERIC|STRING|BYTES|BOOL|TIMESTAMP|DATETIME|GEOGRAPHY|INTEGER|FLOAT)(?![\w"(])'
+)
+_ARRAY_TYPE_RE = re.compile(r"\bARRAY\s*<\s*([A-Za-z0-9_]+)\s*>")
+
+SCALAR_PARAM_TYPES = {
+    "STRING": "VARCHAR",
+    "INT64": "BIGINT",
+    "INTEGER": "BIGINT",
+    "FLOAT64": "DOUBLE",
+    "FLOAT": "DOUBLE",
+    "NUMERIC": "DECIMAL(38, 9)",
+    "BIGNUMERIC": "DECIMAL(38, 9)",
+    "BOOL": "BOOLEAN",
+    "BOOLEAN": "BOOLEAN",
+    "DATE": "DATE",
+    "TIMESTAMP": "TIMESTAMPTZ",
+    "DATETIME": "TIMESTAMP",
+    "TIME": "TIME",
+    "JSON": "JSON",
+    "BYTES": "BLOB",
+}
+
+
+def duckdb_type(bq_type: str) -> str:
+    """Translate a BigQuery type name (including ARRAY<T>) to DuckDB."""
+    text = bq_type.strip()
+    array = re.fullmatch(r"ARRAY\s*<\s*(.+)\s*>", text, re.IGNORECASE)
+    if array:
+        return f"{duckdb_type(array.group(1))}[]"
+    numeric = re.fullmatch(r"(BIG)?NUMERIC\s*\((.+)\)", text, re.IGNORECASE)
+    if numeric:
+        return f"DECIMAL({numeric.group(2)})"
+    return BQ_TO_DUCKDB_TYPES.get(text.upper(), text)
+
+
+def _field_ddl(field: SchemaField) -> str:
+    """DuckDB column type for a BigQuery SchemaField."""
+    if field.field_type in ("RECORD", "STRUCT"):
+        members = ", ".join(f'"{sub.name}" {_field_ddl(sub)}' for sub in field.fields)
+        column_type = f"STRUCT({members})"
+    else:
+        column_type = duckdb_type(field.field_type)
+    return f"{column_type}[]" if field.mode == "REPEATED" else column_type
+
+
+def _bq_field(name: str, data_type: pa.DataType) -> SchemaField:
+    """BigQuery SchemaField for an Arrow column type."""
+    if pa.types.is_list(data_type) or pa.types.is_large_list(data_type):
+        inner = _bq_field(name, data_type.value_type)
+        return SchemaField(name, inner.field_type, mode="REPEATED", fields=inner.fields)
+    if pa.types.is_struct(data_type):
+        fields = [_bq_field(data_type.field(i).name, data_type.field(i).type) for i in range(data_type.num_fields)]
+        return SchemaField(name, "RECORD", fields=fields)
+    if pa.types.is_boolean(data_type):
+        field_type = "BOOLEAN"
+    elif pa.types.is_integer(data_type):
+        field_type = "INTEGER"
+    elif pa.types.is_floating(data_type):
+        field_type = "FLOAT"
+    elif pa.types.is_decimal(data_type):
+        field_type = "NUMERIC"
+    elif pa.types.is_date(data_type):
+        field_type = "DATE"
+    elif pa.types.is_timestamp(data_type):
+        field_type = "TIMESTAMP" if data_type.tz else "DATETIME"
+    elif pa.types.is_time(data_type):
+        field_type = "TIME"
+    elif pa.types.is_binary(data_type) or pa.types.is_large_binary(data_type):
+        field_type = "BYTES"
+    else:
+        field_type = "STRING"
+    return SchemaField(name, field_type)
+
+
+def _value_type(value: Any) -> Optional[str]:
+    """DuckDB type for a Python value bound without a declared type."""
+    if isinstance(value, bool):
+        return "BOOLEAN"
+    if isinstance(value, int):
+        return "BIGINT"
+    if isinstance(value, float):
+        return "DOUBLE"
+    if isinstance(value, Decimal):
+        return "DECIMAL(38, 9)"
+    if isinstance(value, datetime):
+        return "TIMESTAMPTZ" if value.tzinfo else "TIMESTAMP"
+    if isinstance(value, date):
+        return "DATE"
+    if isinstance(value, str):
+        return "VARCHAR"
+    if isinstance(value, (list, tuple)):
+        element = next((v for v in value if v is not None), None)
+        return f"{_value_type(element) or 'VARCHAR'}[]"
+    return None
+
+
+def _query_parameters(job_config: Optional[bigquery.QueryJobConfig]) -> Dict[str, Tuple[Optional[str], Any]]:
+    """Named query parameters from a job config as {name: (duckdb_type, value)}."""
+    params: Dict[str, Tuple[Optional[str], Any]] = {}
+    for param in getattr(job_config, "query_parameters", None) or []:
+        if isinstance(param, bigquery.ArrayQueryParameter):
+            element = SCALAR_PARAM_TYPES.get(str(param.array_type).upper(), "VARCHAR")
+            params[param.name] = (f"{element}[]", list(param.values or []))
+        elif isinstance(param, bigquery.ScalarQueryParameter):
+            params[param.name] = (SCALAR_PARAM_TYPES.get(str(param.type_).upper()), param.value)
+        else:
+            raise google_api_exceptions.BadRequest(
+                f"Local BigQuery does not support {type(param).__name__} parameters"
+            )
+    return params
+
+
+# ============================================
+# SQL Translation
+# ============================================
+
+_LITERAL_RE = re.compile(r"\x00(\d+)\x00")
+_NAME_CHAIN_RE = re.compile(r"\x01([^\x01]*)\x01((?:\.[A-Za-z_][A-Za-z0-9_]*)*)")
+_CALL_RE = re.compile(r"(?<![\w.$\"])([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"', "`": "`"}
+
+# Words that end a FROM item, i.e. cannot be an UNNEST alias
+_CLAUSE_WORDS = {
+    "WHERE", "ON", "USING", "JOIN", "LEFT", "RIGHT", "INNER", "FULL", "CROSS", "GROUP", "ORDER",
+    "LIMIT", "WITH", "UNION", "EXCEPT", "INTERSECT", "HAVING", "QUALIFY", "WINDOW", "AS",
+}
+
+
+def _mask(sql: str) -> Tuple[str, List[str]]:
+    """
+    Replace string literals with \\x00N\\x00 placeholders, drop comments and
+    mark `quoted` names as \\x01name\\x01, so rewrites never touch literals.
+    """
+    out: List[str] = []
+    literals: List[str] = []
+    i, n = 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if sql.startswith("--", i) or c == "#":
+            end = sql.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            out.append(" ")
+            continue
+        if c == "`":
+            end = sql.find("`", i + 1)
+            if end == -1:
+                raise google_api_exceptions.BadRequest("Unterminated quoted identifier")
+            out.append(f"\x01{sql[i + 1:end]}\x01")
+            i = end + 1
+            continue
+
+        start, raw = i, False
+        if c in "rRbB" and (i == 0 or not (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+            k = i
+            while k < n and k - i < 2 and sql[k] in "rRbB":
+                k += 1
+            if k < n and sql[k] in "'\"":
+                raw = "r" in sql[i:k].lower()
+                start = k
+        if start != i or c in "'\"":
+            quote = sql[start:start + 3] if sql[start:start + 3] in ('"""', "'''") else sql[start]
+            j = start + len(quote)
+            chars: List[str] = []
+            while True:
+                if j >= n:
+                    raise google_api_exceptions.BadRequest("Unterminated string literal")
+                if sql.startswith(quote, j):
+                    break
+                if sql[j] == "\\" and j + 1 < n:
+                    escaped = sql[j + 1]
+                    chars.append(sql[j:j + 2] if raw or escaped not in _ESCAPES else _ESCAPES[escaped])
+                    j += 2
+                    continue
+                chars.append(sql[j])
+                j += 1
+            literals.append("".join(chars))
+            out.append(f"\x00{len(literals) - 1}\x00")
+            i = j + len(quote)
+            continue
+
+        out.append(c)
+        i += 1
+    return "".join(out), literals
+
+
+def _unmask(text: str, literals: Sequence[str]) -> str:
+    """Restore literals as DuckDB single-quoted strings."""
+    return _LITERAL_RE.sub(lambda m: "'" + literals[int(m.group(1))].replace("'", "''") + "'", text)
+
+
+def _resolve_names(text: str, project: str) -> str:
+    """`project.dataset.table` -> "dataset"."table" (project dropped)."""
+    def replace(match: re.Match) -> str:
+        inner = [p for p in match.group(1).split(".") if p]
+        tail = [p for p in match.group(2).split(".") if p]
+        if len(inner) >= 3 or (len(inner) == 2 and tail and (inner[0] == project or "-" in inner[0])):
+            inner = inner[1:]
+        return ".".join(f'"{part}"' for part in inner + tail)
+    return _NAME_CHAIN_RE.sub(replace, text)
+
+
+def _match_paren(text: str, open_index: int) -> int:
+    """Index of the bracket closing the one at open_index (literals are masked)."""
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] in "([":
+            depth += 1
+        elif text[i] in ")]":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise google_api_exceptions.BadRequest("Unbalanced parentheses in query")
+
+
+def _split_top_level(text: str, separator: str = ",") -> List[str]:
+    """Split on separator outside brackets."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    tail = text[start:].strip()
+    if tail or parts:
+        parts.append(tail)
+    return parts
+
+
+def _find_keyword(text: str, keyword: str, start: int = 0) -> int:
+    """Position of a top-level (bracket depth 0) keyword, or -1."""
+    pattern = re.compile(rf"\b{keyword}\b", re.IGNORECASE)
+    depth = 0
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif depth == 0 and pattern.match(text, i) and (i == 0 or not (text[i - 1].isalnum() or text[i - 1] == "_")):
+            return i
+        i += 1
+    return -1
+
+
+def _interval(arg: str) -> Tuple[str, str]:
+    match = re.fullmatch(r"\s*INTERVAL\s+(.+?)\s+([A-Za-z]+)\s*", arg, re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise google_api_exceptions.BadRequest(f"Expected INTERVAL <n> <part>, got: {arg}")
+    return match.group(1), match.group(2)
+
+
+def _date_part(arg: str) -> str:
+    part = arg.strip().upper()
+    if part.startswith("WEEK") or part == "ISOWEEK":
+        return "week"
+    if part == "ISOYEAR":
+        return "isoyear"
+    return part.lower()
+
+
+def _regexp_group(pattern_arg: str, literals: Sequence[str]) -> int:
+    """BigQuery returns capture group 1 when the pattern has one."""
+    match = _LITERAL_RE.fullmatch(pattern_arg.strip())
+    pattern = literals[int(match.group(1))] if match else ""
+    return 1 if re.search(r"(?<!\\)\((?!\?)", pattern) else 0
+
+
+def _extract(args: List[str], literals: Sequence[str]) -> str:
+    match = re.fullmatch(r"\s*(\w+)(?:\s*\(\s*\w+\s*\))?\s+FROM\s+(.+)", args[0], re.IGNORECASE | re.DOTALL)
+    if not match:
+        return f"EXTRACT({args[0]})"
+    part, expr = match.group(1).upper(), match.group(2)
+    if part == "DAYOFWEEK":
+        return f"(dayofweek({expr}) + 1)"
+    if part == "DATE":
+        return f"CAST({expr} AS date)"
+    return f"EXTRACT({_date_part(part)} FROM {expr})"
+
+
+def _array_agg(args: List[str], literals: Sequence[str]) -> str:
+    body = ", ".join(args)
+    limit = re.search(r"\s+LIMIT\s+(\d+)\s*$", body, re.IGNORECASE)
+    if limit:
+        body = body[:limit.start()]
+    ignore_nulls = re.search(r"\s+IGNORE\s+NULLS\b", body, re.IGNORECASE)
+    if ignore_nulls:
+        body = body[:ignore_nulls.start()] + body[ignore_nulls.end():]
+    value = _split_top_level(re.split(r"\s+ORDER\s+BY\s+", body, flags=re.IGNORECASE)[0])[0]
+    call = f"array_agg({body})"
+    if ignore_nulls:
+        call += f" FILTER (WHERE {value.replace('DISTINCT ', '')} IS NOT NULL)"
+    return f"{call}[1:{limit.group(1)}]" if limit else call
+
+
+def _struct(args: List[str], literals: Sequence[str]) -> str:
+    members = []
+    for i, arg in enumerate(args):
+        alias = re.search(r"\s+AS\s+([A-Za-z_]\w*)\s*$", arg, re.IGNORECASE)
+        name = alias.group(1) if alias else f"_field_{i + 1}"
+        members.append(f'"{name}" := {arg[:alias.start()] if alias else arg}')
+    return f"struct_pack({', '.join(members)})"
+
+
+def _to_hex(args: List[str], literals: Sequence[str]) -> str:
+    inner = args[0].strip()
+    if re.match(r"(md5|sha256)\s*\(", inner, re.IGNORECASE):
+        return inner
+    return f"lower(hex({inner}))"
+
+
+def _last_day(args: List[str], literals: Sequence[str]) -> str:
+    part = _date_part(args[1]) if len(args) > 1 else "month"
+    if part == "month":
+        return f"last_day({args[0]})"
+    return f"CAST(date_trunc('{part}', {args[0]}) + INTERVAL 1 {part} - INTERVAL 1 day AS date)"
+
+
+_Rewrite = Callable[[List[str], Sequence[str]], str]
+
+# BigQuery functions DuckDB spells or types differently
+FUNCTION_REWRITES: Dict[str, _Rewrite] = {
+    "DATE": lambda a, _: (
+        f"CAST({a[0]} AS date)" if len(a) == 1
+        else f"make_date({a[0]}, {a[1]}, {a[2]})" if len(a) == 3
+        else f"CAST(timezone({a[1]}, {a[0]}) AS date)"
+    ),
+    "TIMESTAMP": lambda a, _: (
+        f"CAST({a[0]} AS timestamptz)" if len(a) == 1
+        else f"timezone({a[1]}, CAST({a[0]} AS timestamp))"
+    ),
+    "DATETIME": lambda a, _: f"CAST({a[0]} AS timestamp)",
+    "STRING": lambda a, _: f"CAST({a[0]} AS varchar)",
+    "DATE_ADD": lambda a, _: "CAST(({}) + INTERVAL ({}) {} AS date)".format(a[0], *_interval(a[1])),
+    "DATE_SUB": lambda a, _: "CAST(({}) - INTERVAL ({}) {} AS date)".format(a[0], *_interval(a[1])),
+    "TIMESTAMP_ADD": lambda a, _: "(({}) + INTERVAL ({}) {})".format(a[0], *_interval(a[1])),
+    "TIMESTAMP_SUB": lambda a, _: "(({}) - INTERVAL ({}) {})".format(a[0], *_interval(a[1])),
+    "DATETIME_ADD": lambda a, _: "(({}) + INTERVAL ({}) {})".format(a[0], *_interval(a[1])),
+    "DATETIME_SUB": lambda a, _: "(({}) - INTERVAL ({}) {})".format(a[0], *_interval(a[1])),
+    "DATE_DIFF": lambda a, _: f"date_diff('{_date_part(a[2])}', {a[1]}, {a[0]})",
+    "TIMESTAMP_DIFF": lambda a, _: f"date_diff('{_date_part(a[2])}', {a[1]}, {a[0]})",
+    "DATETIME_DIFF": lambda a, _: f"date_diff('{_date_part(a[2])}', {a[1]}, {a[0]})",
+    "DATE_TRUNC": lambda a, _: f"CAST(date_trunc('{_date_part(a[1])}', {a[0]}) AS date)",
+    "TIMESTAMP_TRUNC": lambda a, _: f"date_trunc('{_date_part(a[1])}', {a[0]})",
+    "DATETIME_TRUNC": lambda a, _: f"date_trunc('{_date_part(a[1])}', {a[0]})",
+    "LAST_DAY": _last_day,
+    "EXTRACT": _extract,
+    "FORMAT_DATE": lambda a, _: f"strftime({a[1]}, {a[0]})",
+    "FORMAT_TIMESTAMP": lambda a, _: f"strftime({a[1]}, {a[0]})",
+    "FORMAT_DATETIME": lambda a, _: f"strftime({a[1]}, {a[0]})",
+    "PARSE_DATE": lambda a, _: f"CAST(strptime({a[1]}, {a[0]}) AS date)",
+    "PARSE_TIMESTAMP": lambda a, _: f"CAST(strptime({a[1]}, {a[0]}) AS timestamptz)",
+    "PARSE_DATETIME": lambda a, _: f"strptime({a[1]}, {a[0]})",
+    "GENERATE_DATE_ARRAY": lambda a, _: (
+        f"list_transform(generate_series(CAST({a[0]} AS timestamp), CAST({a[1]} AS timestamp), "
+        f"{a[2] if len(a) > 2 else 'INTERVAL 1 day'}), d -> CAST(d AS date))"
+    ),
+    "GENERATE_TIMESTAMP_ARRAY": lambda a, _: (
+        f"generate_series(CAST({a[0]} AS timestamptz), CAST({a[1]} AS timestamptz), {a[2]})"
+    ),
+    "CURRENT_DATE": lambda a, _: "current_date",
+    "CURRENT_TIMESTAMP": lambda a, _: "current_timestamp",
+    "CURRENT_DATETIME": lambda a, _: "CAST(current_timestamp AS timestamp)",
+    "TIMESTAMP_MILLIS": lambda a, _: f"CAST(epoch_ms({a[0]}) AS timestamptz)",
+    "TIMESTAMP_SECONDS": lambda a, _: f"to_timestamp({a[0]})",
+    "UNIX_SECONDS": lambda a, _: f"CAST(epoch({a[0]}) AS bigint)",
+    "UNIX_MILLIS": lambda a, _: f"epoch_ms({a[0]})",
+    "UNIX_DATE": lambda a, _: f"date_diff('day', DATE '1970-01-01', {a[0]})",
+    "SAFE_DIVIDE": lambda a, _: f"(CASE WHEN ({a[1]}) = 0 THEN NULL ELSE ({a[0]}) / ({a[1]}) END)",
+    "IEEE_DIVIDE": lambda a, _: f"(({a[0]}) / ({a[1]}))",
+    "DIV": lambda a, _: f"(({a[0]}) // ({a[1]}))",
+    "CONCAT": lambda a, _: "(" + " || ".join(f"({arg})" for arg in a) + ")",
+    "REGEXP_EXTRACT": lambda a, lits: f"NULLIF(regexp_extract({a[0]}, {a[1]}, {_regexp_group(a[1], lits)}), '')",
+    "REGEXP_EXTRACT_ALL": lambda a, lits: f"regexp_extract_all({a[0]}, {a[1]}, {_regexp_group(a[1], lits)})",
+    "REGEXP_REPLACE": lambda a, _: f"regexp_replace({a[0]}, {a[1]}, {a[2]}, 'g')",
+    "SPLIT": lambda a, _: f"string_split({a[0]}, {a[1] if len(a) > 1 else chr(39) + ',' + chr(39)})",
+    "CONTAINS_SUBSTR": lambda a, _: f"contains(lower(CAST({a[0]} AS varchar)), lower({a[1]}))",
+    "GENERATE_UUID": lambda a, _: "CAST(uuid() AS varchar)",
+    "TO_JSON_STRING": lambda a, _: f"CAST(to_json({a[0]}) AS varchar)",
+    "PARSE_JSON": lambda a, _: f"CAST({a[0]} AS json)",
+    "JSON_EXTRACT_ARRAY": lambda a, _: f"CAST(json_extract({a[0]}, {a[1] if len(a) > 1 else chr(39) + '$' + chr(39)}) AS json[])",
+    "JSON_EXTRACT_STRING_ARRAY": lambda a, _: f"CAST(json_extract({a[0]}, {a[1] if len(a) > 1 else chr(39) + '$' + chr(39)}) AS varchar[])",
+    "FARM_FINGERPRINT": lambda a, _: f"CAST(hash({a[0]}) >> 1 AS bigint)",
+    "TO_HEX": _to_hex,
+    "ARRAY_AGG": _array_agg,
+    "STRUCT": _struct,
+}
+
+FUNCTION_RENAMES = {
+    "SAFE_CAST": "TRY_CAST",
+    "FORMAT": "printf",
+    "COUNTIF": "count_if",
+    "LOGICAL_AND": "bool_and",
+    "LOGICAL_OR": "bool_or",
+    "ARRAY_LENGTH": "len",
+    "ARRAY_CONCAT": "list_concat",
+    "REGEXP_CONTAINS": "regexp_matches",
+    "JSON_EXTRACT_SCALAR": "json_extract_string",
+    "JSON_VALUE": "json_extract_string",
+    "JSON_EXTRACT": "json_extract",
+    "JSON_QUERY": "json_extract",
+    "INITCAP": "bq_initcap",
+}
+
+# Helper macros created on every connection
+_MACROS = (
+    "CREATE OR REPLACE MACRO bq_initcap(s) AS "
+    "array_to_string(list_transform(string_split(lower(s), ' '), w -> upper(left(w, 1)) || substr(w, 2)), ' ')"
+)
+
+
+def _rewrite_calls(text: str, literals: Sequence[str]) -> str:
+    """Apply FUNCTION_REWRITES / FUNCTION_RENAMES, innermost arguments first."""
+    out: List[str] = []
+    pos = 0
+    for match in _CALL_RE.finditer(text):
+        if match.start() < pos:
+            continue
+        name = match.group(1).upper()
+        if name not in FUNCTION_REWRITES and name not in FUNCTION_RENAMES and name != "UNNEST":
+            continue
+        open_index = match.end() - 1
+        close_index = _match_paren(text, open_index)
+        inner = _rewrite_calls(text[open_index + 1:close_index], literals)
+        out.append(text[pos:match.start()])
+        pos = close_index + 1
+
+        if name == "UNNEST":
+            prefix = "".join(out)
+            if re.search(r"\bIN\s*$", prefix, re.IGNORECASE):
+                out.append(f"(SELECT UNNEST({inner}))")
+                continue
+            alias = re.match(r"\s+(?:AS\s+)?([A-Za-z_]\w*)", text[pos:], re.IGNORECASE)
+            if alias and alias.group(1).upper() not in _CLAUSE_WORDS and not text[pos + alias.end():].lstrip().startswith("("):
+                out.append(f"UNNEST({inner}) AS _unnest_{alias.group(1)}({alias.group(1)})")
+                pos += alias.end()
+            else:
+                out.append(f"UNNEST({inner})")
+        elif name in FUNCTION_RENAMES:
+            out.append(f"{FUNCTION_RENAMES[name]}({inner})")
+        else:
+            out.append(FUNCTION_REWRITES[name](_split_top_level(inner), literals))
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _strip_ddl_options(text: str) -> str:
+    """Drop PARTITION BY / CLUSTER BY / OPTIONS(...) from CREATE statements."""
+    while True:
+        match = re.search(r"\bOPTIONS\s*\(", text, re.IGNORECASE)
+        if not match:
+            break
+        text = text[:match.start()] + text[_match_paren(text, match.end() - 1) + 1:]
+    for clause in ("PARTITION BY", "CLUSTER BY"):
+        position = _find_keyword(text, clause.replace(" ", r"\s+"))
+        if position == -1:
+            continue
+        ends = [p for p in (_find_keyword(text, k, position + len(clause)) for k in ("CLUSTER", "AS")) if p != -1]
+        text = text[:position] + (text[min(ends):] if ends else "")
+    return text
+
+
+def _rewrite_statement(text: str) -> str:
+    """Statement-level rewrites for syntax DuckDB spells differently."""
+    head = text.lstrip()
+    offset = len(text) - len(head)
+    if re.match(r"MERGE\s+(?!INTO\b)", head, re.IGNORECASE):
+        head = re.sub(r"^MERGE\s+", "MERGE INTO ", head, flags=re.IGNORECASE)
+    elif re.match(r"INSERT\s+(?!INTO\b)", head, re.IGNORECASE):
+        head = re.sub(r"^INSERT\s+", "INSERT INTO ", head, flags=re.IGNORECASE)
+    elif re.match(r"DELETE\s+(?!FROM\b)", head, re.IGNORECASE):
+        head = re.sub(r"^DELETE\s+", "DELETE FROM ", head, flags=re.IGNORECASE)
+    elif re.match(r"(CREATE|ALTER)\b", head, re.IGNORECASE):
+        head = _strip_ddl_options(head)
+    return text[:offset] + head
+
+
+def _bind_placeholders(
+    text: str,
+    param_types: Dict[str, Optional[str]],
+    variable_types: Dict[str, Optional[str]],
+) -> str:
+    """@param and script variables -> (typed) DuckDB named parameters."""
+    text = re.sub(r"@@error\.message\b", "$__error_message", text, flags=re.IGNORECASE)
+    text = re.sub(r"@@error\.\w+", "NULL", text, flags=re.IGNORECASE)
+    text = re.sub(r"@@row_count\b", "$__row_count", text, flags=re.IGNORECASE)
+
+    def typed(name: str, column_type: Optional[str]) -> str:
+        return f"CAST(${name} AS {column_type})" if column_type else f"${name}"
+
+    text = re.sub(
+        r"(?<![\w@$])@([A-Za-z_]\w*)",
+        lambda m: typed(m.group(1), param_types.get(m.group(1))),
+        text,
+    )
+    if not variable_types:
+        return text
+
+    def variable(match: re.Match) -> str:
+        name = match.group(0)
+        key = name.lower()
+        if key not in variable_types:
+            return name
+        before = text[:match.start()]
+        after = text[match.end():]
+        if re.search(r"\bAS\s*$", before, re.IGNORECASE) or re.match(r"\s*(:=|\.)", after):
+            return name
+        return typed(f"__v_{key}", variable_types[key])
+
+    return re.sub(r'(?<![\w."$\x00])[A-Za-z_]\w*(?![\w"\x00])', variable, text)
+
+
+@lru_cache(maxsize=1024)
+def _translate_masked(
+    masked: str,
+    literals: Tuple[str, ...],
+    project: str,
+    param_types: Tuple[Tuple[str, Optional[str]], ...],
+    variable_types: Tuple[Tuple[str, Optional[str]], ...],
+) -> str:
+    text = _resolve_names(masked, project)
+    text = _rewrite_statement(text)
+    text = re.sub(r"\bSAFE\.", "", text)
+    text = re.sub(r"(\*\s*)EXCEPT\s*\(", r"\1EXCLUDE (", text, flags=re.IGNORECASE)
+    text = _ARRAY_TYPE_RE.sub(lambda m: f"{BQ_TO_DUCKDB_TYPES.get(m.group(1).upper(), m.group(1))}[]", text)
+    text = re.sub(r"\bNUMERIC\s*\(", "DECIMAL(", text)
+    text = _TYPE_KEYWORD_RE.sub(lambda m: BQ_TO_DUCKDB_TYPES[m.group(1)], text)
+    text = _rewrite_calls(text, literals)
+    text = _bind_placeholders(text, dict(param_types), dict(variable_types))
+    return _unmask(text, literals)
+
+
+def translate_sql(
+    sql: str,
+    project: str = "",
+    param_types: Optional[Dict[str, Optional[str]]] = None,
+) -> str:
+    """
+    Translate a single BigQuery Standard SQL statement to DuckDB SQL.
+
+    Args:
+        sql: BigQuery SQL
+        project: Project id dropped from `project.dataset.table` names
+        param_types: DuckDB types for @params (typed CAST($name AS T))
+
+    Returns:
+        DuckDB SQL using $name placeholders
+    """
+    masked, literals = _mask(sql)
+    return _translate_masked(
+        masked, tuple(literals), project, tuple(sorted((param_types or {}).items())), ()
+    )
+
+
+# ============================================
+# Script Interpreter
+# ============================================
+
+class _Return(Exception):
+    """RETURN inside a script or procedure."""
+
+
+class _Node:
+    """Parsed script statement."""
+
+    def __init__(self, kind: str, **fields: Any):
+        self.kind = kind
+        self.__dict__.update(fields)
+
+
+def _peel(chunk: str) -> List[Tuple[str, Any]]:
+    """Split block headers (BEGIN, IF ... THEN, ELSE, EXCEPTION ...) off a statement chunk."""
+    pieces: List[Tuple[str, Any]] = []
+    text = chunk.strip()
+    while text:
+        upper = text.upper()
+        header = re.match(
+            r"CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+(?:IF\s+NOT\s+EXISTS\s+)?([^\s(]+)\s*\(",
+            text, re.IGNORECASE,
+        )
+        if header:
+            close = _match_paren(text, header.end() - 1)
+            rest = _strip_ddl_options(text[close + 1:]).lstrip()
+            pieces.append(("PROCEDURE", (header.group(1), text[header.end():close])))
+            text = rest
+            continue
+        if re.match(r"BEGIN\b(?!\s+TRAN)", upper):
+            pieces.append(("BEGIN", None))
+            text = text[5:].lstrip()
+            continue
+        condition = re.match(r"(ELSEIF|IF)\b", upper)
+        if condition and not re.match(r"IF\s*\(", upper):
+            then = _find_then(text, condition.end())
+            pieces.append((condition.group(1), text[condition.end():then].strip()))
+            text = text[then + 4:].lstrip()
+            continue
+        if re.match(r"ELSE\b", upper):
+            pieces.append(("ELSE", None))
+            text = text[4:].lstrip()
+            continue
+        handler = re.match(r"EXCEPTION\s+WHEN\s+ERROR\s+THEN\b", upper)
+        if handler:
+            pieces.append(("EXCEPTION", None))
+            text = text[handler.end():].lstrip()
+            continue
+        end = re.fullmatch(r"END(\s+IF)?", upper)
+        if end:
+            pieces.append(("END IF" if end.group(1) else "END", None))
+            break
+        if re.match(r"(LOOP|WHILE|REPEAT|FOR)\b", upper) or re.match(r"END\s+(LOOP|WHILE|REPEAT|FOR)\b", upper):
+            raise google_api_exceptions.BadRequest(f"Local BigQuery does not support loops: {text[:40]}")
+        pieces.append(("STMT", text))
+        break
+    return pieces
+
+
+def _find_then(text: str, start: int) -> int:
+    """First THEN of an IF header that is not part of a CASE expression."""
+    depth = 0
+    for match in re.finditer(r"\b(CASE|END|THEN)\b", text[start:], re.IGNORECASE):
+        word = match.group(1).upper()
+        if word == "CASE":
+            depth += 1
+        elif word == "END":
+            depth -= 1
+        elif depth == 0:
+            return start + match.start()
+    raise google_api_exceptions.BadRequest("IF without THEN")
+
+
+def parse_script(masked: str) -> List[_Node]:
+    """Parse a masked script into nodes."""
+    pieces: List[Tuple[str, Any]] = []
+    for chunk in _split_top_level(masked, ";"):
+        if chunk:
+            pieces.extend(_peel(chunk))
+    nodes, index, terminator = _parse_block(pieces, 0)
+    if terminator is not None:
+        raise google_api_exceptions.BadRequest(f"Unexpected {terminator}")
+    return nodes
+
+
+def _parse_block(pieces: List[Tuple[str, Any]], index: int) -> Tuple[List[_Node], int, Optional[str]]:
+    """Parse until ELSE/ELSEIF/END/END IF/EXCEPTION; returns (nodes, next index, terminator)."""
+    nodes: List[_Node] = []
+    while index < len(pieces):
+        kind, value = pieces[index]
+        if kind in ("ELSE", "ELSEIF", "END", "END IF", "EXCEPTION"):
+            return nodes, index, kind
+        index += 1
+        if kind == "STMT":
+            nodes.append(_Node("STMT", text=value))
+        elif kind == "BEGIN":
+            body, index, terminator = _parse_block(pieces, index)
+            handler = None
+            if terminator == "EXCEPTION":
+                handler, index, terminator = _parse_block(pieces, index + 1)
+            if terminator != "END":
+                raise google_api_exceptions.BadRequest("BEGIN without END")
+            index += 1
+            nodes.append(_Node("BLOCK", body=body, handler=handler))
+        elif kind == "IF":
+            branches = []
+            condition = value
+            while True:
+                body, index, terminator = _parse_block(pieces, index)
+                branches.append((condition, body))
+                if terminator == "ELSEIF":
+                    condition = pieces[index][1]
+                    index += 1
+                    continue
+                if terminator == "ELSE":
+                    else_body, index, terminator = _parse_block(pieces, index + 1)
+                    branches.append((None, else_body))
+                if terminator != "END IF":
+                    raise google_api_exceptions.BadRequest("IF without END IF")
+                index += 1
+                break
+            nodes.append(_Node("IF", branches=branches))
+        elif kind == "PROCEDURE":
+            name, params = value
+            body, index, _ = _parse_block(pieces, index)
+            if not body or body[0].kind != "BLOCK":
+                raise google_api_exceptions.BadRequest(f"Procedure {name} has no BEGIN ... END body")
+            nodes.append(_Node("PROCEDURE", name=name, params=params, body=body[0]))
+            nodes.extend(body[1:])
+    return nodes, index, None
+
+
+class _Procedure:
+    """Stored procedure registered by CREATE PROCEDURE."""
+
+    def __init__(self, name: str, params: List[Tuple[str, str, str]], body: _Node, literals: List[str]):
+        self.name = name
+        self.params = params  # (mode, name, duckdb type)
+        self.body = body
+        self.literals = literals
+
+
+class _StatementResult:
+    """Outcome of one executed statement."""
+
+    def __init__(self, table: Optional[pa.Table] = None, affected_rows: Optional[int] = None, statement_type: str = "SELECT"):
+        self.table = table
+        self.affected_rows = affected_rows
+        self.statement_type = statement_type
+
+
+def _fetch_arrow(result: Any) -> pa.Table:
+    """Arrow table from a DuckDB result across duckdb versions."""
+    if hasattr(result, "to_arrow_table"):
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()
+
+
+class _ScriptRunner:
+    """
+    Executes parsed statements on one DuckDB connection.
+
+    Variables live in a scope dict {name: [duckdb_type, value]}; a CALL gets a
+    fresh scope. The result of a script is the last SELECT it ran.
+    """
+
+    def __init__(self, client: "LocalBigQueryClient", connection: Any, params: Dict[str, Tuple[Optional[str], Any]]):
+        self.client = client
+        self.connection = connection
+        self.params = params
+        self.row_count: Optional[int] = None
+        self.error_message: Optional[str] = None
+        self.in_transaction = False
+        self.last_result = _StatementResult(statement_type="SCRIPT")
+
+    # -------- execution primitives --------
+
+    def _execute(self, masked: str, literals: Sequence[str], scope: Dict[str, list], params=None) -> Any:
+        """Translate and run one masked statement with variables and params bound."""
+        params = self.params if params is None else params
+        sql = _translate_masked(
+            masked,
+            tuple(literals),
+            self.client.project,
+            tuple(sorted((name, t) for name, (t, _) in params.items())),
+            tuple(sorted((name, t) for name, (t, _) in scope.items())),
+        )
+        values = {}
+        for name in set(re.findall(r"\$([A-Za-z_]\w*)", sql)):
+            if name.startswith("__v_"):
+                values[name] = scope[name[4:]][1]
+            elif name == "__row_count":
+                values[name] = self.row_count
+            elif name == "__error_message":
+                values[name] = self.error_message
+            elif name in params:
+                values[name] = params[name][1]
+            else:
+                raise google_api_exceptions.BadRequest(f"Query parameter '{name}' not found")
+        try:
+            return self.connection.execute(sql, values) if values else self.connection.execute(sql)
+        except Exception as e:
+            raise _bq_error(e, sql) from e
+
+    def _evaluate(self, exprs: List[str], literals: Sequence[str], scope: Dict[str, list]) -> List[Tuple[str, Any]]:
+        """Evaluate expressions; returns [(duckdb type, value)]."""
+        result = self._execute("SELECT " + ", ".join(f"({e})" for e in exprs), literals, scope)
+        row = result.fetchone()
+        types = [str(column[1]) for column in result.description]
+        return list(zip(types, row))
+
+    # -------- statements --------
+
+    def run(self, nodes: List[_Node], literals: Sequence[str], scope: Dict[str, list]) -> None:
+        for node in nodes:
+            if node.kind == "STMT":
+                self._statement(node.text, literals, scope)
+            elif node.kind == "BLOCK":
+                self._block(node, literals, scope)
+            elif node.kind == "IF":
+                for condition, body in node.branches:
+                    if condition is None or self._evaluate([f"CAST(({condition}) AS boolean)"], literals, scope)[0][1]:
+                        self.run(body, literals, scope)
+                        break
+            elif node.kind == "PROCEDURE":
+                self.client._register_procedure(node, literals)
+
+    def _block(self, node: _Node, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        if node.handler is None:
+            self.run(node.body, literals, scope)
+            return
+        try:
+            self.run(node.body, literals, scope)
+        except _Return:
+            raise
+        except Exception as e:
+            if self.in_transaction:
+                self.connection.execute("ROLLBACK")
+                self.in_transaction = False
+            self.error_message = getattr(e, "message", None) or str(e)
+            self.run(node.handler, literals, scope)
+
+    def _statement(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        upper = text.upper()
+        keyword = re.match(r"[A-Z_]+(?:\s+[A-Z_]+)?", upper)
+        head = keyword.group(0) if keyword else ""
+
+        if head.startswith("DECLARE"):
+            self._declare(text, literals, scope)
+        elif head.startswith("SET ") or head == "SET":
+            self._set(text, literals, scope)
+        elif head == "EXECUTE IMMEDIATE":
+            self._execute_immediate(text, literals, scope)
+        elif head.startswith("CALL"):
+            self._call(text, literals, scope)
+        elif head.startswith("ASSERT"):
+            self._assert(text, literals, scope)
+        elif head.startswith("RAISE"):
+            message = re.search(r"\bMESSAGE\s*=\s*(.+)$", text, re.IGNORECASE | re.DOTALL)
+            if message:
+                raise google_api_exceptions.BadRequest(str(self._evaluate([message.group(1)], literals, scope)[0][1]))
+            raise google_api_exceptions.BadRequest(self.error_message or "RAISE")
+        elif head.startswith("RETURN"):
+            raise _Return()
+        elif re.match(r"BEGIN\s+TRAN", upper):
+            if not self.in_transaction:
+                self.connection.execute("BEGIN TRANSACTION")
+                self.in_transaction = True
+        elif head.startswith("COMMIT"):
+            if self.in_transaction:
+                self.connection.execute("COMMIT")
+                self.in_transaction = False
+        elif head.startswith("ROLLBACK"):
+            if self.in_transaction:
+                self.connection.execute("ROLLBACK")
+                self.in_transaction = False
+        elif re.match(r"DROP\s+PROCEDURE\b", upper):
+            name = re.sub(r"^DROP\s+PROCEDURE\s+(IF\s+EXISTS\s+)?", "", text, flags=re.IGNORECASE).strip()
+            self.client._procedures.pop(self.client._routine_key(name), None)
+        else:
+            self._sql(text, literals, scope)
+
+    def _sql(self, text: str, literals: Sequence[str], scope: Dict[str, list], params=None) -> _StatementResult:
+        result = self._execute(text, literals, scope, params)
+        statement_type = _statement_type(text)
+        if statement_type == "SELECT":
+            outcome = _StatementResult(_fetch_arrow(result), None, statement_type)
+            self.last_result = outcome
+        elif statement_type in ("INSERT", "UPDATE", "DELETE", "MERGE"):
+            row = result.fetchone()
+            self.row_count = int(row[0]) if row else 0
+            outcome = _StatementResult(None, self.row_count, statement_type)
+            self.client._touch(self.client._statement_target(text))
+        else:
+            outcome = _StatementResult(None, None, statement_type)
+            if statement_type.startswith("CREATE") or statement_type.startswith("DROP"):
+                self.client._touch(self.client._statement_target(text))
+        return outcome
+
+    def _declare(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        body = re.sub(r"^DECLARE\s+", "", text, flags=re.IGNORECASE)
+        default_at = _find_keyword(body, "DEFAULT")
+        default = body[default_at + 7:].strip() if default_at != -1 else None
+        head = body[:default_at] if default_at != -1 else body
+        names_match = re.match(r"\s*([A-Za-z_]\w*(?:\s*,\s*[A-Za-z_]\w*)*)\s*(.*)$", head, re.DOTALL)
+        names = [n.strip().lower() for n in names_match.group(1).split(",")]
+        type_text = names_match.group(2).strip()
+        column_type = duckdb_type(type_text) if type_text else None
+        value = None
+        if default is not None:
+            expr = f"CAST(({default}) AS {column_type})" if column_type else default
+            inferred, value = self._evaluate([expr], literals, scope)[0]
+            column_type = column_type or inferred
+        for name in names:
+            scope[name] = [column_type, value]
+
+    def _set(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        body = re.sub(r"^SET\s+", "", text, flags=re.IGNORECASE)
+        equals = _split_top_level(body, "=")
+        target, expr = equals[0], "=".join(equals[1:])
+        if target.startswith("("):
+            names = [n.strip().lower() for n in target.strip("() ").split(",")]
+            expr = expr.strip()
+            if re.match(r"\(\s*SELECT\b", expr, re.IGNORECASE):
+                result = self._execute(expr.strip()[1:-1], literals, scope)
+                row = result.fetchone() or (None,) * len(names)
+            else:
+                row = [v for _, v in self._evaluate(_split_top_level(expr.strip()[1:-1]), literals, scope)]
+            for name, value in zip(names, row):
+                scope[self._variable(name, scope)][1] = value
+            return
+        name = self._variable(target.strip().lower(), scope)
+        column_type = scope[name][0]
+        cast = f"CAST(({expr}) AS {column_type})" if column_type else expr
+        scope[name][1] = self._evaluate([cast], literals, scope)[0][1]
+
+    @staticmethod
+    def _variable(name: str, scope: Dict[str, list]) -> str:
+        if name not in scope:
+            raise google_api_exceptions.BadRequest(f"Unrecognized variable: {name}")
+        return name
+
+    def _assert(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        body = re.sub(r"^ASSERT\s+", "", text, flags=re.IGNORECASE)
+        match = re.search(r"\s+AS\s+(\x00\d+\x00)\s*$", body)
+        condition = body[:match.start()] if match else body
+        if self._evaluate([f"CAST(({condition}) AS boolean)"], literals, scope)[0][1] is not True:
+            message = literals[int(match.group(1).strip("\x00"))] if match else condition.strip()
+            raise google_api_exceptions.BadRequest(f"Assertion failed: {message}")
+
+    def _execute_immediate(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        body = re.sub(r"^EXECUTE\s+IMMEDIATE\s+", "", text, flags=re.IGNORECASE)
+        using_at = _find_keyword(body, "USING")
+        using = body[using_at + 5:] if using_at != -1 else ""
+        body = body[:using_at] if using_at != -1 else body
+        into_at = _find_keyword(body, "INTO")
+        into = [n.strip().lower() for n in body[into_at + 4:].split(",")] if into_at != -1 else []
+        sql_expr = body[:into_at] if into_at != -1 else body
+
+        items = _split_top_level(using) if using.strip() else []
+        names, exprs = [], []
+        for i, item in enumerate(items):
+            alias = re.search(r"\s+AS\s+([A-Za-z_]\w*)\s*$", item, re.IGNORECASE)
+            names.append(alias.group(1) if alias else f"_{i + 1}")
+            exprs.append(item[:alias.start()] if alias else item)
+        evaluated = self._evaluate([sql_expr] + exprs, literals, scope)
+        inner_sql = evaluated[0][1]
+        params = {name: (column_type, value) for name, (column_type, value) in zip(names, evaluated[1:])}
+
+        inner_masked, inner_literals = _mask(inner_sql)
+        if any(name.startswith("_") for name in names):
+            # Positional ? placeholders become named parameters in order
+            counter = iter(names)
+            inner_masked = re.sub(r"\?", lambda _: f"@{next(counter)}", inner_masked)
+        nodes = parse_script(inner_masked)
+        if len(nodes) == 1 and nodes[0].kind == "STMT" and _statement_type(nodes[0].text) != "CALL":
+            outcome = self._sql(nodes[0].text, inner_literals, {}, params)
+        else:
+            saved = self.params
+            self.params = params
+            try:
+                self.run(nodes, inner_literals, {})
+            finally:
+                self.params = saved
+            outcome = self.last_result
+        if into:
+            row = outcome.table.slice(0, 1).to_pylist() if outcome.table is not None else []
+            values = list(row[0].values()) if row else [None] * len(into)
+            for name, value in zip(into, values):
+                scope[self._variable(name, scope)][1] = value
+
+    def _call(self, text: str, literals: Sequence[str], scope: Dict[str, list]) -> None:
+        match = re.match(r"CALL\s+(.+?)\s*\(", text, re.IGNORECASE | re.DOTALL)
+        close = _match_paren(text, match.end() - 1)
+        procedure = self.client._procedures.get(self.client._routine_key(match.group(1)))
+        if procedure is None:
+            raise google_api_exceptions.NotFound(f"Not found: Procedure {_resolve_names(match.group(1), self.client.project)}")
+        args = _split_top_level(text[match.end():close])
+        if len(args) != len(procedure.params):
+            raise google_api_exceptions.BadRequest(
+                f"Procedure {procedure.name} expects {len(procedure.params)} arguments, got {len(args)}"
+            )
+        exprs = [f"CAST(({arg}) AS {column_type})" for arg, (_, _, column_type) in zip(args, procedure.params)]
+        values = self._evaluate(exprs, literals, scope) if exprs else []
+        frame = {name: [column_type, value] for (_, name, column_type), (_, value) in zip(procedure.params, values)}
+        try:
+            self.run([procedure.body], procedure.literals, frame)
+        except _Return:
+            pass
+        for (mode, name, _), arg in zip(procedure.params, args):
+            if mode in ("OUT", "INOUT") and arg.strip().lower() in scope:
+                scope[arg.strip().lower()][1] = frame[name][1]
+
+
+def _statement_type(masked: str) -> str:
+    head = re.match(r"\s*\(*\s*([A-Za-z]+)(?:\s+(?:OR\s+REPLACE\s+)?(?:TEMP\s+|TEMPORARY\s+)?([A-Za-z]+))?", masked)
+    if not head:
+        return "SELECT"
+    first = head.group(1).upper()
+    if first in ("SELECT", "WITH", "VALUES", "FROM", "DESCRIBE", "SHOW", "EXPLAIN"):
+        return "SELECT"
+    if first in ("CREATE", "DROP", "ALTER"):
+        return f"{first}_{(head.group(2) or '').upper()}".rstrip("_")
+    return first
+
+
+def _bq_error(error: Exception, sql: str) -> Exception:
+    """Map a DuckDB error onto the google.api_core exception BigQuery raises."""
+    if isinstance(error, google_api_exceptions.GoogleAPICallError):
+        return error
+    message = str(error).split("\n")[0]
+    if duckdb is not None and isinstance(error, duckdb.CatalogException) and "does not exist" in message:
+        return google_api_exceptions.NotFound(f"Not found: {message}")
+    logger.debug(f"Local BigQuery statement failed: {message}", extra={"sql": sql[:2000]})
+    return google_api_exceptions.BadRequest(message)
+
+
+# ============================================
+# Jobs and Results
+# ============================================
+
+class LocalRowIterator:
+    """Query result mirroring google.cloud.bigquery.table.RowIterator."""
+
+    def __init__(self, table: Optional[pa.Table]):
+        self._table = table if table is not None else pa.table({})
+        self.schema = [_bq_field(f.name, f.type) for f in self._table.schema]
+        self.total_rows = self._table.num_rows
+
+    def __iter__(self) -> Iterator[bigquery.Row]:
+        names = self._table.column_names
+        field_to_index = {name: i for i, name in enumerate(names)}
+        columns = [column.to_pylist() for column in self._table.columns]
+        for values in zip(*columns):
+            yield bigquery.Row(values, field_to_index)
+
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def to_arrow(self, *args: Any, **kwargs: Any) -> pa.Table:
+        return self._table
+
+    def to_dataframe(self, *args: Any, **kwargs: Any):
+        return self._table.to_pandas()
+
+
+class LocalQueryJob:
+    """Completed query job mirroring google.cloud.bigquery.QueryJob."""
+
+    def __init__(self, query: str, outcome: _StatementResult, started: datetime, ended: datetime, location: str):
+        self.job_id = f"local_{uuid.uuid4().hex}"
+        self.query = query
+        self.location = location
+        self.state = "DONE"
+        self.errors = None
+        self.error_result = None
+        self.started = started
+        self.ended = ended
+        self.created = started
+        self.statement_type = outcome.statement_type
+        self.num_dml_affected_rows = outcome.affected_rows
+        self.total_bytes_processed = 0
+        self.total_bytes_billed = 0
+        self.slot_millis = int((ended - started).total_seconds() * 1000)
+        self.cache_hit = False
+        self.destination = None
+        self._rows = LocalRowIterator(outcome.table)
+
+    def result(self, *args: Any, max_results: Optional[int] = None, **kwargs: Any) -> LocalRowIterator:
+        if max_results is not None:
+            return LocalRowIterator(self._rows.to_arrow().slice(0, max_results))
+        return self._rows
+
+    def to_arrow(self, *args: Any, **kwargs: Any) -> pa.Table:
+        return self._rows.to_arrow()
+
+    def to_dataframe(self, *args: Any, **kwargs: Any):
+        return self._rows.to_dataframe()
+
+    def done(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    def running(self) -> bool:
+        return False
+
+    def exception(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def cancel(self, *args: Any, **kwargs: Any) -> bool:
+        return False
+
+
+class LocalLoadJob:
+    """Completed load job mirroring google.cloud.bigquery.LoadJob."""
+
+    def __init__(self, destination: str, output_rows: int):
+        self.job_id = f"local_load_{uuid.uuid4().hex}"
+        self.destination = destination
+        self.output_rows = output_rows
+        self.state = "DONE"
+        self.errors = None
+        self.error_result = None
+
+    def result(self, *args: Any, **kwargs: Any) -> "LocalLoadJob":
+        return self
+
+    def done(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+
+# ============================================
+# Client
+# ============================================
+
+class LocalBigQueryClient:
+    """
+    DuckDB-backed stand-in for google.cloud.bigquery.Client.
+
+    Thread-safe: each job runs on its own DuckDB cursor over one shared
+    database, so concurrent DML on the same table can conflict the way it
+    does in BigQuery.
+    """
+
+    def __init__(
+        self,
+        project: str,
+        location: str = "US",
+        database: str = ":memory:",
+        data_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            project: Project id reported on tables/jobs and dropped from names
+            location: Reported location
+            database: DuckDB database path (":memory:" for throwaway runs)
+            data_dir: Parquet fixture root loaded on start
+        """
+        if duckdb is None:
+            raise ImportError("bigquery_backend='duckdb' requires the duckdb package (pip install duckdb)")
+        self.project = project
+        self.location = location
+        self._connection = duckdb.connect(database)
+        self._connection.execute("SET TimeZone = 'UTC'")
+        self._connection.execute(_MACROS)
+        self._procedures: Dict[str, _Procedure] = {}
+        self._modified: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        if data_dir:
+            self.load_parquet_dir(data_dir)
+
+    # -------- internals --------
+
+    def _cursor(self) -> Any:
+        with self._lock:
+            cursor = self._connection.cursor()
+        cursor.execute("SET TimeZone = 'UTC'")
+        return cursor
+
+    def _split_ref(self, ref: Any) -> Tuple[str, str]:
+        """(dataset, table) from a table id string, TableReference or Table."""
+        if isinstance(ref, (bigquery.Table, bigquery.TableReference, bigquery.table.TableListItem)):
+            return ref.dataset_id, ref.table_id
+        parts = str(ref).replace(":", ".").replace("`", "").split(".")
+        if len(parts) < 2:
+            raise google_api_exceptions.BadRequest(f"Invalid table id: {ref}")
+        return parts[-2], parts[-1]
+
+    def _routine_key(self, name: str) -> str:
+        masked, _ = _mask(name.strip())
+        parts = _resolve_names(masked, self.project).replace('"', "").split(".")
+        return ".".join(parts[-2:]).lower()
+
+    def _statement_target(self, masked: str) -> Optional[str]:
+        resolved = _resolve_names(masked, self.project)
+        match = re.search(
+            r"^\s*(?:INSERT\s+(?:INTO\s+)?|DELETE\s+(?:FROM\s+)?|UPDATE\s+|MERGE\s+(?:INTO\s+)?|TRUNCATE\s+(?:TABLE\s+)?|"
+            r"(?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?(?:TEMP\s+|TEMPORARY\s+)?TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?)"
+            r'("?[\w-]+"?\s*\.\s*"?[\w-]+"?)',
+            resolved,
+            re.IGNORECASE,
+        )
+        return match.group(1).replace('"', "").replace(" ", "").lower() if match else None
+
+    def _touch(self, key: Optional[str]) -> None:
+        if key:
+            self._modified[key] = datetime.now(timezone.utc)
+
+    def _register_procedure(self, node: _Node, literals: Sequence[str]) -> None:
+        params = []
+        for declaration in _split_top_level(node.params):
+            if not declaration:
+                continue
+            match = re.match(r"(?:(IN|OUT|INOUT)\s+)?([A-Za-z_]\w*)\s+(.+)$", declaration.strip(), re.IGNORECASE | re.DOTALL)
+            params.append(((match.group(1) or "IN").upper(), match.group(2).lower(), duckdb_type(match.group(3))))
+        key = self._routine_key(node.name)
+        self._procedures[key] = _Procedure(key, params, node.body, list(literals))
+
+    def _insert_arrow(self, dataset: str, table: str, data: pa.Table, truncate: bool = False) -> int:
+        cursor = self._cursor()
+        try:
+            target = f'"{dataset}"."{table}"'
+            cursor.register("__local_rows", data)
+            if truncate:
+                cursor.execute(f"DELETE FROM {target}")
+            cursor.execute(f'INSERT INTO {target} BY NAME SELECT * FROM "__local_rows"')
+            cursor.unregister("__local_rows")
+        except Exception as e:
+            raise _bq_error(e, f"INSERT INTO {dataset}.{table}") from e
+        finally:
+            cursor.close()
+        self._touch(f"{dataset}.{table}".lower())
+        return data.num_rows
+
+    def _table_exists(self, dataset: str, table: str) -> bool:
+        cursor = self._cursor()
+        try:
+            row = cursor.execute(
+                "SELECT count(*) FROM information_schema.tables WHERE lower(table_schema) = lower(?) AND lower(table_name) = lower(?)",
+                [dataset, table],
+            ).fetchone()
+        finally:
+            cursor.close()
+        return bool(row and row[0])
+
+    # -------- queries --------
+
+    def query(self, query: str, job_config: Optional[bigquery.QueryJobConfig] = None, **kwargs: Any) -> LocalQueryJob:
+        """Run a query or script and return a completed job."""
+        params = _query_parameters(job_config)
+        started = datetime.now(timezone.utc)
+        masked, literals = _mask(query)
+        cursor = self._cursor()
+        runner = _ScriptRunner(self, cursor, params)
+        try:
+            nodes = parse_script(masked)
+            if len(nodes) == 1 and nodes[0].kind == "STMT" and _statement_type(nodes[0].text) not in ("CALL", "DECLARE"):
+                outcome = runner._sql(nodes[0].text, literals, {})
+            else:
+                try:
+                    runner.run(nodes, literals, {})
+                except _Return:
+                    pass
+                outcome = runner.last_result
+        except Exception:
+            if runner.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        return LocalQueryJob(query, outcome, started, datetime.now(timezone.utc), self.location)
+
+    # -------- datasets and tables --------
+
+    def get_dataset(self, dataset_ref: Any, **kwargs: Any) -> bigquery.Dataset:
+        dataset_id = getattr(dataset_ref, "dataset_id", None) or str(dataset_ref).split(".")[-1]
+        cursor = self._cursor()
+        try:
+            row = cursor.execute(
+                "SELECT count(*) FROM information_schema.schemata WHERE lower(schema_name) = lower(?)", [dataset_id]
+            ).fetchone()
+        finally:
+            cursor.close()
+        if not row or not row[0]:
+            raise google_api_exceptions.NotFound(f"Not found: Dataset {self.project}:{dataset_id}")
+        dataset = bigquery.Dataset(f"{self.project}.{dataset_id}")
+        dataset.location = self.location
+        return dataset
+
+    def create_dataset(self, dataset: Any, exists_ok: bool = False, **kwargs: Any) -> bigquery.Dataset:
+        dataset_id = getattr(dataset, "dataset_id", None) or str(dataset).split(".")[-1]
+        cursor = self._cursor()
+        try:
+            cursor.execute(f'CREATE SCHEMA {"IF NOT EXISTS " if exists_ok else ""}"{dataset_id}"')
+        except Exception as e:
+            raise google_api_exceptions.Conflict(f"Already Exists: Dataset {self.project}:{dataset_id}") from e
+        finally:
+            cursor.close()
+        return self.get_dataset(dataset_id)
+
+    def delete_dataset(self, dataset: Any, delete_contents: bool = False, not_found_ok: bool = False, **kwargs: Any) -> None:
+        dataset_id = getattr(dataset, "dataset_id", None) or str(dataset).split(".")[-1]
+        cursor = self._cursor()
+        try:
+            cursor.execute(f'DROP SCHEMA {"IF EXISTS " if not_found_ok else ""}"{dataset_id}"{" CASCADE" if delete_contents else ""}')
+        except Exception as e:
+            raise _bq_error(e, f"DROP SCHEMA {dataset_id}") from e
+        finally:
+            cursor.close()
+
+    def get_table(self, table: Any, **kwargs: Any) -> bigquery.Table:
+        dataset, name = self._split_ref(table)
+        cursor = self._cursor()
+        try:
+            columns = cursor.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE lower(table_schema) = lower(?) AND lower(table_name) = lower(?) ORDER BY ordinal_position",
+                [dataset, name],
+            ).fetchall()
+            if not columns:
+                raise google_api_exceptions.NotFound(f"Not found: Table {self.project}:{dataset}.{name}")
+            empty = _fetch_arrow(cursor.execute(f'SELECT * FROM "{dataset}"."{name}" LIMIT 0'))
+            num_rows = cursor.execute(f'SELECT count(*) FROM "{dataset}"."{name}"').fetchone()[0]
+        finally:
+            cursor.close()
+        result = bigquery.Table(f"{self.project}.{dataset}.{name}", schema=[_bq_field(f.name, f.type) for f in empty.schema])
+        modified = self._modified.get(f"{dataset}.{name}".lower())
+        if modified is None:
+            modified = datetime.now(timezone.utc)
+            self._modified[f"{dataset}.{name}".lower()] = modified
+        result._properties["numRows"] = str(num_rows)
+        result._properties["lastModifiedTime"] = str(int(modified.timestamp() * 1000))
+        result._properties["location"] = self.location
+        return result
+
+    def create_table(self, table: Any, exists_ok: bool = False, **kwargs: Any) -> bigquery.Table:
+        if not isinstance(table, bigquery.Table):
+            table = bigquery.Table(str(table))
+        dataset, name = table.dataset_id, table.table_id
+        if not table.schema:
+            raise google_api_exceptions.BadRequest(f"Local BigQuery needs a schema to create {dataset}.{name}")
+        columns = ", ".join(f'"{field.name}" {_field_ddl(field)}' for field in table.schema)
+        cursor = self._cursor()
+        try:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset}"')
+            cursor.execute(f'CREATE TABLE {"IF NOT EXISTS " if exists_ok else ""}"{dataset}"."{name}" ({columns})')
+        except Exception as e:
+            if duckdb is not None and isinstance(e, duckdb.CatalogException) and "already exists" in str(e):
+                raise google_api_exceptions.Conflict(f"Already Exists: Table {self.project}:{dataset}.{name}") from e
+            raise _bq_error(e, f"CREATE TABLE {dataset}.{name}") from e
+        finally:
+            cursor.close()
+        self._touch(f"{dataset}.{name}".lower())
+        return self.get_table(f"{dataset}.{name}")
+
+    def delete_table(self, table: Any, not_found_ok: bool = False, **kwargs: Any) -> None:
+        dataset, name = self._split_ref(table)
+        if not self._table_exists(dataset, name):
+            if not_found_ok:
+                return
+            raise google_api_exceptions.NotFound(f"Not found: Table {self.project}:{dataset}.{name}")
+        cursor = self._cursor()
+        try:
+            cursor.execute(f'DROP TABLE "{dataset}"."{name}"')
+        finally:
+            cursor.close()
+        self._modified.pop(f"{dataset}.{name}".lower(), None)
+
+    def list_tables(self, dataset: Any, **kwargs: Any) -> List[bigquery.table.TableListItem]:
+        dataset_id = getattr(dataset, "dataset_id", None) or str(dataset).split(".")[-1]
+        cursor = self._cursor()
+        try:
+            rows = cursor.execute(
+                "SELECT table_name, table_type FROM information_schema.tables WHERE lower(table_schema) = lower(?) ORDER BY table_name",
+                [dataset_id],
+            ).fetchall()
+        finally:
+            cursor.close()
+        return [
+            bigquery.table.TableListItem({
+                "tableReference": {"projectId": self.project, "datasetId": dataset_id, "tableId": name},
+                "type": "VIEW" if table_type == "VIEW" else "TABLE",
+            })
+            for name, table_type in rows
+        ]
+
+    def list_jobs(self, parent_job: Any = None, **kwargs: Any) -> List[LocalQueryJob]:
+        """Scripts run in one interpreter pass, so no child jobs are recorded."""
+        return []
+
+    # -------- writes --------
+
+    def insert_rows_json(self, table: Any, json_rows: Sequence[Dict[str, Any]], **kwargs: Any) -> List[Dict[str, Any]]:
+        """Streaming insert; returns BigQuery-style per-row errors (empty on success)."""
+        if not json_rows:
+            return []
+        dataset, name = self._split_ref(table)
+        try:
+            self._insert_arrow(dataset, name, pa.Table.from_pylist([dict(row) for row in json_rows]))
+        except google_api_exceptions.GoogleAPICallError as e:
+            return [{"index": i, "errors": [{"reason": "invalid", "message": e.message}]} for i in range(len(json_rows))]
+        return []
+
+    def insert_rows(self, table: Any, rows: Sequence[Any], selected_fields: Optional[Sequence[SchemaField]] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+        fields = selected_fields or getattr(table, "schema", None) or self.get_table(table).schema
+        names = [field.name for field in fields]
+        return self.insert_rows_json(table, [row if isinstance(row, dict) else dict(zip(names, row)) for row in rows])
+
+    def load_table_from_json(self, json_rows: Sequence[Dict[str, Any]], destination: Any, job_config: Optional[bigquery.LoadJobConfig] = None, **kwargs: Any) -> LocalLoadJob:
+        dataset, name = self._split_ref(destination)
+        rows = [dict(row) for row in json_rows]
+        loaded = self._insert_arrow(dataset, name, pa.Table.from_pylist(rows), _truncates(job_config)) if rows else 0
+        return LocalLoadJob(f"{dataset}.{name}", loaded)
+
+    def load_table_from_file(self, file_obj: Any, destination: Any, job_config: Optional[bigquery.LoadJobConfig] = None, **kwargs: Any) -> LocalLoadJob:
+        """Load NEWLINE_DELIMITED_JSON, PARQUET or CSV from a file object."""
+        dataset, name = self._split_ref(destination)
+        source_format = getattr(job_config, "source_format", None) or "CSV"
+        payload = file_obj.read()
+        if source_format == bigquery.SourceFormat.PARQUET:
+            data = pq.read_table(io.BytesIO(payload))
+        elif source_format == bigquery.SourceFormat.NEWLINE_DELIMITED_JSON:
+            text = payload.decode("utf-8") if isinstance(payload, bytes) else payload
+            data = pa.Table.from_pylist([json.loads(line) for line in text.splitlines() if line.strip()])
+        elif source_format == bigquery.SourceFormat.CSV:
+            data = pa_csv.read_csv(io.BytesIO(payload if isinstance(payload, bytes) else payload.encode("utf-8")))
+        else:
+            raise google_api_exceptions.BadRequest(f"Local BigQuery cannot load {source_format}")
+        loaded = self._insert_arrow(dataset, name, data, _truncates(job_config)) if data.num_rows else 0
+        return LocalLoadJob(f"{dataset}.{name}", loaded)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    # -------- fixtures --------
+
+    def load_parquet_dir(self, data_dir: str) -> Dict[str, int]:
+        """
+        Load {data_dir}/{dataset}/{table}.parquet (or {table}/*.parquet) fixtures.
+
+        Existing tables (e.g. created from schema files) are appended to by
+        column name; other tables are created from the Parquet schema.
+
+        Returns:
+            {"dataset.table": row count}
+        """
+        loaded: Dict[str, int] = {}
+        cursor = self._cursor()
+        try:
+            for dataset_dir in sorted(p for p in Path(data_dir).iterdir() if p.is_dir()):
+                cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset_dir.name}"')
+                for source in sorted(dataset_dir.iterdir()):
+                    if source.suffix == ".parquet":
+                        name, pattern = source.stem, str(source)
+                    elif source.is_dir() and any(source.glob("*.parquet")):
+                        name, pattern = source.name, str(source / "*.parquet")
+                    else:
+                        continue
+                    target = f'"{dataset_dir.name}"."{name}"'
+                    reader = f"read_parquet('{pattern}', union_by_name = true)"
+                    if self._table_exists(dataset_dir.name, name):
+                        cursor.execute(f"INSERT INTO {target} BY NAME SELECT * FROM {reader}")
+                    else:
+                        cursor.execute(f"CREATE TABLE {target} AS SELECT * FROM {reader}")
+                    key = f"{dataset_dir.name}.{name}"
+                    loaded[key] = cursor.execute(f"SELECT count(*) FROM {target}").fetchone()[0]
+                    self._touch(key.lower())
+        finally:
+            cursor.close()
+        logger.info(f"Loaded {len(loaded)} local BigQuery tables from {data_dir}", extra={"tables": loaded})
+        return loaded
+
+    def create_tables_from_schemas(self, dataset: str, schema_dir: str, tables: Optional[Sequence[str]] = None) -> List[str]:
+        """Create tables in dataset from BigQuery JSON schema files ({table}.json)."""
+        created = []
+        for schema_file in sorted(Path(schema_dir).glob("*.json")):
+            if tables is not None and schema_file.stem not in tables:
+                continue
+            with open(schema_file) as f:
+                fields = json.load(f)
+            if not isinstance(fields, list):
+                continue
+            schema = [SchemaField.from_api_repr(field) for field in fields]
+            self.create_table(bigquery.Table(f"{self.project}.{dataset}.{schema_file.stem}", schema=schema), exists_ok=True)
+            created.append(schema_file.stem)
+        return created
+
+    def load_procedures(self, procedure_dir: str) -> List[str]:
+        """Register every CREATE PROCEDURE file under procedure_dir ({project_id} substituted)."""
+        registered = []
+        for sql_file in sorted(Path(procedure_dir).rglob("*.sql")):
+            sql = sql_file.read_text().replace("{project_id}", self.project)
+            if not re.search(r"\bCREATE\s+(OR\s+REPLACE\s+)?PROCEDURE\b", sql, re.IGNORECASE):
+                continue
+            self.query(sql)
+            registered.append(sql_file.stem)
+        return registered
+
+    def export_parquet(self, out_dir: str, datasets: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Write tables to {out_dir}/{dataset}/{table}.parquet (the fixture layout)."""
+        exported: Dict[str, int] = {}
+        cursor = self._cursor()
+        try:
+            rows = cursor.execute(
+                "SELECT table_schema, table_name FROM information_schema.tables "
+                "WHERE table_type = 'BASE TABLE' AND table_catalog = current_database() ORDER BY 1, 2"
+            ).fetchall()
+            for dataset, name in rows:
+                if dataset == "main" or (datasets is not None and dataset not in datasets):
+                    continue
+                path = Path(out_dir) / dataset / f"{name}.parquet"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                cursor.execute(f"COPY \"{dataset}\".\"{name}\" TO '{path}' (FORMAT PARQUET)")
+                exported[f"{dataset}.{name}"] = cursor.execute(f'SELECT count(*) FROM "{dataset}"."{name}"').fetchone()[0]
+        finally:
+            cursor.close()
+        return exported
+
+
+def _truncates(job_config: Optional[Any]) -> bool:
+    return getattr(job_config, "write_disposition", None) == bigquery.WriteDisposition.WRITE_TRUNCATE
+
+
+# ============================================
+# Shared Instance
+# ============================================
+
+_local_client: Optional[LocalBigQueryClient] = None
+_local_client_lock = threading.Lock()
+
+
+def get_local_bigquery_client() -> LocalBigQueryClient:
+    """
+    Shared DuckDB stand-in used by BigQueryClient when
+    settings.bigquery_backend == "duckdb".
+
+    One instance per process so every BigQueryClient sees the same tables.
+    """
+    global _local_client
+
+    if _local_client is not None:
+        return _local_client
+
+    with _local_client_lock:
+        if _local_client is None:
+            _local_client = LocalBigQueryClient(
+                project=settings.gcp_project_id,
+                location=settings.bigquery_location,
+                database=settings.local_bigquery_database,
+                data_dir=settings.local_bigquery_data_dir,
+            )
+            logger.info(
+                "Initialized local BigQuery stand-in (duckdb)",
+                extra={"database": settings.local_bigquery_database, "data_dir": settings.local_bigquery_data_dir},
+            )
+    return _local_client
+
+
+def reset_local_bigquery_client() -> None:
+    """Close and drop the shared stand-in (tests)."""
+    global _local_client
+
+    with _local_client_lock:
+        if _local_client is not None:
+            _local_client.close()
+        _local_client = None
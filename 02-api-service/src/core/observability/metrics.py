@@ -1,6 +1,7 @@
 """
 Prometheus Metrics - Pipeline Observability
-Tracks pipeline executions, durations, active pipelines, and quota utilization.
+Tracks pipeline executions, durations, active pipelines, quota utilization,
+and BigQuery write buffer flushes.
 """
 
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest
@@ -46,6 +47,31 @@ quota_utilization = Gauge(
     registry=metrics_registry
 )
 
+# Counter: Rows flushed by the BigQuery write buffer per table and outcome
+write_buffer_rows_total = Counter(
+    'bq_write_buffer_rows_total',
+    'Rows flushed by the BigQuery write buffer',
+    ['table', 'status'],
+    registry=metrics_registry
+)
+
+# Histogram: BigQuery write buffer flush duration in seconds
+write_buffer_flush_seconds = Histogram(
+    'bq_write_buffer_flush_seconds',
+    'BigQuery write buffer flush duration in seconds',
+    ['table', 'trigger', 'status'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=metrics_registry
+)
+
+# Gauge: Rows buffered (queued or in flight) per table
+write_buffer_pending_rows = Gauge(
+    'bq_write_buffer_pending_rows',
+    'Rows waiting in the BigQuery write buffer',
+    ['table'],
+    registry=metrics_registry
+)
+
 # ====================
 # Helper Functions
 # ====================
@@ -122,6 +148,45 @@ def set_quota_utilization(
     ).set(percentage)
 
 
+def _table_label(table_id: str) -> str:
+    """Table name without project/dataset, keeping label cardinality low."""
+    return table_id.rsplit(".", 1)[-1]
+
+
+def observe_write_buffer_flush(
+    table_id: str,
+    trigger: str,
+    success: bool,
+    row_count: int,
+    duration_seconds: float
+) -> None:
+    """
+    Record one BigQuery write buffer flush.
+
+    Args:
+        table_id: Destination table ID
+        trigger: What caused the flush (size, time, forced)
+        success: Whether the write succeeded
+        row_count: Rows in the flushed batch
+        duration_seconds: Duration of the write in seconds
+    """
+    status = "success" if success else "failure"
+    table = _table_label(table_id)
+    write_buffer_rows_total.labels(table=table, status=status).inc(row_count)
+    write_buffer_flush_seconds.labels(table=table, trigger=trigger, status=status).observe(duration_seconds)
+
+
+def set_write_buffer_pending_rows(table_id: str, count: int) -> None:
+    """
+    Set the number of rows buffered for a table.
+
+    Args:
+        table_id: Destination table ID
+        count: Queued plus in-flight rows
+    """
+    write_buffer_pending_rows.labels(table=_table_label(table_id)).set(count)
+
+
 def get_metrics() -> bytes:
     """
     Generate Prometheus metrics in text format.
@@ -6,6 +6,15 @@ Provides common cache, validation, date utilities, and base classes for dashboar
 
 from src.core.services._shared.cache import LRUCache, CacheEntry, CacheConfig, create_cache
 from src.core.services._shared.validation import validate_org_slug, ORG_SLUG_PATTERN
+from src.core.services._shared.pagination import (
+    InvalidCursorError,
+    KeysetSpec,
+    SortKey,
+    split_page,
+    get_row_count_cache,
+    reset_row_count_cache,
+    resolve_total,
+)
 from src.core.services._shared.export_import import (
     SyncAction,
     SyncChange,
@@ -54,6 +63,14 @@ __all__ = [
     # Validation
     "validate_org_slug",
     "ORG_SLUG_PATTERN",
+    # Keyset pagination
+    "InvalidCursorError",
+    "KeysetSpec",
+    "SortKey",
+    "split_page",
+    "get_row_count_cache",
+    "reset_row_count_cache",
+    "resolve_total",
     # Export/Import Framework
     "SyncAction",
     "SyncChange",
@@ -0,0 +1,195 @@
+"""
+Keyset Pagination
+
+Opaque cursors and cached row counters for paginated BigQuery reads.
+
+LIMIT/OFFSET makes BigQuery read and discard every row before the page, so
+deep pages get slower, and a COUNT(*) per page doubles the number of jobs.
+Keyset pagination seeks past the last row of the previous page instead:
+
+    WHERE start_time <= @cursor_start_time
+      AND (start_time < @cursor_start_time
+           OR (start_time = @cursor_start_time
+               AND pipeline_logging_id < @cursor_pipeline_logging_id))
+
+The standalone bound on the leading (partition) column lets BigQuery prune
+partitions; the OR chain breaks ties on the unique trailing column.
+
+Cursors are URL-safe base64 JSON bound to the endpoint (kind) and a hash of
+the active filters, so a cursor cannot be replayed against another query.
+Totals come from a TTL cache of COUNT(*) results keyed by the same hash.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from google.cloud import bigquery
+
+from src.core.services._shared.cache import LRUCache, create_cache
+
+logger = logging.getLogger(__name__)
+
+# TTL for cached COUNT(*) results (approximate totals)
+ROW_COUNT_TTL_SECONDS = 300
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or does not match the query."""
+
+
+# ============================================
+# Keyset Specification
+# ============================================
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a keyset sort (BigQuery parameter type: TIMESTAMP, INT64, STRING)."""
+    column: str
+    param_type: str
+
+
+@dataclass(frozen=True)
+class KeysetSpec:
+    """
+    Sort order of a paginated endpoint.
+
+    The last key must be unique so the order is total. When the first key is
+    the table's partition column, the seek predicate prunes partitions.
+    """
+    kind: str
+    keys: Tuple[SortKey, ...]
+    descending: bool = True
+
+    @property
+    def order_by(self) -> str:
+        """ORDER BY clause body matching the seek predicate."""
+        direction = "DESC" if self.descending else "ASC"
+        return ", ".join(f"{key.column} {direction}" for key in self.keys)
+
+    def filter_signature(self, filters: Mapping[str, Any]) -> str:
+        """Deterministic hash of the active filters (cursor binding and count cache key)."""
+        payload = json.dumps({"kind": self.kind, **filters}, sort_keys=True, default=str)
+        return hashlib.md5(payload.encode()).hexdigest()[:16]
+
+    def encode_cursor(self, row: Mapping[str, Any], signature: str) -> str:
+        """Build the cursor pointing after ``row``."""
+        values = []
+        for key in self.keys:
+            value = row[key.column]
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        payload = json.dumps({"k": self.kind, "f": signature, "v": values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str, signature: str) -> List[Any]:
+        """
+        Decode a cursor into sort key values.
+
+        Raises:
+            InvalidCursorError: Malformed cursor, or issued for another endpoint or filter set
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            kind, cursor_signature, raw_values = payload["k"], payload["f"], payload["v"]
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursorError("Malformed pagination cursor") from e
+
+        if kind != self.kind or cursor_signature != signature:
+            raise InvalidCursorError("Pagination cursor does not match this query; restart from the first page")
+        if not isinstance(raw_values, list) or len(raw_values) != len(self.keys):
+            raise InvalidCursorError("Malformed pagination cursor")
+
+        values = []
+        try:
+            for key, raw in zip(self.keys, raw_values):
+                if key.param_type == "TIMESTAMP":
+                    values.append(datetime.fromisoformat(raw))
+                elif key.param_type == "INT64":
+                    values.append(int(raw))
+                else:
+                    values.append(str(raw))
+        except (TypeError, ValueError) as e:
+            raise InvalidCursorError("Malformed pagination cursor") from e
+        return values
+
+    def seek(self, values: Sequence[Any]) -> Tuple[str, List[bigquery.ScalarQueryParameter]]:
+        """
+        Build the WHERE fragment selecting rows after the cursor values.
+
+        Returns:
+            (sql_condition, query_parameters)
+        """
+        op = "<" if self.descending else ">"
+        bound = "<=" if self.descending else ">="
+        names = [f"cursor_{key.column}" for key in self.keys]
+        params = [
+            bigquery.ScalarQueryParameter(name, key.param_type, value)
+            for name, key, value in zip(names, self.keys, values)
+        ]
+
+        branches = []
+        for i, key in enumerate(self.keys):
+            equal_prefix = [f"{self.keys[j].column} = @{names[j]}" for j in range(i)]
+            branches.append(" AND ".join(equal_prefix + [f"{key.column} {op} @{names[i]}"]))
+        ordered = " OR ".join(f"({branch})" for branch in branches)
+
+        # Standalone range on the leading column is what BigQuery uses for partition pruning
+        condition = f"{self.keys[0].column} {bound} @{names[0]} AND ({ordered})"
+        return condition, params
+
+
+def split_page(rows: List[Any], limit: int) -> Tuple[List[Any], bool]:
+    """Split a LIMIT limit + 1 result into (page, has_more)."""
+    return rows[:limit], len(rows) > limit
+
+
+# ============================================
+# Cached Row Counters
+# ============================================
+
+_row_count_cache: Optional[LRUCache] = None
+
+
+def get_row_count_cache() -> LRUCache:
+    """Get the shared COUNT(*) cache."""
+    global _row_count_cache
+    if _row_count_cache is None:
+        _row_count_cache = create_cache(
+            "PAGINATION_COUNT", max_size=5000, default_ttl=ROW_COUNT_TTL_SECONDS, max_memory_mb=16
+        )
+    return _row_count_cache
+
+
+def reset_row_count_cache() -> None:
+    """Drop cached counts (tests)."""
+    global _row_count_cache
+    _row_count_cache = None
+
+
+def resolve_total(signature: str, count_fn: Callable[[], int], estimate: bool) -> Tuple[int, bool]:
+    """
+    Resolve the total row count for a filter set.
+
+    Args:
+        signature: Filter signature from KeysetSpec.filter_signature
+        count_fn: Runs the exact COUNT(*) query
+        estimate: Serve a cached count (up to ROW_COUNT_TTL_SECONDS old) when available
+
+    Returns:
+        (total, is_estimate)
+    """
+    cache = get_row_count_cache()
+    if estimate:
+        cached = cache.get(signature)
+        if cached is not None:
+            return cached["total"], True
+
+    total = count_fn()
+    cache.set(signature, {"total": total})
+    return total, False
@@ -1,9 +1,10 @@
 """Budget Read Service — Variance calculation and budget analytics."""
 
 import os
+import asyncio
 import logging
 import threading
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 import polars as pl
 from google.cloud import bigquery
@@ -19,30 +20,18 @@ from src.core.services.budget_read.models import (
     ProviderBreakdownItem,
     ProviderBreakdownResponse,
 )
-from src.core.services.budget_read.aggregations import (
-    sum_by_category,
+from src.core.services.budget_read.variance import (
+    actuals_by_budget,
+    budget_fingerprint,
 )
+from src.core.services._shared import create_cache
+from src.lib.costs.constants import COST_CATEGORY_COLUMN, resolve_category_filter
 
 logger = logging.getLogger(__name__)
 
-# Cloud provider names for category filtering (matches cost_read/service.py)
-CLOUD_PROVIDERS = ["gcp", "aws", "azure", "google", "amazon", "microsoft", "oci", "oracle"]
-GENAI_PROVIDERS = [
-    "openai", "anthropic", "google ai", "cohere", "mistral",
-    "gemini", "claude", "azure openai", "aws bedrock", "vertex ai",
-]
-
-# Map FOCUS ServiceProviderName → budget provider short name
-PROVIDER_NAME_MAP = {
-    "google cloud": "gcp",
-    "google cloud platform": "gcp",
-    "amazon web services": "aws",
-    "microsoft azure": "azure",
-    "microsoft": "azure",
-    "oracle": "oci",
-    "oracle cloud": "oci",
-    "google ai": "gemini",
-}
+# Cost frames and per-budget actuals are keyed by the cost table's
+# last-modified time, so the TTL only bounds memory, not staleness.
+BUDGET_CACHE_TTL_SECONDS = 900
 
 
 class BudgetReadService:
@@ -56,25 +45,35 @@ class BudgetReadService:
         self.dataset_id = dataset_id
         self.budgets_table = f"{project_id}.{dataset_id}.org_budgets"
         self.allocations_table = f"{project_id}.{dataset_id}.org_budget_allocations"
+        self._cache = create_cache("BUDGET", max_size=200, default_ttl=BUDGET_CACHE_TTL_SECONDS)
 
-    def _filter_by_entity(self, costs_df: pl.DataFrame, entity_id: str) -> pl.DataFrame:
-        """Filter costs for a hierarchy entity using boundary-safe matching.
+    def invalidate_org_cache(self, org_slug: str) -> int:
+        """Drop cached cost frames and actuals for an org."""
+        return self._cache.invalidate_org(org_slug)
 
-        Matches:
-        - Direct assignment: x_hierarchy_entity_id == entity_id
-        - Ancestor rollup: entity_id appears as a complete path segment
-          (e.g., /DEPT-1/ or ending with /DEPT-1)
+    async def _run_query(self, query: str, params: list) -> List[Dict[str, Any]]:
+        """Run a parameterized query off the event loop and return dict rows."""
+        loop = asyncio.get_event_loop()
 
-        Uses literal=True to prevent regex injection from entity IDs
-        containing special characters.
-        """
-        if costs_df.is_empty():
-            return costs_df
-        return costs_df.filter(
-            (pl.col("x_hierarchy_entity_id") == entity_id) |
-            (pl.col("x_hierarchy_path").str.contains(f"/{entity_id}/", literal=True)) |
-            (pl.col("x_hierarchy_path").str.ends_with(f"/{entity_id}"))
-        )
+        def run_query():
+            job_config = bigquery.QueryJobConfig(query_parameters=params)
+            return [dict(row) for row in self.client.query(query, job_config=job_config).result()]
+
+        return await loop.run_in_executor(None, run_query)
+
+    async def _cost_data_version(self, org_slug: str) -> Optional[str]:
+        """Last-modified time of the org's cost table (None disables caching)."""
+        loop = asyncio.get_event_loop()
+
+        def get_version():
+            modified = self.client.get_table(self._get_cost_table(org_slug)).modified
+            return modified.isoformat() if modified else None
+
+        try:
+            return await loop.run_in_executor(None, get_version)
+        except Exception as e:
+            logger.debug(f"Cost table version unavailable for {org_slug}: {e}")
+            return None
 
     def _get_cost_table(self, org_slug: str) -> str:
         """Get the FOCUS 1.3 cost table for an org."""
@@ -88,94 +87,105 @@ class BudgetReadService:
         period_start: str,
         period_end: str,
         category: Optional[str] = None,
+        data_version: Optional[str] = None,
     ) -> pl.DataFrame:
         """Fetch actual costs from cost_data_standard_1_3 for the given period.
 
+        Costs are summed per day, provider, hierarchy entity and category in
+        BigQuery, so the frame scales with distinct keys rather than line items.
+
         Returns DataFrame with columns: charge_date, BilledCost, ServiceProviderName,
         x_hierarchy_entity_id, x_hierarchy_path, category
         """
         cost_table = self._get_cost_table(org_slug)
 
-        # Build category-specific SQL
+        # x_cost_category is materialised at ingestion (first clustering column)
         category_where = ""
         query_params = [
             bigquery.ScalarQueryParameter("period_start", "DATE", period_start),
             bigquery.ScalarQueryParameter("period_end", "DATE", period_end),
         ]
 
-        if category:
-            cat_lower = category.lower()
-            if cat_lower in ("subscription", "saas"):
-                category_where = "AND x_source_system = 'subscription_costs_daily'"
-            elif cat_lower == "cloud":
-                category_where = (
-                    "AND (LOWER(ServiceProviderName) IN UNNEST(@cloud_providers) OR "
-                    "LOWER(x_source_system) LIKE '%cloud%' OR "
-                    "LOWER(x_source_system) LIKE '%gcp%' OR "
-                    "LOWER(x_source_system) LIKE '%aws%' OR "
-                    "LOWER(x_source_system) LIKE '%azure%')"
-                )
-                query_params.append(
-                    bigquery.ArrayQueryParameter("cloud_providers", "STRING", CLOUD_PROVIDERS)
-                )
-            elif cat_lower == "genai":
-                category_where = (
-                    "AND ((LOWER(ServiceProviderName) IN UNNEST(@genai_providers) OR "
-                    "LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning') OR "
-                    "LOWER(x_source_system) LIKE '%genai%' OR "
-                    "LOWER(x_source_system) LIKE '%llm%') AND "
-                    "COALESCE(x_source_system, '') != 'subscription_costs_daily')"
-                )
-                query_params.append(
-                    bigquery.ArrayQueryParameter("genai_providers", "STRING", GENAI_PROVIDERS)
-                )
-
-        # Determine category label in the query
-        category_case = """
-            CASE
-                WHEN x_source_system = 'subscription_costs_daily' THEN 'subscription'
-                WHEN LOWER(ServiceProviderName) IN ('gcp', 'aws', 'azure', 'google', 'amazon', 'microsoft', 'oci', 'oracle')
-                     OR LOWER(x_source_system) LIKE '%cloud%' THEN 'cloud'
-                WHEN LOWER(ServiceProviderName) IN ('openai', 'anthropic', 'gemini', 'claude', 'cohere', 'mistral')
-                     OR LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning') THEN 'genai'
-                ELSE 'cloud'
-            END AS category
-        """
+        cost_category = resolve_category_filter(category)
+        if cost_category:
+            category_where = f"AND {COST_CATEGORY_COLUMN} = @cost_category"
+            query_params.append(
+                bigquery.ScalarQueryParameter("cost_category", "STRING", cost_category)
+            )
 
         query = f"""
             SELECT
                 CAST(ChargePeriodStart AS DATE) as charge_date,
-                COALESCE(BilledCost, 0) as BilledCost,
+                CAST(SUM(COALESCE(BilledCost, 0)) AS FLOAT64) as BilledCost,
                 COALESCE(ServiceProviderName, 'Unknown') as ServiceProviderName,
                 COALESCE(x_hierarchy_entity_id, 'unassigned') as x_hierarchy_entity_id,
                 COALESCE(x_hierarchy_path, '') as x_hierarchy_path,
-                {category_case}
+                COALESCE({COST_CATEGORY_COLUMN}, 'other') AS category
             FROM `{cost_table}`
             WHERE CAST(ChargePeriodStart AS DATE) >= @period_start
             AND CAST(ChargePeriodStart AS DATE) <= @period_end
             {category_where}
+            GROUP BY 1, 3, 4, 5, 6
         """
 
-        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
-
         empty_schema = {
-            "charge_date": [],
-            "BilledCost": [],
-            "ServiceProviderName": [],
-            "x_hierarchy_entity_id": [],
-            "x_hierarchy_path": [],
-            "category": [],
+            "charge_date": pl.Date,
+            "BilledCost": pl.Float64,
+            "ServiceProviderName": pl.Utf8,
+            "x_hierarchy_entity_id": pl.Utf8,
+            "x_hierarchy_path": pl.Utf8,
+            "category": pl.Utf8,
         }
 
+        version = data_version or await self._cost_data_version(org_slug)
+        cache_key = f"{org_slug}:costs:{period_start}:{period_end}:{cost_category or 'all'}:{version}"
+        if version:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_event_loop()
+
+        def run_query():
+            job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+            return pl.from_arrow(self.client.query(query, job_config=job_config).result().to_arrow())
+
         try:
-            results = self.client.query(query, job_config=job_config).result()
-            rows = [dict(row) for row in results]
-            if not rows:
-                return pl.DataFrame(empty_schema)
-            return pl.DataFrame(rows)
+            df = await loop.run_in_executor(None, run_query)
         except Exception as e:
             logger.warning(f"Failed to fetch costs for {org_slug}: {e}")
-            return pl.DataFrame(empty_schema)
+            return pl.DataFrame(schema=empty_schema)
+
+        if df.is_empty():
+            df = pl.DataFrame(schema=empty_schema)
+        if version:
+            self._cache.set(cache_key, df)
+        return df
+
+    async def _budget_actuals(self, org_slug: str, budgets: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Actual spend per budget_id, computed in one pass over the org's costs.
+
+        Results are cached per org, cost data version and budget fingerprint, so
+        repeated dashboard loads skip both the cost scan and the join.
+        """
+        if not budgets:
+            return {}
+
+        version = await self._cost_data_version(org_slug)
+        cache_key = f"{org_slug}:actuals:{version}:{budget_fingerprint(budgets)}"
+        if version:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        min_start = min(str(b["period_start"]) for b in budgets)
+        max_end = max(str(b["period_end"]) for b in budgets)
+        costs_df = await self._fetch_actual_costs(org_slug, min_start, max_end, data_version=version)
+        actuals = actuals_by_budget(costs_df, budgets)
+
+        if version:
+            self._cache.set(cache_key, actuals)
+        return actuals
 
     def _apply_period_filters(
         self,
@@ -226,10 +236,9 @@ class BudgetReadService:
         query = self._apply_period_filters(query, params, period_type, period_start, period_end)
 
         query += " ORDER BY created_at DESC"
-        job_config = bigquery.QueryJobConfig(query_parameters=params)
 
         try:
-            results = list(self.client.query(query, job_config=job_config).result())
+            results = await self._run_query(query, params)
         except Exception as e:
             logger.error(f"Failed to fetch budgets for summary: {e}")
             raise
@@ -248,10 +257,8 @@ class BudgetReadService:
                 budgets_total=0,
             )
 
-        # Fetch ALL actual costs once for the full date range (avoids N+1 queries)
-        min_start = min(str(b["period_start"]) for b in results)
-        max_end = max(str(b["period_end"]) for b in results)
-        all_costs_df = await self._fetch_actual_costs(org_slug, min_start, max_end)
+        # Fetch costs once for the full date range and match every budget in one join
+        actuals = await self._budget_actuals(org_slug, results)
 
         # Build variance items per budget
         items = []
@@ -259,48 +266,9 @@ class BudgetReadService:
         total_actual = 0.0
         budgets_over = 0
 
-        for row in results:
-            budget = dict(row)
-            budget_period_start = str(budget["period_start"])
-            budget_period_end = str(budget["period_end"])
-            budget_cat = budget["category"]
-
-            # Filter the pre-fetched costs for this budget's specific period and category
-            if not all_costs_df.is_empty():
-                costs_df = all_costs_df
-                # Filter by this budget's date range
-                from datetime import date as date_type
-                bp_start = date_type.fromisoformat(budget_period_start)
-                bp_end = date_type.fromisoformat(budget_period_end)
-                costs_df = costs_df.filter(
-                    (pl.col("charge_date") >= bp_start) &
-                    (pl.col("charge_date") <= bp_end)
-                )
-                if budget_cat and budget_cat != "total":
-                    costs_df = costs_df.filter(pl.col("category") == budget_cat)
-
-                # Filter by provider if budget targets a specific provider
-                budget_provider = budget.get("provider")
-                if budget_provider and not costs_df.is_empty():
-                    provider_lower = budget_provider.lower()
-                    # Build list of FOCUS names that map to this budget provider
-                    focus_names = [provider_lower]
-                    for focus_name, short_name in PROVIDER_NAME_MAP.items():
-                        if short_name == provider_lower:
-                            focus_names.append(focus_name)
-                    costs_df = costs_df.filter(
-                        pl.col("ServiceProviderName").str.to_lowercase().is_in(focus_names)
-                    )
-            else:
-                costs_df = all_costs_df
-
-            # Filter by hierarchy entity if budget is entity-specific
+        for budget in results:
             entity_id = budget["hierarchy_entity_id"]
-            if entity_id and not costs_df.is_empty():
-                entity_costs = self._filter_by_entity(costs_df, entity_id)
-                actual = float(entity_costs["BilledCost"].sum()) if not entity_costs.is_empty() else 0.0
-            else:
-                actual = float(costs_df["BilledCost"].sum()) if not costs_df.is_empty() else 0.0
+            actual = actuals.get(budget["budget_id"], 0.0)
 
             budget_amount = float(budget["budget_amount"])
             variance = budget_amount - actual
@@ -319,7 +287,7 @@ class BudgetReadService:
                 hierarchy_entity_name=budget["hierarchy_entity_name"],
                 hierarchy_path=budget.get("hierarchy_path"),
                 hierarchy_level_code=budget["hierarchy_level_code"],
-                category=budget_cat,
+                category=budget["category"],
                 budget_type=budget["budget_type"],
                 budget_amount=budget_amount,
                 actual_amount=round(actual, 2),
@@ -374,9 +342,8 @@ class BudgetReadService:
             params.append(bigquery.ScalarQueryParameter("root_entity_id", "STRING", root_entity_id))
         query = self._apply_period_filters(query, params, period_type, period_start, period_end)
         query += " ORDER BY hierarchy_level_code, hierarchy_entity_name"
-        job_config = bigquery.QueryJobConfig(query_parameters=params)
 
-        budgets = list(self.client.query(query, job_config=job_config).result())
+        budgets = await self._run_query(query, params)
 
         # Fetch allocations
         alloc_query = f"""
@@ -385,8 +352,7 @@ class BudgetReadService:
             WHERE org_slug = @org_slug
         """
         alloc_params = [bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug)]
-        alloc_config = bigquery.QueryJobConfig(query_parameters=alloc_params)
-        allocations = list(self.client.query(alloc_query, job_config=alloc_config).result())
+        allocations = await self._run_query(alloc_query, alloc_params)
 
         # Build parent→children map from allocations
         parent_to_children = {}
@@ -401,9 +367,7 @@ class BudgetReadService:
             child_to_parent[cid] = pid
 
         # Build budget lookup
-        budget_map = {}
-        for b in budgets:
-            budget_map[b["budget_id"]] = dict(b)
+        budget_map = {b["budget_id"]: b for b in budgets}
 
         # Build tree nodes (with cycle detection to prevent infinite recursion)
         def build_node(budget_id: str, actual_lookup: dict, _depth: int = 0, _visited: set | None = None) -> AllocationNode:
@@ -414,7 +378,7 @@ class BudgetReadService:
                 logger.warning(f"Circular allocation detected at budget {budget_id}, returning leaf node")
                 b = budget_map[budget_id]
                 entity_id = b["hierarchy_entity_id"]
-                actual = float(actual_lookup.get((entity_id, b["category"], b.get("provider"), str(b["period_start"]), str(b["period_end"])), 0.0))
+                actual = float(actual_lookup.get(budget_id, 0.0))
                 return AllocationNode(
                     budget_id=budget_id,
                     hierarchy_entity_id=entity_id,
@@ -441,7 +405,7 @@ class BudgetReadService:
                     child_nodes.append(build_node(ca["child_budget_id"], actual_lookup, _depth + 1, _visited))
 
             entity_id = b["hierarchy_entity_id"]
-            actual = float(actual_lookup.get((entity_id, b["category"], b.get("provider"), str(b["period_start"]), str(b["period_end"])), 0.0))
+            actual = float(actual_lookup.get(budget_id, 0.0))
             budget_amount = float(b["budget_amount"])
 
             return AllocationNode(
@@ -459,49 +423,8 @@ class BudgetReadService:
                 children=child_nodes,
             )
 
-        # Fetch actuals for all budgets period range — always get ALL categories
-        # so each budget can be matched to its own category
-        # actual_lookup keyed by (entity_id, category) for per-budget accuracy
-        actual_lookup: dict = {}
-        costs_df = pl.DataFrame()
-        if budgets:
-            min_start = min(str(b["period_start"]) for b in budgets)
-            max_end = max(str(b["period_end"]) for b in budgets)
-            costs_df = await self._fetch_actual_costs(org_slug, min_start, max_end)
-            if not costs_df.is_empty():
-                for b in budgets:
-                    eid = b["hierarchy_entity_id"]
-                    bcat = b["category"]
-                    bprov = b.get("provider")
-                    bp_start_str = str(b["period_start"])
-                    bp_end_str = str(b["period_end"])
-                    key = (eid, bcat, bprov, bp_start_str, bp_end_str)
-                    if key not in actual_lookup:
-                        # Filter costs to this budget's specific period
-                        # Use date objects (not strings) for Polars date comparison
-                        from datetime import date as _date
-                        bp_start_date = _date.fromisoformat(bp_start_str)
-                        bp_end_date = _date.fromisoformat(bp_end_str)
-                        period_costs = costs_df.filter(
-                            (pl.col("charge_date") >= bp_start_date) &
-                            (pl.col("charge_date") <= bp_end_date)
-                        ) if "charge_date" in costs_df.columns else costs_df
-                        # Match entity directly OR via hierarchy path (boundary-safe)
-                        entity_costs = self._filter_by_entity(period_costs, eid)
-                        # Scope to budget's category (unless "total" = all categories)
-                        if bcat and bcat != "total":
-                            entity_costs = entity_costs.filter(pl.col("category") == bcat)
-                        # Scope to budget's provider if set
-                        if bprov and not entity_costs.is_empty():
-                            provider_lower = bprov.lower()
-                            focus_names = [provider_lower]
-                            for focus_name, short_name in PROVIDER_NAME_MAP.items():
-                                if short_name == provider_lower:
-                                    focus_names.append(focus_name)
-                            entity_costs = entity_costs.filter(
-                                pl.col("ServiceProviderName").str.to_lowercase().is_in(focus_names)
-                            )
-                        actual_lookup[key] = float(entity_costs["BilledCost"].sum()) if not entity_costs.is_empty() else 0.0
+        # Actuals for every budget (own entity subtree, category, provider, period)
+        actual_lookup = await self._budget_actuals(org_slug, budgets)
 
         # Find root nodes (budgets not allocated from a parent)
         roots = []
@@ -556,8 +479,7 @@ class BudgetReadService:
             GROUP BY category
             ORDER BY category
         """
-        job_config = bigquery.QueryJobConfig(query_parameters=params)
-        results = list(self.client.query(query, job_config=job_config).result())
+        results = await self._run_query(query, params)
 
         if not results:
             return CategoryBreakdownResponse(org_slug=org_slug, items=[], currency="USD")
@@ -568,30 +490,30 @@ class BudgetReadService:
             FROM `{self.budgets_table}`
             {where_clause}
         """
-        range_config = bigquery.QueryJobConfig(query_parameters=params)
-        range_result = list(self.client.query(range_query, job_config=range_config).result())
+        range_result = await self._run_query(range_query, params)
         min_start = str(range_result[0]["min_start"])
         max_end = str(range_result[0]["max_end"])
 
-        # Fetch all actuals (scoped to hierarchy entity if filter is set)
-        costs_df = await self._fetch_actual_costs(org_slug, min_start, max_end)
-        if hierarchy_entity_id and not costs_df.is_empty():
-            costs_df = self._filter_by_entity(costs_df, hierarchy_entity_id)
-        actual_by_cat = {}
-        if not costs_df.is_empty():
-            agg = sum_by_category(costs_df)
-            for row in agg.iter_rows(named=True):
-                actual_by_cat[row["category"]] = float(row["actual_amount"])
+        # One synthetic budget per category over the full range (scoped to the
+        # hierarchy entity subtree if the filter is set); "total" spans all categories
+        category_scopes = [
+            {
+                "budget_id": row["category"],
+                "hierarchy_entity_id": hierarchy_entity_id,
+                "category": row["category"],
+                "provider": None,
+                "period_start": min_start,
+                "period_end": max_end,
+            }
+            for row in results
+        ]
+        actual_by_cat = await self._budget_actuals(org_slug, category_scopes)
 
         items = []
         for row in results:
             cat = row["category"]
             budget_amt = float(row["budget_amount"])
-            # "total" category means all cost types combined
-            if cat == "total":
-                actual_amt = sum(float(v) for v in actual_by_cat.values())
-            else:
-                actual_amt = float(actual_by_cat.get(cat, 0.0))
+            actual_amt = float(actual_by_cat.get(cat, 0.0))
             variance = budget_amt - actual_amt
             variance_pct = (variance / budget_amt * 100) if budget_amt > 0 else 0
 
@@ -637,52 +559,21 @@ class BudgetReadService:
             params.append(bigquery.ScalarQueryParameter("hierarchy_entity_id", "STRING", hierarchy_entity_id))
         query = self._apply_period_filters(query, params, period_type, period_start, period_end)
         query += " ORDER BY provider"
-        job_config = bigquery.QueryJobConfig(query_parameters=params)
-        budgets = list(self.client.query(query, job_config=job_config).result())
+        budgets = await self._run_query(query, params)
 
         if not budgets:
             return ProviderBreakdownResponse(
                 org_slug=org_slug, category=category, items=[], currency="USD"
             )
 
-        # Get date range — fetch ALL costs (no category filter) for per-budget scoping
-        min_start = min(str(b["period_start"]) for b in budgets)
-        max_end = max(str(b["period_end"]) for b in budgets)
-        all_costs_df = await self._fetch_actual_costs(org_slug, min_start, max_end)
+        # Per-budget actuals scoped to entity + category + provider + period
+        actuals = await self._budget_actuals(org_slug, budgets)
 
         items = []
         for b in budgets:
             provider = b["provider"]
             budget_amt = float(b["budget_amount"])
-            entity_id = b["hierarchy_entity_id"]
-            bcat = b["category"]
-
-            # Compute per-budget actual: scoped to entity + category + provider
-            actual_amt = 0.0
-            if not all_costs_df.is_empty() and provider:
-                from datetime import date as date_type
-                bp_start = date_type.fromisoformat(str(b["period_start"]))
-                bp_end = date_type.fromisoformat(str(b["period_end"]))
-                costs_df = all_costs_df.filter(
-                    (pl.col("charge_date") >= bp_start) &
-                    (pl.col("charge_date") <= bp_end)
-                )
-                # Filter by entity (direct + boundary-safe hierarchy path rollup)
-                if entity_id:
-                    costs_df = self._filter_by_entity(costs_df, entity_id)
-                # Filter by category
-                if bcat and bcat != "total":
-                    costs_df = costs_df.filter(pl.col("category") == bcat)
-                # Filter by provider (normalize FOCUS names)
-                provider_lower = provider.lower()
-                focus_names = [provider_lower]
-                for focus_name, short_name in PROVIDER_NAME_MAP.items():
-                    if short_name == provider_lower:
-                        focus_names.append(focus_name)
-                costs_df = costs_df.filter(
-                    pl.col("ServiceProviderName").str.to_lowercase().is_in(focus_names)
-                )
-                actual_amt = float(costs_df["BilledCost"].sum()) if not costs_df.is_empty() else 0.0
+            actual_amt = actuals.get(b["budget_id"], 0.0)
 
             variance = budget_amt - actual_amt
             variance_pct = (variance / budget_amt * 100) if budget_amt > 0 else 0
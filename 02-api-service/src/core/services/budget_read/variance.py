@@ -0,0 +1,179 @@
+"""Vectorised budget-vs-actual engine.
+
+Computes actuals for every budget of an org in one Polars pass instead of
+filtering the cost frame once per budget:
+
+1. Each distinct (entity, path, provider, category) combination is expanded
+   to every key a budget can match on: every hierarchy entity on its path
+   (plus its own entity), its category plus "total", and its provider name
+   plus the budget short name from PROVIDER_NAME_MAP. "*" stands for "any" on
+   entity and provider. Key triples no budget asks for are dropped before
+   daily costs are joined in.
+2. A running total of BilledCost per (entity, category, provider) key is
+   built over charge_date.
+3. Budgets interval-join the running totals with two backward as-of joins:
+   actual = running(period_end) - running(period_start - 1 day).
+"""
+
+import hashlib
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+import polars as pl
+
+# Map FOCUS ServiceProviderName → budget provider short name
+PROVIDER_NAME_MAP = {
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+    "microsoft": "azure",
+    "oracle": "oci",
+    "oracle cloud": "oci",
+    "google ai": "gemini",
+}
+
+ANY = "*"
+TOTAL_CATEGORY = "total"
+KEY_COLUMNS = ["entity_key", "category_key", "provider_key"]
+DIMENSION_COLUMNS = ["x_hierarchy_entity_id", "x_hierarchy_path", "ServiceProviderName", "category"]
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def build_budget_frame(budgets: Iterable[Dict[str, Any]]) -> pl.DataFrame:
+    """Normalise budget rows to match keys and period bounds.
+
+    Expected keys: budget_id, hierarchy_entity_id, category, provider,
+    period_start, period_end. Empty entity/provider match any; an empty or
+    "total" category matches all categories.
+    """
+    rows = [
+        {
+            "budget_id": b["budget_id"],
+            "entity_key": b.get("hierarchy_entity_id") or ANY,
+            "category_key": b["category"] if b.get("category") and b["category"] != TOTAL_CATEGORY else TOTAL_CATEGORY,
+            "provider_key": b["provider"].lower() if b.get("provider") else ANY,
+            "period_start": _as_date(b["period_start"]),
+            "period_end": _as_date(b["period_end"]),
+        }
+        for b in budgets
+    ]
+    schema = {
+        "budget_id": pl.Utf8,
+        "entity_key": pl.Utf8,
+        "category_key": pl.Utf8,
+        "provider_key": pl.Utf8,
+        "period_start": pl.Date,
+        "period_end": pl.Date,
+    }
+    return pl.DataFrame(rows, schema=schema)
+
+
+def running_totals(costs_df: pl.DataFrame, budgets_df: pl.DataFrame) -> pl.DataFrame:
+    """Cumulative BilledCost per match key and charge_date.
+
+    Key expansion runs on the distinct (entity, path, provider, category)
+    combinations rather than on every cost row, and keeps only the key
+    triples some budget asks for.
+
+    Expected cost columns: charge_date, BilledCost, ServiceProviderName,
+    x_hierarchy_entity_id, x_hierarchy_path, category
+    Returns: entity_key, category_key, provider_key, charge_date, running_cost
+    """
+    provider = pl.col("ServiceProviderName").str.to_lowercase()
+
+    daily = (
+        costs_df.lazy()
+        .group_by(DIMENSION_COLUMNS + ["charge_date"])
+        .agg(pl.col("BilledCost").cast(pl.Float64).sum())
+        .collect()
+    )
+
+    dimension_keys = (
+        daily.lazy()
+        .select(DIMENSION_COLUMNS)
+        .unique()
+        .with_columns(
+            # Boundary-safe subtree match: own entity or any later path segment
+            pl.concat_list([
+                pl.col("x_hierarchy_entity_id"),
+                pl.col("x_hierarchy_path").str.split("/").list.slice(1),
+                pl.lit(ANY),
+            ]).list.unique().alias("entity_key"),
+            pl.concat_list([pl.col("category"), pl.lit(TOTAL_CATEGORY)]).list.unique().alias("category_key"),
+            pl.concat_list([provider, provider.replace(PROVIDER_NAME_MAP), pl.lit(ANY)]).list.unique().alias("provider_key"),
+        )
+        .explode("entity_key")
+        .explode("category_key")
+        .explode("provider_key")
+        .join(budgets_df.lazy().select(KEY_COLUMNS).unique(), on=KEY_COLUMNS, how="semi")
+    )
+
+    return (
+        daily.lazy()
+        .join(dimension_keys, on=DIMENSION_COLUMNS, how="inner")
+        .group_by(KEY_COLUMNS + ["charge_date"])
+        .agg(pl.col("BilledCost").sum())
+        .sort("charge_date")
+        .with_columns(pl.col("BilledCost").cum_sum().over(KEY_COLUMNS).alias("running_cost"))
+        .select(KEY_COLUMNS + ["charge_date", "running_cost"])
+        .collect()
+    )
+
+
+def compute_budget_actuals(costs_df: pl.DataFrame, budgets_df: pl.DataFrame) -> pl.DataFrame:
+    """Actual spend for every budget in one interval join.
+
+    Args:
+        costs_df: Daily cost rows (see running_totals)
+        budgets_df: Frame from build_budget_frame
+
+    Returns:
+        budget_id, actual_amount (0.0 for budgets without matching costs)
+    """
+    if budgets_df.is_empty():
+        return pl.DataFrame({"budget_id": [], "actual_amount": []}, schema={"budget_id": pl.Utf8, "actual_amount": pl.Float64})
+    if costs_df.is_empty():
+        return budgets_df.select("budget_id", pl.lit(0.0).alias("actual_amount"))
+
+    totals = running_totals(costs_df, budgets_df)
+
+    def running_at(bound: pl.Expr, alias: str) -> pl.DataFrame:
+        lookups = budgets_df.select(["budget_id"] + KEY_COLUMNS + [bound.alias("lookup_date")]).sort("lookup_date")
+        return (
+            lookups.join_asof(totals, left_on="lookup_date", right_on="charge_date", by=KEY_COLUMNS, strategy="backward")
+            .select("budget_id", pl.col("running_cost").fill_null(0.0).alias(alias))
+        )
+
+    at_end = running_at(pl.col("period_end"), "running_end")
+    before_start = running_at(pl.col("period_start") - pl.duration(days=1), "running_before")
+
+    return (
+        budgets_df.select("budget_id")
+        .join(at_end, on="budget_id", how="left")
+        .join(before_start, on="budget_id", how="left")
+        .select(
+            "budget_id",
+            (pl.col("running_end") - pl.col("running_before")).alias("actual_amount"),
+        )
+    )
+
+
+def actuals_by_budget(costs_df: pl.DataFrame, budgets: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Convenience wrapper returning {budget_id: actual_amount}."""
+    result = compute_budget_actuals(costs_df, build_budget_frame(budgets))
+    return dict(zip(result["budget_id"].to_list(), result["actual_amount"].to_list()))
+
+
+def budget_fingerprint(budgets: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """Stable hash of the budget fields that affect actuals (cache key component)."""
+    parts = sorted(
+        "|".join(str(b.get(field) or "") for field in ("budget_id", "hierarchy_entity_id", "category", "provider", "period_start", "period_end"))
+        for b in budgets
+    )
+    if not parts:
+        return None
+    return hashlib.md5("\n".join(parts).encode()).hexdigest()[:16]
@@ -57,6 +57,7 @@ from src.lib.costs import (
     CostFilterParams,
     apply_cost_filters,
 )
+from src.lib.costs.constants import COST_CATEGORY_COLUMN, resolve_category_filter
 
 logger = logging.getLogger(__name__)
 
@@ -217,35 +218,13 @@ class CostReadService:
             query_params.append(bigquery.ArrayQueryParameter("service_categories", "STRING", query.service_categories))
 
         # Push category filter to SQL WHERE for efficiency
-        # This reduces data transfer from BigQuery significantly
-        if category:
-            category_lower = category.lower()
-            if category_lower in ("subscription", "saas"):
-                # Filter to Subscription source system
-                where_conditions.append("x_source_system = 'subscription_costs_daily'")
-            elif category_lower == "cloud":
-                # Filter to cloud providers (case-insensitive)
-                cloud_providers = ["gcp", "aws", "azure", "google", "amazon", "microsoft", "oci", "oracle"]
-                where_conditions.append(
-                    "(LOWER(ServiceProviderName) IN UNNEST(@cloud_providers) OR "
-                    "LOWER(x_source_system) LIKE '%cloud%' OR "
-                    "LOWER(x_source_system) LIKE '%gcp%' OR "
-                    "LOWER(x_source_system) LIKE '%aws%' OR "
-                    "LOWER(x_source_system) LIKE '%azure%' OR "
-                    "LOWER(x_source_system) LIKE '%oci%')"
-                )
-                query_params.append(bigquery.ArrayQueryParameter("cloud_providers", "STRING", cloud_providers))
-            elif category_lower == "genai":
-                # Filter to GenAI providers (case-insensitive)
-                genai_providers = ["openai", "anthropic", "google ai", "cohere", "mistral", "gemini", "claude", "deepseek", "azure openai", "aws bedrock", "vertex ai"]
-                where_conditions.append(
-                    "((LOWER(ServiceProviderName) IN UNNEST(@genai_providers) OR "
-                    "LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning') OR "
-                    "LOWER(x_source_system) LIKE '%genai%' OR "
-                    "LOWER(x_source_system) LIKE '%llm%') AND "
-                    "COALESCE(x_source_system, '') != 'subscription_costs_daily')"
-                )
-                query_params.append(bigquery.ArrayQueryParameter("genai_providers", "STRING", genai_providers))
+        # x_cost_category is materialised at ingestion and is the first
+        # clustering column, so equality prunes blocks instead of scanning
+        # provider/source system columns for every row
+        cost_category = resolve_category_filter(category)
+        if cost_category:
+            where_conditions.append(f"{COST_CATEGORY_COLUMN} = @cost_category")
+            query_params.append(bigquery.ScalarQueryParameter("cost_category", "STRING", cost_category))
 
         # N-level hierarchy filters (NEW - v16.0+)
         # Use x_hierarchy_entity_id for exact match OR x_hierarchy_path for parent/child matching
@@ -300,6 +279,7 @@ class CostReadService:
             DATE(ChargePeriodStart) as ChargePeriodStart,
             DATE(ChargePeriodEnd) as ChargePeriodEnd,
             x_source_system,
+            x_cost_category,
             x_hierarchy_entity_id,
             x_hierarchy_entity_name,
             x_hierarchy_level_code,
@@ -320,40 +300,14 @@ class CostReadService:
         """
         Filter DataFrame by cost category (genai, cloud, subscription).
 
-        Uses same filtering logic as get_genai_costs, get_cloud_costs,
-        get_subscription_costs for consistency.
+        Uses the materialised x_cost_category column, same as the SQL
+        push-down in _fetch_cost_data.
         """
-        if not category or df.is_empty():
+        cost_category = resolve_category_filter(category)
+        if not cost_category or df.is_empty() or COST_CATEGORY_COLUMN not in df.columns:
             return df
 
-        category_lower = category.lower()
-
-        if category_lower in ("subscription", "saas"):
-            # Filter to Subscription source system
-            if "x_source_system" in df.columns:
-                df = df.filter(
-                    pl.col("x_source_system").fill_null("").eq("subscription_costs_daily")
-                )
-
-        elif category_lower == "cloud":
-            # Filter to cloud providers
-            cloud_providers = ["gcp", "aws", "azure", "google", "amazon", "microsoft", "oci", "oracle"]
-            if "ServiceProviderName" in df.columns:
-                provider_match = pl.col("ServiceProviderName").fill_null("").str.to_lowercase().is_in(cloud_providers)
-                source_match = pl.col("x_source_system").fill_null("").str.to_lowercase().str.contains("cloud|gcp|aws|azure|oci")
-                df = df.filter(provider_match | source_match)
-
-        elif category_lower == "genai":
-            # Filter to GenAI providers
-            genai_providers = ["openai", "anthropic", "google", "google ai", "cohere", "mistral", "gemini", "claude", "deepseek", "azure openai", "aws bedrock", "vertex ai"]
-            if "ServiceProviderName" in df.columns and "ServiceCategory" in df.columns:
-                provider_match = pl.col("ServiceProviderName").fill_null("").str.to_lowercase().is_in(genai_providers)
-                category_match = pl.col("ServiceCategory").fill_null("").str.to_lowercase().is_in(["genai", "llm", "ai and machine learning"])
-                source_match = pl.col("x_source_system").fill_null("").str.to_lowercase().str.contains("genai|llm|openai|anthropic|gemini|deepseek")
-                not_saas = pl.col("x_source_system").fill_null("").ne("subscription_costs_daily")
-                df = df.filter((provider_match | category_match | source_match) & not_saas)
-
-        return df
+        return df.filter(pl.col(COST_CATEGORY_COLUMN) == cost_category)
 
     # ==========================================================================
     # Core Methods (using CostQuery + lib/costs/)
@@ -990,7 +944,7 @@ class CostReadService:
 
         try:
             # Use SQL WHERE push-down for subscription filtering
-            # This filters at BigQuery level: x_source_system = 'subscription_costs_daily'
+            # This filters at BigQuery level: x_cost_category = 'subscription'
             df = await self._fetch_cost_data(query, category="subscription")
 
             if df.is_empty():
@@ -1090,7 +1044,7 @@ class CostReadService:
 
         try:
             # Use SQL WHERE push-down for cloud filtering
-            # This filters at BigQuery level: LOWER(ServiceProviderName) IN (gcp, aws, azure, ...)
+            # This filters at BigQuery level: x_cost_category = 'cloud'
             df = await self._fetch_cost_data(query, category="cloud")
 
             if df.is_empty():
@@ -1201,8 +1155,7 @@ class CostReadService:
 
         try:
             # Use SQL WHERE push-down for GenAI filtering
-            # This filters at BigQuery level: LOWER(ServiceProviderName) IN (openai, anthropic, ...)
-            # AND NOT x_source_system = 'subscription_costs_daily'
+            # This filters at BigQuery level: x_cost_category = 'genai'
             df = await self._fetch_cost_data(query, category="genai")
 
             if df.is_empty():
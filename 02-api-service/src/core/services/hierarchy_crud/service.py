@@ -24,6 +24,7 @@ import google.api_core.exceptions
 
 from src.core.engine.bq_client import BigQueryClient, get_bigquery_client
 from src.core.exceptions import BigQueryResourceNotFoundError
+from src.core.utils.bq_write_buffer import get_bq_write_buffer
 from src.app.config import get_settings
 from src.app.models.hierarchy_models import (
     CreateEntityRequest,
@@ -83,6 +84,8 @@ ORG_HIERARCHY_TABLE = "org_hierarchy"
 ORG_HIERARCHY_VIEW = "x_org_hierarchy"
 SAAS_SUBSCRIPTION_PLANS_TABLE = "subscription_plans"
 CENTRAL_DATASET = "organizations"
+# Rows per coalesced DML INSERT; keeps ~25 params per row under BigQuery's 10,000 limit
+DML_INSERT_BATCH_ROWS = 200
 
 
 # ==============================================================================
@@ -259,11 +262,13 @@ class HierarchyService:
         Uses standard SQL INSERT instead of streaming inserts to avoid the
         streaming buffer limitation where data cannot be updated/deleted for ~30 minutes.
         """
+        self._insert_rows_dml(self._get_central_table_ref(table_name), rows)
+
+    def _insert_rows_dml(self, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """DML INSERT of rows into a fully qualified table (write buffer writer)."""
         if not rows:
             return
 
-        table_id = self._get_central_table_ref(table_name)
-
         # Get column names from first row
         columns = list(rows[0].keys())
 
@@ -1025,7 +1030,13 @@ class HierarchyService:
         }
 
         try:
-            self._insert_to_central_table(ORG_HIERARCHY_TABLE, [row])
+            # Concurrent creates are coalesced into one multi-row DML INSERT
+            table_id = self._get_central_table_ref(ORG_HIERARCHY_TABLE)
+            write_buffer = get_bq_write_buffer()
+            write_buffer.register_table(
+                table_id, writer=self._insert_rows_dml, max_batch_rows=DML_INSERT_BATCH_ROWS
+            )
+            await write_buffer.write(table_id, [row])
         except Exception as e:
             logger.error(f"Failed to create entity: {e}")
             raise RuntimeError(f"Failed to create entity: {e}")
@@ -17,6 +17,7 @@ from google.cloud import bigquery
 from croniter import croniter
 
 from src.core.security.kms_encryption import encrypt_value, decrypt_value
+from src.core.utils.bq_write_buffer import default_row_writer, get_bq_write_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -1465,9 +1466,11 @@ class NotificationSettingsService:
         }
 
         try:
-            errors = self.client.insert_rows_json(self.alert_history_table, [row])
-            if errors:
-                raise Exception(f"BigQuery insert errors: {errors}")
+            # Evaluations of many alerts run concurrently; their history rows
+            # share one append
+            write_buffer = get_bq_write_buffer()
+            write_buffer.register_table(self.alert_history_table, writer=default_row_writer(self.client))
+            await write_buffer.write(self.alert_history_table, [row])
             return history_id
         except Exception as e:
             logger.error(f"Failed to record alert evaluation: {e}")
@@ -14,13 +14,14 @@ Usage:
     ))
 """
 
-from src.core.services.pipeline_read.models import PipelineQuery, PipelineResponse
+from src.core.services.pipeline_read.models import PipelineQuery, PipelineResponse, PIPELINE_RUNS_KEYSET
 from src.core.services.pipeline_read.service import PipelineReadService, get_pipeline_read_service
 from src.core.services._shared.date_utils import DatePeriod
 
 __all__ = [
     "PipelineQuery",
     "PipelineResponse",
+    "PIPELINE_RUNS_KEYSET",
     "PipelineReadService",
     "get_pipeline_read_service",
     "DatePeriod",
@@ -0,0 +1,399 @@
+"""
+Pipeline Log Export
+
+Streams pipeline run logs (runs, step logs, state transitions) as CSV, NDJSON
+or JSON without materialising a run in memory.
+
+- Step logs and transitions are read in keyset-paged BigQuery queries of
+  EXPORT_PAGE_SIZE rows, for up to EXPORT_RUN_BATCH runs at a time
+- Queries are bounded below by the earliest run start_time in the batch so
+  BigQuery prunes step/transition partitions
+- Rows are encoded as they arrive and flushed in ~64KB chunks, optionally
+  through an incremental gzip compressor
+
+Generators are synchronous (the BigQuery client blocks); StreamingResponse
+iterates them in a threadpool.
+"""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from google.cloud import bigquery
+
+from src.core.services._shared.pagination import KeysetSpec, SortKey
+from src.core.services.pipeline_read.models import PIPELINE_RUNS_KEYSET
+
+logger = logging.getLogger(__name__)
+
+# Rows per BigQuery page for step logs and transitions
+EXPORT_PAGE_SIZE = 1000
+# Runs whose steps/transitions are fetched in one query
+EXPORT_RUN_BATCH = 100
+# Upper bound on runs in one multi-run export
+MAX_EXPORT_RUNS = 10000
+# Flush threshold for encoded output
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = ("csv", "ndjson")
+FINAL_STEP_STATUSES = ("COMPLETED", "FAILED", "SKIPPED", "CANCELLED", "TIMEOUT")
+
+STEPS_EXPORT_KEYSET = KeysetSpec(
+    kind="export_steps",
+    keys=(
+        SortKey("pipeline_logging_id", "STRING"),
+        SortKey("step_index", "INT64"),
+        SortKey("step_logging_id", "STRING"),
+    ),
+    descending=False,
+)
+TRANSITIONS_EXPORT_KEYSET = KeysetSpec(
+    kind="export_transitions",
+    keys=(SortKey("transition_time", "TIMESTAMP"), SortKey("transition_id", "STRING")),
+    descending=False,
+)
+
+RUN_COLUMNS = """
+    pipeline_logging_id,
+    pipeline_id,
+    status,
+    trigger_type,
+    trigger_by,
+    start_time,
+    end_time,
+    CAST(duration_ms AS INT64) as duration_ms,
+    run_date,
+    error_message,
+    error_context,
+    parameters,
+    run_metadata"""
+
+STEP_COLUMNS = """
+    pipeline_logging_id,
+    step_logging_id,
+    step_name,
+    step_type,
+    step_index,
+    status,
+    start_time,
+    end_time,
+    CAST(duration_ms AS INT64) as duration_ms,
+    CAST(rows_processed AS INT64) as rows_processed,
+    error_message,
+    error_context,
+    metadata"""
+
+TRANSITION_COLUMNS = """
+    transition_id,
+    pipeline_logging_id,
+    step_logging_id,
+    entity_type,
+    from_state,
+    to_state,
+    transition_time,
+    error_type,
+    error_message,
+    CAST(retry_count AS INT64) as retry_count,
+    CAST(duration_in_state_ms AS INT64) as duration_in_state_ms,
+    metadata"""
+
+# Union layout for multi-run CSV exports (one row per run, step or transition)
+EXPORT_CSV_COLUMNS = [
+    "record_type", "pipeline_logging_id", "pipeline_id", "step_logging_id", "transition_id",
+    "step_index", "step_name", "step_type", "entity_type", "status", "from_state", "to_state",
+    "trigger_type", "trigger_by", "start_time", "end_time", "transition_time", "duration_ms",
+    "rows_processed", "error_type", "error_message", "error_context",
+]
+
+JSON_FIELDS = ("parameters", "run_metadata", "metadata", "error_context")
+
+
+def _parse_json_fields(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode JSON string columns, keeping unparsable values as {"raw": ...}."""
+    record = dict(row)
+    for field in JSON_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            try:
+                record[field] = json.loads(value)
+            except ValueError:
+                record[field] = {"raw": value}
+    return record
+
+
+def _csv_line(values: Iterable[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(["" if value is None else value for value in values])
+    return buffer.getvalue()
+
+
+def encode_stream(chunks: Iterable[str], compress: bool = False) -> Iterator[bytes]:
+    """
+    Encode text chunks to UTF-8 bytes, batching to EXPORT_CHUNK_BYTES.
+
+    Args:
+        chunks: Text fragments in output order
+        compress: Gzip the stream incrementally
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending: List[bytes] = []
+    pending_size = 0
+
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        if compressor is not None:
+            data = compressor.compress(data)
+        if not data:
+            continue
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= EXPORT_CHUNK_BYTES:
+            yield b"".join(pending)
+            pending, pending_size = [], 0
+
+    if compressor is not None:
+        pending.append(compressor.flush())
+    if pending:
+        yield b"".join(pending)
+
+
+class PipelineLogExporter:
+    """
+    Streams pipeline logs for one run, a list of runs or a date range.
+
+    Args:
+        bq_client: BigQueryClient (query() yields row dicts)
+        project_id: GCP project holding the organizations dataset
+        page_size: Rows per step/transition query
+        run_batch_size: Runs per batch (also the run page size)
+    """
+
+    def __init__(
+        self,
+        bq_client,
+        project_id: str,
+        page_size: int = EXPORT_PAGE_SIZE,
+        run_batch_size: int = EXPORT_RUN_BATCH,
+    ):
+        self.bq_client = bq_client
+        self.page_size = page_size
+        self.run_batch_size = run_batch_size
+        self._dataset = f"{project_id}.organizations"
+
+    # ============================================
+    # Paged Readers
+    # ============================================
+
+    def fetch_run(self, org_slug: str, pipeline_logging_id: str) -> Optional[Dict[str, Any]]:
+        """Load one run, or None if it does not exist for the org."""
+        rows = list(self.bq_client.query(
+            f"""
+            SELECT {RUN_COLUMNS}
+            FROM `{self._dataset}.org_meta_pipeline_runs`
+            WHERE org_slug = @org_slug AND pipeline_logging_id = @pipeline_logging_id
+            """,
+            parameters=[
+                bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
+                bigquery.ScalarQueryParameter("pipeline_logging_id", "STRING", pipeline_logging_id),
+            ],
+        ))
+        return rows[0] if rows else None
+
+    def iter_run_batches(
+        self,
+        org_slug: str,
+        pipeline_logging_ids: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        max_runs: int = MAX_EXPORT_RUNS,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of runs (newest first) matching the IDs and/or start_time date range."""
+        where = ["org_slug = @org_slug"]
+        parameters = [bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug)]
+        if pipeline_logging_ids:
+            where.append("pipeline_logging_id IN UNNEST(@pipeline_logging_ids)")
+            parameters.append(bigquery.ArrayQueryParameter("pipeline_logging_ids", "STRING", pipeline_logging_ids))
+        if start_date:
+            where.append("start_time >= TIMESTAMP(@start_date)")
+            parameters.append(bigquery.ScalarQueryParameter("start_date", "DATE", start_date))
+        if end_date:
+            where.append("start_time < TIMESTAMP(DATE_ADD(@end_date, INTERVAL 1 DAY))")
+            parameters.append(bigquery.ScalarQueryParameter("end_date", "DATE", end_date))
+
+        exported = 0
+        for page in self._keyset_pages(
+            "org_meta_pipeline_runs", RUN_COLUMNS, PIPELINE_RUNS_KEYSET, where, parameters, self.run_batch_size
+        ):
+            page = page[:max_runs - exported]
+            exported += len(page)
+            yield page
+            if exported >= max_runs:
+                logger.warning(f"Pipeline log export for {org_slug} truncated at {max_runs} runs")
+                return
+
+    def iter_steps(self, org_slug: str, runs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield final-status step logs for the runs, grouped by run in step order."""
+        where, parameters = self._run_scope(org_slug, runs, "start_time")
+        where.append("status IN UNNEST(@final_statuses)")
+        parameters.append(bigquery.ArrayQueryParameter("final_statuses", "STRING", list(FINAL_STEP_STATUSES)))
+        for page in self._keyset_pages(
+            "org_meta_step_logs", STEP_COLUMNS, STEPS_EXPORT_KEYSET, where, parameters, self.page_size
+        ):
+            yield from page
+
+    def iter_transitions(self, org_slug: str, runs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield state transitions for the runs in time order."""
+        where, parameters = self._run_scope(org_slug, runs, "transition_time")
+        for page in self._keyset_pages(
+            "org_meta_state_transitions", TRANSITION_COLUMNS, TRANSITIONS_EXPORT_KEYSET, where, parameters, self.page_size
+        ):
+            yield from page
+
+    def _run_scope(self, org_slug: str, runs: List[Dict[str, Any]], time_column: str) -> tuple:
+        """Filter to the runs' IDs, bounded below by their earliest start for partition pruning."""
+        where = ["org_slug = @org_slug", "pipeline_logging_id IN UNNEST(@pipeline_logging_ids)"]
+        parameters = [
+            bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
+            bigquery.ArrayQueryParameter(
+                "pipeline_logging_ids", "STRING", [run["pipeline_logging_id"] for run in runs]
+            ),
+        ]
+        run_starts = [run["start_time"] for run in runs if run.get("start_time")]
+        if run_starts:
+            # One day of slack: PENDING transitions can precede the run's start_time
+            where.append(f"{time_column} >= TIMESTAMP_SUB(@min_run_start, INTERVAL 1 DAY)")
+            parameters.append(bigquery.ScalarQueryParameter("min_run_start", "TIMESTAMP", min(run_starts)))
+        return where, parameters
+
+    def _keyset_pages(
+        self,
+        table: str,
+        columns: str,
+        spec: KeysetSpec,
+        where: List[str],
+        parameters: List[Any],
+        page_size: int,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Page a table with keyset seeks until a short page comes back."""
+        seek_sql, seek_parameters = "", []
+        while True:
+            rows = list(self.bq_client.query(
+                f"""
+                SELECT {columns}
+                FROM `{self._dataset}.{table}`
+                WHERE {" AND ".join(where)}{seek_sql}
+                ORDER BY {spec.order_by}
+                LIMIT @page_size
+                """,
+                parameters=parameters + seek_parameters + [
+                    bigquery.ScalarQueryParameter("page_size", "INT64", page_size)
+                ],
+            ))
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            seek_sql, seek_parameters = spec.seek([rows[-1][key.column] for key in spec.keys])
+            seek_sql = f" AND {seek_sql}"
+
+    # ============================================
+    # Single Run Formats
+    # ============================================
+
+    def stream_run_json(self, org_slug: str, run: Dict[str, Any]) -> Iterator[str]:
+        """Run detail as one JSON document with "steps" and "transitions" arrays."""
+        header = json.dumps(_parse_json_fields(run), default=str)
+        yield header[:-1] + ', "steps": ['
+        for i, step in enumerate(self.iter_steps(org_slug, [run])):
+            yield ("," if i else "") + json.dumps(_parse_json_fields(step), default=str)
+        yield '], "transitions": ['
+        for i, transition in enumerate(self.iter_transitions(org_slug, [run])):
+            yield ("," if i else "") + json.dumps(_parse_json_fields(transition), default=str)
+        yield "]}\n"
+
+    def stream_run_csv(self, org_slug: str, run: Dict[str, Any]) -> Iterator[str]:
+        """Sectioned CSV: run summary, steps, then state transitions."""
+        yield _csv_line(["Run Summary"])
+        yield _csv_line(["Field", "Value"])
+        for field in ("pipeline_logging_id", "pipeline_id", "status", "trigger_type", "trigger_by"):
+            yield _csv_line([field, run.get(field)])
+        yield _csv_line(["start_time", str(run.get("start_time"))])
+        yield _csv_line(["end_time", str(run.get("end_time"))])
+        yield _csv_line(["duration_ms", run.get("duration_ms")])
+        yield _csv_line(["error_message", run.get("error_message")])
+        yield _csv_line([])
+
+        yield _csv_line(["Steps"])
+        yield _csv_line(["step_index", "step_name", "step_type", "status", "start_time", "end_time", "duration_ms", "rows_processed", "error_message"])
+        for step in self.iter_steps(org_slug, [run]):
+            yield _csv_line([
+                step["step_index"],
+                step["step_name"],
+                step["step_type"],
+                step["status"],
+                str(step.get("start_time")),
+                str(step.get("end_time")),
+                step.get("duration_ms"),
+                step.get("rows_processed"),
+                step.get("error_message"),
+            ])
+        yield _csv_line([])
+
+        yield _csv_line(["State Transitions"])
+        yield _csv_line(["transition_time", "entity_type", "step_logging_id", "from_state", "to_state", "error_type", "error_message", "retry_count", "duration_in_state_ms"])
+        for transition in self.iter_transitions(org_slug, [run]):
+            yield _csv_line([
+                str(transition["transition_time"]),
+                transition["entity_type"],
+                transition.get("step_logging_id"),
+                transition["from_state"],
+                transition["to_state"],
+                transition.get("error_type"),
+                transition.get("error_message"),
+                transition.get("retry_count"),
+                transition.get("duration_in_state_ms"),
+            ])
+
+    # ============================================
+    # Multi-Run Formats
+    # ============================================
+
+    def stream_records(self, org_slug: str, run_batches: Iterable[List[Dict[str, Any]]], fmt: str) -> Iterator[str]:
+        """
+        Flat export of runs, steps and transitions (one record per line).
+
+        Every record carries record_type ("run", "step", "transition") and
+        pipeline_logging_id. A failure after streaming has started is written
+        as a final record_type="error" record, since the status code is sent.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt == "csv":
+            yield _csv_line(EXPORT_CSV_COLUMNS)
+
+        try:
+            for runs in run_batches:
+                for run in runs:
+                    yield self._format_record("run", run, fmt)
+                for step in self.iter_steps(org_slug, runs):
+                    yield self._format_record("step", step, fmt)
+                for transition in self.iter_transitions(org_slug, runs):
+                    yield self._format_record("transition", transition, fmt)
+        except Exception as e:
+            logger.error(f"Pipeline log export failed for {org_slug}: {e}")
+            yield self._format_record("error", {"error_message": "Export interrupted; output is incomplete"}, fmt)
+
+    def _format_record(self, record_type: str, row: Dict[str, Any], fmt: str) -> str:
+        record = {"record_type": record_type, **_parse_json_fields(row)}
+        if fmt == "ndjson":
+            return json.dumps(record, default=str) + "\n"
+
+        values = []
+        for column in EXPORT_CSV_COLUMNS:
+            value = record.get(column)
+            values.append(json.dumps(value, default=str) if isinstance(value, (dict, list)) else value)
+        return _csv_line(values)
@@ -11,6 +11,14 @@ from typing import Optional, List, Dict, Any, Tuple
 import hashlib
 
 from src.core.services._shared.date_utils import DatePeriod, resolve_date_range
+from src.core.services._shared.pagination import KeysetSpec, SortKey
+
+
+# Runs are paged newest first on the partition column plus the unique run ID
+PIPELINE_RUNS_KEYSET = KeysetSpec(
+    kind="pipeline_runs",
+    keys=(SortKey("start_time", "TIMESTAMP"), SortKey("pipeline_logging_id", "STRING")),
+)
 
 
 @dataclass
@@ -33,6 +41,7 @@ class PipelineQuery:
     fiscal_year_start_month: int = 1  # From org settings
     limit: int = 50
     offset: int = 0
+    cursor: Optional[str] = None  # Keyset cursor from PipelineResponse.next_cursor (replaces offset)
 
     def resolve_dates(self) -> Tuple[date, date]:
         """Resolve actual date range based on query parameters."""
@@ -50,6 +59,18 @@ class PipelineQuery:
         )
         return date_range.start_date, date_range.end_date
 
+    def filter_signature(self) -> str:
+        """Hash of the filters (not the page) that binds keyset cursors."""
+        resolved_start, resolved_end = self.resolve_dates()
+        return PIPELINE_RUNS_KEYSET.filter_signature({
+            "org_slug": self.org_slug,
+            "statuses": sorted(self.status_filter or []),
+            "pipeline_id": self.pipeline_id,
+            "trigger_type": self.trigger_type,
+            "start_date": resolved_start,
+            "end_date": resolved_end,
+        })
+
     def cache_key(self) -> str:
         """Generate deterministic cache key."""
         resolved_start, resolved_end = self.resolve_dates()
@@ -62,6 +83,7 @@ class PipelineQuery:
             str(resolved_end),
             str(self.limit),
             str(self.offset),
+            self.cursor or "",
         ]
         key_str = "|".join(key_parts)
         return hashlib.md5(key_str.encode()).hexdigest()[:16]
@@ -75,6 +97,7 @@ class PipelineResponse:
     summary: Optional[Dict[str, Any]] = None
     stats: Optional[Dict[str, Any]] = None
     total: int = 0
+    next_cursor: Optional[str] = None
     error: Optional[str] = None
     cache_hit: bool = False
     query_time_ms: float = 0.0
@@ -23,7 +23,7 @@ from google.cloud import bigquery
 from src.core.engine.bq_client import get_bigquery_client
 from src.app.config import settings
 from src.core.services._shared import LRUCache, validate_org_slug, create_cache
-from src.core.services.pipeline_read.models import PipelineQuery, PipelineResponse
+from src.core.services.pipeline_read.models import PipelineQuery, PipelineResponse, PIPELINE_RUNS_KEYSET
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +111,15 @@ class PipelineReadService:
             bigquery.ScalarQueryParameter("end_date", "DATE", resolved_end)
         )
 
+        # Keyset seek replaces OFFSET; the start_time bound prunes partitions
+        offset = query.offset
+        if query.cursor:
+            cursor_values = PIPELINE_RUNS_KEYSET.decode_cursor(query.cursor, query.filter_signature())
+            seek_sql, seek_params = PIPELINE_RUNS_KEYSET.seek(cursor_values)
+            where_conditions.append(seek_sql)
+            query_params.extend(seek_params)
+            offset = 0
+
         where_clause = " AND ".join(where_conditions)
 
         sql = f"""
@@ -129,13 +138,14 @@ class PipelineReadService:
             parameters
         FROM {table_ref}
         WHERE {where_clause}
-        ORDER BY start_time DESC
+        ORDER BY {PIPELINE_RUNS_KEYSET.order_by}
         LIMIT @limit OFFSET @offset
         """
 
+        # One extra row tells get_pipeline_runs whether another page exists
         query_params.extend([
-            bigquery.ScalarQueryParameter("limit", "INT64", query.limit),
-            bigquery.ScalarQueryParameter("offset", "INT64", query.offset),
+            bigquery.ScalarQueryParameter("limit", "INT64", query.limit + 1),
+            bigquery.ScalarQueryParameter("offset", "INT64", offset),
         ])
 
         return sql, query_params
@@ -148,14 +158,16 @@ class PipelineReadService:
         cached_df = self._cache.get(cache_key)
         if cached_df is not None:
             query_time = (time.time() - start_time) * 1000
-            data = cached_df.to_dicts()
-            stats = self._calculate_run_stats(cached_df)
+            page_df = cached_df.head(query.limit)
+            data = page_df.to_dicts()
+            stats = self._calculate_run_stats(page_df)
 
             return PipelineResponse(
                 success=True,
                 data=data,
                 stats=stats,
                 total=len(data),
+                next_cursor=self._next_runs_cursor(query, data, cached_df.height > query.limit),
                 cache_hit=True,
                 query_time_ms=round(query_time, 2)
             )
@@ -166,8 +178,9 @@ class PipelineReadService:
 
             self._cache.set(cache_key, df, ttl=30)
 
-            data = df.to_dicts()
-            stats = self._calculate_run_stats(df)
+            page_df = df.head(query.limit)
+            data = page_df.to_dicts()
+            stats = self._calculate_run_stats(page_df)
             query_time = (time.time() - start_time) * 1000
 
             return PipelineResponse(
@@ -175,6 +188,7 @@ class PipelineReadService:
                 data=data,
                 stats=stats,
                 total=len(data),
+                next_cursor=self._next_runs_cursor(query, data, df.height > query.limit),
                 cache_hit=False,
                 query_time_ms=round(query_time, 2)
             )
@@ -187,6 +201,12 @@ class PipelineReadService:
                 query_time_ms=(time.time() - start_time) * 1000
             )
 
+    def _next_runs_cursor(self, query: PipelineQuery, data: List[Dict[str, Any]], has_more: bool) -> Optional[str]:
+        """Cursor after the last run of the page, or None on the last page."""
+        if not has_more or not data:
+            return None
+        return PIPELINE_RUNS_KEYSET.encode_cursor(data[-1], query.filter_signature())
+
     async def get_run_summary(self, org_slug: str, days: int = 7) -> PipelineResponse:
         """Get aggregated pipeline run summary."""
         start_time = time.time()
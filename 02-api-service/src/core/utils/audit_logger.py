@@ -5,17 +5,22 @@ Logs all mutating operations (CREATE/UPDATE/DELETE) to org_audit_logs table.
 Issue #32: Missing Audit Logs
 """
 
+import asyncio
 import logging
 import uuid
 import json
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
-from google.cloud import bigquery
 
 from src.app.config import settings
-from src.core.engine.bq_client import get_bigquery_client
+from src.core.utils.bq_write_buffer import get_bq_write_buffer
 
 logger = logging.getLogger(__name__)
 
+# Attempts per audit entry before it is given up (and logged in full)
+AUDIT_WRITE_ATTEMPTS = 3
+AUDIT_RETRY_BASE_DELAY_SECONDS = 0.2
+
 
 class AuditLogger:
     """
@@ -49,15 +54,9 @@ class AuditLogger:
     STATUS_FAILURE = "FAILURE"
     STATUS_DENIED = "DENIED"
 
-    def __init__(self):
-        """Initialize audit logger."""
-        self.bq_client = None
-
-    def _get_bq_client(self):
-        """Lazy load BigQuery client."""
-        if self.bq_client is None:
-            self.bq_client = get_bigquery_client()
-        return self.bq_client
+    @staticmethod
+    def _table_id() -> str:
+        return f"{settings.gcp_project_id}.organizations.org_audit_logs"
 
     async def log_operation(
         self,
@@ -92,50 +91,37 @@ class AuditLogger:
             error_message: Optional error message if failed
 
         Returns:
-            True if logged successfully, False otherwise
+            True if the entry was written, False otherwise
         """
         try:
             audit_id = str(uuid.uuid4())
 
-            # Prepare details as JSON string
-            details_json = json.dumps(details) if details else None
-
-            # Insert audit log entry
-            # Note: details column is JSON type, so we use PARSE_JSON() to convert string to JSON
-            insert_query = f"""
-            INSERT INTO `{settings.gcp_project_id}.organizations.org_audit_logs`
-            (audit_id, org_slug, user_id, api_key_id, action, resource_type, resource_id,
-             details, ip_address, user_agent, request_id, status, error_message, created_at)
-            VALUES
-            (@audit_id, @org_slug, @user_id, @api_key_id, @action, @resource_type, @resource_id,
-             PARSE_JSON(@details), @ip_address, @user_agent, @request_id, @status, @error_message, CURRENT_TIMESTAMP())
-            """
-
-            bq_client = self._get_bq_client()
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("audit_id", "STRING", audit_id),
-                    bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
-                    bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
-                    bigquery.ScalarQueryParameter("api_key_id", "STRING", api_key_id),
-                    bigquery.ScalarQueryParameter("action", "STRING", action),
-                    bigquery.ScalarQueryParameter("resource_type", "STRING", resource_type),
-                    bigquery.ScalarQueryParameter("resource_id", "STRING", resource_id),
-                    bigquery.ScalarQueryParameter("details", "STRING", details_json),
-                    bigquery.ScalarQueryParameter("ip_address", "STRING", ip_address),
-                    bigquery.ScalarQueryParameter("user_agent", "STRING", user_agent),
-                    bigquery.ScalarQueryParameter("request_id", "STRING", request_id),
-                    bigquery.ScalarQueryParameter("status", "STRING", status),
-                    bigquery.ScalarQueryParameter("error_message", "STRING", error_message)
-                ],
-                job_timeout_ms=60000  # 60 seconds for audit logging
-            )
-
-            bq_client.client.query(insert_query, job_config=job_config).result()
+            # details column is JSON type; it is written as a JSON string
+            row = {
+                "audit_id": audit_id,
+                "org_slug": org_slug,
+                "user_id": user_id,
+                "api_key_id": api_key_id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "details": json.dumps(details) if details else None,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "request_id": request_id,
+                "status": status,
+                "error_message": error_message,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+            # Audit rows are append-only, so they are micro-batched with other
+            # requests' rows instead of paying a DML round-trip per operation.
+            # write() waits for the flush: an audit entry must not be dropped
+            # silently, so failures are retried and surfaced to the caller.
+            await self._write_row(row)
 
             logger.info(
-                f"Audit log entry created",
+                "Audit log entry written",
                 extra={
                     "audit_id": audit_id,
                     "org_slug": org_slug,
@@ -161,6 +147,30 @@ class AuditLogger:
             )
             return False
 
+    async def _write_row(self, row: Dict[str, Any]) -> None:
+        """
+        Write one audit row through the write buffer, retrying with backoff.
+
+        The full row is logged if every attempt fails, so the entry survives
+        in Cloud Logging and can be backfilled.
+
+        Raises:
+            Exception: The last write error
+        """
+        for attempt in range(1, AUDIT_WRITE_ATTEMPTS + 1):
+            try:
+                await get_bq_write_buffer().write(self._table_id(), [row])
+                return
+            except Exception as e:
+                if attempt == AUDIT_WRITE_ATTEMPTS:
+                    logger.error(
+                        f"Audit log entry not written after {attempt} attempts: {e}",
+                        extra={"audit_row": row},
+                    )
+                    raise
+                logger.warning(f"Audit log write attempt {attempt} failed, retrying: {e}")
+                await asyncio.sleep(AUDIT_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+
 
 # Global audit logger instance
 _audit_logger = AuditLogger()
@@ -0,0 +1,630 @@
+"""
+BigQuery Write Buffer
+
+Micro-batches row writes from concurrent requests into one BigQuery request
+per destination table instead of one streaming insert / DML per request:
+- Rows are coalesced per table and flushed when a batch is full or when the
+  oldest row has waited flush_interval_seconds
+- write() waits until its rows are durable (coalescing with whatever else
+  arrives within linger_ms); submit() returns as soon as rows are buffered
+- Buffered rows per table are bounded; submit()/write() block when the
+  bound is reached (backpressure) instead of growing memory without limit
+- close() flushes every table on shutdown
+- Per-table flush metrics are kept in memory and exported to Prometheus
+
+Each table flushes with a writer callable (table_id, rows) run in a worker
+thread. The default writer appends each batch to the table's default stream
+with the Storage Write API (streaming inserts on the local duckdb backend);
+tables that must stay mutable right after insert register a DML writer
+instead.
+
+Delivery is at-least-once: a batch the API rejects is not written and the
+error reaches write() callers, who retry; a transport failure after the
+append landed can duplicate it on retry. Rows that must be unique carry
+their own ID (audit_id, alert_history_id).
+
+Updates of existing rows (AuthMetricsAggregator's last_used_at) do not go
+through the buffer: it queues one row per call, while the aggregator keeps
+one entry per API key however many requests use it between flushes.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from google.cloud.bigquery_storage_v1 import BigQueryWriteClient
+from google.cloud.bigquery_storage_v1 import types as storage_types
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+from src.app.config import settings
+from src.core.observability.metrics import (
+    observe_write_buffer_flush,
+    set_write_buffer_pending_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+# (table_id, rows) -> None; raises on failure
+RowWriter = Callable[[str, List[Dict[str, Any]]], None]
+
+TRIGGER_SIZE = "size"
+TRIGGER_TIME = "time"
+TRIGGER_FORCED = "forced"
+
+
+def streaming_insert_writer(client: Any = None) -> RowWriter:
+    """
+    Writer sending each batch as one insert_rows_json request.
+
+    Args:
+        client: google.cloud.bigquery.Client (shared API client by default)
+    """
+    def write(table_id: str, rows: List[Dict[str, Any]]) -> None:
+        bq = client
+        if bq is None:
+            from src.core.engine.bq_client import get_bigquery_client
+            bq = get_bigquery_client().client
+        errors = bq.insert_rows_json(table_id, rows)
+        if errors:
+            raise RuntimeError(f"BigQuery insert errors for {table_id}: {errors}")
+
+    return write
+
+
+# ============================================
+# Storage Write API
+# ============================================
+
+_PROTO_TYPES = {
+    "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "BYTES": descriptor_pb2.FieldDescriptorProto.TYPE_BYTES,
+    "INTEGER": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "INT64": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "FLOAT": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+    "FLOAT64": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+    "BOOLEAN": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+    "BOOL": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+    "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,  # Micros since epoch
+    "DATE": descriptor_pb2.FieldDescriptorProto.TYPE_INT32,  # Days since epoch
+    # Sent as their canonical string form
+    "NUMERIC": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "BIGNUMERIC": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "DATETIME": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "TIME": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "JSON": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "GEOGRAPHY": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_DATE = date(1970, 1, 1)
+
+_write_client: Optional[BigQueryWriteClient] = None
+_write_client_lock = threading.Lock()
+
+
+def _get_write_client() -> BigQueryWriteClient:
+    """Get or create the process-wide BigQueryWriteClient."""
+    global _write_client
+    if _write_client is None:
+        with _write_client_lock:
+            if _write_client is None:
+                _write_client = BigQueryWriteClient()
+    return _write_client
+
+
+@dataclass
+class _StreamTarget:
+    """Default stream and proto row type of one table."""
+    stream_name: str
+    proto_schema: storage_types.ProtoSchema
+    row_class: Any
+    field_types: Dict[str, str]
+    repeated: frozenset
+
+
+def _stream_target(table_id: str, schema: List[Any]) -> _StreamTarget:
+    descriptor = descriptor_pb2.DescriptorProto(name="Row")
+    for number, schema_field in enumerate(schema, start=1):
+        field_type = schema_field.field_type.upper()
+        if field_type not in _PROTO_TYPES:
+            raise ValueError(
+                f"Column {schema_field.name} of {table_id} has type {field_type}, which the "
+                "Storage Write API writer does not support; register another writer"
+            )
+        descriptor.field.append(descriptor_pb2.FieldDescriptorProto(
+            name=schema_field.name,
+            number=number,
+            type=_PROTO_TYPES[field_type],
+            label=(
+                descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED
+                if schema_field.mode == "REPEATED"
+                else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+            ),
+        ))
+
+    file_proto = descriptor_pb2.FileDescriptorProto(name=f"{table_id}.proto")
+    file_proto.message_type.append(descriptor)
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+
+    project, dataset, table = table_id.split(".")
+    return _StreamTarget(
+        stream_name=f"projects/{project}/datasets/{dataset}/tables/{table}/streams/_default",
+        proto_schema=storage_types.ProtoSchema(proto_descriptor=descriptor),
+        row_class=message_factory.GetMessageClass(pool.FindMessageTypeByName("Row")),
+        field_types={f.name: f.field_type.upper() for f in schema},
+        repeated=frozenset(f.name for f in schema if f.mode == "REPEATED"),
+    )
+
+
+def _proto_value(value: Any, field_type: str) -> Any:
+    if field_type == "TIMESTAMP":
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return (value - _EPOCH) // timedelta(microseconds=1)
+        return int(value)
+    if field_type == "DATE":
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        return (value - _EPOCH_DATE).days if isinstance(value, date) else int(value)
+    if field_type in ("INTEGER", "INT64"):
+        return int(value)
+    if field_type in ("FLOAT", "FLOAT64"):
+        return float(value)
+    if field_type in ("BOOLEAN", "BOOL"):
+        return bool(value)
+    if field_type == "BYTES":
+        return value if isinstance(value, bytes) else str(value).encode()
+    if field_type == "JSON" and not isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _serialize_rows(target: _StreamTarget, rows: List[Dict[str, Any]]) -> storage_types.ProtoRows:
+    proto_rows = storage_types.ProtoRows()
+    for row in rows:
+        message = target.row_class()
+        for name, value in row.items():
+            if value is None:
+                continue
+            if name not in target.field_types:
+                raise ValueError(f"No such column: {name}")
+            field_type = target.field_types[name]
+            if name in target.repeated:
+                getattr(message, name).extend(_proto_value(v, field_type) for v in value)
+            else:
+                setattr(message, name, _proto_value(value, field_type))
+        proto_rows.serialized_rows.append(message.SerializeToString())
+    return proto_rows
+
+
+def storage_write_writer(client: Any = None, write_client: Any = None) -> RowWriter:
+    """
+    Writer appending each batch to the table's default stream (Storage Write API).
+
+    One AppendRows request per batch; rows are visible once it returns. The
+    table schema is read once per table and re-read after a failed append.
+
+    Args:
+        client: google.cloud.bigquery.Client for table schemas (shared API client by default)
+        write_client: BigQueryWriteClient (process-wide client by default)
+    """
+    targets: Dict[str, _StreamTarget] = {}
+    targets_lock = threading.Lock()
+
+    def write(table_id: str, rows: List[Dict[str, Any]]) -> None:
+        with targets_lock:
+            target = targets.get(table_id)
+        if target is None:
+            bq = client
+            if bq is None:
+                from src.core.engine.bq_client import get_bigquery_client
+                bq = get_bigquery_client().client
+            target = _stream_target(table_id, list(bq.get_table(table_id).schema))
+            with targets_lock:
+                targets[table_id] = target
+
+        request = storage_types.AppendRowsRequest(
+            write_stream=target.stream_name,
+            proto_rows=storage_types.AppendRowsRequest.ProtoData(
+                writer_schema=target.proto_schema,
+                rows=_serialize_rows(target, rows),
+            ),
+        )
+        try:
+            # Streaming RPCs carry no routing header unless it is passed explicitly
+            responses = (write_client or _get_write_client()).append_rows(
+                iter([request]),
+                metadata=(("x-goog-request-params", f"write_stream={target.stream_name}"),),
+            )
+            for response in responses:
+                if response.row_errors:
+                    details = [f"row {e.index}: {e.message}" for e in response.row_errors]
+                    raise RuntimeError(f"BigQuery Storage Write API rejected rows for {table_id}: {details}")
+                if response.error.code:
+                    raise RuntimeError(
+                        f"BigQuery Storage Write API error for {table_id}: "
+                        f"code={response.error.code} {response.error.message}"
+                    )
+        except Exception:
+            # The table may have changed; read its schema again on the next flush
+            with targets_lock:
+                targets.pop(table_id, None)
+            raise
+
+    return write
+
+
+def default_row_writer(client: Any = None) -> RowWriter:
+    """
+    Writer used for tables without a registered one.
+
+    The Storage Write API writer; streaming inserts when the service runs on
+    the local duckdb backend, which has no Storage Write API.
+
+    Args:
+        client: google.cloud.bigquery.Client (shared API client by default)
+    """
+    if settings.bigquery_backend == "duckdb":
+        return streaming_insert_writer(client)
+    return storage_write_writer(client)
+
+
+# ============================================
+# Metrics
+# ============================================
+
+@dataclass
+class TableWriteMetrics:
+    """Flush statistics for one destination table."""
+    table_id: str
+    rows_enqueued: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    flushes_by_trigger: Dict[str, int] = field(default_factory=dict)
+    backpressure_waits: int = 0
+    pending_rows: int = 0
+    last_flush_rows: int = 0
+    last_flush_seconds: float = 0.0
+    total_flush_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table_id": self.table_id,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flushes_by_trigger": dict(self.flushes_by_trigger),
+            "backpressure_waits": self.backpressure_waits,
+            "pending_rows": self.pending_rows,
+            "avg_rows_per_flush": round(self.rows_written / self.flushes, 1) if self.flushes else 0.0,
+            "last_flush_rows": self.last_flush_rows,
+            "last_flush_seconds": round(self.last_flush_seconds, 4),
+            "total_flush_seconds": round(self.total_flush_seconds, 4),
+            "last_error": self.last_error,
+        }
+
+
+# ============================================
+# Per-table buffer
+# ============================================
+
+@dataclass
+class _Submission:
+    rows: List[Dict[str, Any]]
+    deadline: float
+    future: Optional[asyncio.Future] = None
+
+
+class _TableBuffer:
+    """Pending rows and the flush task of one destination table."""
+
+    def __init__(
+        self,
+        table_id: str,
+        writer: RowWriter,
+        max_batch_rows: int,
+        flush_interval_seconds: float,
+        linger_seconds: float,
+        max_pending_rows: int,
+    ):
+        self.table_id = table_id
+        self.writer = writer
+        self.max_batch_rows = max_batch_rows
+        self.flush_interval_seconds = flush_interval_seconds
+        self.linger_seconds = min(linger_seconds, flush_interval_seconds)
+        self.max_pending_rows = max_pending_rows
+        self.metrics = TableWriteMetrics(table_id=table_id)
+
+        self._queue: List[_Submission] = []
+        self._queued_rows = 0
+        # Queued plus in-flight rows; bounded by max_pending_rows
+        self._pending_rows = 0
+        self._force = False
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def enqueue(self, rows: List[Dict[str, Any]], wait: bool) -> Optional[asyncio.Future]:
+        if self._closing:
+            raise RuntimeError(f"BigQuery write buffer for {self.table_id} is closed")
+
+        # Check and reserve under one lock so concurrent callers woken by the
+        # same notify cannot all pass the bound
+        async with self._space:
+            if self._pending_rows and self._pending_rows + len(rows) > self.max_pending_rows:
+                self.metrics.backpressure_waits += 1
+                await self._space.wait_for(
+                    lambda: not self._pending_rows or self._pending_rows + len(rows) <= self.max_pending_rows
+                )
+
+            now = time.monotonic()
+            future = asyncio.get_running_loop().create_future() if wait else None
+            delay = self.linger_seconds if wait else self.flush_interval_seconds
+            self._queue.append(_Submission(rows=rows, deadline=now + delay, future=future))
+            self._queued_rows += len(rows)
+            self._pending_rows += len(rows)
+            self.metrics.rows_enqueued += len(rows)
+            self._set_pending()
+        self._drained.clear()
+        self._ensure_task()
+        self._wakeup.set()
+        return future
+
+    async def flush(self) -> None:
+        if not self._queue and self._drained.is_set():
+            return
+        self._force = True
+        self._ensure_task()
+        self._wakeup.set()
+        await self._drained.wait()
+
+    async def close(self) -> None:
+        self._closing = True
+        await self.flush()
+        if self._task is not None:
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._force = False
+                self._drained.set()
+                if self._closing:
+                    return
+                await self._wait(None)
+                continue
+
+            if self._queued_rows >= self.max_batch_rows:
+                trigger = TRIGGER_SIZE
+            elif self._force or self._closing:
+                trigger = TRIGGER_FORCED
+            else:
+                remaining = min(s.deadline for s in self._queue) - time.monotonic()
+                if remaining > 0:
+                    await self._wait(remaining)
+                    continue
+                trigger = TRIGGER_TIME
+
+            await self._flush_batch(self._take_batch(), trigger)
+
+    def _take_batch(self) -> List[_Submission]:
+        batch: List[_Submission] = []
+        rows = 0
+        while self._queue and (not batch or rows + len(self._queue[0].rows) <= self.max_batch_rows):
+            submission = self._queue.pop(0)
+            batch.append(submission)
+            rows += len(submission.rows)
+        self._queued_rows -= rows
+        return batch
+
+    async def _flush_batch(self, batch: List[_Submission], trigger: str) -> None:
+        rows = [row for submission in batch for row in submission.rows]
+        error = await self._write(rows, trigger)
+
+        if error is not None and len(batch) > 1 and any(s.future is not None for s in batch):
+            # Callers awaiting their write get their own outcome: one bad row
+            # must not fail every request it was coalesced with
+            for submission in batch:
+                self._resolve(submission, await self._write(submission.rows, TRIGGER_FORCED))
+        else:
+            for submission in batch:
+                self._resolve(submission, error)
+
+        self._pending_rows -= len(rows)
+        self._set_pending()
+        async with self._space:
+            self._space.notify_all()
+
+    async def _write(self, rows: List[Dict[str, Any]], trigger: str) -> Optional[Exception]:
+        start = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            await asyncio.to_thread(self.writer, self.table_id, rows)
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - start
+
+        metrics = self.metrics
+        metrics.flushes += 1
+        metrics.flushes_by_trigger[trigger] = metrics.flushes_by_trigger.get(trigger, 0) + 1
+        metrics.last_flush_rows = len(rows)
+        metrics.last_flush_seconds = elapsed
+        metrics.total_flush_seconds += elapsed
+        if error is None:
+            metrics.rows_written += len(rows)
+        else:
+            metrics.failed_flushes += 1
+            metrics.rows_failed += len(rows)
+            metrics.last_error = str(error)
+            logger.error(f"BigQuery write buffer flush of {len(rows)} rows to {self.table_id} failed: {error}")
+        observe_write_buffer_flush(self.table_id, trigger, error is None, len(rows), elapsed)
+        return error
+
+    @staticmethod
+    def _resolve(submission: _Submission, error: Optional[Exception]) -> None:
+        if submission.future is None or submission.future.done():
+            return
+        if error is None:
+            submission.future.set_result(None)
+        else:
+            submission.future.set_exception(error)
+
+    def _set_pending(self) -> None:
+        self.metrics.pending_rows = self._pending_rows
+        set_write_buffer_pending_rows(self.table_id, self._pending_rows)
+
+
+# ============================================
+# Buffer
+# ============================================
+
+class BigQueryWriteBuffer:
+    """
+    Coalesces row writes per destination table across requests.
+
+    Args:
+        writer: Default writer for tables without a registered one
+        max_batch_rows: Rows per flush; a full batch flushes immediately
+        flush_interval_seconds: Longest a submit() row is buffered
+        linger_ms: Longest a write() caller waits for rows to coalesce with
+        max_pending_rows: Buffered rows per table before callers block
+    """
+
+    def __init__(
+        self,
+        writer: Optional[RowWriter] = None,
+        max_batch_rows: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        linger_ms: Optional[int] = None,
+        max_pending_rows: Optional[int] = None,
+    ):
+        self.writer = writer or default_row_writer()
+        self.max_batch_rows = max_batch_rows or settings.bq_write_buffer_max_batch_rows
+        self.flush_interval_seconds = flush_interval_seconds or settings.bq_write_buffer_flush_interval_seconds
+        self.linger_seconds = (linger_ms if linger_ms is not None else settings.bq_write_buffer_linger_ms) / 1000
+        self.max_pending_rows = max_pending_rows or settings.bq_write_buffer_max_pending_rows
+        self._tables: Dict[str, _TableBuffer] = {}
+        self._closed = False
+
+    def register_table(
+        self,
+        table_id: str,
+        writer: Optional[RowWriter] = None,
+        max_batch_rows: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Configure how a table is flushed. The first registration wins.
+
+        Args:
+            table_id: Fully qualified table ID
+            writer: Writer for this table (e.g. a DML INSERT writer)
+            max_batch_rows: Per-table batch size (e.g. to bound query parameters)
+            flush_interval_seconds: Per-table flush interval
+        """
+        if table_id in self._tables:
+            return
+        self._tables[table_id] = _TableBuffer(
+            table_id=table_id,
+            writer=writer or self.writer,
+            max_batch_rows=max_batch_rows or self.max_batch_rows,
+            flush_interval_seconds=flush_interval_seconds or self.flush_interval_seconds,
+            linger_seconds=self.linger_seconds,
+            max_pending_rows=self.max_pending_rows,
+        )
+
+    async def submit(self, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Buffer rows and return once accepted (fire-and-forget).
+
+        Blocks while the table is at max_pending_rows. Flush failures are
+        logged and counted in the table's metrics.
+        """
+        if rows:
+            await self._table(table_id).enqueue(rows, wait=False)
+
+    async def write(self, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Buffer rows and wait until they are written.
+
+        Raises:
+            Exception: The writer's error if these rows could not be written
+        """
+        if not rows:
+            return
+        future = await self._table(table_id).enqueue(rows, wait=True)
+        await future
+
+    async def flush(self, table_id: Optional[str] = None) -> None:
+        """Flush one table (or all tables) now and wait for completion."""
+        if table_id is None:
+            tables = list(self._tables.values())
+        else:
+            tables = [self._tables[table_id]] if table_id in self._tables else []
+        await asyncio.gather(*(t.flush() for t in tables))
+
+    async def close(self) -> None:
+        """Flush every table and stop the flush tasks."""
+        self._closed = True
+        await asyncio.gather(*(t.close() for t in self._tables.values()))
+        logger.info(f"BigQuery write buffer closed ({len(self._tables)} tables flushed)")
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-table flush metrics keyed by table ID."""
+        return {table_id: t.metrics.to_dict() for table_id, t in self._tables.items()}
+
+    def _table(self, table_id: str) -> _TableBuffer:
+        if self._closed:
+            raise RuntimeError("BigQuery write buffer is closed")
+        self.register_table(table_id)
+        return self._tables[table_id]
+
+
+# Global singleton instance
+_write_buffer: Optional[BigQueryWriteBuffer] = None
+
+
+def get_bq_write_buffer() -> BigQueryWriteBuffer:
+    """Get or create the process-wide BigQueryWriteBuffer."""
+    global _write_buffer
+    if _write_buffer is None:
+        _write_buffer = BigQueryWriteBuffer()
+    return _write_buffer
+
+
+def reset_bq_write_buffer() -> None:
+    """Drop the singleton (tests)."""
+    global _write_buffer
+    _write_buffer = None
@@ -0,0 +1,515 @@
+"""
+Pipeline Fan-Out
+
+Engine behind the admin run-all endpoint:
+- Resolves orgs, validated integrations and encrypted org API keys for every
+  org in ONE BigQuery query
+- Decrypts org API keys in parallel (KMS calls run in worker threads)
+- Triggers pipelines with bounded concurrency, globally and per provider
+- Runs in the background; progress is tracked per batch_run_id in an
+  in-process registry and upserted to org_meta_pipeline_batch_runs (RUNNING
+  on start, periodically while running, final status at the end) so any
+  instance can answer the status endpoint
+
+Run time grows with (pipelines / concurrency) rather than with the number of
+sequential round trips per org.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from google.cloud import bigquery
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+MAX_RESULTS = 100
+MAX_ERRORS = 20
+MAX_TRACKED_BATCHES = 50
+
+STATUS_RUNNING = "RUNNING"
+STATUS_COMPLETED = "COMPLETED"
+STATUS_PARTIAL = "PARTIAL"
+STATUS_FAILED = "FAILED"
+
+
+# ============================================
+# Data Classes
+# ============================================
+
+@dataclass(frozen=True)
+class PipelineTarget:
+    """One pipeline to trigger for one org integration."""
+    org_slug: str
+    provider: str
+    pipeline_path: str
+
+
+@dataclass
+class OrgPlan:
+    """Resolved work for one org."""
+    org_slug: str
+    targets: List[PipelineTarget]
+    encrypted_api_key: Optional[bytes]
+
+
+@dataclass
+class BatchRunProgress:
+    """Live progress of a run-all batch."""
+    batch_run_id: str
+    org_slug: str
+    run_date: str
+    dry_run: bool
+    categories: Optional[List[str]] = None
+    providers: Optional[List[str]] = None
+    status: str = STATUS_RUNNING
+    orgs_processed: int = 0
+    orgs_skipped: int = 0
+    pipelines_triggered: int = 0
+    pipelines_failed: int = 0
+    pipelines_skipped_quota: int = 0
+    total_integrations: int = 0
+    pipelines_pending: int = 0
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    triggered_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    completed_at: Optional[str] = None
+    _started: float = field(default_factory=time.monotonic, repr=False)
+    _elapsed: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        elapsed = self._elapsed if self._elapsed is not None else time.monotonic() - self._started
+        return round(elapsed, 2)
+
+    @property
+    def done(self) -> bool:
+        return self.status != STATUS_RUNNING
+
+    def add_result(self, entry: Dict[str, Any]) -> None:
+        if len(self.results) < MAX_RESULTS:
+            self.results.append(entry)
+
+    def add_error(self, org_slug: str, error: str) -> None:
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"org_slug": org_slug, "error": error})
+
+    def finish(self, failed: bool = False) -> None:
+        self._elapsed = time.monotonic() - self._started
+        self.completed_at = datetime.now(timezone.utc).isoformat()
+        if failed:
+            self.status = STATUS_FAILED
+        else:
+            self.status = STATUS_COMPLETED if self.pipelines_failed == 0 else STATUS_PARTIAL
+
+    def message(self) -> str:
+        dry_label = " (DRY RUN)" if self.dry_run else ""
+        state = "running" if not self.done else self.status.lower()
+        return (
+            f"Pipeline run-all{dry_label} {state}: {self.orgs_processed} orgs processed, "
+            f"{self.orgs_skipped} skipped, {self.pipelines_triggered} triggered, "
+            f"{self.pipelines_failed} failed, {self.pipelines_skipped_quota} quota-skipped, "
+            f"{self.pipelines_pending} pending in {self.elapsed_seconds:.2f}s"
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        """org_meta_pipeline_batch_runs row."""
+        now_ts = datetime.now(timezone.utc).isoformat()
+        return {
+            "batch_run_id": self.batch_run_id,
+            "org_slug": self.org_slug,
+            "trigger_type": "MANUAL" if self.org_slug != "ALL" else "SCHEDULED",
+            "status": self.status,
+            "run_date": self.run_date,
+            "dry_run": self.dry_run,
+            "categories_filter": json.dumps(self.categories) if self.categories else None,
+            "providers_filter": json.dumps(self.providers) if self.providers else None,
+            "orgs_processed": self.orgs_processed,
+            "orgs_skipped": self.orgs_skipped,
+            "pipelines_triggered": self.pipelines_triggered,
+            "pipelines_failed": self.pipelines_failed,
+            "pipelines_skipped_quota": self.pipelines_skipped_quota,
+            "total_integrations": self.total_integrations,
+            "results": json.dumps(self.results[:MAX_RESULTS]),
+            "errors": json.dumps(self.errors[:MAX_ERRORS]),
+            "elapsed_seconds": self.elapsed_seconds,
+            "triggered_at": self.triggered_at,
+            "completed_at": self.completed_at or now_ts,
+            "created_at": now_ts,
+        }
+
+
+# ============================================
+# Batch Registry
+# ============================================
+
+class BatchRunRegistry:
+    """
+    In-process registry of recent run-all batches.
+
+    Holds the background task of each batch (so it is not garbage collected)
+    and its live progress. Only the most recent MAX_TRACKED_BATCHES are kept;
+    other instances read the copy persisted by persist_batch_run.
+    """
+
+    def __init__(self, max_batches: int = MAX_TRACKED_BATCHES):
+        self.max_batches = max_batches
+        self._batches: "OrderedDict[str, BatchRunProgress]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def register(self, progress: BatchRunProgress, task: Optional[asyncio.Task] = None) -> None:
+        self._batches[progress.batch_run_id] = progress
+        if task is not None:
+            self._tasks[progress.batch_run_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(progress.batch_run_id, None))
+        while len(self._batches) > self.max_batches:
+            oldest_id, oldest = next(iter(self._batches.items()))
+            if not oldest.done:
+                break
+            del self._batches[oldest_id]
+
+    def get(self, batch_run_id: str) -> Optional[BatchRunProgress]:
+        return self._batches.get(batch_run_id)
+
+    def running(self) -> List[BatchRunProgress]:
+        return [p for p in self._batches.values() if not p.done]
+
+
+_registry: Optional[BatchRunRegistry] = None
+
+
+def get_batch_run_registry() -> BatchRunRegistry:
+    global _registry
+    if _registry is None:
+        _registry = BatchRunRegistry()
+    return _registry
+
+
+def reset_batch_run_registry() -> None:
+    global _registry
+    _registry = None
+
+
+def new_batch_run_id() -> str:
+    return str(uuid.uuid4())
+
+
+# ============================================
+# Persistence
+# ============================================
+
+_BATCH_RUN_PARAM_TYPES = {
+    "batch_run_id": "STRING",
+    "org_slug": "STRING",
+    "trigger_type": "STRING",
+    "status": "STRING",
+    "run_date": "DATE",
+    "dry_run": "BOOL",
+    "categories_filter": "STRING",
+    "providers_filter": "STRING",
+    "orgs_processed": "INT64",
+    "orgs_skipped": "INT64",
+    "pipelines_triggered": "INT64",
+    "pipelines_failed": "INT64",
+    "pipelines_skipped_quota": "INT64",
+    "total_integrations": "INT64",
+    "results": "STRING",
+    "errors": "STRING",
+    "elapsed_seconds": "FLOAT64",
+    "triggered_at": "TIMESTAMP",
+    "completed_at": "TIMESTAMP",
+    "created_at": "TIMESTAMP",
+}
+_BATCH_RUN_JSON_COLUMNS = ("categories_filter", "providers_filter", "results", "errors")
+_BATCH_RUN_PROGRESS_COLUMNS = (
+    "status", "orgs_processed", "orgs_skipped", "pipelines_triggered", "pipelines_failed",
+    "pipelines_skipped_quota", "results", "errors", "elapsed_seconds", "completed_at",
+)
+
+
+def persist_batch_run(bq_client: Any, project_id: str, progress: BatchRunProgress) -> None:
+    """
+    Upsert a batch's progress into org_meta_pipeline_batch_runs.
+
+    One row per batch_run_id, written with DML (MERGE) so later updates can
+    modify it; streamed rows could not be updated for ~30 minutes.
+
+    Args:
+        bq_client: google.cloud.bigquery.Client
+        project_id: GCP project holding the organizations dataset
+        progress: Batch to write
+    """
+    row = progress.to_row()
+
+    def value(column: str) -> str:
+        return f"PARSE_JSON(@{column})" if column in _BATCH_RUN_JSON_COLUMNS else f"@{column}"
+
+    columns = list(_BATCH_RUN_PARAM_TYPES)
+    query = f"""
+    MERGE `{project_id}.organizations.org_meta_pipeline_batch_runs` T
+    USING (SELECT @batch_run_id AS batch_run_id) S
+    ON T.batch_run_id = S.batch_run_id
+    WHEN MATCHED THEN UPDATE SET
+        {", ".join(f"{c} = {value(c)}" for c in _BATCH_RUN_PROGRESS_COLUMNS)}
+    WHEN NOT MATCHED THEN INSERT ({", ".join(columns)})
+    VALUES ({", ".join(value(c) for c in columns)})
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter(column, param_type, row[column])
+            for column, param_type in _BATCH_RUN_PARAM_TYPES.items()
+        ]
+    )
+    bq_client.query(query, job_config=job_config).result()
+
+
+def load_batch_run(bq_client: Any, project_id: str, batch_run_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a batch persisted by persist_batch_run (e.g. started on another instance).
+
+    Args:
+        bq_client: google.cloud.bigquery.Client
+        project_id: GCP project holding the organizations dataset
+        batch_run_id: Batch to read
+
+    Returns:
+        The row as a dict with JSON columns decoded, or None if not found
+    """
+    query = f"""
+    SELECT *
+    FROM `{project_id}.organizations.org_meta_pipeline_batch_runs`
+    WHERE batch_run_id = @batch_run_id
+    LIMIT 1
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("batch_run_id", "STRING", batch_run_id),
+        ]
+    )
+    row = next(iter(bq_client.query(query, job_config=job_config).result()), None)
+    if row is None:
+        return None
+
+    record = dict(row.items())
+    for column in _BATCH_RUN_JSON_COLUMNS:
+        # The BigQuery client already decodes JSON columns; only raw text is parsed
+        value = record.get(column)
+        if isinstance(value, str):
+            record[column] = json.loads(value) if value else None
+    return record
+
+
+async def persist_progress_periodically(
+    persist: Callable[[], Any],
+    progress: BatchRunProgress,
+    interval_seconds: float,
+) -> None:
+    """Call the async persist() every interval_seconds until the batch is done."""
+    while not progress.done:
+        await asyncio.sleep(interval_seconds)
+        if not progress.done:
+            await persist()
+
+
+# ============================================
+# Resolution
+# ============================================
+
+def resolve_org_plans(
+    bq_client: Any,
+    project_id: str,
+    provider_map: Dict[str, Dict[str, str]],
+    org_slug: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    providers: Optional[List[str]] = None,
+) -> Tuple[List[str], List[OrgPlan]]:
+    """
+    Resolve every active org's matching integrations and API key in one query.
+
+    Args:
+        bq_client: google.cloud.bigquery.Client
+        project_id: GCP project holding the organizations dataset
+        provider_map: provider key -> {"category", "path"}
+        org_slug: Restrict to one org
+        categories: Category filter ("cloud", "genai")
+        providers: Provider key filter
+
+    Returns:
+        (all active org slugs, plans for orgs with at least one matching integration)
+    """
+    org_filter = "AND p.org_slug = @filter_org_slug" if org_slug else ""
+    query = f"""
+    WITH active_keys AS (
+        SELECT org_slug, encrypted_org_api_key
+        FROM `{project_id}.organizations.org_api_keys`
+        WHERE is_active = TRUE
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY org_slug ORDER BY created_at DESC) = 1
+    )
+    SELECT
+        p.org_slug,
+        ARRAY_AGG(c.provider IGNORE NULLS ORDER BY c.credential_id) AS providers,
+        ANY_VALUE(k.encrypted_org_api_key) AS encrypted_org_api_key
+    FROM `{project_id}.organizations.org_profiles` p
+    LEFT JOIN `{project_id}.organizations.org_integration_credentials` c
+        ON c.org_slug = p.org_slug
+        AND c.is_active = TRUE
+        AND c.validation_status = 'VALID'
+    LEFT JOIN active_keys k ON k.org_slug = p.org_slug
+    WHERE p.status = 'ACTIVE' {org_filter}
+    GROUP BY p.org_slug
+    ORDER BY p.org_slug
+    """
+    params = []
+    if org_slug:
+        params.append(bigquery.ScalarQueryParameter("filter_org_slug", "STRING", org_slug))
+    job_config = bigquery.QueryJobConfig(query_parameters=params)
+
+    org_slugs: List[str] = []
+    plans: List[OrgPlan] = []
+    for row in bq_client.query(query, job_config=job_config).result():
+        org_slugs.append(row.org_slug)
+        targets = []
+        # One trigger per credential, as before
+        for provider_key in row.providers or []:
+            mapping = provider_map.get(provider_key)
+            if not mapping:
+                continue
+            if categories and mapping["category"] not in categories:
+                continue
+            if providers and provider_key not in providers:
+                continue
+            targets.append(PipelineTarget(row.org_slug, provider_key, mapping["path"]))
+        if targets:
+            plans.append(OrgPlan(row.org_slug, targets, row.encrypted_org_api_key))
+    return org_slugs, plans
+
+
+async def decrypt_api_keys(
+    plans: List[OrgPlan],
+    decrypt: Callable[[bytes], str],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Decrypt org API keys in parallel.
+
+    Returns:
+        org_slug -> plaintext key, or the Exception raised for that org
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(plan: OrgPlan) -> Tuple[str, Any]:
+        async with semaphore:
+            try:
+                return plan.org_slug, await asyncio.to_thread(decrypt, plan.encrypted_api_key)
+            except Exception as e:
+                return plan.org_slug, e
+
+    pairs = await asyncio.gather(*(one(p) for p in plans if p.encrypted_api_key))
+    return dict(pairs)
+
+
+# ============================================
+# Fan-Out
+# ============================================
+
+class PipelineFanout:
+    """
+    Triggers pipelines with a global and a per-provider concurrency bound.
+
+    Args:
+        client: httpx.AsyncClient used for all triggers
+        pipeline_service_url: Pipeline service base URL
+        max_concurrency: Triggers in flight across the batch
+        max_per_provider: Triggers in flight per provider
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        pipeline_service_url: str,
+        max_concurrency: int,
+        max_per_provider: int,
+    ):
+        self.client = client
+        self.pipeline_service_url = pipeline_service_url
+        self.max_per_provider = max(1, max_per_provider)
+        self._global = asyncio.Semaphore(max(1, max_concurrency))
+        self._per_provider: Dict[str, asyncio.Semaphore] = {}
+
+    def _provider_semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._per_provider:
+            self._per_provider[provider] = asyncio.Semaphore(self.max_per_provider)
+        return self._per_provider[provider]
+
+    async def run(
+        self,
+        plans: List[OrgPlan],
+        api_keys: Dict[str, Any],
+        progress: BatchRunProgress,
+    ) -> None:
+        """Trigger every plan's pipelines, updating progress as each completes."""
+        jobs = []
+        for plan in plans:
+            key = api_keys.get(plan.org_slug)
+            if not plan.encrypted_api_key:
+                progress.orgs_skipped += 1
+                progress.add_error(plan.org_slug, "No active API key found")
+                continue
+            if isinstance(key, Exception):
+                progress.orgs_skipped += 1
+                progress.add_error(plan.org_slug, f"API key decryption failed: {str(key)[:100]}")
+                continue
+            progress.orgs_processed += 1
+            progress.pipelines_pending += len(plan.targets)
+            jobs.extend(self._trigger(target, key, progress) for target in plan.targets)
+        await asyncio.gather(*jobs)
+
+    async def _trigger(self, target: PipelineTarget, api_key: str, progress: BatchRunProgress) -> None:
+        entry = {
+            "org_slug": target.org_slug,
+            "provider": target.provider,
+            "pipeline_path": target.pipeline_path,
+            "date": progress.run_date,
+        }
+        if progress.dry_run:
+            progress.pipelines_triggered += 1
+            progress.pipelines_pending -= 1
+            progress.add_result({**entry, "status": "dry_run"})
+            return
+
+        try:
+            # Provider slot first: tasks queued behind a saturated provider
+            # must not hold global slots other providers could use
+            async with self._provider_semaphore(target.provider), self._global:
+                resp = await self.client.post(
+                    f"{self.pipeline_service_url}/api/v1/pipelines/run/{target.org_slug}/{target.pipeline_path}",
+                    headers={"X-API-Key": api_key},
+                    params={"date": progress.run_date},
+                )
+            if resp.status_code == 200:
+                progress.pipelines_triggered += 1
+                entry["status"] = "triggered"
+            elif resp.status_code == 429:
+                progress.pipelines_skipped_quota += 1
+                entry["status"] = "quota_exceeded"
+            else:
+                progress.pipelines_failed += 1
+                entry.update(status="failed", http_status=resp.status_code, detail=resp.text[:200])
+        except httpx.RequestError as req_err:
+            progress.pipelines_failed += 1
+            entry.update(status="error", detail=str(req_err)[:200])
+        finally:
+            progress.pipelines_pending -= 1
+        progress.add_result(entry)
@@ -3,22 +3,38 @@ Pipeline Trigger Helper
 
 Helper functions for triggering pipelines from API service.
 Used for automatic pipeline execution after data changes (e.g., subscription creation).
+
+Plan create/edit goes through SubscriptionRecomputeCoalescer: the changed
+subscription ids and date window are queued per org, and a short debounce
+merges bursts of edits into one targeted pipeline run.
 """
 
+import asyncio
+import threading
 import httpx
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Set
 from datetime import date
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for more edits before triggering the recompute
+RECOMPUTE_DEBOUNCE_SECONDS = 2.0
+# Retry delay while a previous subscription cost run is still in progress
+RECOMPUTE_BUSY_RETRY_SECONDS = 10.0
+RECOMPUTE_MAX_ATTEMPTS = 30
+# Above this many changed subscriptions a full-org recompute is cheaper
+MAX_TARGETED_SUBSCRIPTIONS = 500
+
 
 async def trigger_subscription_cost_pipeline(
     org_slug: str,
     api_key: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    pipeline_service_url: str = "http://localhost:8001"
+    pipeline_service_url: str = "http://localhost:8001",
+    subscription_ids: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Trigger subscription cost calculation pipeline.
@@ -29,6 +45,7 @@ async def trigger_subscription_cost_pipeline(
         start_date: Optional start date (defaults to MONTH_START in pipeline)
         end_date: Optional end date (defaults to TODAY in pipeline)
         pipeline_service_url: Pipeline service base URL
+        subscription_ids: Optional subscriptions to recompute (None = whole org)
 
     Returns:
         Dict with pipeline_logging_id and status, or error details
@@ -48,6 +65,8 @@ async def trigger_subscription_cost_pipeline(
             body["start_date"] = start_date.isoformat()
         if end_date:
             body["end_date"] = end_date.isoformat()
+        if subscription_ids:
+            body["subscription_ids"] = sorted(subscription_ids)
 
         # Make async HTTP request with timeout
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -68,7 +87,8 @@ async def trigger_subscription_cost_pipeline(
                         "org_slug": org_slug,
                         "pipeline_logging_id": result.get("pipeline_logging_id"),
                         "start_date": start_date.isoformat() if start_date else "MONTH_START",
-                        "end_date": end_date.isoformat() if end_date else "TODAY"
+                        "end_date": end_date.isoformat() if end_date else "TODAY",
+                        "subscriptions": len(subscription_ids) if subscription_ids else "ALL"
                     }
                 )
                 return {
@@ -155,3 +175,198 @@ def should_trigger_cost_backfill(start_date: Optional[date]) -> bool:
 
     today = date.today()
     return start_date < today
+
+
+# ============================================
+# Coalesced targeted recompute
+# ============================================
+
+@dataclass
+class PendingRecompute:
+    """Changed subscriptions and date window awaiting one pipeline run for an org."""
+    api_key: str
+    pipeline_service_url: str
+    subscription_ids: Set[str] = field(default_factory=set)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    full_window: bool = False  # Some edit asked for the pipeline default start
+    open_ended: bool = False   # Some edit asked for the pipeline default end
+
+    def merge(
+        self,
+        subscription_ids: List[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> None:
+        """Widen the pending recompute to cover another edit."""
+        self.subscription_ids.update(subscription_ids)
+        if start_date is None:
+            self.full_window = True
+        elif self.start_date is None or start_date < self.start_date:
+            self.start_date = start_date
+        if end_date is None:
+            self.open_ended = True
+        elif self.end_date is None or end_date > self.end_date:
+            self.end_date = end_date
+
+
+class SubscriptionRecomputeCoalescer:
+    """
+    Debounces subscription cost recomputes per org.
+
+    schedule() records the changed subscription ids and window and returns
+    immediately; one background task per org waits RECOMPUTE_DEBOUNCE_SECONDS,
+    then triggers a single targeted run for everything queued meanwhile. If a
+    run is already in progress (429), the batch is re-queued and retried, so
+    edits made during a run are picked up by the next one.
+
+    Pending batches live only in this process. On shutdown drain(flush_now=True)
+    skips the remaining debounce and triggers them at once; a batch is still
+    lost if its org's pipeline is already running at that moment or the
+    trigger does not finish within the shutdown timeout. Those subscriptions
+    are recomputed by the next scheduled daily run.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = RECOMPUTE_DEBOUNCE_SECONDS,
+        busy_retry_seconds: float = RECOMPUTE_BUSY_RETRY_SECONDS,
+        max_attempts: int = RECOMPUTE_MAX_ATTEMPTS,
+    ):
+        self.debounce_seconds = debounce_seconds
+        self.busy_retry_seconds = busy_retry_seconds
+        self.max_attempts = max_attempts
+        self._pending: Dict[str, PendingRecompute] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._flushing = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def schedule(
+        self,
+        org_slug: str,
+        api_key: str,
+        subscription_ids: List[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        pipeline_service_url: str = "http://localhost:8001",
+    ) -> Dict[str, Any]:
+        """Queue a targeted recompute; returns without waiting for the pipeline."""
+        pending = self._pending.get(org_slug)
+        if pending is None:
+            pending = PendingRecompute(api_key=api_key, pipeline_service_url=pipeline_service_url)
+            self._pending[org_slug] = pending
+        pending.api_key = api_key
+        pending.merge(subscription_ids, start_date, end_date)
+
+        if org_slug not in self._tasks:
+            self._tasks[org_slug] = asyncio.create_task(self._run(org_slug))
+
+        return {
+            "success": True,
+            "status": "QUEUED",
+            "message": f"Cost recompute queued for {len(pending.subscription_ids)} subscription(s)"
+        }
+
+    async def _run(self, org_slug: str) -> None:
+        """Flush the org's pending batches until none are left."""
+        attempts = 0
+        try:
+            await self._sleep(self.debounce_seconds)
+            while org_slug in self._pending:
+                pending = self._pending.pop(org_slug)
+                targeted = len(pending.subscription_ids) <= MAX_TARGETED_SUBSCRIPTIONS
+                result = await trigger_subscription_cost_pipeline(
+                    org_slug=org_slug,
+                    api_key=pending.api_key,
+                    start_date=None if pending.full_window else pending.start_date,
+                    end_date=None if pending.open_ended else pending.end_date,
+                    pipeline_service_url=pending.pipeline_service_url,
+                    subscription_ids=sorted(pending.subscription_ids) if targeted else None,
+                )
+
+                attempts += 1
+                busy = result.get("status") == "ALREADY_RUNNING"
+                if busy and attempts < self.max_attempts and not self._flushing:
+                    # Put the batch back (merged with anything queued since) and wait
+                    self._requeue(org_slug, pending)
+                    await self._sleep(self.busy_retry_seconds)
+                    continue
+
+                if not result.get("success") or result.get("status") == "ALREADY_RUNNING":
+                    logger.warning(
+                        "Coalesced subscription cost recompute not started",
+                        extra={
+                            "org_slug": org_slug,
+                            "subscriptions": len(pending.subscription_ids),
+                            "pipeline_result": result
+                        }
+                    )
+                attempts = 0
+                if org_slug in self._pending:
+                    # Edits arrived while triggering: debounce them into the next run
+                    await self._sleep(self.debounce_seconds)
+        except Exception as e:
+            logger.error(
+                f"Subscription cost recompute task failed: {e}",
+                extra={"org_slug": org_slug},
+                exc_info=True
+            )
+        finally:
+            self._tasks.pop(org_slug, None)
+
+    def _requeue(self, org_slug: str, pending: PendingRecompute) -> None:
+        newer = self._pending.get(org_slug)
+        if newer is not None:
+            pending.api_key = newer.api_key
+            pending.merge(
+                list(newer.subscription_ids),
+                None if newer.full_window else newer.start_date,
+                None if newer.open_ended else newer.end_date,
+            )
+        self._pending[org_slug] = pending
+
+    async def _sleep(self, seconds: float) -> None:
+        """Debounce / retry wait, cut short once a flush_now drain starts."""
+        if self._flushing:
+            return
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def drain(self, flush_now: bool = False) -> None:
+        """
+        Wait for all scheduled recomputes.
+
+        Args:
+            flush_now: Trigger pending batches without waiting out the
+                debounce and without busy retries (used on shutdown)
+        """
+        if flush_now:
+            self._flushing = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+
+_recompute_coalescer: Optional[SubscriptionRecomputeCoalescer] = None
+_recompute_coalescer_lock = threading.Lock()
+
+
+def get_subscription_recompute_coalescer() -> SubscriptionRecomputeCoalescer:
+    """Get the process-wide subscription recompute coalescer."""
+    global _recompute_coalescer
+    if _recompute_coalescer is None:
+        with _recompute_coalescer_lock:
+            if _recompute_coalescer is None:
+                _recompute_coalescer = SubscriptionRecomputeCoalescer()
+    return _recompute_coalescer
+
+
+def reset_subscription_recompute_coalescer() -> None:
+    """Reset the coalescer (for testing)."""
+    global _recompute_coalescer
+    _recompute_coalescer = None
@@ -22,6 +22,7 @@ from src.lib.costs.constants import (
     is_genai_provider,
     is_cloud_provider,
     CATEGORY_OTHER,
+    COST_CATEGORY_COLUMN,
 )
 
 logger = logging.getLogger(__name__)
@@ -639,6 +640,8 @@ def aggregate_granular(
 
     # Add category columns if they exist
     category_cols = []
+    if COST_CATEGORY_COLUMN in df.columns:
+        category_cols.append(COST_CATEGORY_COLUMN)
     if "x_source_system" in df.columns:
         category_cols.append("x_source_system")
     if "ServiceCategory" in df.columns:
@@ -680,6 +683,7 @@ def aggregate_granular(
             provider=item["provider"],
             source_system=row.get("x_source_system"),
             service_category=row.get("ServiceCategory"),
+            cost_category=row.get(COST_CATEGORY_COLUMN),
         )
 
         granular_data.append(item)
@@ -72,6 +72,34 @@ def normalize_category(raw_category: str | None) -> str:
     return SERVICE_CATEGORY_MAP.get(normalized, CATEGORY_OTHER)
 
 
+# =============================================================================
+# Materialised Category Column
+# =============================================================================
+
+# cost_data_standard_1_3 column written at ingestion by the FOCUS conversion
+# procedures from organizations.cost_category_mappings. Filter on it with
+# equality instead of re-deriving the category from provider/source system.
+COST_CATEGORY_COLUMN = "x_cost_category"
+
+
+def resolve_category_filter(category: str | None) -> str | None:
+    """
+    Get the x_cost_category value to filter on for a requested category.
+
+    Accepts canonical names and aliases (e.g. 'saas' -> 'subscription').
+
+    Args:
+        category: Requested category (any case)
+
+    Returns:
+        Canonical category, or None if the request does not name a
+        genai/cloud/subscription category (no filter)
+    """
+    if not category:
+        return None
+    return SERVICE_CATEGORY_MAP.get(category.lower().strip())
+
+
 # =============================================================================
 # Source System Mapping
 # =============================================================================
@@ -140,25 +168,31 @@ def is_cloud_provider(provider: str | None) -> bool:
 def detect_category(
     provider: str | None = None,
     source_system: str | None = None,
-    service_category: str | None = None
+    service_category: str | None = None,
+    cost_category: str | None = None
 ) -> str:
     """
     Detect the canonical category from available fields.
 
     Priority:
-    1. x_source_system (most reliable)
-    2. Provider name detection
-    3. ServiceCategory normalization
-    4. Default to 'other'
+    1. x_cost_category (materialised at ingestion)
+    2. x_source_system
+    3. Provider name detection
+    4. ServiceCategory normalization
+    5. Default to 'other'
 
     Args:
         provider: Provider/ServiceProviderName
         source_system: x_source_system value
         service_category: ServiceCategory value
+        cost_category: x_cost_category value
 
     Returns:
         Canonical category name
     """
+    if cost_category and cost_category.lower() in VALID_CATEGORIES:
+        return cost_category.lower()
+
     # Try source system first
     if source_system:
         category = get_category_from_source_system(source_system)
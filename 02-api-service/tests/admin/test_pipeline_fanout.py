@@ -0,0 +1,341 @@
+"""
+Tests for the run-all pipeline fan-out engine (src/core/utils/pipeline_fanout.py).
+
+The pipeline service is simulated with httpx.MockTransport (per-request
+latency, in-flight tracking per provider); BigQuery and KMS are stubbed.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from google.cloud import bigquery
+
+from src.core.utils.pipeline_fanout import (
+    STATUS_COMPLETED,
+    STATUS_PARTIAL,
+    STATUS_RUNNING,
+    BatchRunProgress,
+    BatchRunRegistry,
+    OrgPlan,
+    PipelineFanout,
+    PipelineTarget,
+    decrypt_api_keys,
+    load_batch_run,
+    persist_batch_run,
+    persist_progress_periodically,
+    resolve_org_plans,
+)
+
+PROVIDER_MAP = {
+    "GCP_SA": {"category": "cloud", "path": "cloud/gcp/cost/billing"},
+    "OPENAI": {"category": "genai", "path": "genai/payg/openai"},
+    "CLAUDE": {"category": "genai", "path": "genai/payg/anthropic"},
+}
+
+
+class MockPipelineService:
+    """Pipeline service stand-in recording concurrency per provider path."""
+
+    def __init__(self, latency: float = 0.01, status_for=None):
+        self.latency = latency
+        self.status_for = status_for or (lambda path: 200)
+        self.in_flight = 0
+        self.peak = 0
+        self.in_flight_by_path = defaultdict(int)
+        self.peak_by_path = defaultdict(int)
+        self.calls = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/run/", 1)[1].split("/", 1)[1]
+        self.calls.append((request.url.path, request.headers["X-API-Key"], request.url.params["date"]))
+        self.in_flight += 1
+        self.in_flight_by_path[path] += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.peak_by_path[path] = max(self.peak_by_path[path], self.in_flight_by_path[path])
+        try:
+            await asyncio.sleep(self.latency)
+            return httpx.Response(self.status_for(path), json={"status": "PENDING"})
+        finally:
+            self.in_flight -= 1
+            self.in_flight_by_path[path] -= 1
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def _plans(org_count: int, providers=("GCP_SA", "OPENAI")):
+    return [
+        OrgPlan(
+            org_slug=f"org_{i:04d}",
+            targets=[PipelineTarget(f"org_{i:04d}", p, PROVIDER_MAP[p]["path"]) for p in providers],
+            encrypted_api_key=f"enc-{i}".encode(),
+        )
+        for i in range(org_count)
+    ]
+
+
+def _progress(dry_run: bool = False) -> BatchRunProgress:
+    return BatchRunProgress(batch_run_id="batch-1", org_slug="ALL", run_date="2026-01-15", dry_run=dry_run)
+
+
+# ============================================
+# Resolution
+# ============================================
+
+def test_resolution_uses_one_query_and_applies_filters():
+    rows = [
+        SimpleNamespace(org_slug="acme", providers=["GCP_SA", "OPENAI", "UNKNOWN"], encrypted_org_api_key=b"k1"),
+        SimpleNamespace(org_slug="globex", providers=["CLAUDE"], encrypted_org_api_key=b"k2"),
+        SimpleNamespace(org_slug="initech", providers=[], encrypted_org_api_key=b"k3"),
+    ]
+    queries = []
+
+    class FakeBQ:
+        def query(self, sql, job_config=None):
+            queries.append(sql)
+            return SimpleNamespace(result=lambda: rows)
+
+    org_slugs, plans = resolve_org_plans(FakeBQ(), "proj", PROVIDER_MAP, categories=["genai"])
+
+    assert len(queries) == 1
+    assert org_slugs == ["acme", "globex", "initech"]
+    assert [(p.org_slug, [t.provider for t in p.targets]) for p in plans] == [
+        ("acme", ["OPENAI"]), ("globex", ["CLAUDE"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keys_decrypt_in_parallel_and_failures_are_per_org():
+    def decrypt(value: bytes) -> str:
+        time.sleep(0.05)
+        if value == b"enc-3":
+            raise ValueError("KMS denied")
+        return value.decode().replace("enc", "key")
+
+    start = time.perf_counter()
+    keys = await decrypt_api_keys(_plans(8), decrypt, concurrency=8)
+    elapsed = time.perf_counter() - start
+
+    assert keys["org_0000"] == "key-0"
+    assert isinstance(keys["org_0003"], ValueError)
+    assert elapsed < 0.3  # 8 x 50ms sequentially would be 0.4s
+
+
+# ============================================
+# Fan-out
+# ============================================
+
+@pytest.mark.asyncio
+async def test_fanout_respects_global_and_per_provider_limits():
+    service = MockPipelineService(latency=0.02)
+    plans = _plans(30)
+    keys = {p.org_slug: f"key-{p.org_slug}" for p in plans}
+    progress = _progress()
+
+    async with service.client() as client:
+        fanout = PipelineFanout(client, "http://pipelines", max_concurrency=6, max_per_provider=4)
+        await fanout.run(plans, keys, progress)
+    progress.finish()
+
+    assert progress.status == STATUS_COMPLETED
+    assert (progress.orgs_processed, progress.pipelines_triggered, progress.pipelines_pending) == (30, 60, 0)
+    assert service.peak <= 6
+    assert max(service.peak_by_path.values()) <= 4
+    assert ("/api/v1/pipelines/run/org_0001/genai/payg/openai", "key-org_0001", "2026-01-15") in service.calls
+
+
+@pytest.mark.asyncio
+async def test_fanout_classifies_quota_failures_and_skips_orgs_without_keys():
+    service = MockPipelineService(status_for=lambda path: 429 if "openai" in path else 500 if "gcp" in path else 200)
+    plans = _plans(3)
+    plans[2].encrypted_api_key = None
+    keys = {"org_0000": "k0", "org_0001": RuntimeError("boom")}
+    progress = _progress()
+
+    async with service.client() as client:
+        await PipelineFanout(client, "http://pipelines", 4, 4).run(plans, keys, progress)
+    progress.finish()
+
+    assert progress.orgs_processed == 1 and progress.orgs_skipped == 2
+    assert (progress.pipelines_skipped_quota, progress.pipelines_failed) == (1, 1)
+    assert progress.status == STATUS_PARTIAL
+    assert {e["error"].split(":")[0] for e in progress.errors} == {"API key decryption failed", "No active API key found"}
+
+
+@pytest.mark.asyncio
+async def test_saturated_provider_does_not_hold_global_slots():
+    service = MockPipelineService(latency=0.05)
+    plans = _plans(4, providers=("GCP_SA",)) + [
+        OrgPlan("org_openai", [PipelineTarget("org_openai", "OPENAI", PROVIDER_MAP["OPENAI"]["path"])], b"enc")
+    ]
+    keys = {p.org_slug: "k" for p in plans}
+
+    async with service.client() as client:
+        await PipelineFanout(client, "http://pipelines", max_concurrency=2, max_per_provider=1).run(
+            plans, keys, _progress()
+        )
+
+    # GCP triggers queued on their provider slot leave the second global slot free
+    assert "openai" in service.calls[1][0]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_triggers_nothing():
+    service = MockPipelineService()
+    progress = _progress(dry_run=True)
+    async with service.client() as client:
+        await PipelineFanout(client, "http://pipelines", 4, 4).run(_plans(5), {f"org_{i:04d}": "k" for i in range(5)}, progress)
+
+    assert service.calls == []
+    assert progress.pipelines_triggered == 10
+    assert {r["status"] for r in progress.results} == {"dry_run"}
+
+
+@pytest.mark.asyncio
+async def test_run_time_stays_flat_as_org_count_grows():
+    async def run(org_count: int) -> float:
+        service = MockPipelineService(latency=0.02)
+        plans = _plans(org_count, providers=("GCP_SA",))
+        start = time.perf_counter()
+        async with service.client() as client:
+            await PipelineFanout(client, "http://pipelines", 200, 200).run(
+                plans, {p.org_slug: "k" for p in plans}, _progress()
+            )
+        return time.perf_counter() - start
+
+    small, large = await run(10), await run(150)
+    # Sequential triggering would scale 15x
+    assert large < small * 5
+
+
+def test_registry_keeps_running_batches_and_evicts_finished():
+    registry = BatchRunRegistry(max_batches=2)
+    running = BatchRunProgress(batch_run_id="a", org_slug="ALL", run_date="2026-01-15", dry_run=False)
+    registry.register(running)
+    for batch_id in ("b", "c"):
+        done = BatchRunProgress(batch_run_id=batch_id, org_slug="ALL", run_date="2026-01-15", dry_run=False)
+        done.finish()
+        registry.register(done)
+
+    assert registry.get("a").status == STATUS_RUNNING
+    assert [p.batch_run_id for p in registry.running()] == ["a"]
+
+
+# ============================================
+# Persistence
+# ============================================
+
+def test_persist_batch_run_upserts_one_row_per_batch():
+    calls = []
+
+    class FakeBQ:
+        def query(self, sql, job_config=None):
+            calls.append((sql, {p.name: p.value for p in job_config.query_parameters}))
+            return SimpleNamespace(result=lambda: [])
+
+    progress = _progress()
+    persist_batch_run(FakeBQ(), "proj", progress)
+    progress.pipelines_triggered = 3
+    progress.finish()
+    persist_batch_run(FakeBQ(), "proj", progress)
+
+    (first_sql, first), (_, second) = calls
+    assert "MERGE `proj.organizations.org_meta_pipeline_batch_runs`" in first_sql
+    assert "ON T.batch_run_id = S.batch_run_id" in first_sql
+    assert (first["batch_run_id"], first["status"]) == ("batch-1", STATUS_RUNNING)
+    assert (second["status"], second["pipelines_triggered"]) == (STATUS_COMPLETED, 3)
+
+
+@pytest.mark.asyncio
+async def test_progress_persisted_while_running_and_stops_when_done():
+    progress = _progress()
+    snapshots = []
+
+    async def persist():
+        snapshots.append(progress.pipelines_triggered)
+        progress.pipelines_triggered += 1
+
+    task = asyncio.create_task(persist_progress_periodically(persist, progress, 0.01))
+    await asyncio.sleep(0.05)
+    progress.finish()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert len(snapshots) >= 2
+    assert snapshots == list(range(len(snapshots)))
+
+
+def _persisted_row(results, errors):
+    """A batch-run row as the BigQuery client returns it (JSON columns decoded)."""
+    values = {
+        "batch_run_id": "batch-remote", "status": STATUS_PARTIAL, "orgs_processed": 2, "orgs_skipped": 0,
+        "pipelines_triggered": 3, "pipelines_failed": 1, "pipelines_skipped_quota": 0,
+        "total_integrations": 4, "results": results, "errors": errors, "elapsed_seconds": 12.5,
+    }
+    return bigquery.Row(tuple(values.values()), {name: i for i, name in enumerate(values)})
+
+
+class PersistedBatchRunBQ:
+    def __init__(self, row):
+        self.row = row
+
+    def query(self, sql, job_config=None):
+        return SimpleNamespace(result=lambda: iter([self.row] if self.row else []))
+
+
+def test_load_batch_run_uses_json_columns_already_decoded_by_the_client():
+    results = [{"org_slug": "org_0001", "provider": "OPENAI", "status": "FAILED"}]
+    errors = [{"org_slug": "org_0002", "error": "no api key"}]
+
+    record = load_batch_run(PersistedBatchRunBQ(_persisted_row(results, errors)), "proj", "batch-remote")
+
+    assert (record["results"], record["errors"]) == (results, errors)
+    assert load_batch_run(PersistedBatchRunBQ(None), "proj", "batch-missing") is None
+
+
+def test_load_batch_run_round_trips_a_persisted_batch_run():
+    pytest.importorskip("duckdb")
+    from src.core.engine.local_bq import LocalBigQueryClient
+
+    client = LocalBigQueryClient("proj")
+    try:
+        client.create_dataset("proj.organizations")
+        client.create_tables_from_schemas(
+            "organizations",
+            str(Path(__file__).resolve().parents[2] / "configs/setup/bootstrap/schemas"),
+            ["org_meta_pipeline_batch_runs"],
+        )
+        progress = BatchRunProgress(batch_run_id="batch-remote", org_slug="ALL", run_date="2026-01-15", dry_run=False)
+        progress.add_result({"org_slug": "org_0001", "provider": "OPENAI", "status": "TRIGGERED"})
+        progress.add_error("org_0002", "no api key")
+        progress.finish()
+        persist_batch_run(client, "proj", progress)
+
+        record = load_batch_run(client, "proj", "batch-remote")
+    finally:
+        client.close()
+
+    assert record["status"] == STATUS_COMPLETED
+    assert record["results"] == [{"org_slug": "org_0001", "provider": "OPENAI", "status": "TRIGGERED"}]
+    assert record["errors"] == [{"org_slug": "org_0002", "error": "no api key"}]
+
+
+@pytest.mark.asyncio
+async def test_status_endpoint_reads_persisted_batch_run_from_another_instance():
+    pytest.importorskip("supabase")
+    from src.app.routers.admin import get_run_all_status
+
+    results = [{"org_slug": "org_0001", "provider": "OPENAI", "status": "FAILED"}]
+    errors = [{"org_slug": "org_0002", "error": "no api key"}]
+    bq_client = SimpleNamespace(client=PersistedBatchRunBQ(_persisted_row(results, errors)))
+
+    response = await get_run_all_status("batch-remote", _="admin", bq_client=bq_client)
+
+    assert response.status == STATUS_PARTIAL
+    assert response.success is True
+    assert (response.results, response.errors) == (results, errors)
+    assert response.pipelines_failed == 1
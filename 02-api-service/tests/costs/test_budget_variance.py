@@ -0,0 +1,226 @@
+"""
+Tests for the vectorised budget-vs-actual engine.
+
+The engine is checked against the per-budget Polars filters BudgetReadService
+used before (date range, boundary-safe entity subtree, category, provider
+aliases), plus service-level caching keyed by the cost table version.
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import polars as pl
+import pytest
+
+from src.core.services._shared import create_cache
+from src.core.services.budget_read.service import BudgetReadService
+from src.core.services.budget_read.variance import (
+    PROVIDER_NAME_MAP,
+    actuals_by_budget,
+    budget_fingerprint,
+    build_budget_frame,
+)
+
+TEST_ORG_SLUG = "test_org"
+
+
+def reference_actual(costs_df: pl.DataFrame, budget: dict) -> float:
+    """Per-budget filter chain the engine replaces."""
+    df = costs_df.filter(
+        (pl.col("charge_date") >= date.fromisoformat(str(budget["period_start"]))) &
+        (pl.col("charge_date") <= date.fromisoformat(str(budget["period_end"])))
+    )
+    if budget["category"] and budget["category"] != "total":
+        df = df.filter(pl.col("category") == budget["category"])
+    if budget.get("provider"):
+        provider = budget["provider"].lower()
+        names = [provider] + [name for name, short in PROVIDER_NAME_MAP.items() if short == provider]
+        df = df.filter(pl.col("ServiceProviderName").str.to_lowercase().is_in(names))
+    entity_id = budget["hierarchy_entity_id"]
+    if entity_id:
+        df = df.filter(
+            (pl.col("x_hierarchy_entity_id") == entity_id) |
+            pl.col("x_hierarchy_path").str.contains(f"/{entity_id}/", literal=True) |
+            pl.col("x_hierarchy_path").str.ends_with(f"/{entity_id}")
+        )
+    return float(df["BilledCost"].sum())
+
+
+def _costs(rows):
+    return pl.DataFrame(rows, schema={
+        "charge_date": pl.Date,
+        "BilledCost": pl.Float64,
+        "ServiceProviderName": pl.Utf8,
+        "x_hierarchy_entity_id": pl.Utf8,
+        "x_hierarchy_path": pl.Utf8,
+        "category": pl.Utf8,
+    })
+
+
+def _budget(budget_id, entity=None, category="total", provider=None, start="2026-01-01", end="2026-01-31"):
+    return {
+        "budget_id": budget_id,
+        "hierarchy_entity_id": entity,
+        "category": category,
+        "provider": provider,
+        "period_start": start,
+        "period_end": end,
+    }
+
+
+@pytest.fixture
+def costs_df():
+    return _costs([
+        (date(2026, 1, 1), 10.0, "Google Cloud", "TEAM-1", "/DEPT-1/PROJ-1/TEAM-1", "cloud"),
+        (date(2026, 1, 15), 5.0, "OpenAI", "TEAM-1", "/DEPT-1/PROJ-1/TEAM-1", "genai"),
+        (date(2026, 1, 31), 2.0, "Amazon Web Services", "TEAM-2", "/DEPT-1/PROJ-2/TEAM-2", "cloud"),
+        (date(2026, 2, 1), 7.0, "Google Cloud", "TEAM-1", "/DEPT-1/PROJ-1/TEAM-1", "cloud"),
+        (date(2026, 1, 10), 1.0, "Slack", "DEPT-10", "/DEPT-10", "subscription"),
+        (date(2026, 1, 10), 3.0, "Unknown", "unassigned", "", "other"),
+    ])
+
+
+@pytest.mark.parametrize("budget, expected", [
+    (_budget("all"), 21.0),
+    (_budget("dept", entity="DEPT-1"), 17.0),
+    (_budget("dept-prefix", entity="DEPT-10"), 1.0),
+    (_budget("team-cloud", entity="TEAM-1", category="cloud"), 10.0),
+    (_budget("gcp", provider="gcp"), 10.0),
+    (_budget("openai", provider="OpenAI", category="genai"), 5.0),
+    (_budget("feb", entity="TEAM-1", start="2026-02-01", end="2026-02-28"), 7.0),
+    (_budget("boundary", start="2026-01-31", end="2026-02-01"), 9.0),
+    (_budget("nothing", entity="TEAM-9"), 0.0),
+])
+def test_budget_actuals_match_scoping_rules(costs_df, budget, expected):
+    assert actuals_by_budget(costs_df, [budget])[budget["budget_id"]] == pytest.approx(expected)
+
+
+def test_engine_matches_per_budget_filters_on_random_data():
+    rng = random.Random(7)
+    entities = {
+        "TEAM-1": "/DEPT-1/PROJ-1/TEAM-1",
+        "TEAM-2": "/DEPT-1/PROJ-2/TEAM-2",
+        "TEAM-3": "/DEPT-2/PROJ-3/TEAM-3",
+        "PROJ-3": "/DEPT-2/PROJ-3",
+        "unassigned": "",
+    }
+    providers = ["Google Cloud", "Amazon Web Services", "Microsoft Azure", "OpenAI", "Anthropic"]
+    categories = ["cloud", "genai", "subscription"]
+    start = date(2026, 1, 1)
+    rows = []
+    for _ in range(2000):
+        entity = rng.choice(list(entities))
+        rows.append((start + timedelta(days=rng.randrange(120)), round(rng.uniform(0, 50), 2),
+                     rng.choice(providers), entity, entities[entity], rng.choice(categories)))
+    costs_df = _costs(rows)
+
+    scopes = ["DEPT-1", "DEPT-2", "PROJ-1", "PROJ-3", "TEAM-2", None]
+    budgets = []
+    for i in range(200):
+        period_start = start + timedelta(days=rng.randrange(100))
+        budgets.append(_budget(
+            f"b{i}",
+            entity=rng.choice(scopes),
+            category=rng.choice(categories + ["total", None]),
+            provider=rng.choice(["gcp", "aws", "azure", "openai", None]),
+            start=period_start.isoformat(),
+            end=(period_start + timedelta(days=rng.randrange(45))).isoformat(),
+        ))
+
+    actuals = actuals_by_budget(costs_df, budgets)
+
+    for budget in budgets:
+        assert actuals[budget["budget_id"]] == pytest.approx(reference_actual(costs_df, budget), abs=1e-6)
+
+
+def test_empty_costs_give_zero_actuals():
+    assert actuals_by_budget(_costs([]), [_budget("a"), _budget("b", entity="X")]) == {"a": 0.0, "b": 0.0}
+
+
+def test_budget_frame_normalises_keys():
+    frame = build_budget_frame([_budget("a", entity="", category=None, provider="GCP", start=date(2026, 1, 1))])
+
+    assert frame.row(0, named=True) == {
+        "budget_id": "a",
+        "entity_key": "*",
+        "category_key": "total",
+        "provider_key": "gcp",
+        "period_start": date(2026, 1, 1),
+        "period_end": date(2026, 1, 31),
+    }
+
+
+def test_budget_fingerprint_ignores_order_and_tracks_scope():
+    a, b = _budget("a"), _budget("b", entity="TEAM-1")
+
+    assert budget_fingerprint([a, b]) == budget_fingerprint([b, a])
+    assert budget_fingerprint([a, b]) != budget_fingerprint([a, dict(b, period_end="2026-02-28")])
+    assert budget_fingerprint([]) is None
+
+
+# ============================================
+# Service caching
+# ============================================
+
+
+def _service(costs_df, modified):
+    service = object.__new__(BudgetReadService)
+    service.project_id = "test-project"
+    service.budgets_table = "test-project.organizations.org_budgets"
+    service._cache = create_cache("BUDGET_TEST", max_size=10, default_ttl=60)
+    service.client = MagicMock()
+    service.client.get_table.return_value.modified = modified
+    service.client.query.return_value.result.return_value.to_arrow.return_value = costs_df.to_arrow()
+    return service
+
+
+async def test_budget_actuals_cached_per_data_version(costs_df):
+    service = _service(costs_df, datetime(2026, 2, 2, tzinfo=timezone.utc))
+    budgets = [_budget("dept", entity="DEPT-1")]
+
+    first = await service._budget_actuals(TEST_ORG_SLUG, budgets)
+    second = await service._budget_actuals(TEST_ORG_SLUG, budgets)
+
+    assert first == second == {"dept": pytest.approx(17.0)}
+    assert service.client.query.call_count == 1
+
+    # New cost load → new table version → recomputed
+    service.client.get_table.return_value.modified = datetime(2026, 2, 3, tzinfo=timezone.utc)
+    await service._budget_actuals(TEST_ORG_SLUG, budgets)
+    assert service.client.query.call_count == 2
+
+    assert service.invalidate_org_cache(TEST_ORG_SLUG) > 0
+
+
+async def test_budget_actuals_uncached_without_table_version(costs_df):
+    service = _service(costs_df, None)
+    budgets = [_budget("all")]
+
+    await service._budget_actuals(TEST_ORG_SLUG, budgets)
+    await service._budget_actuals(TEST_ORG_SLUG, budgets)
+
+    assert service.client.query.call_count == 2
+
+
+async def test_budget_summary_uses_engine_actuals(costs_df):
+    service = _service(costs_df, None)
+    budget_row = {
+        **_budget("team", entity="TEAM-1", category="cloud"),
+        "hierarchy_entity_name": "Team 1",
+        "hierarchy_path": "/DEPT-1/PROJ-1/TEAM-1",
+        "hierarchy_level_code": "team",
+        "budget_type": "monetary",
+        "budget_amount": 8.0,
+        "currency": "USD",
+        "period_type": "monthly",
+        "period_start": date(2026, 1, 1),
+        "period_end": date(2026, 1, 31),
+    }
+    service._run_query = AsyncMock(return_value=[budget_row])
+
+    summary = await service.get_budget_summary(TEST_ORG_SLUG)
+
+    assert summary.items[0].actual_amount == 10.0
+    assert summary.items[0].is_over_budget is True
+    assert summary.budgets_over == 1
@@ -0,0 +1,108 @@
+"""
+Tests for the materialised x_cost_category column in the dashboard readers.
+
+The FOCUS conversion procedures write x_cost_category at ingestion, so
+CostReadService and BudgetReadService filter with a single equality on it
+instead of provider/source system pattern chains.
+"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import polars as pl
+import pyarrow as pa
+import pytest
+
+from src.core.services.budget_read.service import BudgetReadService
+from src.core.services.cost_read.models import CostQuery
+from src.core.services.cost_read.service import CostReadService
+from src.lib.costs import aggregate_granular
+from src.lib.costs.constants import detect_category, resolve_category_filter
+
+TEST_ORG_SLUG = "test_org"
+
+
+def _params(query_params):
+    return {p.name: getattr(p, "value", None) for p in query_params}
+
+
+@pytest.mark.parametrize("requested, expected", [
+    ("genai", "genai"),
+    ("Cloud", "cloud"),
+    ("saas", "subscription"),
+    ("subscription", "subscription"),
+    ("total", None),
+    (None, None),
+])
+def test_resolve_category_filter(requested, expected):
+    assert resolve_category_filter(requested) == expected
+
+
+@pytest.mark.parametrize("category", ["genai", "cloud", "saas"])
+async def test_fetch_cost_data_filters_on_cost_category(category):
+    service = CostReadService(cache=MagicMock(), agg_cache=MagicMock())
+    service._execute_query = AsyncMock(return_value=pl.DataFrame())
+    query = CostQuery(org_slug=TEST_ORG_SLUG, start_date=date(2026, 1, 1), end_date=date(2026, 1, 31))
+
+    await service._fetch_cost_data(query, category=category)
+
+    sql, query_params = service._execute_query.call_args.args
+    assert "x_cost_category = @cost_category" in sql
+    assert "LOWER(" not in sql and "LIKE '%" not in sql
+    assert _params(query_params)["cost_category"] == resolve_category_filter(category)
+
+
+async def test_fetch_cost_data_without_category_has_no_category_filter():
+    service = CostReadService(cache=MagicMock(), agg_cache=MagicMock())
+    service._execute_query = AsyncMock(return_value=pl.DataFrame())
+
+    await service._fetch_cost_data(CostQuery(org_slug=TEST_ORG_SLUG, start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)))
+
+    sql, query_params = service._execute_query.call_args.args
+    assert "@cost_category" not in sql
+    assert "cost_category" not in _params(query_params)
+
+
+async def test_budget_actual_costs_use_cost_category():
+    service = object.__new__(BudgetReadService)
+    service.project_id = "test-project"
+    service._cache = MagicMock()
+    service.client = MagicMock()
+    service.client.get_table.side_effect = RuntimeError("no table metadata")
+    service.client.query.return_value.result.return_value.to_arrow.return_value = pa.Table.from_pylist([
+        {"charge_date": date(2026, 1, 1), "BilledCost": 12.5, "ServiceProviderName": "OpenAI",
+         "x_hierarchy_entity_id": "unassigned", "x_hierarchy_path": "", "category": "genai"},
+    ])
+
+    df = await service._fetch_actual_costs(TEST_ORG_SLUG, "2026-01-01", "2026-01-31", category="genai")
+
+    sql = service.client.query.call_args.args[0]
+    job_config = service.client.query.call_args.kwargs["job_config"]
+    assert "AND x_cost_category = @cost_category" in sql
+    assert "COALESCE(x_cost_category, 'other') AS category" in sql
+    assert "CASE" not in sql
+    assert "GROUP BY" in sql
+    assert _params(job_config.query_parameters)["cost_category"] == "genai"
+    assert df["category"].to_list() == ["genai"]
+
+
+def test_materialised_category_takes_priority():
+    # GPU infrastructure billed by a cloud vendor but converted by the GenAI pipeline
+    assert detect_category(provider="Amazon Web Services") == "cloud"
+    assert detect_category(provider="Amazon Web Services", cost_category="genai") == "genai"
+    assert detect_category(provider="OpenAI", cost_category="unknown") == "genai"
+
+
+def test_aggregate_granular_uses_cost_category():
+    df = pl.DataFrame({
+        "ChargePeriodStart": [date(2026, 1, 1), date(2026, 1, 1)],
+        "ServiceProviderName": ["Google Cloud Compute", "Google Cloud"],
+        "ServiceCategory": ["genai", "Compute"],
+        "x_source_system": ["genai_costs_daily_unified", "cloud_gcp_billing_raw_daily"],
+        "x_cost_category": ["genai", "cloud"],
+        "BilledCost": [10.0, 5.0],
+    })
+
+    categories = {row["provider"]: row["category"] for row in aggregate_granular(df)}
+
+    assert categories == {"Google Cloud Compute": "genai", "Google Cloud": "cloud"}
@@ -0,0 +1,92 @@
+"""
+Tests for CostReadService running on the local DuckDB BigQuery stand-in.
+
+With bigquery_backend="duckdb" the service's unmodified BigQuery SQL runs
+against cost_data_standard_1_3 built from the onboarding schema, which is what
+the offline read-path benchmarks rely on.
+"""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from src.app.config import settings
+from src.core.engine.bq_client import BigQueryClient
+from src.core.engine.local_bq import get_local_bigquery_client, reset_local_bigquery_client
+from src.core.services._shared import create_cache
+from src.core.services.cost_read.models import CostQuery
+from src.core.services.cost_read.service import CostReadService
+
+ORG_SCHEMAS = Path(__file__).resolve().parents[2] / "configs" / "setup" / "organizations" / "onboarding" / "schemas"
+TEST_ORG_SLUG = "bench_org"
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "bigquery_backend", "duckdb")
+    monkeypatch.setattr(settings, "local_bigquery_data_dir", None)
+    monkeypatch.setattr(settings, "environment", "development")
+    reset_local_bigquery_client()
+
+    local = get_local_bigquery_client()
+    dataset = f"{TEST_ORG_SLUG}_local"
+    local.create_tables_from_schemas(dataset, str(ORG_SCHEMAS), ["cost_data_standard_1_3"])
+    rows = [
+        {
+            "ChargePeriodStart": f"2026-01-{day:02d}T00:00:00Z",
+            "ChargePeriodEnd": f"2026-01-{day:02d}T23:59:59Z",
+            "BilledCost": cost,
+            "EffectiveCost": cost,
+            "BillingCurrency": "USD",
+            "ServiceProviderName": provider,
+            "ServiceName": service_name,
+            "ServiceCategory": category,
+            "x_cost_category": category.lower(),
+            "x_source_system": source,
+            "x_org_slug": TEST_ORG_SLUG,
+            "x_hierarchy_entity_id": "TEAM-BACKEND",
+            "x_hierarchy_path": "/DEPT-ENG/PROJ-PLATFORM/TEAM-BACKEND",
+        }
+        for day in range(1, 11)
+        for provider, service_name, category, source, cost in (
+            ("Google Cloud", "Compute Engine", "Cloud", "cloud_gcp_billing_raw_daily", 10.0),
+            ("OpenAI", "gpt-4o", "GenAI", "genai_costs_daily_unified", 2.5),
+        )
+    ]
+    assert local.insert_rows_json(f"{dataset}.cost_data_standard_1_3", rows) == []
+
+    svc = CostReadService(cache=create_cache("local_bq_costs"), agg_cache=create_cache("local_bq_aggs"))
+    svc._bq_client = BigQueryClient()
+    yield svc
+    reset_local_bigquery_client()
+
+
+def _query(**kwargs):
+    return CostQuery(org_slug=TEST_ORG_SLUG, start_date=date(2026, 1, 1), end_date=date(2026, 1, 31), **kwargs)
+
+
+async def test_summary_and_provider_breakdown(service):
+    assert isinstance(service.bq_client.client, type(get_local_bigquery_client()))
+
+    summary = await service.get_cost_summary(_query())
+    assert summary.success, summary.error
+    assert summary.summary["total_billed_cost"] == pytest.approx(125.0)
+    assert summary.summary["record_count"] == 20
+
+    by_provider = await service.get_cost_by_provider(_query())
+    totals = {row["provider"]: row["total_cost"] for row in by_provider.data}
+    assert totals == {"Google Cloud": pytest.approx(100.0), "OpenAI": pytest.approx(25.0)}
+
+
+async def test_trend_and_provider_filter(service):
+    trend = await service.get_cost_trend(_query())
+    assert trend.success, trend.error
+    assert len(trend.data) == 10
+    assert trend.data[0]["total_cost"] == pytest.approx(12.5)
+
+    costs = await service.get_costs(_query(providers=["OpenAI"]))
+    assert costs.success, costs.error
+    assert {row["ServiceProviderName"] for row in costs.data} == {"OpenAI"}
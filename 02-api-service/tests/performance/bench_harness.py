@@ -0,0 +1,360 @@
+"""
+Benchmark Harness
+
+Measures a callable over repeated runs and records machine-readable results:
+- Latency percentiles (ms) over the timed iterations
+- Throughput (rows/s at p50 latency)
+- Peak RSS of the process while the iterations ran
+- Python allocations (peak traced bytes and net blocks retained) from one
+  extra run under tracemalloc, so tracing does not skew the timings
+
+Results of a suite are written to {BENCH_RESULTS_DIR}/{suite}-{timestamp}.json
+and compared case by case against baselines/{suite}.json. A metric that is
+worse than its baseline by more than BENCH_REGRESSION_THRESHOLD (and by more
+than an absolute floor, so scheduling jitter on the small 10k cases does not
+count) is reported as a regression. BENCH_UPDATE_BASELINE=1 rewrites the
+baseline from the current run instead.
+
+Environment:
+    BENCH_SIZES                 Row counts to run, e.g. "10k,1m,10m" (default "10k")
+    BENCH_ITERATIONS            Timed iterations per case (default 7)
+    BENCH_REGRESSION_THRESHOLD  Allowed relative slowdown/growth (default 0.25)
+    BENCH_TRACE_ALLOCATIONS     "0" skips the tracemalloc run (default on)
+    BENCH_RESULTS_DIR           Where result files go (default ./results next to the suite)
+    BENCH_UPDATE_BASELINE       "1" writes the current results as the new baseline
+
+03-data-pipeline-service/tests/load/bench_harness.py is the source of truth;
+02-api-service/tests/performance carries an identical copy, enforced by
+02-api-service/tests/test_vendored_modules.py.
+"""
+
+import inspect
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SIZES = "10k"
+DEFAULT_ITERATIONS = 7
+DEFAULT_THRESHOLD = 0.25
+
+# (result path, higher is worse, absolute floor below which a change is noise)
+# Throughput is derived from p50 latency, so it is recorded but not compared separately
+REGRESSION_METRICS = (
+    ("latency_ms.p50", True, 25.0),
+    ("rss_growth_mb", True, 32.0),
+    ("alloc_peak_mb", True, 8.0),
+)
+
+_SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ============================================
+# Configuration
+# ============================================
+
+def parse_size(label: str) -> int:
+    """Row count for a size label ("10k" -> 10_000, "1m" -> 1_000_000, "2500" -> 2500)."""
+    label = label.strip().lower()
+    if label and label[-1] in _SIZE_SUFFIXES:
+        return int(float(label[:-1]) * _SIZE_SUFFIXES[label[-1]])
+    return int(label)
+
+
+def bench_sizes() -> List[str]:
+    """Size labels selected by BENCH_SIZES."""
+    return [label.strip().lower() for label in os.environ.get("BENCH_SIZES", DEFAULT_SIZES).split(",") if label.strip()]
+
+
+# ============================================
+# Memory Sampling
+# ============================================
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024 / 1024
+    except OSError:
+        # ru_maxrss is the lifetime peak (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if platform.system() == "Darwin" else peak / 1024
+
+
+class PeakRSSSampler:
+    """Samples RSS on a background thread and keeps the maximum."""
+
+    def __init__(self, interval_seconds: float = 0.005):
+        self.interval_seconds = interval_seconds
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._run, name="bench-rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+        return False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+# ============================================
+# Statistics
+# ============================================
+
+def latency_percentiles(timings: List[float]) -> Dict[str, float]:
+    """min/p50/p95/p99/max/mean/stdev in ms from durations in seconds."""
+    ordered = sorted(timings)
+    n = len(ordered)
+    return {
+        "min": round(ordered[0] * 1000, 3),
+        "p50": round(ordered[int(n * 0.50)] * 1000, 3),
+        "p95": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 3),
+        "p99": round(ordered[min(n - 1, int(n * 0.99))] * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+        "mean": round(statistics.mean(ordered) * 1000, 3),
+        "stdev": round(statistics.stdev(ordered) * 1000, 3) if n > 1 else 0.0,
+    }
+
+
+def _metric(case: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = case
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def find_regressions(case: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Metrics of case that are worse than baseline beyond threshold and floor."""
+    regressions = []
+    for path, higher_is_worse, floor in REGRESSION_METRICS:
+        current, previous = _metric(case, path), _metric(baseline, path)
+        if current is None or not previous:
+            continue
+        delta = current - previous if higher_is_worse else previous - current
+        if delta > previous * threshold and delta > floor:
+            regressions.append(f"{path}: {previous:,.2f} -> {current:,.2f} ({delta / previous:+.0%})")
+    return regressions
+
+
+# ============================================
+# Recorder
+# ============================================
+
+@dataclass
+class BenchmarkRecorder:
+    """
+    Runs and records the cases of one benchmark suite.
+
+    Usage:
+        result = await bench.measure("cost_summary", size, rows, lambda: service.get_cost_summary(q), setup=clear)
+    """
+
+    suite: str
+    baseline_path: Path
+    results_dir: Path
+    threshold: float = DEFAULT_THRESHOLD
+    iterations: int = DEFAULT_ITERATIONS
+    trace_allocations: bool = True
+    update_baseline: bool = False
+    cases: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    regressions: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls, suite: str, suite_dir: Path) -> "BenchmarkRecorder":
+        return cls(
+            suite=suite,
+            baseline_path=suite_dir / "baselines" / f"{suite}.json",
+            results_dir=Path(os.environ.get("BENCH_RESULTS_DIR", str(suite_dir / "results"))),
+            threshold=float(os.environ.get("BENCH_REGRESSION_THRESHOLD", DEFAULT_THRESHOLD)),
+            iterations=max(1, int(os.environ.get("BENCH_ITERATIONS", DEFAULT_ITERATIONS))),
+            trace_allocations=os.environ.get("BENCH_TRACE_ALLOCATIONS", "1") != "0",
+            update_baseline=os.environ.get("BENCH_UPDATE_BASELINE") == "1",
+        )
+
+    def baseline_cases(self) -> Dict[str, Dict[str, Any]]:
+        if not self.baseline_path.exists():
+            return {}
+        with open(self.baseline_path) as f:
+            return json.load(f).get("cases", {})
+
+    async def measure(
+        self,
+        name: str,
+        size: str,
+        rows: int,
+        fn: Callable[[], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        iterations: Optional[int] = None,
+        warmup: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Time fn (sync or async) and record the case as "{name}[{size}]".
+
+        Args:
+            name: Case name (stable across runs, used as baseline key)
+            size: Size label the data was generated for
+            rows: Rows processed per call (for throughput)
+            fn: Callable under test; awaited if it returns an awaitable
+            setup: Untimed callable run before every call (e.g. cache clears)
+            iterations: Timed iterations (default BENCH_ITERATIONS)
+            warmup: Untimed calls before timing
+
+        Returns:
+            The recorded case, including any "regressions" against the baseline
+        """
+        async def call() -> Any:
+            if setup is not None:
+                await _resolve(setup())
+            start = time.perf_counter()
+            await _resolve(fn())
+            return time.perf_counter() - start
+
+        for _ in range(warmup):
+            await call()
+
+        timings = []
+        with PeakRSSSampler() as rss:
+            for _ in range(iterations or self.iterations):
+                timings.append(await call())
+
+        latency = latency_percentiles(timings)
+        case: Dict[str, Any] = {
+            "name": name,
+            "size": size,
+            "rows": rows,
+            "iterations": len(timings),
+            "latency_ms": latency,
+            "throughput_rows_per_s": round(rows / (latency["p50"] / 1000), 1) if latency["p50"] else None,
+            "peak_rss_mb": round(rss.peak_mb, 1),
+            "rss_growth_mb": round(rss.peak_mb - rss.start_mb, 1),
+        }
+
+        if self.trace_allocations:
+            if setup is not None:
+                await _resolve(setup())
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                tracemalloc.reset_peak()
+                await _resolve(fn())
+                _, peak = tracemalloc.get_traced_memory()
+                after = tracemalloc.take_snapshot()
+            finally:
+                tracemalloc.stop()
+            case["alloc_peak_mb"] = round(peak / 1024 / 1024, 2)
+            case["alloc_blocks"] = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+        key = f"{name}[{size}]"
+        baseline = self.baseline_cases().get(key)
+        if baseline and not self.update_baseline:
+            found = find_regressions(case, baseline, self.threshold)
+            if found:
+                case["regressions"] = found
+                self.regressions[key] = found
+        self.cases[key] = case
+        _print_case(key, case)
+        return case
+
+    def assert_no_regressions(self, case: Dict[str, Any]) -> None:
+        """Fail the calling test if case regressed against its baseline."""
+        found = case.get("regressions")
+        if found:
+            raise AssertionError(
+                f"{case['name']}[{case['size']}] regressed beyond {self.threshold:.0%}: " + "; ".join(found)
+            )
+
+    def write(self) -> Optional[Path]:
+        """Write the results file (and the baseline when updating)."""
+        if not self.cases:
+            return None
+        document = {
+            "suite": self.suite,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "environment": environment_info(),
+            "threshold": self.threshold,
+            "cases": self.cases,
+            "regressions": self.regressions,
+        }
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = self.results_dir / f"{self.suite}-{stamp}.json"
+        path.write_text(json.dumps(document, indent=2, sort_keys=True))
+
+        if self.update_baseline:
+            merged = {**self.baseline_cases(), **{
+                key: {k: v for k, v in case.items() if k != "regressions"} for key, case in self.cases.items()
+            }}
+            self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            self.baseline_path.write_text(json.dumps(
+                {"suite": self.suite, "environment": document["environment"], "cases": merged},
+                indent=2, sort_keys=True,
+            ) + "\n")
+        print(f"\nBenchmark results: {path}" + (f" (baseline updated: {self.baseline_path})" if self.update_baseline else ""))
+        return path
+
+
+# ============================================
+# Helpers
+# ============================================
+
+async def _resolve(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def environment_info() -> Dict[str, Any]:
+    """Machine and library versions recorded next to every result."""
+    info: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    for module in ("polars", "pyarrow", "duckdb", "numpy"):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            pass
+    try:
+        info["git_sha"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=2
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        info["git_sha"] = None
+    return info
+
+
+def _print_case(key: str, case: Dict[str, Any]) -> None:
+    latency = case["latency_ms"]
+    line = (
+        f"  {key:<40} p50 {latency['p50']:>9.1f}ms  p95 {latency['p95']:>9.1f}ms  "
+        f"{case['throughput_rows_per_s'] or 0:>12,.0f} rows/s  rss {case['peak_rss_mb']:>7.0f}MB"
+    )
+    if "alloc_peak_mb" in case:
+        line += f"  alloc {case['alloc_peak_mb']:>7.1f}MB/{case['alloc_blocks']:,} blocks"
+    if case.get("regressions"):
+        line += "  REGRESSED"
+    print(line)
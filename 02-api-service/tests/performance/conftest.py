@@ -17,6 +17,7 @@ import statistics
 import pytest
 from typing import List, Dict, Any, Optional
 from contextlib import contextmanager
+from pathlib import Path
 from httpx import AsyncClient, ASGITransport
 from google.cloud import bigquery
 
@@ -327,3 +328,30 @@ def ensure_cleanup(cleanup_fn):
 def cleanup_helper():
     """Fixture for cleanup utilities."""
     return ensure_cleanup
+
+
+# ============================================
+# Benchmark Harness (bench_harness.py)
+# ============================================
+
+def pytest_generate_tests(metafunc):
+    """Run tests that take bench_size once per BENCH_SIZES label."""
+    if "bench_size" in metafunc.fixturenames:
+        from .bench_harness import bench_sizes
+        metafunc.parametrize("bench_size", bench_sizes(), scope="module")
+
+
+@pytest.fixture(scope="module")
+def bench(request):
+    """
+    BenchmarkRecorder for the requesting module.
+
+    The suite is named after the module (test_e2e_read_benchmark -> e2e_read_benchmark);
+    results are written when the module finishes.
+    """
+    from .bench_harness import BenchmarkRecorder
+
+    module_path = Path(request.module.__file__)
+    recorder = BenchmarkRecorder.from_env(module_path.stem.removeprefix("test_"), module_path.parent)
+    yield recorder
+    recorder.write()
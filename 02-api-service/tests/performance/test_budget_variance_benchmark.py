@@ -0,0 +1,115 @@
+"""
+Budget Variance Benchmark
+
+Compares the per-budget filter loop BudgetReadService used to run (one
+date/entity/category/provider filter chain per budget over the cost frame)
+with the vectorised engine in budget_read.variance (key expansion, running
+totals and two as-of joins for all budgets at once).
+
+Runs locally on synthetic data shaped like the _fetch_actual_costs frame:
+1k budgets × 1M daily cost rows by default, configurable with BENCH_BUDGETS
+and BENCH_COST_ROWS.
+
+Run with: pytest -m performance --run-integration tests/performance/test_budget_variance_benchmark.py -v -s
+"""
+
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.core.services.budget_read.variance import PROVIDER_NAME_MAP, actuals_by_budget
+
+pytestmark = [pytest.mark.performance]
+
+PROVIDERS = ["Google Cloud", "Amazon Web Services", "Microsoft Azure", "OpenAI", "Anthropic", "Slack"]
+CATEGORIES = ["cloud", "genai", "subscription"]
+START = date(2025, 1, 1)
+DAYS = 365
+
+
+@pytest.fixture(scope="module")
+def synthetic_org():
+    """Cost frame and budgets for an org with a 4-level hierarchy."""
+    if os.environ.get("RUN_INTEGRATION_TESTS") != "true":
+        pytest.skip("Benchmark requires --run-integration")
+
+    rng = np.random.default_rng(42)
+    rows = int(os.environ.get("BENCH_COST_ROWS", "1000000"))
+    budget_count = int(os.environ.get("BENCH_BUDGETS", "1000"))
+
+    # 5 departments → 25 projects → 250 teams
+    teams = [(f"DEPT-{d}", f"PROJ-{d}-{p}", f"TEAM-{d}-{p}-{t}") for d in range(5) for p in range(5) for t in range(10)]
+    team_idx = rng.integers(0, len(teams), rows)
+    costs_df = pl.DataFrame({
+        "charge_date": [START + timedelta(days=int(d)) for d in rng.integers(0, DAYS, rows)],
+        "BilledCost": rng.uniform(0, 100, rows).round(4),
+        "ServiceProviderName": np.array(PROVIDERS)[rng.integers(0, len(PROVIDERS), rows)],
+        "x_hierarchy_entity_id": [teams[i][2] for i in team_idx],
+        "x_hierarchy_path": [f"/{teams[i][0]}/{teams[i][1]}/{teams[i][2]}" for i in team_idx],
+        "category": np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), rows)],
+    })
+
+    scopes = sorted({entity for team in teams for entity in team}) + [None]
+    budgets = []
+    for i in range(budget_count):
+        month = int(rng.integers(0, 12))
+        period_start = date(2025, month + 1, 1)
+        period_end = (date(2025, month + 2, 1) if month < 11 else date(2026, 1, 1)) - timedelta(days=1)
+        budgets.append({
+            "budget_id": f"budget-{i}",
+            "hierarchy_entity_id": scopes[int(rng.integers(0, len(scopes)))],
+            "category": [*CATEGORIES, "total"][int(rng.integers(0, 4))],
+            "provider": [None, "gcp", "aws", "openai"][int(rng.integers(0, 4))],
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
+        })
+    return costs_df, budgets
+
+
+def legacy_actuals(costs_df: pl.DataFrame, budgets: list) -> dict:
+    """The per-budget loop from BudgetReadService before the engine."""
+    actuals = {}
+    for budget in budgets:
+        df = costs_df.filter(
+            (pl.col("charge_date") >= date.fromisoformat(budget["period_start"])) &
+            (pl.col("charge_date") <= date.fromisoformat(budget["period_end"]))
+        )
+        if budget["category"] and budget["category"] != "total":
+            df = df.filter(pl.col("category") == budget["category"])
+        if budget["provider"]:
+            provider = budget["provider"].lower()
+            names = [provider] + [name for name, short in PROVIDER_NAME_MAP.items() if short == provider]
+            df = df.filter(pl.col("ServiceProviderName").str.to_lowercase().is_in(names))
+        entity_id = budget["hierarchy_entity_id"]
+        if entity_id:
+            df = df.filter(
+                (pl.col("x_hierarchy_entity_id") == entity_id) |
+                pl.col("x_hierarchy_path").str.contains(f"/{entity_id}/", literal=True) |
+                pl.col("x_hierarchy_path").str.ends_with(f"/{entity_id}")
+            )
+        actuals[budget["budget_id"]] = float(df["BilledCost"].sum())
+    return actuals
+
+
+def test_engine_vs_per_budget_loop(synthetic_org):
+    costs_df, budgets = synthetic_org
+
+    start = time.perf_counter()
+    legacy = legacy_actuals(costs_df, budgets)
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    engine = actuals_by_budget(costs_df, budgets)
+    engine_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n{len(budgets)} budgets × {costs_df.height} cost rows")
+    print(f"  per-budget loop: {legacy_ms:>10.0f} ms")
+    print(f"  engine:          {engine_ms:>10.0f} ms  ({legacy_ms / engine_ms:.1f}x)")
+
+    for budget_id, actual in legacy.items():
+        assert engine[budget_id] == pytest.approx(actual, rel=1e-9, abs=1e-6)
+    assert engine_ms < legacy_ms
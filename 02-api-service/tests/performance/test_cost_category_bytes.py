@@ -0,0 +1,119 @@
+"""
+Cost Category Bytes-Scanned Benchmark
+
+Compares bytes processed by the dashboard category filter before and after
+materialising x_cost_category:
+- Before: provider/source system pattern chain (LOWER(...) IN / LIKE '%...%')
+- After: x_cost_category = @cost_category on a table clustered by it
+
+Builds a synthetic cost_data_standard_1_3-shaped table in a scratch dataset
+(partitioned by ChargePeriodStart, clustered like onboarding), runs both
+filters with the query cache disabled and reports total_bytes_processed.
+
+These tests use REAL BigQuery. Rows are configurable with BENCH_ROWS.
+
+Run with: pytest -m performance --run-integration tests/performance/test_cost_category_bytes.py -v -s
+"""
+
+import os
+import uuid
+
+import pytest
+from google.cloud import bigquery
+
+pytestmark = [pytest.mark.performance]
+
+CLUSTERING_FIELDS = ["x_cost_category", "SubAccountId", "ServiceProviderName", "ServiceCategory"]
+
+# Previous CostReadService._fetch_cost_data predicates
+LEGACY_FILTERS = {
+    "cloud": (
+        "(LOWER(ServiceProviderName) IN UNNEST(['gcp', 'aws', 'azure', 'google', 'amazon', 'microsoft', 'oci', 'oracle']) OR "
+        "LOWER(x_source_system) LIKE '%cloud%' OR LOWER(x_source_system) LIKE '%gcp%' OR "
+        "LOWER(x_source_system) LIKE '%aws%' OR LOWER(x_source_system) LIKE '%azure%' OR "
+        "LOWER(x_source_system) LIKE '%oci%')"
+    ),
+    "genai": (
+        "((LOWER(ServiceProviderName) IN UNNEST(['openai', 'anthropic', 'google ai', 'cohere', 'mistral', 'gemini', "
+        "'claude', 'deepseek', 'azure openai', 'aws bedrock', 'vertex ai']) OR "
+        "LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning') OR "
+        "LOWER(x_source_system) LIKE '%genai%' OR LOWER(x_source_system) LIKE '%llm%') AND "
+        "COALESCE(x_source_system, '') != 'subscription_costs_daily')"
+    ),
+    "subscription": "x_source_system = 'subscription_costs_daily'",
+}
+
+
+@pytest.fixture
+def cost_table(bq_client_perf):
+    """Synthetic FOCUS cost table in a throwaway dataset."""
+    rows = int(os.environ.get("BENCH_ROWS", "2000000"))
+    project_id = bq_client_perf.project
+    dataset_id = f"perf_cost_category_{uuid.uuid4().hex[:8]}"
+    table_id = f"{project_id}.{dataset_id}.cost_data_standard_1_3"
+
+    dataset = bigquery.Dataset(f"{project_id}.{dataset_id}")
+    dataset.location = os.environ.get("BIGQUERY_LOCATION", "US")
+    bq_client_perf.create_dataset(dataset)
+
+    try:
+        bq_client_perf.query(f"""
+            CREATE TABLE `{table_id}`
+            PARTITION BY DATE(ChargePeriodStart)
+            CLUSTER BY {", ".join(CLUSTERING_FIELDS)}
+            AS
+            WITH sources AS (
+              SELECT * FROM UNNEST([
+                STRUCT('cloud_gcp_billing_raw_daily' AS x_source_system, 'Google Cloud' AS ServiceProviderName, 'Compute' AS ServiceCategory, 'cloud' AS x_cost_category),
+                ('cloud_aws_billing_raw_daily', 'AWS', 'Storage', 'cloud'),
+                ('cloud_azure_billing_raw_daily', 'Microsoft Azure', 'Databases', 'cloud'),
+                ('genai_costs_daily_unified', 'OpenAI', 'genai', 'genai'),
+                ('genai_costs_daily_unified', 'Anthropic', 'genai', 'genai'),
+                ('subscription_costs_daily', 'Slack', 'subscription', 'subscription')
+              ]) WITH OFFSET AS source_index
+            )
+            SELECT
+              TIMESTAMP(DATE_SUB(DATE '2026-01-31', INTERVAL MOD(n, 30) DAY)) AS ChargePeriodStart,
+              CONCAT('account-', CAST(MOD(n, 50) AS STRING)) AS SubAccountId,
+              s.ServiceProviderName,
+              s.ServiceCategory,
+              s.x_source_system,
+              s.x_cost_category,
+              CONCAT('service-', CAST(MOD(n, 200) AS STRING)) AS ServiceName,
+              CAST(RAND() * 100 AS NUMERIC) AS BilledCost
+            FROM UNNEST(GENERATE_ARRAY(1, {rows})) AS n
+            JOIN sources s ON s.source_index = MOD(n, 6)
+        """).result()
+        yield table_id
+    finally:
+        bq_client_perf.delete_dataset(dataset_id, delete_contents=True, not_found_ok=True)
+
+
+def _bytes_processed(client: bigquery.Client, table_id: str, where: str, params=None) -> int:
+    job = client.query(
+        f"""
+        SELECT SubAccountId, ServiceProviderName, ServiceName, BilledCost
+        FROM `{table_id}`
+        WHERE DATE(ChargePeriodStart) BETWEEN '2026-01-01' AND '2026-01-31'
+          AND {where}
+        """,
+        job_config=bigquery.QueryJobConfig(use_query_cache=False, query_parameters=params or []),
+    )
+    job.result()
+    return job.total_bytes_processed
+
+
+@pytest.mark.parametrize("category", ["cloud", "genai", "subscription"])
+def test_cost_category_equality_scans_fewer_bytes(bq_client_perf, cost_table, category):
+    legacy_bytes = _bytes_processed(bq_client_perf, cost_table, LEGACY_FILTERS[category])
+    materialised_bytes = _bytes_processed(
+        bq_client_perf,
+        cost_table,
+        "x_cost_category = @cost_category",
+        [bigquery.ScalarQueryParameter("cost_category", "STRING", category)],
+    )
+
+    print(f"\n{category}: pattern filter {legacy_bytes / 1e6:.1f} MB | "
+          f"x_cost_category {materialised_bytes / 1e6:.1f} MB "
+          f"({(1 - materialised_bytes / legacy_bytes) * 100:.0f}% less)")
+    assert materialised_bytes < legacy_bytes
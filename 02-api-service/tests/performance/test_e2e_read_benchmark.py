@@ -0,0 +1,329 @@
+"""
+End-to-End Read Path Benchmark
+
+Drives the dashboard read path - CostReadService, UsageReadService,
+BudgetReadService and the Polars aggregations in lib/costs/aggregations.py -
+over synthetic org data on the local DuckDB BigQuery stand-in
+(bigquery_backend="duckdb"), so it runs offline and reproducibly.
+
+Each case is timed cold (service caches cleared before every call) at every
+size in BENCH_SIZES (10k by default; 1m and 10m are opt-in) and recorded with
+tests/performance/bench_harness.py: latency percentiles, throughput, peak RSS
+and allocations go to results/e2e_read_benchmark-*.json and are compared with
+baselines/e2e_read_benchmark.json.
+
+Run with: pytest -m performance --run-integration tests/performance/test_e2e_read_benchmark.py -v -s
+          BENCH_SIZES=10k,1m BENCH_UPDATE_BASELINE=1 pytest ...  (refresh baselines)
+"""
+
+import os
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+pytest.importorskip("duckdb")
+
+from src.app.config import settings
+from src.core.engine.bq_client import BigQueryClient
+from src.core.engine.local_bq import get_local_bigquery_client, reset_local_bigquery_client
+from src.core.services._shared import create_cache
+from src.core.services.budget_read.service import BudgetReadService
+from src.core.services.cost_read.models import CostQuery
+from src.core.services.cost_read.service import CostReadService
+from src.core.services.usage_read.service import UsageReadService
+from src.lib.costs import aggregations
+
+from .bench_harness import parse_size
+
+pytestmark = [pytest.mark.performance]
+
+SETUP_DIR = Path(__file__).resolve().parents[2] / "configs" / "setup"
+ORG_SLUG = "bench_org"
+DATASET = f"{ORG_SLUG}_local"
+DAYS = 90
+END = date.today()
+START = END - timedelta(days=DAYS - 1)
+
+# (provider, x_cost_category, ServiceCategory, x_source_system, services)
+CATALOG = [
+    ("Google Cloud", "cloud", "Compute", "cloud_gcp_billing_raw_daily", ["Compute Engine", "BigQuery", "Cloud Storage"]),
+    ("Amazon Web Services", "cloud", "Compute", "cloud_aws_billing_raw_daily", ["Amazon EC2", "Amazon S3", "Amazon RDS"]),
+    ("Microsoft Azure", "cloud", "Compute", "cloud_azure_billing_raw_daily", ["Virtual Machines", "Blob Storage"]),
+    ("OpenAI", "genai", "AI and Machine Learning", "genai_costs_daily_unified", ["gpt-4o", "gpt-4o-mini"]),
+    ("Anthropic", "genai", "AI and Machine Learning", "genai_costs_daily_unified", ["claude-sonnet", "claude-haiku"]),
+    ("Slack", "subscription", "SaaS", "subscription_costs_daily", ["Slack Pro"]),
+]
+MODELS = [("openai", "gpt-4o"), ("openai", "gpt-4o-mini"), ("anthropic", "claude-sonnet"), ("gemini", "gemini-pro")]
+# 5 departments -> 25 projects -> 250 teams
+TEAMS = [(f"DEPT-{d}", f"PROJ-{d}-{p}", f"TEAM-{d}-{p}-{t}") for d in range(5) for p in range(5) for t in range(10)]
+
+
+# ============================================
+# Synthetic Data
+# ============================================
+
+def _take(values, idx: np.ndarray) -> pa.Array:
+    return pa.array(values).take(pa.array(idx))
+
+
+def _timestamps(day_offsets: np.ndarray, seconds: np.ndarray | int = 0) -> pa.Array:
+    start_us = int(datetime.combine(START, dt_time(), tzinfo=timezone.utc).timestamp()) * 1_000_000
+    return pa.array(start_us + (day_offsets * 86_400 + seconds) * 1_000_000, type=pa.timestamp("us", tz="UTC"))
+
+
+def cost_rows(rows: int, rng: np.random.Generator) -> pa.Table:
+    """FOCUS 1.3 rows spread over providers, services, teams and DAYS days."""
+    services = [(p, cat, svc_cat, src, svc) for p, cat, svc_cat, src, svcs in CATALOG for svc in svcs]
+    service_idx = rng.integers(0, len(services), rows)
+    team_idx = rng.integers(0, len(TEAMS), rows)
+    days = rng.integers(0, DAYS, rows)
+    billed = rng.gamma(2.0, 20.0, rows).round(4)
+    effective = (billed * rng.uniform(0.8, 1.0, rows)).round(4)
+
+    def team(level):
+        return [t[level] for t in TEAMS]
+
+    path = [f"/{d}/{p}/{t}" for d, p, t in TEAMS]
+    run_date = pa.array(np.full(rows, np.datetime64(END)), type=pa.date32())
+    return pa.table({
+        "BillingAccountId": _take([f"acct-{i}" for i in range(8)], rng.integers(0, 8, rows)),
+        "SubAccountId": _take([f"sub-{i}" for i in range(32)], rng.integers(0, 32, rows)),
+        "ServiceProviderName": _take([s[0] for s in services], service_idx),
+        "HostProviderName": _take([s[0] for s in services], service_idx),
+        "InvoiceIssuerName": _take([s[0] for s in services], service_idx),
+        "ServiceCategory": _take([s[2] for s in services], service_idx),
+        "ServiceName": _take([s[4] for s in services], service_idx),
+        "ResourceName": _take([f"resource-{i}" for i in range(500)], rng.integers(0, 500, rows)),
+        "RegionName": _take(["us-central1", "us-east-1", "europe-west1", "global"], rng.integers(0, 4, rows)),
+        "BilledCost": billed,
+        "EffectiveCost": effective,
+        "ListCost": billed,
+        "ContractedCost": effective,
+        "BillingCurrency": _take(["USD"], np.zeros(rows, dtype=np.int64)),
+        "ConsumedQuantity": rng.uniform(0, 1000, rows).round(3),
+        "ConsumedUnit": _take(["Hours", "GiB", "Tokens", "Seats"], rng.integers(0, 4, rows)),
+        "ChargeCategory": _take(["Usage"], np.zeros(rows, dtype=np.int64)),
+        "ChargeClass": _take(["Regular"], np.zeros(rows, dtype=np.int64)),
+        "BillingPeriodStart": _timestamps(days - days % 30),
+        "BillingPeriodEnd": _timestamps(days - days % 30 + 30),
+        "ChargePeriodStart": _timestamps(days),
+        "ChargePeriodEnd": _timestamps(days, 86_399),
+        "x_source_system": _take([s[3] for s in services], service_idx),
+        "x_cost_category": _take([s[1] for s in services], service_idx),
+        "x_hierarchy_entity_id": _take(team(2), team_idx),
+        "x_hierarchy_entity_name": _take([t.title() for t in team(2)], team_idx),
+        "x_hierarchy_level_code": _take(["TEAM"], np.zeros(rows, dtype=np.int64)),
+        "x_hierarchy_path": _take(path, team_idx),
+        "x_hierarchy_path_names": _take([p.replace("/", " > ").strip(" >") for p in path], team_idx),
+        "x_ingestion_date": run_date,
+        "x_pipeline_id": _take([s[3] for s in services], service_idx),
+        "x_credential_id": _take(["bench-credential"], np.zeros(rows, dtype=np.int64)),
+        "x_pipeline_run_date": run_date,
+        "x_run_id": _take(["bench-run"], np.zeros(rows, dtype=np.int64)),
+        "x_ingested_at": _timestamps(np.full(rows, DAYS - 1)),
+    })
+
+
+def usage_rows(rows: int, rng: np.random.Generator) -> pa.Table:
+    """genai_usage_raw request rows over the last DAYS days."""
+    model_idx = rng.integers(0, len(MODELS), rows)
+    input_tokens = rng.integers(10, 8_000, rows)
+    output_tokens = rng.integers(10, 2_000, rows)
+    failed = rng.random(rows) < 0.02
+    return pa.table({
+        "request_id": pa.array([f"req-{i}" for i in range(rows)]),
+        "provider": _take([m[0] for m in MODELS], model_idx),
+        "model": _take([m[1] for m in MODELS], model_idx),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "latency_ms": rng.gamma(2.0, 400.0, rows).round(1),
+        "status": _take(["success", "error"], failed.astype(np.int64)),
+        "error_message": pa.array(np.where(failed, "rate_limited", None)),
+        "request_timestamp": _timestamps(rng.integers(0, DAYS, rows), rng.integers(0, 86_400, rows)),
+        "x_org_slug": _take([ORG_SLUG], np.zeros(rows, dtype=np.int64)),
+    })
+
+
+def budget_rows(count: int, rng: np.random.Generator) -> pa.Table:
+    """Monthly budgets at every hierarchy level for the benchmark window."""
+    entities = sorted({(level, entity) for team in TEAMS for level, entity in zip(("DEPT", "PROJ", "TEAM"), team)})
+    picks = rng.integers(0, len(entities), count)
+    created = datetime.now(timezone.utc)
+    rows = []
+    for i, pick in enumerate(picks):
+        level, entity = entities[pick]
+        month_start = (START + timedelta(days=int(rng.integers(0, DAYS)))).replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        rows.append({
+            "budget_id": f"budget-{i}",
+            "org_slug": ORG_SLUG,
+            "hierarchy_entity_id": entity,
+            "hierarchy_entity_name": entity.title(),
+            "hierarchy_path": next(f"/{d}/{p}/{t}" for d, p, t in TEAMS if entity in (d, p, t)).split(entity)[0] + entity,
+            "hierarchy_level_code": level,
+            "category": ["cloud", "genai", "subscription", "total"][int(rng.integers(0, 4))],
+            "budget_type": "monetary",
+            "budget_amount": float(rng.integers(1_000, 100_000)),
+            "currency": "USD",
+            "period_type": "monthly",
+            "period_start": month_start,
+            "period_end": month_end,
+            "provider": [None, "gcp", "aws", "openai"][int(rng.integers(0, 4))],
+            "is_active": True,
+            "created_by": "bench",
+            "created_at": created,
+            "updated_at": created,
+        })
+    return pa.Table.from_pylist(rows)
+
+
+@pytest.fixture(scope="module")
+def read_env(bench_size, tmp_path_factory):
+    """Stand-in loaded with cost, usage and budget data for one size."""
+    if os.environ.get("RUN_INTEGRATION_TESTS") != "true":
+        pytest.skip("Benchmark requires --run-integration")
+
+    rows = parse_size(bench_size)
+    rng = np.random.default_rng(42)
+    fixtures = tmp_path_factory.mktemp(f"read_{bench_size}")
+    for dataset, table, data in (
+        (DATASET, "cost_data_standard_1_3", cost_rows(rows, rng)),
+        (DATASET, "genai_usage_raw", usage_rows(rows, rng)),
+        ("organizations", "org_budgets", budget_rows(min(1_000, max(100, rows // 1_000)), rng)),
+    ):
+        (fixtures / dataset).mkdir(exist_ok=True)
+        pq.write_table(data, fixtures / dataset / f"{table}.parquet")
+        del data
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "bigquery_backend", "duckdb")
+        mp.setattr(settings, "local_bigquery_data_dir", None)
+        mp.setattr(settings, "environment", "development")
+        reset_local_bigquery_client()
+        local = get_local_bigquery_client()
+        local.create_tables_from_schemas(DATASET, str(SETUP_DIR / "organizations" / "onboarding" / "schemas"), ["cost_data_standard_1_3"])
+        local.create_tables_from_schemas("organizations", str(SETUP_DIR / "bootstrap" / "schemas"), ["org_budgets", "org_budget_allocations"])
+        loaded = local.load_parquet_dir(str(fixtures))
+        assert loaded[f"{DATASET}.cost_data_standard_1_3"] == rows
+
+        bq = BigQueryClient()
+        costs = CostReadService(cache=create_cache("bench_costs"), agg_cache=create_cache("bench_aggs"))
+        costs._bq_client = bq
+        usage = UsageReadService()
+        usage._bq_client = bq
+        budgets = BudgetReadService(settings.gcp_project_id)
+        budgets.bq, budgets.client = bq, bq.client
+        yield {"rows": rows, "costs": costs, "usage": usage, "budgets": budgets}
+        reset_local_bigquery_client()
+
+
+def _cost_query(**kwargs) -> CostQuery:
+    return CostQuery(org_slug=ORG_SLUG, start_date=START, end_date=END, **kwargs)
+
+
+# ============================================
+# Cost Reads
+# ============================================
+
+async def test_cost_read_service(bench, bench_size, read_env):
+    costs, rows = read_env["costs"], read_env["rows"]
+
+    def clear():
+        # Cost cache keys are hashed, so invalidate_org_cache() cannot match them
+        costs._cache.clear()
+        costs._agg_cache.clear()
+
+    async def summary():
+        response = await costs.get_cost_summary(_cost_query())
+        assert response.success, response.error
+        assert response.summary["record_count"] == rows
+
+    async def by_provider():
+        response = await costs.get_cost_by_provider(_cost_query())
+        assert response.success, response.error
+
+    async def trend():
+        response = await costs.get_cost_trend(_cost_query())
+        assert response.success, response.error
+
+    async def granular():
+        response = await costs.get_granular_trend(_cost_query(), clear_cache=True)
+        assert response.success, response.error
+
+    async def genai_filtered():
+        response = await costs.get_genai_costs(_cost_query())
+        assert response.success, response.error
+
+    for name, fn in (
+        ("cost_summary", summary),
+        ("cost_by_provider", by_provider),
+        ("cost_trend", trend),
+        ("cost_granular_trend", granular),
+        ("cost_genai_category", genai_filtered),
+    ):
+        bench.assert_no_regressions(await bench.measure(name, bench_size, rows, fn, setup=clear))
+
+
+# ============================================
+# Polars Aggregations
+# ============================================
+
+async def test_cost_aggregations(bench, bench_size, read_env):
+    costs, rows = read_env["costs"], read_env["rows"]
+    df = await costs._fetch_cost_data(_cost_query())
+    assert df.height == rows
+
+    for name, fn in (
+        ("agg_by_provider", lambda: aggregations.aggregate_by_provider(df)),
+        ("agg_by_service", lambda: aggregations.aggregate_by_service(df)),
+        ("agg_by_category", lambda: aggregations.aggregate_by_category(df)),
+        ("agg_by_date_daily", lambda: aggregations.aggregate_by_date(df)),
+        ("agg_by_date_monthly", lambda: aggregations.aggregate_by_date(df, granularity="monthly")),
+        ("agg_by_hierarchy", lambda: aggregations.aggregate_by_hierarchy(df)),
+        ("agg_provider_by_date", lambda: aggregations.aggregate_provider_by_date(df)),
+        ("agg_granular", lambda: aggregations.aggregate_granular(df)),
+    ):
+        bench.assert_no_regressions(await bench.measure(name, bench_size, rows, fn))
+
+
+# ============================================
+# Usage and Budget Reads
+# ============================================
+
+async def test_usage_read_service(bench, bench_size, read_env):
+    usage, rows = read_env["usage"], read_env["rows"]
+    def clear():
+        usage.invalidate_cache(ORG_SLUG)
+
+    for name, method in (
+        ("usage_summary", usage.get_usage_summary),
+        ("usage_by_provider", usage.get_usage_by_provider),
+        ("usage_by_model", usage.get_usage_by_model),
+        ("usage_daily", usage.get_usage_daily),
+    ):
+        async def call(method=method):
+            response = await method(ORG_SLUG, days=DAYS)
+            assert response.success, response.error
+
+        bench.assert_no_regressions(await bench.measure(name, bench_size, rows, call, setup=clear))
+
+
+async def test_budget_read_service(bench, bench_size, read_env):
+    budgets, rows = read_env["budgets"], read_env["rows"]
+    def clear():
+        budgets.invalidate_org_cache(ORG_SLUG)
+
+    async def summary():
+        response = await budgets.get_budget_summary(ORG_SLUG)
+        assert response.budgets_total > 0
+
+    async def provider_breakdown():
+        await budgets.get_provider_breakdown(ORG_SLUG)
+
+    for name, fn in (("budget_summary", summary), ("budget_provider_breakdown", provider_breakdown)):
+        bench.assert_no_regressions(await bench.measure(name, bench_size, rows, fn, setup=clear))
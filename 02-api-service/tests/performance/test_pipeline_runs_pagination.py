@@ -0,0 +1,146 @@
+"""
+Pipeline Runs Pagination Benchmark
+
+Compares LIMIT/OFFSET + COUNT(*) paging of org_meta_pipeline_runs with
+keyset cursors (start_time, pipeline_logging_id) for an org with 1M+ runs:
+- OFFSET: two jobs per page; deep pages read and discard every earlier row
+- Keyset: one job per page (total from the cached counter); the start_time
+  bound prunes partitions newer than the cursor
+
+Builds a synthetic table shaped like org_meta_pipeline_runs (partitioned by
+start_time, clustered by org_slug, status) in a scratch dataset and pages it
+at several depths with the query cache disabled.
+
+These tests use REAL BigQuery. Rows are configurable with BENCH_RUNS.
+
+Run with: pytest -m performance --run-integration tests/performance/test_pipeline_runs_pagination.py -v -s
+"""
+
+import os
+import statistics
+import time
+import uuid
+
+import pytest
+from google.cloud import bigquery
+
+from src.core.services.pipeline_read import PIPELINE_RUNS_KEYSET
+
+pytestmark = [pytest.mark.performance]
+
+ORG_SLUG = "bench_org"
+PAGE_SIZE = 50
+DEPTHS = [0, 1_000, 100_000, 1_000_000]
+REPEATS = 3
+
+
+@pytest.fixture(scope="module")
+def runs_table():
+    """Synthetic org_meta_pipeline_runs table in a throwaway dataset."""
+    if os.environ.get("GCP_PROJECT_ID") in ["test-project", None]:
+        pytest.skip("Performance tests require real GCP credentials")
+
+    client = bigquery.Client(project=os.environ["GCP_PROJECT_ID"])
+    runs = int(os.environ.get("BENCH_RUNS", "1200000"))
+    dataset_id = f"perf_pipeline_runs_{uuid.uuid4().hex[:8]}"
+    table_id = f"{client.project}.{dataset_id}.org_meta_pipeline_runs"
+
+    dataset = bigquery.Dataset(f"{client.project}.{dataset_id}")
+    dataset.location = os.environ.get("BIGQUERY_LOCATION", "US")
+    client.create_dataset(dataset)
+
+    try:
+        # ~90% of runs belong to the benchmark org, spread over a year of partitions
+        client.query(f"""
+            CREATE TABLE `{table_id}`
+            PARTITION BY DATE(start_time)
+            CLUSTER BY org_slug, status
+            AS
+            SELECT
+              GENERATE_UUID() AS pipeline_logging_id,
+              IF(MOD(n, 10) = 0, 'other_org', '{ORG_SLUG}') AS org_slug,
+              CONCAT('genai/payg/provider_', CAST(MOD(n, 12) AS STRING)) AS pipeline_id,
+              ['COMPLETED', 'COMPLETED', 'COMPLETED', 'FAILED'][OFFSET(MOD(n, 4))] AS status,
+              'scheduler' AS trigger_type,
+              CAST(NULL AS STRING) AS trigger_by,
+              TIMESTAMP_SUB(TIMESTAMP '2026-01-01', INTERVAL DIV(n * 31536, {runs}) * 1000 SECOND) AS start_time,
+              CAST(NULL AS TIMESTAMP) AS end_time,
+              CAST(MOD(n, 600000) AS INT64) AS duration_ms,
+              DATE '2025-12-31' AS run_date,
+              CAST(NULL AS STRING) AS error_message,
+              CAST(NULL AS STRING) AS error_context,
+              CAST(NULL AS STRING) AS parameters
+            FROM UNNEST(GENERATE_ARRAY(1, {runs})) AS n
+        """).result()
+        yield client, table_id
+    finally:
+        client.delete_dataset(dataset_id, delete_contents=True, not_found_ok=True)
+
+
+def _run(client: bigquery.Client, sql: str, params) -> bigquery.QueryJob:
+    job = client.query(sql, job_config=bigquery.QueryJobConfig(use_query_cache=False, query_parameters=params))
+    job.result()
+    return job
+
+
+def _timed(fn):
+    timings, jobs = [], None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        jobs = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), jobs
+
+
+def test_keyset_vs_offset_latency(runs_table):
+    client, table_id = runs_table
+    org_param = [bigquery.ScalarQueryParameter("org_slug", "STRING", ORG_SLUG)]
+    columns = "pipeline_logging_id, pipeline_id, status, trigger_type, start_time, end_time, duration_ms, run_date"
+
+    # Boundary row before each depth, i.e. what next_cursor would point at
+    boundaries = {
+        row["depth"]: row for row in _run(client, f"""
+            SELECT * FROM (
+              SELECT start_time, pipeline_logging_id,
+                     ROW_NUMBER() OVER (ORDER BY {PIPELINE_RUNS_KEYSET.order_by}) AS depth
+              FROM `{table_id}` WHERE org_slug = @org_slug
+            ) WHERE depth IN UNNEST(@depths)
+        """, org_param + [bigquery.ArrayQueryParameter("depths", "INT64", [d for d in DEPTHS if d])]).result()
+    }
+    signature = PIPELINE_RUNS_KEYSET.filter_signature({"org_slug": ORG_SLUG})
+
+    print(f"\n{'depth':>10} | {'offset+count ms':>15} | {'offset MB':>10} | {'keyset ms':>10} | {'keyset MB':>10}")
+    for depth in DEPTHS:
+        if depth and depth not in boundaries:
+            continue
+
+        def offset_page():
+            count = _run(client, f"SELECT COUNT(*) AS total FROM `{table_id}` WHERE org_slug = @org_slug", org_param)
+            page = _run(client, f"""
+                SELECT {columns} FROM `{table_id}` WHERE org_slug = @org_slug
+                ORDER BY {PIPELINE_RUNS_KEYSET.order_by} LIMIT @limit OFFSET @offset
+            """, org_param + [
+                bigquery.ScalarQueryParameter("limit", "INT64", PAGE_SIZE + 1),
+                bigquery.ScalarQueryParameter("offset", "INT64", depth),
+            ])
+            return [count, page]
+
+        def keyset_page():
+            seek_sql, seek_params = "", []
+            if depth:
+                cursor = PIPELINE_RUNS_KEYSET.encode_cursor(boundaries[depth], signature)
+                seek_sql, seek_params = PIPELINE_RUNS_KEYSET.seek(PIPELINE_RUNS_KEYSET.decode_cursor(cursor, signature))
+                seek_sql = f" AND {seek_sql}"
+            page = _run(client, f"""
+                SELECT {columns} FROM `{table_id}` WHERE org_slug = @org_slug{seek_sql}
+                ORDER BY {PIPELINE_RUNS_KEYSET.order_by} LIMIT @limit
+            """, org_param + seek_params + [bigquery.ScalarQueryParameter("limit", "INT64", PAGE_SIZE + 1)])
+            return [page]
+
+        offset_ms, offset_jobs = _timed(offset_page)
+        keyset_ms, keyset_jobs = _timed(keyset_page)
+        offset_bytes = sum(job.total_bytes_processed for job in offset_jobs)
+        keyset_bytes = sum(job.total_bytes_processed for job in keyset_jobs)
+
+        print(f"{depth:>10} | {offset_ms:>15.0f} | {offset_bytes / 1e6:>10.1f} | {keyset_ms:>10.0f} | {keyset_bytes / 1e6:>10.1f}")
+        assert keyset_bytes <= offset_bytes
@@ -0,0 +1,200 @@
+"""
+Tests for keyset (cursor) pagination of pipeline log reads.
+
+Covers the shared KeysetSpec cursor/seek helpers, the cached row counter and
+PipelineReadService._build_runs_query.
+"""
+
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.services._shared.pagination import (
+    InvalidCursorError,
+    KeysetSpec,
+    SortKey,
+    reset_row_count_cache,
+    resolve_total,
+    split_page,
+)
+from src.core.services.pipeline_read import PIPELINE_RUNS_KEYSET, PipelineQuery
+from src.core.services.pipeline_read.service import PipelineReadService
+
+ASC_KEYSET = KeysetSpec(
+    kind="test_steps",
+    keys=(SortKey("step_index", "INT64"), SortKey("step_logging_id", "STRING")),
+    descending=False,
+)
+
+
+def _params(query_params):
+    return {p.name: p.value for p in query_params}
+
+
+@pytest.fixture(autouse=True)
+def fresh_count_cache():
+    reset_row_count_cache()
+    yield
+    reset_row_count_cache()
+
+
+# ============================================
+# Cursor Encoding
+# ============================================
+
+class TestCursor:
+    def test_round_trip_preserves_typed_values(self):
+        signature = PIPELINE_RUNS_KEYSET.filter_signature({"org_slug": "acme"})
+        start = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+        cursor = PIPELINE_RUNS_KEYSET.encode_cursor(
+            {"start_time": start, "pipeline_logging_id": "run-1", "status": "FAILED"}, signature
+        )
+
+        assert "=" not in cursor
+        assert PIPELINE_RUNS_KEYSET.decode_cursor(cursor, signature) == [start, "run-1"]
+
+    def test_int_keys_round_trip(self):
+        signature = ASC_KEYSET.filter_signature({"pipeline_logging_id": "run-1"})
+        cursor = ASC_KEYSET.encode_cursor({"step_index": 3, "step_logging_id": "step-3"}, signature)
+
+        assert ASC_KEYSET.decode_cursor(cursor, signature) == [3, "step-3"]
+
+    def test_rejects_cursor_for_other_filters(self):
+        cursor = PIPELINE_RUNS_KEYSET.encode_cursor(
+            {"start_time": datetime(2026, 3, 1), "pipeline_logging_id": "run-1"},
+            PIPELINE_RUNS_KEYSET.filter_signature({"org_slug": "acme"}),
+        )
+
+        with pytest.raises(InvalidCursorError):
+            PIPELINE_RUNS_KEYSET.decode_cursor(cursor, PIPELINE_RUNS_KEYSET.filter_signature({"org_slug": "other"}))
+
+    def test_rejects_cursor_for_other_endpoint(self):
+        signature = "same"
+        cursor = ASC_KEYSET.encode_cursor({"step_index": 1, "step_logging_id": "s"}, signature)
+
+        with pytest.raises(InvalidCursorError):
+            PIPELINE_RUNS_KEYSET.decode_cursor(cursor, signature)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "e30", "eyJrIjoidGVzdF9zdGVwcyIsImYiOiJ4IiwidiI6WyJ4Il19"])
+    def test_rejects_malformed_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            ASC_KEYSET.decode_cursor(cursor, "x")
+
+
+# ============================================
+# Seek Predicate
+# ============================================
+
+class TestSeek:
+    def test_descending_seek_bounds_partition_column(self):
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        sql, params = PIPELINE_RUNS_KEYSET.seek([start, "run-1"])
+
+        assert sql.startswith("start_time <= @cursor_start_time AND (")
+        assert "(start_time < @cursor_start_time)" in sql
+        assert "(start_time = @cursor_start_time AND pipeline_logging_id < @cursor_pipeline_logging_id)" in sql
+        assert _params(params) == {"cursor_start_time": start, "cursor_pipeline_logging_id": "run-1"}
+        assert PIPELINE_RUNS_KEYSET.order_by == "start_time DESC, pipeline_logging_id DESC"
+
+    def test_ascending_seek(self):
+        sql, _ = ASC_KEYSET.seek([2, "step-2"])
+
+        assert sql.startswith("step_index >= @cursor_step_index")
+        assert "step_logging_id > @cursor_step_logging_id" in sql
+        assert ASC_KEYSET.order_by == "step_index ASC, step_logging_id ASC"
+
+    def test_seek_matches_python_ordering(self):
+        # Simulate the predicate over a page boundary with tied timestamps
+        rows = sorted(
+            [(t, f"run-{i}") for i, t in enumerate([5, 5, 5, 4, 4, 3, 2, 2, 1])],
+            reverse=True,
+        )
+        seen, cursor = [], None
+        while True:
+            candidates = [r for r in rows if cursor is None or r < cursor]
+            page, has_more = split_page(candidates, 2)
+            seen.extend(page)
+            if not has_more:
+                break
+            cursor = page[-1]
+
+        assert seen == rows
+
+    def test_split_page(self):
+        assert split_page([1, 2, 3], 2) == ([1, 2], True)
+        assert split_page([1, 2], 2) == ([1, 2], False)
+
+
+# ============================================
+# Cached Row Counter
+# ============================================
+
+class TestResolveTotal:
+    def test_exact_always_counts(self):
+        count_fn = MagicMock(return_value=10)
+
+        assert resolve_total("sig", count_fn, estimate=False) == (10, False)
+        assert resolve_total("sig", count_fn, estimate=False) == (10, False)
+        assert count_fn.call_count == 2
+
+    def test_estimate_served_from_cache(self):
+        resolve_total("sig", MagicMock(return_value=1_200_000), estimate=False)
+        count_fn = MagicMock(return_value=1_300_000)
+
+        assert resolve_total("sig", count_fn, estimate=True) == (1_200_000, True)
+        count_fn.assert_not_called()
+
+    def test_estimate_miss_counts_once(self):
+        count_fn = MagicMock(return_value=7)
+
+        assert resolve_total("sig", count_fn, estimate=True) == (7, False)
+        assert resolve_total("sig", count_fn, estimate=True) == (7, True)
+        assert count_fn.call_count == 1
+
+
+# ============================================
+# PipelineReadService
+# ============================================
+
+class TestBuildRunsQuery:
+    def _service(self):
+        service = PipelineReadService()
+        service._project_id = "test-project"
+        return service
+
+    def _query(self, **kwargs):
+        return PipelineQuery(
+            org_slug="acme_corp", start_date=date(2026, 3, 1), end_date=date(2026, 3, 31), limit=25, **kwargs
+        )
+
+    def test_offset_query_kept_for_compatibility(self):
+        sql, params = self._service()._build_runs_query(self._query(offset=50))
+
+        assert "@cursor_start_time" not in sql
+        assert "ORDER BY start_time DESC, pipeline_logging_id DESC" in sql
+        assert _params(params)["offset"] == 50
+        assert _params(params)["limit"] == 26
+
+    def test_cursor_query_seeks_without_offset(self):
+        first = self._query()
+        cursor = PIPELINE_RUNS_KEYSET.encode_cursor(
+            {"start_time": datetime(2026, 3, 15, 8, tzinfo=timezone.utc), "pipeline_logging_id": "run-9"},
+            first.filter_signature(),
+        )
+
+        sql, params = self._service()._build_runs_query(self._query(cursor=cursor))
+
+        assert "start_time <= @cursor_start_time" in sql
+        assert _params(params)["offset"] == 0
+        assert _params(params)["cursor_pipeline_logging_id"] == "run-9"
+
+    def test_cursor_bound_to_filters(self):
+        cursor = PIPELINE_RUNS_KEYSET.encode_cursor(
+            {"start_time": datetime(2026, 3, 15), "pipeline_logging_id": "run-9"},
+            self._query().filter_signature(),
+        )
+
+        with pytest.raises(InvalidCursorError):
+            self._service()._build_runs_query(self._query(cursor=cursor, trigger_type="scheduler"))
@@ -0,0 +1,224 @@
+"""
+Tests for the streaming pipeline log exporter.
+
+Uses a fake BigQuery client that answers keyset-paged queries from in-memory
+rows, so paging, partition bounds and output formats are checked without
+BigQuery.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.core.services.pipeline_read.log_export import (
+    EXPORT_CSV_COLUMNS,
+    PipelineLogExporter,
+    encode_stream,
+)
+
+T0 = datetime(2026, 2, 1, 6, 0, tzinfo=timezone.utc)
+
+
+class FakeBigQuery:
+    """Serves runs/steps/transitions in pages, honouring cursor parameters."""
+
+    def __init__(self, runs, steps, transitions, fail_on=None):
+        self.tables = {
+            "org_meta_pipeline_runs": (runs, ("start_time", "pipeline_logging_id"), True),
+            "org_meta_step_logs": (steps, ("pipeline_logging_id", "step_index", "step_logging_id"), False),
+            "org_meta_state_transitions": (transitions, ("transition_time", "transition_id"), False),
+        }
+        self.calls = []
+        self.fail_on = fail_on
+
+    def query(self, sql, parameters=None):
+        params = {p.name: p.values if hasattr(p, "values") else p.value for p in parameters or []}
+        self.calls.append((sql, params))
+        table = next(name for name in self.tables if f".{name}`" in sql)
+        if table == self.fail_on:
+            raise RuntimeError("quota exceeded")
+        rows, keys, descending = self.tables[table]
+
+        ids = params.get("pipeline_logging_ids") or (
+            [params["pipeline_logging_id"]] if "pipeline_logging_id" in params else None
+        )
+        selected = [row for row in rows if ids is None or row["pipeline_logging_id"] in ids]
+        selected.sort(key=lambda row: tuple(row[k] for k in keys), reverse=descending)
+
+        if f"cursor_{keys[0]}" in params:
+            cursor = tuple(params[f"cursor_{k}"] for k in keys)
+            selected = [
+                row for row in selected
+                if (tuple(row[k] for k in keys) < cursor if descending else tuple(row[k] for k in keys) > cursor)
+            ]
+        return iter(selected[:params.get("page_size", len(selected))])
+
+
+def _run(i):
+    return {
+        "pipeline_logging_id": f"run-{i:03d}",
+        "pipeline_id": "genai/payg/openai",
+        "status": "FAILED" if i % 2 else "COMPLETED",
+        "trigger_type": "scheduler",
+        "trigger_by": None,
+        "start_time": T0 + timedelta(hours=i),
+        "end_time": None,
+        "duration_ms": 1000,
+        "run_date": date(2026, 2, 1),
+        "error_message": "boom" if i % 2 else None,
+        "error_context": '{"error_type": "TRANSIENT"}' if i % 2 else None,
+        "parameters": '{"date": "2026-01-31"}',
+        "run_metadata": None,
+    }
+
+
+def _steps(run, count):
+    return [{
+        "pipeline_logging_id": run["pipeline_logging_id"],
+        "step_logging_id": f"{run['pipeline_logging_id']}-step-{n}",
+        "step_name": f"step_{n}",
+        "step_type": "gcp.bq_etl",
+        "step_index": n,
+        "status": "COMPLETED",
+        "start_time": run["start_time"] + timedelta(minutes=n),
+        "end_time": None,
+        "duration_ms": 10,
+        "rows_processed": n * 100,
+        "error_message": None,
+        "error_context": None,
+        "metadata": "not json",
+    } for n in range(count)]
+
+
+def _transitions(run, count):
+    return [{
+        "transition_id": f"{run['pipeline_logging_id']}-t-{n}",
+        "pipeline_logging_id": run["pipeline_logging_id"],
+        "step_logging_id": None,
+        "entity_type": "PIPELINE",
+        "from_state": "PENDING",
+        "to_state": "RUNNING",
+        "transition_time": run["start_time"] + timedelta(seconds=n),
+        "error_type": None,
+        "error_message": None,
+        "retry_count": 0,
+        "duration_in_state_ms": 5,
+        "metadata": None,
+    } for n in range(count)]
+
+
+@pytest.fixture
+def fake_bq():
+    runs = [_run(i) for i in range(5)]
+    steps = [step for run in runs for step in _steps(run, 7)]
+    transitions = [t for run in runs for t in _transitions(run, 3)]
+    return FakeBigQuery(runs, steps, transitions)
+
+
+def _exporter(bq, **kwargs):
+    return PipelineLogExporter(bq, "test-project", page_size=4, run_batch_size=2, **kwargs)
+
+
+def test_steps_paged_with_keyset_and_partition_bound(fake_bq):
+    exporter = _exporter(fake_bq)
+    run = fake_bq.tables["org_meta_pipeline_runs"][0][3]
+
+    steps = list(exporter.iter_steps("acme", [run]))
+
+    assert [s["step_index"] for s in steps] == list(range(7))
+    step_calls = [(sql, params) for sql, params in fake_bq.calls if "org_meta_step_logs" in sql]
+    assert len(step_calls) == 2
+    assert "OFFSET" not in step_calls[1][0]
+    assert step_calls[1][1]["cursor_step_index"] == 3
+    assert "start_time >= TIMESTAMP_SUB(@min_run_start, INTERVAL 1 DAY)" in step_calls[0][0]
+    assert step_calls[0][1]["min_run_start"] == run["start_time"]
+
+
+def test_run_batches_newest_first_and_capped(fake_bq):
+    batches = list(_exporter(fake_bq).iter_run_batches("acme", start_date=date(2026, 2, 1), end_date=date(2026, 2, 1), max_runs=3))
+
+    assert [[r["pipeline_logging_id"] for r in batch] for batch in batches] == [["run-004", "run-003"], ["run-002"]]
+    sql, params = fake_bq.calls[0]
+    assert "start_time >= TIMESTAMP(@start_date)" in sql
+    assert params["end_date"] == date(2026, 2, 1)
+
+
+def test_multi_run_ndjson_export(fake_bq):
+    exporter = _exporter(fake_bq)
+    batches = exporter.iter_run_batches("acme", pipeline_logging_ids=["run-001", "run-002"])
+
+    records = [json.loads(line) for line in "".join(exporter.stream_records("acme", batches, "ndjson")).splitlines()]
+
+    counts = {}
+    for record in records:
+        counts[record["record_type"]] = counts.get(record["record_type"], 0) + 1
+    assert counts == {"run": 2, "step": 14, "transition": 6}
+    failed_run = next(r for r in records if r["record_type"] == "run" and r["pipeline_logging_id"] == "run-001")
+    assert failed_run["error_context"] == {"error_type": "TRANSIENT"}
+    assert failed_run["parameters"] == {"date": "2026-01-31"}
+    assert next(r for r in records if r["record_type"] == "step")["metadata"] == {"raw": "not json"}
+
+
+def test_multi_run_csv_export(fake_bq):
+    exporter = _exporter(fake_bq)
+    batches = exporter.iter_run_batches("acme", pipeline_logging_ids=["run-001"])
+
+    rows = list(csv.DictReader(io.StringIO("".join(exporter.stream_records("acme", batches, "csv")))))
+
+    assert list(rows[0].keys()) == EXPORT_CSV_COLUMNS
+    assert rows[0]["record_type"] == "run"
+    assert json.loads(rows[0]["error_context"]) == {"error_type": "TRANSIENT"}
+    assert sum(row["record_type"] == "step" for row in rows) == 7
+
+
+def test_export_failure_written_as_error_record():
+    run = _run(1)
+    bq = FakeBigQuery([run], _steps(run, 2), [], fail_on="org_meta_state_transitions")
+    exporter = _exporter(bq)
+
+    lines = "".join(exporter.stream_records("acme", [[run]], "ndjson")).splitlines()
+
+    assert json.loads(lines[-1])["record_type"] == "error"
+    assert len(lines) == 4  # run, 2 steps, error
+
+
+def test_single_run_json_document(fake_bq):
+    exporter = _exporter(fake_bq)
+    run = exporter.fetch_run("acme", "run-001")
+
+    document = json.loads("".join(exporter.stream_run_json("acme", run)))
+
+    assert document["pipeline_logging_id"] == "run-001"
+    assert len(document["steps"]) == 7
+    assert len(document["transitions"]) == 3
+
+
+def test_single_run_csv_sections(fake_bq):
+    exporter = _exporter(fake_bq)
+    run = exporter.fetch_run("acme", "run-002")
+
+    rows = list(csv.reader(io.StringIO("".join(exporter.stream_run_csv("acme", run)))))
+
+    assert rows[0] == ["Run Summary"]
+    assert ["Steps"] in rows and ["State Transitions"] in rows
+    assert rows.index(["State Transitions"]) - rows.index(["Steps"]) == 7 + 3
+
+
+def test_encode_stream_gzip_round_trip():
+    chunks = [f'{{"n": {i}}}\n' for i in range(20000)]
+
+    encoded = list(encode_stream(iter(chunks), compress=True))
+
+    assert len(encoded) >= 1
+    assert gzip.decompress(b"".join(encoded)).decode() == "".join(chunks)
+
+
+def test_encode_stream_batches_output():
+    encoded = list(encode_stream(("x" * 1000 for _ in range(200)), compress=False))
+
+    assert len(encoded) == 4
+    assert sum(len(chunk) for chunk in encoded) == 200_000
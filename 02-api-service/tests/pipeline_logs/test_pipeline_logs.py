@@ -221,6 +221,78 @@ class TestListPipelineRuns:
         data = response.json()
         assert data["total"] == 0
         assert data["runs"] == []
+        assert data["next_cursor"] is None
+        assert data["has_more"] is False
+
+    @pytest.mark.asyncio
+    async def test_list_runs_cursor_pagination(self, test_client, mock_bq_client):
+        """Test keyset cursor paging with the total served from the cached counter."""
+        from src.core.services._shared.pagination import reset_row_count_cache
+        reset_row_count_cache()
+
+        def run_row(run_id, hour):
+            return {
+                "pipeline_logging_id": run_id,
+                "pipeline_id": "test/pipeline",
+                "status": "COMPLETED",
+                "trigger_type": "api",
+                "trigger_by": None,
+                "start_time": datetime(2025, 1, 15, hour, 0),
+                "end_time": None,
+                "duration_ms": None,
+                "run_date": date(2025, 1, 15),
+                "error_message": None,
+                "parameters": None
+            }
+
+        # First page: count + limit + 1 rows
+        mock_bq_client.query.side_effect = [
+            [{"total": 3}],
+            [run_row("run-003", 12), run_row("run-002", 11)],
+        ]
+        response = await test_client.get("/api/v1/pipelines/test_org/runs", params={"limit": 1})
+
+        assert response.status_code == 200
+        first_page = response.json()
+        assert first_page["has_more"] is True
+        assert first_page["total_is_estimate"] is False
+        assert [run["pipeline_logging_id"] for run in first_page["runs"]] == ["run-003"]
+
+        # Next page: only the page query runs, seeking past run-003
+        mock_bq_client.query.reset_mock()
+        mock_bq_client.query.side_effect = [[run_row("run-002", 11)]]
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/runs",
+            params={"limit": 1, "cursor": first_page["next_cursor"]}
+        )
+
+        assert response.status_code == 200
+        second_page = response.json()
+        assert second_page["total"] == 3
+        assert second_page["total_is_estimate"] is True
+        assert second_page["has_more"] is False
+        assert second_page["next_cursor"] is None
+        assert mock_bq_client.query.call_count == 1
+        sql = mock_bq_client.query.call_args.args[0]
+        assert "start_time <= @cursor_start_time" in sql
+        assert "ORDER BY start_time DESC, pipeline_logging_id DESC" in sql
+
+    @pytest.mark.asyncio
+    async def test_list_runs_rejects_cursor_from_other_filters(self, test_client, mock_bq_client):
+        """Test that a cursor cannot be replayed with different filters."""
+        from src.core.services.pipeline_read import PIPELINE_RUNS_KEYSET
+
+        cursor = PIPELINE_RUNS_KEYSET.encode_cursor(
+            {"start_time": datetime(2025, 1, 15, 10, 0), "pipeline_logging_id": "run-001"},
+            PIPELINE_RUNS_KEYSET.filter_signature({"org_slug": "test_org"}),
+        )
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/runs",
+            params={"cursor": cursor, "status_filter": "FAILED"}
+        )
+
+        assert response.status_code == 400
+        mock_bq_client.query.assert_not_called()
 
 
 # ============================================
@@ -504,7 +576,8 @@ class TestDownloadPipelineLogs:
                 "parameters": None,
                 "run_metadata": None
             }],
-            []  # No steps
+            [],  # No steps
+            []  # No state transitions
         ]
 
         response = await test_client.get(
@@ -534,7 +607,8 @@ class TestDownloadPipelineLogs:
                 "parameters": None,
                 "run_metadata": None
             }],
-            []  # No steps
+            [],  # No steps
+            []  # No state transitions
         ]
 
         response = await test_client.get(
@@ -555,6 +629,63 @@ class TestDownloadPipelineLogs:
 
         assert response.status_code == 400
 
+    @pytest.mark.asyncio
+    async def test_download_gzip_ndjson(self, test_client, mock_bq_client):
+        """Test streaming a gzipped NDJSON download."""
+        import gzip
+        import json
+
+        mock_bq_client.query.side_effect = [
+            [{
+                "pipeline_logging_id": "run-001",
+                "pipeline_id": "openai/cost/usage_cost",
+                "status": "FAILED",
+                "trigger_type": "api",
+                "trigger_by": None,
+                "start_time": datetime(2025, 1, 15, 10, 0),
+                "end_time": datetime(2025, 1, 15, 10, 5),
+                "duration_ms": 300000,
+                "run_date": date(2025, 1, 15),
+                "error_message": "boom",
+                "parameters": None,
+                "run_metadata": None
+            }],
+            [],
+            []
+        ]
+
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/runs/run-001/download",
+            params={"format": "ndjson", "compress": True}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'pipeline_run_run-001.ndjson.gz' in response.headers["content-disposition"]
+        records = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+        assert records[0]["record_type"] == "run"
+        assert records[0]["error_message"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_download_not_found(self, test_client, mock_bq_client):
+        """Test that a missing run is a 404 before streaming starts."""
+        mock_bq_client.query.side_effect = [[]]
+
+        response = await test_client.get("/api/v1/pipelines/test_org/runs/missing/download")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_export_requires_runs_or_date_range(self, test_client, mock_bq_client):
+        """Test that a multi-run export needs run IDs or a full date range."""
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/logs/export",
+            params={"start_date": "2025-01-01"}
+        )
+
+        assert response.status_code == 400
+        mock_bq_client.query.assert_not_called()
+
 
 # ============================================
 # Error Handling Tests
@@ -626,3 +757,21 @@ class TestPipelineLogsInputValidation:
             params={"offset": -1}
         )
         assert response.status_code == 422  # Validation error
+
+    @pytest.mark.asyncio
+    async def test_cursor_with_offset_rejected(self, test_client, mock_bq_client):
+        """Test that cursor and offset cannot be combined."""
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/runs",
+            params={"cursor": "abc", "offset": 10}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_rejected(self, test_client, mock_bq_client):
+        """Test that a malformed cursor returns 400 instead of 500."""
+        response = await test_client.get(
+            "/api/v1/pipelines/test_org/runs/run-001/steps",
+            params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
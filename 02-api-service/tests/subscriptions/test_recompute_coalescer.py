@@ -0,0 +1,116 @@
+"""
+Tests for coalesced, targeted subscription cost recomputes.
+
+trigger_subscription_cost_pipeline is patched, so these check batching,
+window merging and busy retries without the pipeline service.
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.utils import pipeline_trigger
+from src.core.utils.pipeline_trigger import SubscriptionRecomputeCoalescer
+
+TRIGGER = "src.core.utils.pipeline_trigger.trigger_subscription_cost_pipeline"
+
+
+@pytest.fixture
+def coalescer():
+    return SubscriptionRecomputeCoalescer(debounce_seconds=0.01, busy_retry_seconds=0.01, max_attempts=5)
+
+
+async def test_burst_of_edits_triggers_one_targeted_run(coalescer):
+    trigger = AsyncMock(return_value={"success": True, "status": "PENDING"})
+    with patch(TRIGGER, trigger):
+        result = coalescer.schedule("acme", "key", ["sub_a"], start_date=date(2026, 3, 10))
+        coalescer.schedule("acme", "key", ["sub_a", "sub_b"], start_date=date(2026, 3, 1))
+        coalescer.schedule("acme", "key", ["sub_c"], start_date=date(2026, 3, 20), end_date=date(2026, 3, 31))
+        await coalescer.drain()
+
+    assert result["status"] == "QUEUED"
+    trigger.assert_awaited_once()
+    kwargs = trigger.await_args.kwargs
+    assert kwargs["org_slug"] == "acme"
+    assert kwargs["subscription_ids"] == ["sub_a", "sub_b", "sub_c"]
+    assert kwargs["start_date"] == date(2026, 3, 1)
+    # One edit left the end open → pipeline default (today)
+    assert kwargs["end_date"] is None
+
+
+async def test_orgs_are_batched_separately(coalescer):
+    trigger = AsyncMock(return_value={"success": True, "status": "PENDING"})
+    with patch(TRIGGER, trigger):
+        coalescer.schedule("acme", "key-1", ["sub_a"], start_date=date(2026, 3, 1))
+        coalescer.schedule("globex", "key-2", ["sub_x"], start_date=date(2026, 2, 1))
+        await coalescer.drain()
+
+    calls = {call.kwargs["org_slug"]: call.kwargs for call in trigger.await_args_list}
+    assert calls["acme"]["subscription_ids"] == ["sub_a"]
+    assert calls["globex"]["api_key"] == "key-2"
+
+
+async def test_busy_pipeline_retries_with_edits_made_meanwhile(coalescer):
+    results = iter([
+        {"success": True, "status": "ALREADY_RUNNING"},
+        {"success": True, "status": "PENDING"},
+    ])
+
+    async def trigger(**kwargs):
+        if not trigger_calls:
+            # Another edit lands while the first attempt is rejected
+            coalescer.schedule("acme", "key", ["sub_b"], start_date=date(2026, 1, 15))
+        trigger_calls.append(kwargs)
+        return next(results)
+
+    trigger_calls = []
+    with patch(TRIGGER, trigger):
+        coalescer.schedule("acme", "key", ["sub_a"], start_date=date(2026, 2, 1))
+        await coalescer.drain()
+
+    assert len(trigger_calls) == 2
+    assert trigger_calls[1]["subscription_ids"] == ["sub_a", "sub_b"]
+    assert trigger_calls[1]["start_date"] == date(2026, 1, 15)
+
+
+async def test_shutdown_drain_triggers_pending_edits_without_waiting():
+    coalescer = SubscriptionRecomputeCoalescer(debounce_seconds=30, busy_retry_seconds=30, max_attempts=5)
+    trigger = AsyncMock(side_effect=[
+        {"success": True, "status": "PENDING"},
+        {"success": True, "status": "ALREADY_RUNNING"},
+    ])
+    with patch(TRIGGER, trigger):
+        coalescer.schedule("acme", "key", ["sub_a"], start_date=date(2026, 3, 1))
+        coalescer.schedule("globex", "key", ["sub_x"], start_date=date(2026, 3, 1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(coalescer.drain(flush_now=True), timeout=1)
+
+    # Both orgs triggered at once; a busy pipeline is not retried during shutdown
+    assert trigger.await_count == 2
+    assert coalescer._pending == {}
+
+
+async def test_large_batches_fall_back_to_full_recompute(coalescer, monkeypatch):
+    monkeypatch.setattr(pipeline_trigger, "MAX_TARGETED_SUBSCRIPTIONS", 2)
+    trigger = AsyncMock(return_value={"success": True, "status": "PENDING"})
+    with patch(TRIGGER, trigger):
+        coalescer.schedule("acme", "key", ["a", "b", "c"], start_date=date(2026, 3, 1))
+        await coalescer.drain()
+
+    assert trigger.await_args.kwargs["subscription_ids"] is None
+    assert trigger.await_args.kwargs["start_date"] == date(2026, 3, 1)
+
+
+async def test_trigger_body_carries_subscription_ids():
+    response = AsyncMock()
+    response.status_code = 200
+    response.json = lambda: {"pipeline_logging_id": "run-1", "status": "PENDING"}
+    with patch("httpx.AsyncClient.post", AsyncMock(return_value=response)) as post:
+        result = await pipeline_trigger.trigger_subscription_cost_pipeline(
+            "acme", "key", start_date=date(2026, 3, 1), subscription_ids=["sub_b", "sub_a"]
+        )
+
+    assert result["success"] is True
+    assert post.await_args.kwargs["json"] == {"start_date": "2026-03-01", "subscription_ids": ["sub_a", "sub_b"]}
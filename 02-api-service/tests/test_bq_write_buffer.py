@@ -0,0 +1,286 @@
+"""
+Tests for the micro-batching BigQuery write buffer (src/core/utils/bq_write_buffer.py).
+
+BigQuery is replaced by a recording writer with configurable latency and
+per-row failures; the Storage Write API writer runs against a fake
+BigQueryWriteClient.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import types as storage_types
+
+from src.core.utils import audit_logger, bq_write_buffer
+from src.core.utils.audit_logger import log_create
+from src.core.utils.bq_write_buffer import BigQueryWriteBuffer, storage_write_writer
+
+TABLE = "proj.organizations.org_audit_logs"
+
+
+class RecordingWriter:
+    """Writer stand-in recording every batch; rows with "bad" fail their batch."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.batches = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, table_id, rows):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if any(row.get("bad") for row in rows):
+                raise ValueError("invalid row")
+            self.batches.append((table_id, list(rows)))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @property
+    def rows(self):
+        return [row for _, batch in self.batches for row in batch]
+
+
+async def test_concurrent_writes_share_one_flush():
+    writer = RecordingWriter(latency=0.01)
+    buffer = BigQueryWriteBuffer(writer=writer, linger_ms=20)
+
+    await asyncio.gather(*(buffer.write(TABLE, [{"i": i}]) for i in range(50)))
+    await buffer.close()
+
+    assert len(writer.batches) == 1
+    assert sorted(r["i"] for r in writer.rows) == list(range(50))
+    metrics = buffer.metrics()[TABLE]
+    assert (metrics["rows_written"], metrics["flushes"], metrics["pending_rows"]) == (50, 1, 0)
+
+
+async def test_full_batch_flushes_without_waiting_for_interval():
+    writer = RecordingWriter()
+    buffer = BigQueryWriteBuffer(writer=writer, max_batch_rows=10, flush_interval_seconds=30)
+
+    for i in range(25):
+        await buffer.submit(TABLE, [{"i": i}])
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for _, batch in writer.batches] == [10, 10]
+    await buffer.close()
+    assert [len(batch) for _, batch in writer.batches] == [10, 10, 5]
+    assert buffer.metrics()[TABLE]["flushes_by_trigger"] == {"size": 2, "forced": 1}
+
+
+async def test_interval_flushes_partial_batch():
+    writer = RecordingWriter()
+    buffer = BigQueryWriteBuffer(writer=writer, flush_interval_seconds=0.05)
+
+    await buffer.submit(TABLE, [{"i": 1}])
+    assert writer.batches == []
+    await asyncio.sleep(0.15)
+    await buffer.close()
+
+    assert writer.rows == [{"i": 1}]
+    assert buffer.metrics()[TABLE]["flushes_by_trigger"] == {"time": 1}
+
+
+async def test_bad_row_only_fails_its_own_write():
+    writer = RecordingWriter()
+    buffer = BigQueryWriteBuffer(writer=writer, linger_ms=20)
+
+    results = await asyncio.gather(
+        buffer.write(TABLE, [{"i": 1}]),
+        buffer.write(TABLE, [{"i": 2, "bad": True}]),
+        buffer.write(TABLE, [{"i": 3}]),
+        return_exceptions=True,
+    )
+    await buffer.close()
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert sorted(r["i"] for r in writer.rows) == [1, 3]
+    assert buffer.metrics()[TABLE]["last_error"] == "invalid row"
+
+
+async def test_backpressure_bounds_buffered_rows():
+    writer = RecordingWriter(latency=0.02)
+    buffer = BigQueryWriteBuffer(writer=writer, max_batch_rows=5, max_pending_rows=10)
+    peak_pending = 0
+
+    for i in range(40):
+        await buffer.submit(TABLE, [{"i": i}])
+        peak_pending = max(peak_pending, buffer.metrics()[TABLE]["pending_rows"])
+    await buffer.close()
+
+    assert peak_pending <= 10
+    assert buffer.metrics()[TABLE]["backpressure_waits"] > 0
+    assert sorted(r["i"] for r in writer.rows) == list(range(40))
+    assert writer.peak_in_flight == 1
+
+
+async def test_backpressure_holds_under_concurrent_submitters():
+    writer = RecordingWriter(latency=0.01)
+    buffer = BigQueryWriteBuffer(writer=writer, max_batch_rows=4, max_pending_rows=8)
+    peak_pending = 0
+
+    async def submit(i):
+        nonlocal peak_pending
+        await buffer.submit(TABLE, [{"i": i}, {"i": -i}])
+        peak_pending = max(peak_pending, buffer.metrics()[TABLE]["pending_rows"])
+
+    await asyncio.gather(*(submit(i) for i in range(1, 31)))
+    await buffer.close()
+
+    assert peak_pending <= 8
+    assert len(writer.rows) == 60
+
+
+async def test_tables_use_registered_writers_and_close_rejects_new_rows():
+    default, dml = RecordingWriter(), RecordingWriter()
+    buffer = BigQueryWriteBuffer(writer=default, flush_interval_seconds=30)
+    buffer.register_table("proj.organizations.org_hierarchy", writer=dml, max_batch_rows=2)
+
+    await buffer.submit(TABLE, [{"i": 1}])
+    await buffer.submit("proj.organizations.org_hierarchy", [{"i": 2}])
+    await buffer.close()
+
+    assert default.rows == [{"i": 1}] and dml.rows == [{"i": 2}]
+    with pytest.raises(RuntimeError):
+        await buffer.submit(TABLE, [{"i": 3}])
+
+
+async def test_audit_logger_waits_until_rows_are_written(monkeypatch):
+    writer = RecordingWriter()
+    buffer = BigQueryWriteBuffer(writer=writer, flush_interval_seconds=30, linger_ms=5)
+    monkeypatch.setattr(bq_write_buffer, "_write_buffer", buffer)
+
+    assert await log_create("acme_corp", "API_KEY", resource_id="key-1", details={"scope": "org"})
+
+    (table_id, rows), = writer.batches
+    assert table_id.endswith(".organizations.org_audit_logs")
+    assert rows[0]["action"] == "CREATE" and json.loads(rows[0]["details"]) == {"scope": "org"}
+    await buffer.close()
+
+
+async def test_audit_logger_retries_failed_writes(monkeypatch):
+    attempts = []
+
+    def flaky_writer(table_id, rows):
+        attempts.append(len(rows))
+        if len(attempts) < 3:
+            raise RuntimeError("backend unavailable")
+
+    buffer = BigQueryWriteBuffer(writer=flaky_writer, linger_ms=0)
+    monkeypatch.setattr(bq_write_buffer, "_write_buffer", buffer)
+    monkeypatch.setattr(audit_logger, "AUDIT_RETRY_BASE_DELAY_SECONDS", 0)
+
+    assert await log_create("acme_corp", "API_KEY", resource_id="key-1")
+    assert attempts == [1, 1, 1]
+
+    attempts.clear()
+    monkeypatch.setattr(audit_logger, "AUDIT_WRITE_ATTEMPTS", 2)
+    assert await log_create("acme_corp", "API_KEY", resource_id="key-2") is False
+    assert attempts == [1, 1]
+    await buffer.close()
+
+
+# ============================================
+# Storage Write API writer
+# ============================================
+
+AUDIT_SCHEMA = [
+    bigquery.SchemaField("audit_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("details", "JSON"),
+    bigquery.SchemaField("recipients", "STRING", mode="REPEATED"),
+    bigquery.SchemaField("attempt", "INTEGER"),
+    bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
+]
+
+
+class FakeSchemaClient:
+    def __init__(self):
+        self.get_table_calls = 0
+
+    def get_table(self, table_id):
+        self.get_table_calls += 1
+        return SimpleNamespace(schema=AUDIT_SCHEMA)
+
+
+class FakeWriteClient:
+    """BigQueryWriteClient stand-in answering each AppendRows request with `response`."""
+
+    def __init__(self, response=None):
+        self.response = response or storage_types.AppendRowsResponse(
+            append_result=storage_types.AppendRowsResponse.AppendResult()
+        )
+        self.calls = []
+
+    def append_rows(self, requests, metadata=()):
+        self.calls.append((list(requests), dict(metadata)))
+        return iter([self.response])
+
+
+def test_storage_write_writer_appends_batch_to_default_stream():
+    schema_client, write_client = FakeSchemaClient(), FakeWriteClient()
+    write = storage_write_writer(schema_client, write_client)
+    created_at = datetime(2026, 1, 15, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+    write(TABLE, [
+        {"audit_id": "a-1", "details": {"scope": "org"}, "recipients": ["x@acme.io"], "created_at": created_at},
+        {"audit_id": "a-2", "details": None, "attempt": 2, "created_at": "2026-01-15T12:00:00.123456+00:00"},
+    ])
+    write(TABLE, [{"audit_id": "a-3", "created_at": created_at}])
+
+    assert schema_client.get_table_calls == 1
+    assert len(write_client.calls) == 2
+    [request], metadata = write_client.calls[0]
+    stream = "projects/proj/datasets/organizations/tables/org_audit_logs/streams/_default"
+    assert request.write_stream == stream
+    assert metadata["x-goog-request-params"] == f"write_stream={stream}"
+
+    descriptor = request.proto_rows.writer_schema.proto_descriptor
+    assert [f.name for f in descriptor.field] == [f.name for f in AUDIT_SCHEMA]
+    row_class = bq_write_buffer._stream_target(TABLE, AUDIT_SCHEMA).row_class
+    first, second = (row_class.FromString(r) for r in request.proto_rows.rows.serialized_rows)
+    assert json.loads(first.details) == {"scope": "org"}
+    assert list(first.recipients) == ["x@acme.io"]
+    assert first.created_at == second.created_at == 1768478400123456
+    assert (second.audit_id, second.attempt, second.HasField("details")) == ("a-2", 2, False)
+
+
+def test_storage_write_writer_raises_on_rejected_rows_and_rereads_schema():
+    schema_client = FakeSchemaClient()
+    write_client = FakeWriteClient(storage_types.AppendRowsResponse(
+        row_errors=[storage_types.RowError(index=0, message="missing required field")]
+    ))
+    write = storage_write_writer(schema_client, write_client)
+
+    with pytest.raises(RuntimeError, match="row 0: missing required field"):
+        write(TABLE, [{"audit_id": "a-1", "created_at": "2026-01-15T12:00:00Z"}])
+
+    write_client.response = storage_types.AppendRowsResponse(
+        append_result=storage_types.AppendRowsResponse.AppendResult()
+    )
+    write(TABLE, [{"audit_id": "a-1", "created_at": "2026-01-15T12:00:00Z"}])
+    assert schema_client.get_table_calls == 2
+
+    with pytest.raises(ValueError, match="No such column: unknown"):
+        write(TABLE, [{"audit_id": "a-2", "unknown": 1}])
+
+
+def test_default_writer_falls_back_to_streaming_inserts_on_duckdb_backend(monkeypatch):
+    inserted = []
+    client = SimpleNamespace(insert_rows_json=lambda table_id, rows: inserted.append(rows) or [])
+    monkeypatch.setattr(bq_write_buffer.settings, "bigquery_backend", "duckdb")
+
+    bq_write_buffer.default_row_writer(client)(TABLE, [{"audit_id": "a-1"}])
+
+    assert inserted == [[{"audit_id": "a-1"}]]
@@ -0,0 +1,35 @@
+"""
+Vendored module sync check.
+
+Service images are built from their own directories, so modules shared with
+the pipeline service are copied rather than imported. Each copy here must
+stay byte-identical to its source of truth in 03-data-pipeline-service; edit
+the source and copy it over.
+
+Skipped when the pipeline service is not checked out next to this service
+(e.g. inside the api-service image).
+"""
+
+from pathlib import Path
+
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+PIPELINE_SERVICE_ROOT = SERVICE_ROOT.parent / "03-data-pipeline-service"
+
+# api-service path -> pipeline-service path (source of truth)
+VENDORED = {
+    "src/core/engine/local_bq.py": "src/core/engine/local_bq.py",
+    "tests/performance/bench_harness.py": "tests/load/bench_harness.py",
+}
+
+
+@pytest.mark.skipif(not PIPELINE_SERVICE_ROOT.is_dir(), reason="03-data-pipeline-service not checked out")
+@pytest.mark.parametrize("copy_path, source_path", sorted(VENDORED.items()))
+def test_vendored_copy_matches_source(copy_path, source_path):
+    copy = (SERVICE_ROOT / copy_path).read_bytes()
+    source = (PIPELINE_SERVICE_ROOT / source_path).read_bytes()
+    assert copy == source, (
+        f"02-api-service/{copy_path} differs from 03-data-pipeline-service/{source_path}; "
+        f"copy the pipeline service version over"
+    )
@@ -0,0 +1,64 @@
+-- ================================================================================
+-- PROCEDURE: sp_cost_category_1_sync_mappings
+-- LOCATION: {project_id}.organizations (central dataset)
+-- OPERATES ON: {project_id}.organizations.cost_category_mappings
+--
+-- PURPOSE: Seeds the shared x_source_system -> x_cost_category mapping read by
+--          sp_cloud_1_convert_to_focus, sp_genai_3_convert_to_focus and
+--          sp_subscription_3_convert_to_focus. The procedures materialise the
+--          category into cost_data_standard_1_3.x_cost_category so dashboards
+--          filter with equality instead of provider/source system pattern chains.
+--
+--          Missing mappings are inserted; existing rows are left untouched so
+--          operators can deactivate or re-point a mapping without it being
+--          reverted on the next sync.
+--
+-- INPUTS:
+--   p_project_id: GCP Project ID
+--
+-- USAGE:
+--   CALL `your-project-id.organizations`.sp_cost_category_1_sync_mappings('your-project-id');
+--
+-- NOTE: The table itself is created by bootstrap (cost_category_mappings.json).
+-- ================================================================================
+
+CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_cost_category_1_sync_mappings(
+  p_project_id STRING
+)
+OPTIONS(strict_mode=TRUE)
+BEGIN
+  DECLARE v_rows_inserted INT64 DEFAULT 0;
+
+  ASSERT p_project_id IS NOT NULL AS "p_project_id cannot be NULL";
+  ASSERT REGEXP_CONTAINS(p_project_id, r'^[a-z][a-z0-9\-]*[a-z0-9]$')
+    AS "Invalid project_id format - must match GCP project naming rules";
+
+  EXECUTE IMMEDIATE FORMAT("""
+    MERGE `%s.organizations.cost_category_mappings` T
+    USING (
+      SELECT source_system, x_cost_category, description
+      FROM UNNEST([
+        STRUCT('cloud_gcp_billing_raw_daily' AS source_system, 'cloud' AS x_cost_category, 'sp_cloud_1_convert_to_focus (GCP billing export)' AS description),
+        STRUCT('cloud_aws_billing_raw_daily', 'cloud', 'sp_cloud_1_convert_to_focus (AWS CUR)'),
+        STRUCT('cloud_azure_billing_raw_daily', 'cloud', 'sp_cloud_1_convert_to_focus (Azure Cost Management)'),
+        STRUCT('cloud_oci_billing_raw_daily', 'cloud', 'sp_cloud_1_convert_to_focus (OCI usage reports)'),
+        STRUCT('genai_costs_daily_unified', 'genai', 'sp_genai_3_convert_to_focus (PAYG, commitment and GPU/TPU infrastructure)'),
+        STRUCT('subscription_costs_daily', 'subscription', 'sp_subscription_3_convert_to_focus (SaaS subscription plans)')
+      ])
+    ) S
+    ON T.source_system = S.source_system
+    WHEN NOT MATCHED THEN
+      INSERT (source_system, x_cost_category, description, is_active, created_at, updated_at)
+      VALUES (S.source_system, S.x_cost_category, S.description, TRUE, CURRENT_TIMESTAMP(), NULL)
+  """, p_project_id);
+
+  SET v_rows_inserted = @@row_count;
+
+  SELECT
+    v_rows_inserted AS mappings_inserted,
+    'cost_category_mappings' AS target_table,
+    CURRENT_TIMESTAMP() AS executed_at;
+
+EXCEPTION WHEN ERROR THEN
+  RAISE USING MESSAGE = CONCAT('sp_cost_category_1_sync_mappings Failed: ', @@error.message);
+END;
@@ -14,6 +14,9 @@
 -- OUTPUT: Records inserted into cost_data_standard_1_3 table
 --
 -- HIERARCHY: Uses 5-field x_hierarchy_* model (entity_id, entity_name, level_code, path, path_names)
+--
+-- CATEGORY: x_cost_category comes from organizations.cost_category_mappings
+--           (source_system 'genai_costs_daily_unified', default 'genai')
 -- ================================================================================
 
 CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_genai_3_convert_to_focus(
@@ -32,6 +35,7 @@ BEGIN
   -- Handle NULL defaults inside procedure body for BigQuery compatibility
   DECLARE v_pipeline_id STRING DEFAULT COALESCE(p_pipeline_id, 'genai_to_focus');
   DECLARE v_run_id STRING DEFAULT COALESCE(p_run_id, GENERATE_UUID());
+  DECLARE v_cost_category STRING;
 
   -- Validation
   ASSERT p_project_id IS NOT NULL AS "p_project_id cannot be NULL";
@@ -67,6 +71,20 @@ BEGIN
     SET v_currency = 'USD';
   END;
 
+  -- Normalised cost category from the shared mapping table
+  BEGIN
+    EXECUTE IMMEDIATE FORMAT("""
+      SELECT MAX(x_cost_category) FROM `%s.organizations.cost_category_mappings`
+      WHERE source_system = @source_system AND is_active
+    """, p_project_id)
+    INTO v_cost_category
+    USING 'genai_costs_daily_unified' AS source_system;
+  EXCEPTION WHEN ERROR THEN
+    -- Mapping table not bootstrapped yet: use the default below
+    SET v_cost_category = NULL;
+  END;
+  SET v_cost_category = COALESCE(v_cost_category, 'genai');
+
   BEGIN TRANSACTION;
 
     -- Step 1: Delete existing GenAI FOCUS records for this date AND credential (idempotent)
@@ -102,6 +120,7 @@ BEGIN
        ChargeCategory, ChargeType, ChargeFrequency,
        SubAccountId, SubAccountName,
        x_genai_cost_type, x_genai_provider, x_genai_model,
+       x_source_system, x_cost_category,
        x_hierarchy_entity_id, x_hierarchy_entity_name, x_hierarchy_level_code,
        x_hierarchy_path, x_hierarchy_path_names,
        x_hierarchy_validated_at,
@@ -212,6 +231,8 @@ BEGIN
         cost_type as x_genai_cost_type,
         provider as x_genai_provider,
         model as x_genai_model,
+        'genai_costs_daily_unified' as x_source_system,
+        @v_cost_category as x_cost_category,
 
         -- 5-field hierarchy model (NEW design)
         x_hierarchy_entity_id,
@@ -243,7 +264,8 @@ BEGIN
         AND (@p_credential_id IS NULL OR x_credential_id = @p_credential_id)
     """, p_project_id, p_dataset_id, p_project_id, p_dataset_id)
     USING p_cost_date AS p_date, p_credential_id AS p_credential_id,
-          v_pipeline_id AS p_pipeline_id, v_run_id AS p_run_id, v_currency AS v_currency;
+          v_pipeline_id AS p_pipeline_id, v_run_id AS p_run_id, v_currency AS v_currency,
+          v_cost_category AS v_cost_category;
 
     SET v_rows_inserted = @@row_count;
 
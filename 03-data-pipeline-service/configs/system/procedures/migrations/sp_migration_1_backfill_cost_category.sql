@@ -0,0 +1,160 @@
+-- ================================================================================
+-- MIGRATION: sp_migration_1_backfill_cost_category
+-- LOCATION: {project_id}.organizations (central dataset)
+-- OPERATES ON: {project_id}.{p_dataset_id} (per-customer dataset)
+--
+-- PURPOSE: Backfills cost_data_standard_1_3.x_cost_category for rows written
+--          before the FOCUS conversion procedures materialised it.
+--
+--          1. Adds the x_cost_category column if the table predates it
+--          2. Seeds organizations.cost_category_mappings (sp_cost_category_1_sync_mappings)
+--          3. Rows whose x_source_system has a mapping take the mapped category
+--          4. Remaining rows use the rules the dashboards used to apply at query
+--             time (x_genai_cost_type, provider name, ServiceCategory, x_source_system)
+--
+--          Only rows with x_cost_category IS NULL are touched, so re-running is safe.
+--
+-- CLUSTERING: BigQuery DDL cannot change clustering on an existing table. After
+--             the backfill, put x_cost_category first in the clustering spec:
+--               bq update --clustering_fields=x_cost_category,SubAccountId,ServiceProviderName,ServiceCategory \
+--                 your-project-id:acme_corp_prod.cost_data_standard_1_3
+--             Clustering applies to newly written data; BigQuery re-clusters
+--             older blocks automatically in the background.
+--
+-- INPUTS:
+--   p_project_id: GCP Project ID
+--   p_dataset_id: Customer dataset ID (e.g., 'acme_corp_prod')
+--   p_dry_run:    If TRUE, only show what would be updated (default: FALSE)
+--
+-- USAGE:
+--   -- Dry run (preview changes)
+--   CALL `your-project-id.organizations`.sp_migration_1_backfill_cost_category(
+--     'your-project-id',
+--     'acme_corp_prod',
+--     TRUE
+--   );
+--
+--   -- Execute migration
+--   CALL `your-project-id.organizations`.sp_migration_1_backfill_cost_category(
+--     'your-project-id',
+--     'acme_corp_prod',
+--     FALSE
+--   );
+-- ================================================================================
+
+CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_migration_1_backfill_cost_category(
+  p_project_id STRING,
+  p_dataset_id STRING,
+  p_dry_run BOOL
+)
+BEGIN
+  DECLARE v_rows_to_update INT64;
+  DECLARE v_rows_mapped INT64 DEFAULT 0;
+  DECLARE v_rows_derived INT64 DEFAULT 0;
+  -- Category rules previously evaluated by every dashboard query
+  DECLARE v_derived_category STRING DEFAULT """
+    CASE
+      WHEN x_genai_cost_type IS NOT NULL THEN 'genai'
+      WHEN x_source_system = 'subscription_costs_daily' THEN 'subscription'
+      WHEN LOWER(ServiceProviderName) IN ('openai', 'anthropic', 'google ai', 'cohere', 'mistral', 'gemini', 'claude',
+                                          'deepseek', 'azure openai', 'aws bedrock', 'vertex ai')
+        OR LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning')
+        OR LOWER(x_source_system) LIKE '%genai%'
+        OR LOWER(x_source_system) LIKE '%llm%' THEN 'genai'
+      WHEN LOWER(ServiceProviderName) IN ('gcp', 'aws', 'azure', 'google', 'amazon', 'microsoft', 'oci', 'oracle',
+                                          'google cloud', 'amazon web services', 'microsoft azure')
+        OR REGEXP_CONTAINS(LOWER(x_source_system), r'cloud|gcp|aws|azure|oci') THEN 'cloud'
+      WHEN LOWER(ServiceCategory) IN ('subscription', 'saas', 'software') THEN 'subscription'
+      ELSE 'other'
+    END
+  """;
+
+  -- 1. Parameter Validation
+  ASSERT p_project_id IS NOT NULL AS "p_project_id cannot be NULL";
+  ASSERT p_dataset_id IS NOT NULL AS "p_dataset_id cannot be NULL";
+  ASSERT REGEXP_CONTAINS(p_project_id, r'^[a-z][a-z0-9\-]*[a-z0-9]$')
+    AS "Invalid project_id format - must match GCP project naming rules";
+  ASSERT REGEXP_CONTAINS(p_dataset_id, r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+    AS "Invalid dataset_id format - must be valid BigQuery dataset name";
+  SET p_dry_run = COALESCE(p_dry_run, FALSE);
+
+  -- 2. Tables created before x_cost_category existed (additive and nullable,
+  --    also applied on dry runs so the preview can filter on the column)
+  EXECUTE IMMEDIATE FORMAT("""
+    ALTER TABLE `%s.%s.cost_data_standard_1_3`
+    ADD COLUMN IF NOT EXISTS x_cost_category STRING
+      OPTIONS(description="[Extension] Normalised cost category: 'genai', 'cloud', 'subscription', 'other'")
+  """, p_project_id, p_dataset_id);
+
+  -- 3. Count rows that need updating
+  EXECUTE IMMEDIATE FORMAT("""
+    SELECT COUNT(*)
+    FROM `%s.%s.cost_data_standard_1_3`
+    WHERE x_cost_category IS NULL
+  """, p_project_id, p_dataset_id)
+  INTO v_rows_to_update;
+
+  -- 4. Dry run preview
+  IF p_dry_run THEN
+    EXECUTE IMMEDIATE FORMAT("""
+      SELECT
+        x_source_system,
+        %s AS x_cost_category,
+        COUNT(*) AS row_count,
+        ROUND(SUM(BilledCost), 2) AS billed_cost
+      FROM `%s.%s.cost_data_standard_1_3`
+      WHERE x_cost_category IS NULL
+      GROUP BY 1, 2
+      ORDER BY row_count DESC
+    """, v_derived_category, p_project_id, p_dataset_id);
+
+    SELECT
+      'DRY RUN PREVIEW' AS mode,
+      v_rows_to_update AS rows_to_update,
+      'Mapped x_source_system values take the category from organizations.cost_category_mappings' AS note,
+      'Set p_dry_run = FALSE to execute migration' AS next_step;
+
+  ELSE
+    -- 5. Make sure the shared mapping is seeded
+    CALL `{project_id}.organizations`.sp_cost_category_1_sync_mappings(p_project_id);
+
+    -- 6. Rows with a mapped source system
+    EXECUTE IMMEDIATE FORMAT("""
+      UPDATE `%s.%s.cost_data_standard_1_3` t
+      SET x_cost_category = m.x_cost_category
+      FROM `%s.organizations.cost_category_mappings` m
+      WHERE t.x_cost_category IS NULL
+        AND LOWER(t.x_source_system) = m.source_system
+        AND m.is_active
+    """, p_project_id, p_dataset_id, p_project_id);
+
+    SET v_rows_mapped = @@row_count;
+
+    -- 7. Everything else (legacy sources, manual imports)
+    EXECUTE IMMEDIATE FORMAT("""
+      UPDATE `%s.%s.cost_data_standard_1_3`
+      SET x_cost_category = %s
+      WHERE x_cost_category IS NULL
+    """, p_project_id, p_dataset_id, v_derived_category);
+
+    SET v_rows_derived = @@row_count;
+
+    -- 8. Verify results
+    SELECT
+      'MIGRATION COMPLETED' AS status,
+      p_project_id AS project_id,
+      p_dataset_id AS dataset_id,
+      v_rows_to_update AS rows_identified,
+      v_rows_mapped AS rows_updated_from_mapping,
+      v_rows_derived AS rows_updated_from_rules,
+      CURRENT_TIMESTAMP() AS completed_at;
+  END IF;
+
+EXCEPTION WHEN ERROR THEN
+  SELECT
+    'MIGRATION FAILED' AS status,
+    @@error.message AS error_message,
+    p_project_id AS project_id,
+    p_dataset_id AS dataset_id;
+  RAISE USING MESSAGE = CONCAT('Migration Failed: ', @@error.message);
+END;
@@ -32,6 +32,8 @@
 --   p_dataset_id: Customer dataset (e.g., 'acme_corp_prod')
 --   p_start_date: Start date (inclusive)
 --   p_end_date:   End date (inclusive)
+--   p_subscription_ids: Restrict delete + insert to these subscriptions
+--                       (NULL or [] = every subscription of the org)
 --
 -- CALCULATION:
 --   1. Select subscriptions with status IN ('active', 'expired', 'cancelled')
@@ -59,7 +61,8 @@ CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_subscription_2_calcu
   p_end_date DATE,
   p_pipeline_id STRING,
   p_credential_id STRING,
-  p_run_id STRING
+  p_run_id STRING,
+  p_subscription_ids ARRAY<STRING>
 )
 OPTIONS(strict_mode=TRUE)
 BEGIN
@@ -71,6 +74,8 @@ BEGIN
   DECLARE v_fiscal_year_start_month INT64 DEFAULT 1;
   -- MT-FIX: Extract org_slug for defense-in-depth filtering
   DECLARE v_org_slug STRING;
+  -- Targeted recompute: only these subscriptions' rows are rebuilt ([] = all)
+  DECLARE v_subscription_ids ARRAY<STRING> DEFAULT IFNULL(p_subscription_ids, []);
 
   -- 1. Validation
   ASSERT p_project_id IS NOT NULL AS "p_project_id cannot be NULL";
@@ -114,8 +119,9 @@ BEGIN
       DELETE FROM `%s.%s.subscription_plan_costs_daily`
       WHERE cost_date BETWEEN @p_start AND @p_end
         AND x_org_slug = @org_slug
+        AND (ARRAY_LENGTH(@subscription_ids) = 0 OR subscription_id IN UNNEST(@subscription_ids))
     """, p_project_id, p_dataset_id)
-    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug;
+    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug, v_subscription_ids AS subscription_ids;
 
     -- 3. Insert daily costs (skip zero-cost rows like FREE plans)
     -- Uses 5-field x_hierarchy_* model
@@ -187,6 +193,7 @@ BEGIN
         WHERE sp.status IN ('active', 'expired', 'cancelled')
           AND (sp.start_date <= @p_end OR sp.start_date IS NULL)
           AND (sp.end_date >= @p_start OR sp.end_date IS NULL)
+          AND (ARRAY_LENGTH(@subscription_ids) = 0 OR sp.subscription_id IN UNNEST(@subscription_ids))
       ),
       with_cycle_cost AS (
         -- Calculate cycle cost (price × seats for PER_SEAT, just price for FLAT_FEE)
@@ -466,26 +473,30 @@ BEGIN
       FROM daily_expanded
       WHERE daily_cost > 0  -- Skip zero-cost rows (FREE plans)
     """, p_project_id, p_dataset_id, p_project_id, p_dataset_id)
-    USING p_start_date AS p_start, p_end_date AS p_end, v_org_currency AS org_currency, v_default_currency AS default_currency, v_fiscal_year_start_month AS fy_start_month, p_pipeline_id AS p_pipeline_id, p_credential_id AS p_credential_id, p_run_id AS p_run_id;
+    USING p_start_date AS p_start, p_end_date AS p_end, v_org_currency AS org_currency, v_default_currency AS default_currency, v_fiscal_year_start_month AS fy_start_month, p_pipeline_id AS p_pipeline_id, p_credential_id AS p_credential_id, p_run_id AS p_run_id, v_subscription_ids AS subscription_ids;
 
   -- 4. Get row count (inside transaction for atomicity)
   EXECUTE IMMEDIATE FORMAT("""
     SELECT COUNT(*) FROM `%s.%s.subscription_plan_costs_daily`
     WHERE cost_date BETWEEN @p_start AND @p_end
+      AND (ARRAY_LENGTH(@subscription_ids) = 0 OR subscription_id IN UNNEST(@subscription_ids))
   """, p_project_id, p_dataset_id)
-  INTO v_rows_inserted USING p_start_date AS p_start, p_end_date AS p_end;
+  INTO v_rows_inserted USING p_start_date AS p_start, p_end_date AS p_end, v_subscription_ids AS subscription_ids;
 
   COMMIT TRANSACTION;
 
   -- PRO-010 FIX: Count subscriptions with NULL or zero seats for DQ monitoring
-  EXECUTE IMMEDIATE FORMAT("""
-    SELECT COUNT(DISTINCT subscription_id)
-    FROM `%s.%s.subscription_plans`
-    WHERE status IN ('active', 'pending')
-      AND (seats IS NULL OR seats <= 0)
-      AND (end_date IS NULL OR end_date >= CURRENT_DATE())
-  """, p_project_id, p_dataset_id)
-  INTO v_zero_seat_count;
+  -- Org-wide DQ checks run on full recomputes only (targeted plan-edit runs skip them)
+  IF ARRAY_LENGTH(v_subscription_ids) = 0 THEN
+    EXECUTE IMMEDIATE FORMAT("""
+      SELECT COUNT(DISTINCT subscription_id)
+      FROM `%s.%s.subscription_plans`
+      WHERE status IN ('active', 'pending')
+        AND (seats IS NULL OR seats <= 0)
+        AND (end_date IS NULL OR end_date >= CURRENT_DATE())
+    """, p_project_id, p_dataset_id)
+    INTO v_zero_seat_count;
+  END IF;
 
   -- PRO-010 FIX: Log DQ issue for NULL/zero seats
   IF v_zero_seat_count > 0 THEN
@@ -515,7 +526,7 @@ BEGIN
   END IF;
 
   -- BUG-036 FIX: Log warning if no cost rows inserted (all plans FREE or inactive)
-  IF v_rows_inserted = 0 THEN
+  IF v_rows_inserted = 0 AND ARRAY_LENGTH(v_subscription_ids) = 0 THEN
     -- Log to DQ results for monitoring
     EXECUTE IMMEDIATE FORMAT("""
       INSERT INTO `%s.organizations.org_meta_dq_results` (
@@ -17,6 +17,12 @@
 --
 -- HIERARCHY: Uses 5-field x_hierarchy_* model (entity_id, entity_name, level_code, path, path_names)
 --
+-- CATEGORY: x_cost_category comes from organizations.cost_category_mappings
+--           (source_system 'subscription_costs_daily', default 'subscription')
+--
+-- TARGETED RUNS: p_subscription_ids (NULL or [] = all) limits the delete and
+--   re-insert to those subscriptions' rows (x_source_record_id = subscription_id)
+--
 -- UPDATED: 2026-01-01 - All x_* fields standardized to snake_case convention
 -- ================================================================================
 
@@ -27,7 +33,8 @@ CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_subscription_3_conve
   p_end_date DATE,
   p_pipeline_id STRING,
   p_credential_id STRING,
-  p_run_id STRING
+  p_run_id STRING,
+  p_subscription_ids ARRAY<STRING>
 )
 OPTIONS(strict_mode=TRUE)
 BEGIN
@@ -35,6 +42,8 @@ BEGIN
   DECLARE v_org_slug STRING;
   DECLARE v_org_exists INT64 DEFAULT 0;
   DECLARE v_currencies_valid BOOL DEFAULT TRUE;
+  DECLARE v_cost_category STRING;
+  DECLARE v_subscription_ids ARRAY<STRING> DEFAULT IFNULL(p_subscription_ids, []);
 
   -- Extract org_slug from dataset_id using safe extraction
   -- Pattern: {org_slug}_{env} where env is prod/stage/dev/local/test
@@ -56,6 +65,20 @@ BEGIN
   ASSERT p_credential_id IS NOT NULL AS "p_credential_id cannot be NULL";
   ASSERT p_run_id IS NOT NULL AS "p_run_id cannot be NULL";
 
+  -- Normalised cost category from the shared mapping table
+  BEGIN
+    EXECUTE IMMEDIATE FORMAT("""
+      SELECT MAX(x_cost_category) FROM `%s.organizations.cost_category_mappings`
+      WHERE source_system = @source_system AND is_active
+    """, p_project_id)
+    INTO v_cost_category
+    USING 'subscription_costs_daily' AS source_system;
+  EXCEPTION WHEN ERROR THEN
+    -- Mapping table not bootstrapped yet: use the default below
+    SET v_cost_category = NULL;
+  END;
+  SET v_cost_category = COALESCE(v_cost_category, 'subscription');
+
   BEGIN TRANSACTION;
 
     -- PRO-012: Validate currency codes in source data (defensive check)
@@ -81,9 +104,10 @@ BEGIN
       FROM `%s.%s.subscription_plan_costs_daily`
       WHERE cost_date BETWEEN @p_start AND @p_end
         AND x_org_slug = @org_slug
+        AND (ARRAY_LENGTH(@subscription_ids) = 0 OR subscription_id IN UNNEST(@subscription_ids))
     """, p_project_id, p_dataset_id)
     INTO v_currencies_valid
-    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug;
+    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug, v_subscription_ids AS subscription_ids;
 
     ASSERT v_currencies_valid AS "Invalid currency code found in subscription_plan_costs_daily. Use valid ISO 4217 codes (USD, EUR, GBP, etc.)";
 
@@ -95,8 +119,9 @@ BEGIN
       WHERE DATE(ChargePeriodStart) BETWEEN @p_start AND @p_end
         AND x_source_system = 'subscription_costs_daily'
         AND SubAccountId = @org_slug
+        AND (ARRAY_LENGTH(@subscription_ids) = 0 OR x_source_record_id IN UNNEST(@subscription_ids))
     """, p_project_id, p_dataset_id)
-    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug;
+    USING p_start_date AS p_start, p_end_date AS p_end, v_org_slug AS org_slug, v_subscription_ids AS subscription_ids;
 
     -- 3. Insert mapped data with ALL fields populated (FOCUS 1.3 compliant)
     -- Uses 5-field x_hierarchy_* model
@@ -145,7 +170,7 @@ BEGIN
         -- Tags (JSON in FOCUS 1.3)
         Tags,
         -- Extension fields (x_ prefix per FOCUS convention)
-        x_source_system, x_source_record_id, x_amortization_class, x_service_model,
+        x_source_system, x_cost_category, x_source_record_id, x_amortization_class, x_service_model,
         x_cost_allocation_key, x_exchange_rate_used, x_original_currency, x_original_cost, x_updated_at,
         -- Org-specific extension fields (from org_profiles)
         x_org_slug, x_org_name, x_org_owner_email, x_org_default_currency, x_org_default_timezone,
@@ -316,6 +341,7 @@ BEGIN
 
         -- Extension fields (x_ prefix per FOCUS convention)
         'subscription_costs_daily' AS x_source_system,
+        @v_cost_category AS x_cost_category,
         spc.subscription_id AS x_source_record_id,
         'Amortized' AS x_amortization_class,
         'SaaS' AS x_service_model,
@@ -374,16 +400,19 @@ BEGIN
         ON spc.x_org_slug = os.org_slug
         AND os.status = 'ACTIVE'
       WHERE spc.cost_date BETWEEN @p_start AND @p_end
+        AND (ARRAY_LENGTH(@subscription_ids) = 0 OR spc.subscription_id IN UNNEST(@subscription_ids))
     """, p_project_id, p_dataset_id, p_project_id, p_dataset_id, p_project_id, p_dataset_id, p_project_id, p_project_id)
-    USING p_start_date AS p_start, p_end_date AS p_end, p_pipeline_id AS p_pipeline_id, p_credential_id AS p_credential_id, p_run_id AS p_run_id;
+    USING p_start_date AS p_start, p_end_date AS p_end, p_pipeline_id AS p_pipeline_id, p_credential_id AS p_credential_id, p_run_id AS p_run_id,
+          v_cost_category AS v_cost_category, v_subscription_ids AS subscription_ids;
 
   -- 4. Get row count (inside transaction for atomicity)
   EXECUTE IMMEDIATE FORMAT("""
     SELECT COUNT(*) FROM `%s.%s.cost_data_standard_1_3`
     WHERE ChargePeriodStart BETWEEN @p_start AND @p_end
       AND x_source_system = 'subscription_costs_daily'
+      AND (ARRAY_LENGTH(@subscription_ids) = 0 OR x_source_record_id IN UNNEST(@subscription_ids))
   """, p_project_id, p_dataset_id)
-  INTO v_rows_inserted USING TIMESTAMP(p_start_date) AS p_start, TIMESTAMP(p_end_date) AS p_end;
+  INTO v_rows_inserted USING TIMESTAMP(p_start_date) AS p_start, TIMESTAMP(p_end_date) AS p_end, v_subscription_ids AS subscription_ids;
 
   COMMIT TRANSACTION;
 
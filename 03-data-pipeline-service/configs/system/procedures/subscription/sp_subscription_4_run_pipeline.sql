@@ -12,6 +12,9 @@
 --   p_dataset_id: Customer dataset ID (e.g., 'acme_corp_prod')
 --   p_start_date: Start of processing window (inclusive, defaults to earliest start_date or month start)
 --   p_end_date:   End of processing window (inclusive, defaults to today)
+--   p_subscription_ids: Subscriptions to recompute (NULL or [] = all subscriptions).
+--                       Plan create/edit passes the changed ids so only their
+--                       daily and FOCUS rows in the window are rebuilt.
 --
 -- USAGE:
 --   -- Run for a specific customer
@@ -19,7 +22,9 @@
 --     'your-project-id',
 --     'acme_corp_prod',
 --     DATE('2024-01-01'),
---     DATE('2024-01-31')
+--     DATE('2024-01-31'),
+--     'acme_corp-subscription-costs', 'internal', 'manual-run',
+--     ['sub_slack_pro_1a2b3c4d5e6f']  -- or [] for the whole org
 --   );
 --
 -- FLOW:
@@ -36,13 +41,15 @@ CREATE OR REPLACE PROCEDURE `{project_id}.organizations`.sp_subscription_4_run_p
   p_end_date DATE,
   p_pipeline_id STRING,
   p_credential_id STRING,
-  p_run_id STRING
+  p_run_id STRING,
+  p_subscription_ids ARRAY<STRING>
 )
 BEGIN
   -- Declare local variables for defaulting dates
   DECLARE v_start_date DATE;
   DECLARE v_end_date DATE;
   DECLARE v_effective_start_date DATE;
+  DECLARE v_subscription_ids ARRAY<STRING> DEFAULT IFNULL(p_subscription_ids, []);
 
   -- 1. Parameter Validation (required params)
   ASSERT p_project_id IS NOT NULL AS "p_project_id cannot be NULL";
@@ -53,13 +60,17 @@ BEGIN
 
   -- 2. Get earliest start_date from active subscription plans
   -- This allows us to calculate costs from when subscriptions actually started
+  -- Targeted runs only look at the requested subscriptions (any status)
   EXECUTE IMMEDIATE FORMAT("""
     SELECT MIN(start_date)
     FROM `%s.%s.subscription_plans`
-    WHERE status = 'active'
-      AND start_date IS NOT NULL
+    WHERE start_date IS NOT NULL
+      AND IF(ARRAY_LENGTH(@subscription_ids) = 0,
+             status = 'active',
+             subscription_id IN UNNEST(@subscription_ids))
   """, p_project_id, p_dataset_id)
-  INTO v_effective_start_date;
+  INTO v_effective_start_date
+  USING v_subscription_ids AS subscription_ids;
 
   -- 3. Default dates if not provided
   -- Priority: provided start_date > earliest start_date from plans > first of current month
@@ -76,12 +87,14 @@ BEGIN
   -- 2. Stage 1: Calculate Daily Costs
   -- Note: Using direct CALL - procedures must be in same project as orchestrator
   CALL `{project_id}.organizations`.sp_subscription_2_calculate_daily_costs(
-    p_project_id, p_dataset_id, v_start_date, v_end_date, p_pipeline_id, p_credential_id, p_run_id
+    p_project_id, p_dataset_id, v_start_date, v_end_date, p_pipeline_id, p_credential_id, p_run_id,
+    v_subscription_ids
   );
 
   -- 3. Stage 2: Convert to FOCUS 1.3 Standard (with org-specific fields)
   CALL `{project_id}.organizations`.sp_subscription_3_convert_to_focus(
-    p_project_id, p_dataset_id, v_start_date, v_end_date, p_pipeline_id, p_credential_id, p_run_id
+    p_project_id, p_dataset_id, v_start_date, v_end_date, p_pipeline_id, p_credential_id, p_run_id,
+    v_subscription_ids
   );
 
   -- 4. Completion
@@ -89,7 +102,8 @@ BEGIN
          p_project_id AS project_id,
          p_dataset_id AS dataset_id,
          v_start_date AS start_date,
-         v_end_date AS end_date;
+         v_end_date AS end_date,
+         ARRAY_LENGTH(v_subscription_ids) AS subscriptions_targeted;
 
 EXCEPTION WHEN ERROR THEN
   -- Log error details for debugging
@@ -325,6 +325,19 @@ class Settings(BaseSettings):
     bq_max_results_per_page: int = Field(default=10000, ge=100, le=100000)
     bq_query_timeout_seconds: int = Field(default=300, ge=10)
     bq_max_retry_attempts: int = Field(default=5, ge=1, le=10)
+    bigquery_backend: str = Field(
+        default="bigquery",
+        pattern="^(bigquery|duckdb)$",
+        description="'duckdb' serves BigQueryClient.client from the local DuckDB stand-in (offline benchmarks/tests)"
+    )
+    local_bigquery_data_dir: Optional[str] = Field(
+        default=None,
+        description="Parquet fixtures loaded by the duckdb backend ({dir}/{dataset}/{table}.parquet)"
+    )
+    local_bigquery_database: str = Field(
+        default=":memory:",
+        description="DuckDB database file for the duckdb backend (':memory:' for throwaway runs)"
+    )
 
     # ============================================
     # Polars Configuration
@@ -348,13 +361,72 @@ class Settings(BaseSettings):
         default=5,
         ge=1,
         le=20,
-        description="Number of background workers for concurrent log flushing"
+        description="Unused: metadata logs flush through the shared MetadataFlushEngine"
     )
     metadata_log_queue_size: int = Field(
         default=1000,
         ge=100,
         le=10000,
-        description="Maximum queue size for buffered logs (backpressure when full)"
+        description="Per-run queue capacity reported by MetadataLogger.get_queue_depths()"
+    )
+    metadata_log_max_batch_rows: int = Field(
+        default=5000,
+        ge=1,
+        le=50000,
+        description="Upper bound for the adaptive batch size (metadata_log_batch_size is the start)"
+    )
+    metadata_log_target_flush_latency_ms: int = Field(
+        default=1000,
+        ge=50,
+        le=60000,
+        description="Batch sizes grow while writes finish under this latency and halve above it"
+    )
+    metadata_log_max_pending_rows: int = Field(
+        default=50000,
+        ge=100,
+        le=1000000,
+        description="Rows buffered per table across all runs before the oldest are spilled to disk"
+    )
+    metadata_log_spill_enabled: bool = Field(
+        default=True,
+        description="Spill metadata rows to local disk when BigQuery writes fail (replayed later); "
+                    "when disabled such rows are dropped and counted as lost"
+    )
+    metadata_log_spill_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for spilled metadata rows; defaults to the system temp directory"
+    )
+    metadata_log_spill_max_mb: int = Field(
+        default=256,
+        ge=1,
+        le=10240,
+        description="Disk budget for spilled metadata rows; rows beyond it are dropped"
+    )
+
+    # ============================================
+    # Shared HTTP Client Pool
+    # ============================================
+    http_pool_max_connections_per_host: int = Field(
+        default=20,
+        ge=1,
+        le=500,
+        description="Maximum open connections per upstream host (GenAI providers, REST APIs, webhooks)"
+    )
+    http_pool_max_keepalive_per_host: int = Field(
+        default=10,
+        ge=0,
+        le=500,
+        description="Idle keep-alive connections retained per upstream host"
+    )
+    http_pool_keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        ge=1.0,
+        le=3600.0,
+        description="Seconds an idle pooled connection is kept before closing"
+    )
+    http_pool_http2: bool = Field(
+        default=True,
+        description="Negotiate HTTP/2 with upstream hosts (requires the h2 package)"
     )
 
     # ============================================
@@ -372,6 +444,36 @@ class Settings(BaseSettings):
         le=100,
         description="Number of partitions to process in parallel"
     )
+    step_output_dir: Optional[str] = Field(
+        default=None,
+        description="Local directory for spilled step outputs (Arrow IPC files passed "
+                    "between steps); defaults to the system temp directory"
+    )
+    pipeline_plan_cache_watch: bool = Field(
+        default=True,
+        description="Watch configs_base_path and drop cached pipeline plans when YAML files change"
+    )
+    pipeline_plan_path_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0.0,
+        le=3600.0,
+        description="How long an (org, pipeline) -> YAML path lookup is reused before the "
+                    "config tree is searched again"
+    )
+    pipeline_cancel_poll_interval_seconds: float = Field(
+        default=5.0,
+        ge=0.5,
+        le=300.0,
+        description="Interval of the shared status poll that picks up cancellations of runs in this "
+                    "process requested on other instances (one query for all active runs)"
+    )
+    pipeline_status_update_linger_ms: int = Field(
+        default=50,
+        ge=0,
+        le=5000,
+        description="How long run status transitions wait to be coalesced into one UPDATE "
+                    "of org_meta_pipeline_runs"
+    )
 
     # ============================================
     # Auto-Sync Configuration
@@ -410,6 +512,59 @@ class Settings(BaseSettings):
         le=120,
         description="Timeout for individual notification sends"
     )
+    notification_outbox_enabled: bool = Field(
+        default=False,
+        description="Queue notifications in the outbox and deliver in the background."
+    )
+    notification_outbox_store: str = Field(
+        default="bigquery",
+        pattern="^(bigquery|sqlite)$",
+        description="'bigquery': organizations.notification_outbox, shared by every instance. "
+                    "'sqlite': notification_outbox_path, for a single instance only; without "
+                    "the path notifications are sent inline."
+    )
+    notification_outbox_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for the 'sqlite' outbox store. Must be on a persistent volume "
+                    "(a container's local disk is lost on restart and scale-in) and is not "
+                    "shared between instances."
+    )
+    notification_outbox_poll_seconds: float = Field(
+        default=10.0,
+        ge=0.5,
+        le=300.0,
+        description="Idle poll interval of the outbox dispatcher (entries queued by other "
+                    "instances, expired claims). Local enqueues wake it immediately."
+    )
+    notification_outbox_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Delivery attempts per notification before dead-lettering"
+    )
+    notification_outbox_dedup_window_seconds: float = Field(
+        default=3600.0,
+        ge=0,
+        description="Window in which an identical notification is suppressed as a duplicate"
+    )
+    notification_email_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Max concurrent email deliveries from the outbox"
+    )
+    notification_slack_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Max concurrent Slack deliveries from the outbox"
+    )
+    notification_webhook_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Max concurrent webhook deliveries from the outbox"
+    )
 
     # ============================================
     # Alert Configuration
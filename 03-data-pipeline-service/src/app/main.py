@@ -373,6 +373,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to start auth aggregator: {e}. Auth metrics will not be batched.")
 
+    # Drop cached pipeline plans as soon as YAML configs change on disk
+    if settings.pipeline_plan_cache_watch:
+        try:
+            from src.core.pipeline.plan_cache import get_pipeline_plan_cache
+            if get_pipeline_plan_cache().start_watching():
+                logger.info("Pipeline plan cache file watcher started")
+        except Exception as e:
+            logger.warning(f"Failed to start pipeline plan cache watcher: {e}. Plans revalidate by file stat.")
+
+    # Start notification outbox dispatcher (also redelivers entries left by a previous run).
+    # Only used with a durable store; otherwise notifications are sent inline.
+    try:
+        from src.core.notifications.outbox import get_notification_outbox, outbox_enabled
+        if outbox_enabled():
+            get_notification_outbox().start()
+            logger.info("Notification outbox dispatcher started")
+    except Exception as e:
+        logger.warning(f"Failed to start notification outbox: {e}. Notifications will queue until next enqueue.")
+
     yield
 
     # Shutdown
@@ -395,6 +414,30 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping auth aggregator: {e}")
 
+    # Stop pipeline plan cache file watcher
+    try:
+        from src.core.pipeline.plan_cache import get_pipeline_plan_cache
+        await get_pipeline_plan_cache().stop_watching()
+    except Exception as e:
+        logger.warning(f"Error stopping pipeline plan cache watcher: {e}")
+
+    # Write coalesced run status transitions and stop the cancellation poll
+    try:
+        from src.core.pipeline.run_control import get_run_registry, get_run_status_writer
+        await get_run_status_writer().close()
+        await get_run_registry().close()
+    except Exception as e:
+        logger.warning(f"Error stopping pipeline run control: {e}")
+
+    # Write (or spill) buffered pipeline metadata logs
+    try:
+        from src.core.metadata.flush_engine import close_metadata_flush_engine
+        await asyncio.wait_for(close_metadata_flush_engine(), timeout=10.0)
+    except asyncio.TimeoutError:
+        logger.warning("Metadata log flush timed out during shutdown (10s)")
+    except Exception as e:
+        logger.warning(f"Error flushing metadata logs: {e}")
+
     # Shutdown BigQuery thread pool executor
     try:
         from src.core.pipeline.async_executor import BQ_EXECUTOR
@@ -403,6 +446,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error shutting down BigQuery executor: {e}")
 
+    # Stop notification outbox dispatcher (undelivered entries stay in the store)
+    try:
+        from src.core.notifications.outbox import get_notification_outbox
+        await get_notification_outbox().stop(timeout=10.0)
+        logger.info("Notification outbox dispatcher stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping notification outbox: {e}")
+
     # GAP-002 FIX: Close notification adapter sessions gracefully
     try:
         from src.core.notifications.registry import get_notification_registry
@@ -412,6 +463,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error closing notification sessions: {e}")
 
+    # Close shared outbound HTTP connections (GenAI providers, REST APIs, webhooks)
+    try:
+        from src.core.utils.http_pool import close_http_client_pool
+        await close_http_client_pool()
+        logger.info("Shared HTTP client pool closed")
+    except Exception as e:
+        logger.warning(f"Error closing shared HTTP client pool: {e}")
+
     await graceful_shutdown()
 
 
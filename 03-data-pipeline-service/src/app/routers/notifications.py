@@ -5,7 +5,9 @@ Endpoints for sending notifications through configured channels (email, Slack, w
 Called by the API Service when alert rules trigger or when users test channels/rules.
 """
 
+import asyncio
 import logging
+import time
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -21,6 +23,7 @@ from src.core.notifications.alert_sender import (
     AlertNotificationData,
     get_alert_sender,
 )
+from src.core.notifications.outbox import get_notification_outbox, outbox_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +127,7 @@ async def send_notification(
             "channels_sent": success_count,
             "channels_total": total_count,
             "results": results,
+            "queued": outbox_enabled(),
             "org_slug": request.org_slug,
             "title": request.title,
         }
@@ -270,3 +274,58 @@ async def send_summary(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Summary send failed"
         )
+
+
+@router.get(
+    "/outbox",
+    summary="Notification outbox status",
+    description="Queue depth per channel and the most recent dead-lettered notifications.",
+)
+async def get_outbox_status(
+    limit: int = 50,
+    _admin_context: None = Depends(verify_admin_key),
+):
+    """Return outbox depth and dead letters."""
+    outbox = get_notification_outbox()
+    # Store reads block (SQLite / BigQuery); keep them off the event loop
+    dead_letters = await asyncio.to_thread(
+        outbox.store.list_dead_letters, limit=min(max(limit, 1), 500)
+    )
+    depth = await asyncio.to_thread(outbox.queue_depth)
+
+    return {
+        "enabled": outbox_enabled(),
+        "depth": depth,
+        "dead_letters": [
+            {
+                "entry_id": entry.entry_id,
+                "channel": entry.channel,
+                "org_slug": entry.org_slug,
+                "title": entry.payload.title,
+                "attempts": entry.attempts,
+                "last_error": entry.last_error,
+                "enqueued_at": entry.enqueued_at,
+            }
+            for entry in dead_letters
+        ],
+    }
+
+
+@router.post(
+    "/outbox/{entry_id}/requeue",
+    summary="Requeue a dead-lettered notification",
+    description="Move a dead-lettered notification back to the outbox for redelivery.",
+)
+async def requeue_dead_letter(
+    entry_id: str,
+    _admin_context: None = Depends(verify_admin_key),
+):
+    """Requeue a dead-lettered outbox entry."""
+    outbox = get_notification_outbox()
+    if not outbox.store.requeue(entry_id, time.time()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dead-lettered notification not found"
+        )
+    outbox.start()
+    return {"success": True, "entry_id": entry_id}
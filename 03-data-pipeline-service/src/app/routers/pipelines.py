@@ -5,7 +5,7 @@ Endpoints for triggering and monitoring pipelines.
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request
 from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
 import uuid
 import asyncio
@@ -233,6 +233,10 @@ async def report_pipeline_completion_to_api_service(
 # Request/Response Models
 # ============================================
 
+# Upper bound on ids in one targeted subscription recompute
+MAX_TARGETED_SUBSCRIPTIONS = 500
+
+
 class TriggerPipelineRequest(BaseModel):
     """Request to trigger a pipeline."""
     trigger_by: Optional[str] = Field(
@@ -256,6 +260,21 @@ class TriggerPipelineRequest(BaseModel):
         default=False,
         description="Force refresh even if data already exists"
     )
+    subscription_ids: Optional[List[str]] = Field(
+        default=None,
+        max_length=MAX_TARGETED_SUBSCRIPTIONS,
+        description="Recompute only these subscriptions (subscription cost pipeline)"
+    )
+
+    @field_validator("subscription_ids")
+    @classmethod
+    def validate_subscription_ids(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        ids = list(dict.fromkeys(item.strip() for item in v if item and item.strip()))
+        if any(len(item) > 256 for item in ids):
+            raise ValueError("subscription_ids entries must be at most 256 characters")
+        return ids or None
 
     # SECURITY: Forbid unknown fields to prevent injection of unexpected parameters
     model_config = ConfigDict(extra="forbid")
@@ -1463,8 +1482,9 @@ async def cancel_pipeline_run(
 
     - **pipeline_logging_id**: Pipeline run ID to cancel
 
-    Sets the pipeline status to 'CANCELLING' in BigQuery. The executor will detect this
-    and gracefully stop before the next step. In-progress steps will complete.
+    Sets the pipeline status to 'CANCELLING' in BigQuery and signals the run directly when
+    it executes in this process (other instances pick it up from their status poll). The
+    executor stops gracefully before the next step. In-progress steps will complete.
 
     Returns:
         - pipeline_logging_id: The cancelled pipeline ID
@@ -1537,12 +1557,18 @@ async def cancel_pipeline_run(
                 "message": f"Pipeline status changed to {current_status} before cancellation could be applied."
             }
 
+        # Push the signal to the run if it executes in this process; runs on
+        # other instances see CANCELLING on their next status poll
+        from src.core.pipeline.run_control import get_run_registry
+        signalled_locally = get_run_registry().request_cancel(pipeline_logging_id, source="api")
+
         logger.info(
             f"Pipeline cancellation requested",
             extra={
                 "pipeline_logging_id": pipeline_logging_id,
                 "org_slug": org.org_slug,
-                "previous_status": current_status
+                "previous_status": current_status,
+                "signalled_locally": signalled_locally
             }
         )
 
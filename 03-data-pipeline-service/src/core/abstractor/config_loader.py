@@ -226,37 +226,20 @@ class ConfigLoader:
         Returns:
             Validated PipelineConfig object
         """
-        cache_key = f"{org_slug}:pipeline:{pipeline_id}"
+        # Pipelines are served from the plan cache, which revalidates against
+        # the file on every lookup (no stale configs after a YAML edit)
+        from src.core.pipeline.plan_cache import get_pipeline_plan_cache
 
-        # Check cache with LRU tracking
-        cached_config = self._access_cache(cache_key)
-        if cached_config is not None:
-            logger.debug(f"Config cache hit: {cache_key}")
-            return cached_config
-
-        # Use new recursive search method to find pipeline
+        plan_cache = get_pipeline_plan_cache()
         try:
-            config_path_str = settings.find_pipeline_path(org_slug, pipeline_id)
-            config_path = Path(config_path_str)
+            config_path = plan_cache.resolve_path(org_slug, pipeline_id)
         except (FileNotFoundError, ValueError) as e:
             raise FileNotFoundError(
                 f"Pipeline config not found: {pipeline_id} for org {org_slug}. {e}"
             )
 
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_dict = yaml.safe_load(f)
-
-            config = PipelineConfig(**config_dict)
-            self._set_cache(cache_key, config)
-
-            logger.info(
-                f"Loaded pipeline config: {config.pipeline_id}",
-                extra={"org_slug": org_slug, "num_steps": len(config.steps)}
-            )
-
-            return config
-
+            return plan_cache.get_plan_for_path(config_path).model
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in {config_path}: {e}")
         except Exception as e:
@@ -276,6 +259,9 @@ class ConfigLoader:
             self._cache_hits = 0
             self._cache_misses = 0
             logger.info(f"Cleared entire config cache (removed {cache_size} entries)")
+
+            from src.core.pipeline.plan_cache import get_pipeline_plan_cache
+            get_pipeline_plan_cache().invalidate()
         else:
             keys_to_delete = [k for k in self._cache.keys() if k.startswith(f"{org_slug}:")]
             for key in keys_to_delete:
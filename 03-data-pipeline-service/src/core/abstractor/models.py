@@ -63,11 +63,19 @@ class AuthConfig(BaseModel):
     header_name: Optional[str] = Field(default=None, description="Custom auth header name")
 
 
+class ParallelPaginationConfig(BaseModel):
+    """Speculative parallel page fetching (offset/page pagination only)."""
+    enabled: bool = False
+    max_concurrency: int = Field(default=4, ge=1, le=32)
+    initial_concurrency: int = Field(default=2, ge=1, le=32)
+
+
 class PaginationConfig(BaseModel):
     """API pagination configuration."""
     type: Literal["cursor", "offset", "page"] = "cursor"
     cursor_field: Optional[str] = "next_page_token"
     page_size: int = Field(default=100, ge=1, le=10000)
+    parallel: Optional[ParallelPaginationConfig] = None
 
 
 class RateLimitConfig(BaseModel):
@@ -9,7 +9,8 @@ Flow:
 3. Execute data source query
 4. Evaluate conditions
 5. Resolve recipients
-6. Send notifications
+6. Send notifications (queued in the notification outbox, so evaluation
+   does not wait on Slack/webhook/SMTP latency)
 7. Record alert history
 """
 
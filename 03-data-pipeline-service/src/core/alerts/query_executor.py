@@ -31,14 +31,14 @@ QUERY_TEMPLATES = {
             MIN(DATE(ChargePeriodStart)) as period_start,
             MAX(DATE(ChargePeriodEnd)) as period_end
         FROM `{project}.{dataset}.cost_data_standard_1_3`
-        WHERE x_source_system = 'subscription_costs_daily'
+        WHERE x_cost_category = 'subscription'
           AND DATE(ChargePeriodStart) >= @start_date
           AND DATE(ChargePeriodStart) <= @end_date
     """,
 
     # --------------------------------------------
     # CLOUD COSTS (GCP, AWS, Azure, OCI)
-    # FIX ISS-017, ISS-018: Use correct x_source_system pattern
+    # x_cost_category is materialised by the FOCUS conversion procedures
     # --------------------------------------------
     "cloud_costs": """
         SELECT
@@ -47,7 +47,7 @@ QUERY_TEMPLATES = {
             MAX(BillingCurrency) as currency,
             COUNT(*) as record_count
         FROM `{project}.{dataset}.cost_data_standard_1_3`
-        WHERE x_source_system LIKE 'cloud_%_billing_raw_daily'
+        WHERE x_cost_category = 'cloud'
           AND DATE(ChargePeriodStart) >= @start_date
           AND DATE(ChargePeriodStart) <= @end_date
     """,
@@ -63,14 +63,9 @@ QUERY_TEMPLATES = {
             MAX(BillingCurrency) as currency,
             COUNT(*) as record_count
         FROM `{project}.{dataset}.cost_data_standard_1_3`
-        WHERE (
-            LOWER(ServiceProviderName) IN ('openai', 'anthropic', 'google ai', 'gemini', 'claude', 'deepseek', 'cohere', 'mistral')
-            OR LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning')
-            OR LOWER(x_source_system) LIKE '%genai%'
-        )
-        AND x_source_system != 'subscription_costs_daily'
-        AND DATE(ChargePeriodStart) >= @start_date
-        AND DATE(ChargePeriodStart) <= @end_date
+        WHERE x_cost_category = 'genai'
+          AND DATE(ChargePeriodStart) >= @start_date
+          AND DATE(ChargePeriodStart) <= @end_date
     """,
 
     # --------------------------------------------
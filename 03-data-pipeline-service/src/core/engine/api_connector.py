@@ -5,6 +5,7 @@ REST API client with authentication, pagination, rate limiting, and retry logic.
 
 import httpx
 import asyncio
+import math
 import time
 from typing import Dict, Any, Optional, Iterator, List
 from dataclasses import dataclass
@@ -24,8 +25,16 @@ from src.core.abstractor.models import (
     AuthType,
     PaginationConfig
 )
+from src.core.engine.parallel_pagination import (
+    AdaptiveWindow,
+    PageResult,
+    ParallelPaginationSettings,
+    PARALLEL_PAGINATION_TYPES,
+    fetch_pages_parallel,
+)
 from src.core.utils.secrets import get_secret
 from src.core.utils.logging import get_logger
+from src.core.utils.http_pool import get_http_client_pool
 from src.app.config import get_settings
 
 logger = get_logger(__name__)
@@ -133,29 +142,46 @@ class APIResponse:
 class RateLimiter:
     """
     Token bucket rate limiter for API calls.
+
+    The bucket refills continuously at requests_per_minute / 60 tokens per
+    second and holds at most `burst` tokens (a minute's worth by default). A
+    full bucket is the largest burst of back-to-back requests, so parallel
+    pagination passes one_second_burst() instead.
     """
 
-    def __init__(self, requests_per_minute: int):
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
         """
         Initialize rate limiter.
 
         Args:
-            requests_per_minute: Maximum requests allowed per minute
+            requests_per_minute: Maximum requests allowed per minute (may be
+                fractional, e.g. a requests_per_second limit below 1/60)
+            burst: Bucket capacity (defaults to requests_per_minute, min 1)
         """
         self.requests_per_minute = requests_per_minute
-        self.tokens = requests_per_minute
+        self.capacity = max(1, burst if burst is not None else math.ceil(requests_per_minute))
+        self.tokens = self.capacity
         self.last_update = time.time()
         self.lock = asyncio.Lock()
 
-    async def acquire(self):
-        """Acquire a token, waiting if necessary."""
+    async def acquire(self) -> float:
+        """
+        Acquire a token, waiting if necessary.
+
+        Returns:
+            Seconds spent waiting for a token (0.0 if one was available).
+            Parallel pagination uses this as a saturation signal.
+        """
+        waited_since = time.monotonic()
+        contended = self.lock.locked()
         async with self.lock:
+            contended = contended or self.tokens <= 0
             while self.tokens <= 0:
                 # Refill tokens based on elapsed time
                 now = time.time()
                 elapsed = now - self.last_update
                 self.tokens += elapsed * (self.requests_per_minute / 60.0)
-                self.tokens = min(self.tokens, self.requests_per_minute)
+                self.tokens = min(self.tokens, self.capacity)
                 self.last_update = now
 
                 if self.tokens <= 0:
@@ -163,6 +189,12 @@ class RateLimiter:
                     await asyncio.sleep(0.1)
 
             self.tokens -= 1
+        return time.monotonic() - waited_since if contended else 0.0
+
+    @staticmethod
+    def one_second_burst(requests_per_minute: float) -> int:
+        """Bucket capacity of about one second of requests (min 1)."""
+        return max(1, math.ceil(requests_per_minute / 60.0))
 
 
 class APIConnector:
@@ -204,7 +236,16 @@ class APIConnector:
         # Rate limiter
         self.rate_limiter = None
         if config.rate_limit:
-            self.rate_limiter = RateLimiter(config.rate_limit.requests_per_minute)
+            rpm = config.rate_limit.requests_per_minute
+            pagination = config.pagination
+            parallel_enabled = (
+                pagination is not None
+                and pagination.type in PARALLEL_PAGINATION_TYPES
+                and ParallelPaginationSettings.from_config(pagination.parallel).enabled
+            )
+            # Parallel pagination would otherwise fire a minute's quota at once
+            burst = RateLimiter.one_second_burst(rpm) if parallel_enabled else None
+            self.rate_limiter = RateLimiter(rpm, burst=burst)
 
         # HTTP client (async)
         self._client: Optional[httpx.AsyncClient] = None
@@ -213,11 +254,13 @@ class APIConnector:
         """
         Get or create HTTP client.
 
+        Connections come from the shared per-host pool and outlive the client.
+
         SECURITY: follow_redirects is disabled to prevent SSRF redirect attacks.
         """
         if self._client is None:
             headers = self._build_headers()
-            self._client = httpx.AsyncClient(
+            self._client = get_http_client_pool().client(
                 headers=headers,
                 timeout=self.config.timeout,
                 follow_redirects=False
@@ -283,7 +326,8 @@ class APIConnector:
     async def _make_request(
         self,
         url: str,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        feedback: Optional[PageResult] = None
     ) -> httpx.Response:
         """
         Make HTTP GET request with retry and rate limiting.
@@ -291,6 +335,8 @@ class APIConnector:
         Args:
             url: Full URL to request
             params: Query parameters
+            feedback: Optional PageResult that records 429s and rate limiter
+                      waits across retries (used by parallel pagination)
 
         Returns:
             HTTP response
@@ -304,7 +350,9 @@ class APIConnector:
 
         # Apply rate limiting
         if self.rate_limiter:
-            await self.rate_limiter.acquire()
+            waited = await self.rate_limiter.acquire()
+            if feedback is not None:
+                feedback.rate_limited_wait += waited
 
         client = await self._get_client()
 
@@ -316,6 +364,8 @@ class APIConnector:
         )
 
         response = await client.get(url, params=params)
+        if response.status_code == 429 and feedback is not None:
+            feedback.throttled = True
         response.raise_for_status()
 
         logger.info(
@@ -347,6 +397,13 @@ class APIConnector:
 
         pagination = self.config.pagination
 
+        if pagination and pagination.type in PARALLEL_PAGINATION_TYPES:
+            parallel = ParallelPaginationSettings.from_config(pagination.parallel)
+            if parallel.enabled:
+                async for record in self._fetch_all_parallel(url, pagination, parallel, max_pages):
+                    yield record
+                return
+
         while page <= max_pages:
             # Add pagination parameters
             if pagination:
@@ -420,6 +477,56 @@ class APIConnector:
             org_slug=self.org_slug
         )
 
+    async def _fetch_all_parallel(
+        self,
+        url: str,
+        pagination: PaginationConfig,
+        parallel: ParallelPaginationSettings,
+        max_pages: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch offset/page paginated records with several pages in flight.
+
+        Records are yielded in page order; see engine/parallel_pagination.py.
+        """
+        window = AdaptiveWindow(
+            initial=parallel.initial_concurrency,
+            maximum=parallel.max_concurrency,
+        )
+
+        async def fetch_page(index: int) -> PageResult:
+            if pagination.type == "offset":
+                params = {"offset": index * pagination.page_size, "limit": pagination.page_size}
+            else:
+                params = {"page": index + 1, "per_page": pagination.page_size}
+
+            result = PageResult(rows=[])
+            response = await self._make_request(url, params, feedback=result)
+            result.rows = self._extract_records(response.json())
+            return result
+
+        total_fetched = 0
+        pages = 0
+        async for records in fetch_pages_parallel(
+            fetch_page,
+            page_size=pagination.page_size,
+            window=window,
+            max_pages=max_pages,
+        ):
+            pages += 1
+            for record in records:
+                yield record
+                total_fetched += 1
+
+        logger.info(
+            "Completed parallel fetch",
+            total_records=total_fetched,
+            total_pages=pages,
+            final_window=window.size,
+            throttle_events=window.throttle_events,
+            org_slug=self.org_slug
+        )
+
     def _extract_records(self, response_data: Any) -> List[Dict[str, Any]]:
         """
         Extract records from API response.
@@ -450,7 +557,7 @@ class APIConnector:
         return []
 
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP client (pooled connections stay open for reuse)."""
         if self._client:
             await self._client.aclose()
             self._client = None
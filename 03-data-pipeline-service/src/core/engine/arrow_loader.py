@@ -0,0 +1,268 @@
+"""
+Arrow -> BigQuery Loading
+
+Loads Arrow record batches into BigQuery as Parquet load jobs:
+- Batches are conformed to the destination table schema (types, column
+  order, lineage defaults) with vectorised casts
+- Chunks of flush_rows rows are serialised to in-memory Parquet and loaded
+  while the caller produces the next chunk
+- Used by streaming extractors and by BQLoader for spilled step outputs
+"""
+
+import asyncio
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_FLUSH_ROWS = 200_000
+
+_BQ_TO_ARROW = {
+    "STRING": pa.string(),
+    "FLOAT64": pa.float64(),
+    "FLOAT": pa.float64(),
+    "NUMERIC": pa.float64(),
+    "INT64": pa.int64(),
+    "INTEGER": pa.int64(),
+    "BOOL": pa.bool_(),
+    "BOOLEAN": pa.bool_(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "JSON": pa.string(),
+}
+
+# Nested BigQuery types are loaded from the source column unchanged
+_PASSTHROUGH_TYPES = {"RECORD", "STRUCT"}
+
+
+# ============================================
+# Casting
+# ============================================
+
+def _null_array(length: int, type_: pa.DataType = pa.string()) -> pa.Array:
+    return pa.nulls(length, type=type_)
+
+
+def to_float64(arr: pa.Array, fill: Optional[float] = 0.0) -> pa.Array:
+    """
+    Cast a column to float64, treating empty and unparseable strings as null.
+
+    Strings that Arrow cannot parse fall back to a per-value conversion for
+    that column only.
+
+    Args:
+        arr: Column to convert
+        fill: Value for nulls (None keeps them null)
+    """
+    def filled(result: pa.Array) -> pa.Array:
+        return pc.fill_null(result, fill) if fill is not None else result
+
+    if pa.types.is_floating(arr.type) or pa.types.is_integer(arr.type) or pa.types.is_decimal(arr.type):
+        return filled(pc.cast(arr, pa.float64()))
+    if pa.types.is_null(arr.type):
+        return filled(_null_array(len(arr), pa.float64()))
+
+    if not pa.types.is_string(arr.type) and not pa.types.is_large_string(arr.type):
+        arr = pc.cast(arr, pa.string())
+    arr = pc.if_else(pc.equal(pc.utf8_trim_whitespace(arr), ""), _null_array(len(arr), arr.type), arr)
+    try:
+        return filled(pc.cast(arr, pa.float64()))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        values = []
+        for value in arr.to_pylist():
+            try:
+                values.append(float(value) if value is not None else fill)
+            except (TypeError, ValueError):
+                values.append(fill)
+        return pa.array(values, type=pa.float64())
+
+
+def _blank_to_null(arr: pa.Array) -> pa.Array:
+    if pa.types.is_string(arr.type):
+        return pc.if_else(pc.equal(arr, ""), _null_array(len(arr)), arr)
+    return arr
+
+
+def _cast_column(arr: pa.Array, target: pa.DataType) -> pa.Array:
+    """Cast a column to the destination type."""
+    if arr.type == target:
+        return arr
+    if pa.types.is_null(arr.type):
+        return _null_array(len(arr), target)
+    if pa.types.is_floating(target):
+        return to_float64(arr, fill=None)
+    if pa.types.is_string(target):
+        if pa.types.is_nested(arr.type):
+            # Dicts / lists serialised the way a JSON load job would store them
+            return pa.array(
+                [json.dumps(v, default=str) if v is not None else None for v in arr.to_pylist()],
+                type=pa.string(),
+            )
+        return pc.cast(arr, pa.string())
+
+    arr = _blank_to_null(arr)
+    try:
+        return pc.cast(arr, target)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        if not pa.types.is_timestamp(target):
+            raise
+        # Offsets/formats Arrow's ISO parser rejects
+        values = [
+            datetime.fromisoformat(str(v)) if v is not None else None
+            for v in arr.to_pylist()
+        ]
+        return pa.array(values, type=target)
+
+
+def conform_to_schema(
+    table: pa.Table,
+    schema: Sequence[Any],
+    defaults: Optional[Dict[str, Any]] = None,
+) -> pa.Table:
+    """
+    Reshape a table to a BigQuery table schema.
+
+    Columns are cast to the field types and ordered like the schema; columns
+    not in the schema are dropped and missing ones are filled from
+    ``defaults`` (or null). An empty schema leaves the table unchanged.
+
+    Args:
+        table: Rows to load
+        schema: BigQuery SchemaField list of the destination table
+        defaults: Constant values for schema columns the table does not carry
+    """
+    if not schema:
+        return table
+
+    defaults = defaults or {}
+    arrays = []
+    fields = []
+    for field in schema:
+        field_type = field.field_type.upper()
+        if field_type in _PASSTHROUGH_TYPES:
+            if field.name in table.column_names:
+                column = table.column(field.name).combine_chunks()
+                arrays.append(column)
+                fields.append(pa.field(field.name, column.type))
+            continue
+
+        arrow_type = _BQ_TO_ARROW.get(field_type, pa.string())
+        if field.name in table.column_names:
+            column = table.column(field.name).combine_chunks()
+        elif field.name in defaults:
+            column = pa.repeat(pa.scalar(defaults[field.name]), table.num_rows)
+        else:
+            column = _null_array(table.num_rows, arrow_type)
+        arrays.append(_cast_column(column, arrow_type))
+        fields.append(pa.field(field.name, arrow_type, nullable=field.mode != "REQUIRED"))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+# ============================================
+# Appender
+# ============================================
+
+class ArrowBigQueryAppender:
+    """
+    Buffers Arrow batches and loads them into a BigQuery table as Parquet load jobs.
+
+    At most one load job is in flight while the next chunk is being produced,
+    so memory stays at roughly two chunks of ``flush_rows`` rows.
+
+    Args:
+        client: google.cloud.bigquery.Client
+        table_id: Fully qualified destination table
+        schema: Destination table schema (SchemaField list)
+        defaults: Values for schema columns the batches do not carry
+        flush_rows: Rows per load job
+        write_disposition: Disposition of the first load job (e.g.
+                           "WRITE_TRUNCATE"); later jobs always append
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        table_id: str,
+        schema: Sequence[Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        write_disposition: str = "WRITE_APPEND",
+    ):
+        self.client = client
+        self.table_id = table_id
+        self.schema = list(schema)
+        self.defaults = defaults or {}
+        self.flush_rows = flush_rows
+        self.write_disposition = write_disposition
+
+        self.rows_loaded = 0
+        self.load_jobs = 0
+        self._buffer: List[pa.RecordBatch] = []
+        self._buffered_rows = 0
+        self._pending: Optional[asyncio.Task] = None
+
+    async def append(self, batch: pa.RecordBatch) -> None:
+        """Buffer a batch, starting a load job once flush_rows are buffered."""
+        if batch.num_rows == 0:
+            return
+        if self._buffer and not batch.schema.equals(self._buffer[0].schema):
+            # Batches in one load job must share a schema
+            await self._flush_buffer()
+        self._buffer.append(batch)
+        self._buffered_rows += batch.num_rows
+        if self._buffered_rows >= self.flush_rows:
+            await self._flush_buffer()
+
+    async def close(self) -> int:
+        """Load any buffered rows and wait for all load jobs; returns rows loaded."""
+        await self._flush_buffer()
+        await self._wait_pending()
+        return self.rows_loaded
+
+    async def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        table = pa.Table.from_batches(self._buffer)
+        self._buffer = []
+        self._buffered_rows = 0
+
+        await self._wait_pending()
+        self._pending = asyncio.create_task(asyncio.to_thread(self._load, table))
+
+    async def _wait_pending(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self.rows_loaded += await pending
+
+    def _load(self, table: pa.Table) -> int:
+        from google.cloud import bigquery
+
+        conformed = conform_to_schema(table, self.schema, self.defaults)
+        buffer = io.BytesIO()
+        pq.write_table(conformed, buffer, compression="snappy")
+        buffer.seek(0)
+
+        disposition = self.write_disposition if self.load_jobs == 0 else "WRITE_APPEND"
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=getattr(
+                bigquery.WriteDisposition, disposition, bigquery.WriteDisposition.WRITE_APPEND
+            ),
+        )
+        job = self.client.load_table_from_file(buffer, self.table_id, job_config=job_config)
+        job.result()
+        self.load_jobs += 1
+        logger.debug(f"Loaded {conformed.num_rows} rows into {self.table_id}")
+        return conformed.num_rows
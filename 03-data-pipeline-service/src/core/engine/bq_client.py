@@ -174,6 +174,11 @@ class BigQueryClient:
         if self._client is None:
             with self._client_lock:
                 if self._client is None:
+                    if settings.bigquery_backend == "duckdb":
+                        # Offline stand-in; imported lazily so duckdb stays a dev-only dependency
+                        from src.core.engine.local_bq import get_local_bigquery_client
+                        self._client = get_local_bigquery_client()
+                        return self._client
                     self._client = bigquery.Client(
                         project=self.project_id,
                         location=self.location
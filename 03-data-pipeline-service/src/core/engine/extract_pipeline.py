@@ -0,0 +1,664 @@
+"""
+Extract Pipeline Engine
+Bounded producer/consumer pipeline for fetch -> transform -> write extraction.
+
+Architecture:
+- Fetch stage: pulls pages from an async generator (API pagination)
+- Transform stage: converts pages to rows and accumulates columnar Arrow chunks
+- Write stage: N concurrent writers flush fixed-size batches to BigQuery
+
+Backpressure: each hand-off is a bounded asyncio.Queue, so a slow writer
+stalls transformation, which in turn stalls page fetching. Memory is bounded by
+(page_buffer pages) + (max_inflight_writes + 1) batches.
+
+Batching: pages are appended as pyarrow RecordBatches and sliced zero-copy into
+batch_size tables. This replaces `buffer = buffer[batch_size:]` list re-slicing,
+which copied the remaining buffer on every flush (O(n^2) for large pages).
+
+Resumability: an optional CommitTracker maps committed batches back to the
+pagination state of the last fully-committed page, so a retried step can resume
+from a durable checkpoint. Row ranges committed after that checkpoint (recorded
+atomically with each write, see CheckpointManager.commit_batch) are skipped, so
+no row is written twice (see CommitTracker).
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+
+from src.core.utils.bq_helpers import generate_insert_id
+from src.core.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_PAGE_BUFFER = 4
+DEFAULT_MAX_INFLIGHT_WRITES = 2
+MAX_INFLIGHT_WRITES = 8
+
+# Sentinel marking end of stream on a stage queue
+_END = object()
+
+
+# ============================================
+# Metrics
+# ============================================
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for a single pipeline stage."""
+    name: str
+    items: int = 0
+    rows: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows processed per second of busy time."""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.rows / self.busy_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["busy_seconds"] = round(self.busy_seconds, 3)
+        data["blocked_seconds"] = round(self.blocked_seconds, 3)
+        data["rows_per_second"] = round(self.rows_per_second, 1)
+        return data
+
+
+@dataclass
+class PipelineStats:
+    """Aggregated result of an extract pipeline run."""
+    rows_written: int = 0
+    rows_failed: int = 0
+    rows_skipped: int = 0
+    batches_written: int = 0
+    batches_failed: int = 0
+    elapsed_seconds: float = 0.0
+    stages: Dict[str, StageMetrics] = field(default_factory=dict)
+
+    def stage_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: m.to_dict() for name, m in self.stages.items()}
+
+
+# ============================================
+# Columnar Batch Builder
+# ============================================
+
+class ArrowBatchBuilder:
+    """
+    Accumulates row dicts as Arrow RecordBatches and emits fixed-size batches.
+
+    Each appended page is converted once to a RecordBatch (with a column for
+    every key of any of its rows) and cast to the running schema of the pending pages. Pages whose fields widen that schema
+    (a missing key, int64 -> double) recast the pending pages once; emitted
+    batches are zero-copy slices of the combined table, so total work is O(rows).
+
+    When a page's types cannot be unified with the pending pages (e.g. a field
+    that is a string on one page and a number on the next), the pending pages
+    are closed off as their own segment and a new batch starts with that page.
+    A closed segment's last batch may therefore be shorter than batch_size.
+
+    Pages that are not Arrow-typeable at all (mixed types within one page)
+    switch the builder to plain row lists for the rest of the run; emitted
+    batches are then lists of dicts instead of pa.Table.
+    """
+
+    def __init__(self, batch_size: int):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self._chunks: List[Any] = []
+        self._schema: Optional[pa.Schema] = None
+        self._sealed: List[pa.Table] = []
+        self._pending_rows = 0
+        self._columnar = True
+
+    @property
+    def pending_rows(self) -> int:
+        return self._pending_rows
+
+    def append(self, rows: List[Dict[str, Any]]) -> None:
+        """Append a page of rows as a single chunk."""
+        if not rows:
+            return
+        if self._columnar:
+            try:
+                self._add_chunk(rows_to_record_batch(rows))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                logger.debug(f"Rows not Arrow-typeable, falling back to row lists: {e}")
+                self._chunks = [
+                    [row for segment in self._sealed for row in segment.to_pylist()]
+                ] + [c.to_pylist() for c in self._chunks]
+                self._chunks.append(rows)
+                self._sealed = []
+                self._schema = None
+                self._columnar = False
+        else:
+            self._chunks.append(rows)
+        self._pending_rows += len(rows)
+
+    def _add_chunk(self, chunk: pa.RecordBatch) -> None:
+        """Cast a page to the pending schema, widening it or starting a new segment."""
+        if self._schema is None:
+            self._schema = chunk.schema
+            self._chunks = [chunk]
+            return
+        if chunk.schema.equals(self._schema):
+            self._chunks.append(chunk)
+            return
+
+        try:
+            schema = pa.unify_schemas([self._schema, chunk.schema], promote_options="permissive")
+            conformed = _conform(chunk, schema)
+            if not schema.equals(self._schema):
+                self._chunks = [_conform(c, schema) for c in self._chunks]
+                self._schema = schema
+            self._chunks.append(conformed)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.debug(f"Page types incompatible with pending rows, starting a new batch: {e}")
+            if self._chunks:
+                self._sealed.append(pa.Table.from_batches(self._chunks, schema=self._schema))
+            self._schema = chunk.schema
+            self._chunks = [chunk]
+
+    def drain(self, final: bool = False) -> List[Any]:
+        """
+        Emit all complete batches (and the remainder when final=True).
+
+        Returns:
+            List of batches (pa.Table, or list of row dicts after fallback),
+            each with exactly batch_size rows except possibly the last one
+            of a closed segment or, when final=True, the last one overall.
+        """
+        if (
+            not self._sealed
+            and self._pending_rows < self.batch_size
+            and not (final and self._pending_rows)
+        ):
+            return []
+
+        batches: List[Any] = []
+        for segment in self._sealed:
+            batches.extend(self._split(segment, len(segment)))
+            self._pending_rows -= len(segment)
+        self._sealed = []
+
+        if self._columnar:
+            # Every chunk already carries self._schema, so this is zero-copy
+            combined = pa.Table.from_batches(self._chunks, schema=self._schema) if self._chunks else None
+        else:
+            combined = [row for chunk in self._chunks for row in chunk]
+
+        total = len(combined) if combined is not None else 0
+        emit = total if final else total - total % self.batch_size
+        batches.extend(self._split(combined, emit))
+
+        remaining = total - emit
+        if not remaining:
+            self._chunks = []
+            self._schema = None
+        elif self._columnar:
+            self._chunks = combined.slice(emit).to_batches()
+        else:
+            self._chunks = [combined[emit:]]
+        self._pending_rows = remaining
+        return batches
+
+    def _split(self, combined: Any, length: int) -> List[Any]:
+        """Slice the first `length` rows into batch_size pieces (the last may be short)."""
+        return [
+            self._slice(combined, offset, min(self.batch_size, length - offset))
+            for offset in range(0, length, self.batch_size)
+        ]
+
+    def _slice(self, combined: Any, offset: int, length: int) -> Any:
+        if self._columnar:
+            return combined.slice(offset, length)
+        return combined[offset:offset + length]
+
+
+def rows_to_record_batch(rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    """
+    Convert dict rows to a RecordBatch with a column for every key in any row.
+
+    pa.RecordBatch.from_pylist takes its schema from the first row and drops
+    keys that only appear in later rows; optional vendor fields would be lost.
+    Columns are ordered by first appearance and missing values become nulls.
+
+    Raises:
+        pa.ArrowInvalid / pa.ArrowTypeError: a column mixes incompatible types
+    """
+    keys: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if key not in keys:
+                keys[key] = None
+    return pa.RecordBatch.from_pydict({key: [row.get(key) for row in rows] for key in keys})
+
+
+def _conform(chunk: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Cast a RecordBatch to a (widened) schema, filling missing fields with nulls."""
+    columns = []
+    for schema_field in schema:
+        idx = chunk.schema.get_field_index(schema_field.name)
+        if idx < 0:
+            columns.append(pa.nulls(chunk.num_rows, schema_field.type))
+        else:
+            columns.append(chunk.column(idx).cast(schema_field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _slice_batch(batch: Any, offset: int, length: int) -> Any:
+    """Slice an emitted batch (pa.Table or row list)."""
+    if isinstance(batch, pa.Table):
+        return batch.slice(offset, length)
+    return batch[offset:offset + length]
+
+
+def batch_to_rows(batch: Any) -> List[Dict[str, Any]]:
+    """Convert an emitted batch back to row dicts for the BigQuery writers."""
+    if isinstance(batch, pa.Table):
+        return batch.to_pylist()
+    return batch
+
+
+# ============================================
+# Commit Tracking (Resumable Extraction)
+# ============================================
+
+class CheckpointMismatchError(RuntimeError):
+    """Raised when re-fetched source rows do not match the checkpointed boundary."""
+    pass
+
+
+@dataclass
+class ResumePoint:
+    """
+    Durable resume position for an extraction.
+
+    Attributes:
+        page_state: Pagination state that fetches the page AFTER the last
+                    fully-committed page (None = start from the first page)
+        page_end_row: Absolute row count up to and including that page
+        rows_committed: Contiguous committed row watermark (>= page_end_row)
+        boundary_id: Fingerprint (generate_insert_id over the raw source record,
+                     before transformation) of the last committed source row.
+                     It is only compared with re-fetched source rows to verify
+                     the source order, never with stored insertIds
+        committed_ahead: [start_row, row_count] of ranges committed beyond
+                         the watermark (concurrent writes finish out of order)
+        batch_size: Batch size the ranges above were produced with
+    """
+    page_state: Optional[Dict[str, Any]] = None
+    page_end_row: int = 0
+    rows_committed: int = 0
+    boundary_id: Optional[str] = None
+    committed_ahead: List[List[int]] = field(default_factory=list)
+    batch_size: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True, default=str)
+
+    @classmethod
+    def from_json(cls, value: Optional[str]) -> Optional["ResumePoint"]:
+        if not value:
+            return None
+        try:
+            return cls(**json.loads(value))
+        except (TypeError, ValueError):
+            return None
+
+
+class CommitTracker:
+    """
+    Tracks which source rows are durably written and where to resume.
+
+    The fetch stage reports each page with the pagination state needed to fetch
+    the next page. Writers report batches by absolute start row. The tracker
+    keeps a contiguous committed-row watermark and the newest page lying fully
+    below it, which together form the ResumePoint.
+
+    On resume, pages are re-fetched from ResumePoint.page_state and the first
+    (rows_committed - page_end_row) rows are dropped. Rows inside ranges that
+    were committed beyond the watermark are skipped at write time. Those ranges
+    come from committed_ahead and from `committed` - the batch ledger, which is
+    written atomically with each batch and therefore also covers commits after
+    the last (coalesced) checkpoint write. Each source row is written exactly
+    once as long as the source returns rows in a stable order; the fingerprint
+    of the boundary row is checked to detect sources whose order changed.
+
+    Args:
+        batch_size: Rows per write batch
+        key_fields: Fields for the source row fingerprint (None = whole row)
+        resume: ResumePoint from a previous attempt, if any
+        committed: [start_row, row_count] ranges known to be committed (ledger)
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        key_fields: Optional[List[str]] = None,
+        resume: Optional[ResumePoint] = None,
+        committed: Optional[List[List[int]]] = None,
+    ):
+        self.batch_size = batch_size
+        self.key_fields = key_fields
+        resume = resume or ResumePoint()
+
+        self.watermark = resume.rows_committed
+        self.boundary_id = resume.boundary_id
+        self._resume_state = resume.page_state
+        self._resume_end_row = resume.page_end_row
+        self._to_skip = resume.rows_committed - resume.page_end_row
+        self._fetched_rows = resume.page_end_row
+
+        # Row ranges written by previous attempts beyond the watermark, merged
+        # into sorted, non-overlapping (start, end) pairs
+        self._skip_ranges: List[Tuple[int, int]] = _merge_ranges(
+            (start, start + count)
+            for start, count in list(resume.committed_ahead) + list(committed or [])
+            if start + count > self.watermark
+        )
+
+        # (start_row, end_row, next_page_state, row_ids) for pages not yet
+        # fully below the watermark
+        self._pages: Deque[Tuple[int, int, Optional[Dict[str, Any]], List[str]]] = deque()
+        self._committed: Dict[int, int] = {}
+        self.failed_batches = 0
+
+    @property
+    def base_row(self) -> int:
+        """Absolute row index of the first row emitted after resuming."""
+        return self.watermark
+
+    def page_fetched(
+        self,
+        rows: List[Dict[str, Any]],
+        next_state: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Register a fetched page and return the rows that still need writing.
+
+        Raises:
+            CheckpointMismatchError: If the re-fetched boundary row differs
+                                     from the checkpointed one.
+        """
+        start = self._fetched_rows
+        end = start + len(rows)
+        row_ids = [generate_insert_id(row, self.key_fields) for row in rows]
+        self._pages.append((start, end, next_state, row_ids))
+        self._fetched_rows = end
+
+        if not self._to_skip:
+            return rows
+
+        skip = min(self._to_skip, len(rows))
+        self._to_skip -= skip
+        if not self._to_skip and self.boundary_id and row_ids[skip - 1] != self.boundary_id:
+            raise CheckpointMismatchError(
+                "Source rows changed since the last checkpoint; "
+                "clear the checkpoint to re-extract from the beginning"
+            )
+        return rows[skip:]
+
+    def split_committed(self, start_row: int, row_count: int) -> List[Tuple[int, int, bool]]:
+        """
+        Split a batch's row range by whether a previous attempt committed it.
+
+        Returns:
+            (start_row, row_count, committed) pieces covering the range in order
+        """
+        pieces: List[Tuple[int, int, bool]] = []
+        pos, end = start_row, start_row + row_count
+        for skip_start, skip_end in self._skip_ranges:
+            if skip_end <= pos:
+                continue
+            if skip_start >= end:
+                break
+            if skip_start > pos:
+                pieces.append((pos, skip_start - pos, False))
+                pos = skip_start
+            covered_end = min(skip_end, end)
+            pieces.append((pos, covered_end - pos, True))
+            pos = covered_end
+        if pos < end:
+            pieces.append((pos, end - pos, False))
+        return pieces
+
+    def batch_done(self, start_row: int, row_count: int, success: bool) -> None:
+        """Record a finished batch and advance the watermark if possible."""
+        if not success:
+            self.failed_batches += 1
+            return
+
+        self._committed[start_row] = row_count
+        advanced = False
+        while self.watermark in self._committed:
+            self.watermark += self._committed.pop(self.watermark)
+            advanced = True
+
+        if advanced:
+            self._advance_resume_page()
+
+    def _advance_resume_page(self) -> None:
+        boundary = self.watermark - 1
+        for start, end, _, row_ids in self._pages:
+            if start <= boundary < end:
+                self.boundary_id = row_ids[boundary - start]
+                break
+
+        while self._pages and self._pages[0][1] <= self.watermark:
+            _, end, state, _ = self._pages.popleft()
+            self._resume_state = state
+            self._resume_end_row = end
+
+    def resume_point(self) -> ResumePoint:
+        """Current durable resume position."""
+        return ResumePoint(
+            page_state=self._resume_state,
+            page_end_row=self._resume_end_row,
+            rows_committed=self.watermark,
+            boundary_id=self.boundary_id,
+            committed_ahead=[[s, c] for s, c in sorted(self._committed.items())],
+            batch_size=self.batch_size,
+        )
+
+
+def _merge_ranges(ranges) -> List[Tuple[int, int]]:
+    """Merge (start, end) ranges into sorted, non-overlapping ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# ============================================
+# Pipeline Runner
+# ============================================
+
+WriteFn = Callable[..., Awaitable[Any]]
+TransformFn = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+async def run_extract_pipeline(
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    transform: TransformFn,
+    write: WriteFn,
+    batch_size: int,
+    page_buffer: int = DEFAULT_PAGE_BUFFER,
+    max_inflight_writes: int = DEFAULT_MAX_INFLIGHT_WRITES,
+    tracker: Optional[CommitTracker] = None,
+    on_commit: Optional[Callable[[CommitTracker], None]] = None,
+) -> PipelineStats:
+    """
+    Run fetch, transform and write as concurrent bounded stages.
+
+    Args:
+        pages: Async iterator yielding pages of raw records
+        transform: Sync function converting a raw page into destination rows
+        write: Async function writing a batch of rows. Must return an object
+               with `success`, `rows_inserted` and (optionally) `rows_failed`
+               attributes, e.g. bq_helpers.InsertResult. With a tracker it is
+               called as write(rows, start_row) so the write can record the
+               committed range atomically (CheckpointManager.commit_batch)
+        batch_size: Rows per write batch
+        page_buffer: Max fetched pages waiting for transformation
+        max_inflight_writes: Concurrent write batches (clamped to MAX_INFLIGHT_WRITES)
+        tracker: Optional CommitTracker. Batch row offsets start at
+                 tracker.base_row and rows it already committed are skipped
+        on_commit: Called with the tracker after every successful batch
+                   (e.g. to schedule an async checkpoint write)
+
+    Returns:
+        PipelineStats with row counts and per-stage throughput metrics
+
+    Raises:
+        Exception: First exception raised by the fetch or transform stage.
+                   Write failures are counted, not raised (partial data is
+                   better than none).
+    """
+    start = time.monotonic()
+    max_inflight_writes = min(max(1, max_inflight_writes), MAX_INFLIGHT_WRITES)
+
+    page_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, page_buffer))
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=max_inflight_writes)
+
+    stats = PipelineStats(stages={
+        "fetch": StageMetrics("fetch"),
+        "transform": StageMetrics("transform"),
+        "write": StageMetrics("write"),
+    })
+    fetch_m, transform_m, write_m = (
+        stats.stages["fetch"], stats.stages["transform"], stats.stages["write"]
+    )
+
+    async def fetch_stage() -> None:
+        iterator = pages.__aiter__()
+        while True:
+            t0 = time.monotonic()
+            try:
+                page = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            fetch_m.busy_seconds += time.monotonic() - t0
+            fetch_m.items += 1
+            fetch_m.rows += len(page)
+
+            t0 = time.monotonic()
+            await page_queue.put(page)
+            fetch_m.blocked_seconds += time.monotonic() - t0
+        await page_queue.put(_END)
+
+    async def transform_stage() -> None:
+        builder = ArrowBatchBuilder(batch_size)
+        next_row = tracker.base_row if tracker else 0
+        while True:
+            page = await page_queue.get()
+            if page is _END:
+                break
+
+            t0 = time.monotonic()
+            rows = transform(page)
+            builder.append(rows)
+            ready = builder.drain()
+            transform_m.busy_seconds += time.monotonic() - t0
+            transform_m.items += 1
+            transform_m.rows += len(rows)
+
+            for batch in ready:
+                t0 = time.monotonic()
+                await write_queue.put((next_row, batch))
+                next_row += len(batch)
+                transform_m.blocked_seconds += time.monotonic() - t0
+
+        for batch in builder.drain(final=True):
+            await write_queue.put((next_row, batch))
+            next_row += len(batch)
+        for _ in range(max_inflight_writes):
+            await write_queue.put(_END)
+
+    async def write_worker() -> None:
+        while True:
+            item = await write_queue.get()
+            if item is _END:
+                return
+            start_row, batch = item
+
+            if not tracker:
+                await write_rows(batch_to_rows(batch))
+                continue
+
+            for piece_start, piece_rows, committed in tracker.split_committed(start_row, len(batch)):
+                if committed:
+                    # Already committed by a previous attempt
+                    stats.rows_skipped += piece_rows
+                    tracker.batch_done(piece_start, piece_rows, success=True)
+                    continue
+                piece = batch if piece_rows == len(batch) else _slice_batch(
+                    batch, piece_start - start_row, piece_rows
+                )
+                result = await write_rows(batch_to_rows(piece), piece_start)
+                tracker.batch_done(piece_start, piece_rows, result.success)
+                if result.success and on_commit:
+                    on_commit(tracker)
+
+    async def write_rows(rows: List[Dict[str, Any]], start_row: Optional[int] = None) -> Any:
+        t0 = time.monotonic()
+        result = await (write(rows) if start_row is None else write(rows, start_row))
+        write_m.busy_seconds += time.monotonic() - t0
+        write_m.items += 1
+
+        if result.success:
+            stats.rows_written += result.rows_inserted
+            stats.batches_written += 1
+            write_m.rows += result.rows_inserted
+        else:
+            stats.rows_failed += getattr(result, "rows_failed", len(rows))
+            stats.batches_failed += 1
+            logger.error(f"Batch insert failed: {getattr(result, 'error', None)}")
+        return result
+
+    tasks = [
+        asyncio.create_task(fetch_stage(), name="extract-fetch"),
+        asyncio.create_task(transform_stage(), name="extract-transform"),
+    ] + [
+        asyncio.create_task(write_worker(), name=f"extract-write-{i}")
+        for i in range(max_inflight_writes)
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    stats.elapsed_seconds = time.monotonic() - start
+
+    logger.info(
+        "Extract pipeline completed",
+        extra={
+            "rows_written": stats.rows_written,
+            "rows_failed": stats.rows_failed,
+            "batches_written": stats.batches_written,
+            "elapsed_seconds": round(stats.elapsed_seconds, 2),
+            "stage_metrics": stats.stage_metrics(),
+        }
+    )
+    return stats
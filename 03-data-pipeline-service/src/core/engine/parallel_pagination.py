@@ -0,0 +1,202 @@
+"""
+Parallel Pagination
+Speculative parallel page fetching for offset/page style pagination.
+
+For offset and page-number pagination the URL of page N is known before page
+N-1 has arrived, so several pages can be in flight at once. Pages are still
+yielded strictly in order, and fetching stops at the first short or empty page
+(pages requested beyond it are cancelled and discarded).
+
+Concurrency is governed by an AIMD window:
+- Additive increase: +1 slot after a full window of clean responses
+- Multiplicative decrease: halve the window on a 429 (rate limited)
+- Hold: no growth while the client-side RateLimiter is making callers wait,
+  since extra concurrency cannot go faster than the configured rate
+
+Cursor and link pagination are inherently sequential and are not handled here.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List
+
+from src.core.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_INITIAL_CONCURRENCY = 2
+MAX_CONCURRENCY_LIMIT = 32
+
+PARALLEL_PAGINATION_TYPES = {"offset", "page"}
+
+
+# ============================================
+# Data Classes
+# ============================================
+
+@dataclass
+class PageResult:
+    """Result of fetching a single page."""
+    rows: List[Dict[str, Any]]
+    throttled: bool = False       # Server returned 429 at least once for this page
+    rate_limited_wait: float = 0.0  # Seconds spent waiting on the client-side limiter
+
+
+class AdaptiveWindow:
+    """
+    AIMD concurrency window for speculative page fetching.
+
+    Args:
+        initial: Starting number of in-flight requests
+        maximum: Upper bound on in-flight requests
+        minimum: Lower bound (never below 1)
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_CONCURRENCY,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        minimum: int = 1,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, min(maximum, MAX_CONCURRENCY_LIMIT))
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self._clean_responses = 0
+        self.throttle_events = 0
+
+    def record(self, result: PageResult) -> None:
+        """Adjust the window from a page's rate-limit feedback."""
+        if result.throttled:
+            self.throttle_events += 1
+            self._clean_responses = 0
+            new_size = max(self.minimum, self.size // 2)
+            if new_size != self.size:
+                logger.info(
+                    f"Rate limited, shrinking fetch window {self.size} -> {new_size}"
+                )
+            self.size = new_size
+            return
+
+        if result.rate_limited_wait > 0:
+            # Client-side limiter is the bottleneck - more slots would only queue
+            self._clean_responses = 0
+            return
+
+        self._clean_responses += 1
+        if self._clean_responses >= self.size and self.size < self.maximum:
+            self.size += 1
+            self._clean_responses = 0
+
+
+@dataclass
+class ParallelPaginationSettings:
+    """Resolved parallel pagination settings for a fetch."""
+    enabled: bool = False
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY
+
+    @classmethod
+    def from_config(cls, config: Any) -> "ParallelPaginationSettings":
+        """
+        Build settings from a pipeline YAML dict or a Pydantic model.
+
+        YAML:
+            pagination:
+              type: "offset"
+              parallel:
+                enabled: true
+                max_concurrency: 8
+                initial_concurrency: 2
+        """
+        if not config:
+            return cls()
+        if not isinstance(config, dict):
+            config = config.model_dump()
+        return cls(
+            enabled=bool(config.get("enabled", False)),
+            max_concurrency=int(config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)),
+            initial_concurrency=int(
+                config.get("initial_concurrency", DEFAULT_INITIAL_CONCURRENCY)
+            ),
+        )
+
+
+# ============================================
+# Speculative Fetcher
+# ============================================
+
+async def fetch_pages_parallel(
+    fetch_page: Callable[[int], Awaitable[PageResult]],
+    page_size: int,
+    window: AdaptiveWindow,
+    max_pages: int,
+    start_index: int = 0,
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Fetch pages concurrently and yield them in order.
+
+    Args:
+        fetch_page: Coroutine fetching the page at a zero-based index
+        page_size: Expected rows per full page; a shorter page ends pagination
+        window: Adaptive concurrency window (mutated as feedback arrives)
+        max_pages: Hard limit on page index (exclusive)
+        start_index: First page index to fetch (used when resuming)
+
+    Yields:
+        Non-empty pages of rows, in page order
+
+    Raises:
+        Exception: The first error raised by fetch_page, after cancelling all
+                   other in-flight requests.
+    """
+    in_flight: Dict[int, asyncio.Task] = {}
+    next_to_schedule = start_index
+    next_to_yield = start_index
+    exhausted = False
+
+    try:
+        while next_to_yield < max_pages:
+            while (
+                len(in_flight) < window.size
+                and next_to_schedule < max_pages
+            ):
+                in_flight[next_to_schedule] = asyncio.create_task(
+                    fetch_page(next_to_schedule)
+                )
+                next_to_schedule += 1
+
+            task = in_flight.pop(next_to_yield)
+            result = await task
+            window.record(result)
+            next_to_yield += 1
+
+            if result.rows:
+                yield result.rows
+
+            if len(result.rows) < page_size:
+                logger.debug(
+                    "Short page, stopping speculative fetch",
+                    extra={
+                        "page_index": next_to_yield - 1,
+                        "rows": len(result.rows),
+                        "discarded_in_flight": len(in_flight),
+                    }
+                )
+                exhausted = True
+                break
+
+        if not exhausted:
+            logger.error(
+                f"Pagination limit reached ({max_pages} pages) - data may be truncated"
+            )
+    finally:
+        for task in in_flight.values():
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
@@ -0,0 +1,210 @@
+"""
+Step Output Datasets
+
+Spill-to-disk hand-off of extracted rows between pipeline steps:
+- Extractors write Arrow record batches to local Arrow IPC files instead of
+  keeping lists of dict rows in the pipeline context
+- Only a small, JSON-serialisable handle travels in step results/context
+  (``output_dataset``, which the executor merges into dependent steps)
+- Loaders read the files memory-mapped, batch by batch (zero-copy)
+- Files live under one directory per pipeline run, removed when the run ends
+
+Per-pipeline memory is O(batch) instead of O(rows).
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+
+from src.core.engine.extract_pipeline import rows_to_record_batch
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+# Step result key; the executor merges output_* keys into dependents' context
+STEP_OUTPUT_KEY = "output_dataset"
+# Context key for consumers running against the same context
+CONTEXT_KEY = "extracted_dataset"
+
+DEFAULT_ROWS_PER_BATCH = 10_000
+_HANDLE_MARKER = "arrow_ipc"
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value)[:128] or "unnamed"
+
+
+def step_output_root() -> str:
+    """Root directory for spilled step outputs."""
+    try:
+        from src.app.config import settings
+        configured = settings.step_output_dir
+    except ImportError:
+        configured = None
+    return configured or os.path.join(tempfile.gettempdir(), "pipeline-step-outputs")
+
+
+def run_output_dir(run_id: str) -> str:
+    """Directory holding every step output of one pipeline run."""
+    return os.path.join(step_output_root(), _safe_name(run_id))
+
+
+def cleanup_run_outputs(run_id: str) -> None:
+    """Delete all spilled step outputs of a pipeline run (idempotent)."""
+    path = run_output_dir(run_id)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+        logger.debug(f"Removed step outputs for run {run_id}")
+
+
+# ============================================
+# Dataset Handle
+# ============================================
+
+@dataclass(frozen=True)
+class StepDataset:
+    """
+    Handle to a spilled step output: one or more Arrow IPC files.
+
+    A new part file starts whenever the batch schema changes, so each part
+    is internally consistent.
+    """
+    path: str
+    parts: List[str]
+    num_rows: int
+    format: str = _HANDLE_MARKER
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StepDataset":
+        return cls(
+            path=data["path"],
+            parts=list(data["parts"]),
+            num_rows=int(data["num_rows"]),
+            format=data.get("format", _HANDLE_MARKER),
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.path, p)) for p in self.parts)
+
+    def iter_batches(self) -> Iterator[pa.RecordBatch]:
+        """Yield record batches memory-mapped from disk, without copying."""
+        for part in self.parts:
+            with pa.memory_map(os.path.join(self.path, part), "r") as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+
+    def iter_rows(self, chunk_size: int = DEFAULT_ROWS_PER_BATCH) -> Iterator[List[Dict[str, Any]]]:
+        """Yield rows as lists of dicts, at most chunk_size at a time."""
+        for batch in self.iter_batches():
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size).to_pylist()
+
+
+def as_dataset(value: Any) -> Optional[StepDataset]:
+    """Return a StepDataset for a handle (object or its dict form), else None."""
+    if isinstance(value, StepDataset):
+        return value
+    if isinstance(value, dict) and value.get("format") == _HANDLE_MARKER and "parts" in value:
+        return StepDataset.from_dict(value)
+    return None
+
+
+def find_dataset(context: Dict[str, Any]) -> Optional[StepDataset]:
+    """The step dataset available to a step, from its own or an upstream step."""
+    return as_dataset(context.get(CONTEXT_KEY)) or as_dataset(context.get(STEP_OUTPUT_KEY))
+
+
+# ============================================
+# Writer
+# ============================================
+
+class StepDatasetWriter:
+    """
+    Writes a step's output rows to Arrow IPC files under the run directory.
+
+    Args:
+        run_id: Pipeline run (pipeline_logging_id); scopes cleanup
+        step_id: Producing step
+        rows_per_batch: Rows per record batch when writing dict rows
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        step_id: str,
+        rows_per_batch: int = DEFAULT_ROWS_PER_BATCH,
+    ):
+        self.path = os.path.join(
+            run_output_dir(run_id), f"{_safe_name(step_id)}-{uuid.uuid4().hex[:8]}"
+        )
+        self.rows_per_batch = rows_per_batch
+        self.num_rows = 0
+        self._parts: List[str] = []
+        self._writer: Optional[pa.ipc.RecordBatchFileWriter] = None
+        self._sink = None
+        self._schema: Optional[pa.Schema] = None
+        os.makedirs(self.path, exist_ok=True)
+
+    def _close_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+        self._writer = None
+        self._sink = None
+        self._schema = None
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        """Append a record batch, starting a new part file if its schema differs."""
+        if batch.num_rows == 0:
+            return
+        if self._schema is None or not batch.schema.equals(self._schema):
+            self._close_part()
+            name = f"part-{len(self._parts):05d}.arrow"
+            self._sink = pa.OSFile(os.path.join(self.path, name), "wb")
+            self._writer = pa.ipc.new_file(self._sink, batch.schema)
+            self._schema = batch.schema
+            self._parts.append(name)
+        self._writer.write_batch(batch)
+        self.num_rows += batch.num_rows
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append dict rows, converted rows_per_batch at a time.
+
+        Each batch has a column for every key in any of its rows, so optional
+        fields missing from a batch's first row are kept.
+        """
+        chunk: List[Dict[str, Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.rows_per_batch:
+                self.write_batch(rows_to_record_batch(chunk))
+                chunk = []
+        if chunk:
+            self.write_batch(rows_to_record_batch(chunk))
+
+    def close(self) -> StepDataset:
+        """Finish the last part file and return the handle."""
+        self._close_part()
+        return StepDataset(path=self.path, parts=list(self._parts), num_rows=self.num_rows)
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        self._close_part()
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,622 @@
+"""
+Metadata Flush Engine
+
+Shared write path for pipeline metadata logs. MetadataLogger instances hand
+rows to the engine of their event loop instead of owning queues and flush
+workers:
+
+- Rows from every run are buffered per table and written with one
+  insert_rows_json call per table per flush (coalesced across runs)
+- A table flushes as soon as it holds a full batch, otherwise after
+  flush_interval_seconds; producers never block on a full buffer
+- Batch sizes adapt to observed write latency: they double while full
+  batches finish well under target_latency_seconds and halve above it
+- While BigQuery is failing (write errors / open circuit breaker) rows are
+  spilled to local JSONL files (written in worker threads, never on the
+  event loop) and replayed once writes succeed again.
+  Rows are only dropped (counted as lost) when spilling is disabled, the
+  spill budget is exhausted, or BigQuery rejects them as invalid
+- Prometheus metrics for pending rows, flush latency, queue latency and
+  rows by outcome
+
+One engine exists per event loop (the Pub/Sub worker runs each task in its
+own loop); spill files are shared and claimed by rename before replay.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence
+
+from src.app.config import settings
+from src.core.observability.metrics import (
+    increment_metadata_log_rows,
+    observe_metadata_log_flush,
+    observe_metadata_log_queue_latency,
+    set_metadata_log_pending_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+MIN_BATCH_ROWS = 10
+SPILL_SUFFIX = ".jsonl"
+_REPLAYING_SUFFIX = ".replaying"
+
+# (table_id, rows, row_ids) -> insert_rows_json-style error list
+RowWriter = Callable[[str, List[Dict[str, Any]], List[str]], List[Dict[str, Any]]]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker to prevent cascading failures.
+    Opens circuit after N consecutive failures, preventing further writes.
+    """
+
+    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 60):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Number of consecutive failures before opening circuit
+            timeout_seconds: Seconds to wait before attempting to close circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.timeout_seconds = timeout_seconds
+        self.failure_count = 0
+        self.last_failure_time: Optional[datetime] = None
+        self.is_open = False
+
+    def record_success(self):
+        """Record a successful operation."""
+        self.failure_count = 0
+        self.is_open = False
+        self.last_failure_time = None
+
+    def record_failure(self):
+        """Record a failed operation."""
+        self.failure_count += 1
+        self.last_failure_time = datetime.now(timezone.utc)
+
+        if self.failure_count >= self.failure_threshold:
+            self.is_open = True
+            logger.error(
+                f"Circuit breaker opened after {self.failure_count} consecutive failures",
+                extra={"failure_threshold": self.failure_threshold}
+            )
+
+    def can_execute(self) -> bool:
+        """
+        Check if operation can be executed.
+
+        Returns:
+            True if circuit is closed or timeout has elapsed
+        """
+        if not self.is_open:
+            return True
+
+        # Check if timeout has elapsed
+        if self.last_failure_time:
+            elapsed = (datetime.now(timezone.utc) - self.last_failure_time).total_seconds()
+            if elapsed >= self.timeout_seconds:
+                logger.info(
+                    "Circuit breaker attempting to close after timeout",
+                    extra={"elapsed_seconds": elapsed}
+                )
+                self.is_open = False
+                self.failure_count = 0
+                return True
+
+        return False
+
+
+def insert_rows_writer(client: Any = None) -> RowWriter:
+    """Writer backed by BigQuery streaming inserts (insertId per row for idempotency)."""
+
+    def write(table_id: str, rows: List[Dict[str, Any]], row_ids: List[str]) -> List[Dict[str, Any]]:
+        bq_client = client
+        if bq_client is None:
+            from src.core.engine.bq_client import get_bigquery_client
+            bq_client = get_bigquery_client().client
+        return bq_client.insert_rows_json(table_id, rows, row_ids=row_ids)
+
+    return write
+
+
+def _short_name(table_id: str) -> str:
+    return table_id.rsplit(".", 1)[-1]
+
+
+# ============================================
+# Buffers
+# ============================================
+
+@dataclass
+class _Row:
+    seq: int
+    insert_id: str
+    json: Dict[str, Any]
+    queued_at: float
+
+
+@dataclass
+class TableFlushMetrics:
+    rows_written: int = 0
+    rows_spilled: int = 0
+    rows_replayed: int = 0
+    rows_shed: int = 0
+    rows_rejected: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    last_flush_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+@dataclass
+class _TableBuffer:
+    table_id: str
+    batch_rows: int
+    rows: Deque[_Row] = field(default_factory=deque)
+    next_seq: int = 1
+    in_flight_first_seq: Optional[int] = None
+    # First seq of each overflow batch whose spill file is still being written
+    spilling_first_seqs: List[int] = field(default_factory=list)
+    force_through: int = 0
+    last_flush_at: float = field(default_factory=time.monotonic)
+    metrics: TableFlushMetrics = field(default_factory=TableFlushMetrics)
+
+    @property
+    def handled_through(self) -> int:
+        """Highest seq such that it and every earlier row was written, spilled or dropped."""
+        pending = [self.next_seq]
+        if self.rows:
+            pending.append(self.rows[0].seq)
+        if self.in_flight_first_seq is not None:
+            pending.append(self.in_flight_first_seq)
+        pending.extend(self.spilling_first_seqs)
+        return min(pending) - 1
+
+
+class MetadataFlushEngine:
+    """
+    Coalescing, adaptive writer for metadata log tables.
+
+    Args:
+        writer: Blocking row writer (defaults to BigQuery insert_rows_json)
+        initial_batch_rows: Starting batch size per table
+        max_batch_rows: Upper bound for the adaptive batch size
+        target_latency_seconds: Write latency the batch size is tuned to
+        flush_interval_seconds: Max wait before a partial batch is written
+        max_pending_rows: Rows buffered per table before the oldest are spilled
+        spill_dir: Directory for spilled rows (None disables spilling)
+        spill_max_bytes: Disk budget for spilled rows
+        breaker: Circuit breaker guarding BigQuery writes
+    """
+
+    def __init__(
+        self,
+        writer: Optional[RowWriter] = None,
+        initial_batch_rows: Optional[int] = None,
+        max_batch_rows: Optional[int] = None,
+        target_latency_seconds: Optional[float] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_pending_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        spill_max_bytes: Optional[int] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.writer = writer or insert_rows_writer()
+        self.max_batch_rows = max_batch_rows or settings.metadata_log_max_batch_rows
+        self.initial_batch_rows = min(
+            initial_batch_rows or settings.metadata_log_batch_size, self.max_batch_rows
+        )
+        self.target_latency_seconds = (
+            settings.metadata_log_target_flush_latency_ms / 1000
+            if target_latency_seconds is None else target_latency_seconds
+        )
+        self.flush_interval_seconds = (
+            settings.metadata_log_flush_interval_seconds
+            if flush_interval_seconds is None else flush_interval_seconds
+        )
+        self.max_pending_rows = max_pending_rows or settings.metadata_log_max_pending_rows
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes or settings.metadata_log_spill_max_mb * 1024 * 1024
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, timeout_seconds=60)
+
+        self._tables: Dict[str, _TableBuffer] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._progress: Optional[asyncio.Condition] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._replay_task: Optional[asyncio.Task] = None
+        self._spill_tasks: set = set()
+        self._closed = False
+        self._spilled_bytes = self._scan_spill_dir()
+
+    # ============================================
+    # Producer API
+    # ============================================
+
+    def submit(self, table_id: str, insert_id: str, row: Dict[str, Any]) -> int:
+        """
+        Buffer a row (never blocks).
+
+        Returns:
+            Sequence number of the row within its table (see wait_flushed)
+        """
+        if self._closed:
+            raise RuntimeError("MetadataFlushEngine is closed")
+        self._ensure_started()
+        table = self._table(table_id)
+        seq = table.next_seq
+        table.next_seq += 1
+        table.rows.append(_Row(seq, insert_id, row, time.monotonic()))
+
+        if len(table.rows) > self.max_pending_rows:
+            # Backlog beyond the buffer budget: move the oldest rows to disk
+            overflow = [table.rows.popleft() for _ in range(min(table.batch_rows, len(table.rows)))]
+            self._spill_in_background(table, overflow, reason="overflow")
+        if len(table.rows) >= table.batch_rows:
+            self._wake.set()
+        set_metadata_log_pending_rows(_short_name(table_id), len(table.rows))
+        return seq
+
+    async def wait_flushed(self, through: Mapping[str, int]) -> None:
+        """
+        Flush now and wait until rows up to the given seqs were handled.
+
+        Args:
+            through: table_id -> last seq returned by submit()
+        """
+        waits = {table_id: seq for table_id, seq in through.items() if seq}
+        if not waits:
+            return
+        self._ensure_started()
+        for table_id, seq in waits.items():
+            table = self._table(table_id)
+            table.force_through = max(table.force_through, seq)
+        self._wake.set()
+        async with self._progress:
+            await self._progress.wait_for(
+                lambda: all(self._tables[t].handled_through >= seq for t, seq in waits.items())
+            )
+
+    async def flush(self) -> None:
+        """Write (or spill) every row buffered so far."""
+        await self.wait_flushed({
+            table_id: table.next_seq - 1 for table_id, table in self._tables.items()
+        })
+
+    async def close(self) -> None:
+        """Flush remaining rows and stop the dispatcher."""
+        if self._runner is None:
+            self._closed = True
+            return
+        await self.flush()
+        await asyncio.gather(*self._spill_tasks, return_exceptions=True)
+        self._closed = True
+        self._wake.set()
+        tasks = [self._runner, *self._flush_tasks.values()]
+        if self._replay_task is not None:
+            tasks.append(self._replay_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._runner = None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-table counters, current batch size and pending rows."""
+        return {
+            table_id: {
+                **table.metrics.__dict__,
+                "batch_rows": table.batch_rows,
+                "pending_rows": len(table.rows),
+            }
+            for table_id, table in self._tables.items()
+        }
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self._spilled_bytes
+
+    # ============================================
+    # Dispatcher
+    # ============================================
+
+    def _ensure_started(self) -> None:
+        if self._runner is not None and not self._runner.done():
+            return
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._progress = asyncio.Condition()
+        self._runner = loop.create_task(self._run())
+
+    def _table(self, table_id: str) -> _TableBuffer:
+        table = self._tables.get(table_id)
+        if table is None:
+            table = _TableBuffer(table_id=table_id, batch_rows=self.initial_batch_rows)
+            self._tables[table_id] = table
+        return table
+
+    def _is_due(self, table: _TableBuffer, now: float) -> bool:
+        if not table.rows or table.table_id in self._flush_tasks:
+            return False
+        return (
+            len(table.rows) >= table.batch_rows
+            or table.force_through > table.handled_through
+            or now - table.last_flush_at >= self.flush_interval_seconds
+        )
+
+    async def _run(self) -> None:
+        # Exits on _closed as well: wait_for() may swallow a cancel racing a wake-up
+        while not self._closed:
+            now = time.monotonic()
+            for table in self._tables.values():
+                if self._is_due(table, now):
+                    self._flush_tasks[table.table_id] = asyncio.create_task(self._flush_table(table))
+
+            waiting = [t for t in self._tables.values() if t.rows and t.table_id not in self._flush_tasks]
+            timeout = (
+                min(t.last_flush_at + self.flush_interval_seconds for t in waiting) - now
+                if waiting else self.flush_interval_seconds
+            )
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(timeout, 0.001))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _flush_table(self, table: _TableBuffer) -> None:
+        batch = [table.rows.popleft() for _ in range(min(table.batch_rows, len(table.rows)))]
+        table.in_flight_first_seq = batch[0].seq
+        try:
+            await self._write_batch(table, batch)
+        except Exception as e:
+            logger.error(f"Unexpected error flushing {table.table_id}: {e}", exc_info=True)
+            self._shed(table, batch, reason="error")
+        finally:
+            table.in_flight_first_seq = None
+            table.last_flush_at = time.monotonic()
+            self._flush_tasks.pop(table.table_id, None)
+            set_metadata_log_pending_rows(_short_name(table.table_id), len(table.rows))
+            async with self._progress:
+                self._progress.notify_all()
+            self._wake.set()
+
+    async def _write_batch(self, table: _TableBuffer, batch: List[_Row]) -> None:
+        if not self.breaker.can_execute():
+            await self._spill(table, batch, reason="circuit_open")
+            return
+
+        short = _short_name(table.table_id)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            errors = await loop.run_in_executor(
+                None, self.writer, table.table_id, [r.json for r in batch], [r.insert_id for r in batch]
+            )
+            if errors:
+                # Drop rows BigQuery rejected; rows only "stopped" by them are written again once
+                invalid = _invalid_indexes(errors, len(batch))
+                retry = [r for i, r in enumerate(batch) if i not in invalid]
+                self._shed(table, [batch[i] for i in sorted(invalid)], reason="rejected", error=str(errors[:3]))
+                if retry:
+                    errors = await loop.run_in_executor(
+                        None, self.writer, table.table_id, [r.json for r in retry], [r.insert_id for r in retry]
+                    )
+                    if errors:
+                        self._shed(table, retry, reason="rejected", error=str(errors[:3]))
+                        retry = []
+                batch = retry
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self.breaker.record_failure()
+            table.metrics.failed_flushes += 1
+            table.metrics.last_error = str(e)
+            table.batch_rows = max(MIN_BATCH_ROWS, table.batch_rows // 2)
+            observe_metadata_log_flush(short, "failed", elapsed)
+            logger.warning(
+                f"Metadata log write failed for {table.table_id} - spilling {len(batch)} rows: {e}",
+                extra={"table_id": table.table_id, "log_count": len(batch)}
+            )
+            await self._spill(table, batch, reason="write_failed")
+            return
+
+        elapsed = time.perf_counter() - start
+        self.breaker.record_success()
+        table.metrics.flushes += 1
+        table.metrics.last_flush_seconds = elapsed
+        table.metrics.rows_written += len(batch)
+        observe_metadata_log_flush(short, "success", elapsed)
+        increment_metadata_log_rows(short, "written", len(batch))
+        now = time.monotonic()
+        for row in batch:
+            observe_metadata_log_queue_latency(short, now - row.queued_at)
+        self._adapt(table, len(batch), elapsed)
+
+        if self._spilled_bytes and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.create_task(self._replay_spilled())
+
+    def _adapt(self, table: _TableBuffer, rows: int, elapsed: float) -> None:
+        if elapsed > self.target_latency_seconds:
+            table.batch_rows = max(MIN_BATCH_ROWS, table.batch_rows // 2)
+        elif rows >= table.batch_rows and elapsed < self.target_latency_seconds / 2:
+            table.batch_rows = min(self.max_batch_rows, table.batch_rows * 2)
+
+    # ============================================
+    # Spill / shed
+    # ============================================
+
+    def _scan_spill_dir(self) -> int:
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return 0
+        return sum(
+            entry.stat().st_size for entry in os.scandir(self.spill_dir)
+            if entry.name.endswith(SPILL_SUFFIX)
+        )
+
+    async def _spill(self, table: _TableBuffer, rows: List[_Row], reason: str) -> None:
+        """Write rows to a spill file in a worker thread; shed them if that is not possible."""
+        lines = "".join(
+            json.dumps({"table_id": table.table_id, "insert_id": r.insert_id, "json": r.json}, default=str) + "\n"
+            for r in rows
+        )
+        size = len(lines.encode())
+        if not self.spill_dir or self._spilled_bytes + size > self.spill_max_bytes:
+            self._shed(table, rows, reason=reason)
+            return
+        # Reserve the budget before yielding so concurrent spills cannot overshoot it
+        self._spilled_bytes += size
+        try:
+            await asyncio.to_thread(self._write_spill_file, lines)
+        except OSError as e:
+            self._spilled_bytes -= size
+            logger.error(f"Failed to spill metadata rows to {self.spill_dir}: {e}")
+            self._shed(table, rows, reason=reason)
+            return
+        table.metrics.rows_spilled += len(rows)
+        increment_metadata_log_rows(_short_name(table.table_id), "spilled", len(rows))
+        logger.warning(
+            f"Spilled {len(rows)} metadata rows for {table.table_id} ({reason})",
+            extra={"table_id": table.table_id, "log_count": len(rows), "reason": reason}
+        )
+
+    def _write_spill_file(self, lines: str) -> None:
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{time.time_ns()}-{uuid.uuid4().hex[:8]}{SPILL_SUFFIX}")
+        with open(path, "w") as f:
+            f.write(lines)
+
+    def _spill_in_background(self, table: _TableBuffer, rows: List[_Row], reason: str) -> None:
+        """Spill from synchronous code (submit) without blocking the event loop."""
+        first_seq = rows[0].seq
+        table.spilling_first_seqs.append(first_seq)
+
+        async def spill() -> None:
+            try:
+                await self._spill(table, rows, reason)
+            finally:
+                table.spilling_first_seqs.remove(first_seq)
+                async with self._progress:
+                    self._progress.notify_all()
+
+        task = asyncio.get_running_loop().create_task(spill())
+        self._spill_tasks.add(task)
+        task.add_done_callback(self._spill_tasks.discard)
+
+    def _shed(self, table: _TableBuffer, rows: List[_Row], reason: str, error: Optional[str] = None) -> None:
+        if not rows:
+            return
+        outcome = "rejected" if reason == "rejected" else "shed"
+        if outcome == "rejected":
+            table.metrics.rows_rejected += len(rows)
+        else:
+            table.metrics.rows_shed += len(rows)
+        if error:
+            table.metrics.last_error = error
+        increment_metadata_log_rows(_short_name(table.table_id), outcome, len(rows))
+        logger.error(
+            f"CRITICAL: {len(rows)} metadata rows for {table.table_id} lost ({reason})",
+            extra={"table_id": table.table_id, "log_count": len(rows), "reason": reason, "errors": error}
+        )
+
+    async def _replay_spilled(self) -> None:
+        """Write spilled rows back to BigQuery, oldest file first."""
+        loop = asyncio.get_running_loop()
+        files = sorted(f for f in os.listdir(self.spill_dir) if f.endswith(SPILL_SUFFIX))
+        for name in files:
+            path = os.path.join(self.spill_dir, name)
+            claimed = path + _REPLAYING_SUFFIX
+            try:
+                size = os.path.getsize(path)
+                os.rename(path, claimed)  # Another engine may be replaying the same directory
+            except OSError:
+                continue
+
+            by_table: Dict[str, List[Dict[str, Any]]] = {}
+            with open(claimed) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        by_table.setdefault(entry["table_id"], []).append(entry)
+            try:
+                for table_id, entries in by_table.items():
+                    for i in range(0, len(entries), self.max_batch_rows):
+                        chunk = entries[i:i + self.max_batch_rows]
+                        errors = await loop.run_in_executor(
+                            None, self.writer, table_id, [e["json"] for e in chunk], [e["insert_id"] for e in chunk]
+                        )
+                        if errors:
+                            logger.error(
+                                f"Replayed metadata rows rejected for {table_id}: {errors[:3]}",
+                                extra={"table_id": table_id, "log_count": len(chunk)}
+                            )
+                        else:
+                            self._table(table_id).metrics.rows_replayed += len(chunk)
+                            increment_metadata_log_rows(_short_name(table_id), "replayed", len(chunk))
+            except Exception as e:
+                # Still failing: keep the file for the next successful flush
+                # (re-sent rows are deduplicated by insertId)
+                os.rename(claimed, path)
+                logger.warning(f"Replay of spilled metadata rows failed: {e}")
+                return
+            os.remove(claimed)
+            self._spilled_bytes = max(0, self._spilled_bytes - size)
+        logger.info(f"Replayed {len(files)} spilled metadata file(s)")
+
+
+def _invalid_indexes(errors: Sequence[Dict[str, Any]], batch_size: int) -> set:
+    """Row indexes BigQuery rejected (excluding rows only stopped because of them)."""
+    invalid = set()
+    for error in errors:
+        reasons = {e.get("reason") for e in error.get("errors", [])}
+        if "index" not in error:
+            return set(range(batch_size))
+        if reasons - {"stopped"}:
+            invalid.add(error["index"])
+    return invalid or set(range(batch_size))
+
+
+def default_spill_dir() -> Optional[str]:
+    """Configured spill directory, or None when spilling is disabled."""
+    if not settings.metadata_log_spill_enabled:
+        return None
+    return settings.metadata_log_spill_dir or os.path.join(tempfile.gettempdir(), "metadata-log-spill")
+
+
+# One engine per event loop
+_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MetadataFlushEngine]" = weakref.WeakKeyDictionary()
+
+
+def get_metadata_flush_engine(client: Any = None) -> MetadataFlushEngine:
+    """
+    Get or create the MetadataFlushEngine of the running event loop.
+
+    Args:
+        client: BigQuery client used when the engine is created
+    """
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is None or engine._closed:
+        engine = MetadataFlushEngine(writer=insert_rows_writer(client), spill_dir=default_spill_dir())
+        _engines[loop] = engine
+    return engine
+
+
+def set_metadata_flush_engine(engine: MetadataFlushEngine) -> None:
+    """Install an engine for the running event loop (tests)."""
+    _engines[asyncio.get_running_loop()] = engine
+
+
+async def close_metadata_flush_engine() -> None:
+    """Flush and close the running loop's engine (app shutdown)."""
+    engine = _engines.pop(asyncio.get_running_loop(), None)
+    if engine is not None:
+        await engine.close()
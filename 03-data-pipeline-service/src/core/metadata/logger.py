@@ -3,13 +3,15 @@ Enterprise Metadata Logger
 High-performance async batch logging for pipeline execution metadata.
 
 Features:
-- Async batch processing with configurable buffer and flush intervals
-- Retry logic with exponential backoff using tenacity
+- Rows are handed to the shared MetadataFlushEngine (see flush_engine.py),
+  which coalesces rows of all runs into one insert per table, flushes as
+  soon as a batch fills and adapts batch sizes to write latency
 - Circuit breaker pattern to prevent cascading failures
+- Rows are spilled to local disk (and replayed) instead of lost during
+  BigQuery outages
 - Idempotency via insertId to prevent duplicate logs
 - Graceful degradation if logging fails
-- Background task for periodic flushing
-- Non-blocking async writes
+- Non-blocking async writes (never waits on a full queue)
 
 Usage Example:
     ```python
@@ -91,11 +93,13 @@ Usage Example:
     ```
 
 Configuration (in .env or environment variables):
-    METADATA_LOG_BATCH_SIZE=100          # Number of logs to batch before flush
-    METADATA_LOG_FLUSH_INTERVAL_SECONDS=5  # Seconds between automatic flushes
-    METADATA_LOG_MAX_RETRIES=3           # Max retry attempts for failed writes
-    METADATA_LOG_WORKERS=5               # Number of background workers for concurrent flushing
-    METADATA_LOG_QUEUE_SIZE=1000         # Maximum queue size (backpressure when full)
+    METADATA_LOG_BATCH_SIZE=100          # Initial batch size per table (adapts at runtime)
+    METADATA_LOG_MAX_BATCH_ROWS=5000     # Upper bound for the adaptive batch size
+    METADATA_LOG_TARGET_FLUSH_LATENCY_MS=1000  # Write latency batch sizes are tuned to
+    METADATA_LOG_FLUSH_INTERVAL_SECONDS=5  # Max wait before a partial batch is written
+    METADATA_LOG_MAX_PENDING_ROWS=50000  # Rows buffered per table before spilling the oldest
+    METADATA_LOG_SPILL_ENABLED=true      # Spill to disk (not drop) when BigQuery fails
+    METADATA_LOG_SPILL_DIR=/tmp/metadata-log-spill
 """
 
 import asyncio
@@ -103,24 +107,22 @@ import json
 import uuid
 import socket
 import subprocess
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from enum import Enum
 
 from google.cloud import bigquery
-from tenacity import (
-    retry as tenacity_retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type
-)
 
 from src.app.config import settings
+from src.core.metadata.flush_engine import get_metadata_flush_engine
 from src.core.utils.logging import get_logger
 from src.core.utils.error_classifier import classify_error, create_error_context
 
 logger = get_logger(__name__)
 
+# Git SHA of the deployed configs, resolved once per process
+_config_version: Optional[str] = None
+
 
 def _serialize_datetime_values(obj: Any) -> Any:
     """
@@ -158,78 +160,15 @@ class StepStatus(str, Enum):
     SKIPPED = "SKIPPED"
 
 
-class CircuitBreaker:
-    """
-    Circuit breaker to prevent cascading failures.
-    Opens circuit after N consecutive failures, preventing further writes.
-    """
-
-    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 60):
-        """
-        Initialize circuit breaker.
-
-        Args:
-            failure_threshold: Number of consecutive failures before opening circuit
-            timeout_seconds: Seconds to wait before attempting to close circuit
-        """
-        self.failure_threshold = failure_threshold
-        self.timeout_seconds = timeout_seconds
-        self.failure_count = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.is_open = False
-
-    def record_success(self):
-        """Record a successful operation."""
-        self.failure_count = 0
-        self.is_open = False
-        self.last_failure_time = None
-
-    def record_failure(self):
-        """Record a failed operation."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.now(timezone.utc)
-
-        if self.failure_count >= self.failure_threshold:
-            self.is_open = True
-            logger.error(
-                f"Circuit breaker opened after {self.failure_count} consecutive failures",
-                extra={"failure_threshold": self.failure_threshold}
-            )
-
-    def can_execute(self) -> bool:
-        """
-        Check if operation can be executed.
-
-        Returns:
-            True if circuit is closed or timeout has elapsed
-        """
-        if not self.is_open:
-            return True
-
-        # Check if timeout has elapsed
-        if self.last_failure_time:
-            elapsed = (datetime.now(timezone.utc) - self.last_failure_time).total_seconds()
-            if elapsed >= self.timeout_seconds:
-                logger.info(
-                    "Circuit breaker attempting to close after timeout",
-                    extra={"elapsed_seconds": elapsed}
-                )
-                self.is_open = False
-                self.failure_count = 0
-                return True
-
-        return False
-
-
 class MetadataLogger:
     """
     Enterprise metadata logger with async batch processing and high concurrency support.
 
-    Optimized for 100+ parallel pipelines with:
-    - Thread-safe asyncio.Queue for buffering (replaces deque + lock)
-    - Multiple background workers for parallel flushing
-    - Bounded queue with backpressure handling
-    - Circuit breaker pattern for fault tolerance
+    Optimized for 1000+ parallel pipelines with:
+    - One shared MetadataFlushEngine per event loop instead of per-run
+      queues and flush workers
+    - Non-blocking submits (buffer overflow spills to disk, never fails the run)
+    - Circuit breaker pattern for fault tolerance (in the engine)
     - JSON serialization of dict fields (parameters, metadata)
     """
 
@@ -247,45 +186,31 @@ class MetadataLogger:
 
         # Use CENTRAL organizations dataset for ALL metadata (not per-org)
         self.metadata_dataset = "organizations"
+        self.pipeline_table_id = f"{self.project_id}.{self.metadata_dataset}.org_meta_pipeline_runs"
+        self.step_table_id = f"{self.project_id}.{self.metadata_dataset}.org_meta_step_logs"
+        self.state_transition_table_id = f"{self.project_id}.{self.metadata_dataset}.org_meta_state_transitions"
 
         # Batch configuration from settings
         self.batch_size = settings.metadata_log_batch_size
         self.flush_interval = settings.metadata_log_flush_interval_seconds
-        self.max_retries = settings.metadata_log_max_retries
-        self.num_workers = settings.metadata_log_workers
         self.queue_size = settings.metadata_log_queue_size
 
-        # Thread-safe bounded queues for batch processing (replaces deque + lock)
-        self._pipeline_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
-        self._step_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
-        self._state_transition_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
-
-        # Circuit breaker
-        self._circuit_breaker = CircuitBreaker(failure_threshold=5, timeout_seconds=60)
-
-        # Counter for lost logs (for monitoring and alerting)
-        self._lost_logs_count = {
-            "pipeline": 0,
-            "step": 0,
-            "state_transition": 0
-        }
-
-        # Background worker tasks
-        self._worker_tasks: List[asyncio.Task] = []
+        # Shared flush engine (bound on first use) and this run's last row seq per table
+        self._engine = None
+        self._last_seqs: Dict[str, int] = {}
+        self._queued: Dict[str, int] = {}
         self._running = False
 
         # Get worker instance and config version
         self.worker_instance = self._get_worker_instance()
         self.config_version = self._get_config_version()
 
-        logger.info(
+        logger.debug(
             "Initialized MetadataLogger",
             extra={
                 "org_slug": org_slug,
                 "batch_size": self.batch_size,
-                "flush_interval": self.flush_interval,
-                "num_workers": self.num_workers,
-                "queue_size": self.queue_size
+                "flush_interval": self.flush_interval
             }
         )
 
@@ -315,6 +240,10 @@ class MetadataLogger:
         Returns:
             Git commit SHA or 'unknown'
         """
+        global _config_version
+        if _config_version is not None:
+            return _config_version
+        _config_version = "unknown"
         try:
             result = subprocess.run(
                 ['git', 'rev-parse', '--short', 'HEAD'],
@@ -323,87 +252,41 @@ class MetadataLogger:
                 timeout=2
             )
             if result.returncode == 0:
-                return result.stdout.strip()
+                _config_version = result.stdout.strip()
         except Exception:
             pass
-        return "unknown"
+        return _config_version
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = get_metadata_flush_engine(self.client)
+        return self._engine
+
+    def _enqueue(self, table_id: str, log_entry: Dict[str, Any]) -> None:
+        """Hand a row to the shared flush engine (never blocks)."""
+        self._last_seqs[table_id] = self._get_engine().submit(
+            table_id, log_entry["insertId"], log_entry["json"]
+        )
+        self._queued[table_id] = self._queued.get(table_id, 0) + 1
 
     async def start(self):
-        """Start background flush workers (multiple workers for high concurrency)."""
+        """Bind to the shared flush engine of the running event loop."""
         if self._running:
             logger.warning("MetadataLogger already running")
             return
 
         self._running = True
-
-        # Create multiple background workers for parallel processing
-        for i in range(self.num_workers):
-            task = asyncio.create_task(self._background_flush_worker(worker_id=i))
-            self._worker_tasks.append(task)
-
-        logger.info(
-            f"Started {self.num_workers} background flush workers",
-            extra={"num_workers": self.num_workers}
-        )
+        self._get_engine()
 
     async def stop(self):
-        """Stop background flush workers and flush remaining logs."""
+        """Flush this run's remaining logs."""
         if not self._running:
             return
 
         self._running = False
-
-        # Cancel all background worker tasks
-        for task in self._worker_tasks:
-            task.cancel()
-
-        # Wait for all workers to finish
-        if self._worker_tasks:
-            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
-
-        self._worker_tasks.clear()
-
-        # Final flush of remaining items in queues
         await self.flush()
         logger.info("Stopped MetadataLogger and flushed remaining logs")
 
-    async def _background_flush_worker(self, worker_id: int):
-        """
-        Background worker that periodically flushes buffered logs.
-        Multiple workers run concurrently for high-throughput processing.
-
-        Args:
-            worker_id: Unique identifier for this worker
-        """
-        logger.info(
-            f"Background flush worker {worker_id} started",
-            extra={"worker_id": worker_id}
-        )
-
-        try:
-            while self._running:
-                await asyncio.sleep(self.flush_interval)
-                # Wrap flush with timeout to prevent hanging
-                try:
-                    await asyncio.wait_for(self.flush(), timeout=30)
-                except asyncio.TimeoutError:
-                    logger.error(
-                        f"Flush operation timed out after 30s in worker {worker_id}",
-                        extra={"worker_id": worker_id}
-                    )
-
-        except asyncio.CancelledError:
-            logger.info(
-                f"Background flush worker {worker_id} cancelled",
-                extra={"worker_id": worker_id}
-            )
-        except Exception as e:
-            logger.error(
-                f"Background flush worker {worker_id} error: {e}",
-                extra={"worker_id": worker_id},
-                exc_info=True
-            )
-
     async def log_pipeline_start(
         self,
         pipeline_logging_id: str,
@@ -455,33 +338,16 @@ class MetadataLogger:
                 }
             }
 
-            # Queue put with 5s timeout for backpressure handling
-            # CRITICAL: Use wait_for to fail pipeline if queue is full
-            # This prevents silent log drops and ensures pipeline failures are visible
-            try:
-                await asyncio.wait_for(
-                    self._pipeline_queue.put(log_entry),
-                    timeout=5.0
-                )
+            # Non-blocking: the shared flush engine spills instead of rejecting rows
+            self._enqueue(self.pipeline_table_id, log_entry)
 
-                logger.debug(
-                    f"Queued pipeline start log",
-                    extra={
-                        "pipeline_logging_id": pipeline_logging_id,
-                        "queue_size": self._pipeline_queue.qsize()
-                    }
-                )
-            except asyncio.TimeoutError:
-                # Queue is full after 5s timeout - FAIL the pipeline
-                error_msg = f"Pipeline log queue full ({self.queue_size}) - cannot queue log entry after 5s timeout"
-                logger.error(
-                    error_msg,
-                    extra={
-                        "pipeline_logging_id": pipeline_logging_id,
-                        "queue_size": self.queue_size
-                    }
-                )
-                raise ValueError(error_msg)
+            logger.debug(
+                f"Queued pipeline start log",
+                extra={
+                    "pipeline_logging_id": pipeline_logging_id,
+                    "queued_rows": self._queued[self.pipeline_table_id]
+                }
+            )
 
         except Exception as e:
             logger.error(
@@ -758,34 +624,17 @@ class MetadataLogger:
                 }
             }
 
-            # Queue put with 5s timeout for backpressure handling
-            # CRITICAL: Use wait_for to fail pipeline if queue is full
-            # This prevents silent log drops and ensures pipeline failures are visible
-            try:
-                await asyncio.wait_for(
-                    self._step_queue.put(log_entry),
-                    timeout=5.0
-                )
+            # Non-blocking: the shared flush engine spills instead of rejecting rows
+            self._enqueue(self.step_table_id, log_entry)
 
-                logger.debug(
-                    f"Queued step start log",
-                    extra={
-                        "step_logging_id": step_logging_id,
-                        "step_name": step_name,
-                        "queue_size": self._step_queue.qsize()
-                    }
-                )
-            except asyncio.TimeoutError:
-                # Queue is full after 5s timeout - FAIL the pipeline
-                error_msg = f"Step log queue full ({self.queue_size}) - cannot queue log entry after 5s timeout"
-                logger.error(
-                    error_msg,
-                    extra={
-                        "step_logging_id": step_logging_id,
-                        "queue_size": self.queue_size
-                    }
-                )
-                raise ValueError(error_msg)
+            logger.debug(
+                f"Queued step start log",
+                extra={
+                    "step_logging_id": step_logging_id,
+                    "step_name": step_name,
+                    "queued_rows": self._queued[self.step_table_id]
+                }
+            )
 
         except Exception as e:
             logger.error(
@@ -884,36 +733,19 @@ class MetadataLogger:
                 }
             }
 
-            # Queue put with 5s timeout for backpressure handling
-            # CRITICAL: Use wait_for to fail pipeline if queue is full
-            # This prevents silent log drops and ensures pipeline failures are visible
-            try:
-                await asyncio.wait_for(
-                    self._step_queue.put(log_entry),
-                    timeout=5.0
-                )
+            # Non-blocking: the shared flush engine spills instead of rejecting rows
+            self._enqueue(self.step_table_id, log_entry)
 
-                logger.debug(
-                    f"Queued step end log",
-                    extra={
-                        "step_logging_id": step_logging_id,
-                        "step_name": step_name,
-                        "status": status,
-                        "duration_ms": duration_ms,
-                        "queue_size": self._step_queue.qsize()
-                    }
-                )
-            except asyncio.TimeoutError:
-                # Queue is full after 5s timeout - FAIL the pipeline
-                error_msg = f"Step log queue full ({self.queue_size}) - cannot queue log entry after 5s timeout"
-                logger.error(
-                    error_msg,
-                    extra={
-                        "step_logging_id": step_logging_id,
-                        "queue_size": self.queue_size
-                    }
-                )
-                raise ValueError(error_msg)
+            logger.debug(
+                f"Queued step end log",
+                extra={
+                    "step_logging_id": step_logging_id,
+                    "step_name": step_name,
+                    "status": status,
+                    "duration_ms": duration_ms,
+                    "queued_rows": self._queued[self.step_table_id]
+                }
+            )
 
         except Exception as e:
             logger.error(
@@ -1004,37 +836,19 @@ class MetadataLogger:
                 }
             }
 
-            # Queue put with 5s timeout for backpressure handling
-            try:
-                await asyncio.wait_for(
-                    self._state_transition_queue.put(log_entry),
-                    timeout=5.0
-                )
+            # Non-blocking: the shared flush engine spills instead of rejecting rows
+            self._enqueue(self.state_transition_table_id, log_entry)
 
-                logger.debug(
-                    f"Queued state transition: {entity_type} {from_state} -> {to_state}",
-                    extra={
-                        "pipeline_logging_id": pipeline_logging_id,
-                        "entity_type": entity_type,
-                        "from_state": from_state,
-                        "to_state": to_state,
-                        "queue_size": self._state_transition_queue.qsize()
-                    }
-                )
-            except asyncio.TimeoutError:
-                # Queue is full after 5s timeout - log warning but don't fail pipeline
-                # State transitions are important but not critical enough to fail execution
-                error_msg = f"State transition log queue full ({self.queue_size}) - transition not logged"
-                logger.warning(
-                    error_msg,
-                    extra={
-                        "pipeline_logging_id": pipeline_logging_id,
-                        "entity_type": entity_type,
-                        "from_state": from_state,
-                        "to_state": to_state,
-                        "queue_size": self.queue_size
-                    }
-                )
+            logger.debug(
+                f"Queued state transition: {entity_type} {from_state} -> {to_state}",
+                extra={
+                    "pipeline_logging_id": pipeline_logging_id,
+                    "entity_type": entity_type,
+                    "from_state": from_state,
+                    "to_state": to_state,
+                    "queued_rows": self._queued[self.state_transition_table_id]
+                }
+            )
 
         except Exception as e:
             # Don't fail pipeline if state transition logging fails
@@ -1053,298 +867,44 @@ class MetadataLogger:
         """
         Get current queue depths for monitoring.
 
+        Depths and lost counts come from the shared flush engine and cover
+        all runs on this event loop.
+
         Returns:
             Dictionary with queue sizes and utilization percentages
         """
-        return {
-            "pipeline_queue_size": self._pipeline_queue.qsize(),
-            "step_queue_size": self._step_queue.qsize(),
-            "state_transition_queue_size": self._state_transition_queue.qsize(),
-            "pipeline_queue_capacity": self.queue_size,
-            "step_queue_capacity": self.queue_size,
-            "state_transition_queue_capacity": self.queue_size,
-            "pipeline_queue_utilization_pct": round(
-                (self._pipeline_queue.qsize() / self.queue_size) * 100, 2
-            ),
-            "step_queue_utilization_pct": round(
-                (self._step_queue.qsize() / self.queue_size) * 100, 2
-            ),
-            "state_transition_queue_utilization_pct": round(
-                (self._state_transition_queue.qsize() / self.queue_size) * 100, 2
-            ),
+        engine_metrics = self._engine.metrics() if self._engine is not None else {}
+        depths: Dict[str, int] = {}
+        total_lost = 0
+        for name, table_id in (
+            ("pipeline", self.pipeline_table_id),
+            ("step", self.step_table_id),
+            ("state_transition", self.state_transition_table_id),
+        ):
+            table = engine_metrics.get(table_id, {})
+            pending = table.get("pending_rows", 0)
+            lost = table.get("rows_shed", 0) + table.get("rows_rejected", 0)
+            depths[f"{name}_queue_size"] = pending
+            depths[f"{name}_queue_capacity"] = self.queue_size
+            depths[f"{name}_queue_utilization_pct"] = round((pending / self.queue_size) * 100, 2)
+            depths[f"{name}_spilled_logs"] = table.get("rows_spilled", 0)
             # Lost logs counters for monitoring and alerting
-            "lost_pipeline_logs": self._lost_logs_count["pipeline"],
-            "lost_step_logs": self._lost_logs_count["step"],
-            "lost_state_transition_logs": self._lost_logs_count["state_transition"],
-            "total_lost_logs": sum(self._lost_logs_count.values())
-        }
+            depths[f"lost_{name}_logs"] = lost
+            total_lost += lost
+        depths["total_lost_logs"] = total_lost
+        return depths
 
     async def flush(self):
         """
-        Force flush all queued logs to BigQuery.
-        This method is called periodically by background workers.
-        Multiple workers can call this concurrently for parallel processing.
-        """
-        # Check circuit breaker
-        if not self._circuit_breaker.can_execute():
-            logger.warning(
-                "Circuit breaker open, skipping flush",
-                extra={"failure_count": self._circuit_breaker.failure_count}
-            )
-            return
-
-        # Monitor queue depths for backpressure detection
-        queue_depths = self.get_queue_depths()
-        if (queue_depths["pipeline_queue_utilization_pct"] > 80 or
-            queue_depths["step_queue_utilization_pct"] > 80 or
-            queue_depths["state_transition_queue_utilization_pct"] > 80):
-            logger.warning(
-                "Queue depth high - potential backpressure",
-                extra=queue_depths
-            )
-
-        # Collect pipeline logs from queue (non-blocking, batch-sized)
-        pipeline_logs = []
-        for _ in range(self.batch_size):
-            try:
-                log_entry = self._pipeline_queue.get_nowait()
-                pipeline_logs.append(log_entry)
-            except asyncio.QueueEmpty:
-                break
-
-        # Collect step logs from queue (non-blocking, batch-sized)
-        step_logs = []
-        for _ in range(self.batch_size):
-            try:
-                log_entry = self._step_queue.get_nowait()
-                step_logs.append(log_entry)
-            except asyncio.QueueEmpty:
-                break
-
-        # Collect state transition logs from queue (non-blocking, batch-sized)
-        state_transition_logs = []
-        for _ in range(self.batch_size):
-            try:
-                log_entry = self._state_transition_queue.get_nowait()
-                state_transition_logs.append(log_entry)
-            except asyncio.QueueEmpty:
-                break
-
-        # Flush pipeline logs
-        if pipeline_logs:
-            try:
-                await self._flush_pipeline_logs(pipeline_logs)
-                self._circuit_breaker.record_success()
-            except Exception as e:
-                self._lost_logs_count["pipeline"] += len(pipeline_logs)
-                logger.error(
-                    f"CRITICAL: Failed to flush pipeline logs - {len(pipeline_logs)} logs lost",
-                    extra={
-                        "log_count": len(pipeline_logs),
-                        "total_lost_pipeline_logs": self._lost_logs_count["pipeline"],
-                        "org_slug": self.org_slug
-                    },
-                    exc_info=True
-                )
-                self._circuit_breaker.record_failure()
-                # NOTE: Logs are lost here. The lost count is tracked and logged for monitoring.
-                # Re-queue logic was removed to prevent infinite loops and memory exhaustion.
-
-        # Flush step logs
-        if step_logs:
-            try:
-                await self._flush_step_logs(step_logs)
-                self._circuit_breaker.record_success()
-            except Exception as e:
-                self._lost_logs_count["step"] += len(step_logs)
-                logger.error(
-                    f"CRITICAL: Failed to flush step logs - {len(step_logs)} logs lost",
-                    extra={
-                        "log_count": len(step_logs),
-                        "total_lost_step_logs": self._lost_logs_count["step"],
-                        "org_slug": self.org_slug
-                    },
-                    exc_info=True
-                )
-                self._circuit_breaker.record_failure()
-                # NOTE: Logs are lost here. The lost count is tracked and logged for monitoring.
-                # Re-queue logic was removed to prevent infinite loops and memory exhaustion.
-
-        # Flush state transition logs
-        if state_transition_logs:
-            try:
-                await self._flush_state_transition_logs(state_transition_logs)
-                self._circuit_breaker.record_success()
-            except Exception as e:
-                self._lost_logs_count["state_transition"] += len(state_transition_logs)
-                logger.error(
-                    f"CRITICAL: Failed to flush state transition logs - {len(state_transition_logs)} logs lost",
-                    extra={
-                        "log_count": len(state_transition_logs),
-                        "total_lost_state_transition_logs": self._lost_logs_count["state_transition"],
-                        "org_slug": self.org_slug
-                    },
-                    exc_info=True
-                )
-                self._circuit_breaker.record_failure()
-                # NOTE: Logs are lost here. The lost count is tracked and logged for monitoring.
-                # Re-queue logic was removed to prevent infinite loops and memory exhaustion.
-
-    @tenacity_retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception_type(Exception)
-    )
-    async def _flush_pipeline_logs(self, logs: List[Dict[str, Any]]):
-        """
-        Flush pipeline logs to BigQuery with retry logic.
-
-        Args:
-            logs: List of pipeline log entries
-
-        Raises:
-            Exception: If insert fails after retries
-        """
-        # NOTE: org_meta_pipeline_runs is in CENTRAL organizations dataset, not per-org dataset
-        table_id = f"{self.project_id}.organizations.org_meta_pipeline_runs"
-
-        # Use streaming inserts with insertId for idempotency
-        rows_to_insert = [log["json"] for log in logs]
-
-        # Execute in thread pool to avoid blocking async loop
-        loop = asyncio.get_event_loop()
-        errors = await loop.run_in_executor(
-            None,
-            lambda: self.client.insert_rows_json(
-                table_id,
-                rows_to_insert,
-                row_ids=[log["insertId"] for log in logs]  # Idempotency
-            )
-        )
-
-        if errors:
-            error_msg = f"Failed to insert pipeline logs: {errors}"
-            logger.error(
-                error_msg,
-                extra={
-                    "table_id": table_id,
-                    "errors": errors,
-                    "log_count": len(logs)
-                }
-            )
-            raise ValueError(error_msg)
-
-        logger.info(
-            f"Flushed pipeline logs to BigQuery",
-            extra={
-                "table_id": table_id,
-                "log_count": len(logs)
-            }
-        )
-
-    @tenacity_retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception_type(Exception)
-    )
-    async def _flush_step_logs(self, logs: List[Dict[str, Any]]):
-        """
-        Flush step logs to BigQuery with retry logic.
-
-        Args:
-            logs: List of step log entries
-
-        Raises:
-            Exception: If insert fails after retries
-        """
-        # NOTE: org_meta_step_logs is in CENTRAL organizations dataset
-        table_id = f"{self.project_id}.organizations.org_meta_step_logs"
-
-        # Use streaming inserts with insertId for idempotency
-        rows_to_insert = [log["json"] for log in logs]
-
-        # Execute in thread pool to avoid blocking async loop
-        loop = asyncio.get_event_loop()
-        errors = await loop.run_in_executor(
-            None,
-            lambda: self.client.insert_rows_json(
-                table_id,
-                rows_to_insert,
-                row_ids=[log["insertId"] for log in logs]  # Idempotency
-            )
-        )
-
-        if errors:
-            error_msg = f"Failed to insert step logs: {errors}"
-            logger.error(
-                error_msg,
-                extra={
-                    "table_id": table_id,
-                    "errors": errors,
-                    "log_count": len(logs)
-                }
-            )
-            raise ValueError(error_msg)
-
-        logger.info(
-            f"Flushed step logs to BigQuery",
-            extra={
-                "table_id": table_id,
-                "log_count": len(logs)
-            }
-        )
-
-    @tenacity_retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception_type(Exception)
-    )
-    async def _flush_state_transition_logs(self, logs: List[Dict[str, Any]]):
-        """
-        Flush state transition logs to BigQuery with retry logic.
+        Force flush this run's queued logs to BigQuery.
 
-        Args:
-            logs: List of state transition log entries
-
-        Raises:
-            Exception: If insert fails after retries
+        Waits until every row logged so far was written (or spilled to disk
+        during an outage). Rows of other runs in the same batches are
+        written along the way.
         """
-        # NOTE: org_meta_state_transitions is in CENTRAL organizations dataset
-        table_id = f"{self.project_id}.organizations.org_meta_state_transitions"
-
-        # Use streaming inserts with insertId for idempotency
-        rows_to_insert = [log["json"] for log in logs]
-
-        # Execute in thread pool to avoid blocking async loop
-        loop = asyncio.get_event_loop()
-        errors = await loop.run_in_executor(
-            None,
-            lambda: self.client.insert_rows_json(
-                table_id,
-                rows_to_insert,
-                row_ids=[log["insertId"] for log in logs]  # Idempotency
-            )
-        )
-
-        if errors:
-            error_msg = f"Failed to insert state transition logs: {errors}"
-            logger.error(
-                error_msg,
-                extra={
-                    "table_id": table_id,
-                    "errors": errors,
-                    "log_count": len(logs)
-                }
-            )
-            raise ValueError(error_msg)
-
-        logger.info(
-            f"Flushed state transition logs to BigQuery",
-            extra={
-                "table_id": table_id,
-                "log_count": len(logs)
-            }
-        )
+        if self._engine is None or not self._last_seqs:
+            return
+        await self._engine.wait_flushed(self._last_seqs)
 
 
 def generate_logging_id() -> str:
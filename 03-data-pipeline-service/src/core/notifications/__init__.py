@@ -93,6 +93,23 @@ from .adapters import (
     send_notification,
 )
 
+# SMTP Connection Pool - Persistent email delivery
+from .smtp_pool import (
+    SMTPConnectionPool,
+    get_smtp_pool,
+    close_smtp_pool,
+)
+
+# Notification Outbox - Queued background delivery
+from .outbox import (
+    NotificationOutbox,
+    OutboxStatus,
+    InMemoryOutboxStore,
+    SQLiteOutboxStore,
+    get_notification_outbox,
+    reset_notification_outbox,
+)
+
 # Alert Sender - High-level alert helpers
 from .alert_sender import (
     AlertNotificationSender,
@@ -140,6 +157,19 @@ __all__ = [
     "WebhookNotificationAdapter",
     "send_notification",
 
+    # SMTP Connection Pool
+    "SMTPConnectionPool",
+    "get_smtp_pool",
+    "close_smtp_pool",
+
+    # Notification Outbox
+    "NotificationOutbox",
+    "OutboxStatus",
+    "InMemoryOutboxStore",
+    "SQLiteOutboxStore",
+    "get_notification_outbox",
+    "reset_notification_outbox",
+
     # Alert Sender
     "AlertNotificationSender",
     "AlertNotificationData",
@@ -3,23 +3,21 @@ Notification Provider Adapters
 
 Enterprise-grade provider implementations with:
 - Thread-safe operations
-- Session reuse for efficiency
+- Connection reuse via the shared HTTP client pool
 - Input validation and sanitization
 - Proper error handling
 - Retry logic with exponential backoff
 """
 
-import aiohttp
+import httpx
 import asyncio
 import smtplib
-import ssl
 import re
 import logging
-import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from functools import partial, wraps
-from typing import Dict, Any, Optional, List, ClassVar, Callable, TypeVar
+from functools import wraps
+from typing import Dict, Any, Optional, List, Callable, Tuple, TypeVar
 from datetime import datetime, timezone
 from urllib.parse import urlparse, urlunparse
 
@@ -94,6 +92,8 @@ from .registry import (
     SlackProviderConfig,
     WebhookProviderConfig,
 )
+from .smtp_pool import close_smtp_pool, get_smtp_pool, is_connection_error
+from src.core.utils.http_pool import get_http_client_pool
 
 # ==============================================================================
 # Validation Helpers
@@ -153,7 +153,9 @@ class EmailNotificationAdapter(NotificationProviderInterface):
     """
     Email notification provider adapter.
 
-    Thread-safe SMTP operations with email validation.
+    Thread-safe SMTP operations with email validation. Delivery goes
+    through the shared SMTPConnectionPool (persistent connections on a
+    dedicated thread pool).
     """
 
     def __init__(self, config: Optional[BaseProviderConfig] = None):
@@ -177,21 +179,30 @@ class EmailNotificationAdapter(NotificationProviderInterface):
             and self._config.from_email
         )
 
-    async def send(self, payload: NotificationPayload) -> bool:
-        """Send email notification with retry logic."""
-        if not self.is_configured:
-            logger.warning("Email provider not configured")
-            return False
-
+    @classmethod
+    async def close_pool(cls):
+        """Close the shared SMTP connection pool (call on shutdown)."""
+        # QUIT on pooled connections is network I/O - keep it off the event loop
+        await asyncio.to_thread(close_smtp_pool)
+
+    def _build_message(
+        self, payload: NotificationPayload
+    ) -> Optional[Tuple[MIMEMultipart, List[str]]]:
+        """
+        Build the MIME message and envelope recipients for a payload.
+
+        Returns:
+            (message, valid recipients), or None if there is nobody to send to
+        """
         if not payload.recipients:
             logger.warning("No recipients specified for email")
-            return False
+            return None
 
         # BUG-006 FIX: Validate and filter email addresses
         valid_recipients = _filter_valid_emails(payload.recipients)
         if not valid_recipients:
             logger.error("No valid email addresses after filtering")
-            return False
+            return None
 
         # Build message with truncated title
         title = _truncate(payload.title, MAX_TITLE_LENGTH)
@@ -209,16 +220,27 @@ class EmailNotificationAdapter(NotificationProviderInterface):
         html_body = payload.html_body or self._build_html_body(payload)
         msg.attach(MIMEText(html_body, "html"))
 
+        return msg, valid_recipients
+
+    async def send(self, payload: NotificationPayload) -> bool:
+        """Send email notification with retry logic."""
+        if not self.is_configured:
+            logger.warning("Email provider not configured")
+            return False
+
+        built = self._build_message(payload)
+        if built is None:
+            return False
+        msg, valid_recipients = built
+
         async def _send_with_timeout():
             """Inner function for retry wrapper."""
-            loop = asyncio.get_running_loop()
-            await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    partial(self._send_smtp_sync, msg, valid_recipients)
-                ),
+            results = await asyncio.wait_for(
+                get_smtp_pool().send_messages(self._config, [(msg, valid_recipients)]),
                 timeout=self._config.timeout_seconds
             )
+            if results[0] is not None:
+                raise results[0]
 
         try:
             # GAP-001 FIX: Apply retry logic with exponential backoff
@@ -240,28 +262,76 @@ class EmailNotificationAdapter(NotificationProviderInterface):
             logger.error(f"Email send failed after retries: {e}", exc_info=True)
             return False
 
-    def _send_smtp_sync(self, msg: MIMEMultipart, recipients: List[str]):
-        """Synchronous SMTP send."""
-        if self._config.smtp_use_tls:
-            context = ssl.create_default_context()
-            with smtplib.SMTP(
-                self._config.smtp_host,
-                self._config.smtp_port,
-                timeout=self._config.timeout_seconds
-            ) as server:
-                server.starttls(context=context)
-                if self._config.smtp_username and self._config.smtp_password:
-                    server.login(self._config.smtp_username, self._config.smtp_password)
-                server.send_message(msg, to_addrs=recipients)
-        else:
-            with smtplib.SMTP(
-                self._config.smtp_host,
-                self._config.smtp_port,
-                timeout=self._config.timeout_seconds
-            ) as server:
-                if self._config.smtp_username and self._config.smtp_password:
-                    server.login(self._config.smtp_username, self._config.smtp_password)
-                server.send_message(msg, to_addrs=recipients)
+    async def send_batch(self, payloads: List[NotificationPayload]) -> List[bool]:
+        """
+        Send many emails through the pooled relay connections.
+
+        Messages are split into chunks of ``smtp_batch_size``; each chunk is
+        delivered over a single SMTP connection and chunks run concurrently
+        up to the pool size. Messages that fail with a connection-level error
+        are retried with exponential backoff; rejected messages (e.g. refused
+        recipients) are not retried.
+
+        Args:
+            payloads: Notifications to send
+
+        Returns:
+            Per-payload success flags, in input order
+        """
+        results = [False] * len(payloads)
+        if not payloads:
+            return results
+        if not self.is_configured:
+            logger.warning("Email provider not configured")
+            return results
+
+        outgoing: Dict[int, Tuple[MIMEMultipart, List[str]]] = {}
+        for index, payload in enumerate(payloads):
+            built = self._build_message(payload)
+            if built is not None:
+                outgoing[index] = built
+
+        pool = get_smtp_pool()
+        chunk_size = max(1, self._config.smtp_batch_size)
+        pending = list(outgoing)
+
+        for attempt in range(1, self._config.retry_max_attempts + 1):
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            chunk_results = await asyncio.gather(
+                *(
+                    pool.send_messages(self._config, [outgoing[i] for i in chunk])
+                    for chunk in chunks
+                ),
+                return_exceptions=True,
+            )
+
+            retry: List[int] = []
+            for chunk, outcome in zip(chunks, chunk_results):
+                # A chunk-level exception (e.g. relay unreachable) fails every message in it
+                errors = outcome if isinstance(outcome, list) else [outcome] * len(chunk)
+                for index, error in zip(chunk, errors):
+                    if error is None:
+                        results[index] = True
+                    elif is_connection_error(error):
+                        retry.append(index)
+                    else:
+                        logger.error(f"Email rejected by relay: {error}")
+
+            if not retry:
+                break
+            pending = retry
+            if attempt < self._config.retry_max_attempts:
+                delay = min(1.0 * (2 ** (attempt - 1)), 30.0)
+                logger.warning(
+                    f"Batch attempt {attempt}/{self._config.retry_max_attempts}: "
+                    f"{len(retry)} emails failed, retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                logger.error(f"{len(retry)} emails failed after {attempt} attempts")
+
+        logger.info(f"Email batch sent: {sum(results)}/{len(payloads)} succeeded")
+        return results
 
     def _build_text_body(self, payload: NotificationPayload) -> str:
         """Build plain text email body."""
@@ -423,15 +493,9 @@ class SlackNotificationAdapter(NotificationProviderInterface):
     """
     Slack notification provider adapter.
 
-    Uses Slack Incoming Webhooks with connection pooling.
+    Uses Slack Incoming Webhooks over the shared HTTP connection pool.
     """
 
-    # BUG-007 FIX: Shared session for connection reuse
-    _session: ClassVar[Optional[aiohttp.ClientSession]] = None
-    # BUG-002 FIX: Use threading.Lock for initial lock creation (thread-safe)
-    _session_lock_init = threading.Lock()  # type: ClassVar[threading.Lock]
-    _session_lock: ClassVar[Optional[asyncio.Lock]] = None
-
     def __init__(self, config: Optional[BaseProviderConfig] = None):
         # BUG-011 FIX: Type check config
         if config is not None and not isinstance(config, SlackProviderConfig):
@@ -441,28 +505,9 @@ class SlackNotificationAdapter(NotificationProviderInterface):
     def __repr__(self) -> str:
         return f"<SlackNotificationAdapter configured={self.is_configured}>"
 
-    @classmethod
-    async def _get_session(cls) -> aiohttp.ClientSession:
-        """Get or create shared aiohttp session (thread-safe)."""
-        # BUG-002 FIX: Thread-safe lock initialization
-        if cls._session_lock is None:
-            with cls._session_lock_init:
-                if cls._session_lock is None:
-                    cls._session_lock = asyncio.Lock()
-
-        async with cls._session_lock:
-            if cls._session is None or cls._session.closed:
-                cls._session = aiohttp.ClientSession(
-                    connector=aiohttp.TCPConnector(limit=10, limit_per_host=5)
-                )
-        return cls._session
-
     @classmethod
     async def close_session(cls):
-        """Close the shared session (call on shutdown)."""
-        if cls._session and not cls._session.closed:
-            await cls._session.close()
-            cls._session = None
+        """No-op: connections belong to the shared HTTP pool, closed at app shutdown."""
 
     @property
     def provider_type(self) -> ProviderType:
@@ -490,28 +535,22 @@ class SlackNotificationAdapter(NotificationProviderInterface):
 
         async def _send_slack():
             """Inner function for retry wrapper."""
-            session = await self._get_session()
-            async with session.post(
-                webhook_url,
-                json=slack_payload,
-                timeout=aiohttp.ClientTimeout(total=self._config.timeout_seconds)
-            ) as response:
-                response_text = await response.text()
-
-                if response.status == 200 and response_text == "ok":
-                    return True
-                else:
-                    # Raise exception to trigger retry for server errors
-                    if response.status >= 500:
-                        raise aiohttp.ClientResponseError(
-                            response.request_info,
-                            response.history,
-                            status=response.status,
-                            message=f"Slack webhook failed: {response.status}"
-                        )
-                    # Don't retry client errors (4xx)
-                    logger.error(f"Slack webhook failed: {response.status}")
-                    return False
+            async with get_http_client_pool().client(timeout=self._config.timeout_seconds) as client:
+                response = await client.post(webhook_url, json=slack_payload)
+
+            if response.status_code == 200 and response.text == "ok":
+                return True
+            else:
+                # Raise exception to trigger retry for server errors
+                if response.status_code >= 500:
+                    raise httpx.HTTPStatusError(
+                        f"Slack webhook failed: {response.status_code}",
+                        request=response.request,
+                        response=response
+                    )
+                # Don't retry client errors (4xx)
+                logger.error(f"Slack webhook failed: {response.status_code}")
+                return False
 
         try:
             # GAP-001 FIX: Apply retry logic with exponential backoff
@@ -519,7 +558,7 @@ class SlackNotificationAdapter(NotificationProviderInterface):
                 _send_slack,
                 max_attempts=self._config.retry_max_attempts,
                 base_delay=1.0,
-                retryable_exceptions=(aiohttp.ClientError, ConnectionError, OSError),
+                retryable_exceptions=(httpx.TransportError, httpx.HTTPStatusError, ConnectionError, OSError),
                 logger_name="slack_retry"
             )
 
@@ -527,7 +566,7 @@ class SlackNotificationAdapter(NotificationProviderInterface):
                 logger.info(f"Slack notification sent: {_truncate(payload.title, 50)}")
             return result
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             logger.error(f"Slack webhook timed out after {self._config.timeout_seconds}s")
             return False
         except Exception as e:
@@ -666,15 +705,9 @@ class WebhookNotificationAdapter(NotificationProviderInterface):
     """
     Generic webhook notification provider.
 
-    Sends notifications to any HTTP endpoint with connection pooling.
+    Sends notifications to any HTTP endpoint over the shared HTTP connection pool.
     """
 
-    # BUG-007 FIX: Shared session for connection reuse
-    _session: ClassVar[Optional[aiohttp.ClientSession]] = None
-    # BUG-002 FIX: Use threading.Lock for initial lock creation (thread-safe)
-    _session_lock_init = threading.Lock()  # type: ClassVar[threading.Lock]
-    _session_lock: ClassVar[Optional[asyncio.Lock]] = None
-
     def __init__(self, config: Optional[BaseProviderConfig] = None):
         # BUG-011 FIX: Type check config
         if config is not None and not isinstance(config, WebhookProviderConfig):
@@ -684,28 +717,9 @@ class WebhookNotificationAdapter(NotificationProviderInterface):
     def __repr__(self) -> str:
         return f"<WebhookNotificationAdapter configured={self.is_configured}>"
 
-    @classmethod
-    async def _get_session(cls) -> aiohttp.ClientSession:
-        """Get or create shared aiohttp session (thread-safe)."""
-        # BUG-002 FIX: Thread-safe lock initialization
-        if cls._session_lock is None:
-            with cls._session_lock_init:
-                if cls._session_lock is None:
-                    cls._session_lock = asyncio.Lock()
-
-        async with cls._session_lock:
-            if cls._session is None or cls._session.closed:
-                cls._session = aiohttp.ClientSession(
-                    connector=aiohttp.TCPConnector(limit=10, limit_per_host=5)
-                )
-        return cls._session
-
     @classmethod
     async def close_session(cls):
-        """Close the shared session."""
-        if cls._session and not cls._session.closed:
-            await cls._session.close()
-            cls._session = None
+        """No-op: connections belong to the shared HTTP pool, closed at app shutdown."""
 
     @property
     def provider_type(self) -> ProviderType:
@@ -751,28 +765,22 @@ class WebhookNotificationAdapter(NotificationProviderInterface):
 
         async def _send_webhook():
             """Inner function for retry wrapper."""
-            session = await self._get_session()
-            async with session.request(
-                method,
-                webhook_url,
-                json=webhook_data,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self._config.timeout_seconds)
-            ) as response:
-                if 200 <= response.status < 300:
-                    return True
-                else:
-                    # Raise exception to trigger retry for server errors
-                    if response.status >= 500:
-                        raise aiohttp.ClientResponseError(
-                            response.request_info,
-                            response.history,
-                            status=response.status,
-                            message=f"Webhook failed: {response.status}"
-                        )
-                    # Don't retry client errors (4xx)
-                    logger.error(f"Webhook failed: {response.status}")
-                    return False
+            async with get_http_client_pool().client(timeout=self._config.timeout_seconds) as client:
+                response = await client.request(method, webhook_url, json=webhook_data, headers=headers)
+
+            if 200 <= response.status_code < 300:
+                return True
+            else:
+                # Raise exception to trigger retry for server errors
+                if response.status_code >= 500:
+                    raise httpx.HTTPStatusError(
+                        f"Webhook failed: {response.status_code}",
+                        request=response.request,
+                        response=response
+                    )
+                # Don't retry client errors (4xx)
+                logger.error(f"Webhook failed: {response.status_code}")
+                return False
 
         try:
             # GAP-001 FIX: Apply retry logic with exponential backoff
@@ -780,7 +788,7 @@ class WebhookNotificationAdapter(NotificationProviderInterface):
                 _send_webhook,
                 max_attempts=self._config.retry_max_attempts,
                 base_delay=1.0,
-                retryable_exceptions=(aiohttp.ClientError, ConnectionError, OSError),
+                retryable_exceptions=(httpx.TransportError, httpx.HTTPStatusError, ConnectionError, OSError),
                 logger_name="webhook_retry"
             )
 
@@ -788,7 +796,7 @@ class WebhookNotificationAdapter(NotificationProviderInterface):
                 logger.info(f"Webhook sent: {_sanitize_url_for_logging(webhook_url)}")
             return result
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             logger.error(f"Webhook timed out after {self._config.timeout_seconds}s")
             return False
         except Exception as e:
@@ -17,10 +17,10 @@ from dataclasses import dataclass, field
 from .registry import (
     get_notification_registry,
     NotificationPayload,
-    ProviderType,
     SlackProviderConfig,
     WebhookProviderConfig,
 )
+from .outbox import get_notification_outbox, outbox_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -107,42 +107,50 @@ class AlertNotificationSender:
         """
         Send alert notification to all configured channels.
 
+        With the notification outbox enabled the alert is queued per channel
+        (with its resolved destination) and delivered in the background.
+
         Args:
             data: Alert notification data
 
         Returns:
-            Dict mapping channel name to success status
+            Dict mapping channel name to success (or queued) status
         """
         # Build notification payload
         payload = self._build_payload(data)
 
-        # Configure Slack if specified (MT-FIX: org-specific config)
+        # Per-alert destinations apply to this alert only. They are passed
+        # along with it instead of being written into the registry, whose
+        # org config is shared by every alert of the org.
+        configs = {}
         if "slack" in data.channels and data.slack_webhook_url:
-            slack_config = SlackProviderConfig(
+            configs["slack"] = SlackProviderConfig(
                 enabled=True,
                 webhook_url=data.slack_webhook_url,
                 channel=data.slack_channel,
                 mention_channel=data.slack_mention_channel,
                 mention_users=data.slack_mention_users,
             )
-            self._registry.set_config(
-                ProviderType.SLACK, slack_config, org_slug=data.org_slug
-            )
-
-        # Configure Webhook if specified (MT-FIX: org-specific config)
         if "webhook" in data.channels and data.webhook_url:
-            webhook_config = WebhookProviderConfig(
+            configs["webhook"] = WebhookProviderConfig(
                 enabled=True,
                 url=data.webhook_url,
                 headers=data.webhook_headers,
             )
-            self._registry.set_config(
-                ProviderType.WEBHOOK, webhook_config, org_slug=data.org_slug
+
+        if outbox_enabled():
+            results = await get_notification_outbox().enqueue(
+                payload, data.channels, org_slug=data.org_slug, configs=configs
+            )
+            queued_count = sum(1 for v in results.values() if v)
+            logger.info(
+                f"Alert {data.alert_id} queued: {queued_count}/{len(results)} channels"
             )
+            return results
 
         # Send to all channels (MT-FIX: use org_slug for multi-tenant isolation)
         results = await self._registry.send_to_channels(
-            payload, data.channels, org_slug=data.org_slug
+            payload, data.channels, org_slug=data.org_slug, configs=configs
         )
 
         # Log results
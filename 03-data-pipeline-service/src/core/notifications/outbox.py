@@ -0,0 +1,1247 @@
+"""
+Notification Outbox
+
+Durable, asynchronous notification delivery:
+- Producers enqueue NotificationPayloads and return immediately
+- A background dispatcher delivers per channel with per-provider
+  concurrency limits; due emails of an org go out as one pooled SMTP batch
+- Failed deliveries are retried with exponential backoff, then dead-lettered
+- Dedup keys suppress duplicate notifications within a time window
+- Slack/webhook destinations are resolved when an entry is enqueued and
+  stored with it, so delivery never depends on (or changes) the shared
+  provider registry config
+- BigQuery-backed store shared by every instance survives restarts and
+  scale-in; claims are leases, so entries claimed by a crashed instance are
+  redelivered by another (at-least-once)
+- SQLite-backed store for single-instance deployments with a persistent
+  volume (entries claimed by a crashed dispatcher are redelivered on restart)
+- Store calls run in worker threads, never on the event loop
+- Prometheus metrics for queue depth, delivery lag and outcomes
+
+Usage:
+    outbox = get_notification_outbox()
+    await outbox.enqueue(payload, channels=["email", "slack"], org_slug="acme_corp")
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Type
+
+from google.api_core.exceptions import GoogleAPIError
+from google.cloud import bigquery
+
+from .registry import (
+    BaseProviderConfig,
+    NotificationPayload,
+    NotificationProviderInterface,
+    NotificationProviderRegistry,
+    ProviderType,
+    SlackProviderConfig,
+    WebhookProviderConfig,
+    get_notification_registry,
+)
+from src.core.observability.metrics import (
+    observe_notification_delivery_lag,
+    increment_notification_delivery,
+    set_notification_outbox_depth,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_CHANNEL_CONCURRENCY: Dict[str, int] = {
+    ProviderType.EMAIL.value: 4,
+    ProviderType.SLACK.value: 8,
+    ProviderType.WEBHOOK.value: 8,
+}
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_RETRY_DELAY_SECONDS = 2.0
+DEFAULT_MAX_RETRY_DELAY_SECONDS = 300.0
+DEFAULT_DEDUP_WINDOW_SECONDS = 3600.0
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_IN_FLIGHT = 200
+# Delivered entries are pruned once they fall out of the dedup window
+PRUNE_INTERVAL_SECONDS = 300.0
+# Queue depth gauges are refreshed at most this often (a query per refresh
+# with a shared store)
+DEPTH_REFRESH_INTERVAL_SECONDS = 10.0
+# A claimed entry not completed within the lease is claimable again (the
+# claiming instance died). Well above notification_timeout_seconds.
+DEFAULT_CLAIM_LEASE_SECONDS = 300.0
+# Retries of a BigQuery outbox DML that lost a concurrent-update race
+BQ_CONFLICT_ATTEMPTS = 3
+BQ_CONFLICT_RETRY_DELAY_SECONDS = 0.5
+# Channels whose destination (webhook URL, channel, headers) is stored per
+# entry. Email destinations are the payload recipients; the relay config
+# (with SMTP credentials) stays in the registry.
+DESTINATION_CONFIG_TYPES: Dict[str, Type[BaseProviderConfig]] = {
+    ProviderType.SLACK.value: SlackProviderConfig,
+    ProviderType.WEBHOOK.value: WebhookProviderConfig,
+}
+
+
+class OutboxStatus(str, Enum):
+    """Lifecycle of an outbox entry."""
+    PENDING = "PENDING"
+    IN_FLIGHT = "IN_FLIGHT"
+    DELIVERED = "DELIVERED"
+    DEAD = "DEAD"
+
+
+# ============================================
+# Outbox Entry
+# ============================================
+
+@dataclass
+class OutboxEntry:
+    """A notification queued for delivery to one channel."""
+    entry_id: str
+    channel: str
+    org_slug: Optional[str]
+    payload: NotificationPayload
+    dedup_key: str
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    enqueued_at: float = 0.0
+    next_attempt_at: float = 0.0
+    delivered_at: Optional[float] = None
+    last_error: Optional[str] = None
+    # Provider config resolved at enqueue time (slack/webhook), see
+    # DESTINATION_CONFIG_TYPES. None = the registry's config at delivery.
+    destination: Optional[Dict[str, Any]] = None
+
+
+def default_dedup_key(
+    payload: NotificationPayload,
+    channel: str,
+    org_slug: Optional[str],
+    destination: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Derive a dedup key from the notification content.
+
+    Two notifications with the same channel, destination, org, alert/title,
+    message, data and recipients are considered duplicates.
+    """
+    identity = json.dumps(
+        [
+            channel,
+            destination,
+            org_slug,
+            payload.alert_id or payload.title,
+            payload.message,
+            payload.data,
+            sorted(payload.recipients),
+        ],
+        default=str,
+        sort_keys=True,
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+# ============================================
+# Outbox Stores
+# ============================================
+
+class OutboxStore(ABC):
+    """Persistence for outbox entries. Implementations must be thread-safe."""
+
+    @abstractmethod
+    def add(self, entry: OutboxEntry, dedup_since: float) -> bool:
+        """
+        Insert an entry unless a duplicate exists.
+
+        A duplicate is a PENDING/IN_FLIGHT entry with the same dedup key, or
+        one DELIVERED at or after ``dedup_since``.
+
+        Returns:
+            True if inserted, False if suppressed as a duplicate
+        """
+
+    @abstractmethod
+    def claim_due(self, now: float, limit: int) -> List[OutboxEntry]:
+        """Atomically move up to ``limit`` due PENDING entries to IN_FLIGHT."""
+
+    @abstractmethod
+    def mark_delivered(self, entry_id: str, delivered_at: float) -> None:
+        """Record a successful delivery."""
+
+    @abstractmethod
+    def reschedule(self, entry_id: str, attempts: int, next_attempt_at: float, error: str) -> None:
+        """Return a failed entry to PENDING for a later retry."""
+
+    @abstractmethod
+    def dead_letter(self, entry_id: str, attempts: int, error: str) -> None:
+        """Give up on an entry."""
+
+    @abstractmethod
+    def requeue(self, entry_id: str, now: float) -> bool:
+        """Move a dead-lettered entry back to PENDING. Returns False if not found."""
+
+    @abstractmethod
+    def list_dead_letters(self, limit: int = 100) -> List[OutboxEntry]:
+        """Most recent dead-lettered entries."""
+
+    @abstractmethod
+    def depth(self) -> Dict[str, int]:
+        """Undelivered (PENDING + IN_FLIGHT) entries per channel."""
+
+    @abstractmethod
+    def next_due_at(self) -> Optional[float]:
+        """Earliest next_attempt_at of any PENDING entry."""
+
+    @abstractmethod
+    def recover_in_flight(self) -> int:
+        """Reset IN_FLIGHT entries left by a previous process to PENDING."""
+
+    @abstractmethod
+    def prune_delivered(self, before: float) -> int:
+        """Delete entries delivered before ``before``."""
+
+
+class InMemoryOutboxStore(OutboxStore):
+    """Process-local store (not durable). Used for tests and when no path is configured."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, OutboxEntry] = {}
+
+    def _is_duplicate(self, entry: OutboxEntry, dedup_since: float) -> bool:
+        for existing in self._entries.values():
+            if existing.dedup_key != entry.dedup_key:
+                continue
+            if existing.status in (OutboxStatus.PENDING, OutboxStatus.IN_FLIGHT):
+                return True
+            if existing.status == OutboxStatus.DELIVERED and (existing.delivered_at or 0) >= dedup_since:
+                return True
+        return False
+
+    def add(self, entry: OutboxEntry, dedup_since: float) -> bool:
+        with self._lock:
+            if self._is_duplicate(entry, dedup_since):
+                return False
+            self._entries[entry.entry_id] = entry
+            return True
+
+    def claim_due(self, now: float, limit: int) -> List[OutboxEntry]:
+        with self._lock:
+            due = sorted(
+                (e for e in self._entries.values()
+                 if e.status == OutboxStatus.PENDING and e.next_attempt_at <= now),
+                key=lambda e: e.next_attempt_at,
+            )[:limit]
+            for entry in due:
+                entry.status = OutboxStatus.IN_FLIGHT
+            return list(due)
+
+    def mark_delivered(self, entry_id: str, delivered_at: float) -> None:
+        with self._lock:
+            entry = self._entries[entry_id]
+            entry.status = OutboxStatus.DELIVERED
+            entry.delivered_at = delivered_at
+            entry.attempts += 1
+
+    def reschedule(self, entry_id: str, attempts: int, next_attempt_at: float, error: str) -> None:
+        with self._lock:
+            entry = self._entries[entry_id]
+            entry.status = OutboxStatus.PENDING
+            entry.attempts = attempts
+            entry.next_attempt_at = next_attempt_at
+            entry.last_error = error
+
+    def dead_letter(self, entry_id: str, attempts: int, error: str) -> None:
+        with self._lock:
+            entry = self._entries[entry_id]
+            entry.status = OutboxStatus.DEAD
+            entry.attempts = attempts
+            entry.last_error = error
+
+    def requeue(self, entry_id: str, now: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None or entry.status != OutboxStatus.DEAD:
+                return False
+            entry.status = OutboxStatus.PENDING
+            entry.attempts = 0
+            entry.next_attempt_at = now
+            return True
+
+    def list_dead_letters(self, limit: int = 100) -> List[OutboxEntry]:
+        with self._lock:
+            dead = [e for e in self._entries.values() if e.status == OutboxStatus.DEAD]
+        return sorted(dead, key=lambda e: e.enqueued_at, reverse=True)[:limit]
+
+    def depth(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.status in (OutboxStatus.PENDING, OutboxStatus.IN_FLIGHT):
+                    counts[entry.channel] = counts.get(entry.channel, 0) + 1
+        return counts
+
+    def next_due_at(self) -> Optional[float]:
+        with self._lock:
+            due = [e.next_attempt_at for e in self._entries.values() if e.status == OutboxStatus.PENDING]
+        return min(due) if due else None
+
+    def recover_in_flight(self) -> int:
+        return 0  # Nothing survives the process
+
+    def prune_delivered(self, before: float) -> int:
+        with self._lock:
+            stale = [
+                k for k, e in self._entries.items()
+                if e.status == OutboxStatus.DELIVERED and (e.delivered_at or 0) < before
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+
+class SQLiteOutboxStore(OutboxStore):
+    """
+    Durable store backed by a local SQLite file.
+
+    Only as durable as the disk under ``path``: a container's local disk is
+    lost on Cloud Run restart or scale-in, and the file is never shared
+    between instances. Put it on a persistent volume, and use it only where a
+    single instance delivers notifications; otherwise use BigQueryOutboxStore.
+
+    Args:
+        path: Database file path (parent directories are created)
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS notification_outbox (
+            entry_id TEXT PRIMARY KEY,
+            channel TEXT NOT NULL,
+            org_slug TEXT,
+            payload TEXT NOT NULL,
+            dedup_key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            enqueued_at REAL NOT NULL,
+            next_attempt_at REAL NOT NULL,
+            delivered_at REAL,
+            last_error TEXT,
+            destination TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_due ON notification_outbox (status, next_attempt_at);
+        CREATE INDEX IF NOT EXISTS idx_outbox_dedup ON notification_outbox (dedup_key, status);
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notification_outbox)")}
+        if "destination" not in columns:
+            # Outbox files created before destinations were stored per entry
+            self._conn.execute("ALTER TABLE notification_outbox ADD COLUMN destination TEXT")
+
+    @staticmethod
+    def _to_entry(row) -> OutboxEntry:
+        (entry_id, channel, org_slug, payload, dedup_key, status,
+         attempts, enqueued_at, next_attempt_at, delivered_at, last_error, destination) = row
+        return OutboxEntry(
+            entry_id=entry_id,
+            channel=channel,
+            org_slug=org_slug,
+            payload=NotificationPayload(**json.loads(payload)),
+            dedup_key=dedup_key,
+            status=OutboxStatus(status),
+            attempts=attempts,
+            enqueued_at=enqueued_at,
+            next_attempt_at=next_attempt_at,
+            delivered_at=delivered_at,
+            last_error=last_error,
+            destination=json.loads(destination) if destination else None,
+        )
+
+    def add(self, entry: OutboxEntry, dedup_since: float) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                duplicate = self._conn.execute(
+                    """
+                    SELECT 1 FROM notification_outbox
+                    WHERE dedup_key = ?
+                      AND (status IN ('PENDING', 'IN_FLIGHT')
+                           OR (status = 'DELIVERED' AND delivered_at >= ?))
+                    LIMIT 1
+                    """,
+                    (entry.dedup_key, dedup_since),
+                ).fetchone()
+                if duplicate is None:
+                    self._conn.execute(
+                        "INSERT INTO notification_outbox VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            entry.entry_id, entry.channel, entry.org_slug,
+                            json.dumps(asdict(entry.payload), default=str),
+                            entry.dedup_key, entry.status.value, entry.attempts,
+                            entry.enqueued_at, entry.next_attempt_at,
+                            entry.delivered_at, entry.last_error,
+                            json.dumps(entry.destination) if entry.destination is not None else None,
+                        ),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return duplicate is None
+
+    def claim_due(self, now: float, limit: int) -> List[OutboxEntry]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT * FROM notification_outbox
+                    WHERE status = 'PENDING' AND next_attempt_at <= ?
+                    ORDER BY next_attempt_at
+                    LIMIT ?
+                    """,
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE notification_outbox SET status = 'IN_FLIGHT' WHERE entry_id = ?",
+                    [(row[0],) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        entries = [self._to_entry(row) for row in rows]
+        for entry in entries:
+            entry.status = OutboxStatus.IN_FLIGHT
+        return entries
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def mark_delivered(self, entry_id: str, delivered_at: float) -> None:
+        self._execute(
+            "UPDATE notification_outbox SET status = 'DELIVERED', delivered_at = ?, "
+            "attempts = attempts + 1, last_error = NULL WHERE entry_id = ?",
+            (delivered_at, entry_id),
+        )
+
+    def reschedule(self, entry_id: str, attempts: int, next_attempt_at: float, error: str) -> None:
+        self._execute(
+            "UPDATE notification_outbox SET status = 'PENDING', attempts = ?, "
+            "next_attempt_at = ?, last_error = ? WHERE entry_id = ?",
+            (attempts, next_attempt_at, error, entry_id),
+        )
+
+    def dead_letter(self, entry_id: str, attempts: int, error: str) -> None:
+        self._execute(
+            "UPDATE notification_outbox SET status = 'DEAD', attempts = ?, last_error = ? "
+            "WHERE entry_id = ?",
+            (attempts, error, entry_id),
+        )
+
+    def requeue(self, entry_id: str, now: float) -> bool:
+        return self._execute(
+            "UPDATE notification_outbox SET status = 'PENDING', attempts = 0, next_attempt_at = ? "
+            "WHERE entry_id = ? AND status = 'DEAD'",
+            (now, entry_id),
+        ) > 0
+
+    def list_dead_letters(self, limit: int = 100) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM notification_outbox WHERE status = 'DEAD' "
+                "ORDER BY enqueued_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def depth(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, COUNT(*) FROM notification_outbox "
+                "WHERE status IN ('PENDING', 'IN_FLIGHT') GROUP BY channel"
+            ).fetchall()
+        return {channel: count for channel, count in rows}
+
+    def next_due_at(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM notification_outbox WHERE status = 'PENDING'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def recover_in_flight(self) -> int:
+        return self._execute(
+            "UPDATE notification_outbox SET status = 'PENDING' WHERE status = 'IN_FLIGHT'", ()
+        )
+
+    def prune_delivered(self, before: float) -> int:
+        return self._execute(
+            "DELETE FROM notification_outbox WHERE status = 'DELIVERED' AND delivered_at < ?",
+            (before,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BigQueryOutboxStore(OutboxStore):
+    """
+    Shared store backed by ``organizations.notification_outbox`` in BigQuery.
+
+    Every instance reads and writes the same table, so queued notifications
+    survive restarts and scale-in and any instance can deliver them. Claims
+    are leases: claim_due marks entries IN_FLIGHT until ``now + lease`` and
+    entries whose lease ran out are claimable again. recover_in_flight is
+    therefore a no-op - resetting IN_FLIGHT rows would steal live claims
+    from other instances.
+
+    Rows are written with DML (never streamed), so they can be updated right
+    away. Two claims racing for the table conflict and one of them returns
+    nothing until the next poll; other updates are retried on conflict.
+
+    Args:
+        bq_client: BigQuery client
+        project_id: GCP project ID (defaults to settings)
+        lease_seconds: How long a claim lasts before another instance may retry it
+    """
+
+    _COLUMNS = (
+        "entry_id, channel, org_slug, payload, dedup_key, status, attempts, "
+        "enqueued_at, next_attempt_at, delivered_at, last_error, destination"
+    )
+
+    def __init__(
+        self,
+        bq_client: bigquery.Client,
+        project_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_CLAIM_LEASE_SECONDS,
+    ):
+        if project_id is None:
+            from src.app.config import settings
+            project_id = settings.gcp_project_id
+        self.bq_client = bq_client
+        self.table_id = f"{project_id}.organizations.notification_outbox"
+        self.lease_seconds = lease_seconds
+
+        schema = [
+            bigquery.SchemaField("entry_id", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("channel", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("org_slug", "STRING", mode="NULLABLE"),
+            bigquery.SchemaField("payload", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("dedup_key", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("status", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("attempts", "INTEGER", mode="REQUIRED"),
+            bigquery.SchemaField("enqueued_at", "FLOAT", mode="REQUIRED"),
+            bigquery.SchemaField("next_attempt_at", "FLOAT", mode="REQUIRED"),
+            bigquery.SchemaField("delivered_at", "FLOAT", mode="NULLABLE"),
+            bigquery.SchemaField("last_error", "STRING", mode="NULLABLE"),
+            bigquery.SchemaField("destination", "STRING", mode="NULLABLE"),
+            bigquery.SchemaField("claimed_until", "FLOAT", mode="NULLABLE"),
+        ]
+        table = bigquery.Table(self.table_id, schema=schema)
+        table.clustering_fields = ["status", "dedup_key"]
+        try:
+            self.bq_client.create_table(table, exists_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not create notification outbox table (may already exist): {e}")
+
+    @staticmethod
+    def _to_entry(row) -> OutboxEntry:
+        return OutboxEntry(
+            entry_id=row.entry_id,
+            channel=row.channel,
+            org_slug=row.org_slug,
+            payload=NotificationPayload(**json.loads(row.payload)),
+            dedup_key=row.dedup_key,
+            status=OutboxStatus(row.status),
+            attempts=row.attempts,
+            enqueued_at=row.enqueued_at,
+            next_attempt_at=row.next_attempt_at,
+            delivered_at=row.delivered_at,
+            last_error=row.last_error,
+            destination=json.loads(row.destination) if row.destination else None,
+        )
+
+    def _query(self, sql: str, params: List[Any], retry_conflicts: bool = True):
+        """Run a query job and wait for it, retrying DML that lost a concurrent-update race."""
+        job_config = bigquery.QueryJobConfig(query_parameters=params)
+        attempts = BQ_CONFLICT_ATTEMPTS if retry_conflicts else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                job = self.bq_client.query(sql, job_config=job_config)
+                rows = list(job.result())
+                return job, rows
+            except GoogleAPIError as e:
+                if attempt == attempts or not _is_concurrent_update_error(e):
+                    raise
+                time.sleep(BQ_CONFLICT_RETRY_DELAY_SECONDS * attempt)
+
+    def _update(self, sql: str, params: List[Any]) -> int:
+        job, _ = self._query(sql, params)
+        return job.num_dml_affected_rows or 0
+
+    def add(self, entry: OutboxEntry, dedup_since: float) -> bool:
+        # Single INSERT ... SELECT: the dedup check and the insert are one statement
+        sql = f"""
+        INSERT INTO `{self.table_id}` ({self._COLUMNS})
+        SELECT @entry_id, @channel, @org_slug, @payload, @dedup_key, @status, @attempts,
+               @enqueued_at, @next_attempt_at, @delivered_at, @last_error, @destination
+        FROM UNNEST([1])
+        WHERE NOT EXISTS (
+            SELECT 1 FROM `{self.table_id}`
+            WHERE dedup_key = @dedup_key
+              AND (status IN ('PENDING', 'IN_FLIGHT')
+                   OR (status = 'DELIVERED' AND delivered_at >= @dedup_since))
+        )
+        """
+        return self._update(sql, [
+            bigquery.ScalarQueryParameter("entry_id", "STRING", entry.entry_id),
+            bigquery.ScalarQueryParameter("channel", "STRING", entry.channel),
+            bigquery.ScalarQueryParameter("org_slug", "STRING", entry.org_slug),
+            bigquery.ScalarQueryParameter(
+                "payload", "STRING", json.dumps(asdict(entry.payload), default=str)
+            ),
+            bigquery.ScalarQueryParameter("dedup_key", "STRING", entry.dedup_key),
+            bigquery.ScalarQueryParameter("status", "STRING", entry.status.value),
+            bigquery.ScalarQueryParameter("attempts", "INT64", entry.attempts),
+            bigquery.ScalarQueryParameter("enqueued_at", "FLOAT64", entry.enqueued_at),
+            bigquery.ScalarQueryParameter("next_attempt_at", "FLOAT64", entry.next_attempt_at),
+            bigquery.ScalarQueryParameter("delivered_at", "FLOAT64", entry.delivered_at),
+            bigquery.ScalarQueryParameter("last_error", "STRING", entry.last_error),
+            bigquery.ScalarQueryParameter(
+                "destination", "STRING",
+                json.dumps(entry.destination) if entry.destination is not None else None,
+            ),
+            bigquery.ScalarQueryParameter("dedup_since", "FLOAT64", dedup_since),
+        ]) > 0
+
+    def claim_due(self, now: float, limit: int) -> List[OutboxEntry]:
+        sql = f"""
+        BEGIN TRANSACTION;
+        CREATE TEMP TABLE claimed AS
+        SELECT entry_id
+        FROM `{self.table_id}`
+        WHERE (status = 'PENDING' AND next_attempt_at <= @now)
+           OR (status = 'IN_FLIGHT' AND claimed_until < @now)
+        ORDER BY next_attempt_at
+        LIMIT @limit;
+        UPDATE `{self.table_id}`
+        SET status = 'IN_FLIGHT', claimed_until = @claimed_until
+        WHERE entry_id IN (SELECT entry_id FROM claimed);
+        COMMIT TRANSACTION;
+        SELECT {self._COLUMNS}
+        FROM `{self.table_id}`
+        WHERE entry_id IN (SELECT entry_id FROM claimed);
+        """
+        params = [
+            bigquery.ScalarQueryParameter("now", "FLOAT64", now),
+            bigquery.ScalarQueryParameter("limit", "INT64", limit),
+            bigquery.ScalarQueryParameter("claimed_until", "FLOAT64", now + self.lease_seconds),
+        ]
+        try:
+            _, rows = self._query(sql, params, retry_conflicts=False)
+        except GoogleAPIError as e:
+            if not _is_concurrent_update_error(e):
+                raise
+            # Another instance claimed concurrently; pick up the rest next poll
+            logger.debug(f"Outbox claim lost a concurrent-update race: {e}")
+            return []
+        return [self._to_entry(row) for row in rows]
+
+    def mark_delivered(self, entry_id: str, delivered_at: float) -> None:
+        self._update(
+            f"UPDATE `{self.table_id}` SET status = 'DELIVERED', delivered_at = @delivered_at, "
+            "attempts = attempts + 1, last_error = NULL, claimed_until = NULL "
+            "WHERE entry_id = @entry_id",
+            [
+                bigquery.ScalarQueryParameter("delivered_at", "FLOAT64", delivered_at),
+                bigquery.ScalarQueryParameter("entry_id", "STRING", entry_id),
+            ],
+        )
+
+    def reschedule(self, entry_id: str, attempts: int, next_attempt_at: float, error: str) -> None:
+        self._update(
+            f"UPDATE `{self.table_id}` SET status = 'PENDING', attempts = @attempts, "
+            "next_attempt_at = @next_attempt_at, last_error = @error, claimed_until = NULL "
+            "WHERE entry_id = @entry_id",
+            [
+                bigquery.ScalarQueryParameter("attempts", "INT64", attempts),
+                bigquery.ScalarQueryParameter("next_attempt_at", "FLOAT64", next_attempt_at),
+                bigquery.ScalarQueryParameter("error", "STRING", error),
+                bigquery.ScalarQueryParameter("entry_id", "STRING", entry_id),
+            ],
+        )
+
+    def dead_letter(self, entry_id: str, attempts: int, error: str) -> None:
+        self._update(
+            f"UPDATE `{self.table_id}` SET status = 'DEAD', attempts = @attempts, "
+            "last_error = @error, claimed_until = NULL WHERE entry_id = @entry_id",
+            [
+                bigquery.ScalarQueryParameter("attempts", "INT64", attempts),
+                bigquery.ScalarQueryParameter("error", "STRING", error),
+                bigquery.ScalarQueryParameter("entry_id", "STRING", entry_id),
+            ],
+        )
+
+    def requeue(self, entry_id: str, now: float) -> bool:
+        return self._update(
+            f"UPDATE `{self.table_id}` SET status = 'PENDING', attempts = 0, next_attempt_at = @now "
+            "WHERE entry_id = @entry_id AND status = 'DEAD'",
+            [
+                bigquery.ScalarQueryParameter("now", "FLOAT64", now),
+                bigquery.ScalarQueryParameter("entry_id", "STRING", entry_id),
+            ],
+        ) > 0
+
+    def list_dead_letters(self, limit: int = 100) -> List[OutboxEntry]:
+        _, rows = self._query(
+            f"SELECT {self._COLUMNS} FROM `{self.table_id}` WHERE status = 'DEAD' "
+            "ORDER BY enqueued_at DESC LIMIT @limit",
+            [bigquery.ScalarQueryParameter("limit", "INT64", limit)],
+        )
+        return [self._to_entry(row) for row in rows]
+
+    def depth(self) -> Dict[str, int]:
+        _, rows = self._query(
+            f"SELECT channel, COUNT(*) AS entries FROM `{self.table_id}` "
+            "WHERE status IN ('PENDING', 'IN_FLIGHT') GROUP BY channel",
+            [],
+        )
+        return {row.channel: row.entries for row in rows}
+
+    def next_due_at(self) -> Optional[float]:
+        # Expired leases come due too (their instance is gone)
+        _, rows = self._query(
+            f"SELECT MIN(CASE WHEN status = 'PENDING' THEN next_attempt_at ELSE claimed_until END) AS due "
+            f"FROM `{self.table_id}` WHERE status IN ('PENDING', 'IN_FLIGHT')",
+            [],
+        )
+        return rows[0].due if rows else None
+
+    def recover_in_flight(self) -> int:
+        # Expired leases are reclaimed by claim_due; live ones belong to other instances
+        return 0
+
+    def prune_delivered(self, before: float) -> int:
+        return self._update(
+            f"DELETE FROM `{self.table_id}` WHERE status = 'DELIVERED' AND delivered_at < @before",
+            [bigquery.ScalarQueryParameter("before", "FLOAT64", before)],
+        )
+
+
+def _is_concurrent_update_error(error: Exception) -> bool:
+    """True for BigQuery's DML conflict ("Could not serialize access ... concurrent update")."""
+    return "could not serialize access" in str(error).lower()
+
+
+# ============================================
+# Outbox + Dispatcher
+# ============================================
+
+class NotificationOutbox:
+    """
+    Notification outbox with a concurrent background dispatcher.
+
+    Store calls (SQLite or BigQuery, both blocking) run in worker threads so
+    neither producers nor the dispatcher stall the event loop.
+
+    Args:
+        store: Entry persistence (defaults to in-memory)
+        registry: Provider registry used for delivery
+        channel_concurrency: Max concurrent deliveries per channel
+        max_attempts: Deliveries attempted before dead-lettering
+        base_retry_delay_seconds: First retry delay (doubles per attempt)
+        max_retry_delay_seconds: Retry delay cap
+        dedup_window_seconds: How long a delivered dedup key suppresses repeats
+        poll_interval_seconds: Idle poll interval for retries coming due
+        max_in_flight: Max entries claimed by the dispatcher at once
+    """
+
+    def __init__(
+        self,
+        store: Optional[OutboxStore] = None,
+        registry: Optional[NotificationProviderRegistry] = None,
+        channel_concurrency: Optional[Dict[str, int]] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_retry_delay_seconds: float = DEFAULT_BASE_RETRY_DELAY_SECONDS,
+        max_retry_delay_seconds: float = DEFAULT_MAX_RETRY_DELAY_SECONDS,
+        dedup_window_seconds: float = DEFAULT_DEDUP_WINDOW_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ):
+        self.store = store or InMemoryOutboxStore()
+        self._registry = registry or get_notification_registry()
+        self.channel_concurrency = {**DEFAULT_CHANNEL_CONCURRENCY, **(channel_concurrency or {})}
+        self.max_attempts = max(1, max_attempts)
+        self.base_retry_delay_seconds = base_retry_delay_seconds
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self.dedup_window_seconds = dedup_window_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_in_flight = max_in_flight
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        # Set once the runner has recovered entries left by a previous process
+        self._ready: Optional[asyncio.Event] = None
+        # True while claimed entries are on their way from the store to tasks
+        self._claiming = False
+        self._runner: Optional[asyncio.Task] = None
+        self._deliveries: Set[asyncio.Task] = set()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stopping = False
+        self._last_prune = 0.0
+        self._last_depth_refresh = 0.0
+        self._start_lock = threading.Lock()
+
+    # ------------------------------------------
+    # Producer side
+    # ------------------------------------------
+
+    async def enqueue(
+        self,
+        payload: NotificationPayload,
+        channels: List[str],
+        org_slug: Optional[str] = None,
+        dedup_key: Optional[str] = None,
+        configs: Optional[Dict[str, BaseProviderConfig]] = None,
+    ) -> Dict[str, bool]:
+        """
+        Queue a notification for delivery and return immediately.
+
+        Slack and webhook entries store their fully resolved destination: the
+        config passed in ``configs`` for that channel, else the registry's org
+        (or global) config at enqueue time.
+
+        Args:
+            payload: Notification payload
+            channels: Channel names ("email", "slack", "webhook")
+            org_slug: Org for org-specific provider config (defaults to payload.org_slug)
+            dedup_key: Explicit dedup key; derived from the content if omitted
+                       (suffixed with the channel so each channel dedups separately)
+            configs: Per-channel destination configs for this notification only
+
+        Returns:
+            Dict mapping channel name to True if queued (or already queued as a
+            duplicate), False if the channel is unknown or not configured
+        """
+        org_slug = org_slug or payload.org_slug
+        now = time.time()
+        results: Dict[str, bool] = {}
+
+        for channel in channels:
+            try:
+                destination = self._resolve_destination(channel, org_slug, (configs or {}).get(channel))
+                provider = self._provider_for(channel, org_slug, destination)
+            except (ValueError, TypeError):
+                provider = None
+            if provider is None or not provider.is_configured:
+                logger.warning(f"Provider not available or not configured: {channel}")
+                results[channel] = False
+                continue
+
+            entry = OutboxEntry(
+                entry_id=str(uuid.uuid4()),
+                channel=channel,
+                org_slug=org_slug,
+                payload=payload,
+                dedup_key=(
+                    f"{dedup_key}:{channel}" if dedup_key
+                    else default_dedup_key(payload, channel, org_slug, destination)
+                ),
+                enqueued_at=now,
+                next_attempt_at=now,
+                destination=destination,
+            )
+            added = await asyncio.to_thread(
+                self.store.add, entry, now - self.dedup_window_seconds
+            )
+            if added:
+                increment_notification_delivery(channel, "queued")
+            else:
+                increment_notification_delivery(channel, "deduplicated")
+                logger.debug(f"Suppressed duplicate {channel} notification: {payload.title}")
+            results[channel] = True
+
+        self._ensure_started()
+        return results
+
+    def _resolve_destination(
+        self,
+        channel: str,
+        org_slug: Optional[str],
+        override: Optional[BaseProviderConfig],
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot the destination config for channels that store one."""
+        if channel not in DESTINATION_CONFIG_TYPES:
+            return None
+        config = override or self._registry.get_config(ProviderType(channel), org_slug)
+        return asdict(config) if config is not None else None
+
+    def _provider_for(
+        self,
+        channel: str,
+        org_slug: Optional[str],
+        destination: Optional[Dict[str, Any]],
+    ) -> Optional[NotificationProviderInterface]:
+        """Provider for an entry: built from its stored destination, else the registry's."""
+        provider_type = ProviderType(channel)
+        if destination is not None:
+            config = DESTINATION_CONFIG_TYPES[channel](**destination)
+            return self._registry.create_provider(provider_type, config)
+        return self._registry.get_provider(provider_type, org_slug)
+
+    # ------------------------------------------
+    # Dispatcher lifecycle
+    # ------------------------------------------
+
+    def _ensure_started(self) -> None:
+        """Start the dispatcher on the running loop, or wake it if already running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._start_lock:
+            running = (
+                self._runner is not None
+                and not self._runner.done()
+                and self._loop is not None
+                and not self._loop.is_closed()
+            )
+            if running:
+                if loop is self._loop:
+                    self._wake.set()
+                else:
+                    self._loop.call_soon_threadsafe(self._wake.set)
+                return
+            if loop is None:
+                # No loop here - entries wait in the store until start() runs
+                return
+            self._start_on(loop)
+
+    def _start_on(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._claiming = False
+        self._semaphores = {}
+        self._stopping = False
+        self._runner = loop.create_task(self._run())
+
+    def start(self) -> None:
+        """Start the dispatcher on the running event loop (call on app startup)."""
+        self._ensure_started()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the dispatcher, giving in-flight deliveries up to ``timeout`` seconds.
+
+        Undelivered entries stay in the store for the next start.
+        """
+        runner = self._runner
+        if runner is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        if self._deliveries:
+            await asyncio.wait(set(self._deliveries), timeout=timeout)
+        runner.cancel()
+        for task in list(self._deliveries):
+            task.cancel()
+        await asyncio.gather(runner, *self._deliveries, return_exceptions=True)
+        self._runner = None
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """
+        Wait until nothing is due or in flight.
+
+        Entries waiting on a future retry do not count. Returns False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        self._ensure_started()
+        if self._ready is not None:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return False
+        while time.monotonic() < deadline:
+            next_due = await asyncio.to_thread(self.store.next_due_at)
+            idle = not self._deliveries and not self._claiming
+            if idle and (next_due is None or next_due > time.time()):
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    # ------------------------------------------
+    # Dispatch loop
+    # ------------------------------------------
+
+    def _semaphore(self, channel: str) -> asyncio.Semaphore:
+        if channel not in self._semaphores:
+            self._semaphores[channel] = asyncio.Semaphore(self.channel_concurrency.get(channel, 4))
+        return self._semaphores[channel]
+
+    async def _run(self) -> None:
+        try:
+            recovered = await asyncio.to_thread(self.store.recover_in_flight)
+            if recovered:
+                logger.info(f"Recovered {recovered} in-flight notifications from previous run")
+        except Exception as e:
+            logger.warning(f"Could not recover in-flight notifications: {e}")
+        self._ready.set()
+
+        while not self._stopping:
+            self._wake.clear()
+            capacity = self.max_in_flight - len(self._deliveries)
+            self._claiming = True
+            try:
+                claimed = (
+                    await asyncio.to_thread(self.store.claim_due, time.time(), capacity)
+                    if capacity > 0 else []
+                )
+            except Exception as e:
+                # Store unavailable (e.g. a BigQuery error): entries stay queued
+                logger.warning(f"Notification outbox claim failed, retrying next poll: {e}")
+                claimed = []
+
+            # Emails for the same org share one relay config; they go out as
+            # one send_batch over pooled connections instead of one by one
+            email_batches: Dict[Optional[str], List[OutboxEntry]] = {}
+            for entry in claimed:
+                if entry.channel == ProviderType.EMAIL.value:
+                    email_batches.setdefault(entry.org_slug, []).append(entry)
+                else:
+                    self._spawn(self._deliver(entry))
+            for org_slug, entries in email_batches.items():
+                self._spawn(self._deliver_email_batch(org_slug, entries))
+            self._claiming = False
+
+            await self._housekeeping()
+            if claimed:
+                continue
+
+            try:
+                next_due = await asyncio.to_thread(self.store.next_due_at)
+            except Exception as e:
+                logger.warning(f"Notification outbox poll failed: {e}")
+                next_due = None
+            wait = self.poll_interval_seconds
+            if next_due is not None:
+                wait = max(0.0, min(wait, next_due - time.time()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, delivery) -> None:
+        task = asyncio.create_task(delivery)
+        self._deliveries.add(task)
+        task.add_done_callback(self._on_delivery_done)
+
+    def _on_delivery_done(self, task: asyncio.Task) -> None:
+        self._deliveries.discard(task)
+        if self._wake is not None:
+            self._wake.set()  # Capacity freed
+
+    async def _deliver(self, entry: OutboxEntry) -> None:
+        error: Optional[str] = None
+        async with self._semaphore(entry.channel):
+            try:
+                provider = self._provider_for(entry.channel, entry.org_slug, entry.destination)
+                if provider is None:
+                    error = "Provider not available"
+                elif not await provider.send(entry.payload):
+                    error = "Provider reported failure"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        await self._record_outcome(entry, error)
+
+    async def _deliver_email_batch(self, org_slug: Optional[str], entries: List[OutboxEntry]) -> None:
+        """Deliver one org's claimed emails with EmailNotificationAdapter.send_batch."""
+        errors: List[Optional[str]]
+        async with self._semaphore(ProviderType.EMAIL.value):
+            try:
+                provider = self._registry.get_provider(ProviderType.EMAIL, org_slug)
+                if provider is None:
+                    errors = ["Provider not available"] * len(entries)
+                else:
+                    payloads = [entry.payload for entry in entries]
+                    if hasattr(provider, "send_batch"):
+                        sent = await provider.send_batch(payloads)
+                    else:
+                        sent = [await provider.send(payload) for payload in payloads]
+                    errors = [None if ok else "Provider reported failure" for ok in sent]
+            except Exception as e:
+                errors = [str(e) or type(e).__name__] * len(entries)
+
+        for entry, error in zip(entries, errors):
+            await self._record_outcome(entry, error)
+
+    async def _record_outcome(self, entry: OutboxEntry, error: Optional[str]) -> None:
+        """
+        Mark an attempt delivered, or reschedule / dead-letter it.
+
+        If the store write fails the entry stays IN_FLIGHT and is delivered
+        again after recovery (SQLite) or lease expiry (BigQuery).
+        """
+        now = time.time()
+        try:
+            if error is None:
+                await asyncio.to_thread(self.store.mark_delivered, entry.entry_id, now)
+                increment_notification_delivery(entry.channel, "delivered")
+                observe_notification_delivery_lag(entry.channel, now - entry.enqueued_at)
+                return
+
+            attempts = entry.attempts + 1
+            if attempts >= self.max_attempts:
+                await asyncio.to_thread(self.store.dead_letter, entry.entry_id, attempts, error)
+                increment_notification_delivery(entry.channel, "dead_lettered")
+                logger.error(
+                    f"Dead-lettered {entry.channel} notification after {attempts} attempts",
+                    extra={"entry_id": entry.entry_id, "org_slug": entry.org_slug, "error": error},
+                )
+            else:
+                delay = min(
+                    self.base_retry_delay_seconds * (2 ** (attempts - 1)),
+                    self.max_retry_delay_seconds,
+                )
+                await asyncio.to_thread(
+                    self.store.reschedule, entry.entry_id, attempts, now + delay, error
+                )
+                increment_notification_delivery(entry.channel, "retried")
+                logger.warning(
+                    f"{entry.channel} notification failed (attempt {attempts}/{self.max_attempts}), "
+                    f"retrying in {delay:.1f}s: {error}"
+                )
+        except Exception as e:
+            logger.error(
+                f"Could not record {entry.channel} notification outcome: {e}",
+                extra={"entry_id": entry.entry_id, "org_slug": entry.org_slug},
+            )
+
+    async def _housekeeping(self) -> None:
+        """Prune delivered entries and refresh the depth gauges when due."""
+        now = time.time()
+        try:
+            if now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                pruned = await asyncio.to_thread(
+                    self.store.prune_delivered, now - self.dedup_window_seconds
+                )
+                if pruned:
+                    logger.debug(f"Pruned {pruned} delivered outbox entries")
+            if now - self._last_depth_refresh >= DEPTH_REFRESH_INTERVAL_SECONDS:
+                self._last_depth_refresh = now
+                depth = await asyncio.to_thread(self.store.depth)
+                for channel in set(self.channel_concurrency) | set(depth):
+                    set_notification_outbox_depth(channel, depth.get(channel, 0))
+        except Exception as e:
+            logger.warning(f"Notification outbox housekeeping failed: {e}")
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Undelivered entries per channel."""
+        return self.store.depth()
+
+
+# ============================================
+# Global Outbox (Thread-Safe Singleton)
+# ============================================
+
+_missing_store_warned = False
+
+
+def outbox_enabled() -> bool:
+    """
+    True if notifications should be queued rather than sent inline.
+
+    The outbox is only used with a durable store: the shared BigQuery table,
+    or a SQLite file at notification_outbox_path. An in-memory queue would
+    lose every undelivered notification on restart or scale-in, which is
+    worse than sending inline.
+    """
+    global _missing_store_warned
+    try:
+        from src.app.config import settings
+    except ImportError:
+        return False
+    if not settings.notification_outbox_enabled:
+        return False
+    if settings.notification_outbox_store == "sqlite" and not settings.notification_outbox_path:
+        if not _missing_store_warned:
+            _missing_store_warned = True
+            logger.error(
+                "notification_outbox_store is 'sqlite' without notification_outbox_path; "
+                "sending notifications inline instead of queuing them in memory"
+            )
+        return False
+    return True
+
+
+_outbox: Optional[NotificationOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """
+    Get the global notification outbox (thread-safe).
+
+    Uses the shared BigQuery store (notification_outbox_store="bigquery"),
+    or a SQLite store at settings.notification_outbox_path; otherwise an
+    in-memory store (queue status / tests only - outbox_enabled() never
+    routes notifications to it).
+    """
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                store: OutboxStore = InMemoryOutboxStore()
+                kwargs = {}
+                try:
+                    from src.app.config import settings
+                    if settings.notification_outbox_store == "bigquery":
+                        from src.core.engine.bq_client import get_bigquery_client
+                        store = BigQueryOutboxStore(
+                            get_bigquery_client().client, settings.gcp_project_id
+                        )
+                    elif settings.notification_outbox_path:
+                        store = SQLiteOutboxStore(settings.notification_outbox_path)
+                    kwargs = dict(
+                        poll_interval_seconds=settings.notification_outbox_poll_seconds,
+                        max_attempts=settings.notification_outbox_max_attempts,
+                        dedup_window_seconds=settings.notification_outbox_dedup_window_seconds,
+                        channel_concurrency={
+                            ProviderType.EMAIL.value: settings.notification_email_concurrency,
+                            ProviderType.SLACK.value: settings.notification_slack_concurrency,
+                            ProviderType.WEBHOOK.value: settings.notification_webhook_concurrency,
+                        },
+                    )
+                except ImportError:
+                    pass  # Use defaults if settings not available
+                _outbox = NotificationOutbox(store=store, **kwargs)
+    return _outbox
+
+
+def reset_notification_outbox():
+    """Reset the global outbox (for testing)."""
+    global _outbox
+    _outbox = None
@@ -86,6 +86,10 @@ class EmailProviderConfig(BaseProviderConfig):
     from_email: str = "alerts@cloudact.ai"
     from_name: str = "CloudAct.AI"
     subject_prefix: str = "[CloudAct.AI]"
+    # Connection pooling / batching (see smtp_pool.py)
+    smtp_pool_size: int = 4  # Max concurrent connections per relay
+    smtp_max_messages_per_connection: int = 100  # Recycle connection after N messages
+    smtp_batch_size: int = 50  # Messages per connection in send_batch()
 
     @classmethod
     def from_env(cls) -> "EmailProviderConfig":
@@ -102,6 +106,11 @@ class EmailProviderConfig(BaseProviderConfig):
             smtp_use_tls=os.environ.get("EMAIL_SMTP_USE_TLS", "true").lower() == "true",
             from_email=os.environ.get("EMAIL_FROM_ADDRESS", os.environ.get("FROM_EMAIL", "alerts@cloudact.ai")),
             from_name=os.environ.get("EMAIL_FROM_NAME", os.environ.get("FROM_NAME", "CloudAct.AI")),
+            smtp_pool_size=int(os.environ.get("EMAIL_SMTP_POOL_SIZE", "4")),
+            smtp_max_messages_per_connection=int(
+                os.environ.get("EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION", "100")
+            ),
+            smtp_batch_size=int(os.environ.get("EMAIL_SMTP_BATCH_SIZE", "50")),
         )
 
 
@@ -448,6 +457,30 @@ class NotificationProviderRegistry:
                 logger.error(f"Failed to create provider {provider_type.value}: {e}")
                 return None
 
+    def create_provider(
+        self,
+        provider_type: ProviderType,
+        config: BaseProviderConfig
+    ) -> Optional[NotificationProviderInterface]:
+        """
+        Create an uncached provider instance for an explicit configuration.
+
+        Used for per-notification destinations (e.g. an alert's own Slack
+        webhook) so they never replace the org's shared configuration.
+
+        Returns:
+            Provider instance or None if not registered / creation failed
+        """
+        provider_class = self._providers.get(provider_type)
+        if provider_class is None:
+            logger.warning(f"Provider not registered: {provider_type.value}")
+            return None
+        try:
+            return provider_class(config)
+        except Exception as e:
+            logger.error(f"Failed to create provider {provider_type.value}: {e}")
+            return None
+
     def get_available_providers(self) -> List[ProviderType]:
         """Get list of registered provider types."""
         return list(self._providers.keys())
@@ -473,7 +506,8 @@ class NotificationProviderRegistry:
         payload: NotificationPayload,
         channels: List[str],
         org_slug: Optional[str] = None,
-        parallel: bool = True
+        parallel: bool = True,
+        configs: Optional[Dict[str, BaseProviderConfig]] = None
     ) -> Dict[str, bool]:
         """
         Send notification to multiple channels.
@@ -486,6 +520,8 @@ class NotificationProviderRegistry:
             channels: List of channel names ("email", "slack", "webhook")
             org_slug: Optional org slug for org-specific provider
             parallel: If True, send to all channels concurrently (default: True)
+            configs: Per-channel configs for this notification only (e.g. an
+                     alert's own webhook); the shared org config is untouched
 
         Returns:
             Dict mapping channel name to success status
@@ -507,8 +543,11 @@ class NotificationProviderRegistry:
             """Send to a single channel and return (channel, success)."""
             try:
                 provider_type = ProviderType(channel)
-                # MT-FIX: Get org-specific provider
-                provider = self.get_provider(provider_type, org_slug)
+                if configs and configs.get(channel) is not None:
+                    provider = self.create_provider(provider_type, configs[channel])
+                else:
+                    # MT-FIX: Get org-specific provider
+                    provider = self.get_provider(provider_type, org_slug)
 
                 if not provider:
                     logger.warning(f"Provider not available: {channel}")
@@ -557,7 +596,17 @@ class NotificationProviderRegistry:
 
         Call this on application shutdown to release resources.
         """
-        from .adapters import SlackNotificationAdapter, WebhookNotificationAdapter
+        from .adapters import (
+            EmailNotificationAdapter,
+            SlackNotificationAdapter,
+            WebhookNotificationAdapter,
+        )
+
+        try:
+            await EmailNotificationAdapter.close_pool()
+            logger.debug("Closed SMTP connection pool")
+        except Exception as e:
+            logger.warning(f"Error closing SMTP pool: {e}")
 
         try:
             await SlackNotificationAdapter.close_session()
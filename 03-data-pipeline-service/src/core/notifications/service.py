@@ -14,6 +14,7 @@ from .registry import (
     get_notification_registry,
     NotificationPayload,
 )
+from .outbox import get_notification_outbox, outbox_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,9 @@ class NotificationService:
         """
         Send notification using the unified registry.
 
+        With the notification outbox enabled the notification is
+        queued and delivered in the background; this returns immediately.
+
         Args:
             org_slug: Organization slug
             title: Notification title
@@ -56,7 +60,8 @@ class NotificationService:
             recipients: Email recipients (for email channel)
 
         Returns:
-            Dict mapping channel name to success status
+            Dict mapping channel name to success status (queued status when
+            the outbox is enabled)
         """
         # Build unified payload
         data = details or {}
@@ -74,6 +79,11 @@ class NotificationService:
             data=data,
         )
 
+        if outbox_enabled():
+            return await get_notification_outbox().enqueue(
+                payload, channels or ["email"], org_slug=org_slug
+            )
+
         # Send via unified registry
         return await self._registry.send_to_channels(
             payload,
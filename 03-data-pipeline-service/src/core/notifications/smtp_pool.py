@@ -0,0 +1,369 @@
+"""
+SMTP Connection Pool
+
+Persistent, pooled SMTP delivery for the email notification adapter:
+- Keep-alive connections reused across messages (one handshake, STARTTLS and
+  login per connection instead of per email)
+- Per-relay pools keyed by (host, port, username, tls)
+- NOOP health check before reusing a connection that has been idle
+- Transparent reconnect when the server drops a connection mid-batch
+- Connections recycled after a message cap or idle timeout
+- Dedicated bounded thread pool, so SMTP I/O never saturates the default
+  asyncio executor
+"""
+
+import asyncio
+import logging
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import Message
+from functools import partial
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from .registry import EmailProviderConfig
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_IDLE_TIMEOUT_SECONDS = 60.0
+# Connections idle for less than this are reused without a NOOP round trip
+HEALTH_CHECK_AFTER_SECONDS = 5.0
+
+# (host, port, username, use_tls)
+RelayKey = Tuple[str, int, Optional[str], bool]
+# A message and its envelope recipients
+OutgoingMessage = Tuple[Message, List[str]]
+
+
+def relay_key(config: EmailProviderConfig) -> RelayKey:
+    """Identify the SMTP relay (and credentials) a config sends through."""
+    return (
+        config.smtp_host,
+        config.smtp_port,
+        config.smtp_username,
+        config.smtp_use_tls,
+    )
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    True if an SMTP error means the connection is unusable.
+
+    Connection-level failures are transient and worth retrying on a new
+    connection; message-level rejections (refused recipients, bad data) are
+    permanent for that message.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: service not available, closing transmission channel
+        return error.smtp_code == 421
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, (ConnectionError, OSError, TimeoutError))
+
+
+# ============================================
+# Pooled Connection
+# ============================================
+
+@dataclass
+class _PooledConnection:
+    """An open, authenticated SMTP session."""
+    server: smtplib.SMTP
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    messages_sent: int = 0
+
+    def close(self) -> None:
+        """QUIT politely, falling back to dropping the socket."""
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+@dataclass
+class SMTPPoolStats:
+    """Counters for observing pool effectiveness."""
+    connections_opened: int = 0
+    connections_reused: int = 0
+    reconnects: int = 0
+    health_check_failures: int = 0
+    messages_sent: int = 0
+    messages_failed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+# ============================================
+# Connection Pool
+# ============================================
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of persistent SMTP connections.
+
+    Each relay gets at most ``config.smtp_pool_size`` concurrent connections;
+    callers beyond that wait for a connection to be checked back in.
+
+    Args:
+        max_workers: Size of the dedicated SMTP thread pool
+        idle_timeout_seconds: Close pooled connections idle for longer than this
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.stats = SMTPPoolStats()
+
+        self._lock = threading.Lock()
+        self._idle: Dict[RelayKey, Deque[_PooledConnection]] = {}
+        self._slots: Dict[RelayKey, threading.BoundedSemaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    # ------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------
+
+    def _connect(self, config: EmailProviderConfig) -> _PooledConnection:
+        """Open a new session: connect, EHLO, STARTTLS, login."""
+        server = smtplib.SMTP(
+            config.smtp_host,
+            config.smtp_port,
+            timeout=config.timeout_seconds,
+        )
+        try:
+            if config.smtp_use_tls:
+                server.starttls(context=ssl.create_default_context())
+            if config.smtp_username and config.smtp_password:
+                server.login(config.smtp_username, config.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        with self._lock:
+            self.stats.connections_opened += 1
+        return _PooledConnection(server=server)
+
+    def _slot(self, key: RelayKey, config: EmailProviderConfig) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, config.smtp_pool_size))
+                self._slots[key] = slot
+            return slot
+
+    def _is_healthy(self, conn: _PooledConnection) -> bool:
+        """NOOP round trip to detect connections the server has dropped."""
+        try:
+            code, _ = conn.server.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    def _checkout(self, config: EmailProviderConfig) -> _PooledConnection:
+        """
+        Take a live connection for a relay, opening one if none is idle.
+
+        Raises:
+            TimeoutError: If all connections to the relay stay busy for
+                          longer than config.timeout_seconds
+        """
+        if self._closed:
+            raise RuntimeError("SMTP connection pool is closed")
+
+        key = relay_key(config)
+        if not self._slot(key, config).acquire(timeout=config.timeout_seconds):
+            raise TimeoutError(
+                f"No SMTP connection available for {config.smtp_host} "
+                f"within {config.timeout_seconds}s"
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.get(key)
+                    conn = idle.pop() if idle else None
+                if conn is None:
+                    return self._connect(config)
+
+                idle_for = time.monotonic() - conn.last_used
+                if idle_for > self.idle_timeout_seconds:
+                    conn.close()
+                    continue
+                if idle_for > HEALTH_CHECK_AFTER_SECONDS and not self._is_healthy(conn):
+                    with self._lock:
+                        self.stats.health_check_failures += 1
+                    conn.close()
+                    continue
+
+                with self._lock:
+                    self.stats.connections_reused += 1
+                return conn
+        except BaseException:
+            self._slots[key].release()
+            raise
+
+    def _checkin(
+        self,
+        config: EmailProviderConfig,
+        conn: Optional[_PooledConnection],
+    ) -> None:
+        """Return a connection to the pool (or close it) and free its slot."""
+        key = relay_key(config)
+        try:
+            if conn is None:
+                return
+            if self._closed or conn.messages_sent >= config.smtp_max_messages_per_connection:
+                conn.close()
+                return
+            conn.last_used = time.monotonic()
+            with self._lock:
+                self._idle.setdefault(key, deque()).append(conn)
+        finally:
+            self._slots[key].release()
+
+    # ------------------------------------------
+    # Sending
+    # ------------------------------------------
+
+    def send_messages_sync(
+        self,
+        config: EmailProviderConfig,
+        messages: Sequence[OutgoingMessage],
+    ) -> List[Optional[Exception]]:
+        """
+        Send messages over a single pooled connection.
+
+        If the server drops the connection, a new one is opened and the
+        current message is retried once. Connections that reach the
+        per-connection message cap are recycled mid-batch.
+
+        Args:
+            config: Email provider config identifying the relay
+            messages: (message, envelope recipients) pairs
+
+        Returns:
+            One entry per message: None if sent, else the exception it failed with
+        """
+        results: List[Optional[Exception]] = [None] * len(messages)
+        conn: Optional[_PooledConnection] = self._checkout(config)
+
+        try:
+            for index, (msg, recipients) in enumerate(messages):
+                for attempt in range(2):
+                    try:
+                        if conn is None:
+                            conn = self._connect(config)
+                            with self._lock:
+                                self.stats.reconnects += 1
+                        conn.server.send_message(msg, to_addrs=recipients)
+                        conn.messages_sent += 1
+                        break
+                    except Exception as e:
+                        if not is_connection_error(e):
+                            results[index] = e
+                            break
+                        if conn is not None:
+                            conn.close()
+                            conn = None
+                        if attempt == 1:
+                            results[index] = e
+
+                if conn is not None and conn.messages_sent >= config.smtp_max_messages_per_connection:
+                    conn.close()
+                    conn = None
+        finally:
+            self._checkin(config, conn)
+
+        failed = sum(1 for r in results if r is not None)
+        with self._lock:
+            self.stats.messages_sent += len(messages) - failed
+            self.stats.messages_failed += failed
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="smtp-sender",
+                )
+            return self._executor
+
+    async def send_messages(
+        self,
+        config: EmailProviderConfig,
+        messages: Sequence[OutgoingMessage],
+    ) -> List[Optional[Exception]]:
+        """Async wrapper running send_messages_sync on the SMTP thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            partial(self.send_messages_sync, config, list(messages)),
+        )
+
+    # ------------------------------------------
+    # Shutdown
+    # ------------------------------------------
+
+    def close(self) -> None:
+        """Close all idle connections and stop the SMTP thread pool."""
+        with self._lock:
+            self._closed = True
+            idle = [conn for pool in self._idle.values() for conn in pool]
+            self._idle.clear()
+            executor, self._executor = self._executor, None
+
+        for conn in idle:
+            conn.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        logger.debug(f"Closed SMTP pool ({len(idle)} idle connections)")
+
+
+# ============================================
+# Global Pool Access
+# ============================================
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Get the process-wide SMTP connection pool (thread-safe)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPConnectionPool()
+    return _pool
+
+
+def close_smtp_pool() -> None:
+    """Close the process-wide pool; the next get_smtp_pool() creates a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
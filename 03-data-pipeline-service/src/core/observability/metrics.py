@@ -1,6 +1,8 @@
 """
 Prometheus Metrics - Pipeline Observability
-Tracks pipeline executions, durations, active pipelines, and quota utilization.
+Tracks pipeline executions, durations, active pipelines, quota utilization,
+notification outbox delivery, metadata log flushing and shared HTTP
+connection reuse.
 """
 
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest
@@ -46,6 +48,73 @@ quota_utilization = Gauge(
     registry=metrics_registry
 )
 
+# Gauge: Undelivered notifications in the outbox per channel
+notification_outbox_depth = Gauge(
+    'notification_outbox_depth',
+    'Notifications queued or in flight in the outbox',
+    ['channel'],
+    registry=metrics_registry
+)
+
+# Counter: Notification outbox events by channel and outcome
+notification_deliveries_total = Counter(
+    'notification_deliveries_total',
+    'Notification outbox events (queued, deduplicated, delivered, retried, dead_lettered)',
+    ['channel', 'outcome'],
+    registry=metrics_registry
+)
+
+# Histogram: Time from enqueue to successful delivery
+notification_delivery_lag_seconds = Histogram(
+    'notification_delivery_lag_seconds',
+    'Seconds between enqueue and successful delivery',
+    ['channel'],
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 300, 900, 3600),  # 100ms to 1h
+    registry=metrics_registry
+)
+
+# Gauge: Metadata log rows buffered per table (all runs)
+metadata_log_pending_rows = Gauge(
+    'metadata_log_pending_rows',
+    'Metadata log rows waiting to be written',
+    ['table'],
+    registry=metrics_registry
+)
+
+# Histogram: Metadata log batch write latency
+metadata_log_flush_seconds = Histogram(
+    'metadata_log_flush_seconds',
+    'Seconds per metadata log batch write',
+    ['table', 'outcome'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),  # 50ms to 30s
+    registry=metrics_registry
+)
+
+# Histogram: Time a metadata log row waits before it is written
+metadata_log_queue_latency_seconds = Histogram(
+    'metadata_log_queue_latency_seconds',
+    'Seconds between queuing a metadata log row and writing it',
+    ['table'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30, 60),  # 10ms to 1m
+    registry=metrics_registry
+)
+
+# Counter: Metadata log rows by outcome
+metadata_log_rows_total = Counter(
+    'metadata_log_rows_total',
+    'Metadata log rows (written, spilled, replayed, shed, rejected)',
+    ['table', 'outcome'],
+    registry=metrics_registry
+)
+
+# Counter: Outbound HTTP requests through the shared pool, by connection reuse
+http_pool_requests_total = Counter(
+    'http_pool_requests_total',
+    'Outbound HTTP requests sent through the shared client pool',
+    ['host', 'connection'],
+    registry=metrics_registry
+)
+
 # ====================
 # Helper Functions
 # ====================
@@ -122,6 +191,96 @@ def set_quota_utilization(
     ).set(percentage)
 
 
+def set_notification_outbox_depth(channel: str, depth: int) -> None:
+    """
+    Set the number of undelivered notifications for a channel.
+
+    Args:
+        channel: Notification channel (email, slack, webhook)
+        depth: Queued + in-flight entries
+    """
+    notification_outbox_depth.labels(channel=channel).set(depth)
+
+
+def increment_notification_delivery(channel: str, outcome: str) -> None:
+    """
+    Increment notification outbox event counter.
+
+    Args:
+        channel: Notification channel (email, slack, webhook)
+        outcome: queued, deduplicated, delivered, retried, dead_lettered
+    """
+    notification_deliveries_total.labels(channel=channel, outcome=outcome).inc()
+
+
+def observe_notification_delivery_lag(channel: str, lag_seconds: float) -> None:
+    """
+    Record enqueue-to-delivery lag.
+
+    Args:
+        channel: Notification channel (email, slack, webhook)
+        lag_seconds: Seconds between enqueue and successful delivery
+    """
+    notification_delivery_lag_seconds.labels(channel=channel).observe(lag_seconds)
+
+
+def set_metadata_log_pending_rows(table: str, rows: int) -> None:
+    """
+    Set the number of buffered metadata log rows for a table.
+
+    Args:
+        table: Metadata table name (e.g. org_meta_step_logs)
+        rows: Rows waiting to be written
+    """
+    metadata_log_pending_rows.labels(table=table).set(rows)
+
+
+def observe_metadata_log_flush(table: str, outcome: str, seconds: float) -> None:
+    """
+    Record a metadata log batch write.
+
+    Args:
+        table: Metadata table name
+        outcome: success or failed
+        seconds: Write latency
+    """
+    metadata_log_flush_seconds.labels(table=table, outcome=outcome).observe(seconds)
+
+
+def observe_metadata_log_queue_latency(table: str, seconds: float) -> None:
+    """
+    Record how long a metadata log row waited before it was written.
+
+    Args:
+        table: Metadata table name
+        seconds: Queue-to-write latency
+    """
+    metadata_log_queue_latency_seconds.labels(table=table).observe(seconds)
+
+
+def increment_metadata_log_rows(table: str, outcome: str, count: int = 1) -> None:
+    """
+    Increment metadata log row counter.
+
+    Args:
+        table: Metadata table name
+        outcome: written, spilled, replayed, shed, rejected
+        count: Number of rows
+    """
+    metadata_log_rows_total.labels(table=table, outcome=outcome).inc(count)
+
+
+def increment_http_pool_request(host: str, connection: str) -> None:
+    """
+    Increment shared HTTP pool request counter.
+
+    Args:
+        host: Upstream host (e.g. api.openai.com)
+        connection: new (connection opened for the request), reused or failed
+    """
+    http_pool_requests_total.labels(host=host, connection=connection).inc()
+
+
 def get_metrics() -> bytes:
     """
     Generate Prometheus metrics in text format.
@@ -10,20 +10,21 @@ import asyncio
 import importlib
 import traceback
 import atexit
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Set, Tuple
 from datetime import datetime, timezone, date
 from pathlib import Path
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 
 from src.core.engine.bq_client import BigQueryClient, get_bigquery_client
+from src.core.engine.step_output import cleanup_run_outputs
 from src.core.pipeline.data_quality import DataQualityValidator
 from src.core.utils.logging import create_structured_logger
 from src.core.metadata import MetadataLogger
 from src.app.config import settings
 from src.core.utils.error_classifier import create_error_context, classify_error
-from src.core.abstractor.config_loader import get_config_loader
-from src.core.abstractor.models import PipelineConfig
+from src.core.pipeline.plan_cache import PipelinePlan, compile_dag, get_pipeline_plan_cache
+from src.core.pipeline.run_control import get_run_registry, get_run_status_writer
 from src.core.observability.metrics import (
     increment_pipeline_execution,
     observe_pipeline_duration,
@@ -224,6 +225,7 @@ class AsyncPipelineExecutor:
 
         # DAG for step dependencies
         self.step_dag: Dict[str, StepNode] = {}
+        self._execution_levels: Tuple[Tuple[str, ...], ...] = ()
 
         # Thread-safe storage for step execution results (keyed by step_id)
         # This replaces the problematic _last_step_result instance variable
@@ -265,24 +267,20 @@ class AsyncPipelineExecutor:
             ValueError: If config has invalid YAML or missing required fields
         """
         try:
-            # Use ConfigLoader with Pydantic validation
+            # Compiled plan (validated model, DAG, pre-parsed config) is cached per
+            # YAML file version; a run only renders its own copy of the config
             loop = asyncio.get_event_loop()
-            config_loader = get_config_loader()
-
-            # Load and validate config asynchronously
-            validated_config: PipelineConfig = await loop.run_in_executor(
+            plan: PipelinePlan = await loop.run_in_executor(
                 BQ_EXECUTOR,
-                config_loader.load_pipeline_config,
+                get_pipeline_plan_cache().get_plan,
                 self.org_slug,
                 self.pipeline_id
             )
 
             # Get pipeline directory for resolving relative paths
-            config_path_str = settings.find_pipeline_path(self.org_slug, self.pipeline_id)
-            self.pipeline_dir = Path(config_path_str).parent
+            self.pipeline_dir = Path(plan.path).parent
 
-            # Convert Pydantic model to dict for backward compatibility
-            config = validated_config.model_dump()
+            config = plan.render()
 
             # Inject runtime parameters
             if parameters:
@@ -296,8 +294,8 @@ class AsyncPipelineExecutor:
                 pipeline_dir=str(self.pipeline_dir)
             )
 
-            # Build DAG from validated config
-            self._build_dag(config.get('steps', []))
+            # DAG and execution levels come precompiled with the plan
+            self._set_dag(config.get('steps', []), plan.dependencies, plan.levels)
 
             return config
 
@@ -325,41 +323,32 @@ class AsyncPipelineExecutor:
         Args:
             steps: List of step configurations
         """
-        # Build DAG from step configurations
-        step_ids_in_order = []
+        _, dependencies, levels = compile_dag(steps)
+        self._set_dag(steps, dependencies, levels)
+
+    def _set_dag(
+        self,
+        steps: List[Dict[str, Any]],
+        dependencies: Mapping[str, FrozenSet[str]],
+        levels: Tuple[Tuple[str, ...], ...]
+    ) -> None:
+        """
+        Install step nodes for this run from resolved dependencies.
+
+        Args:
+            steps: Step configurations of this run's config
+            dependencies: Step ID -> IDs it depends on (implicit ones included)
+            levels: Execution levels from compile_dag
+        """
+        self.step_dag = {}
         for idx, step in enumerate(steps):
             node = StepNode(step, idx)
+            node.dependencies = set(dependencies[node.step_id])
             self.step_dag[node.step_id] = node
-            step_ids_in_order.append(node.step_id)
-
-        # Add dependencies (implicit or explicit)
-        for idx, step_id in enumerate(step_ids_in_order):
-            node = self.step_dag[step_id]
-            step_config = node.step_config
-            
-            # CASE 1: Explicit dependencies provided (even if empty list)
-            if 'depends_on' in step_config:
-                # Use what's provided. If it's [], it means "no dependencies" -> Parallel!
-                # Node init already set this from config, so we're good.
-                pass
-                
-            # CASE 2: No depends_on key at all -> Default to Sequential
-            # If step has no explicit depends_on key (not even empty list) and is not first,
-            # make it depend on the previous step
-            elif idx > 0:
-                prev_step_id = step_ids_in_order[idx - 1]
-                node.dependencies.add(prev_step_id)
-                self.logger.debug(
-                    f"Step '{step_id}' has no 'depends_on' key, "
-                    f"adding implicit dependency on '{prev_step_id}' for sequential execution"
-                )
-
-        # Validate all dependencies exist
         for step_id, node in self.step_dag.items():
             for dep_id in node.dependencies:
-                if dep_id not in self.step_dag:
-                    raise ValueError(f"Step {step_id} depends on unknown step {dep_id}")
                 self.step_dag[dep_id].dependents.add(step_id)
+        self._execution_levels = levels
 
         self.logger.info(
             f"Built DAG with {len(self.step_dag)} steps",
@@ -373,135 +362,59 @@ class AsyncPipelineExecutor:
         Returns:
             List of levels, where each level contains step IDs that can run in parallel
         """
-        levels = []
-        remaining = set(self.step_dag.keys())
-        completed = set()
-
-        while remaining:
-            # Find steps with all dependencies completed
-            current_level = [
-                step_id for step_id in remaining
-                if self.step_dag[step_id].dependencies.issubset(completed)
-            ]
-
-            if not current_level:
-                raise ValueError(f"Circular dependency detected in pipeline DAG")
-
-            levels.append(current_level)
-            completed.update(current_level)
-            remaining -= set(current_level)
+        levels = [list(level) for level in self._execution_levels]
 
         self.logger.info(
             f"Execution plan: {len(levels)} parallel levels",
-            levels=[[step_id for step_id in level] for level in levels]
+            levels=levels
         )
 
         return levels
 
     async def _check_cancellation(self) -> bool:
         """
-        Check if pipeline has been cancelled by querying BigQuery.
+        Check if pipeline has been cancelled.
+
+        Reads the in-process run registry: the cancel endpoint signals runs
+        in this process directly and the registry's shared status poll picks
+        up cancellations made through other instances (no query per check).
 
         Returns:
             True if pipeline should be cancelled, False otherwise
-
-        Raises:
-            Exception: Re-raises cancellation as an exception to stop execution
         """
-        from google.cloud import bigquery
-        from src.app.config import settings
-
-        try:
-            # Query current status from BigQuery
-            check_query = f"""
-            SELECT status
-            FROM `{settings.gcp_project_id}.organizations.org_meta_pipeline_runs`
-            WHERE pipeline_logging_id = @pipeline_logging_id
-              AND org_slug = @org_slug
-            """
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("pipeline_logging_id", "STRING", self.pipeline_logging_id),
-                    bigquery.ScalarQueryParameter("org_slug", "STRING", self.org_slug),
-                ]
-            )
-
-            loop = asyncio.get_event_loop()
-
-            def run_query():
-                job = self.bq_client.client.query(check_query, job_config=job_config)
-                return list(job.result())
-
-            rows = await loop.run_in_executor(BQ_EXECUTOR, run_query)
-
-            if rows:
-                current_status = rows[0]['status']
-                if current_status == 'CANCELLING':
-                    self.logger.info(
-                        f"Pipeline cancellation detected - stopping execution",
-                        pipeline_logging_id=self.pipeline_logging_id,
-                        tracking_pipeline_id=self.tracking_pipeline_id
-                    )
-                    return True
-
-            return False
-
-        except Exception as e:
-            # Don't fail the pipeline if cancellation check fails, just log it
-            self.logger.warning(
-                f"Failed to check cancellation status: {e}",
+        if get_run_registry().is_cancelled(self.pipeline_logging_id):
+            self.logger.info(
+                f"Pipeline cancellation detected - stopping execution",
                 pipeline_logging_id=self.pipeline_logging_id,
-                exc_info=True
+                tracking_pipeline_id=self.tracking_pipeline_id
             )
-            return False
+            return True
+        return False
 
     async def _update_pipeline_status_to_running(self) -> None:
         """
         Update the existing PENDING pipeline row to RUNNING status.
 
         The API endpoint creates an initial row with status='PENDING' for concurrency control.
-        This method updates that row to 'RUNNING' when actual execution begins.
+        This method updates that row to 'RUNNING' when actual execution begins. Runs starting
+        together share one UPDATE (see RunStatusWriter).
         """
-        from google.cloud import bigquery
-        from src.app.config import settings
-
         try:
-            # NOTE: org_meta_pipeline_runs is in CENTRAL organizations dataset, not per-org dataset
-            org_pipeline_runs_table = f"{settings.gcp_project_id}.organizations.org_meta_pipeline_runs"
-
-            update_query = f"""
-            UPDATE `{org_pipeline_runs_table}`
-            SET status = 'RUNNING'
-            WHERE pipeline_logging_id = @pipeline_logging_id
-              AND org_slug = @org_slug
-              AND status = 'PENDING'
-            """
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("pipeline_logging_id", "STRING", self.pipeline_logging_id),
-                    bigquery.ScalarQueryParameter("org_slug", "STRING", self.org_slug),
-                ]
+            updated = await get_run_status_writer().transition(
+                pipeline_logging_id=self.pipeline_logging_id,
+                org_slug=self.org_slug,
+                from_status="PENDING",
+                to_status="RUNNING"
             )
 
-            # Run update asynchronously
-            loop = asyncio.get_event_loop()
-
-            def run_query():
-                job = self.bq_client.client.query(update_query, job_config=job_config)
-                job.result()  # Wait for completion
-                return job  # Return the job object, not the result iterator
-
-            query_job = await loop.run_in_executor(BQ_EXECUTOR, run_query)
-
-            # Check if status update affected any rows
-            if query_job.num_dml_affected_rows == 0:
+            # Check if status update affected the run's row
+            if not updated:
                 raise RuntimeError(
                     f"Failed to update pipeline status to RUNNING - no rows affected. "
                     f"Pipeline {self.pipeline_logging_id} may not exist or status is not PENDING."
                 )
 
+            get_run_registry().set_status(self.pipeline_logging_id, "RUNNING")
             self.logger.info(
                 f"Updated pipeline status to RUNNING",
                 pipeline_logging_id=self.pipeline_logging_id,
@@ -709,6 +622,8 @@ class AsyncPipelineExecutor:
 
             self.start_time = datetime.now(timezone.utc)
             self.status = "RUNNING"
+            # Receive cancellation signals for this run (see _check_cancellation)
+            get_run_registry().register(self.pipeline_logging_id, self.org_slug)
             # Start metadata logger background workers
             await self.metadata_logger.start()
 
@@ -1047,6 +962,11 @@ class AsyncPipelineExecutor:
                         exc_info=True
                     )
 
+            get_run_registry().unregister(self.pipeline_logging_id)
+
+            # Remove spilled step outputs (Arrow files handed between steps)
+            cleanup_run_outputs(self.pipeline_logging_id)
+
             # FIX: Clean up BigQuery client resources (idempotent)
             # Thread pool cleaned up at app exit via atexit
             self._close_bq_client()
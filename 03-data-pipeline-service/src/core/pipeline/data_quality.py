@@ -1,8 +1,13 @@
 """
 Data Quality Validation
 Validate data using Great Expectations rules.
+
+Supported expectations are compiled into one aggregate BigQuery query over
+the full table/partition (see dq_compiler.py); the rest run through Great
+Expectations on a pandas sample.
 """
 
+import time
 import yaml
 import uuid
 from typing import Dict, Any, List, Optional
@@ -17,6 +22,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from google.api_core import exceptions as gcp_exceptions
 
 from src.core.engine.bq_client import get_bigquery_client
+from src.core.pipeline.dq_compiler import DQQueryPlan, compile_expectations, evaluate_plan, to_query_parameters
 from src.core.utils.logging import get_logger
 from src.app.config import settings
 
@@ -25,12 +31,22 @@ logger = get_logger(__name__)
 
 class DataQualityValidator:
     """
-    Validate data quality using Great Expectations.
+    Validate data quality using compiled SQL expectations and Great Expectations.
+
+    DQ config keys:
+        expectations: Great Expectations configs (expectation_type + kwargs)
+        engine: "sql" (default) compiles supported expectations into one
+            aggregate query; "pandas" runs everything on a sample
+        partition_column: Restrict validation to one partition (optional,
+            value passed to validate_table as partition_value)
+        sample_size: Rows sampled for the pandas path (default 10000)
     """
 
     def __init__(self):
         """Initialize data quality validator."""
         self.bq_client = get_bigquery_client()
+        # Bytes processed / elapsed time of the last compiled DQ query
+        self.last_query_stats: Dict[str, Any] = {}
 
     def validate_table(
         self,
@@ -38,7 +54,8 @@ class DataQualityValidator:
         dq_config_path: str,
         org_slug: str,
         pipeline_logging_id: str,
-        base_dir: Optional[Path] = None
+        base_dir: Optional[Path] = None,
+        partition_value: Any = None
     ) -> List[Dict[str, Any]]:
         """
         Validate a BigQuery table using DQ rules from YAML config.
@@ -49,6 +66,7 @@ class DataQualityValidator:
             org_slug: Organization identifier
             pipeline_logging_id: Pipeline run ID
             base_dir: Base directory for resolving relative paths (optional for backward compatibility)
+            partition_value: Value of the config's partition_column to validate (optional)
 
         Returns:
             List of validation results
@@ -60,12 +78,38 @@ class DataQualityValidator:
 
         # Load DQ config
         dq_config = self._load_dq_config(dq_config_path, base_dir)
+        expectations = dq_config.get('expectations', [])
+        partition_column = dq_config.get('partition_column') if partition_value is not None else None
+
+        # Compile supported expectations into one aggregate query
+        if dq_config.get('engine', 'sql') == 'sql':
+            plan = compile_expectations(table_id, expectations, partition_column, partition_value)
+        else:
+            plan = DQQueryPlan(sql=None, fallback=list(range(len(expectations))))
+
+        results_by_index: Dict[int, Dict[str, Any]] = {}
+        row_count = None
+        if plan.sql:
+            row = self._run_compiled_query(table_id, plan)
+            row_count = int(row['row_count'] or 0)
+            results_by_index.update(evaluate_plan(plan, row))
 
-        # Fetch data from BigQuery
-        df = self._fetch_table_data(table_id, dq_config.get('sample_size', 10000))
+        # Remaining expectations run on a pandas sample
+        df = None
+        if plan.fallback:
+            fallback_columns = self._referenced_columns([expectations[i] for i in plan.fallback])
+            df = self._fetch_table_data(
+                table_id,
+                dq_config.get('sample_size', 10000),
+                columns=fallback_columns,
+                partition_column=partition_column,
+                partition_value=partition_value
+            )
+            if row_count is None:
+                row_count = len(df)
 
         # Basic check: Ensure data is present
-        if len(df) == 0:
+        if row_count == 0:
             logger.warning(
                 f"No data found in table",
                 extra={"table_id": table_id}
@@ -78,15 +122,14 @@ class DataQualityValidator:
                 'error': 'Table is empty - no data to validate'
             }]
 
-        # Create Great Expectations dataset
-        ge_dataset = PandasDataset(df)
-
-        # Run expectations
-        results = []
-        for expectation in dq_config.get('expectations', []):
-            result = self._run_expectation(ge_dataset, expectation)
-            results.append(result)
+        if df is not None:
+            # Create Great Expectations dataset
+            ge_dataset = PandasDataset(df)
+            for index in plan.fallback:
+                results_by_index[index] = self._run_expectation(ge_dataset, expectations[index])
 
+        results = [results_by_index[index] for index in range(len(expectations))]
+        for result in results:
             # Log result
             if result['success']:
                 logger.info(f"DQ check passed: {result['expectation_type']}")
@@ -145,13 +188,76 @@ class DataQualityValidator:
             except Exception as cleanup_error:
                 logger.error(f"Error closing DQ config file: {cleanup_error}", exc_info=True)
 
-    def _fetch_table_data(self, table_id: str, sample_size: int = 10000) -> pd.DataFrame:
+    def _run_compiled_query(self, table_id: str, plan: DQQueryPlan) -> Dict[str, Any]:
+        """
+        Run a compiled DQ plan and return its single aggregate row.
+
+        Args:
+            table_id: Fully qualified table ID (for logging)
+            plan: Compiled plan with sql and params
+
+        Returns:
+            Aggregate row as a dict
+        """
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(query_parameters=to_query_parameters(plan.params))
+        start = time.perf_counter()
+        query_job = self.bq_client.client.query(plan.sql, job_config=job_config)
+        row = dict(next(iter(query_job.result())))
+
+        self.last_query_stats = {
+            "bytes_processed": query_job.total_bytes_processed,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+            "columns": list(plan.columns),
+            "expectations": len(plan.compiled),
+        }
+        logger.info(
+            f"Ran {len(plan.compiled)} compiled DQ expectations in one query",
+            extra={"table_id": table_id, **self.last_query_stats}
+        )
+        return row
+
+    @staticmethod
+    def _referenced_columns(expectations: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Columns read by expectations, or None if any may need other columns.
+
+        Args:
+            expectations: Expectation configs
+
+        Returns:
+            Sorted column names, or None to select all columns
+        """
+        columns = set()
+        for expectation in expectations:
+            kwargs = expectation.get('kwargs', {}) or {}
+            found = [kwargs[key] for key in ('column', 'column_A', 'column_B') if key in kwargs]
+            found += list(kwargs.get('column_list') or [])
+            if not found and not expectation.get('expectation_type', '').startswith('expect_table_row_count'):
+                return None
+            columns.update(found)
+        if not all(isinstance(c, str) for c in columns):
+            return None
+        return sorted(columns)
+
+    def _fetch_table_data(
+        self,
+        table_id: str,
+        sample_size: int = 10000,
+        columns: Optional[List[str]] = None,
+        partition_column: Optional[str] = None,
+        partition_value: Any = None
+    ) -> pd.DataFrame:
         """
         Fetch data from BigQuery table for validation.
 
         Args:
             table_id: Fully qualified table ID
             sample_size: Number of rows to sample (None for all)
+            columns: Columns to read (None for all)
+            partition_column: Restrict to one partition (optional)
+            partition_value: Value of partition_column
 
         Returns:
             Pandas DataFrame
@@ -162,16 +268,17 @@ class DataQualityValidator:
         # SECURITY FIX: Use parameterized query to prevent SQL injection
         # Note: table_id is a system identifier (not user input) but we validate it properly
         # For table names, we use backticks which is safe, but we parameterize LIMIT value
+        sanitize = SQLParameterInjector.sanitize_identifier
+        select_list = ", ".join(f"`{sanitize(c)}`" for c in columns) if columns else "*"
+        query = f"SELECT {select_list} FROM `{table_id}`"
+        query_parameters = []
+        if partition_column:
+            query += f" WHERE `{sanitize(partition_column)}` = @partition_value"
+            query_parameters.append(SQLParameterInjector._create_scalar_parameter("partition_value", partition_value))
         if sample_size:
-            query = f"SELECT * FROM `{table_id}` LIMIT @sample_size"
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("sample_size", "INT64", sample_size)
-                ]
-            )
-        else:
-            query = f"SELECT * FROM `{table_id}`"
-            job_config = None
+            query += " LIMIT @sample_size"
+            query_parameters.append(bigquery.ScalarQueryParameter("sample_size", "INT64", sample_size))
+        job_config = bigquery.QueryJobConfig(query_parameters=query_parameters) if query_parameters else None
 
         query_job = None
         df = None
@@ -0,0 +1,323 @@
+"""
+Data Quality Expectation Compiler
+Compile Great Expectations rules into one aggregate BigQuery query.
+
+Instead of pulling a sample into pandas, supported expectations are turned
+into COUNTIF aggregates evaluated over the full table (or partition) in a
+single query that reads only the referenced columns. Results keep the shape
+of Great Expectations' BASIC result format (element_count, missing_count,
+unexpected_count, ...) so stored DQ results look the same either way.
+
+Supported expectations:
+- expect_column_values_to_not_be_null
+- expect_column_values_to_be_in_set
+- expect_column_values_to_be_between (numeric bounds)
+- expect_column_values_to_be_unique
+- expect_column_values_to_match_regex
+- expect_table_row_count_to_be_between / expect_table_row_count_to_equal
+
+Anything else (other expectation types, unknown kwargs, non-numeric bounds,
+mixed-type value sets) is left for the pandas/Great Expectations path.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional
+
+from src.core.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Column names are interpolated into SQL; only plain identifiers are compiled
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Kwargs that do not change what an expectation checks
+_IGNORED_KWARGS = {"result_format", "include_config", "catch_exceptions", "meta"}
+
+_COLUMN_MAP_KWARGS = {
+    "expect_column_values_to_not_be_null": {"column", "mostly"},
+    "expect_column_values_to_be_in_set": {"column", "value_set", "mostly"},
+    "expect_column_values_to_be_between": {"column", "min_value", "max_value", "strict_min", "strict_max", "mostly"},
+    "expect_column_values_to_be_unique": {"column", "mostly"},
+    "expect_column_values_to_match_regex": {"column", "regex", "mostly"},
+}
+
+_TABLE_KWARGS = {
+    "expect_table_row_count_to_be_between": {"min_value", "max_value"},
+    "expect_table_row_count_to_equal": {"value"},
+}
+
+SUPPORTED_EXPECTATIONS = frozenset(_COLUMN_MAP_KWARGS) | frozenset(_TABLE_KWARGS)
+
+_SCALAR_TYPES = (bool, int, float, str, Decimal, date)
+
+
+# ============================================
+# Query Plan
+# ============================================
+
+@dataclass
+class CompiledExpectation:
+    """An expectation evaluated from aggregate columns of the DQ query."""
+    index: int
+    expectation_type: str
+    kwargs: Dict[str, Any]
+    column: Optional[str] = None
+    unexpected_alias: Optional[str] = None
+    nonnull_alias: Optional[str] = None
+
+
+@dataclass
+class DQQueryPlan:
+    """One aggregate query for all compiled expectations of a DQ config."""
+    sql: Optional[str]
+    params: Dict[str, Any] = field(default_factory=dict)
+    columns: List[str] = field(default_factory=list)
+    compiled: List[CompiledExpectation] = field(default_factory=list)
+    fallback: List[int] = field(default_factory=list)
+
+
+def _quote(column: str) -> str:
+    return f"`{column}`"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _is_supported(expectation_type: str, kwargs: Dict[str, Any]) -> bool:
+    """Whether an expectation can be compiled with these kwargs."""
+    allowed = _COLUMN_MAP_KWARGS.get(expectation_type) or _TABLE_KWARGS.get(expectation_type)
+    if allowed is None or set(kwargs) - allowed - _IGNORED_KWARGS:
+        return False
+
+    if expectation_type in _COLUMN_MAP_KWARGS:
+        column = kwargs.get("column")
+        if not isinstance(column, str) or not _IDENTIFIER.match(column):
+            return False
+        mostly = kwargs.get("mostly")
+        if mostly is not None and not (_is_number(mostly) and 0 <= mostly <= 1):
+            return False
+
+    if expectation_type == "expect_column_values_to_be_in_set":
+        value_set = kwargs.get("value_set")
+        if not isinstance(value_set, (list, tuple, set)) or not value_set:
+            return False
+        # One BigQuery array type per value set
+        kinds = {"number" if _is_number(v) else type(v) for v in value_set}
+        return len(kinds) == 1 and all(isinstance(v, _SCALAR_TYPES) for v in value_set)
+
+    if expectation_type in ("expect_column_values_to_be_between", "expect_table_row_count_to_be_between"):
+        bounds = [kwargs.get("min_value"), kwargs.get("max_value")]
+        return any(b is not None for b in bounds) and all(b is None or _is_number(b) for b in bounds)
+
+    if expectation_type == "expect_table_row_count_to_equal":
+        return _is_number(kwargs.get("value"))
+
+    if expectation_type == "expect_column_values_to_match_regex":
+        return isinstance(kwargs.get("regex"), str)
+
+    return True
+
+
+def compile_expectations(
+    table_id: str,
+    expectations: List[Dict[str, Any]],
+    partition_column: Optional[str] = None,
+    partition_value: Any = None
+) -> DQQueryPlan:
+    """
+    Compile expectations into one aggregate query.
+
+    Args:
+        table_id: Fully qualified table ID (project.dataset.table)
+        expectations: Expectation configs from the DQ YAML
+        partition_column: Column restricting the scan to one partition (optional)
+        partition_value: Value of partition_column to validate
+
+    Returns:
+        DQQueryPlan; sql is None when nothing could be compiled
+    """
+    plan = DQQueryPlan(sql=None)
+    aggregates = ["COUNT(*) AS row_count"]
+    window_columns: List[str] = []
+    nonnull_aliases: Dict[str, str] = {}
+
+    def reference(column: str) -> str:
+        if column not in nonnull_aliases:
+            nonnull_aliases[column] = f"c{len(nonnull_aliases)}_nonnull"
+            plan.columns.append(column)
+            aggregates.append(f"COUNTIF({_quote(column)} IS NOT NULL) AS {nonnull_aliases[column]}")
+        return nonnull_aliases[column]
+
+    for index, expectation in enumerate(expectations):
+        expectation_type = expectation.get("expectation_type", "")
+        kwargs = expectation.get("kwargs", {}) or {}
+        if not _is_supported(expectation_type, kwargs):
+            plan.fallback.append(index)
+            continue
+
+        compiled = CompiledExpectation(index=index, expectation_type=expectation_type, kwargs=kwargs)
+        plan.compiled.append(compiled)
+        if expectation_type in _TABLE_KWARGS:
+            continue
+
+        column = kwargs["column"]
+        col = _quote(column)
+        compiled.column = column
+        compiled.nonnull_alias = reference(column)
+        compiled.unexpected_alias = f"e{index}_unexpected"
+
+        if expectation_type == "expect_column_values_to_not_be_null":
+            condition = f"{col} IS NULL"
+        elif expectation_type == "expect_column_values_to_be_in_set":
+            param = f"e{index}_value_set"
+            plan.params[param] = list(kwargs["value_set"])
+            condition = f"{col} IS NOT NULL AND {col} NOT IN UNNEST(@{param})"
+        elif expectation_type == "expect_column_values_to_be_between":
+            checks = []
+            for bound, strict, op, strict_op in (("min_value", "strict_min", ">=", ">"), ("max_value", "strict_max", "<=", "<")):
+                if kwargs.get(bound) is not None:
+                    param = f"e{index}_{bound}"
+                    plan.params[param] = kwargs[bound]
+                    checks.append(f"{col} {strict_op if kwargs.get(strict) else op} @{param}")
+            condition = f"{col} IS NOT NULL AND NOT ({' AND '.join(checks)})"
+        elif expectation_type == "expect_column_values_to_be_unique":
+            # Every row whose value occurs more than once is unexpected
+            occurrences = f"e{index}_occurrences"
+            window_columns.append(f"COUNT({col}) OVER (PARTITION BY {col}) AS {occurrences}")
+            condition = f"{occurrences} > 1"
+        else:  # expect_column_values_to_match_regex
+            param = f"e{index}_regex"
+            plan.params[param] = kwargs["regex"]
+            condition = f"{col} IS NOT NULL AND NOT REGEXP_CONTAINS(CAST({col} AS STRING), @{param})"
+
+        aggregates.append(f"COUNTIF({condition}) AS {compiled.unexpected_alias}")
+
+    if not plan.compiled:
+        return plan
+
+    source = f"`{table_id}`"
+    if partition_column is not None:
+        if not _IDENTIFIER.match(partition_column):
+            raise ValueError(f"Invalid partition column: {partition_column}")
+        plan.params["partition_value"] = partition_value
+        source += f"\nWHERE {_quote(partition_column)} = @partition_value"
+
+    if window_columns:
+        # Window counts need a subquery; it still reads only referenced columns
+        inner_columns = [_quote(c) for c in plan.columns] + window_columns
+        source = f"(\n  SELECT {', '.join(inner_columns)}\n  FROM {source}\n)"
+
+    plan.sql = "SELECT\n  " + ",\n  ".join(aggregates) + f"\nFROM {source}"
+    return plan
+
+
+def to_query_parameters(params: Mapping[str, Any]) -> List[Any]:
+    """
+    Build BigQuery query parameters for a plan (arrays for value sets).
+
+    Args:
+        params: DQQueryPlan.params
+
+    Returns:
+        List of ScalarQueryParameter / ArrayQueryParameter
+    """
+    from google.cloud import bigquery
+    from src.core.utils.sql_params import SQLParameterInjector
+
+    query_parameters = []
+    for name, value in params.items():
+        if isinstance(value, list):
+            converted = [SQLParameterInjector._infer_type_and_convert(v) for v in value]
+            array_type = "FLOAT64" if any(t == "FLOAT64" for t, _ in converted) else converted[0][0]
+            values = [float(v) if array_type == "FLOAT64" else v for _, v in converted]
+            query_parameters.append(bigquery.ArrayQueryParameter(name, array_type, values))
+        else:
+            query_parameters.append(SQLParameterInjector._create_scalar_parameter(name, value))
+    return query_parameters
+
+
+# ============================================
+# Result Evaluation
+# ============================================
+
+def _percent(count: int, total: int) -> Optional[float]:
+    return count / total * 100 if total else None
+
+
+def _column_map_result(compiled: CompiledExpectation, row: Mapping[str, Any]) -> Dict[str, Any]:
+    element_count = int(row["row_count"] or 0)
+    nonnull_count = int(row[compiled.nonnull_alias] or 0)
+    unexpected_count = int(row[compiled.unexpected_alias] or 0)
+    missing_count = element_count - nonnull_count
+    mostly = compiled.kwargs.get("mostly")
+
+    if compiled.expectation_type == "expect_column_values_to_not_be_null":
+        # Nulls are the unexpected values; percentages are over all rows
+        details = {
+            "element_count": element_count,
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": _percent(unexpected_count, element_count),
+            "unexpected_percent_total": _percent(unexpected_count, element_count),
+        }
+        checked = element_count
+    else:
+        details = {
+            "element_count": element_count,
+            "missing_count": missing_count,
+            "missing_percent": _percent(missing_count, element_count),
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": _percent(unexpected_count, nonnull_count),
+            "unexpected_percent_total": _percent(unexpected_count, element_count),
+            "unexpected_percent_nonmissing": _percent(unexpected_count, nonnull_count),
+        }
+        checked = nonnull_count
+
+    if checked == 0:
+        success = True
+    elif mostly is None:
+        success = unexpected_count == 0
+    else:
+        success = (checked - unexpected_count) / checked >= mostly
+    return {"success": success, "details": details}
+
+
+def _table_result(compiled: CompiledExpectation, row: Mapping[str, Any]) -> Dict[str, Any]:
+    observed = int(row["row_count"] or 0)
+    if compiled.expectation_type == "expect_table_row_count_to_equal":
+        success = observed == compiled.kwargs["value"]
+    else:
+        min_value = compiled.kwargs.get("min_value")
+        max_value = compiled.kwargs.get("max_value")
+        success = (min_value is None or observed >= min_value) and (max_value is None or observed <= max_value)
+    return {"success": success, "details": {"observed_value": observed}}
+
+
+def evaluate_plan(plan: DQQueryPlan, row: Mapping[str, Any]) -> Dict[int, Dict[str, Any]]:
+    """
+    Turn the aggregate row of a plan's query into expectation results.
+
+    Args:
+        plan: Compiled plan
+        row: The single result row of plan.sql
+
+    Returns:
+        Results keyed by expectation index, in the validator's result format
+    """
+    results = {}
+    for compiled in plan.compiled:
+        if compiled.expectation_type in _TABLE_KWARGS:
+            outcome = _table_result(compiled, row)
+        else:
+            outcome = _column_map_result(compiled, row)
+        results[compiled.index] = {
+            "expectation_type": compiled.expectation_type,
+            "success": outcome["success"],
+            "details": outcome["details"],
+            "kwargs": compiled.kwargs,
+            "engine": "sql",
+        }
+    return results
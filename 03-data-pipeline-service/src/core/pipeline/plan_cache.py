@@ -0,0 +1,382 @@
+"""
+Pipeline Plan Cache
+
+Compiles each pipeline YAML once per file version into a PipelinePlan:
+- the Pydantic-validated PipelineConfig
+- the DAG (implicit sequential dependencies applied) and its execution
+  levels in ready-queue order
+- the config as a pre-parsed template (CompiledTemplate), so a run only
+  renders a fresh copy / substitutes parameters
+
+Entries are keyed by the YAML file and revalidated with a stat() per
+lookup: a changed mtime/size triggers a content hash, and the plan is only
+recompiled when the content actually changed. (org_slug, pipeline_id) ->
+path lookups (a directory search) are reused for path_ttl_seconds.
+
+When watchfiles is installed, start_watching() drops plans and path lookups
+as soon as files under configs_base_path change.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+import yaml
+
+from src.app.config import settings
+from src.core.abstractor.models import PipelineConfig
+from src.core.pipeline.template_resolver import CompiledTemplate, compile_template, load_template
+
+try:
+    from watchfiles import awatch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    awatch = None
+    WATCHFILES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+_YAML_SUFFIXES = (".yml", ".yaml")
+
+
+# ============================================
+# Plan
+# ============================================
+
+@dataclass(frozen=True)
+class FileVersion:
+    """Cheap change detector for a config file."""
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def of(cls, path: str) -> "FileVersion":
+        stat = os.stat(path)
+        return cls(stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class PipelinePlan:
+    """Compiled, validated pipeline config shared by every run of a file version."""
+    path: str
+    version: FileVersion
+    digest: str
+    model: PipelineConfig
+    template: CompiledTemplate
+    step_ids: Tuple[str, ...]
+    dependencies: Mapping[str, FrozenSet[str]]
+    levels: Tuple[Tuple[str, ...], ...]
+
+    def render(self, variables: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """Fresh config dict for one run (safe to mutate)."""
+        return self.template.render(variables)
+
+
+def compile_dag(
+    steps: List[Dict[str, Any]],
+) -> Tuple[Tuple[str, ...], Dict[str, FrozenSet[str]], Tuple[Tuple[str, ...], ...]]:
+    """
+    Resolve step dependencies and execution levels.
+
+    A step without a depends_on key depends on the previous step
+    (sequential by default); depends_on: [] makes it a parallel root.
+
+    Returns:
+        (step_ids in config order, dependencies per step, levels)
+
+    Raises:
+        ValueError: On unknown dependencies or cycles
+    """
+    step_ids = tuple(step["step_id"] for step in steps)
+    dependencies: Dict[str, FrozenSet[str]] = {}
+    for idx, step in enumerate(steps):
+        if "depends_on" in step:
+            deps = frozenset(step.get("depends_on") or [])
+        elif idx > 0:
+            deps = frozenset([step_ids[idx - 1]])
+        else:
+            deps = frozenset()
+        for dep_id in deps:
+            if dep_id not in step_ids:
+                raise ValueError(f"Step {step['step_id']} depends on unknown step {dep_id}")
+        dependencies[step["step_id"]] = deps
+
+    levels: List[Tuple[str, ...]] = []
+    completed: set = set()
+    remaining = list(step_ids)
+    while remaining:
+        # Config order within a level keeps plans deterministic
+        level = tuple(step_id for step_id in remaining if dependencies[step_id] <= completed)
+        if not level:
+            raise ValueError("Circular dependency detected in pipeline DAG")
+        levels.append(level)
+        completed.update(level)
+        remaining = [step_id for step_id in remaining if step_id not in completed]
+
+    return step_ids, dependencies, tuple(levels)
+
+
+def _compile_plan(path: str, version: FileVersion, data: bytes, digest: str) -> PipelinePlan:
+    config_dict = yaml.safe_load(data)
+    if not isinstance(config_dict, dict):
+        raise ValueError(f"Pipeline config is empty or invalid: {path}")
+    model = PipelineConfig(**config_dict)
+    config = model.model_dump()
+    step_ids, dependencies, levels = compile_dag(config.get("steps", []))
+    return PipelinePlan(
+        path=path,
+        version=version,
+        digest=digest,
+        model=model,
+        template=compile_template(config),
+        step_ids=step_ids,
+        dependencies=dependencies,
+        levels=levels,
+    )
+
+
+# ============================================
+# Cache
+# ============================================
+
+@dataclass
+class PlanCacheStats:
+    hits: int = 0
+    misses: int = 0
+    compiles: int = 0
+    # File touched (mtime changed) but content identical: no recompile
+    revalidations: int = 0
+    invalidations: int = 0
+    path_lookups: int = 0
+
+
+@dataclass(frozen=True)
+class _TemplateEntry:
+    version: FileVersion
+    template: CompiledTemplate
+
+
+class PipelinePlanCache:
+    """
+    Process-wide cache of compiled pipeline plans and templates.
+
+    Args:
+        path_ttl_seconds: Reuse of (org_slug, pipeline_id) -> path lookups
+        max_entries: Plans (and templates) kept, least recently used evicted
+    """
+
+    def __init__(self, path_ttl_seconds: Optional[float] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path_ttl_seconds = (
+            settings.pipeline_plan_path_ttl_seconds if path_ttl_seconds is None else path_ttl_seconds
+        )
+        self.max_entries = max_entries
+        self.stats = PlanCacheStats()
+        self._plans: "OrderedDict[str, PipelinePlan]" = OrderedDict()
+        self._templates: "OrderedDict[str, _TemplateEntry]" = OrderedDict()
+        self._paths: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def get_plan(self, org_slug: str, pipeline_id: str) -> PipelinePlan:
+        """
+        Plan for an org's pipeline (org-specific YAML or shared template).
+
+        Raises:
+            FileNotFoundError: If no pipeline YAML matches
+            ValueError / ValidationError: If the YAML is invalid
+        """
+        path = self.resolve_path(org_slug, pipeline_id)
+        try:
+            return self.get_plan_for_path(path)
+        except FileNotFoundError:
+            # File moved or deleted since the lookup was cached
+            self._forget_path(org_slug, pipeline_id)
+            return self.get_plan_for_path(self.resolve_path(org_slug, pipeline_id))
+
+    def get_plan_for_path(self, path: str) -> PipelinePlan:
+        """Plan for a pipeline YAML file, recompiled only when its content changed."""
+        path = os.path.abspath(path)
+        version = FileVersion.of(path)
+        with self._lock:
+            cached = self._plans.get(path)
+            if cached is not None and cached.version == version:
+                self._plans.move_to_end(path)
+                self.stats.hits += 1
+                return cached
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if cached is not None and cached.digest == digest:
+            plan = replace(cached, version=version)
+            with self._lock:
+                self.stats.revalidations += 1
+                self._store(self._plans, path, plan)
+            return plan
+
+        plan = _compile_plan(path, version, data, digest)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.compiles += 1
+            self._store(self._plans, path, plan)
+        logger.info(
+            f"Compiled pipeline plan: {plan.model.pipeline_id}",
+            extra={"path": path, "num_steps": len(plan.step_ids), "levels": len(plan.levels)}
+        )
+        return plan
+
+    def get_template(self, template_path: str) -> CompiledTemplate:
+        """
+        Compiled YAML template (see template_resolver.resolve_template).
+
+        Raises:
+            FileNotFoundError: If template file doesn't exist
+            ValueError: If the file is empty
+        """
+        path = os.path.abspath(template_path)
+        try:
+            version = FileVersion.of(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+
+        with self._lock:
+            cached = self._templates.get(path)
+            if cached is not None and cached.version == version:
+                self._templates.move_to_end(path)
+                self.stats.hits += 1
+                return cached.template
+
+        template = compile_template(load_template(path))
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.compiles += 1
+            self._store(self._templates, path, _TemplateEntry(version, template))
+        return template
+
+    def resolve_path(self, org_slug: str, pipeline_id: str) -> str:
+        """Absolute YAML path of an org's pipeline (settings.find_pipeline_path, cached)."""
+        key = (org_slug, pipeline_id)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._paths.get(key)
+            if cached is not None and now - cached[1] < self.path_ttl_seconds:
+                return cached[0]
+
+        path = os.path.abspath(settings.find_pipeline_path(org_slug, pipeline_id))
+        with self._lock:
+            self.stats.path_lookups += 1
+            if len(self._paths) >= self.max_entries * 4:
+                self._paths.clear()
+            self._paths[key] = (path, now)
+        return path
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drop cached plans/templates for a file (all files when path is None).
+
+        Path lookups are always dropped: a new file can change which YAML
+        an (org, pipeline) pair resolves to.
+        """
+        with self._lock:
+            if path is None:
+                dropped = len(self._plans) + len(self._templates)
+                self._plans.clear()
+                self._templates.clear()
+            else:
+                path = os.path.abspath(path)
+                dropped = int(self._plans.pop(path, None) is not None)
+                dropped += int(self._templates.pop(path, None) is not None)
+            self._paths.clear()
+            self.stats.invalidations += dropped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        with self._lock:
+            total = self.stats.hits + self.stats.misses
+            return {
+                **self.stats.__dict__,
+                "plans": len(self._plans),
+                "templates": len(self._templates),
+                "cached_paths": len(self._paths),
+                "hit_rate_percent": round(self.stats.hits / total * 100, 2) if total else 0,
+                "watching": self._watch_task is not None and not self._watch_task.done(),
+            }
+
+    # ============================================
+    # File watching
+    # ============================================
+
+    def start_watching(self, root: Optional[str] = None) -> bool:
+        """
+        Invalidate entries when YAML files under root change (needs watchfiles).
+
+        Returns:
+            True if a watcher was started
+        """
+        if not WATCHFILES_AVAILABLE:
+            logger.info("watchfiles not installed - pipeline plans revalidated by file stat only")
+            return False
+        if self._watch_task is not None and not self._watch_task.done():
+            return True
+        root = os.path.abspath(root or settings.configs_base_path)
+        self._watch_task = asyncio.create_task(self._watch(root))
+        return True
+
+    async def stop_watching(self) -> None:
+        """Stop the file watcher."""
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        await asyncio.gather(self._watch_task, return_exceptions=True)
+        self._watch_task = None
+
+    async def _watch(self, root: str) -> None:
+        logger.info(f"Watching {root} for pipeline config changes")
+        async for changes in awatch(root, recursive=True):
+            for _, changed_path in changes:
+                if changed_path.endswith(_YAML_SUFFIXES):
+                    self.invalidate(changed_path)
+            logger.debug(f"Pipeline config change detected: {len(changes)} file(s)")
+
+    # ============================================
+    # Internals
+    # ============================================
+
+    def _forget_path(self, org_slug: str, pipeline_id: str) -> None:
+        with self._lock:
+            self._paths.pop((org_slug, pipeline_id), None)
+
+    def _store(self, entries: "OrderedDict[str, Any]", path: str, value: Any) -> None:
+        entries[path] = value
+        entries.move_to_end(path)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+# Global singleton instance
+_plan_cache: Optional[PipelinePlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_pipeline_plan_cache() -> PipelinePlanCache:
+    """Get or create the process-wide PipelinePlanCache."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = PipelinePlanCache()
+    return _plan_cache
+
+
+def reset_pipeline_plan_cache() -> None:
+    """Drop the singleton (tests)."""
+    global _plan_cache
+    _plan_cache = None
@@ -0,0 +1,423 @@
+"""
+Pipeline Run Control
+
+Process-wide bookkeeping for the pipeline runs executing in this worker:
+
+- RunRegistry: cancellation as a push signal. The cancel endpoint calls
+  request_cancel(), which flags the run immediately when it executes in this
+  process. Runs cancelled through another instance are picked up by one
+  shared status poll for all active runs (every cancel_poll_interval_seconds)
+  instead of a SELECT per run before every DAG level. Executors only read
+  the in-memory flag.
+- RunStatusWriter: status transitions (e.g. PENDING -> RUNNING) requested
+  within linger_ms are coalesced into a single UPDATE of
+  org_meta_pipeline_runs per (from_status, to_status). The UPDATE reports
+  which runs it moved, so each caller gets its own outcome.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CANCEL_REQUESTED_STATUS = "CANCELLING"
+
+# (pipeline_logging_ids) -> {pipeline_logging_id: (org_slug, status)}
+StatusFetcher = Callable[[Sequence[str]], Dict[str, Tuple[str, str]]]
+# (from_status, to_status, pipeline_logging_ids, org_slugs) -> ids of the runs moved
+StatusUpdater = Callable[[str, str, Sequence[str], Sequence[str]], Collection[str]]
+
+
+def _runs_table() -> str:
+    # NOTE: org_meta_pipeline_runs is in CENTRAL organizations dataset, not per-org dataset
+    return f"{settings.gcp_project_id}.organizations.org_meta_pipeline_runs"
+
+
+def fetch_run_statuses(pipeline_logging_ids: Sequence[str]) -> Dict[str, Tuple[str, str]]:
+    """Current status of several runs in one query (blocking)."""
+    from google.cloud import bigquery
+    from src.core.engine.bq_client import get_bigquery_client
+
+    query = f"""
+    SELECT pipeline_logging_id, org_slug, status
+    FROM `{_runs_table()}`
+    WHERE pipeline_logging_id IN UNNEST(@pipeline_logging_ids)
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ArrayQueryParameter("pipeline_logging_ids", "STRING", list(pipeline_logging_ids)),
+        ]
+    )
+    rows = get_bigquery_client().client.query(query, job_config=job_config).result()
+    return {row["pipeline_logging_id"]: (row["org_slug"], row["status"]) for row in rows}
+
+
+def update_run_statuses(
+    from_status: str,
+    to_status: str,
+    pipeline_logging_ids: Sequence[str],
+    org_slugs: Sequence[str],
+) -> List[str]:
+    """
+    Move several runs from one status to another with one DML UPDATE (blocking).
+
+    The matching runs are selected and updated in one transaction, so the
+    returned ids are exactly the rows the UPDATE changed.
+
+    Returns:
+        pipeline_logging_ids of the runs moved to to_status
+    """
+    from google.cloud import bigquery
+    from src.core.engine.bq_client import get_bigquery_client
+
+    query = f"""
+    BEGIN TRANSACTION;
+    CREATE TEMP TABLE matched AS
+    SELECT pipeline_logging_id
+    FROM `{_runs_table()}`
+    WHERE pipeline_logging_id IN UNNEST(@pipeline_logging_ids)
+      AND org_slug IN UNNEST(@org_slugs)
+      AND status = @from_status;
+    UPDATE `{_runs_table()}`
+    SET status = @to_status
+    WHERE pipeline_logging_id IN (SELECT pipeline_logging_id FROM matched)
+      AND org_slug IN UNNEST(@org_slugs)
+      AND status = @from_status;
+    COMMIT TRANSACTION;
+    SELECT pipeline_logging_id FROM matched;
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("from_status", "STRING", from_status),
+            bigquery.ScalarQueryParameter("to_status", "STRING", to_status),
+            bigquery.ArrayQueryParameter("pipeline_logging_ids", "STRING", list(pipeline_logging_ids)),
+            bigquery.ArrayQueryParameter("org_slugs", "STRING", sorted(set(org_slugs))),
+        ]
+    )
+    rows = get_bigquery_client().client.query(query, job_config=job_config).result()
+    return [row.pipeline_logging_id for row in rows]
+
+
+# ============================================
+# Cancellation registry
+# ============================================
+
+@dataclass
+class RunHandle:
+    """A pipeline run executing in this process."""
+    pipeline_logging_id: str
+    org_slug: str
+    status: Optional[str] = None
+    cancel_source: Optional[str] = None
+    cancelled: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+
+@dataclass
+class RunControlStats:
+    registered: int = 0
+    push_cancels: int = 0
+    poll_cancels: int = 0
+    polls: int = 0
+    poll_errors: int = 0
+    status_updates: int = 0
+    coalesced_transitions: int = 0
+
+
+class RunRegistry:
+    """
+    In-process registry of active runs with push-based cancellation.
+
+    Args:
+        poll_interval_seconds: Interval of the shared status poll
+        fetcher: Blocking batch status lookup (defaults to BigQuery)
+    """
+
+    def __init__(
+        self,
+        poll_interval_seconds: Optional[float] = None,
+        fetcher: Optional[StatusFetcher] = None,
+    ):
+        self.poll_interval_seconds = (
+            settings.pipeline_cancel_poll_interval_seconds
+            if poll_interval_seconds is None else poll_interval_seconds
+        )
+        self._fetcher = fetcher or fetch_run_statuses
+        self._runs: Dict[str, RunHandle] = {}
+        self._lock = threading.Lock()
+        self._poll_task: Optional[asyncio.Task] = None
+        self.stats = RunControlStats()
+
+    def register(self, pipeline_logging_id: str, org_slug: str) -> RunHandle:
+        """Track a run; starts the shared status poll if it isn't running."""
+        with self._lock:
+            handle = self._runs.get(pipeline_logging_id)
+            if handle is None:
+                handle = RunHandle(pipeline_logging_id=pipeline_logging_id, org_slug=org_slug)
+                self._runs[pipeline_logging_id] = handle
+                self.stats.registered += 1
+        self._ensure_polling()
+        return handle
+
+    def unregister(self, pipeline_logging_id: str) -> None:
+        """Stop tracking a run (the poll stops by itself once no runs remain)."""
+        with self._lock:
+            self._runs.pop(pipeline_logging_id, None)
+
+    def get(self, pipeline_logging_id: str) -> Optional[RunHandle]:
+        with self._lock:
+            return self._runs.get(pipeline_logging_id)
+
+    def request_cancel(self, pipeline_logging_id: str, source: str = "api") -> bool:
+        """
+        Signal cancellation to a run executing in this process.
+
+        Returns:
+            True if the run is active here (False: another instance picks
+            it up from its status poll)
+        """
+        handle = self.get(pipeline_logging_id)
+        if handle is None:
+            return False
+        if not handle.is_cancelled:
+            handle.status = CANCEL_REQUESTED_STATUS
+            handle.cancel_source = source
+            handle.cancelled.set()
+            with self._lock:
+                if source == "poll":
+                    self.stats.poll_cancels += 1
+                else:
+                    self.stats.push_cancels += 1
+            logger.info(
+                "Pipeline cancellation signalled",
+                extra={"pipeline_logging_id": pipeline_logging_id, "source": source}
+            )
+        return True
+
+    def is_cancelled(self, pipeline_logging_id: str) -> bool:
+        """In-memory cancellation check for the executor (no I/O)."""
+        handle = self.get(pipeline_logging_id)
+        return handle is not None and handle.is_cancelled
+
+    def set_status(self, pipeline_logging_id: str, status: str) -> None:
+        handle = self.get(pipeline_logging_id)
+        if handle is not None and not handle.is_cancelled:
+            handle.status = status
+
+    async def poll_once(self) -> int:
+        """
+        Refresh the status of every active run with one query.
+
+        Returns:
+            Number of runs newly found cancelled
+        """
+        with self._lock:
+            handles = {run_id: h for run_id, h in self._runs.items() if not h.is_cancelled}
+        if not handles:
+            return 0
+
+        loop = asyncio.get_running_loop()
+        try:
+            statuses = await loop.run_in_executor(None, self._fetcher, list(handles))
+        except Exception as e:
+            with self._lock:
+                self.stats.poll_errors += 1
+            # Cancellation stays best-effort: keep running, retry on the next poll
+            logger.warning(f"Failed to poll pipeline run statuses: {e}", exc_info=True)
+            return 0
+
+        with self._lock:
+            self.stats.polls += 1
+
+        cancelled = 0
+        for run_id, handle in handles.items():
+            org_slug, status = statuses.get(run_id, (None, None))
+            if status is None or org_slug != handle.org_slug:
+                continue
+            if status == CANCEL_REQUESTED_STATUS:
+                cancelled += int(self.request_cancel(run_id, source="poll"))
+            else:
+                self.set_status(run_id, status)
+        return cancelled
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self.stats.__dict__,
+                "active_runs": len(self._runs),
+                "polling": self._poll_task is not None and not self._poll_task.done(),
+            }
+
+    async def close(self) -> None:
+        """Stop the status poll."""
+        task, self._poll_task = self._poll_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _ensure_polling(self) -> None:
+        if self._poll_task is not None and not self._poll_task.done():
+            return
+        try:
+            self._poll_task = asyncio.get_running_loop().create_task(self._poll_loop())
+        except RuntimeError:
+            # No running loop (sync callers): push signals still work
+            self._poll_task = None
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            with self._lock:
+                if not self._runs:
+                    return
+            await self.poll_once()
+
+
+# ============================================
+# Coalesced status updates
+# ============================================
+
+@dataclass
+class _PendingTransition:
+    pipeline_logging_id: str
+    org_slug: str
+    future: asyncio.Future
+
+
+class RunStatusWriter:
+    """
+    Coalesces run status transitions into one UPDATE per (from, to) status.
+
+    Args:
+        linger_ms: How long the first transition waits for others to join
+        updater: Blocking batch UPDATE (defaults to BigQuery)
+    """
+
+    def __init__(self, linger_ms: Optional[int] = None, updater: Optional[StatusUpdater] = None):
+        self.linger_seconds = (
+            settings.pipeline_status_update_linger_ms if linger_ms is None else linger_ms
+        ) / 1000
+        self._updater = updater or update_run_statuses
+        self._pending: Dict[Tuple[str, str], List[_PendingTransition]] = defaultdict(list)
+        self._flush_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = RunControlStats()
+        self.last_flush_seconds: Optional[float] = None
+
+    async def transition(
+        self,
+        pipeline_logging_id: str,
+        org_slug: str,
+        from_status: str,
+        to_status: str,
+    ) -> bool:
+        """
+        Move a run from from_status to to_status.
+
+        Returns:
+            True if this run was updated; False if it was missing or not in
+            from_status (other runs in the same UPDATE are unaffected)
+
+        Raises:
+            Exception: If the UPDATE itself failed
+        """
+        key = (from_status, to_status)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key].append(_PendingTransition(pipeline_logging_id, org_slug, future))
+        self.stats.coalesced_transitions += 1
+        if key not in self._flush_tasks:
+            self._flush_tasks[key] = asyncio.create_task(self._flush_after_linger(key))
+        return await future
+
+    async def flush(self) -> None:
+        """Write all pending transitions now."""
+        for key in list(self._pending):
+            task = self._flush_tasks.pop(key, None)
+            if task is not None:
+                task.cancel()
+            await self._flush(key)
+
+    async def _flush_after_linger(self, key: Tuple[str, str]) -> None:
+        await asyncio.sleep(self.linger_seconds)
+        self._flush_tasks.pop(key, None)
+        await self._flush(key)
+
+    async def _flush(self, key: Tuple[str, str]) -> None:
+        batch = self._pending.pop(key, [])
+        if not batch:
+            return
+        from_status, to_status = key
+        ids = [t.pipeline_logging_id for t in batch]
+        orgs = [t.org_slug for t in batch]
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            updated = set(await loop.run_in_executor(None, self._updater, from_status, to_status, ids, orgs))
+        except Exception as e:
+            for t in batch:
+                if not t.future.done():
+                    t.future.set_exception(e)
+            return
+        finally:
+            self.last_flush_seconds = time.perf_counter() - start
+
+        self.stats.status_updates += 1
+        if len(updated) < len(batch):
+            logger.warning(
+                f"Run status UPDATE {from_status} -> {to_status} matched {len(updated)}/{len(batch)} runs",
+                extra={"pipeline_logging_ids": [i for i in ids if i not in updated]}
+            )
+        for t in batch:
+            if not t.future.done():
+                t.future.set_result(t.pipeline_logging_id in updated)
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+# Global singleton instances
+_run_registry: Optional[RunRegistry] = None
+_status_writer: Optional[RunStatusWriter] = None
+_singleton_lock = threading.Lock()
+
+
+def get_run_registry() -> RunRegistry:
+    """Get or create the process-wide RunRegistry."""
+    global _run_registry
+    if _run_registry is None:
+        with _singleton_lock:
+            if _run_registry is None:
+                _run_registry = RunRegistry()
+    return _run_registry
+
+
+def reset_run_registry() -> None:
+    """Drop the singleton (tests)."""
+    global _run_registry
+    _run_registry = None
+
+
+def get_run_status_writer() -> RunStatusWriter:
+    """Get or create the process-wide RunStatusWriter."""
+    global _status_writer
+    if _status_writer is None:
+        with _singleton_lock:
+            if _status_writer is None:
+                _status_writer = RunStatusWriter()
+    return _status_writer
+
+
+def reset_run_status_writer() -> None:
+    """Drop the singleton (tests)."""
+    global _status_writer
+    _status_writer = None
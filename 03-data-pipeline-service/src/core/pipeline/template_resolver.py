@@ -1,12 +1,16 @@
 """
 Template Variable Resolver
 Recursively replaces template variables in YAML configurations.
+
+Templates can also be compiled once (compile_template) into a tree of
+render functions with the placeholders pre-split, so resolving a cached
+template per run is only the substitution itself.
 """
 
 import yaml
 import re
 from pathlib import Path
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Callable, FrozenSet, Mapping, Optional, Set, Union, List
 
 
 class TemplateResolver:
@@ -102,6 +106,63 @@ class TemplateResolver:
         return [self.resolve(item) for item in lst]
 
 
+class CompiledTemplate:
+    """
+    Pre-parsed template: placeholder positions are found once at compile time.
+
+    render() returns a fresh structure on every call (containers are never
+    shared between renders), resolving {variable} placeholders exactly like
+    TemplateResolver, including keeping unknown placeholders as-is.
+    """
+
+    def __init__(self, value: Any):
+        names: Set[str] = set()
+        self._render = _compile(value, names)
+        self.variables: FrozenSet[str] = frozenset(names)
+
+    def render(self, variables: Optional[Mapping[str, Any]] = None) -> Any:
+        """
+        Build the resolved value.
+
+        Args:
+            variables: Placeholder values (none: structural copy of the template)
+        """
+        return self._render(variables or {})
+
+
+def compile_template(value: Any) -> CompiledTemplate:
+    """Compile a parsed YAML value into a CompiledTemplate."""
+    return CompiledTemplate(value)
+
+
+def _compile(value: Any, names: Set[str]) -> Callable[[Mapping[str, Any]], Any]:
+    if isinstance(value, str):
+        # split() with one capture group alternates literal, name, literal, ...
+        parts = TemplateResolver.VARIABLE_PATTERN.split(value)
+        if len(parts) == 1:
+            return lambda variables: value
+        literals = parts[0::2]
+        var_names = parts[1::2]
+        names.update(var_names)
+
+        def render_string(variables: Mapping[str, Any]) -> str:
+            out = [literals[0]]
+            for name, literal in zip(var_names, literals[1:]):
+                out.append(str(variables[name]) if name in variables else "{" + name + "}")
+                out.append(literal)
+            return "".join(out)
+
+        return render_string
+    if isinstance(value, dict):
+        items = [(key, _compile(item, names)) for key, item in value.items()]
+        return lambda variables: {key: render(variables) for key, render in items}
+    if isinstance(value, list):
+        renders = [_compile(item, names) for item in value]
+        return lambda variables: [render(variables) for render in renders]
+    # Primitives (int, float, bool, None) are immutable and returned unchanged
+    return lambda variables: value
+
+
 def resolve_template(template_path: str, variables: Dict[str, str]) -> Dict[str, Any]:
     """
     Load a YAML template file and resolve all template variables.
@@ -129,6 +190,19 @@ def resolve_template(template_path: str, variables: Dict[str, str]) -> Dict[str,
         >>> config['pipeline_name']
         'acmeinc_23xv2-gcp-cost-bill-sample-export-template'
     """
+    # Parsed and compiled once per file version; only substitution runs per call
+    from src.core.pipeline.plan_cache import get_pipeline_plan_cache
+    return get_pipeline_plan_cache().get_template(template_path).render(variables)
+
+
+def load_template(template_path: str) -> Any:
+    """
+    Parse a YAML template file without resolving it.
+
+    Raises:
+        FileNotFoundError: If template file doesn't exist
+        ValueError: If the file is empty
+    """
     path = Path(template_path)
 
     if not path.exists():
@@ -141,11 +215,7 @@ def resolve_template(template_path: str, variables: Dict[str, str]) -> Dict[str,
     if template_config is None:
         raise ValueError(f"Template file is empty or invalid: {template_path}")
 
-    # Resolve all variables
-    resolver = TemplateResolver(variables)
-    resolved_config = resolver.resolve(template_config)
-
-    return resolved_config
+    return template_config
 
 
 def get_template_path(
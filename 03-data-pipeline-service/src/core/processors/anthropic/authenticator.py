@@ -136,10 +136,10 @@ class AnthropicAuthenticator:
         Returns:
             httpx.AsyncClient with Anthropic headers set
         """
-        import httpx
+        from src.core.utils.http_pool import get_http_client_pool
 
         api_key = await self.authenticate()
-        return httpx.AsyncClient(
+        return get_http_client_pool().client(
             base_url=self.BASE_URL,
             headers={
                 "x-api-key": api_key,
@@ -7,7 +7,7 @@ for deduplication. It enables:
 2. Multi-account support (data isolation per credential)
 3. Full lineage traceability
 
-Composite Key: (org_slug, x_pipeline_id, x_credential_id, x_pipeline_run_date)
+Composite Key: (x_org_slug, x_pipeline_id, x_credential_id, x_pipeline_run_date)
 
 Usage:
     class MyProcessor(IdempotentWriterMixin):
@@ -106,8 +106,9 @@ class IdempotentWriterMixin:
             run_id = str(uuid.uuid4())
 
         # Get dataset ID
+        # get_org_dataset_id() already returns "{project}.{dataset}"
         dataset_id = bq_client.get_org_dataset_id(org_slug, dataset_type)
-        full_table_id = f"{bq_client.project_id}.{dataset_id}.{table_name}"
+        full_table_id = f"{dataset_id}.{table_name}"
 
         # Step 1: DELETE existing data for composite key
         rows_deleted = await self._delete_existing_data(
@@ -172,7 +173,7 @@ class IdempotentWriterMixin:
         """
         Delete existing data for the composite key.
 
-        Composite Key: (org_slug, x_pipeline_id, x_credential_id, x_pipeline_run_date)
+        Composite Key: (x_org_slug, x_pipeline_id, x_credential_id, x_pipeline_run_date)
 
         IDEM-001 FIX: Uses parameterized queries to prevent SQL injection.
         IDEM-002 FIX: Returns actual deleted row count via job.num_dml_affected_rows.
@@ -273,7 +274,7 @@ class IdempotentWriterMixin:
         Add the 5 REQUIRED lineage columns to all rows.
 
         Columns added:
-        - org_slug: Organization identifier (if not already present)
+        - x_org_slug: Organization identifier (if not already present)
         - x_pipeline_id: Pipeline template name
         - x_credential_id: Credential ID for multi-account isolation
         - x_pipeline_run_date: Data date being processed
@@ -298,9 +299,9 @@ class IdempotentWriterMixin:
         for row in data:
             enriched_row = row.copy()
 
-            # Ensure org_slug is set (don't override if already present)
-            if "org_slug" not in enriched_row:
-                enriched_row["org_slug"] = org_slug
+            # Ensure x_org_slug is set (don't override if already present)
+            if "x_org_slug" not in enriched_row:
+                enriched_row["x_org_slug"] = org_slug
 
             # Add lineage columns (always overwrite to ensure consistency)
             enriched_row["x_pipeline_id"] = pipeline_id
@@ -355,11 +356,12 @@ class IdempotentWriterMixin:
 
         # Default merge keys: composite key for idempotency
         if merge_keys is None:
-            merge_keys = ["org_slug", "x_pipeline_id", "x_credential_id", "x_pipeline_run_date"]
+            merge_keys = ["x_org_slug", "x_pipeline_id", "x_credential_id", "x_pipeline_run_date"]
 
         # Get dataset ID and full table ID
+        # get_org_dataset_id() already returns "{project}.{dataset}"
         dataset_id = bq_client.get_org_dataset_id(org_slug, dataset_type)
-        full_table_id = f"{bq_client.project_id}.{dataset_id}.{table_name}"
+        full_table_id = f"{dataset_id}.{table_name}"
 
         # Add lineage columns to all rows
         enriched_data = self._add_lineage_columns(
@@ -4,16 +4,41 @@ AWS Cost & Usage Report Extractor
 Extracts CUR data from S3 buckets (Parquet/CSV format).
 Uses AWSAuthenticator for cross-account access.
 
+Files are downloaded concurrently, streamed in record batches and mapped
+with vectorised Arrow expressions; when the step has a destination, batches
+are appended to BigQuery directly; otherwise they are spilled to a local
+Arrow step output whose handle is passed to the loading step.
+
 ps_type: cloud.aws.cur_extractor
 """
 
+import asyncio
+import contextlib
 import logging
-from typing import Dict, Any, List, Optional
+import tempfile
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
 from datetime import datetime, date, timezone
-import io
 import uuid
 
+import pyarrow as pa
+
 from src.core.processors.cloud.aws.authenticator import AWSAuthenticator
+from src.core.engine.arrow_loader import DEFAULT_FLUSH_ROWS, ArrowBigQueryAppender
+from src.core.engine.step_output import CONTEXT_KEY, STEP_OUTPUT_KEY, StepDatasetWriter
+from src.core.processors.cloud.aws.cur_stream import (
+    DEFAULT_BATCH_SIZE,
+    iter_cur_batches,
+    map_cur_batch,
+)
+from src.core.processors.cloud.aws.s3_fetch import (
+    CUR_FILE_SUFFIXES,
+    DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+    AsyncS3Fetcher,
+    BigQueryCURFileManifest,
+    CURFileManifest,
+    S3Object,
+)
+from src.core.processors.generic.bq_loader import BQLoader
 from src.app.config import get_settings
 from src.core.utils.validators import (
     is_valid_org_slug,
@@ -33,12 +58,19 @@ class AWSCURExtractor:
     - Parquet format (preferred)
     - GZIP compressed CSV
     - Athena query integration
+
+    Files are streamed in Arrow record batches (see cur_stream), so memory
+    stays bounded by batch_size regardless of CUR size. Downloads run
+    concurrently (see s3_fetch) and, with skip_ingested, objects whose ETag
+    is already in the ingestion manifest are skipped.
     """
 
-    def __init__(self, org_slug: Optional[str] = None):
+    def __init__(self, org_slug: Optional[str] = None, manifest: Optional[CURFileManifest] = None):
         self.org_slug = org_slug
         self.settings = get_settings()
         self._auth: Optional[AWSAuthenticator] = None
+        self.batch_size = DEFAULT_BATCH_SIZE
+        self.manifest = manifest
 
     async def execute(
         self,
@@ -50,10 +82,14 @@ class AWSCURExtractor:
 
         Args:
             step_config: Configuration with source_bucket, source_prefix, date_filter
+                         (or a "source" block with bucket/prefix/format), optional
+                         batch_size/flush_rows/max_concurrent_downloads/
+                         skip_ingested and a "destination" block
             context: Pipeline context with org_slug
 
         Returns:
-            Dict with extracted rows and metadata
+            Dict with row counts and metadata; without a destination it also
+            carries the handle of the spilled step output
         """
         # ERR-002 FIX: Get org_slug from context if not set in constructor
         if not self.org_slug:
@@ -66,10 +102,22 @@ class AWSCURExtractor:
             return {"status": "FAILED", "error": f"Invalid org_slug format: {self.org_slug}"}
 
         config = step_config.get("config", {})
-        source_bucket = config.get("source_bucket")
-        source_prefix = config.get("source_prefix", "")
+        # Pipeline YAMLs declare the CUR location under a top-level "source" block
+        source = step_config.get("source", {})
+        source_bucket = config.get("source_bucket") or source.get("bucket")
+        source_prefix = config.get("source_prefix", source.get("prefix", ""))
         date_filter = config.get("date_filter") or context.get("date")
-        file_format = config.get("format", "Parquet").lower()
+        file_format = (config.get("format") or source.get("format") or "Parquet").lower()
+        field_mappings = config.get("field_mappings") or source.get("field_mappings")
+        destination = config.get("destination") or step_config.get("destination")
+        self.batch_size = int(config.get("batch_size", DEFAULT_BATCH_SIZE))
+        flush_rows = int(config.get("flush_rows", DEFAULT_FLUSH_ROWS))
+        max_downloads = int(
+            config.get("max_concurrent_downloads")
+            or source.get("max_concurrent_downloads")
+            or DEFAULT_MAX_CONCURRENT_DOWNLOADS
+        )
+        skip_ingested = bool(config.get("skip_ingested", source.get("skip_ingested", False)))
 
         if not source_bucket:
             return {"status": "FAILED", "error": "source_bucket is required"}
@@ -97,16 +145,38 @@ class AWSCURExtractor:
             }
         )
 
+        fetcher: Optional[AsyncS3Fetcher] = None
         try:
             # Authenticate with AWS
             self._auth = AWSAuthenticator(self.org_slug)
             s3_client = await self._auth.get_s3_client()
+            fetcher = AsyncS3Fetcher(s3_client, max_concurrent_downloads=max_downloads)
 
             # List CUR files
-            files = await self._list_cur_files(
-                s3_client, source_bucket, source_prefix, date_filter
+            search_prefix, files = await self._list_cur_files(
+                fetcher, source_bucket, source_prefix, date_filter
             )
 
+            # Manifest skipping only applies when this step loads the rows
+            # itself; otherwise a later step could still fail to write them
+            use_manifest = skip_ingested and bool(destination and destination.get("table"))
+            files_skipped = 0
+            if use_manifest and files:
+                pending = await asyncio.to_thread(
+                    self._get_manifest().pending,
+                    self.org_slug, source_bucket, search_prefix, files,
+                )
+                files_skipped = len(files) - len(pending)
+                files = pending
+                if not files:
+                    return {
+                        "status": "SUCCESS",
+                        "row_count": 0,
+                        "file_count": 0,
+                        "files_skipped": files_skipped,
+                        "message": "All CUR files already ingested"
+                    }
+
             if not files:
                 logger.warning(f"No CUR files found for date {date_filter}")
                 return {
@@ -123,56 +193,100 @@ class AWSCURExtractor:
             pipeline_run_date = date_filter or date.today().isoformat()
             ingested_at = datetime.now(timezone.utc).isoformat()
 
-            # Extract data from files
-            rows = []
-            for file_key in files:
-                file_rows = await self._extract_file(
-                    s3_client, source_bucket, file_key, file_format
+            constants = {
+                "x_org_slug": self.org_slug,
+                "provider": "aws",
+                "ingestion_timestamp": ingested_at,
+                "x_pipeline_id": pipeline_id,
+                "x_credential_id": credential_id,
+                "x_pipeline_run_date": pipeline_run_date,
+                "x_run_id": run_id,
+                "x_ingested_at": ingested_at,
+            }
+
+            # With a destination, batches stream straight into BigQuery and
+            # never accumulate; otherwise they are spilled to disk for a bq_loader step
+            appender = None
+            writer: Optional[StepDatasetWriter] = None
+            if destination and destination.get("table"):
+                appender = await self._create_appender(destination, run_id, flush_rows)
+                sink = appender.append
+            else:
+                writer = StepDatasetWriter(
+                    context.get("run_id") or run_id, context.get("step_id", "cur_extract")
                 )
-                # Add standardized lineage columns to each row
-                for row in file_rows:
-                    row["x_pipeline_id"] = pipeline_id
-                    row["x_credential_id"] = credential_id
-                    row["x_pipeline_run_date"] = pipeline_run_date
-                    row["x_run_id"] = run_id
-                    row["x_ingested_at"] = ingested_at
-                rows.extend(file_rows)
-
-            # Store in context for downstream steps
-            context["extracted_data"] = rows
+
+                async def sink(batch: pa.RecordBatch) -> None:
+                    await asyncio.to_thread(writer.write_batch, batch)
+
+            # Files are downloaded concurrently and mapped as each one lands
+            row_count = 0
+            try:
+                with tempfile.TemporaryDirectory(prefix="cur-") as tmp_dir:
+                    downloads = fetcher.iter_downloads(source_bucket, files, tmp_dir)
+                    async with contextlib.aclosing(downloads):
+                        async for obj, path in downloads:
+                            row_count += await self._stream_file(
+                                path, obj.key, constants, field_mappings, sink,
+                            )
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+
+            result = {
+                "status": "SUCCESS",
+                "row_count": row_count,
+                "file_count": len(files),
+                "files_skipped": files_skipped,
+                "bytes_downloaded": fetcher.stats.bytes_downloaded,
+                "source_bucket": source_bucket,
+                "date_filter": date_filter,
+                # x_pipeline_run_date of the written rows, for partition-scoped FOCUS conversion
+                "output_run_dates": [pipeline_run_date] if row_count else []
+            }
+
+            if appender is not None:
+                result["rows_loaded"] = await appender.close()
+                result["load_jobs"] = appender.load_jobs
+                result["destination_table"] = appender.table_id
+                if use_manifest:
+                    await asyncio.to_thread(
+                        self._get_manifest().record,
+                        self.org_slug, source_bucket, files, pipeline_id, run_id,
+                    )
+            else:
+                # Only the handle travels to downstream steps
+                dataset = writer.close()
+                context[CONTEXT_KEY] = dataset
+                result[STEP_OUTPUT_KEY] = dataset.to_dict()
 
             logger.info(
                 f"CUR extraction complete",
                 extra={
                     "org_slug": self.org_slug,
-                    "row_count": len(rows),
+                    "row_count": row_count,
                     "file_count": len(files)
                 }
             )
 
-            return {
-                "status": "SUCCESS",
-                "rows": rows,
-                "row_count": len(rows),
-                "file_count": len(files),
-                "source_bucket": source_bucket,
-                "date_filter": date_filter
-            }
+            return result
 
         except Exception as e:
             logger.error(f"CUR extraction failed: {e}", exc_info=True)
             return {"status": "FAILED", "error": str(e)}
+        finally:
+            if fetcher is not None:
+                fetcher.close()
 
     async def _list_cur_files(
         self,
-        s3_client,
+        fetcher: AsyncS3Fetcher,
         bucket: str,
         prefix: str,
         date_filter: Optional[str]
-    ) -> List[str]:
-        """List CUR files in S3 bucket."""
-        files = []
-
+    ) -> Tuple[str, List[S3Object]]:
+        """List CUR files in S3 bucket; returns (search prefix, objects)."""
         # Build prefix with date if provided
         search_prefix = prefix
         if date_filter:
@@ -185,191 +299,88 @@ class AWSCURExtractor:
             except ValueError:
                 pass
 
-        paginator = s3_client.get_paginator("list_objects_v2")
-
-        for page in paginator.paginate(Bucket=bucket, Prefix=search_prefix):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                # Filter for CUR data files (parquet or csv.gz)
-                if key.endswith(".parquet") or key.endswith(".csv.gz") or key.endswith(".csv"):
-                    files.append(key)
+        # Filter for CUR data files (parquet or csv.gz)
+        return search_prefix, await fetcher.list_objects(bucket, search_prefix, CUR_FILE_SUFFIXES)
 
-        return files
-
-    async def _extract_file(
+    async def _stream_file(
         self,
-        s3_client,
-        bucket: str,
+        path: str,
         key: str,
-        file_format: str
-    ) -> List[Dict[str, Any]]:
-        """Extract data from a single CUR file."""
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        body = response["Body"].read()
-
-        if file_format == "parquet":
-            raw_rows = await self._parse_parquet(body)
-        else:
-            raw_rows = await self._parse_csv(body, key.endswith(".gz"))
-
-        # Map CUR columns to schema columns
-        return [self._map_cur_row(row) for row in raw_rows]
-
-    def _map_cur_row(self, cur_row: Dict[str, Any]) -> Dict[str, Any]:
+        constants: Dict[str, Any],
+        field_mappings: Optional[Dict[str, str]],
+        sink: Callable[[pa.RecordBatch], Awaitable[None]],
+    ) -> int:
         """
-        Map AWS CUR column names to schema column names.
+        Stream one downloaded CUR file through the vectorised mapper into a sink.
 
-        AWS CUR uses naming like:
-        - lineItem/UsageAccountId -> linked_account_id
-        - lineItem/UnblendedCost -> unblended_cost
-        - product/productName -> product_name
+        Batches are read and mapped in a worker thread so the event loop
+        stays free for concurrent downloads and loads.
+
+        Returns:
+            Number of rows mapped
         """
-        ingestion_ts = datetime.now(timezone.utc).isoformat()
-
-        # AWS CUR column name mapping (both Parquet and CSV formats)
-        # Parquet uses underscores, CSV uses slashes
-        def get_val(key: str, *alt_keys: str):
-            """Get value from CUR row, trying multiple key formats."""
-            # Try exact key first
-            if key in cur_row:
-                return cur_row[key]
-            # Try with underscores (Parquet format)
-            underscore_key = key.replace("/", "_")
-            if underscore_key in cur_row:
-                return cur_row[underscore_key]
-            # Try snake_case version
-            snake_key = key.replace("/", "_").lower()
-            if snake_key in cur_row:
-                return cur_row[snake_key]
-            # Try alternative keys
-            for alt in alt_keys:
-                if alt in cur_row:
-                    return cur_row[alt]
-                alt_underscore = alt.replace("/", "_")
-                if alt_underscore in cur_row:
-                    return cur_row[alt_underscore]
-            return None
-
-        def safe_float(val) -> float:
-            """Safely convert to float."""
-            if val is None:
-                return 0.0
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return 0.0
+        batches = iter_cur_batches(
+            path,
+            "parquet" if key.endswith(".parquet") else "csv",
+            is_gzip=key.endswith(".gz"),
+            batch_size=self.batch_size,
+            field_mappings=field_mappings,
+        )
 
-        def safe_date(val) -> str:
-            """Extract date from timestamp."""
-            if val is None:
+        def next_mapped() -> Optional[pa.RecordBatch]:
+            item = next(batches, None)
+            if item is None:
                 return None
-            if isinstance(val, str):
-                return val[:10] if len(val) >= 10 else val
-            return str(val)[:10] if val else None
-
-        # Map to schema columns
-        return {
-            # Required fields
-            "usage_date": safe_date(get_val("lineItem/UsageStartDate", "line_item_usage_start_date")),
-            "x_org_slug": self.org_slug,
-            "provider": "aws",
-            "linked_account_id": get_val("lineItem/UsageAccountId", "line_item_usage_account_id") or "",
-            "unblended_cost": safe_float(get_val("lineItem/UnblendedCost", "line_item_unblended_cost")),
-            "ingestion_timestamp": ingestion_ts,
-
-            # Account info
-            "linked_account_name": get_val("lineItem/UsageAccountName", "line_item_usage_account_name"),
-            "payer_account_id": get_val("bill/PayerAccountId", "bill_payer_account_id"),
-
-            # Service/Product info
-            "service_code": get_val("lineItem/ProductCode", "line_item_product_code"),
-            "product_code": get_val("product/ProductCode", "product_product_code"),
-            "product_name": get_val("product/productName", "product_product_name"),
-
-            # Usage details
-            "usage_type": get_val("lineItem/UsageType", "line_item_usage_type"),
-            "operation": get_val("lineItem/Operation", "line_item_operation"),
-            "region": get_val("product/region", "product_region"),
-            "availability_zone": get_val("lineItem/AvailabilityZone", "line_item_availability_zone"),
-            "resource_id": get_val("lineItem/ResourceId", "line_item_resource_id"),
-            "line_item_type": get_val("lineItem/LineItemType", "line_item_line_item_type"),
-
-            # Time fields
-            "usage_start_time": get_val("lineItem/UsageStartDate", "line_item_usage_start_date"),
-            "usage_end_time": get_val("lineItem/UsageEndDate", "line_item_usage_end_date"),
-
-            # Usage amounts
-            "usage_amount": safe_float(get_val("lineItem/UsageAmount", "line_item_usage_amount")),
-            "usage_unit": get_val("pricing/unit", "pricing_unit"),
-
-            # Cost fields
-            "blended_cost": safe_float(get_val("lineItem/BlendedCost", "line_item_blended_cost")),
-            "amortized_cost": safe_float(get_val("savingsPlan/SavingsPlanEffectiveCost", "savings_plan_savings_plan_effective_cost")),
-            "net_unblended_cost": safe_float(get_val("lineItem/NetUnblendedCost", "line_item_net_unblended_cost")),
-            "currency": get_val("lineItem/CurrencyCode", "line_item_currency_code") or "USD",
-            "pricing_unit": get_val("pricing/unit", "pricing_unit"),
-            "public_on_demand_cost": safe_float(get_val("pricing/publicOnDemandCost", "pricing_public_on_demand_cost")),
-
-            # Reservation/Savings Plan
-            "reservation_arn": get_val("reservation/ReservationARN", "reservation_reservation_arn"),
-            "savings_plan_arn": get_val("savingsPlan/SavingsPlanARN", "savings_plan_savings_plan_arn"),
-            "discount_amount": safe_float(get_val("discount/TotalDiscount", "discount_total_discount")),
-
-            # Billing period
-            "invoice_id": get_val("bill/InvoiceId", "bill_invoice_id"),
-            "billing_period_start": safe_date(get_val("bill/BillingPeriodStartDate", "bill_billing_period_start_date")),
-            "billing_period_end": safe_date(get_val("bill/BillingPeriodEndDate", "bill_billing_period_end_date")),
-
-            # Tags and categories
-            "resource_tags_json": self._extract_tags(cur_row),
-            "cost_category_json": self._extract_cost_categories(cur_row),
-        }
-
-    def _extract_tags(self, cur_row: Dict[str, Any]) -> str:
-        """Extract resource tags from CUR row as JSON string."""
-        import json
-        tags = {}
-        for key, value in cur_row.items():
-            # Tags are prefixed with "resourceTags/" or "resource_tags_"
-            if key.startswith("resourceTags/") or key.startswith("resource_tags_"):
-                tag_name = key.split("/")[-1] if "/" in key else key.replace("resource_tags_", "")
-                if value:
-                    tags[tag_name] = value
-        return json.dumps(tags) if tags else None
-
-    def _extract_cost_categories(self, cur_row: Dict[str, Any]) -> str:
-        """Extract cost categories from CUR row as JSON string."""
-        import json
-        categories = {}
-        for key, value in cur_row.items():
-            # Cost categories are prefixed with "costCategory/"
-            if key.startswith("costCategory/") or key.startswith("cost_category_"):
-                cat_name = key.split("/")[-1] if "/" in key else key.replace("cost_category_", "")
-                if value:
-                    categories[cat_name] = value
-        return json.dumps(categories) if categories else None
-
-    async def _parse_parquet(self, data: bytes) -> List[Dict[str, Any]]:
-        """Parse Parquet file."""
-        try:
-            import pyarrow.parquet as pq
-            table = pq.read_table(io.BytesIO(data))
-            return table.to_pylist()
-        except ImportError:
-            logger.warning("pyarrow not installed, cannot parse Parquet")
-            return []
-
-    async def _parse_csv(self, data: bytes, is_gzip: bool) -> List[Dict[str, Any]]:
-        """Parse CSV file (optionally gzipped)."""
-        import csv
-        import gzip
-
-        if is_gzip:
-            data = gzip.decompress(data)
-
-        reader = csv.DictReader(io.StringIO(data.decode("utf-8")))
-        return list(reader)
-
+            column_map, batch = item
+            return map_cur_batch(batch, column_map, constants)
+
+        rows = 0
+        while True:
+            mapped = await asyncio.to_thread(next_mapped)
+            if mapped is None:
+                break
+            rows += mapped.num_rows
+            await sink(mapped)
+        return rows
+
+    def _get_manifest(self) -> CURFileManifest:
+        if self.manifest is None:
+            self.manifest = BigQueryCURFileManifest(BQLoader(self.org_slug).bq_client.client)
+        return self.manifest
+
+    async def _create_appender(
+        self,
+        destination: Dict[str, Any],
+        run_id: str,
+        flush_rows: int,
+    ) -> ArrowBigQueryAppender:
+        """Resolve the destination table (creating it from its schema template) and build an appender."""
+        table_name = destination["table"]
+        dataset_id = self.settings.get_org_dataset_name(self.org_slug)
+        table_id = f"{self.settings.gcp_project_id}.{dataset_id}.{table_name}"
+
+        loader = BQLoader(self.org_slug)
+        table = await loader._ensure_table_exists(
+            table_id,
+            {
+                "schema_template": destination.get("schema_template"),
+                "provider": "aws",
+                "domain": "cost",
+                "table_config": destination.get("table_config", {}),
+            },
+            {},
+        )
+        return ArrowBigQueryAppender(
+            client=loader.bq_client.client,
+            table_id=table_id,
+            schema=table.schema,
+            defaults={
+                "x_ingestion_id": run_id,
+                "x_ingestion_date": date.today().isoformat(),
+                "x_cloud_provider": "AWS",
+            },
+            flush_rows=flush_rows,
+        )
 
 async def execute(step_config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """Entry point for pipeline executor."""
@@ -0,0 +1,323 @@
+"""
+Streaming AWS CUR Ingestion
+
+Vectorised, bounded-memory building blocks for the CUR extractor:
+- Row-group / block streaming of Parquet and (gzipped) CSV CUR files with
+  column projection, so only mapped columns are ever decoded
+- CUR -> schema column mapping as Arrow compute expressions over whole
+  record batches (no per-row Python dicts)
+
+Mapped batches go to BigQuery through engine.arrow_loader, so peak memory is
+bounded by the read batch size plus one pending load chunk, independent of
+the CUR file size.
+"""
+
+import csv
+import gzip
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from src.core.engine.arrow_loader import to_float64
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_BATCH_SIZE = 65_536
+
+TAG_PREFIXES = ("resourceTags/", "resource_tags_")
+COST_CATEGORY_PREFIXES = ("costCategory/", "cost_category_")
+
+# Column kinds
+RAW = "raw"      # Passed through unchanged
+FLOAT = "float"  # float64, null/invalid -> 0.0
+DATE = "date"    # 'YYYY-MM-DD' string taken from a date/timestamp
+
+# (target column, CUR column, alternative column, kind, default for null/empty)
+# CSV CURs use "lineItem/UnblendedCost", Parquet CURs "line_item_unblended_cost"
+CUR_FIELDS: Tuple[Tuple[str, str, str, str, Optional[str]], ...] = (
+    ("usage_date", "lineItem/UsageStartDate", "line_item_usage_start_date", DATE, None),
+    ("linked_account_id", "lineItem/UsageAccountId", "line_item_usage_account_id", RAW, ""),
+    ("unblended_cost", "lineItem/UnblendedCost", "line_item_unblended_cost", FLOAT, None),
+    ("linked_account_name", "lineItem/UsageAccountName", "line_item_usage_account_name", RAW, None),
+    ("payer_account_id", "bill/PayerAccountId", "bill_payer_account_id", RAW, None),
+    ("service_code", "lineItem/ProductCode", "line_item_product_code", RAW, None),
+    ("product_code", "product/ProductCode", "product_product_code", RAW, None),
+    ("product_name", "product/productName", "product_product_name", RAW, None),
+    ("usage_type", "lineItem/UsageType", "line_item_usage_type", RAW, None),
+    ("operation", "lineItem/Operation", "line_item_operation", RAW, None),
+    ("region", "product/region", "product_region", RAW, None),
+    ("availability_zone", "lineItem/AvailabilityZone", "line_item_availability_zone", RAW, None),
+    ("resource_id", "lineItem/ResourceId", "line_item_resource_id", RAW, None),
+    ("line_item_type", "lineItem/LineItemType", "line_item_line_item_type", RAW, None),
+    ("usage_start_time", "lineItem/UsageStartDate", "line_item_usage_start_date", RAW, None),
+    ("usage_end_time", "lineItem/UsageEndDate", "line_item_usage_end_date", RAW, None),
+    ("usage_amount", "lineItem/UsageAmount", "line_item_usage_amount", FLOAT, None),
+    ("usage_unit", "pricing/unit", "pricing_unit", RAW, None),
+    ("blended_cost", "lineItem/BlendedCost", "line_item_blended_cost", FLOAT, None),
+    ("amortized_cost", "savingsPlan/SavingsPlanEffectiveCost", "savings_plan_savings_plan_effective_cost", FLOAT, None),
+    ("net_unblended_cost", "lineItem/NetUnblendedCost", "line_item_net_unblended_cost", FLOAT, None),
+    ("currency", "lineItem/CurrencyCode", "line_item_currency_code", RAW, "USD"),
+    ("pricing_unit", "pricing/unit", "pricing_unit", RAW, None),
+    ("public_on_demand_cost", "pricing/publicOnDemandCost", "pricing_public_on_demand_cost", FLOAT, None),
+    ("reservation_arn", "reservation/ReservationARN", "reservation_reservation_arn", RAW, None),
+    ("savings_plan_arn", "savingsPlan/SavingsPlanARN", "savings_plan_savings_plan_arn", RAW, None),
+    ("discount_amount", "discount/TotalDiscount", "discount_total_discount", FLOAT, None),
+    ("invoice_id", "bill/InvoiceId", "bill_invoice_id", RAW, None),
+    ("billing_period_start", "bill/BillingPeriodStartDate", "bill_billing_period_start_date", DATE, None),
+    ("billing_period_end", "bill/BillingPeriodEndDate", "bill_billing_period_end_date", DATE, None),
+)
+
+
+# ============================================
+# Column Resolution
+# ============================================
+
+def _candidate_names(key: str, alt: str) -> List[str]:
+    """Lookup order for a CUR column: exact, underscored, snake_case, then alternative."""
+    underscored = key.replace("/", "_")
+    return [key, underscored, underscored.lower(), alt, alt.replace("/", "_")]
+
+
+def _prefixed_columns(names: Sequence[str], prefixes: Tuple[str, ...]) -> List[Tuple[str, str]]:
+    """(column, name without prefix) for tag / cost category columns."""
+    result = []
+    for name in names:
+        for prefix in prefixes:
+            if name.startswith(prefix):
+                short = name.split("/")[-1] if "/" in name else name.replace(prefix, "")
+                result.append((name, short))
+                break
+    return result
+
+
+class CURColumnMap:
+    """
+    Resolved mapping from one CUR file's columns to schema columns.
+
+    Resolution happens once per file schema instead of once per row.
+
+    Args:
+        names: Column names present in the CUR file
+        field_mappings: Optional extra {cur_column: target_column} passthroughs
+                        (pipeline ``source.field_mappings``); targets already
+                        produced by the standard mapping are ignored
+    """
+
+    def __init__(self, names: Sequence[str], field_mappings: Optional[Dict[str, str]] = None):
+        present = set(names)
+        self.fields: Dict[str, Optional[str]] = {}
+        for target, key, alt, _, _ in CUR_FIELDS:
+            self.fields[target] = next((c for c in _candidate_names(key, alt) if c in present), None)
+
+        self.extra: Dict[str, str] = {}
+        for source, target in (field_mappings or {}).items():
+            if source in present and target not in self.fields and target not in self.extra:
+                self.extra[target] = source
+
+        self.tags = _prefixed_columns(names, TAG_PREFIXES)
+        self.cost_categories = _prefixed_columns(names, COST_CATEGORY_PREFIXES)
+
+    @property
+    def projection(self) -> List[str]:
+        """Source columns to read; everything else in the CUR is skipped."""
+        columns = [c for c in self.fields.values() if c]
+        columns += list(self.extra.values())
+        columns += [c for c, _ in self.tags] + [c for c, _ in self.cost_categories]
+        return list(dict.fromkeys(columns))
+
+
+# ============================================
+# Vectorised Mapping
+# ============================================
+
+def _null_array(length: int, type_: pa.DataType = pa.string()) -> pa.Array:
+    return pa.nulls(length, type=type_)
+
+
+def to_date_string(arr: pa.Array) -> pa.Array:
+    """Take the 'YYYY-MM-DD' part of a date, timestamp or ISO string column."""
+    if pa.types.is_timestamp(arr.type) or pa.types.is_date(arr.type):
+        # Casting via date32 is an order of magnitude faster than strftime
+        return pc.cast(pc.cast(arr, pa.date32()), pa.string())
+    if not pa.types.is_string(arr.type) and not pa.types.is_large_string(arr.type):
+        arr = pc.cast(arr, pa.string())
+    return pc.utf8_slice_codeunits(arr, 0, 10)
+
+
+def _with_default(arr: pa.Array, default: str) -> pa.Array:
+    """Replace null and empty values with a default (``value or default``)."""
+    if not pa.types.is_string(arr.type):
+        arr = pc.cast(arr, pa.string())
+    filled = pc.fill_null(arr, default)
+    return pc.if_else(pc.equal(filled, ""), pa.scalar(default, pa.string()), filled)
+
+
+def _json_escape(arr: pa.Array) -> Optional[pa.Array]:
+    """JSON string escaping; None if the column needs the slow path."""
+    if not pc.any(pc.match_substring_regex(arr, r'[\\"\x00-\x1f]')).as_py():
+        return arr
+    if pc.any(pc.match_substring_regex(arr, r"[\x00-\x07\x0b\x0e-\x1f]")).as_py():
+        return None
+    for raw, escaped in (("\\", "\\\\"), ('"', '\\"'), ("\n", "\\n"), ("\r", "\\r"),
+                         ("\t", "\\t"), ("\b", "\\b"), ("\f", "\\f")):
+        arr = pc.replace_substring(arr, raw, escaped)
+    return arr
+
+
+def build_json_object(batch: pa.RecordBatch, columns: Sequence[Tuple[str, str]]) -> pa.Array:
+    """
+    Assemble a JSON object string per row from key/value columns.
+
+    Keys come from the column names, values are the truthy column values;
+    rows with no values get null. Equivalent to ``json.dumps(dict)`` with
+    the default separators.
+    """
+    length = batch.num_rows
+    if not columns:
+        return _null_array(length)
+
+    acc: Optional[pa.Array] = None
+    for column, name in columns:
+        values = batch.column(column)
+        if not pa.types.is_string(values.type):
+            values = pc.cast(values, pa.string())
+        truthy = pc.and_kleene(pc.is_valid(values), pc.not_equal(values, ""))
+        escaped = _json_escape(values)
+        if escaped is None:
+            escaped = pa.array(
+                [json.dumps(v)[1:-1] if v is not None else None for v in values.to_pylist()],
+                type=pa.string(),
+            )
+        fragment = pc.binary_join_element_wise(f"{json.dumps(name)}: \"", escaped, "\"", "")
+        fragment = pc.if_else(truthy, fragment, _null_array(length))
+        if acc is None:
+            acc = fragment
+        else:
+            # binary_join_element_wise(null_handling="skip") miscounts all-null
+            # inputs on some pyarrow versions; coalesce keeps lengths exact
+            acc = pc.coalesce(pc.binary_join_element_wise(acc, fragment, ", "), acc, fragment)
+
+    return pc.binary_join_element_wise("{", acc, "}", "")
+
+
+def map_cur_batch(
+    batch: pa.RecordBatch,
+    column_map: CURColumnMap,
+    constants: Dict[str, Any],
+) -> pa.RecordBatch:
+    """
+    Map a batch of raw CUR rows to schema columns.
+
+    Args:
+        batch: Record batch read from a CUR file
+        column_map: Column resolution for the file
+        constants: Columns with one value for the whole batch (org, lineage)
+
+    Returns:
+        Record batch with the standard CUR columns, extra field mappings,
+        tag / cost category JSON and the constant columns
+    """
+    length = batch.num_rows
+    names: List[str] = []
+    arrays: List[pa.Array] = []
+
+    for target, _, _, kind, default in CUR_FIELDS:
+        source = column_map.fields[target]
+        if source is None:
+            if kind == FLOAT:
+                arr = pa.repeat(pa.scalar(0.0, pa.float64()), length)
+            elif default is not None:
+                arr = pa.repeat(pa.scalar(default, pa.string()), length)
+            else:
+                arr = _null_array(length)
+        else:
+            arr = batch.column(source)
+            if kind == FLOAT:
+                arr = to_float64(arr)
+            elif kind == DATE:
+                arr = to_date_string(arr)
+            elif default is not None:
+                arr = _with_default(arr, default)
+        names.append(target)
+        arrays.append(arr)
+
+    for target, source in column_map.extra.items():
+        names.append(target)
+        arrays.append(batch.column(source))
+
+    names += ["resource_tags_json", "cost_category_json"]
+    arrays.append(build_json_object(batch, column_map.tags))
+    arrays.append(build_json_object(batch, column_map.cost_categories))
+
+    for name, value in constants.items():
+        names.append(name)
+        arrays.append(pa.repeat(pa.scalar(value, pa.string()), length))
+
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+# ============================================
+# File Streaming
+# ============================================
+
+def read_csv_header(path: str, is_gzip: bool) -> List[str]:
+    """Column names from the first line of a (gzipped) CSV."""
+    opener = gzip.open if is_gzip else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def iter_cur_batches(
+    path: str,
+    file_format: str,
+    is_gzip: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    field_mappings: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[CURColumnMap, pa.RecordBatch]]:
+    """
+    Stream a local CUR file as projected record batches.
+
+    Parquet is read row group by row group; CSV block by block with every
+    column read as a string (as csv.DictReader would).
+
+    Yields:
+        (column map, raw batch) pairs; the column map is the same object for
+        every batch of the file
+    """
+    if file_format == "parquet":
+        parquet = pq.ParquetFile(path)
+        column_map = CURColumnMap(parquet.schema_arrow.names, field_mappings)
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=column_map.projection):
+            yield column_map, batch
+        return
+
+    column_map = CURColumnMap(read_csv_header(path, is_gzip), field_mappings)
+    projection = column_map.projection
+    if not projection:
+        return
+    source = pa.input_stream(path, compression="gzip" if is_gzip else None)
+    reader = pacsv.open_csv(
+        source,
+        # Rough block size targeting batch_size rows of a typical CUR line
+        read_options=pacsv.ReadOptions(block_size=max(1 << 20, batch_size * 256)),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=projection,
+            column_types={c: pa.string() for c in projection},
+            strings_can_be_null=False,
+        ),
+    )
+    try:
+        for batch in reader:
+            yield column_map, batch
+    finally:
+        source.close()
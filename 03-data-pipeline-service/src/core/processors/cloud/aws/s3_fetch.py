@@ -0,0 +1,395 @@
+"""
+Async S3 Object Fetching
+
+Non-blocking, concurrent S3 access for the CUR extractor:
+- boto3 calls run on a dedicated bounded thread pool, never on the event loop
+- Bounded concurrent downloads, yielded in completion order so parsing and
+  loading of one file overlaps the download of the next ones
+- Large objects fetched as parallel ranged GETs (pinned to the listed ETag)
+  written straight into a preallocated local file
+- ETag manifest of already-ingested files, so unchanged CUR objects are
+  skipped on re-runs while rewritten ones are picked up again
+
+SECURITY: Manifest entries are stored per org_slug for multi-tenant isolation.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 8
+# Objects at least this large are fetched as parallel ranged GETs
+DEFAULT_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_MAX_PART_CONCURRENCY = 4
+READ_CHUNK_SIZE = 1024 * 1024
+
+CUR_FILE_SUFFIXES = (".parquet", ".csv.gz", ".csv")
+
+
+@dataclass(frozen=True)
+class S3Object:
+    """A listed S3 object."""
+    key: str
+    etag: str
+    size: int
+
+
+@dataclass
+class S3FetchStats:
+    """Counters for observing fetch throughput."""
+    files_downloaded: int = 0
+    bytes_downloaded: int = 0
+    ranged_parts: int = 0
+    download_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _normalise_etag(etag: Optional[str]) -> str:
+    return (etag or "").strip('"')
+
+
+# ============================================
+# Fetcher
+# ============================================
+
+class AsyncS3Fetcher:
+    """
+    Concurrent, non-blocking S3 listing and downloads over a boto3 client.
+
+    boto3 clients are thread-safe, so one client is shared by all workers.
+
+    Args:
+        client: boto3 S3 client (or any object with the same API)
+        max_concurrent_downloads: Files downloaded (or waiting to be consumed) at once
+        multipart_threshold: Size from which objects use ranged GETs
+        part_size: Bytes per ranged GET
+        max_part_concurrency: Parallel ranged GETs per object
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrent_downloads: int = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+        multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_part_concurrency: int = DEFAULT_MAX_PART_CONCURRENCY,
+    ):
+        self.client = client
+        self.max_concurrent_downloads = max(1, max_concurrent_downloads)
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.max_part_concurrency = max(1, max_part_concurrency)
+        self.stats = S3FetchStats()
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(64, self.max_concurrent_downloads * self.max_part_concurrency),
+            thread_name_prefix="s3-fetch",
+        )
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        """Stop the fetch thread pool."""
+        self._executor.shutdown(wait=False)
+
+    # ------------------------------------------
+    # Listing
+    # ------------------------------------------
+
+    def _list_sync(self, bucket: str, prefix: str, suffixes: Tuple[str, ...]) -> List[S3Object]:
+        objects = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                if key.endswith(suffixes):
+                    objects.append(S3Object(
+                        key=key,
+                        etag=_normalise_etag(obj.get("ETag")),
+                        size=int(obj.get("Size", 0)),
+                    ))
+        return objects
+
+    async def list_objects(
+        self,
+        bucket: str,
+        prefix: str,
+        suffixes: Tuple[str, ...] = CUR_FILE_SUFFIXES,
+    ) -> List[S3Object]:
+        """List objects under a prefix (with ETag and size) without blocking the loop."""
+        return await self._run(self._list_sync, bucket, prefix, suffixes)
+
+    # ------------------------------------------
+    # Downloads
+    # ------------------------------------------
+
+    def _copy_body(self, body, fd: int, offset: int) -> int:
+        written = 0
+        try:
+            while True:
+                chunk = body.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    return written
+                os.pwrite(fd, chunk, offset + written)
+                written += len(chunk)
+        finally:
+            body.close()
+
+    def _get_range_sync(self, bucket: str, obj: S3Object, fd: int, start: int, end: int) -> int:
+        kwargs = {"Bucket": bucket, "Key": obj.key, "Range": f"bytes={start}-{end}"}
+        if obj.etag:
+            # Fail rather than stitch together parts of two object versions
+            kwargs["IfMatch"] = obj.etag
+        response = self.client.get_object(**kwargs)
+        written = self._copy_body(response["Body"], fd, start)
+        if written != end - start + 1:
+            raise IOError(f"Short ranged read for s3://{bucket}/{obj.key} bytes {start}-{end}")
+        return written
+
+    def _get_whole_sync(self, bucket: str, obj: S3Object, fd: int) -> int:
+        response = self.client.get_object(Bucket=bucket, Key=obj.key)
+        return self._copy_body(response["Body"], fd, 0)
+
+    async def download(self, bucket: str, obj: S3Object, path: str) -> str:
+        """
+        Download one object to a local path.
+
+        Objects at or above multipart_threshold are split into part_size
+        ranges fetched in parallel and written at their offsets.
+
+        Returns:
+            The local path
+        """
+        started = time.monotonic()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            if obj.size >= self.multipart_threshold and obj.size > self.part_size:
+                os.ftruncate(fd, obj.size)
+                ranges = [
+                    (start, min(start + self.part_size, obj.size) - 1)
+                    for start in range(0, obj.size, self.part_size)
+                ]
+                parts = asyncio.Semaphore(self.max_part_concurrency)
+
+                async def fetch_part(start: int, end: int) -> int:
+                    async with parts:
+                        return await self._run(self._get_range_sync, bucket, obj, fd, start, end)
+
+                written = sum(await asyncio.gather(*(fetch_part(s, e) for s, e in ranges)))
+                ranged = len(ranges)
+            else:
+                written = await self._run(self._get_whole_sync, bucket, obj, fd)
+                ranged = 0
+        finally:
+            os.close(fd)
+
+        with self._lock:
+            self.stats.files_downloaded += 1
+            self.stats.bytes_downloaded += written
+            self.stats.ranged_parts += ranged
+            self.stats.download_seconds += time.monotonic() - started
+        return path
+
+    async def iter_downloads(
+        self,
+        bucket: str,
+        objects: Sequence[S3Object],
+        dest_dir: str,
+    ) -> AsyncIterator[Tuple[S3Object, str]]:
+        """
+        Download objects concurrently, yielding each as soon as it lands.
+
+        At most max_concurrent_downloads files are downloading or waiting to
+        be consumed, which bounds local disk use. Each file is deleted once
+        the consumer moves on to the next one.
+
+        Yields:
+            (object, local path) in completion order
+
+        Raises:
+            The first download error; outstanding downloads are cancelled
+        """
+        slots = asyncio.Semaphore(self.max_concurrent_downloads)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def fetch(index: int, obj: S3Object) -> None:
+            await slots.acquire()
+            path = os.path.join(dest_dir, f"{index:06d}-{os.path.basename(obj.key) or 'object'}")
+            try:
+                await self.download(bucket, obj, path)
+                done.put_nowait((obj, path, None))
+            except Exception as e:
+                done.put_nowait((obj, path, e))
+
+        tasks = [asyncio.create_task(fetch(i, obj)) for i, obj in enumerate(objects)]
+        try:
+            for _ in range(len(objects)):
+                obj, path, error = await done.get()
+                try:
+                    if error is not None:
+                        raise error
+                    yield obj, path
+                finally:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    slots.release()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ============================================
+# Ingestion Manifest
+# ============================================
+
+class CURFileManifest:
+    """
+    Record of CUR objects already ingested, keyed by (bucket, key) -> ETag.
+
+    In-memory base implementation; BigQueryCURFileManifest persists it.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], str] = {}
+
+    def load(self, org_slug: str, bucket: str, prefix: str) -> Dict[str, str]:
+        """ETags of ingested objects under a prefix, by key."""
+        return {
+            key: etag
+            for (org, b, key), etag in self._entries.items()
+            if org == org_slug and b == bucket and key.startswith(prefix)
+        }
+
+    def record(
+        self,
+        org_slug: str,
+        bucket: str,
+        objects: Iterable[S3Object],
+        pipeline_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> None:
+        """Mark objects as ingested at their current ETag."""
+        for obj in objects:
+            self._entries[(org_slug, bucket, obj.key)] = obj.etag
+
+    def pending(
+        self,
+        org_slug: str,
+        bucket: str,
+        prefix: str,
+        objects: Sequence[S3Object],
+    ) -> List[S3Object]:
+        """Objects that are new or whose ETag changed since they were ingested."""
+        ingested = self.load(org_slug, bucket, prefix)
+        return [obj for obj in objects if not obj.etag or ingested.get(obj.key) != obj.etag]
+
+
+class BigQueryCURFileManifest(CURFileManifest):
+    """
+    CUR file manifest stored in BigQuery (organizations.cur_file_manifest).
+
+    Append-only: each ingestion adds a row, and the latest ingested_at per
+    object wins when loading.
+    """
+
+    def __init__(self, bq_client, project_id: Optional[str] = None):
+        super().__init__()
+        from src.app.config import get_settings
+
+        self.bq_client = bq_client
+        self.project_id = project_id or get_settings().gcp_project_id
+        self.table_id = f"{self.project_id}.organizations.cur_file_manifest"
+        self._ensure_table_exists()
+
+    def _ensure_table_exists(self) -> None:
+        from google.cloud import bigquery
+
+        schema = [
+            bigquery.SchemaField("org_slug", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("bucket", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("object_key", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("etag", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("size_bytes", "INTEGER", mode="NULLABLE"),
+            bigquery.SchemaField("pipeline_id", "STRING", mode="NULLABLE"),
+            bigquery.SchemaField("run_id", "STRING", mode="NULLABLE"),
+            bigquery.SchemaField("ingested_at", "TIMESTAMP", mode="REQUIRED"),
+        ]
+        try:
+            self.bq_client.create_table(bigquery.Table(self.table_id, schema=schema), exists_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not create CUR manifest table (may already exist): {e}")
+
+    def load(self, org_slug: str, bucket: str, prefix: str) -> Dict[str, str]:
+        from google.cloud import bigquery
+
+        query = f"""
+        SELECT object_key, etag
+        FROM `{self.table_id}`
+        WHERE org_slug = @org_slug
+            AND bucket = @bucket
+            AND STARTS_WITH(object_key, @prefix)
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY object_key ORDER BY ingested_at DESC) = 1
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
+                bigquery.ScalarQueryParameter("bucket", "STRING", bucket),
+                bigquery.ScalarQueryParameter("prefix", "STRING", prefix),
+            ]
+        )
+        try:
+            rows = self.bq_client.query(query, job_config=job_config).result()
+            return {row["object_key"]: row["etag"] for row in rows}
+        except Exception as e:
+            # Without a manifest every file is treated as new
+            logger.warning(f"Could not load CUR manifest for {org_slug}: {e}")
+            return {}
+
+    def record(
+        self,
+        org_slug: str,
+        bucket: str,
+        objects: Iterable[S3Object],
+        pipeline_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> None:
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "org_slug": org_slug,
+                "bucket": bucket,
+                "object_key": obj.key,
+                "etag": obj.etag,
+                "size_bytes": obj.size,
+                "pipeline_id": pipeline_id,
+                "run_id": run_id,
+                "ingested_at": ingested_at,
+            }
+            for obj in objects
+        ]
+        if not rows:
+            return
+        errors = self.bq_client.insert_rows_json(self.table_id, rows)
+        if errors:
+            logger.warning(f"Failed to record {len(errors)} CUR manifest entries for {org_slug}: {errors[:3]}")
@@ -4,18 +4,36 @@ Azure Cost Management Extractor
 Extracts cost data from Azure Cost Management API.
 Uses AzureAuthenticator for OAuth2 authentication.
 
+The date range is split into day/week chunks queried concurrently (see
+cost_query.CostQueryEngine), following nextLink pagination and backing off
+on Azure's throttling headers. Pages are mapped and streamed to BigQuery
+(when the step has a destination) or to a spilled step output as they arrive.
+
 ps_type: cloud.azure.cost_extractor
 """
 
+import contextlib
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
 import uuid
 
 import httpx
+import pyarrow as pa
 
 from src.core.processors.cloud.azure.authenticator import AzureAuthenticator
+from src.core.processors.cloud.azure.cost_query import (
+    DEFAULT_CHUNK_DAYS,
+    DEFAULT_MAX_CONCURRENT_QUERIES,
+    CostPage,
+    CostQueryEngine,
+    get_cost_management_http_client,
+    split_date_range,
+)
 from src.app.config import get_settings
+from src.core.engine.arrow_loader import DEFAULT_FLUSH_ROWS, ArrowBigQueryAppender
+from src.core.engine.step_output import CONTEXT_KEY, STEP_OUTPUT_KEY, StepDatasetWriter
+from src.core.processors.generic.bq_loader import BQLoader
 from src.core.utils.validators import (
     is_valid_org_slug,
     is_valid_date_format,
@@ -24,6 +42,13 @@ from src.core.utils.validators import (
 
 logger = logging.getLogger(__name__)
 
+# Arrow types of mapped columns that are not strings
+_FLOAT_COLUMNS = {
+    "cost_in_billing_currency", "usage_quantity", "cost_in_usd",
+    "exchange_rate", "effective_price", "unit_price",
+}
+_BOOL_COLUMNS = {"is_azure_credit_eligible"}
+
 
 class AzureCostExtractor:
     """
@@ -32,10 +57,17 @@ class AzureCostExtractor:
     Uses the Cost Management Query API to retrieve cost and usage data.
     """
 
-    def __init__(self, org_slug: Optional[str] = None):
+    def __init__(
+        self,
+        org_slug: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.org_slug = org_slug
         self.settings = get_settings()
         self._auth: Optional[AzureAuthenticator] = None
+        # Defaults to the pooled client shared by all Cost Management queries
+        self.http_client = http_client
+        self._row_schema: Optional[pa.Schema] = None
 
     async def execute(
         self,
@@ -46,11 +78,15 @@ class AzureCostExtractor:
         Extract Azure cost data.
 
         Args:
-            step_config: Configuration with date_filter, granularity
-            context: Pipeline context with org_slug
+            step_config: Configuration with date_filter (or start_date/end_date),
+                         granularity, chunk_days, max_concurrent_queries and an
+                         optional "destination" block; pipeline YAMLs may put
+                         these under a "source" block
+            context: Pipeline context with org_slug (and start_date/end_date)
 
         Returns:
-            Dict with extracted cost rows and metadata
+            Dict with row counts and metadata; without a destination it also
+            carries the handle of the spilled step output
         """
         # ERR-002 FIX: Get org_slug from context if not set in constructor
         if not self.org_slug:
@@ -63,18 +99,34 @@ class AzureCostExtractor:
             return {"status": "FAILED", "error": f"Invalid org_slug format: {self.org_slug}"}
 
         config = step_config.get("config", {})
+        source = step_config.get("source", {})
         date_filter = config.get("date_filter") or context.get("date")
-        granularity = config.get("granularity", "Daily")
+        granularity = config.get("granularity") or source.get("granularity") or "Daily"
+        chunk_days = int(config.get("chunk_days") or source.get("chunk_days") or DEFAULT_CHUNK_DAYS)
+        max_concurrent = int(
+            config.get("max_concurrent_queries")
+            or source.get("max_concurrent_queries")
+            or DEFAULT_MAX_CONCURRENT_QUERIES
+        )
+        flush_rows = int(config.get("flush_rows", DEFAULT_FLUSH_ROWS))
+        destination = config.get("destination") or step_config.get("destination")
 
         # MT-FIX: Validate date format to prevent injection
         if date_filter and not is_valid_date_format(date_filter):
             return {"status": "FAILED", "error": f"Invalid date format: {date_filter}. Expected YYYY-MM-DD"}
 
+        try:
+            start_date, end_date = self._resolve_date_range(date_filter, config, context)
+        except ValueError as e:
+            return {"status": "FAILED", "error": str(e)}
+        chunks = split_date_range(start_date, end_date, chunk_days)
+
         logger.info(
             f"Extracting Azure cost data",
             extra={
                 "org_slug": self.org_slug,
-                "date": date_filter,
+                "date_range": f"{start_date} to {end_date}",
+                "chunks": len(chunks),
                 "granularity": granularity
             }
         )
@@ -89,84 +141,131 @@ class AzureCostExtractor:
             if not is_valid_azure_subscription_id(subscription_id):
                 return {"status": "FAILED", "error": f"Invalid Azure subscription ID format: {subscription_id}"}
 
-            # Parse date range
-            if date_filter:
-                start_date = datetime.strptime(date_filter, "%Y-%m-%d")
-            else:
-                start_date = datetime.now() - timedelta(days=1)
-            end_date = start_date + timedelta(days=1)
+            engine = CostQueryEngine(
+                http_client=self.http_client or get_cost_management_http_client(),
+                url=(
+                    f"{client_config['base_url']}/subscriptions/{subscription_id}"
+                    f"/providers/Microsoft.CostManagement/query"
+                ),
+                headers=client_config["headers"],
+                api_version=source.get("api_version") or client_config["api_version"],
+                max_concurrent_queries=max_concurrent,
+            )
 
             # Generate lineage metadata
             run_id = str(uuid.uuid4())
-            pipeline_id = context.get("pipeline_id", "cloud_cost_azure")
-            credential_id = context.get("credential_id", "")
-            pipeline_run_date = date_filter or start_date.strftime("%Y-%m-%d")
-            ingested_at = datetime.now(timezone.utc).isoformat()
-
-            # Query Cost Management API
-            rows = await self._query_costs(
-                client_config,
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d"),
-                granularity
-            )
-
-            # Add standardized lineage columns to each row
-            for row in rows:
-                row["x_pipeline_id"] = pipeline_id
-                row["x_credential_id"] = credential_id
-                row["x_pipeline_run_date"] = pipeline_run_date
-                row["x_run_id"] = run_id
-                row["x_ingested_at"] = ingested_at
-
-            # Store in context for downstream steps
-            context["extracted_data"] = rows
+            lineage = {
+                "x_pipeline_id": context.get("pipeline_id", "cloud_cost_azure"),
+                "x_credential_id": context.get("credential_id", ""),
+                "x_pipeline_run_date": date_filter or start_date.isoformat(),
+                "x_run_id": run_id,
+                "x_ingested_at": datetime.now(timezone.utc).isoformat(),
+            }
 
+            # Pages stream straight into BigQuery with a destination, otherwise
+            # into a spilled step output for a bq_loader step
+            appender = None
+            writer: Optional[StepDatasetWriter] = None
+            if destination and destination.get("table"):
+                appender = await self._create_appender(destination, run_id, flush_rows)
+            else:
+                writer = StepDatasetWriter(
+                    context.get("run_id") or run_id, context.get("step_id", "azure_cost_extract")
+                )
+
+            row_count = 0
+            try:
+                pages = engine.iter_pages(self._query_body(granularity), chunks)
+                async with contextlib.aclosing(pages):
+                    async for page in pages:
+                        rows = self._map_page(page, subscription_id, lineage)
+                        if not rows:
+                            continue
+                        batch = pa.RecordBatch.from_pylist(rows, schema=self._schema_for(rows[0]))
+                        if appender is not None:
+                            await appender.append(batch)
+                        else:
+                            writer.write_batch(batch)
+                        row_count += len(rows)
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+
+            date_range = f"{start_date} to {end_date}"
             logger.info(
                 f"Azure cost extraction complete",
                 extra={
                     "org_slug": self.org_slug,
-                    "row_count": len(rows),
-                    "date_range": f"{start_date.date()} to {end_date.date()}"
+                    "row_count": row_count,
+                    "date_range": date_range,
+                    "requests": engine.stats.requests,
+                    "throttled": engine.stats.throttled
                 }
             )
 
-            return {
+            result = {
                 "status": "SUCCESS",
-                "rows": rows,
-                "row_count": len(rows),
+                "row_count": row_count,
                 "subscription_id": client_config["subscription_id"],
-                "date_range": f"{start_date.date()} to {end_date.date()}"
+                "date_range": date_range,
+                "chunks": len(chunks),
+                "pages": engine.stats.pages,
+                "throttled_requests": engine.stats.throttled,
+                # x_pipeline_run_date of the written rows, for partition-scoped FOCUS conversion
+                "output_run_dates": [lineage["x_pipeline_run_date"]] if row_count else []
             }
+            if appender is not None:
+                result["rows_loaded"] = await appender.close()
+                result["load_jobs"] = appender.load_jobs
+                result["destination_table"] = appender.table_id
+            else:
+                dataset = writer.close()
+                context[CONTEXT_KEY] = dataset
+                result[STEP_OUTPUT_KEY] = dataset.to_dict()
+            return result
 
         except Exception as e:
             logger.error(f"Azure cost extraction failed: {e}", exc_info=True)
             return {"status": "FAILED", "error": str(e)}
 
-    async def _query_costs(
-        self,
-        client_config: Dict[str, Any],
-        start_date: str,
-        end_date: str,
-        granularity: str
-    ) -> List[Dict[str, Any]]:
-        """Query Azure Cost Management API and map to schema columns."""
-        subscription_id = client_config["subscription_id"]
-        api_version = client_config["api_version"]
-
-        url = (
-            f"{client_config['base_url']}/subscriptions/{subscription_id}"
-            f"/providers/Microsoft.CostManagement/query"
-        )
+    @staticmethod
+    def _resolve_date_range(
+        date_filter: Optional[str],
+        config: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[date, date]:
+        """
+        Resolve the extraction range as [start, end) dates.
 
-        # Cost Management Query payload - request all needed dimensions
-        query_body = {
+        date_filter selects one day; otherwise start_date/end_date (inclusive)
+        from the step config or pipeline context; otherwise yesterday.
+        """
+        if date_filter:
+            start = datetime.strptime(date_filter, "%Y-%m-%d").date()
+            return start, start + timedelta(days=1)
+
+        start_raw = config.get("start_date") or context.get("start_date")
+        end_raw = config.get("end_date") or context.get("end_date") or start_raw
+        if not start_raw:
+            start = datetime.now(timezone.utc).date() - timedelta(days=1)
+            return start, start + timedelta(days=1)
+
+        for value in (start_raw, end_raw):
+            if not is_valid_date_format(str(value)):
+                raise ValueError(f"Invalid date format: {value}. Expected YYYY-MM-DD")
+        start = datetime.strptime(str(start_raw), "%Y-%m-%d").date()
+        end = datetime.strptime(str(end_raw), "%Y-%m-%d").date()
+        if end < start:
+            raise ValueError(f"end_date {end} is before start_date {start}")
+        return start, end + timedelta(days=1)
+
+    @staticmethod
+    def _query_body(granularity: str) -> Dict[str, Any]:
+        """Cost Management Query payload; timePeriod is set per chunk."""
+        return {
             "type": "Usage",
             "timeframe": "Custom",
-            "timePeriod": {
-                "from": f"{start_date}T00:00:00Z",
-                "to": f"{end_date}T00:00:00Z"
-            },
             "dataset": {
                 "granularity": granularity,
                 "aggregation": {
@@ -193,91 +292,145 @@ class AzureCostExtractor:
             }
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=client_config["headers"],
-                params={"api-version": api_version},
-                json=query_body,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        # Get column names from response
-        columns = [col["name"] for col in data.get("properties", {}).get("columns", [])]
-        ingestion_ts = datetime.now(timezone.utc).isoformat()
-
-        # Transform response to rows with proper schema mapping
-        rows = []
-        for row_data in data.get("properties", {}).get("rows", []):
-            api_row = dict(zip(columns, row_data))
-
-            # Map Azure API columns to schema columns (snake_case)
-            row = {
-                # Required fields
-                "usage_date": start_date,
-                "x_org_slug": self.org_slug,
+    def _map_page(
+        self,
+        page: CostPage,
+        subscription_id: str,
+        lineage: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Map one page of API rows to schema columns."""
+        default_date = page.chunk[0].isoformat()
+        return [
+            self._map_row(dict(zip(page.columns, row_data)), subscription_id, default_date, lineage)
+            for row_data in page.rows
+        ]
+
+    def _map_row(
+        self,
+        api_row: Dict[str, Any],
+        subscription_id: str,
+        default_date: str,
+        lineage: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Map Azure API columns to schema columns (snake_case)."""
+        row = {
+            # Required fields
+            "usage_date": self._usage_date(api_row.get("UsageDate"), default_date),
+            "x_org_slug": self.org_slug,
+            "provider": "azure",
+            "subscription_id": subscription_id,
+            "cost_in_billing_currency": float(api_row.get("Cost", 0) or 0),
+            "ingestion_timestamp": lineage["x_ingested_at"],
+
+            # Map Azure API response to schema fields
+            "subscription_name": None,  # Not available in query API
+            "resource_group": api_row.get("ResourceGroup"),
+            "resource_id": api_row.get("ResourceId"),
+            "resource_name": self._extract_resource_name(api_row.get("ResourceId")),
+            "resource_type": api_row.get("ResourceType"),
+            "resource_location": api_row.get("ResourceLocation"),
+            "service_name": api_row.get("ServiceName"),
+            "service_tier": api_row.get("ServiceTier"),
+            "service_family": api_row.get("ServiceFamily"),
+            "meter_id": api_row.get("Meter"),
+            "meter_name": api_row.get("MeterName"),
+            "meter_category": api_row.get("MeterCategory"),
+            "meter_subcategory": api_row.get("MeterSubCategory"),
+            "meter_region": api_row.get("ResourceLocation"),
+            "charge_type": api_row.get("ChargeType", "Usage"),
+            "usage_quantity": float(api_row.get("UsageQuantity", 0) or 0),
+            "unit_of_measure": "Units",  # Default, API doesn't always provide
+            "cost_in_usd": float(api_row.get("CostUSD", 0) or 0),
+            "billing_currency": api_row.get("BillingCurrency", "USD"),
+            "pricing_model": api_row.get("PricingModel", "OnDemand"),
+
+            # Optional fields - set to None if not available
+            "product_name": api_row.get("ServiceName"),
+            "product_order_id": None,
+            "product_order_name": None,
+            "consumed_service": api_row.get("ServiceName"),
+            "billing_period_start": None,
+            "billing_period_end": None,
+            "usage_start_time": None,
+            "usage_end_time": None,
+            "exchange_rate": None,
+            "effective_price": None,
+            "unit_price": None,
+            "reservation_id": None,
+            "reservation_name": None,
+            "frequency": None,
+            "publisher_type": "Azure",
+            "publisher_name": None,
+            "invoice_id": None,
+            "invoice_section_id": None,
+            "invoice_section_name": None,
+            "billing_account_id": None,
+            "billing_account_name": None,
+            "billing_profile_id": None,
+            "billing_profile_name": None,
+            "cost_center": None,
+            "benefit_id": None,
+            "benefit_name": None,
+            "is_azure_credit_eligible": None,
+            "resource_tags_json": None,
+        }
+        # Add standardized lineage columns
+        row.update(lineage)
+        return row
+
+    def _schema_for(self, row: Dict[str, Any]) -> pa.Schema:
+        """Fixed Arrow schema for mapped rows, so every page shares one schema."""
+        if self._row_schema is None:
+            self._row_schema = pa.schema([
+                (name, pa.float64() if name in _FLOAT_COLUMNS
+                 else pa.bool_() if name in _BOOL_COLUMNS else pa.string())
+                for name in row
+            ])
+        return self._row_schema
+
+    @staticmethod
+    def _usage_date(value: Any, default: str) -> str:
+        """UsageDate arrives as an int (20260115) with Daily granularity."""
+        text = str(value) if value is not None else ""
+        if len(text) == 8 and text.isdigit():
+            return f"{text[:4]}-{text[4:6]}-{text[6:]}"
+        if len(text) >= 10 and is_valid_date_format(text[:10]):
+            return text[:10]
+        return default
+
+    async def _create_appender(
+        self,
+        destination: Dict[str, Any],
+        run_id: str,
+        flush_rows: int,
+    ) -> ArrowBigQueryAppender:
+        """Resolve the destination table (creating it from its schema template) and build an appender."""
+        table_name = destination["table"]
+        dataset_id = self.settings.get_org_dataset_name(self.org_slug)
+        table_id = f"{self.settings.gcp_project_id}.{dataset_id}.{table_name}"
+
+        loader = BQLoader(self.org_slug)
+        table = await loader._ensure_table_exists(
+            table_id,
+            {
+                "schema_template": destination.get("schema_template"),
                 "provider": "azure",
-                "subscription_id": subscription_id,
-                "cost_in_billing_currency": float(api_row.get("Cost", 0) or 0),
-                "ingestion_timestamp": ingestion_ts,
-
-                # Map Azure API response to schema fields
-                "subscription_name": None,  # Not available in query API
-                "resource_group": api_row.get("ResourceGroup"),
-                "resource_id": api_row.get("ResourceId"),
-                "resource_name": self._extract_resource_name(api_row.get("ResourceId")),
-                "resource_type": api_row.get("ResourceType"),
-                "resource_location": api_row.get("ResourceLocation"),
-                "service_name": api_row.get("ServiceName"),
-                "service_tier": api_row.get("ServiceTier"),
-                "service_family": api_row.get("ServiceFamily"),
-                "meter_id": api_row.get("Meter"),
-                "meter_name": api_row.get("MeterName"),
-                "meter_category": api_row.get("MeterCategory"),
-                "meter_subcategory": api_row.get("MeterSubCategory"),
-                "meter_region": api_row.get("ResourceLocation"),
-                "charge_type": api_row.get("ChargeType", "Usage"),
-                "usage_quantity": float(api_row.get("UsageQuantity", 0) or 0),
-                "unit_of_measure": "Units",  # Default, API doesn't always provide
-                "cost_in_usd": float(api_row.get("CostUSD", 0) or 0),
-                "billing_currency": api_row.get("BillingCurrency", "USD"),
-                "pricing_model": api_row.get("PricingModel", "OnDemand"),
-
-                # Optional fields - set to None if not available
-                "product_name": api_row.get("ServiceName"),
-                "product_order_id": None,
-                "product_order_name": None,
-                "consumed_service": api_row.get("ServiceName"),
-                "billing_period_start": None,
-                "billing_period_end": None,
-                "usage_start_time": None,
-                "usage_end_time": None,
-                "exchange_rate": None,
-                "effective_price": None,
-                "unit_price": None,
-                "reservation_id": None,
-                "reservation_name": None,
-                "frequency": None,
-                "publisher_type": "Azure",
-                "publisher_name": None,
-                "invoice_id": None,
-                "invoice_section_id": None,
-                "invoice_section_name": None,
-                "billing_account_id": None,
-                "billing_account_name": None,
-                "billing_profile_id": None,
-                "billing_profile_name": None,
-                "cost_center": None,
-                "benefit_id": None,
-                "benefit_name": None,
-                "is_azure_credit_eligible": None,
-                "resource_tags_json": None,
-            }
-            rows.append(row)
-
-        return rows
+                "domain": "cost",
+                "table_config": destination.get("table_config", {}),
+            },
+            {},
+        )
+        return ArrowBigQueryAppender(
+            client=loader.bq_client.client,
+            table_id=table_id,
+            schema=table.schema,
+            defaults={
+                "x_ingestion_id": run_id,
+                "x_ingestion_date": date.today().isoformat(),
+                "x_cloud_provider": "azure",
+            },
+            flush_rows=flush_rows,
+        )
 
     def _extract_resource_name(self, resource_id: str) -> str:
         """Extract resource name from Azure resource ID."""
@@ -0,0 +1,270 @@
+"""
+Azure Cost Management Query Engine
+
+Concurrent, paginated querying of the Cost Management Query API:
+- The date range is split into day/week chunks queried concurrently
+- Each chunk follows properties.nextLink until the result set is exhausted
+- 429 responses pause every in-flight chunk for the period advertised in
+  Azure's throttling headers (x-ms-ratelimit-*-retry-after / Retry-After)
+- Pages are yielded as they arrive (completion order), so callers can
+  stream rows to the loader instead of buffering the whole range
+- One pooled httpx.AsyncClient is shared by all extractions on an event loop
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Constants
+# ============================================
+
+DEFAULT_CHUNK_DAYS = 7
+DEFAULT_MAX_CONCURRENT_QUERIES = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_TIMEOUT_SECONDS = 60.0
+# Used when a 429 carries no retry-after header
+DEFAULT_THROTTLE_SECONDS = 10.0
+MAX_THROTTLE_SECONDS = 120.0
+
+# Cost Management advertises per-scope quotas in several headers; the
+# longest wait wins
+RETRY_AFTER_HEADERS = (
+    "x-ms-ratelimit-microsoft.costmanagement-qpu-retry-after",
+    "x-ms-ratelimit-microsoft.costmanagement-entity-retry-after",
+    "x-ms-ratelimit-microsoft.costmanagement-tenant-retry-after",
+    "x-ms-ratelimit-microsoft.costmanagement-clienttype-retry-after",
+    "retry-after",
+)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def split_date_range(start: date, end: date, chunk_days: int) -> List[Tuple[date, date]]:
+    """
+    Split [start, end) into consecutive chunks of at most chunk_days days.
+
+    Returns:
+        List of (chunk_start, chunk_end) pairs, chunk_end exclusive
+    """
+    chunk_days = max(1, chunk_days)
+    chunks = []
+    cursor = start
+    while cursor < end:
+        chunk_end = min(cursor + timedelta(days=chunk_days), end)
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end
+    return chunks
+
+
+def retry_after_seconds(headers: httpx.Headers) -> Optional[float]:
+    """Longest wait advertised by Azure's throttling headers, if any."""
+    waits = []
+    for name in RETRY_AFTER_HEADERS:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            waits.append(float(value))
+        except ValueError:
+            continue
+    return max(waits) if waits else None
+
+
+# ============================================
+# Shared HTTP client
+# ============================================
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_cost_management_http_client() -> httpx.AsyncClient:
+    """
+    Pooled AsyncClient shared by Cost Management queries on the running loop.
+
+    Connections (and TLS sessions) are reused across chunks, pages and
+    pipeline runs instead of being rebuilt per query.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        _clients[loop] = client
+    return client
+
+
+# ============================================
+# Query Engine
+# ============================================
+
+@dataclass
+class CostPage:
+    """One page of Cost Management query results."""
+    chunk: Tuple[date, date]
+    columns: List[str]
+    rows: List[List[Any]]
+
+
+@dataclass
+class CostQueryStats:
+    requests: int = 0
+    pages: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+
+
+class ThrottleGate:
+    """Pauses all requests of a query until a server-advertised time."""
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def block(self, seconds: float) -> None:
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def wait(self) -> float:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            return delay
+        return 0.0
+
+
+class CostQueryEngine:
+    """
+    Runs one Cost Management query over a date range as concurrent chunks.
+
+    Args:
+        http_client: httpx.AsyncClient (shared pooled client by default)
+        url: Query endpoint (.../providers/Microsoft.CostManagement/query)
+        headers: Authorization headers
+        api_version: Cost Management API version
+        max_concurrent_queries: Chunks queried at the same time
+        max_retries: Attempts per request on throttling / transient errors
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        api_version: str,
+        max_concurrent_queries: int = DEFAULT_MAX_CONCURRENT_QUERIES,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        self.http_client = http_client
+        self.url = url
+        self.headers = headers
+        self.api_version = api_version
+        self.max_concurrent_queries = max(1, max_concurrent_queries)
+        self.max_retries = max_retries
+        self.stats = CostQueryStats()
+        self._gate = ThrottleGate()
+
+    async def iter_pages(
+        self,
+        body: Dict[str, Any],
+        chunks: List[Tuple[date, date]],
+    ) -> AsyncIterator[CostPage]:
+        """
+        Yield result pages of every chunk in completion order.
+
+        Args:
+            body: Query body; timePeriod is set per chunk
+            chunks: (start, end) pairs from split_date_range
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent_queries * 2)
+        semaphore = asyncio.Semaphore(self.max_concurrent_queries)
+        done = object()
+
+        async def run_chunk(chunk: Tuple[date, date]) -> None:
+            async with semaphore:
+                async for page in self._iter_chunk(body, chunk):
+                    await queue.put(page)
+
+        async def run_all() -> None:
+            tasks = [asyncio.create_task(run_chunk(c)) for c in chunks]
+            try:
+                await asyncio.gather(*tasks)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(done)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        producer = asyncio.create_task(run_all())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _iter_chunk(self, body: Dict[str, Any], chunk: Tuple[date, date]) -> AsyncIterator[CostPage]:
+        chunk_start, chunk_end = chunk
+        chunk_body = {
+            **body,
+            "timeframe": "Custom",
+            # "to" is inclusive; ending on the last second keeps chunks disjoint
+            "timePeriod": {
+                "from": f"{chunk_start.isoformat()}T00:00:00Z",
+                "to": f"{(chunk_end - timedelta(days=1)).isoformat()}T23:59:59Z",
+            },
+        }
+        url: Optional[str] = self.url
+        params: Optional[Dict[str, str]] = {"api-version": self.api_version}
+        while url:
+            data = await self._post(url, params, chunk_body)
+            properties = data.get("properties", {})
+            self.stats.pages += 1
+            yield CostPage(
+                chunk=chunk,
+                columns=[col["name"] for col in properties.get("columns", [])],
+                rows=properties.get("rows", []),
+            )
+            # nextLink already carries api-version and the $skiptoken
+            url = properties.get("nextLink")
+            params = None
+
+    async def _post(self, url: str, params: Optional[Dict[str, str]], body: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            self.stats.throttle_wait_seconds += await self._gate.wait()
+            self.stats.requests += 1
+            response = await self.http_client.post(url, headers=self.headers, params=params, json=body)
+            if response.status_code not in _RETRYABLE_STATUS or attempt == self.max_retries:
+                response.raise_for_status()
+                return response.json()
+
+            wait = retry_after_seconds(response.headers)
+            if response.status_code == 429:
+                self.stats.throttled += 1
+                wait = min(wait if wait is not None else DEFAULT_THROTTLE_SECONDS, MAX_THROTTLE_SECONDS)
+                # Every chunk backs off, not just the one that was throttled
+                self._gate.block(wait)
+                logger.info(f"Cost Management throttled; pausing queries for {wait:.1f}s")
+            else:
+                await asyncio.sleep(wait if wait is not None else min(2 ** attempt, 30))
+        return {}
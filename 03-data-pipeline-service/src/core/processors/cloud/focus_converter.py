@@ -16,6 +16,8 @@ from google.cloud import bigquery
 from src.core.engine.bq_client import BigQueryClient
 from src.app.config import get_settings
 from src.core.utils.audit_logger import log_execute, AuditLogger
+from src.core.utils.query_performance import log_script_metrics
+from src.core.processors.generic.procedure_executor import call_with_concurrent_update_retry
 
 
 class CloudFOCUSConverterProcessor:
@@ -45,6 +47,8 @@ class CloudFOCUSConverterProcessor:
                 - config.start_date: Start date for range (new)
                 - config.end_date: End date for range (new)
                 - config.provider: Provider to convert (gcp, aws, azure, oci, all)
+                - config.run_dates: Extract run dates to convert (partition-scoped
+                  mode); defaults to output_run_dates of the extract step
             context: Execution context with org_slug, start_date, end_date
 
         Returns:
@@ -95,6 +99,11 @@ class CloudFOCUSConverterProcessor:
         else:
             return {"status": "FAILED", "error": "Either 'date' or 'start_date'+'end_date' is required"}
 
+        # Partition-scoped mode: only the charge days the upstream extract touched
+        run_dates = [self._parse_date(d) for d in (config.get("run_dates") or context.get("output_run_dates") or [])]
+        if None in run_dates:
+            return {"status": "FAILED", "error": "Invalid run_dates format"}
+
         dataset_id = self.settings.get_org_dataset_name(org_slug)
         project_id = self.settings.gcp_project_id
 
@@ -110,7 +119,8 @@ class CloudFOCUSConverterProcessor:
                 "action": "START",
                 "processor": "CloudFOCUSConverterProcessor",
                 "provider": provider,
-                "dates": len(dates_to_process)
+                "dates": len(dates_to_process),
+                "run_dates": len(run_dates)
             }
         )
 
@@ -135,33 +145,52 @@ class CloudFOCUSConverterProcessor:
                     @p_provider,
                     @p_pipeline_id,
                     @p_credential_id,
-                    @p_run_id
+                    @p_run_id,
+                    @p_run_dates
                 )
             """
 
-            job = bq_client.client.query(
-                call_query,
-                job_config=bigquery.QueryJobConfig(
-                    query_parameters=[
-                        bigquery.ScalarQueryParameter("p_project_id", "STRING", project_id),
-                        bigquery.ScalarQueryParameter("p_dataset_id", "STRING", dataset_id),
-                        bigquery.ScalarQueryParameter("p_start_date", "DATE", start_date),
-                        bigquery.ScalarQueryParameter("p_end_date", "DATE", end_date),
-                        bigquery.ScalarQueryParameter("p_provider", "STRING", provider),
-                        bigquery.ScalarQueryParameter("p_pipeline_id", "STRING", "focus_convert_cloud"),
-                        bigquery.ScalarQueryParameter("p_credential_id", "STRING", credential_id),
-                        bigquery.ScalarQueryParameter("p_run_id", "STRING", run_id),
-                    ]
-                )
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("p_project_id", "STRING", project_id),
+                    bigquery.ScalarQueryParameter("p_dataset_id", "STRING", dataset_id),
+                    bigquery.ScalarQueryParameter("p_start_date", "DATE", start_date),
+                    bigquery.ScalarQueryParameter("p_end_date", "DATE", end_date),
+                    bigquery.ScalarQueryParameter("p_provider", "STRING", provider),
+                    bigquery.ScalarQueryParameter("p_pipeline_id", "STRING", "focus_convert_cloud"),
+                    bigquery.ScalarQueryParameter("p_credential_id", "STRING", credential_id),
+                    bigquery.ScalarQueryParameter("p_run_id", "STRING", run_id),
+                    bigquery.ArrayQueryParameter("p_run_dates", "DATE", run_dates),
+                ]
             )
 
-            # Get result
-            result = list(job.result())
+            # Re-run on partition-level conflicts with other providers' conversions
+            job, result, _ = await call_with_concurrent_update_retry(
+                "sp_cloud_1_convert_to_focus",
+                lambda: bq_client.client.query(call_query, job_config=job_config),
+                lambda query_job: list(query_job.result()),
+                extra={"org_slug": org_slug, "provider": provider},
+            )
             total_rows_inserted = result[0]["rows_inserted"] if result else 0
+            partitions_replaced = result[0]["partitions_replaced"] if result else 0
+
+            query_metrics = log_script_metrics(
+                job,
+                operation="sp_cloud_1_convert_to_focus",
+                client=bq_client.client,
+                org_slug=org_slug,
+                additional_context={"provider": provider, "run_id": run_id}
+            )
 
             self.logger.info(
                 f"Converted {total_rows_inserted} {provider} records to FOCUS 1.3 (range: {start_date} to {end_date})",
-                extra={"rows_inserted": total_rows_inserted, "start_date": str(start_date), "end_date": str(end_date)}
+                extra={
+                    "rows_inserted": total_rows_inserted,
+                    "start_date": str(start_date),
+                    "end_date": str(end_date),
+                    "partition_scoped": bool(run_dates),
+                    "partitions_replaced": partitions_replaced
+                }
             )
 
             # SEC-005: Audit logging - Log successful completion
@@ -184,6 +213,10 @@ class CloudFOCUSConverterProcessor:
                 "start_date": str(start_date),
                 "end_date": str(end_date),
                 "provider": provider,
+                "partition_scoped": bool(run_dates),
+                "partitions_replaced": partitions_replaced,
+                "total_bytes_processed": query_metrics.get("total_bytes_processed"),
+                "slot_millis": query_metrics.get("slot_millis"),
                 "target_table": "cost_data_standard_1_3"
             }
 
@@ -758,7 +758,9 @@ class ExternalBqExtractor:
             "destination_table": full_table_id,
             "write_mode": write_mode,
             "schema_template": schema_template_name,
-            "use_org_credentials": use_org_credentials
+            "use_org_credentials": use_org_credentials,
+            # x_pipeline_run_date of the loaded rows, for partition-scoped FOCUS conversion
+            "output_run_dates": [pipeline_run_date] if row_count else []
         }
 
     @retry_on_transient_error(max_retries=3, backoff_seconds=1)
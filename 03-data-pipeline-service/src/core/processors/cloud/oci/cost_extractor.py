@@ -7,13 +7,15 @@ Uses OCIAuthenticator for API key signature authentication.
 ps_type: cloud.oci.cost_extractor
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime, timedelta, timezone
 import uuid
 
 from src.core.processors.cloud.oci.authenticator import OCIAuthenticator
 from src.app.config import get_settings
+from src.core.engine.step_output import CONTEXT_KEY, STEP_OUTPUT_KEY, StepDatasetWriter
 from src.core.utils.validators import (
     is_valid_org_slug,
     is_valid_date_format,
@@ -100,137 +102,155 @@ class OCICostExtractor:
             pipeline_run_date = date_filter or start_date.strftime("%Y-%m-%d")
             ingested_at = datetime.now(timezone.utc).isoformat()
 
-            # Query Usage API
-            rows = await self._query_costs(
-                start_date.strftime("%Y-%m-%dT00:00:00Z"),
-                end_date.strftime("%Y-%m-%dT00:00:00Z"),
-                granularity
+            # Spill each Usage API page to a step output as it arrives; only
+            # the handle goes downstream, so memory is bounded by one page
+            writer = StepDatasetWriter(
+                context.get("run_id") or run_id, context.get("step_id", "oci_cost_extract")
             )
-
-            # Add standardized lineage columns to each row
-            for row in rows:
-                row["x_pipeline_id"] = pipeline_id
-                row["x_credential_id"] = credential_id
-                row["x_pipeline_run_date"] = pipeline_run_date
-                row["x_run_id"] = run_id
-                row["x_ingested_at"] = ingested_at
-
-            # Store in context for downstream steps
-            context["extracted_data"] = rows
+            row_count = 0
+            try:
+                async for rows in self._iter_cost_pages(
+                    start_date.strftime("%Y-%m-%dT00:00:00Z"),
+                    end_date.strftime("%Y-%m-%dT00:00:00Z"),
+                    granularity
+                ):
+                    # Add standardized lineage columns to each row
+                    for row in rows:
+                        row["x_pipeline_id"] = pipeline_id
+                        row["x_credential_id"] = credential_id
+                        row["x_pipeline_run_date"] = pipeline_run_date
+                        row["x_run_id"] = run_id
+                        row["x_ingested_at"] = ingested_at
+                    writer.write_rows(rows)
+                    row_count += len(rows)
+            except BaseException:
+                writer.abort()
+                raise
+            dataset = writer.close()
+            context[CONTEXT_KEY] = dataset
 
             logger.info(
                 f"OCI cost extraction complete",
                 extra={
                     "org_slug": self.org_slug,
-                    "row_count": len(rows),
+                    "row_count": row_count,
                     "tenancy": self._auth.tenancy_ocid
                 }
             )
 
             return {
                 "status": "SUCCESS",
-                "rows": rows,
-                "row_count": len(rows),
+                STEP_OUTPUT_KEY: dataset.to_dict(),
+                "row_count": row_count,
                 "tenancy_ocid": self._auth.tenancy_ocid,
                 "region": self._auth.region,
-                "date_range": f"{start_date.date()} to {end_date.date()}"
+                "date_range": f"{start_date.date()} to {end_date.date()}",
+                # x_pipeline_run_date of the written rows, for partition-scoped FOCUS conversion
+                "output_run_dates": [pipeline_run_date] if row_count else []
             }
 
         except Exception as e:
             logger.error(f"OCI cost extraction failed: {e}", exc_info=True)
             return {"status": "FAILED", "error": str(e)}
 
-    async def _query_costs(
+    async def _iter_cost_pages(
         self,
         start_time: str,
         end_time: str,
         granularity: str
-    ) -> List[Dict[str, Any]]:
-        """Query OCI Usage API for cost data."""
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Query OCI Usage API for cost data, yielding the rows of one page at a time."""
         try:
             import oci
+        except ImportError:
+            logger.warning("OCI SDK not installed, using REST API fallback")
+            rows = await self._query_costs_rest(start_time, end_time, granularity)
+            if rows:
+                yield rows
+            return
 
-            config = await self._auth.get_oci_config()
-            usage_client = oci.usage_api.UsageapiClient(config)
-
-            # Create usage request
-            request_summarized_usages_details = oci.usage_api.models.RequestSummarizedUsagesDetails(
-                tenant_id=self._auth.tenancy_ocid,
-                time_usage_started=start_time,
-                time_usage_ended=end_time,
-                granularity=granularity,
-                query_type="COST",
-                group_by=["service", "compartmentName", "region", "resourceId"],
-                compartment_depth=5
-            )
+        config = await self._auth.get_oci_config()
+        usage_client = oci.usage_api.UsageapiClient(config)
+
+        # Create usage request
+        request_summarized_usages_details = oci.usage_api.models.RequestSummarizedUsagesDetails(
+            tenant_id=self._auth.tenancy_ocid,
+            time_usage_started=start_time,
+            time_usage_ended=end_time,
+            granularity=granularity,
+            query_type="COST",
+            group_by=["service", "compartmentName", "region", "resourceId"],
+            compartment_depth=5
+        )
 
-            response = usage_client.request_summarized_usages(
-                request_summarized_usages_details
+        ingestion_ts = datetime.now(timezone.utc).isoformat()
+        page = None
+        while True:
+            # The SDK call blocks; keep it off the event loop
+            response = await asyncio.to_thread(
+                usage_client.request_summarized_usages,
+                request_summarized_usages_details,
+                page=page
             )
-
-            # Transform to rows with full schema mapping
-            rows = []
-            ingestion_ts = datetime.now(timezone.utc).isoformat()
-
-            for item in response.data.items:
-                row = {
-                    # Required fields
-                    "usage_date": start_time[:10],
-                    "x_org_slug": self.org_slug,
-                    "provider": "oci",
-                    "tenancy_id": self._auth.tenancy_ocid,
-                    "cost": float(item.computed_amount) if item.computed_amount else 0.0,
-                    "ingestion_timestamp": ingestion_ts,
-
-                    # Tenancy/Compartment info
-                    "tenancy_name": getattr(item, 'tenant_name', None),
-                    "compartment_id": getattr(item, 'compartment_id', None),
-                    "compartment_name": item.compartment_name,
-                    "compartment_path": getattr(item, 'compartment_path', None),
-
-                    # Location
-                    "region": item.region,
-                    "availability_domain": getattr(item, 'availability_domain', None),
-
-                    # Service/SKU info
-                    "service_name": item.service,
-                    "sku_name": getattr(item, 'sku_name', None),
-                    "sku_part_number": getattr(item, 'sku_part_number', None),
-
-                    # Resource info
-                    "resource_id": item.resource_id,
-                    "resource_name": getattr(item, 'resource_name', None),
-
-                    # Usage details
-                    "usage_type": getattr(item, 'usage_type', None),
-                    "unit": item.unit,
-                    "usage_start_time": getattr(item, 'time_usage_started', None),
-                    "usage_end_time": getattr(item, 'time_usage_ended', None),
-                    "usage_quantity": float(item.computed_quantity) if item.computed_quantity else 0.0,
-                    "computed_quantity": float(item.computed_quantity) if item.computed_quantity else 0.0,
-                    "unit_price": float(item.unit_price) if item.unit_price else 0.0,
-                    "currency": item.currency or "USD",
-
-                    # Overage/Correction flags
-                    "overage_flag": getattr(item, 'is_forecast', 'N'),  # Map forecast to overage
-                    "is_correction": getattr(item, 'is_correction', False),
-
-                    # Subscription/Platform
-                    "subscription_id": getattr(item, 'subscription_id', None),
-                    "platform_type": getattr(item, 'platform_type', None),
-                    "billing_period": getattr(item, 'time_usage_started', start_time)[:7] if hasattr(item, 'time_usage_started') else start_time[:7],
-
-                    # Tags (as JSON strings)
-                    "freeform_tags_json": self._tags_to_json(getattr(item, 'freeform_tags', None)),
-                    "defined_tags_json": self._tags_to_json(getattr(item, 'defined_tags', None)),
-                }
-                rows.append(row)
-
-            return rows
-
-        except ImportError:
-            logger.warning("OCI SDK not installed, using REST API fallback")
-            return await self._query_costs_rest(start_time, end_time, granularity)
+            yield [self._item_to_row(item, start_time, ingestion_ts) for item in response.data.items]
+
+            page = response.next_page
+            if not page:
+                break
+
+    def _item_to_row(self, item: Any, start_time: str, ingestion_ts: str) -> Dict[str, Any]:
+        """Transform a usage summary item to a row with full schema mapping."""
+        return {
+            # Required fields
+            "usage_date": start_time[:10],
+            "x_org_slug": self.org_slug,
+            "provider": "oci",
+            "tenancy_id": self._auth.tenancy_ocid,
+            "cost": float(item.computed_amount) if item.computed_amount else 0.0,
+            "ingestion_timestamp": ingestion_ts,
+
+            # Tenancy/Compartment info
+            "tenancy_name": getattr(item, 'tenant_name', None),
+            "compartment_id": getattr(item, 'compartment_id', None),
+            "compartment_name": item.compartment_name,
+            "compartment_path": getattr(item, 'compartment_path', None),
+
+            # Location
+            "region": item.region,
+            "availability_domain": getattr(item, 'availability_domain', None),
+
+            # Service/SKU info
+            "service_name": item.service,
+            "sku_name": getattr(item, 'sku_name', None),
+            "sku_part_number": getattr(item, 'sku_part_number', None),
+
+            # Resource info
+            "resource_id": item.resource_id,
+            "resource_name": getattr(item, 'resource_name', None),
+
+            # Usage details
+            "usage_type": getattr(item, 'usage_type', None),
+            "unit": item.unit,
+            "usage_start_time": getattr(item, 'time_usage_started', None),
+            "usage_end_time": getattr(item, 'time_usage_ended', None),
+            "usage_quantity": float(item.computed_quantity) if item.computed_quantity else 0.0,
+            "computed_quantity": float(item.computed_quantity) if item.computed_quantity else 0.0,
+            "unit_price": float(item.unit_price) if item.unit_price else 0.0,
+            "currency": item.currency or "USD",
+
+            # Overage/Correction flags
+            "overage_flag": getattr(item, 'is_forecast', 'N'),  # Map forecast to overage
+            "is_correction": getattr(item, 'is_correction', False),
+
+            # Subscription/Platform
+            "subscription_id": getattr(item, 'subscription_id', None),
+            "platform_type": getattr(item, 'platform_type', None),
+            "billing_period": getattr(item, 'time_usage_started', start_time)[:7] if hasattr(item, 'time_usage_started') else start_time[:7],
+
+            # Tags (as JSON strings)
+            "freeform_tags_json": self._tags_to_json(getattr(item, 'freeform_tags', None)),
+            "defined_tags_json": self._tags_to_json(getattr(item, 'defined_tags', None)),
+        }
 
     def _tags_to_json(self, tags) -> str:
         """Convert OCI tags dict to JSON string."""
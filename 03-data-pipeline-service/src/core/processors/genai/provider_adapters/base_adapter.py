@@ -5,19 +5,26 @@ Abstract base class for all GenAI provider adapters.
 Defines the interface for extracting usage data from provider APIs.
 
 Features:
-- Configurable rate limiting to avoid provider API rate limits
+- Process-wide adaptive rate limiting per provider credential and endpoint
+  (shared token buckets, see rate_limiter.py)
+- Concurrent per-day fetches within the shared rate limit
 - Retry with exponential backoff for transient errors
-- HTTP connection pooling with proper timeouts
+- HTTP connection pooling with proper timeouts (shared per-host pool)
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from datetime import date
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+from datetime import date, timedelta
+from urllib.parse import urlsplit
 import logging
 import asyncio
 import time
 import httpx
 
+from src.core.utils.http_pool import get_http_client_pool
+
+from .rate_limiter import AdaptiveTokenBucket, credential_fingerprint, get_rate_limit_bucket
+
 # Timeout and retry configuration
 DEFAULT_TIMEOUT = httpx.Timeout(
     connect=10.0,    # Connection timeout
@@ -39,7 +46,12 @@ MAX_BATCH_DELAY_SECONDS = 30.0  # Maximum batch delay
 DEFAULT_REQUEST_DELAY_SECONDS = 0.1  # 100ms delay between requests
 DEFAULT_BATCH_DELAY_SECONDS = 1.0    # 1 second delay between batches
 DEFAULT_BURST_LIMIT = 10              # Requests before applying batch delay
-DEFAULT_RATE_LIMIT_WINDOW_SECONDS = 60  # Window for rate limit tracking
+DEFAULT_DAY_CONCURRENCY = 4           # Days fetched concurrently by per-day extractors
+
+# Credential fields identifying a provider account (first match wins)
+CREDENTIAL_IDENTITY_FIELDS = (
+    "api_key", "aws_access_key_id", "service_account_json", "subscription_id", "project_id", "credential_id"
+)
 
 
 class BaseGenAIAdapter(ABC):
@@ -54,8 +66,9 @@ class BaseGenAIAdapter(ABC):
     Not all providers support all flows - unsupported flows return empty lists.
 
     Rate Limiting Features:
-    - Configurable delay between sequential API requests
-    - Burst control with batch delays
+    - Requests draw from token buckets shared by every adapter in the process
+      that uses the same provider credential and endpoint
+    - Bucket rates adapt to 429/Retry-After and x-ratelimit-* headers
     - Request tracking for rate limit avoidance
     """
 
@@ -65,7 +78,8 @@ class BaseGenAIAdapter(ABC):
         org_slug: str,
         request_delay_seconds: float = DEFAULT_REQUEST_DELAY_SECONDS,
         batch_delay_seconds: float = DEFAULT_BATCH_DELAY_SECONDS,
-        burst_limit: int = DEFAULT_BURST_LIMIT
+        burst_limit: int = DEFAULT_BURST_LIMIT,
+        day_concurrency: int = DEFAULT_DAY_CONCURRENCY
     ):
         """
         Initialize adapter with credentials and rate limiting configuration.
@@ -76,6 +90,10 @@ class BaseGenAIAdapter(ABC):
             request_delay_seconds: Delay between individual API requests (default: 0.1s)
             batch_delay_seconds: Delay after burst_limit requests (default: 1.0s)
             burst_limit: Number of requests before applying batch delay (default: 10)
+            day_concurrency: Days fetched concurrently by per-day extractors (default: 4)
+
+        The delays and burst limit set the initial rate of the shared bucket
+        (burst_limit requests per burst_limit * request_delay + batch_delay seconds).
         """
         self.credentials = credentials
         self.org_slug = org_slug
@@ -86,11 +104,12 @@ class BaseGenAIAdapter(ABC):
         self._request_delay_seconds = request_delay_seconds
         self._batch_delay_seconds = batch_delay_seconds
         self._burst_limit = burst_limit
+        self._day_concurrency = max(1, day_concurrency)
 
-        # Rate limiting state (thread-safe via lock)
+        # Rate limiting state (buckets are shared; counters are per adapter)
         self._request_count = 0
         self._last_request_time: Optional[float] = None
-        self._requests_in_window: List[float] = []
+        self._rate_limit_buckets: Dict[str, AdaptiveTokenBucket] = {}
         # SECURITY: Track total retry count across all requests
         self._total_retry_count = 0
         # MEDIUM #15: Thread-safe lock for request count
@@ -241,44 +260,61 @@ class BaseGenAIAdapter(ABC):
                 model = model[:-len(suffix)]
         return model
 
-    async def _apply_rate_limit(self) -> None:
+    def _initial_rate_per_second(self) -> float:
+        """Steady-state rate implied by the configured delays and burst limit."""
+        window = self._burst_limit * self._request_delay_seconds + self._batch_delay_seconds
+        return self._burst_limit / window if window > 0 else float(self._burst_limit)
+
+    def _credential_fingerprint(self) -> str:
+        """Fingerprint of the provider account these credentials belong to."""
+        for field_name in CREDENTIAL_IDENTITY_FIELDS:
+            value = self.credentials.get(field_name)
+            if value:
+                org_id = self.credentials.get("org_id") or ""
+                return credential_fingerprint(f"{field_name}:{value}:{org_id}")
+        return credential_fingerprint(f"org:{self.org_slug}")
+
+    def _get_rate_limit_bucket(self, url: Optional[str] = None) -> AdaptiveTokenBucket:
+        """
+        Get the shared bucket for a request URL (host + path, query ignored).
+
+        Args:
+            url: Request URL; None uses one bucket for the whole provider
+        """
+        endpoint = "*"
+        if url:
+            parts = urlsplit(url)
+            endpoint = f"{parts.netloc}{parts.path}"
+
+        bucket = self._rate_limit_buckets.get(endpoint)
+        if bucket is None:
+            bucket = get_rate_limit_bucket(
+                self.provider_name,
+                self._credential_fingerprint(),
+                endpoint,
+                rate_per_second=self._initial_rate_per_second(),
+                burst=self._burst_limit,
+                min_rate_per_second=1.0 / MAX_REQUEST_DELAY_SECONDS
+            )
+            self._rate_limit_buckets[endpoint] = bucket
+        return bucket
+
+    async def _apply_rate_limit(self, url: Optional[str] = None) -> None:
         """
         Apply rate limiting before making an API request.
 
-        Implements configurable delay between requests to avoid provider rate limits:
-        1. Always applies minimum delay between requests (request_delay_seconds)
-        2. After burst_limit requests, applies longer batch delay (batch_delay_seconds)
-        3. Tracks request timing for monitoring
+        Waits for a token from the process-wide bucket of this provider
+        credential and endpoint, so concurrent adapters (other pipelines,
+        other orgs on the same provider account, concurrent day fetches)
+        share one quota.
 
         Usage:
-            await self._apply_rate_limit()
+            await self._apply_rate_limit(url)
             response = await client.get(url)
         """
-        current_time = time.monotonic()
+        await self._get_rate_limit_bucket(url).acquire()
 
-        # Clean up old requests outside the window
-        window_start = current_time - DEFAULT_RATE_LIMIT_WINDOW_SECONDS
-        self._requests_in_window = [t for t in self._requests_in_window if t > window_start]
-
-        # Check if we've hit the burst limit
-        if len(self._requests_in_window) >= self._burst_limit:
-            self.logger.debug(
-                f"Burst limit reached ({self._burst_limit} requests), "
-                f"applying batch delay of {self._batch_delay_seconds}s"
-            )
-            await asyncio.sleep(self._batch_delay_seconds)
-            # Reset the window after batch delay
-            self._requests_in_window = []
-        elif self._last_request_time is not None:
-            # Apply minimum delay between requests
-            elapsed = current_time - self._last_request_time
-            if elapsed < self._request_delay_seconds:
-                delay = self._request_delay_seconds - elapsed
-                await asyncio.sleep(delay)
-
-        # Update tracking state (Note: for async context, use lock for thread safety)
         self._last_request_time = time.monotonic()
-        self._requests_in_window.append(self._last_request_time)
         # MEDIUM #15: Increment with awareness of concurrent access
         # In async context, this is generally safe but we track for monitoring
         self._request_count += 1
@@ -308,12 +344,16 @@ class BaseGenAIAdapter(ABC):
             )
         """
         if request_delay_seconds is not None:
-            self._request_delay_seconds = request_delay_seconds
+            self._request_delay_seconds = min(request_delay_seconds, MAX_REQUEST_DELAY_SECONDS)
         if batch_delay_seconds is not None:
-            self._batch_delay_seconds = batch_delay_seconds
+            self._batch_delay_seconds = min(batch_delay_seconds, MAX_BATCH_DELAY_SECONDS)
         if burst_limit is not None:
             self._burst_limit = burst_limit
 
+        # Applies to the shared buckets this adapter already uses
+        for bucket in self._rate_limit_buckets.values():
+            bucket.configure(self._initial_rate_per_second(), self._burst_limit)
+
         self.logger.info(
             f"Rate limiting configured: delay={self._request_delay_seconds}s, "
             f"batch_delay={self._batch_delay_seconds}s, burst_limit={self._burst_limit}"
@@ -328,22 +368,23 @@ class BaseGenAIAdapter(ABC):
         """
         return {
             "total_requests": self._request_count,
-            "requests_in_current_window": len(self._requests_in_window),
             "burst_limit": self._burst_limit,
             "request_delay_seconds": self._request_delay_seconds,
             "batch_delay_seconds": self._batch_delay_seconds,
-            "last_request_time": self._last_request_time
+            "last_request_time": self._last_request_time,
+            "shared_buckets": {
+                endpoint: bucket.get_stats() for endpoint, bucket in self._rate_limit_buckets.items()
+            }
         }
 
     def reset_retry_state(self) -> None:
         """
         Reset retry state after successful operation.
-        Call after successful batch of requests to reset delay multipliers.
+        Call after successful batch of requests to reset the retry budget.
+        Shared bucket rates recover on their own as requests succeed.
         """
         self._total_retry_count = 0
-        self._request_delay_seconds = DEFAULT_REQUEST_DELAY_SECONDS
-        self._batch_delay_seconds = DEFAULT_BATCH_DELAY_SECONDS
-        self.logger.debug("Reset retry state and rate limit delays")
+        self.logger.debug("Reset retry state")
 
     async def _make_request_with_retry(
         self,
@@ -386,9 +427,10 @@ class BaseGenAIAdapter(ABC):
             try:
                 # Apply rate limiting before each request attempt
                 if apply_rate_limit:
-                    await self._apply_rate_limit()
+                    await self._apply_rate_limit(url)
 
                 response = await client.request(method, url, **kwargs)
+                bucket = self._get_rate_limit_bucket(url)
 
                 # Handle rate limiting (429)
                 if response.status_code == 429:
@@ -408,12 +450,15 @@ class BaseGenAIAdapter(ABC):
                         f"Rate limited by {self.provider_name}. Retrying in {retry_after}s "
                         f"(attempt {attempt + 1}/{MAX_RETRIES}, total retries: {self._total_retry_count}/{MAX_TOTAL_RETRIES})"
                     )
-                    # Increase rate limit delays after hitting 429 (with caps)
-                    self._request_delay_seconds = min(self._request_delay_seconds * 2, MAX_REQUEST_DELAY_SECONDS)
-                    self._batch_delay_seconds = min(self._batch_delay_seconds * 2, MAX_BATCH_DELAY_SECONDS)
-                    await asyncio.sleep(retry_after)
+                    # Slow down every adapter sharing this credential/endpoint;
+                    # the next acquire waits out Retry-After
+                    bucket.on_throttled(retry_after)
+                    if not apply_rate_limit:
+                        await asyncio.sleep(retry_after)
                     continue
 
+                bucket.on_response(response.headers)
+
                 # Handle server errors (5xx) with retry
                 if 500 <= response.status_code < 600:
                     self._total_retry_count += 1
@@ -448,10 +493,52 @@ class BaseGenAIAdapter(ABC):
         """
         Get configured HTTP client with proper timeout.
 
+        The client sends on the process-wide per-host connection pool, so
+        closing it (``async with``) keeps provider connections alive for
+        the next request, adapter or pipeline run.
+
         Returns:
             httpx.AsyncClient configured with timeouts
         """
-        return httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+        return get_http_client_pool().client(timeout=DEFAULT_TIMEOUT)
+
+    async def _fetch_days_concurrently(
+        self,
+        start_date: date,
+        end_date: date,
+        fetch_day: Callable[[date], Awaitable[Optional[List[Dict[str, Any]]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch each day in a range with bounded concurrency.
+
+        Requests still go through the shared rate limit bucket, so
+        concurrency only overlaps request latency; it does not raise the rate.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            fetch_day: Coroutine returning the day's records, or None to stop
+                fetching the remaining days (e.g. authentication failed)
+
+        Returns:
+            Records of all fetched days, in date order
+        """
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        semaphore = asyncio.Semaphore(self._day_concurrency)
+        stop = asyncio.Event()
+
+        async def run(day: date) -> List[Dict[str, Any]]:
+            async with semaphore:
+                if stop.is_set():
+                    return []
+                records = await fetch_day(day)
+                if records is None:
+                    stop.set()
+                    return []
+                return records
+
+        results = await asyncio.gather(*(run(day) for day in days))
+        return [record for day_records in results for record in day_records]
 
     def _get_model_family(self, model: str) -> str:
         """
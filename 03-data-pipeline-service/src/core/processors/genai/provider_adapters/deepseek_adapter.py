@@ -6,8 +6,8 @@ DeepSeek API is largely compatible with OpenAI API format.
 """
 
 import httpx
-from typing import Dict, Any, List
-from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+from datetime import date, datetime
 import logging
 
 from .base_adapter import BaseGenAIAdapter
@@ -178,12 +178,9 @@ class DeepSeekAdapter(BaseGenAIAdapter):
             "Content-Type": "application/json"
         }
 
-        usage_records = []
-
         async with self._get_http_client() as client:
-            # Iterate through each day in the range
-            current_date = start_date
-            while current_date <= end_date:
+            async def fetch_day(current_date: date) -> Optional[List[Dict[str, Any]]]:
+                """Fetch one day; returns None to stop on authentication failure."""
                 try:
                     # DeepSeek usage API endpoint (if available)
                     # Note: Check DeepSeek docs for actual usage endpoint
@@ -202,8 +199,7 @@ class DeepSeekAdapter(BaseGenAIAdapter):
                             validated_data = self._validate_response_structure(
                                 data, f"for date {current_date}"
                             )
-                            daily_usage = self._parse_daily_usage(validated_data, current_date, credential_id)
-                            usage_records.extend(daily_usage)
+                            return self._parse_daily_usage(validated_data, current_date, credential_id)
                         except (ValueError, APIResponseValidationError) as e:
                             self.logger.error(
                                 f"Failed to parse DeepSeek response for {current_date}: {type(e).__name__}"
@@ -216,9 +212,9 @@ class DeepSeekAdapter(BaseGenAIAdapter):
                         # No usage for this date or endpoint not available
                         self.logger.debug(f"No usage data for {current_date}")
                     elif response.status_code == 401:
-                        # Invalid credentials - don't retry
+                        # Invalid credentials - don't retry or fetch remaining days
                         self.logger.error("DeepSeek API authentication failed")
-                        break
+                        return None
                     else:
                         self.logger.warning(
                             f"Failed to fetch DeepSeek usage for {current_date}: "
@@ -226,9 +222,13 @@ class DeepSeekAdapter(BaseGenAIAdapter):
                         )
 
                 except Exception as e:
+                    # Log error type but not potentially sensitive details
                     self.logger.error(f"Error fetching DeepSeek usage for {current_date}: {type(e).__name__}")
 
-                current_date += timedelta(days=1)
+                return []
+
+            # Days are fetched concurrently within the shared rate limit
+            usage_records = await self._fetch_days_concurrently(start_date, end_date, fetch_day)
 
         self.logger.info(f"Extracted {len(usage_records)} DeepSeek usage records")
         return usage_records
@@ -6,7 +6,7 @@ Extracts usage data from OpenAI API for PAYG billing.
 
 import httpx
 from typing import Dict, Any, List, Optional, Union
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 import logging
 
 from .base_adapter import BaseGenAIAdapter
@@ -179,12 +179,9 @@ class OpenAIAdapter(BaseGenAIAdapter):
         if org_id:
             headers["OpenAI-Organization"] = org_id
 
-        usage_records = []
-
         async with self._get_http_client() as client:
-            # Iterate through each day in the range
-            current_date = start_date
-            while current_date <= end_date:
+            async def fetch_day(current_date: date) -> Optional[List[Dict[str, Any]]]:
+                """Fetch one day; returns None to stop on authentication failure."""
                 try:
                     # OpenAI Usage API endpoint
                     url = f"{self.BASE_URL}/usage"
@@ -202,10 +199,7 @@ class OpenAIAdapter(BaseGenAIAdapter):
                             validated_data = self._validate_response_structure(
                                 data, f"for date {current_date}"
                             )
-                            daily_usage = self._parse_daily_usage(
-                                validated_data, current_date, credential_id
-                            )
-                            usage_records.extend(daily_usage)
+                            return self._parse_daily_usage(validated_data, current_date, credential_id)
                         except (ValueError, APIResponseValidationError) as e:
                             self.logger.error(
                                 f"Failed to parse OpenAI response for {current_date}: {type(e).__name__}"
@@ -218,9 +212,9 @@ class OpenAIAdapter(BaseGenAIAdapter):
                         # No usage for this date
                         self.logger.debug(f"No usage data for {current_date}")
                     elif response.status_code == 401:
-                        # Invalid credentials - don't retry
+                        # Invalid credentials - don't retry or fetch remaining days
                         self.logger.error("OpenAI API authentication failed")
-                        break
+                        return None
                     else:
                         self.logger.warning(
                             f"Failed to fetch OpenAI usage for {current_date}: "
@@ -231,7 +225,10 @@ class OpenAIAdapter(BaseGenAIAdapter):
                     # Log error type but not potentially sensitive details
                     self.logger.error(f"Error fetching OpenAI usage for {current_date}: {type(e).__name__}")
 
-                current_date += timedelta(days=1)
+                return []
+
+            # Days are fetched concurrently within the shared rate limit
+            usage_records = await self._fetch_days_concurrently(start_date, end_date, fetch_day)
 
         self.logger.info(f"Extracted {len(usage_records)} OpenAI usage records")
         return usage_records
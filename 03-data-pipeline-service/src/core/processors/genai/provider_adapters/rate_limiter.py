@@ -0,0 +1,323 @@
+"""
+Shared GenAI Provider Rate Limiter
+
+Process-wide adaptive token buckets keyed by (provider, credential, endpoint).
+Every adapter instance that talks to the same provider account and endpoint
+draws from the same bucket, so concurrent pipelines (orgs sharing a provider
+account, several date ranges, concurrent per-day fetches) share one quota
+instead of each assuming the full rate.
+
+Rates adapt to provider feedback:
+- 429 responses halve the rate and block the bucket for Retry-After seconds
+- x-ratelimit-* / anthropic-ratelimit-* headers set the rate to spread the
+  remaining requests evenly until the window resets (blocking at zero)
+- Successful responses without rate headers recover the rate additively
+  up to the configured rate
+
+New buckets start with a single token so a cold start paces requests
+instead of bursting past a provider limit nobody has observed yet.
+
+Buckets are thread-safe (the Pub/Sub worker runs tasks on separate event
+loops) and waiting is done with asyncio.sleep outside the lock.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+BucketKey = Tuple[str, str, str]
+
+# Header prefixes for (limit, remaining, reset), in order of preference
+RATE_LIMIT_HEADER_SETS = (
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset"),
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+# ============================================
+# Header Parsing
+# ============================================
+
+@dataclass
+class RateLimitInfo:
+    """Request quota advertised by a provider response."""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_seconds: Optional[float] = None
+
+
+def parse_reset_seconds(value: str, now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a rate limit reset header into seconds from now.
+
+    Accepts durations ("1s", "6m0s", "20ms"), plain seconds, epoch seconds
+    and RFC 3339 timestamps (Anthropic).
+
+    Args:
+        value: Raw header value
+        now: Current wall-clock time (defaults to time.time())
+
+    Returns:
+        Seconds until reset, or None if unparseable
+    """
+    value = value.strip()
+    now = time.time() if now is None else now
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+    try:
+        seconds = float(value)
+        # Large values are absolute epoch timestamps
+        return max(0.0, seconds - now) if seconds > 1e9 else max(0.0, seconds)
+    except ValueError:
+        pass
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return max(0.0, reset_at.timestamp() - now)
+    except ValueError:
+        return None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> Optional[RateLimitInfo]:
+    """
+    Extract request quota information from response headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        RateLimitInfo, or None if the response has no rate limit headers
+    """
+    for limit_name, remaining_name, reset_name in RATE_LIMIT_HEADER_SETS:
+        remaining_raw = headers.get(remaining_name)
+        if remaining_raw is None:
+            continue
+        info = RateLimitInfo()
+        try:
+            info.remaining = max(0, int(float(remaining_raw)))
+            if headers.get(limit_name) is not None:
+                info.limit = int(float(headers[limit_name]))
+        except (TypeError, ValueError):
+            continue
+        if headers.get(reset_name) is not None:
+            info.reset_seconds = parse_reset_seconds(headers[reset_name])
+        return info
+    return None
+
+
+# ============================================
+# Token Bucket
+# ============================================
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket whose refill rate follows provider rate limit feedback.
+
+    acquire() re-checks the bucket after every sleep, so a rate raised by
+    response headers (or lowered by a 429) applies to requests already
+    waiting, not only to new ones.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        min_rate_per_second: float = 0.2,
+        max_rate_per_second: Optional[float] = None,
+        clock=time.monotonic
+    ):
+        """
+        Initialize bucket.
+
+        Args:
+            rate_per_second: Configured steady-state rate
+            burst: Bucket capacity (requests allowed back-to-back)
+            min_rate_per_second: Floor for rate reductions after 429s
+            max_rate_per_second: Ceiling for header-driven increases
+                (default: 10x the configured rate)
+            clock: Monotonic clock (overridable in tests)
+        """
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.configured_rate = rate_per_second
+        self.rate = rate_per_second
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate_per_second, rate_per_second)
+        self.max_rate = max_rate_per_second or rate_per_second * 10
+        self._tokens = 1.0
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+
+        # Stats
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1 and now >= self._blocked_until:
+                    self._tokens -= 1
+                    self.requests += 1
+                    self.waited_seconds += waited
+                    return waited
+                wait = max((1 - self._tokens) / self.rate, self._blocked_until - now)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def on_throttled(self, retry_after_seconds: float) -> None:
+        """
+        Record a 429: halve the rate and block until Retry-After elapses.
+
+        Args:
+            retry_after_seconds: Provider-requested wait
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + retry_after_seconds)
+            self.throttled += 1
+
+    def on_response(self, headers: Mapping[str, str]) -> None:
+        """
+        Adapt the rate to a non-429 response.
+
+        Args:
+            headers: Response headers
+        """
+        info = parse_rate_limit_headers(headers)
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if info is None or info.reset_seconds is None:
+                # No quota information: additive recovery towards the configured rate
+                if self.rate < self.configured_rate:
+                    self.rate = min(self.configured_rate, self.rate + self.configured_rate * 0.1)
+                return
+            if info.remaining == 0:
+                self._tokens = min(self._tokens, 0.0)
+                self._blocked_until = max(self._blocked_until, now + info.reset_seconds)
+                return
+            if info.reset_seconds > 0:
+                target = info.remaining / info.reset_seconds
+                self.rate = min(self.max_rate, max(self.min_rate, target))
+            # Never hold more tokens than the provider has left
+            self._tokens = min(self._tokens, float(info.remaining))
+
+    def configure(self, rate_per_second: float, burst: int) -> None:
+        """
+        Change the configured rate and capacity.
+
+        Args:
+            rate_per_second: New steady-state rate
+            burst: New bucket capacity
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self.configured_rate = rate_per_second
+            self.rate = rate_per_second
+            self.burst = max(1, burst)
+            self.min_rate = min(self.min_rate, rate_per_second)
+            self.max_rate = max(self.max_rate, rate_per_second)
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current rate and counters for monitoring."""
+        with self._lock:
+            now = self._clock()
+            return {
+                "rate_per_second": round(self.rate, 3),
+                "configured_rate_per_second": round(self.configured_rate, 3),
+                "burst": self.burst,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited_seconds, 3),
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 3),
+            }
+
+
+# ============================================
+# Process-wide Registry
+# ============================================
+
+_buckets: Dict[BucketKey, AdaptiveTokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def credential_fingerprint(secret: str) -> str:
+    """Stable, non-reversible identifier for a provider credential."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def get_rate_limit_bucket(
+    provider: str,
+    credential: str,
+    endpoint: str,
+    rate_per_second: float,
+    burst: int,
+    min_rate_per_second: float = 0.2
+) -> AdaptiveTokenBucket:
+    """
+    Get or create the shared bucket for a provider credential and endpoint.
+
+    The rate and burst only apply when the bucket is created; later callers
+    share the existing bucket and its adapted rate.
+
+    Args:
+        provider: Provider name (e.g. openai)
+        credential: Credential fingerprint (see credential_fingerprint)
+        endpoint: Host and path (e.g. api.openai.com/v1/usage)
+        rate_per_second: Initial steady-state rate
+        burst: Bucket capacity
+        min_rate_per_second: Floor for rate reductions
+    """
+    key = (provider, credential, endpoint)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = AdaptiveTokenBucket(rate_per_second, burst, min_rate_per_second=min_rate_per_second)
+            _buckets[key] = bucket
+        return bucket
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every shared bucket, keyed by "provider:credential:endpoint"."""
+    with _buckets_lock:
+        buckets = dict(_buckets)
+    return {":".join(key): bucket.get_stats() for key, bucket in buckets.items()}
+
+
+def reset_rate_limit_buckets() -> None:
+    """Drop all shared buckets (tests)."""
+    with _buckets_lock:
+        _buckets.clear()
@@ -5,6 +5,9 @@ Part of 'Pipeline as Config' Architecture.
 Loads data from pipeline context (extracted rows) into BigQuery tables.
 Supports schema templates, partitioning, and clustering.
 
+Extractors that spill their output to disk pass a step dataset handle
+instead of rows; it is streamed batch by batch into Parquet load jobs.
+
 CRUD-001 FIX: Added idempotent mode using MERGE pattern to prevent duplicates on re-runs.
 
 ps_type: generic.bq_loader
@@ -32,6 +35,8 @@ from google.cloud.bigquery import SchemaField
 
 from src.app.config import get_settings
 from src.core.engine.bq_client import BigQueryClient
+from src.core.engine.arrow_loader import ArrowBigQueryAppender
+from src.core.engine.step_output import StepDataset, find_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +45,9 @@ class BQLoader:
     """
     Generic processor for loading extracted data into BigQuery tables.
 
-    Reads data from context["extracted_data"] and writes to destination table.
+    Reads data from a step dataset handle (context["extracted_dataset"] or an
+    upstream step's output_dataset) or from context["extracted_data"], and
+    writes it to the destination table.
 
     Configuration:
         destination_table: "{org_slug}_prod.cloud_aws_billing_raw_daily"
@@ -75,7 +82,7 @@ class BQLoader:
 
         Args:
             step_config: Step configuration from pipeline YAML
-            context: Pipeline context containing extracted_data
+            context: Pipeline context containing a step dataset or extracted_data
 
         Returns:
             Dict with status and metadata
@@ -86,9 +93,11 @@ class BQLoader:
 
         config = step_config.get("config", {})
 
-        # Get extracted data from context
-        extracted_data = context.get("extracted_data", [])
-        if not extracted_data:
+        # Get extracted data from context; spilled datasets take precedence
+        dataset = find_dataset(context)
+        extracted_data = [] if dataset else context.get("extracted_data", [])
+        row_count = dataset.num_rows if dataset else len(extracted_data)
+        if not row_count:
             logger.warning(f"No data to load for {org_slug}")
             return {
                 "status": "SUCCESS",
@@ -124,7 +133,7 @@ class BQLoader:
         )
 
         logger.info(
-            f"Loading {len(extracted_data)} rows to {dest_table_id}",
+            f"Loading {row_count} rows to {dest_table_id}",
             extra={"org_slug": org_slug, "write_disposition": write_disposition_str}
         )
 
@@ -133,7 +142,7 @@ class BQLoader:
             table = await self._ensure_table_exists(
                 dest_table_id,
                 config,
-                extracted_data[0] if extracted_data else {}
+                self._sample_row(dataset) if dataset else extracted_data[0]
             )
 
             # CRUD-001 FIX: Check if idempotent mode is enabled
@@ -142,13 +151,16 @@ class BQLoader:
             if idempotent:
                 # Use MERGE for idempotent writes
                 merge_keys = config.get("merge_keys", ["org_slug", "x_pipeline_id", "x_credential_id", "x_pipeline_run_date"])
-                rows_loaded = await self._load_data_idempotent(
-                    dest_table_id,
-                    extracted_data,
-                    merge_keys,
-                    org_slug,
-                    context
-                )
+                chunks = dataset.iter_rows() if dataset else [extracted_data]
+                rows_loaded = 0
+                for chunk in chunks:
+                    rows_loaded += await self._load_data_idempotent(
+                        dest_table_id,
+                        chunk,
+                        merge_keys,
+                        org_slug,
+                        context
+                    )
                 return {
                     "status": "SUCCESS",
                     "rows_loaded": rows_loaded,
@@ -157,12 +169,20 @@ class BQLoader:
                 }
             else:
                 # Standard load
-                rows_loaded = await self._load_data(
-                    dest_table_id,
-                    extracted_data,
-                    write_disposition,
-                    config.get("partition_field")
-                )
+                if dataset:
+                    rows_loaded = await self._load_dataset(
+                        dest_table_id,
+                        dataset,
+                        table.schema,
+                        write_disposition_str
+                    )
+                else:
+                    rows_loaded = await self._load_data(
+                        dest_table_id,
+                        extracted_data,
+                        write_disposition,
+                        config.get("partition_field")
+                    )
                 return {
                     "status": "SUCCESS",
                     "rows_loaded": rows_loaded,
@@ -334,6 +354,47 @@ class BQLoader:
 
         return len(load_rows)
 
+    @staticmethod
+    def _sample_row(dataset: StepDataset) -> Dict[str, Any]:
+        """First row of a step dataset, for schema inference."""
+        for batch in dataset.iter_batches():
+            return batch.slice(0, 1).to_pylist()[0]
+        return {}
+
+    async def _load_dataset(
+        self,
+        table_id: str,
+        dataset: StepDataset,
+        schema: List[SchemaField],
+        write_disposition: str
+    ) -> int:
+        """
+        Stream a spilled step dataset into BigQuery as Parquet load jobs.
+
+        Batches are read memory-mapped and conformed to the table schema, so
+        only about two load chunks are held in memory at once. Columns the
+        table does not define are dropped.
+
+        Args:
+            table_id: Full BigQuery table ID
+            dataset: Step dataset handle
+            schema: Destination table schema
+            write_disposition: Disposition of the first load job
+
+        Returns:
+            Number of rows loaded
+        """
+        appender = ArrowBigQueryAppender(
+            self.bq_client.client,
+            table_id,
+            schema,
+            defaults={"ingestion_timestamp": datetime.now(timezone.utc).isoformat()},
+            write_disposition=write_disposition,
+        )
+        for batch in dataset.iter_batches():
+            await appender.append(batch)
+        return await appender.close()
+
     async def _load_data_idempotent(
         self,
         table_id: str,
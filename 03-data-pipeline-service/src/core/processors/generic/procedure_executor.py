@@ -7,9 +7,10 @@ Designed for calling procedures in the organizations dataset that operate on per
 """
 
 import logging
+import random
 import re
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import date, datetime, timedelta
 from google.cloud import bigquery
 from google.api_core import retry
@@ -18,11 +19,84 @@ from google.api_core.exceptions import GoogleAPIError
 from src.app.config import get_settings
 from src.core.engine.bq_client import BigQueryClient
 from src.core.utils.audit_logger import log_execute, AuditLogger
+from src.core.utils.query_performance import log_script_metrics
+
+logger = logging.getLogger(__name__)
 
 # Validation patterns for SQL injection prevention
 PROCEDURE_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
 PARAM_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
 DATASET_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+ARRAY_TYPE_PATTERN = re.compile(r'^ARRAY<(STRING|INT64|FLOAT64|DATE|BOOL)>$')
+
+# Procedures that are safe to re-run after BigQuery aborts them for a concurrent
+# DML conflict. BigQuery detects conflicts per partition: two cloud providers'
+# FOCUS conversions touching the same ChargePeriodStart days conflict even
+# though they write disjoint x_source_system rows, and each per-provider MERGE
+# is idempotent, so the CALL is retried.
+CONCURRENT_UPDATE_RETRY_PROCEDURES = frozenset({"sp_cloud_1_convert_to_focus"})
+CONCURRENT_UPDATE_MAX_ATTEMPTS = 5
+CONCURRENT_UPDATE_BASE_DELAY_SECONDS = 2.0
+CONCURRENT_UPDATE_MAX_DELAY_SECONDS = 30.0
+
+
+def _is_concurrent_update_error(error: Exception) -> bool:
+    """True for BigQuery's DML conflict error ("Could not serialize access to table ...")."""
+    return "could not serialize access" in str(error).lower()
+
+
+async def call_with_concurrent_update_retry(
+    procedure_name: str,
+    submit: Callable[[], Any],
+    wait: Callable[[Any], List[Any]],
+    extra: Optional[Dict[str, Any]] = None,
+) -> Tuple[Any, List[Any], int]:
+    """
+    Run a procedure CALL, re-running it after concurrent DML conflicts.
+
+    Only procedures in CONCURRENT_UPDATE_RETRY_PROCEDURES are retried; other
+    errors and other procedures fail on the first attempt.
+
+    Args:
+        procedure_name: Procedure being called
+        submit: Blocking call starting the query job
+        wait: Blocking call returning the job's result rows
+        extra: Logging context
+
+    Returns:
+        (query job, result rows, attempts)
+    """
+    loop = asyncio.get_running_loop()
+    attempt = 1
+    while True:
+        job = await loop.run_in_executor(None, submit)
+        try:
+            return job, await loop.run_in_executor(None, wait, job), attempt
+        except GoogleAPIError as e:
+            if (
+                procedure_name not in CONCURRENT_UPDATE_RETRY_PROCEDURES
+                or not _is_concurrent_update_error(e)
+                or attempt >= CONCURRENT_UPDATE_MAX_ATTEMPTS
+            ):
+                raise
+            # Jittered backoff so the conflicting runs do not collide again
+            delay = min(
+                CONCURRENT_UPDATE_MAX_DELAY_SECONDS,
+                CONCURRENT_UPDATE_BASE_DELAY_SECONDS * 2 ** (attempt - 1),
+            ) * random.uniform(0.5, 1.0)
+            logger.warning(
+                f"Procedure {procedure_name} hit a concurrent update, retrying in {delay:.1f}s",
+                extra={**(extra or {}), "attempt": attempt}
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _param_display(param) -> str:
+    """Loggable value of a scalar or array query parameter."""
+    if isinstance(param, bigquery.ArrayQueryParameter):
+        return f"[{len(param.values)} values]"
+    return str(param.value)
 
 
 class ProcedureExecutorProcessor:
@@ -49,6 +123,10 @@ class ProcedureExecutorProcessor:
             - name: p_end_date
               type: DATE
               value: "${end_date}"  # From pipeline parameters
+            - name: p_subscription_ids
+              type: ARRAY<STRING>
+              value: "${subscription_ids}"  # List from pipeline parameters
+              optional: true  # Missing → empty array
 
     Context Variables:
         - project_id: GCP project ID
@@ -208,7 +286,12 @@ class ProcedureExecutorProcessor:
 
             if resolved_value is None:
                 if is_optional:
-                    bq_param = bigquery.ScalarQueryParameter(param_name, param_type, None)
+                    array_match = ARRAY_TYPE_PATTERN.match(param_type)
+                    if array_match:
+                        # BigQuery treats NULL arrays as empty; pass [] so the type is known
+                        bq_param = bigquery.ArrayQueryParameter(param_name, array_match.group(1), [])
+                    else:
+                        bq_param = bigquery.ScalarQueryParameter(param_name, param_type, None)
                     query_parameters.append(bq_param)
                     continue  # Skip to next parameter after appending
                 else:
@@ -237,7 +320,7 @@ class ProcedureExecutorProcessor:
             extra={
                 "procedure": procedure_name,
                 "org_slug": org_slug,
-                "parameters": {p.name: str(p.value) for p in query_parameters}
+                "parameters": {p.name: _param_display(p) for p in query_parameters}
             }
         )
 
@@ -253,7 +336,7 @@ class ProcedureExecutorProcessor:
                 "action": "START",
                 "processor": "ProcedureExecutorProcessor",
                 "procedure": procedure_name,
-                "parameters": {p.name: str(p.value) for p in query_parameters}
+                "parameters": {p.name: _param_display(p) for p in query_parameters}
             }
         )
 
@@ -291,25 +374,43 @@ class ProcedureExecutorProcessor:
             def execute_query():
                 return bq_client.client.query(call_sql, job_config=job_config)
 
-            query_job = await loop.run_in_executor(None, execute_query)
-
             # Wait for completion in executor
-            def get_results():
-                return list(query_job.result(timeout=timeout_minutes * 60))
-
-            results = await loop.run_in_executor(None, get_results)
+            def get_results(job):
+                return list(job.result(timeout=timeout_minutes * 60))
+
+            query_job, results, attempt = await call_with_concurrent_update_retry(
+                procedure_name,
+                execute_query,
+                get_results,
+                extra={"procedure": procedure_name, "org_slug": org_slug},
+            )
 
             # Parse result rows if any
             result_data = []
             for row in results:
                 result_data.append(dict(row))
 
+            # Bytes scanned and slot time of the whole CALL and of each DML statement
+            query_metrics = await loop.run_in_executor(
+                None,
+                lambda: log_script_metrics(
+                    query_job,
+                    operation=procedure_name,
+                    client=bq_client.client,
+                    org_slug=org_slug,
+                    additional_context={"pipeline_id": pipeline_id, "run_id": run_id}
+                )
+            )
+
             self.logger.info(
                 f"Procedure {procedure_name} completed successfully",
                 extra={
                     "job_id": query_job.job_id,
                     "org_slug": org_slug,
-                    "result_rows": len(result_data)
+                    "attempts": attempt,
+                    "result_rows": len(result_data),
+                    "total_bytes_processed": query_metrics.get("total_bytes_processed"),
+                    "slot_millis": query_metrics.get("slot_millis")
                 }
             )
 
@@ -333,8 +434,10 @@ class ProcedureExecutorProcessor:
                 "job_id": query_job.job_id,
                 "results": result_data,
                 "rows_returned": len(result_data),
+                "total_bytes_processed": query_metrics.get("total_bytes_processed"),
+                "slot_millis": query_metrics.get("slot_millis"),
                 "org_slug": org_slug,
-                "parameters": {p.name: str(p.value) for p in query_parameters}
+                "parameters": {p.name: _param_display(p) for p in query_parameters}
             }
 
         except GoogleAPIError as e:
@@ -485,19 +588,34 @@ class ProcedureExecutorProcessor:
         name: str,
         param_type: str,
         value: Any
-    ) -> Optional[bigquery.ScalarQueryParameter]:
+    ):
         """
         Create a BigQuery query parameter with proper type conversion.
 
         Args:
             name: Parameter name
-            param_type: BigQuery type (STRING, DATE, INT64, FLOAT64, BOOL)
-            value: Parameter value
+            param_type: BigQuery type (STRING, DATE, INT64, FLOAT64, BOOL, ARRAY<...>)
+            value: Parameter value (list or comma-separated string for ARRAY types)
 
         Returns:
-            BigQuery ScalarQueryParameter or None if invalid
+            BigQuery ScalarQueryParameter / ArrayQueryParameter or None if invalid
         """
         try:
+            array_match = ARRAY_TYPE_PATTERN.match(param_type)
+            if array_match:
+                element_type = array_match.group(1)
+                if isinstance(value, str):
+                    value = [item.strip() for item in value.split(",") if item.strip()]
+                elif not isinstance(value, (list, tuple)):
+                    raise ValueError(f"Cannot convert {type(value).__name__} to {param_type}")
+                elements = []
+                for item in value:
+                    element = self._create_bq_parameter(name, element_type, item)
+                    if element is None:
+                        raise ValueError(f"Invalid {element_type} element in {param_type}")
+                    elements.append(element.value)
+                return bigquery.ArrayQueryParameter(name, element_type, elements)
+
             if param_type == "DATE":
                 # Convert string to date if needed - support multiple formats
                 if isinstance(value, str):
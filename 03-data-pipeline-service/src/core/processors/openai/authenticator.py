@@ -136,10 +136,10 @@ class OpenAIAuthenticator:
         Returns:
             httpx.AsyncClient with Authorization header set
         """
-        import httpx
+        from src.core.utils.http_pool import get_http_client_pool
 
         api_key = await self.authenticate()
-        return httpx.AsyncClient(
+        return get_http_client_pool().client(
             base_url=self.BASE_URL,
             headers={"Authorization": f"Bearer {api_key}"},
             timeout=30.0
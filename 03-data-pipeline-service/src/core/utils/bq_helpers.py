@@ -10,6 +10,7 @@ Production-grade utilities for BigQuery operations:
 SECURITY: All operations are tenant-isolated via org_slug parameters.
 """
 
+import asyncio
 import hashlib
 import io
 import json
@@ -365,7 +366,9 @@ async def _streaming_insert_with_dlq(
 
     # BigQuery insert_rows_json expects row_ids as separate parameter
     try:
-        errors = bq_client.insert_rows_json(
+        # The client call blocks on the HTTP request; keep it off the event loop
+        errors = await asyncio.to_thread(
+            bq_client.insert_rows_json,
             table_id,
             row_data,
             row_ids=insert_ids
@@ -475,15 +478,17 @@ async def _batch_load(
     )
 
     try:
-        # Execute load job
-        load_job = bq_client.load_table_from_file(
-            json_buffer,
-            table_id,
-            job_config=job_config
-        )
+        def run_load_job():
+            load_job = bq_client.load_table_from_file(
+                json_buffer,
+                table_id,
+                job_config=job_config
+            )
+            load_job.result()
+            return load_job
 
-        # Wait for completion
-        load_job.result()
+        # Execute the load job and wait for completion off the event loop
+        load_job = await asyncio.to_thread(run_load_job)
 
         if load_job.errors:
             logger.error(
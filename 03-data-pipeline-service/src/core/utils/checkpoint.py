@@ -4,23 +4,48 @@ Pagination Checkpoint Utility
 Provides crash recovery for paginated API fetches by persisting cursor state.
 If a pipeline crashes mid-pagination, it can resume from the last checkpoint.
 
+AsyncCheckpointWriter coalesces frequent progress updates and persists only the
+latest one in the background, so checkpointing does not cost a BigQuery
+round-trip per page or per batch.
+
+Exactly-once resume does not depend on that coalesced cursor. Checkpointed
+extractions write each batch with CheckpointManager.commit_batch, which loads
+it into a staging table and then inserts it into the destination and records
+its row range in the pipeline_checkpoint_batches ledger in one transaction. A
+crash at any point leaves either both or neither, and a resumed run skips every
+row range found in the ledger.
+
+Each commit costs one load job and one query job (plus a staging table
+create), so checkpointed extractions commit large batches (api_extractor:
+checkpoint.commit_rows) rather than one per page or per insert batch.
+
+Only the generic API extractor (api_extractor) resumes from checkpoints.
+Provider-specific extractors restart from the beginning on retry.
+
 SECURITY: Checkpoints are stored per-org in BigQuery for multi-tenant isolation.
 """
 
+import asyncio
+import io
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 
 from google.cloud import bigquery
 
 from src.app.config import get_settings
+from src.core.utils.bq_helpers import serialize_row_for_json
 from src.core.utils.logging import get_logger, safe_error_log
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Orphaned staging tables (crash between load and commit) expire on their own
+STAGING_TABLE_EXPIRATION = timedelta(days=1)
+
 
 @dataclass
 class PaginationCheckpoint:
@@ -54,6 +79,9 @@ class CheckpointManager:
         self.bq_client = bq_client
         self.project_id = project_id or settings.gcp_project_id
         self.table_id = f"{self.project_id}.organizations.pipeline_checkpoints"
+        self.batches_table_id = f"{self.project_id}.organizations.pipeline_checkpoint_batches"
+        # Destination schemas for staging tables (one get_table per destination)
+        self._destination_schemas: Dict[str, List[bigquery.SchemaField]] = {}
         self._ensure_table_exists()
 
     def _ensure_table_exists(self) -> None:
@@ -70,12 +98,24 @@ class CheckpointManager:
             bigquery.SchemaField("is_complete", "BOOLEAN", mode="REQUIRED"),
         ]
 
-        table = bigquery.Table(self.table_id, schema=schema)
+        # Ledger of batches committed together with their destination rows
+        batches_schema = [
+            bigquery.SchemaField("org_slug", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("pipeline_id", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("step_id", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("api_endpoint", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("start_row", "INTEGER", mode="REQUIRED"),
+            bigquery.SchemaField("row_count", "INTEGER", mode="REQUIRED"),
+            bigquery.SchemaField("committed_at", "TIMESTAMP", mode="REQUIRED"),
+        ]
+        batches_table = bigquery.Table(self.batches_table_id, schema=batches_schema)
+        batches_table.clustering_fields = ["org_slug", "pipeline_id", "step_id"]
 
-        try:
-            self.bq_client.create_table(table, exists_ok=True)
-        except Exception as e:
-            logger.warning(f"Could not create checkpoint table (may already exist): {e}")
+        for table in (bigquery.Table(self.table_id, schema=schema), batches_table):
+            try:
+                self.bq_client.create_table(table, exists_ok=True)
+            except Exception as e:
+                logger.warning(f"Could not create checkpoint table (may already exist): {e}")
 
     def save_checkpoint(self, checkpoint: PaginationCheckpoint) -> bool:
         """
@@ -241,6 +281,144 @@ class CheckpointManager:
                           pipeline_id=pipeline_id)
             return None
 
+    def get_committed_batches(
+        self,
+        org_slug: str,
+        pipeline_id: str,
+        step_id: str,
+        api_endpoint: str
+    ) -> List[List[int]]:
+        """
+        Get the row ranges committed by commit_batch since the key was last completed.
+
+        Args:
+            org_slug: Organization identifier
+            pipeline_id: Pipeline identifier
+            step_id: Step identifier
+            api_endpoint: API endpoint being paginated
+
+        Returns:
+            Sorted [start_row, row_count] pairs
+
+        Raises:
+            Exception: If the ledger cannot be read. Resuming without it could
+                       write committed rows twice, so this is not swallowed.
+        """
+        query = f"""
+        SELECT start_row, row_count
+        FROM `{self.batches_table_id}`
+        WHERE org_slug = @org_slug
+            AND pipeline_id = @pipeline_id
+            AND step_id = @step_id
+            AND api_endpoint = @api_endpoint
+        ORDER BY start_row
+        """
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
+                bigquery.ScalarQueryParameter("pipeline_id", "STRING", pipeline_id),
+                bigquery.ScalarQueryParameter("step_id", "STRING", step_id),
+                bigquery.ScalarQueryParameter("api_endpoint", "STRING", api_endpoint),
+            ]
+        )
+
+        return [
+            [row.start_row, row.row_count]
+            for row in self.bq_client.query(query, job_config=job_config).result()
+        ]
+
+    def commit_batch(
+        self,
+        org_slug: str,
+        pipeline_id: str,
+        step_id: str,
+        api_endpoint: str,
+        table_id: str,
+        rows: List[Dict[str, Any]],
+        start_row: int
+    ) -> int:
+        """
+        Write a batch and record its row range as one atomic unit.
+
+        The rows are loaded into a staging table next to the destination, then
+        one script appends them to the destination and inserts the ledger row
+        in a transaction and drops the staging table. Both statements are
+        INSERTs, so concurrent batches of the same extraction do not conflict.
+        A staging table left behind by a crash expires after a day.
+
+        Args:
+            org_slug: Organization identifier
+            pipeline_id: Pipeline identifier
+            step_id: Step identifier
+            api_endpoint: API endpoint being paginated
+            table_id: Destination table (project.dataset.table)
+            rows: Destination rows of the batch
+            start_row: Absolute source row index of the first row
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: If the load or the commit fails (nothing is committed)
+        """
+        if not rows:
+            return 0
+
+        schema = self._destination_schemas.get(table_id)
+        if schema is None:
+            schema = self.bq_client.get_table(table_id).schema
+            self._destination_schemas[table_id] = schema
+        project_id, dataset_id, table_name = table_id.split(".")
+        staging_id = f"{project_id}.{dataset_id}._ckpt_{table_name}_{uuid.uuid4().hex[:12]}"
+
+        staging = bigquery.Table(staging_id, schema=schema)
+        staging.expires = datetime.now(timezone.utc) + STAGING_TABLE_EXPIRATION
+        self.bq_client.create_table(staging)
+
+        try:
+            buffer = io.BytesIO()
+            for row in rows:
+                buffer.write((json.dumps(serialize_row_for_json(row), default=str) + "\n").encode("utf-8"))
+            buffer.seek(0)
+            self.bq_client.load_table_from_file(
+                buffer,
+                staging_id,
+                job_config=bigquery.LoadJobConfig(
+                    source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                    write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                ),
+            ).result()
+
+            commit_query = f"""
+            BEGIN TRANSACTION;
+            INSERT INTO `{table_id}` SELECT * FROM `{staging_id}`;
+            INSERT INTO `{self.batches_table_id}`
+                (org_slug, pipeline_id, step_id, api_endpoint, start_row, row_count, committed_at)
+            VALUES (@org_slug, @pipeline_id, @step_id, @api_endpoint, @start_row, @row_count, CURRENT_TIMESTAMP());
+            COMMIT TRANSACTION;
+            DROP TABLE IF EXISTS `{staging_id}`;
+            """
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("org_slug", "STRING", org_slug),
+                    bigquery.ScalarQueryParameter("pipeline_id", "STRING", pipeline_id),
+                    bigquery.ScalarQueryParameter("step_id", "STRING", step_id),
+                    bigquery.ScalarQueryParameter("api_endpoint", "STRING", api_endpoint),
+                    bigquery.ScalarQueryParameter("start_row", "INT64", start_row),
+                    bigquery.ScalarQueryParameter("row_count", "INT64", len(rows)),
+                ]
+            )
+            self.bq_client.query(commit_query, job_config=job_config).result()
+        except Exception:
+            try:
+                self.bq_client.delete_table(staging_id, not_found_ok=True)
+            except Exception as e:
+                logger.warning(f"Could not drop checkpoint staging table {staging_id}: {e}")
+            raise
+
+        return len(rows)
+
     def mark_complete(
         self,
         org_slug: str,
@@ -261,13 +439,22 @@ class CheckpointManager:
             True if successful, False otherwise
         """
         try:
+            # The batch ledger is cleared in the same transaction, so the next
+            # run for this key starts from an empty ledger
             update_query = f"""
+            BEGIN TRANSACTION;
             UPDATE `{self.table_id}`
             SET is_complete = TRUE, last_updated = CURRENT_TIMESTAMP()
             WHERE org_slug = @org_slug
                 AND pipeline_id = @pipeline_id
                 AND step_id = @step_id
-                AND api_endpoint = @api_endpoint
+                AND api_endpoint = @api_endpoint;
+            DELETE FROM `{self.batches_table_id}`
+            WHERE org_slug = @org_slug
+                AND pipeline_id = @pipeline_id
+                AND step_id = @step_id
+                AND api_endpoint = @api_endpoint;
+            COMMIT TRANSACTION;
             """
 
             job_config = bigquery.QueryJobConfig(
@@ -334,6 +521,126 @@ class CheckpointManager:
             return 0
 
 
+class AsyncCheckpointWriter:
+    """
+    Batched, asynchronous checkpoint persistence for a single pagination key.
+
+    update() is synchronous and only records the latest state in memory. A
+    background task writes it (one MERGE) at most every flush_interval_seconds,
+    and intermediate updates are coalesced. close() performs the final write
+    and optionally marks the checkpoint complete.
+
+    The persisted state only tells a resumed run where to start fetching; it
+    may lag the committed data by up to flush_interval_seconds. Rows committed
+    after it are skipped using the commit_batch ledger.
+
+    Usage:
+        writer = AsyncCheckpointWriter(manager, org_slug, pipeline_id, step_id, endpoint)
+        writer.start()
+        ...
+        writer.update(cursor=state_json, page_number=page, total_fetched=rows)
+        ...
+        await writer.close(complete=True)
+    """
+
+    def __init__(
+        self,
+        manager: CheckpointManager,
+        org_slug: str,
+        pipeline_id: str,
+        step_id: str,
+        api_endpoint: str,
+        flush_interval_seconds: float = 30.0
+    ):
+        self.manager = manager
+        self.org_slug = org_slug
+        self.pipeline_id = pipeline_id
+        self.step_id = step_id
+        self.api_endpoint = api_endpoint
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._pending: Optional[PaginationCheckpoint] = None
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.writes = 0
+        self.updates = 0
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="checkpoint-writer")
+
+    def update(self, cursor: Optional[str], page_number: int, total_fetched: int) -> None:
+        """Record the latest progress (persisted on the next flush)."""
+        self._pending = PaginationCheckpoint(
+            org_slug=self.org_slug,
+            pipeline_id=self.pipeline_id,
+            step_id=self.step_id,
+            api_endpoint=self.api_endpoint,
+            cursor=cursor,
+            page_number=page_number,
+            total_fetched=total_fetched,
+            last_updated=datetime.now(timezone.utc).isoformat(),
+            is_complete=False
+        )
+        self.updates += 1
+        self._dirty.set()
+
+    async def flush(self) -> bool:
+        """Persist the latest pending checkpoint now (no-op if nothing changed)."""
+        async with self._flush_lock:
+            checkpoint, self._pending = self._pending, None
+            self._dirty.clear()
+            if checkpoint is None:
+                return True
+            saved = await asyncio.to_thread(self.manager.save_checkpoint, checkpoint)
+            if saved:
+                self.writes += 1
+            elif self._pending is None:
+                # Keep the state so the next flush retries it
+                self._pending = checkpoint
+            return saved
+
+    async def close(self, complete: bool = False) -> None:
+        """Stop the background task, write the final state, optionally mark complete."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+        if complete:
+            await asyncio.to_thread(
+                self.manager.mark_complete,
+                self.org_slug,
+                self.pipeline_id,
+                self.step_id,
+                self.api_endpoint
+            )
+
+        logger.debug(
+            "Checkpoint writer closed",
+            extra={
+                "org_slug": self.org_slug,
+                "pipeline_id": self.pipeline_id,
+                "updates": self.updates,
+                "writes": self.writes,
+                "complete": complete
+            }
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+
 def create_checkpoint_manager(bq_client: bigquery.Client) -> CheckpointManager:
     """Factory function to create a CheckpointManager."""
     return CheckpointManager(bq_client)
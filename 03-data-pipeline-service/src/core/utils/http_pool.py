@@ -0,0 +1,232 @@
+"""
+Shared HTTP Client Pool
+
+Process-wide outbound HTTP connection pool used by GenAI provider adapters,
+REST API connectors/extractors and notification webhooks instead of a fresh
+httpx.AsyncClient (and fresh DNS/TCP/TLS handshakes) per adapter or request:
+
+- One keep-alive connection pool per upstream host (scheme, host, port) with
+  its own connection limit, so a slow provider cannot starve the others
+- HTTP/2 is negotiated when enabled and the optional h2 package is
+  installed; otherwise connections fall back to HTTP/1.1 keep-alive
+- Callers keep their own client settings (headers, timeouts, base_url) via
+  lightweight clients from HttpClientPool.client(); closing such a client
+  leaves the pooled connections open for the next caller
+- Connection reuse is counted per host (new vs reused connection) and
+  exported to Prometheus as http_pool_requests_total
+
+One pool exists per event loop (the Pub/Sub worker runs each task in its
+own loop and connections are bound to the loop that opened them).
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import httpx
+
+from src.app.config import settings
+from src.core.observability.metrics import increment_http_pool_request
+
+# Optional: HTTP/2 support
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+HostKey = Tuple[str, str, int]
+
+
+# ============================================
+# Metrics
+# ============================================
+
+@dataclass
+class HostConnectionStats:
+    """Connection reuse counters for one upstream host."""
+    requests: int = 0
+    connections_opened: int = 0
+    failed: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served on an already open connection."""
+        if self.requests == 0:
+            return 0.0
+        return max(0, self.requests - self.connections_opened) / self.requests
+
+
+# ============================================
+# Pool
+# ============================================
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Client-facing transport: routes to the pool and never closes it."""
+
+    def __init__(self, pool: "HttpClientPool"):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Pooled connections outlive the client; HttpClientPool.close() owns them
+        pass
+
+
+class HttpClientPool:
+    """
+    Per-host keep-alive connection pools shared by all outbound HTTP callers.
+
+    Usage:
+        async with get_http_client_pool().client(timeout=30.0) as client:
+            response = await client.get("https://api.openai.com/v1/models")
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 20,
+        max_keepalive_per_host: int = 10,
+        keepalive_expiry_seconds: float = 60.0,
+        http2: bool = True
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections_per_host: Open connection limit per upstream host
+            max_keepalive_per_host: Idle connections kept per upstream host
+            keepalive_expiry_seconds: Idle time before a pooled connection is closed
+            http2: Negotiate HTTP/2 (ignored when h2 is not installed)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=min(max_keepalive_per_host, max_connections_per_host),
+            keepalive_expiry=keepalive_expiry_seconds
+        )
+        self.http2 = http2 and H2_AVAILABLE
+        if http2 and not H2_AVAILABLE:
+            logger.debug("h2 not installed; shared HTTP pool uses HTTP/1.1 keep-alive")
+
+        self._transports: Dict[HostKey, httpx.AsyncHTTPTransport] = {}
+        self._stats: Dict[str, HostConnectionStats] = {}
+        self._closed = False
+
+    @property
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Transport for callers that build their own httpx.AsyncClient."""
+        return _PooledTransport(self)
+
+    def client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """
+        Create a lightweight client on top of the shared connections.
+
+        Args:
+            **kwargs: httpx.AsyncClient options (headers, timeout, base_url, ...)
+
+        Returns:
+            httpx.AsyncClient whose close does not close pooled connections
+        """
+        return httpx.AsyncClient(transport=self.transport, **kwargs)
+
+    def _get_transport(self, key: HostKey) -> httpx.AsyncHTTPTransport:
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+            self._transports[key] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request on the pooled connections of its host."""
+        if self._closed:
+            raise RuntimeError("HTTP client pool is closed")
+
+        url = request.url
+        host = url.host
+        port = url.port or (443 if url.scheme == "https" else 80)
+        transport = self._get_transport((url.scheme, host, port))
+        stats = self._stats.setdefault(host, HostConnectionStats())
+
+        # httpcore reports connection setup through the "trace" extension
+        opened = False
+        caller_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            nonlocal opened
+            if event_name == "connection.connect_tcp.complete":
+                opened = True
+            if caller_trace is not None:
+                await caller_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        stats.requests += 1
+        try:
+            response = await transport.handle_async_request(request)
+        except Exception:
+            stats.failed += 1
+            stats.connections_opened += int(opened)
+            increment_http_pool_request(host, "failed")
+            raise
+
+        stats.connections_opened += int(opened)
+        increment_http_pool_request(host, "new" if opened else "reused")
+        return response
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection reuse counters per upstream host."""
+        return {
+            host: {
+                "requests": stats.requests,
+                "connections_opened": stats.connections_opened,
+                "failed": stats.failed,
+                "reuse_ratio": round(stats.reuse_ratio, 4),
+            }
+            for host, stats in self._stats.items()
+        }
+
+    async def close(self) -> None:
+        """Close every pooled connection (app shutdown)."""
+        self._closed = True
+        transports, self._transports = list(self._transports.values()), {}
+        for transport in transports:
+            try:
+                await transport.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled HTTP transport: {e}")
+
+
+# One pool per event loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpClientPool]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client_pool() -> HttpClientPool:
+    """Get or create the HttpClientPool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool._closed:
+        pool = HttpClientPool(
+            max_connections_per_host=settings.http_pool_max_connections_per_host,
+            max_keepalive_per_host=settings.http_pool_max_keepalive_per_host,
+            keepalive_expiry_seconds=settings.http_pool_keepalive_expiry_seconds,
+            http2=settings.http_pool_http2
+        )
+        _pools[loop] = pool
+    return pool
+
+
+def set_http_client_pool(pool: HttpClientPool) -> None:
+    """Install a pool for the running event loop (tests)."""
+    _pools[asyncio.get_running_loop()] = pool
+
+
+async def close_http_client_pool() -> None:
+    """Close the running loop's pool (app shutdown)."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
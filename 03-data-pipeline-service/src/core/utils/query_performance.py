@@ -25,6 +25,11 @@ Usage:
     # Option 3: Manual logging
     result = client.query(query, job_config=config).result()
     log_query_metrics(result._query_job, operation="manual_query")
+
+    # Option 4: Scripts / stored procedure CALLs (totals plus each DML statement)
+    job = client.query("CALL `project.organizations`.sp_example(...)")
+    job.result()
+    log_script_metrics(job, operation="sp_example", client=client)
 """
 
 import logging
@@ -81,7 +86,7 @@ def log_query_metrics(
 
         # Determine log level based on performance
         bytes_gb = metrics["total_bytes_processed"] / (1024 ** 3)
-        exec_time_sec = metrics.get("execution_time_ms", 0) / 1000
+        exec_time_sec = (metrics["execution_time_ms"] or 0) / 1000
 
         # Log warnings for expensive queries
         if bytes_gb > 1.0:  # More than 1 GB processed
@@ -107,6 +112,61 @@ def log_query_metrics(
         return {}
 
 
+# Child job statement types logged individually by log_script_metrics
+DML_STATEMENT_TYPES = ("INSERT", "UPDATE", "DELETE", "MERGE")
+
+
+def log_script_metrics(
+    script_job: bigquery.QueryJob,
+    operation: str,
+    client: Optional[bigquery.Client] = None,
+    org_slug: Optional[str] = None,
+    additional_context: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Log performance metrics of a completed script or stored procedure CALL.
+
+    The parent job's bytes processed and slot milliseconds are totals over
+    every statement of the script. When a client is given, the child jobs are
+    listed too and each DML statement is logged as "{operation}.{statement}",
+    so the statement that scans the most can be found.
+
+    Args:
+        script_job: Completed BigQuery job of the script or CALL
+        operation: Name of the operation (e.g., "sp_cloud_1_convert_to_focus")
+        client: BigQuery client used to list the child jobs
+        org_slug: Organization slug for multi-tenant tracking
+        additional_context: Additional metadata to log
+
+    Returns:
+        Parent job metrics, with "statements" (per-DML-statement metrics in
+        execution order) when a client is given
+    """
+    metrics = log_query_metrics(script_job, operation, org_slug, additional_context)
+    if client is None or not metrics:
+        return metrics
+
+    statements = []
+    try:
+        # Child jobs are listed newest first
+        children = list(client.list_jobs(parent_job=script_job.job_id))
+        for child in reversed(children):
+            statement_type = getattr(child, "statement_type", None)
+            if statement_type not in DML_STATEMENT_TYPES:
+                continue
+            statements.append(log_query_metrics(
+                child,
+                operation=f"{operation}.{statement_type.lower()}",
+                org_slug=org_slug,
+                additional_context={"parent_job_id": script_job.job_id, **(additional_context or {})}
+            ))
+    except Exception as e:
+        logger.warning(f"Could not list child jobs for {operation}: {e}")
+
+    metrics["statements"] = statements
+    return metrics
+
+
 def log_query_performance(operation: str, org_slug: Optional[str] = None):
     """
     Decorator to automatically log query performance metrics.
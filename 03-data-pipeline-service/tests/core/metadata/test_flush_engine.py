@@ -0,0 +1,195 @@
+"""
+Tests for the shared metadata flush engine (src/core/metadata/flush_engine.py)
+and MetadataLogger on top of it.
+
+BigQuery is replaced by a recording writer with configurable latency,
+outages and rejected rows.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from src.core.metadata import MetadataLogger
+from src.core.metadata.flush_engine import MetadataFlushEngine, set_metadata_flush_engine
+
+
+class RecordingWriter:
+    """insert_rows_json stand-in; rows with "bad" are rejected, failing=True raises."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.failing = False
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, table_id, rows, row_ids):
+        time.sleep(self.latency)
+        if self.failing:
+            raise ConnectionError("BigQuery unavailable")
+        bad = [i for i, row in enumerate(rows) if row.get("bad")]
+        if bad:
+            return [
+                {"index": i, "errors": [{"reason": "invalid" if i in bad else "stopped"}]}
+                for i in range(len(rows))
+            ]
+        with self._lock:
+            self.calls.append((table_id, list(row_ids)))
+        return []
+
+    def ids(self, table_suffix=""):
+        return [i for table_id, ids in self.calls if table_id.endswith(table_suffix) for i in ids]
+
+
+def _engine(writer, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 30)
+    kwargs.setdefault("spill_dir", None)
+    engine = MetadataFlushEngine(writer=writer, **kwargs)
+    set_metadata_flush_engine(engine)
+    return engine
+
+
+async def _log_step(metadata_logger, step_logging_id):
+    await metadata_logger.log_step_start(
+        step_logging_id=step_logging_id,
+        pipeline_logging_id="run",
+        step_name="extract",
+        step_type="generic.api_extractor",
+        step_index=0
+    )
+
+
+async def test_runs_share_one_insert_per_table():
+    writer = RecordingWriter()
+    engine = _engine(writer)
+    loggers = [MetadataLogger(bq_client=None, org_slug="acme_corp") for _ in range(20)]
+
+    for i, metadata_logger in enumerate(loggers):
+        await metadata_logger.start()
+        await _log_step(metadata_logger, f"step-{i}")
+        await metadata_logger.log_state_transition(pipeline_logging_id="run", from_state="PENDING", to_state="RUNNING")
+    assert writer.calls == []
+
+    await asyncio.gather(*(metadata_logger.stop() for metadata_logger in loggers))
+
+    assert sorted(writer.ids("org_meta_step_logs")) == sorted(f"step-{i}_start" for i in range(20))
+    assert len(writer.calls) == 2  # step logs + state transitions
+    await engine.close()
+
+
+async def test_full_batch_flushes_immediately_and_batch_size_adapts():
+    writer = RecordingWriter()
+    engine = _engine(writer, initial_batch_rows=10, max_batch_rows=40, target_latency_seconds=1.0)
+
+    for i in range(10):
+        engine.submit("p.organizations.org_meta_step_logs", f"r{i}", {"i": i})
+    await asyncio.sleep(0.05)
+
+    assert len(writer.ids()) == 10
+    assert engine.metrics()["p.organizations.org_meta_step_logs"]["batch_rows"] == 20
+
+    writer.latency = 0.05
+    engine.target_latency_seconds = 0.01
+    for i in range(20):
+        engine.submit("p.organizations.org_meta_step_logs", f"s{i}", {"i": i})
+    await asyncio.sleep(0.2)
+    assert engine.metrics()["p.organizations.org_meta_step_logs"]["batch_rows"] == 10
+    await engine.close()
+
+
+async def test_outage_spills_to_disk_and_replays(tmp_path):
+    writer = RecordingWriter()
+    writer.failing = True
+    engine = _engine(writer, spill_dir=str(tmp_path))
+    metadata_logger = MetadataLogger(bq_client=None, org_slug="acme_corp")
+    await metadata_logger.start()
+
+    for i in range(5):
+        await _log_step(metadata_logger, f"step-{i}")
+    await metadata_logger.stop()  # Returns once rows are safe on disk
+
+    assert os.listdir(tmp_path) and engine.spilled_bytes > 0
+    assert metadata_logger.get_queue_depths()["step_spilled_logs"] == 5
+    assert metadata_logger.get_queue_depths()["total_lost_logs"] == 0
+
+    writer.failing = False
+    engine.submit(metadata_logger.step_table_id, "after-outage", {"i": 0})
+    await engine.flush()
+    for _ in range(100):
+        if not os.listdir(tmp_path):
+            break
+        await asyncio.sleep(0.01)
+
+    assert sorted(writer.ids()) == sorted(["after-outage"] + [f"step-{i}_start" for i in range(5)])
+    assert engine.spilled_bytes == 0
+    await engine.close()
+
+
+async def test_rows_are_shed_not_raised_when_spilling_is_disabled():
+    writer = RecordingWriter()
+    writer.failing = True
+    engine = _engine(writer)
+    metadata_logger = MetadataLogger(bq_client=None, org_slug="acme_corp")
+    await metadata_logger.start()
+
+    await _log_step(metadata_logger, "step-1")
+    await metadata_logger.stop()
+
+    assert metadata_logger.get_queue_depths()["lost_step_logs"] == 1
+    await engine.close()
+
+
+async def test_rejected_row_does_not_drop_its_batch():
+    writer = RecordingWriter()
+    engine = _engine(writer)
+    table_id = "p.organizations.org_meta_state_transitions"
+
+    for i in range(3):
+        engine.submit(table_id, f"t{i}", {"i": i, "bad": i == 1})
+    await engine.flush()
+
+    assert writer.ids() == ["t0", "t2"]
+    assert engine.metrics()[table_id]["rows_rejected"] == 1
+    await engine.close()
+
+
+async def test_overflow_spills_oldest_rows_without_blocking(tmp_path):
+    writer = RecordingWriter(latency=0.05)
+    engine = _engine(writer, initial_batch_rows=10, max_pending_rows=20, spill_dir=str(tmp_path))
+    table_id = "p.organizations.org_meta_step_logs"
+
+    start = time.perf_counter()
+    for i in range(100):
+        engine.submit(table_id, f"r{i}", {"i": i, "at": datetime.now(timezone.utc).isoformat()})
+    assert time.perf_counter() - start < 0.5
+    assert engine.metrics()[table_id]["pending_rows"] <= 20
+
+    await engine.flush()
+    metrics = engine.metrics()[table_id]
+    assert metrics["rows_written"] + metrics["rows_spilled"] == 100
+    assert metrics["rows_spilled"] > 0
+    await engine.close()
+
+
+async def test_overflow_spill_files_are_written_off_the_event_loop(tmp_path):
+    writer = RecordingWriter(latency=0.05)
+    engine = _engine(writer, initial_batch_rows=10, max_pending_rows=20, spill_dir=str(tmp_path))
+    table_id = "p.organizations.org_meta_step_logs"
+    write_spill_file = engine._write_spill_file
+    spill_threads = []
+
+    def recording_write(lines):
+        spill_threads.append(threading.get_ident())
+        write_spill_file(lines)
+
+    engine._write_spill_file = recording_write
+    for i in range(60):
+        engine.submit(table_id, f"r{i}", {"i": i})
+    assert spill_threads == []  # submit() only schedules the spill
+
+    await engine.flush()
+    assert spill_threads and threading.get_ident() not in spill_threads
+    assert engine.metrics()[table_id]["rows_spilled"] == 10 * len(spill_threads)
+    await engine.close()
@@ -0,0 +1,250 @@
+"""
+Tests for the local DuckDB BigQuery stand-in (bigquery_backend="duckdb").
+
+Covers SQL translation, the script interpreter and the real subscription
+stored procedures running against schema-built tables.
+"""
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from google.api_core import exceptions as google_api_exceptions
+from google.cloud import bigquery
+
+pytest.importorskip("duckdb")
+
+from src.app.config import settings
+from src.core.engine.bq_client import BigQueryClient
+from src.core.engine.local_bq import (
+    LocalBigQueryClient,
+    get_local_bigquery_client,
+    reset_local_bigquery_client,
+    translate_sql,
+)
+
+PROJECT = "bench-project"
+SERVICE_ROOT = Path(__file__).resolve().parents[2]
+PROCEDURES_DIR = SERVICE_ROOT / "configs" / "system" / "procedures" / "subscription"
+SETUP_DIR = SERVICE_ROOT.parent / "02-api-service" / "configs" / "setup"
+BOOTSTRAP_SCHEMAS = SETUP_DIR / "bootstrap" / "schemas"
+ORG_SCHEMAS = SETUP_DIR / "organizations" / "onboarding" / "schemas"
+
+
+@pytest.fixture
+def client():
+    local = LocalBigQueryClient(PROJECT)
+    yield local
+    local.close()
+
+
+def _params(*params):
+    return bigquery.QueryJobConfig(query_parameters=list(params))
+
+
+# ============================================
+# Translation
+# ============================================
+
+def test_translate_names_params_and_functions():
+    sql = translate_sql(
+        "SELECT DATE_ADD(@d, INTERVAL 1 DAY), COUNTIF(x > 0), FORMAT_DATE('%Y-%m', d) "
+        "FROM `bench-project.acme_local.t` WHERE id IN UNNEST(@ids) AND note = 'it''s -- not a comment'",
+        PROJECT,
+        {"d": "DATE", "ids": "VARCHAR[]"},
+    )
+    assert '"acme_local"."t"' in sql
+    assert "CAST((CAST($d AS DATE)) + INTERVAL (1) DAY AS date)" in sql
+    assert "count_if(x > 0)" in sql
+    assert "strftime(d, '%Y-%m')" in sql
+    assert "IN (SELECT UNNEST(CAST($ids AS VARCHAR[])))" in sql
+    assert "'it''s -- not a comment'" in sql
+
+
+# ============================================
+# Client surface
+# ============================================
+
+def test_query_parameters_rows_and_dml_counts(client):
+    client.create_table(bigquery.Table(f"{PROJECT}.acme_local.events", schema=[
+        bigquery.SchemaField("id", "STRING", mode="REQUIRED"),
+        bigquery.SchemaField("amount", "FLOAT64"),
+        bigquery.SchemaField("event_date", "DATE"),
+    ]))
+    errors = client.insert_rows_json(f"{PROJECT}.acme_local.events", [
+        {"id": "a", "amount": 1.5, "event_date": "2026-01-01"},
+        {"id": "b", "amount": 2.5, "event_date": "2026-01-02"},
+    ])
+    assert errors == []
+
+    rows = list(client.query(
+        "SELECT id, amount FROM `bench-project.acme_local.events` WHERE id IN UNNEST(@ids) ORDER BY id",
+        job_config=_params(bigquery.ArrayQueryParameter("ids", "STRING", ["b"])),
+    ).result())
+    assert rows[0].id == "b" and rows[0]["amount"] == 2.5
+
+    job = client.query(
+        "UPDATE `bench-project.acme_local.events` SET amount = amount * 2 WHERE event_date >= @d",
+        job_config=_params(bigquery.ScalarQueryParameter("d", "DATE", date(2026, 1, 1))),
+    )
+    assert job.num_dml_affected_rows == 2
+    assert job.total_bytes_processed == 0
+
+    table = client.get_table(f"{PROJECT}.acme_local.events")
+    assert table.num_rows == 2
+    assert [f.field_type for f in table.schema] == ["STRING", "FLOAT", "DATE"]
+
+    with pytest.raises(google_api_exceptions.NotFound):
+        client.get_table(f"{PROJECT}.acme_local.missing")
+    with pytest.raises(google_api_exceptions.NotFound):
+        client.query("SELECT * FROM `bench-project.acme_local.missing`")
+
+
+def test_script_variables_exceptions_and_execute_immediate(client):
+    job = client.query("""
+        DECLARE n INT64 DEFAULT 3;
+        DECLARE s STRING;
+        SET s = CONCAT('a', CAST(n AS STRING));
+        IF n > 2 THEN
+          SET n = n + 1;
+        ELSE
+          SET n = 0;
+        END IF;
+        BEGIN
+          SELECT ERROR('boom');
+        EXCEPTION WHEN ERROR THEN
+          SET s = CONCAT(s, ':', @@error.message);
+        END;
+        EXECUTE IMMEDIATE FORMAT("SELECT %d * @k", n) INTO n USING 10 AS k;
+        SELECT n AS n, s AS s;
+    """)
+    row = list(job.result())[0]
+    assert row.n == 40
+    assert row.s.startswith("a3:") and "boom" in row.s
+
+    with pytest.raises(google_api_exceptions.BadRequest, match="Assertion failed: must be positive"):
+        client.query('DECLARE x INT64 DEFAULT -1; ASSERT x > 0 AS "must be positive";')
+
+
+def test_subscription_procedures_run_end_to_end(client):
+    client.create_tables_from_schemas(
+        "acme_local", str(ORG_SCHEMAS),
+        ["subscription_plans", "subscription_plan_costs_daily", "cost_data_standard_1_3"],
+    )
+    client.create_tables_from_schemas("organizations", str(BOOTSTRAP_SCHEMAS), ["org_profiles", "org_hierarchy", "org_subscriptions"])
+    client.insert_rows_json("organizations.org_profiles", [{
+        "org_slug": "acme", "company_name": "Acme", "admin_email": "admin@acme.test", "org_dataset_id": "acme_local",
+        "status": "ACTIVE", "default_currency": "USD", "created_at": "2026-01-01T00:00:00Z",
+    }])
+    assert set(client.load_procedures(str(PROCEDURES_DIR))) >= {
+        "sp_subscription_2_calculate_daily_costs", "sp_subscription_3_convert_to_focus", "sp_subscription_4_run_pipeline",
+    }
+
+    plan = {
+        "x_org_slug": "acme", "subscription_id": "sub_a", "provider": "slack", "plan_name": "PRO", "category": "collaboration",
+        "status": "active", "start_date": "2026-01-01", "billing_cycle": "monthly", "currency": "USD", "seats": 10,
+        "pricing_model": "PER_SEAT", "unit_price": 8.0, "auto_renew": True,
+        "x_hierarchy_entity_id": "TEAM-BACKEND", "x_hierarchy_entity_name": "Backend",
+        "x_hierarchy_path": "/DEPT-ENG/TEAM-BACKEND", "x_hierarchy_path_names": "Eng > Backend",
+    }
+    client.insert_rows_json("acme_local.subscription_plans", [plan, dict(plan, subscription_id="sub_b", unit_price=4.0)])
+
+    client.query(
+        "CALL `bench-project.organizations`.sp_subscription_4_run_pipeline("
+        "'bench-project', 'acme_local', DATE('2026-01-01'), DATE('2026-01-31'), 'p', 'internal', 'run-1', [])"
+    )
+    totals = {
+        row.subscription_id: (row.days, float(row.total))
+        for row in client.query(
+            "SELECT subscription_id, COUNT(*) AS days, ROUND(SUM(daily_cost), 2) AS total "
+            "FROM `bench-project.acme_local.subscription_plan_costs_daily` GROUP BY 1"
+        ).result()
+    }
+    assert totals == {"sub_a": (31, 80.0), "sub_b": (31, 40.0)}
+
+    focus = list(client.query(
+        "SELECT COUNT(*) AS n, ANY_VALUE(x_cost_category) AS category "
+        "FROM `bench-project.acme_local.cost_data_standard_1_3`"
+    ).result())[0]
+    assert focus.n == 62 and focus.category == "subscription"
+
+
+def _gcp_billing_row(usage_day: str, run_date: str, cost: float) -> dict:
+    return {
+        "billing_account_id": "0A1B2C", "service_id": "compute", "service_description": "Compute Engine",
+        "usage_start_time": f"{usage_day}T00:00:00Z", "usage_end_time": f"{usage_day}T01:00:00Z",
+        "cost": cost, "currency": "USD", "labels_json": "{}",
+        "x_ingestion_id": f"ing-{usage_day}-{cost}", "x_ingestion_date": run_date, "x_org_slug": "acme",
+        "x_pipeline_id": "gcp-billing", "x_credential_id": "cred", "x_pipeline_run_date": run_date,
+        "x_run_id": f"extract-{run_date}", "x_ingested_at": f"{run_date}T04:00:00Z", "x_cloud_provider": "GCP",
+    }
+
+
+def test_cloud_focus_partition_scoped_conversion(client):
+    client.create_tables_from_schemas("acme_local", str(ORG_SCHEMAS), ["cloud_gcp_billing_raw_daily", "cost_data_standard_1_3"])
+    client.create_tables_from_schemas("organizations", str(BOOTSTRAP_SCHEMAS), ["org_profiles", "org_hierarchy", "org_meta_dq_results"])
+    client.insert_rows_json("organizations.org_profiles", [{"org_slug": "acme", "org_dataset_id": "acme_local", "status": "ACTIVE"}])
+    client.load_procedures(str(SERVICE_ROOT / "configs" / "system" / "procedures" / "cloud"))
+    client.insert_rows_json("acme_local.cloud_gcp_billing_raw_daily", [
+        _gcp_billing_row("2026-01-08", "2026-01-10", 1.0),
+        _gcp_billing_row("2026-01-09", "2026-01-10", 2.0),
+        _gcp_billing_row("2026-01-10", "2026-01-11", 4.0),
+    ])
+    client.insert_rows_json("acme_local.cost_data_standard_1_3", [{
+        "ChargePeriodStart": "2026-01-09T00:00:00Z", "x_source_system": "cloud_aws_billing_raw_daily",
+        "x_cloud_provider": "aws", "x_run_id": "aws-run", "EffectiveCost": 8.0,
+    }])
+
+    def convert(run_id, run_dates):
+        return list(client.query(
+            "CALL `bench-project.organizations`.sp_cloud_1_convert_to_focus("
+            "'bench-project', 'acme_local', DATE('2026-01-08'), DATE('2026-01-10'), 'gcp', 'p', 'cred', @run_id, @run_dates)",
+            job_config=_params(
+                bigquery.ScalarQueryParameter("run_id", "STRING", run_id),
+                bigquery.ArrayQueryParameter("run_dates", "DATE", run_dates),
+            ),
+        ).result())[0]
+
+    def focus_by_day():
+        return {
+            (str(row.day), row.x_run_id): (row.n, float(row.cost))
+            for row in client.query(
+                "SELECT DATE(ChargePeriodStart) AS day, x_run_id, COUNT(*) AS n, SUM(EffectiveCost) AS cost "
+                "FROM `bench-project.acme_local.cost_data_standard_1_3` GROUP BY 1, 2"
+            ).result()
+        }
+
+    result = convert("run-range", [])
+    assert (result.rows_inserted, result.partitions_replaced, result.partition_scoped) == (3, 3, False)
+
+    # A late correction for 01-09 arrives with the 01-12 extract: only that day is replaced
+    client.insert_rows_json("acme_local.cloud_gcp_billing_raw_daily", [_gcp_billing_row("2026-01-09", "2026-01-12", 0.5)])
+    result = convert("run-scoped", [date(2026, 1, 12)])
+    assert (result.rows_inserted, result.partitions_replaced, result.partition_scoped) == (2, 1, True)
+    assert focus_by_day() == {
+        ("2026-01-08", "run-range"): (1, 1.0),
+        ("2026-01-09", "run-scoped"): (2, 2.5),
+        ("2026-01-09", "aws-run"): (1, 8.0),
+        ("2026-01-10", "run-range"): (1, 4.0),
+    }
+
+    # Run dates the extract wrote nothing for leave every partition as it was
+    result = convert("run-empty", [date(2026, 1, 13)])
+    assert (result.rows_inserted, result.partitions_replaced) == (0, 0)
+    assert sum(n for n, _ in focus_by_day().values()) == 5
+
+
+# ============================================
+# Backend switch
+# ============================================
+
+def test_bigquery_client_uses_stand_in_when_configured(monkeypatch):
+    monkeypatch.setattr(settings, "bigquery_backend", "duckdb")
+    monkeypatch.setattr(settings, "local_bigquery_data_dir", None)
+    reset_local_bigquery_client()
+    try:
+        bq = BigQueryClient(project_id=PROJECT)
+        assert bq.client is get_local_bigquery_client()
+        assert isinstance(bq.client, LocalBigQueryClient)
+    finally:
+        reset_local_bigquery_client()
@@ -0,0 +1,189 @@
+"""
+Tests for speculative parallel pagination (offset/page styles).
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.abstractor.models import RestAPIConnectorConfig
+from src.core.engine import api_connector
+from src.core.engine.api_connector import APIConnector, RateLimiter
+from src.core.engine.parallel_pagination import (
+    AdaptiveWindow,
+    PageResult,
+    ParallelPaginationSettings,
+    fetch_pages_parallel,
+)
+from src.core.processors.generic.api_extractor import ApiExtractorProcessor
+
+
+async def _collect(gen):
+    return [page async for page in gen]
+
+
+# ============================================
+# AdaptiveWindow
+# ============================================
+
+def test_window_grows_after_clean_responses():
+    window = AdaptiveWindow(initial=2, maximum=4)
+    for _ in range(2):
+        window.record(PageResult(rows=[{}]))
+    assert window.size == 3
+
+
+def test_window_halves_on_throttle_and_respects_minimum():
+    window = AdaptiveWindow(initial=8, maximum=8)
+    window.record(PageResult(rows=[], throttled=True))
+    assert window.size == 4
+    for _ in range(5):
+        window.record(PageResult(rows=[], throttled=True))
+    assert window.size == 1
+    assert window.throttle_events == 6
+
+
+def test_window_holds_while_client_limiter_saturated():
+    window = AdaptiveWindow(initial=2, maximum=8)
+    for _ in range(10):
+        window.record(PageResult(rows=[{}], rate_limited_wait=0.2))
+    assert window.size == 2
+
+
+def test_settings_default_disabled():
+    assert ParallelPaginationSettings.from_config(None).enabled is False
+    settings = ParallelPaginationSettings.from_config({"enabled": True, "max_concurrency": 8})
+    assert settings.enabled and settings.max_concurrency == 8
+
+
+def test_rate_limiter_default_capacity_is_a_minute_of_requests():
+    # Sequential callers keep the original bucket size
+    assert RateLimiter(requests_per_minute=600).capacity == 600
+    assert RateLimiter(requests_per_minute=600, burst=3).capacity == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_one_second_burst():
+    limiter = RateLimiter(requests_per_minute=600, burst=RateLimiter.one_second_burst(600))
+    assert limiter.capacity == 10
+    waits = [await limiter.acquire() for _ in range(10)]
+    assert waits == [0.0] * 10
+    # The 11th request waits for a refill instead of drawing on a minute's quota
+    assert await limiter.acquire() > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_refills_below_one_request_per_minute():
+    # requests_per_second: 0.01 -> 0.6 requests per minute
+    limiter = RateLimiter(requests_per_minute=0.01 * 60, burst=RateLimiter.one_second_burst(0.6))
+    assert limiter.capacity == 1
+    assert await limiter.acquire() == 0.0
+    # 100s of elapsed time refills one token at 0.01 tokens/s
+    limiter.last_update -= 101
+    waited = await asyncio.wait_for(limiter.acquire(), timeout=1)
+    assert waited < 1
+
+
+def test_connector_uses_one_second_burst_only_for_parallel_pagination(monkeypatch):
+    # Skip the SSRF check's DNS lookup
+    monkeypatch.setattr(api_connector, "validate_url", lambda url: None)
+
+    def connector(parallel):
+        config = RestAPIConnectorConfig(
+            type="rest_api",
+            base_url="https://api.example.com",
+            endpoint="/v1/usage",
+            auth={"type": "bearer", "secret_key": "vendor_api_key"},
+            rate_limit={"requests_per_minute": 600},
+            pagination={"type": "offset", "page_size": 100, "parallel": parallel},
+        )
+        return APIConnector(config, org_slug="acme_corp")
+
+    assert connector(None).rate_limiter.capacity == 600
+    assert connector({"enabled": True}).rate_limiter.capacity == 10
+
+
+# ============================================
+# fetch_pages_parallel
+# ============================================
+
+@pytest.mark.asyncio
+async def test_pages_yielded_in_order_despite_out_of_order_completion():
+    async def fetch_page(index):
+        # Later pages finish first
+        await asyncio.sleep(0.01 * (5 - index) if index < 5 else 0)
+        if index >= 5:
+            return PageResult(rows=[])
+        return PageResult(rows=[{"page": index}] * 10)
+
+    pages = await _collect(fetch_pages_parallel(
+        fetch_page, page_size=10, window=AdaptiveWindow(initial=4, maximum=4), max_pages=100
+    ))
+
+    assert [p[0]["page"] for p in pages] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_short_page_stops_and_cancels_speculative_requests():
+    requested = []
+
+    async def fetch_page(index):
+        requested.append(index)
+        await asyncio.sleep(0.001)
+        if index == 2:
+            return PageResult(rows=[{"i": 1}])  # Short page -> last page
+        return PageResult(rows=[{"i": 0}] * 5)
+
+    pages = await _collect(fetch_pages_parallel(
+        fetch_page, page_size=5, window=AdaptiveWindow(initial=3, maximum=3), max_pages=100
+    ))
+
+    assert len(pages) == 3
+    assert max(requested) < 2 + 3  # Never more than one window past the end
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_propagates():
+    async def fetch_page(index):
+        if index == 1:
+            raise RuntimeError("API Error 500")
+        return PageResult(rows=[{}] * 2)
+
+    with pytest.raises(RuntimeError, match="API Error 500"):
+        await _collect(fetch_pages_parallel(
+            fetch_page, page_size=2, window=AdaptiveWindow(initial=2), max_pages=100
+        ))
+
+
+# ============================================
+# ApiExtractorProcessor integration
+# ============================================
+
+@pytest.mark.asyncio
+async def test_api_extractor_offset_parallel_matches_sequential():
+    total = 1234
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json={"data": [{"id": i} for i in range(offset, min(offset + limit, total))]})
+
+    processor = ApiExtractorProcessor(http_transport=httpx.MockTransport(handler))
+    base = {
+        "url": "https://api.vendor.example/v1/items",
+        "data_path": "data",
+        "rate_limit": {"requests_per_second": 0},
+    }
+
+    sequential = {**base, "pagination": {"type": "offset", "param": "offset", "limit": 100}}
+    parallel = {**base, "pagination": {
+        "type": "offset", "param": "offset", "limit": 100,
+        "parallel": {"enabled": True, "max_concurrency": 6},
+    }}
+
+    seq_pages = await _collect(processor._fetch_pages(sequential, {}, {}, {}))
+    par_pages = await _collect(processor._fetch_pages(parallel, {}, {}, {}))
+
+    assert par_pages == seq_pages
+    assert sum(len(p) for p in par_pages) == total
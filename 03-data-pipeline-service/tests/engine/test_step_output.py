@@ -0,0 +1,186 @@
+"""
+Tests for spilled step outputs (Arrow IPC hand-off between pipeline steps).
+"""
+
+import os
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.app.config import settings
+from src.core.engine.step_output import (
+    STEP_OUTPUT_KEY,
+    StepDatasetWriter,
+    as_dataset,
+    cleanup_run_outputs,
+    run_output_dir,
+)
+from src.core.processors.generic.bq_loader import BQLoader
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "step_output_dir", str(tmp_path / "outputs"))
+    return tmp_path / "outputs"
+
+
+def _rows(n, start=0):
+    return [{"usage_date": "2026-01-15", "cost": float(i), "service": f"svc-{i % 3}"} for i in range(start, start + n)]
+
+
+# ============================================
+# Writer / handle
+# ============================================
+
+def test_rows_round_trip_through_handle_dict():
+    writer = StepDatasetWriter("run-1", "extract", rows_per_batch=4)
+    writer.write_rows(_rows(10))
+    dataset = writer.close()
+
+    restored = as_dataset(dataset.to_dict())
+    assert restored == dataset and restored.num_rows == 10
+    assert [b.num_rows for b in restored.iter_batches()] == [4, 4, 2]
+    assert [r for chunk in restored.iter_rows(chunk_size=3) for r in chunk] == _rows(10)
+    assert as_dataset({"rows": []}) is None
+
+
+def test_keys_first_seen_in_a_later_row_are_kept():
+    writer = StepDatasetWriter("run-1", "extract", rows_per_batch=10)
+    writer.write_rows([{"id": 0}, {"id": 1, "resource_name": "vm-1"}])
+    dataset = writer.close()
+
+    [rows] = list(dataset.iter_rows(chunk_size=10))
+    assert rows == [{"id": 0, "resource_name": None}, {"id": 1, "resource_name": "vm-1"}]
+
+
+def test_schema_change_starts_new_part():
+    writer = StepDatasetWriter("run-1", "extract")
+    writer.write_batch(pa.RecordBatch.from_pylist([{"a": 1}]))
+    writer.write_batch(pa.RecordBatch.from_pylist([{"a": 2}]))
+    writer.write_batch(pa.RecordBatch.from_pylist([{"a": None, "b": "x"}]))
+    dataset = writer.close()
+
+    assert len(dataset.parts) == 2 and dataset.num_rows == 3
+    assert [b.num_columns for b in dataset.iter_batches()] == [1, 1, 2]
+
+
+def test_cleanup_removes_run_directory_only(output_dir):
+    for run_id in ("run-1", "run-2"):
+        writer = StepDatasetWriter(run_id, "extract")
+        writer.write_rows(_rows(2))
+        writer.close()
+
+    cleanup_run_outputs("run-1")
+    cleanup_run_outputs("run-1")  # Idempotent
+
+    assert not os.path.exists(run_output_dir("run-1"))
+    assert os.listdir(run_output_dir("run-2"))
+
+
+def test_abort_discards_partial_output():
+    writer = StepDatasetWriter("run-1", "extract")
+    writer.write_rows(_rows(5))
+    writer.abort()
+    assert not os.path.exists(writer.path)
+
+
+# ============================================
+# BQLoader consumes handles
+# ============================================
+
+class FakeLoadClient:
+    def __init__(self, schema):
+        self.table = SimpleNamespace(schema=schema)
+        self.loads = []
+
+    def get_table(self, table_id):
+        return self.table
+
+    def load_table_from_file(self, file_obj, table_id, job_config=None):
+        self.loads.append((job_config.write_disposition, pq.read_table(file_obj)))
+        return SimpleNamespace(result=lambda: None)
+
+    def load_table_from_json(self, *args, **kwargs):
+        raise AssertionError("Spilled datasets must not be loaded as JSON")
+
+
+@pytest.mark.asyncio
+async def test_bq_loader_streams_upstream_dataset():
+    writer = StepDatasetWriter("run-1", "extract", rows_per_batch=50)
+    writer.write_rows(_rows(120))
+    dataset = writer.close()
+
+    schema = [
+        SimpleNamespace(name=n, field_type=t, mode="NULLABLE")
+        for n, t in [("usage_date", "DATE"), ("cost", "FLOAT64"), ("service", "STRING"),
+                     ("ingestion_timestamp", "TIMESTAMP")]
+    ]
+    client = FakeLoadClient(schema)
+    loader = object.__new__(BQLoader)
+    loader.org_slug = "acme_corp"
+    loader.settings = settings
+    loader._bq_client = SimpleNamespace(client=client)
+
+    # The executor passes the upstream handle via its output_dataset result key
+    context = {"org_slug": "acme_corp", STEP_OUTPUT_KEY: dataset.to_dict()}
+    step_config = {"config": {
+        "destination_table": "proj.acme_corp_prod.cloud_oci_billing_raw_daily",
+        "write_disposition": "WRITE_TRUNCATE",
+    }}
+    result = await loader.execute(step_config, context)
+
+    assert result["status"] == "SUCCESS", result
+    assert result["rows_loaded"] == 120
+    assert [d for d, _ in client.loads] == ["WRITE_TRUNCATE"]
+    loaded = client.loads[0][1]
+    assert loaded.column_names == ["usage_date", "cost", "service", "ingestion_timestamp"]
+    assert loaded.column("ingestion_timestamp").null_count == 0
+    assert sum(loaded.column("cost").to_pylist()) == sum(range(120))
+
+
+@pytest.mark.asyncio
+async def test_oci_extractor_spills_each_page_before_fetching_the_next(monkeypatch):
+    from src.core.processors.cloud.oci import cost_extractor
+
+    class FakeAuthenticator:
+        tenancy_ocid = None
+        region = "us-ashburn-1"
+
+        def __init__(self, org_slug):
+            pass
+
+        async def authenticate(self):
+            return None
+
+    monkeypatch.setattr(cost_extractor, "OCIAuthenticator", FakeAuthenticator)
+
+    written_before_fetch = []
+    writers = []
+    original_init = StepDatasetWriter.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        writers.append(self)
+
+    monkeypatch.setattr(cost_extractor.StepDatasetWriter, "__init__", tracking_init)
+
+    async def pages(self, start_time, end_time, granularity):
+        for page in range(3):
+            written_before_fetch.append(writers[0].num_rows)
+            yield _rows(4, start=page * 4)
+
+    monkeypatch.setattr(cost_extractor.OCICostExtractor, "_iter_cost_pages", pages)
+
+    context = {"org_slug": "acme_corp", "run_id": "run-1", "step_id": "extract"}
+    result = await cost_extractor.OCICostExtractor().execute(
+        {"config": {"date_filter": "2026-01-15"}}, context
+    )
+
+    assert result["status"] == "SUCCESS", result
+    assert result["row_count"] == 12
+    # Page N is on disk before page N + 1 is requested
+    assert written_before_fetch == [0, 4, 8]
+    restored = as_dataset(result[STEP_OUTPUT_KEY])
+    assert [r["cost"] for chunk in restored.iter_rows(chunk_size=5) for r in chunk] == [float(i) for i in range(12)]
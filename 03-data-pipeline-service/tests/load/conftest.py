@@ -0,0 +1,32 @@
+"""
+Load test and benchmark fixtures.
+
+Benchmarks that take bench_size run once per BENCH_SIZES label and record
+their cases through the bench fixture (see bench_harness.py).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from bench_harness import BenchmarkRecorder, bench_sizes
+
+
+def pytest_generate_tests(metafunc):
+    """Run tests that take bench_size once per BENCH_SIZES label."""
+    if "bench_size" in metafunc.fixturenames:
+        metafunc.parametrize("bench_size", bench_sizes(), scope="module")
+
+
+@pytest.fixture(scope="module")
+def bench(request):
+    """
+    BenchmarkRecorder for the requesting module.
+
+    The suite is named after the module (test_e2e_write_benchmark -> e2e_write_benchmark);
+    results are written when the module finishes.
+    """
+    module_path = Path(request.module.__file__)
+    recorder = BenchmarkRecorder.from_env(module_path.stem.removeprefix("test_"), module_path.parent)
+    yield recorder
+    recorder.write()
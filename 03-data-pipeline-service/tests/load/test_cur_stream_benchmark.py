@@ -0,0 +1,171 @@
+"""
+Benchmark: streaming CUR ingestion on a synthetic Parquet CUR file.
+
+Generates a CUR-shaped Parquet file (10M rows by default, written in chunks so
+generation itself stays bounded), streams it through iter_cur_batches +
+map_cur_batch + ArrowBigQueryAppender with a load client that only serialises
+and discards the Parquet payload, and reports rows/s and peak RSS.
+
+Run with:
+    RUN_BENCHMARKS=1 pytest tests/load/test_cur_stream_benchmark.py -s
+    RUN_BENCHMARKS=1 BENCH_CUR_ROWS=1000000 pytest tests/load/test_cur_stream_benchmark.py -s
+"""
+
+import asyncio
+import os
+import resource
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.core.engine.arrow_loader import ArrowBigQueryAppender
+from src.core.processors.cloud.aws.cur_stream import iter_cur_batches, map_cur_batch
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="Benchmark - set RUN_BENCHMARKS=1 to run",
+)
+
+TOTAL_ROWS = int(os.environ.get("BENCH_CUR_ROWS", "10000000"))
+CHUNK_ROWS = 500_000
+BATCH_SIZE = 65_536
+
+
+def _write_synthetic_cur(path: str, total_rows: int) -> None:
+    """CUR-shaped Parquet with timestamps, costs, tags and unmapped columns."""
+    services = pa.array(["AmazonEC2", "AmazonS3", "AmazonRDS", "AWSLambda"])
+    regions = pa.array(["us-east-1", "eu-west-1", "ap-south-1"])
+    teams = pa.array(["platform", "data", None, ""])
+    base_ms = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+    ts = pa.timestamp("ms", tz="UTC")
+
+    writer = None
+    try:
+        for start in range(0, total_rows, CHUNK_ROWS):
+            idx = np.arange(start, min(start + CHUNK_ROWS, total_rows))
+            n = len(idx)
+            usage_start = pa.array(base_ms + (idx % (24 * 31)) * 3_600_000, ts)
+            chunk = pa.table({
+                "bill_payer_account_id": pa.array(["999988887777"] * n),
+                "bill_billing_period_start_date": pa.array(np.full(n, base_ms), ts),
+                "line_item_usage_account_id": pa.array((idx % 50).astype(str)),
+                "line_item_usage_start_date": usage_start,
+                "line_item_usage_end_date": usage_start,
+                "line_item_product_code": services.take(pa.array(idx % 4)),
+                "line_item_usage_type": pa.array(["BoxUsage:m5.large"] * n),
+                "line_item_unblended_cost": pa.array((idx % 1000) / 100.0),
+                "line_item_usage_amount": pa.array((idx % 10).astype(np.float64)),
+                "line_item_currency_code": pa.array(["USD"] * n),
+                "line_item_line_item_description": pa.array(["$0.096 per On Demand Linux m5.large Instance Hour"] * n),
+                "product_region": regions.take(pa.array(idx % 3)),
+                "resource_tags_user_team": teams.take(pa.array(idx % 4)),
+                "resource_tags_user_env": pa.array(["prod"] * n),
+                "cost_category_project": pa.array(["atlas"] * n),
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(path, chunk.schema, compression="snappy")
+            writer.write_table(chunk, row_group_size=CHUNK_ROWS // 4)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakRSS:
+    """Samples resident memory in a background thread."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class DiscardingLoadClient:
+    """Accepts Parquet load payloads without a network round trip."""
+
+    def __init__(self):
+        self.bytes_loaded = 0
+
+    def load_table_from_file(self, file_obj, table_id, job_config=None):
+        self.bytes_loaded += len(file_obj.getbuffer())
+        return SimpleNamespace(result=lambda: None)
+
+
+def _schema():
+    fields = [
+        ("usage_date", "DATE"), ("usage_start_time", "TIMESTAMP"), ("usage_end_time", "TIMESTAMP"),
+        ("payer_account_id", "STRING"), ("linked_account_id", "STRING"), ("service_code", "STRING"),
+        ("usage_type", "STRING"), ("region", "STRING"), ("unblended_cost", "FLOAT64"),
+        ("usage_amount", "FLOAT64"), ("currency", "STRING"), ("billing_period_start", "DATE"),
+        ("resource_tags_json", "STRING"), ("cost_category_json", "STRING"),
+        ("x_org_slug", "STRING"), ("x_run_id", "STRING"), ("x_ingested_at", "TIMESTAMP"),
+        ("x_cloud_provider", "STRING"),
+    ]
+    return [SimpleNamespace(name=n, field_type=t, mode="NULLABLE") for n, t in fields]
+
+
+@pytest.mark.asyncio
+async def test_benchmark_streaming_cur_ingestion(tmp_path):
+    path = str(tmp_path / "synthetic_cur.parquet")
+    _write_synthetic_cur(path, TOTAL_ROWS)
+    file_mb = os.path.getsize(path) / 1e6
+
+    client = DiscardingLoadClient()
+    appender = ArrowBigQueryAppender(
+        client, "bench.acme_corp_prod.cloud_aws_billing_raw_daily", _schema(),
+        defaults={"x_cloud_provider": "AWS"},
+    )
+    constants = {
+        "x_org_slug": "acme_corp",
+        "x_run_id": "bench",
+        "x_ingested_at": "2026-01-02T00:00:00+00:00",
+    }
+
+    baseline_rss = _rss_bytes()
+    rows = 0
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        for column_map, batch in iter_cur_batches(path, "parquet", batch_size=BATCH_SIZE):
+            mapped = await asyncio.to_thread(map_cur_batch, batch, column_map, constants)
+            rows += mapped.num_rows
+            await appender.append(mapped)
+        loaded = await appender.close()
+        elapsed = time.perf_counter() - start
+
+    assert rows == loaded == TOTAL_ROWS
+    print(
+        f"\nCUR stream {TOTAL_ROWS:,} rows ({file_mb:,.0f} MB parquet): {elapsed:.1f}s "
+        f"({TOTAL_ROWS / elapsed:,.0f} rows/s) | {appender.load_jobs} load jobs, "
+        f"{client.bytes_loaded / 1e6:,.0f} MB loaded | "
+        f"peak RSS {rss.peak / 1e6:,.0f} MB (baseline {baseline_rss / 1e6:,.0f} MB)"
+    )
@@ -0,0 +1,227 @@
+"""
+Benchmark: pipeline write hot paths end to end.
+
+Drives the three ways pipelines write to BigQuery at every size in BENCH_SIZES
+(10k by default; 1m and 10m are opt-in) against the local DuckDB BigQuery
+stand-in (bigquery_backend="duckdb"):
+
+- bq_storage_writer.concurrent_insert: schema lookup, proto serialization,
+  batching and the worker pool. The Storage Write API has no local
+  equivalent, so appends go to a write client that acknowledges each request
+  like the default stream does and discards the payload.
+- IdempotentWriterMixin.write_with_dedup: DELETE of the previous run's
+  partition plus the streaming INSERT, both executed by the stand-in.
+- MetadataLogger: step/state-transition rows of concurrent pipelines through
+  the shared MetadataFlushEngine into the org_meta_* tables.
+
+Cases are recorded with tests/load/bench_harness.py: latency percentiles,
+throughput, peak RSS and allocations go to results/e2e_write_benchmark-*.json
+and are compared with baselines/e2e_write_benchmark.json.
+
+Run with:
+    RUN_BENCHMARKS=1 pytest tests/load/test_e2e_write_benchmark.py -s
+    RUN_BENCHMARKS=1 BENCH_SIZES=10k,1m BENCH_UPDATE_BASELINE=1 pytest tests/load/test_e2e_write_benchmark.py -s
+"""
+
+import asyncio
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from google.cloud.bigquery_storage_v1 import types as storage_types
+
+pytest.importorskip("duckdb")
+
+from bench_harness import parse_size
+from src.app.config import settings
+from src.core.engine import bq_client as bq_client_module
+from src.core.engine.bq_client import BigQueryClient
+from src.core.engine.local_bq import get_local_bigquery_client, reset_local_bigquery_client
+from src.core.metadata import MetadataLogger
+from src.core.metadata.flush_engine import MetadataFlushEngine, insert_rows_writer, set_metadata_flush_engine
+from src.core.processors.base.idempotent_writer import IdempotentWriterMixin
+from src.core.utils import bq_storage_writer
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="Benchmark - set RUN_BENCHMARKS=1 to run",
+)
+
+SETUP_DIR = Path(__file__).resolve().parents[3] / "02-api-service" / "configs" / "setup"
+ORG_SLUG = "bench_org"
+TABLE = "genai_payg_usage_raw"
+RUN_DATE = date(2026, 1, 31)
+STEPS = 5
+ROWS_PER_PIPELINE = 1 + STEPS * 3
+MAX_CONCURRENT_PIPELINES = 1000
+MODELS = [("openai", "gpt-4o"), ("openai", "gpt-4o-mini"), ("anthropic", "claude-sonnet"), ("gemini", "gemini-pro")]
+
+
+class LocalWriteClient:
+    """BigQueryWriteClient stand-in: acknowledges appends to the default stream, keeps only row counts."""
+
+    def __init__(self):
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def append_rows(self, requests):
+        for request in requests:
+            with self._lock:
+                self.rows += len(request.proto_rows.rows.serialized_rows)
+            # The default stream reports no offset
+            yield storage_types.AppendRowsResponse(append_result=storage_types.AppendRowsResponse.AppendResult())
+
+
+def usage_rows(rows: int) -> list:
+    """genai_payg_usage_raw rows as a provider extractor hands them to the writers."""
+    rng = np.random.default_rng(42)
+    model_idx = rng.integers(0, len(MODELS), rows)
+    input_tokens = rng.integers(10, 8_000, rows)
+    output_tokens = rng.integers(10, 2_000, rows)
+    days = rng.integers(0, 31, rows)
+    return [
+        {
+            "usage_date": (RUN_DATE - timedelta(days=int(days[i]))).isoformat(),
+            "provider": MODELS[model_idx[i]][0],
+            "model": MODELS[model_idx[i]][1],
+            "region": "global",
+            "input_tokens": int(input_tokens[i]),
+            "output_tokens": int(output_tokens[i]),
+            "total_tokens": int(input_tokens[i] + output_tokens[i]),
+            "request_count": 1,
+            "is_batch": False,
+            "avg_latency_ms": 250.0,
+            "x_ingestion_id": f"ing-{i}",
+            "x_ingestion_date": RUN_DATE.isoformat(),
+            "x_org_slug": ORG_SLUG,
+            "x_genai_provider": MODELS[model_idx[i]][0],
+        }
+        for i in range(rows)
+    ]
+
+
+@pytest.fixture(scope="module")
+def write_env(bench_size):
+    """Stand-in with the usage and metadata tables plus rows for one size."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "bigquery_backend", "duckdb")
+        mp.setattr(settings, "local_bigquery_data_dir", None)
+        reset_local_bigquery_client()
+        local = get_local_bigquery_client()
+        bq = BigQueryClient(project_id=settings.gcp_project_id)
+        dataset = settings.get_org_dataset_name(ORG_SLUG)
+        local.create_tables_from_schemas(dataset, str(SETUP_DIR / "organizations" / "onboarding" / "schemas"), [TABLE])
+        local.create_tables_from_schemas(
+            "organizations", str(SETUP_DIR / "bootstrap" / "schemas"), ["org_meta_step_logs", "org_meta_state_transitions"]
+        )
+        mp.setattr(bq_client_module, "get_bigquery_client", lambda: bq)
+        mp.setattr(bq_storage_writer, "_write_client", LocalWriteClient())
+
+        rows = parse_size(bench_size)
+        yield {
+            "rows": rows,
+            "data": usage_rows(rows),
+            "bq": bq,
+            "local": local,
+            "table_id": f"{bq.get_org_dataset_id(ORG_SLUG, 'prod')}.{TABLE}",
+        }
+        reset_local_bigquery_client()
+
+
+def _count(local, table_id: str) -> int:
+    return list(local.query(f"SELECT COUNT(*) AS n FROM `{table_id}`").result())[0].n
+
+
+# ============================================
+# Storage Write API
+# ============================================
+
+async def test_storage_write_concurrent_insert(bench, bench_size, write_env):
+    rows, data = write_env["rows"], write_env["data"]
+
+    def insert():
+        result = bq_storage_writer.concurrent_insert(write_env["table_id"], data, ORG_SLUG)
+        assert result.success, result.error
+        assert result.total_rows_written == rows
+
+    bench.assert_no_regressions(await bench.measure("storage_write_concurrent_insert", bench_size, rows, insert))
+
+
+# ============================================
+# Idempotent DELETE + INSERT
+# ============================================
+
+class _UsageWriter(IdempotentWriterMixin):
+    pass
+
+
+async def test_idempotent_write_with_dedup(bench, bench_size, write_env):
+    rows, data, bq, local = write_env["rows"], write_env["data"], write_env["bq"], write_env["local"]
+    writer = _UsageWriter()
+
+    async def write():
+        result = await writer.write_with_dedup(
+            bq_client=bq, org_slug=ORG_SLUG, dataset_type="prod", table_name=TABLE, data=data,
+            pipeline_id="genai_payg_openai", credential_id="bench-credential", run_date=RUN_DATE,
+        )
+        assert result["rows_inserted"] == rows
+
+    bench.assert_no_regressions(await bench.measure("idempotent_write_with_dedup", bench_size, rows, write))
+    # Every re-run replaced the previous one instead of appending
+    assert _count(local, write_env["table_id"]) == rows
+
+
+# ============================================
+# Metadata Logging
+# ============================================
+
+async def _pipeline(idx: int, limit: asyncio.Semaphore) -> None:
+    async with limit:
+        metadata_logger = MetadataLogger(bq_client=None, org_slug=ORG_SLUG)
+        await metadata_logger.start()
+        run_id = f"run-{idx}"
+        await metadata_logger.log_state_transition(pipeline_logging_id=run_id, from_state="PENDING", to_state="RUNNING")
+        for step in range(STEPS):
+            step_id = f"{run_id}-step-{step}"
+            start = datetime.now(timezone.utc)
+            await metadata_logger.log_step_start(
+                step_logging_id=step_id, pipeline_logging_id=run_id,
+                step_name=f"step_{step}", step_type="generic.noop", step_index=step
+            )
+            await metadata_logger.log_state_transition(
+                pipeline_logging_id=run_id, step_logging_id=step_id,
+                from_state="PENDING", to_state="RUNNING", entity_type="STEP"
+            )
+            await metadata_logger.log_step_end(
+                step_logging_id=step_id, pipeline_logging_id=run_id,
+                step_name=f"step_{step}", step_type="generic.noop", step_index=step,
+                status="COMPLETED", start_time=start
+            )
+        await metadata_logger.stop()
+
+
+async def test_metadata_logger(bench, bench_size, write_env):
+    local = write_env["local"]
+    pipelines = max(1, write_env["rows"] // ROWS_PER_PIPELINE)
+    rows = pipelines * ROWS_PER_PIPELINE
+    engine = MetadataFlushEngine(writer=insert_rows_writer(local), flush_interval_seconds=0.05, spill_dir=None)
+    set_metadata_flush_engine(engine)
+
+    async def log():
+        limit = asyncio.Semaphore(MAX_CONCURRENT_PIPELINES)
+        await asyncio.gather(*(_pipeline(i, limit) for i in range(pipelines)))
+
+    try:
+        case = await bench.measure("metadata_logger", bench_size, rows, log)
+        metrics = engine.metrics()
+    finally:
+        await engine.close()
+
+    assert sum(m["rows_shed"] + m["rows_rejected"] for m in metrics.values()) == 0
+    runs = 1 + case["iterations"] + (1 if bench.trace_allocations else 0)
+    step_rows = _count(local, f"{settings.gcp_project_id}.organizations.org_meta_step_logs")
+    assert step_rows == runs * pipelines * STEPS * 2
+    bench.assert_no_regressions(case)
@@ -0,0 +1,119 @@
+"""
+Load test: MetadataLogger / MetadataFlushEngine with 1,000 concurrent pipelines.
+
+Each simulated pipeline logs step start, state transitions and step end for
+several short steps, then stops its logger (waiting for its rows). BigQuery
+is a local writer with simulated insert latency. Prints insert calls, batch
+sizes, queue depth and stop latency.
+
+Run with:
+    RUN_BENCHMARKS=1 pytest tests/load/test_metadata_logger_load.py -s
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.metadata import MetadataLogger
+from src.core.metadata.flush_engine import MetadataFlushEngine, set_metadata_flush_engine
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="Benchmark - set RUN_BENCHMARKS=1 to run",
+)
+
+PIPELINES = int(os.environ.get("BENCH_PIPELINES", "1000"))
+STEPS = int(os.environ.get("BENCH_STEPS", "5"))
+INSERT_LATENCY_SECONDS = float(os.environ.get("BENCH_INSERT_LATENCY_MS", "150")) / 1000
+
+
+class SimulatedBigQuery:
+    """insert_rows_json with a fixed base latency plus a per-row cost."""
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, table_id, rows, row_ids):
+        time.sleep(INSERT_LATENCY_SECONDS + len(rows) * 0.00002)
+        with self._lock:
+            self.calls += 1
+            self.rows += len(rows)
+            self.batch_sizes.append(len(rows))
+        return []
+
+
+async def _pipeline(idx: int, stop_latencies: list) -> None:
+    metadata_logger = MetadataLogger(bq_client=None, org_slug="load_test_org")
+    await metadata_logger.start()
+    run_id = f"run-{idx}"
+    await metadata_logger.log_state_transition(pipeline_logging_id=run_id, from_state="PENDING", to_state="RUNNING")
+    for step in range(STEPS):
+        step_id = f"{run_id}-step-{step}"
+        start = datetime.now(timezone.utc)
+        await metadata_logger.log_step_start(
+            step_logging_id=step_id, pipeline_logging_id=run_id,
+            step_name=f"step_{step}", step_type="generic.noop", step_index=step
+        )
+        await metadata_logger.log_state_transition(
+            pipeline_logging_id=run_id, step_logging_id=step_id,
+            from_state="PENDING", to_state="RUNNING", entity_type="STEP"
+        )
+        await asyncio.sleep(random.uniform(0, 0.02))  # the step's own work
+        await metadata_logger.log_step_end(
+            step_logging_id=step_id, pipeline_logging_id=run_id,
+            step_name=f"step_{step}", step_type="generic.noop", step_index=step,
+            status="COMPLETED", start_time=start
+        )
+    stop_start = time.perf_counter()
+    await metadata_logger.stop()
+    stop_latencies.append(time.perf_counter() - stop_start)
+
+
+async def test_load_1000_concurrent_pipelines():
+    bigquery = SimulatedBigQuery()
+    engine = MetadataFlushEngine(writer=bigquery, flush_interval_seconds=1, spill_dir=None)
+    set_metadata_flush_engine(engine)
+
+    stop_latencies = []
+    peak_pending = 0
+
+    async def sample_depth():
+        nonlocal peak_pending
+        while True:
+            pending = sum(m["pending_rows"] for m in engine.metrics().values())
+            peak_pending = max(peak_pending, pending)
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample_depth())
+    start = time.perf_counter()
+    await asyncio.gather(*(_pipeline(i, stop_latencies) for i in range(PIPELINES)))
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+
+    metrics = engine.metrics()
+    await engine.close()
+
+    expected_rows = PIPELINES * (1 + STEPS * 3)
+    assert bigquery.rows == expected_rows
+    assert sum(m["rows_shed"] + m["rows_rejected"] for m in metrics.values()) == 0
+
+    stop_latencies.sort()
+    print(
+        f"\n{PIPELINES} pipelines x {STEPS} steps: {expected_rows} rows in {elapsed:.2f}s "
+        f"({expected_rows / elapsed:.0f} rows/s)\n"
+        f"  insert calls: {bigquery.calls} (mean batch {statistics.mean(bigquery.batch_sizes):.0f}, "
+        f"max {max(bigquery.batch_sizes)}), final batch sizes "
+        f"{ {t.rsplit('.', 1)[-1]: m['batch_rows'] for t, m in metrics.items()} }\n"
+        f"  peak pending rows: {peak_pending}\n"
+        f"  logger.stop() latency p50 {stop_latencies[len(stop_latencies) // 2] * 1000:.0f}ms "
+        f"p99 {stop_latencies[int(len(stop_latencies) * 0.99)] * 1000:.0f}ms"
+    )
@@ -0,0 +1,481 @@
+"""
+Tests for the notification outbox and its background dispatcher.
+"""
+
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from src.core.notifications.outbox import (
+    BigQueryOutboxStore,
+    InMemoryOutboxStore,
+    NotificationOutbox,
+    OutboxEntry,
+    OutboxStatus,
+    SQLiteOutboxStore,
+    outbox_enabled,
+)
+from src.core.notifications.registry import (
+    NotificationPayload,
+    NotificationProviderInterface,
+    NotificationProviderRegistry,
+    ProviderType,
+    WebhookProviderConfig,
+)
+
+
+class FakeProvider(NotificationProviderInterface):
+    """Provider stub with configurable latency and failures."""
+
+    delay = 0.0
+    fail_times = 0
+    sent: List[NotificationPayload] = []
+    in_flight = 0
+    peak_in_flight = 0
+
+    def __init__(self, config=None):
+        pass
+
+    @property
+    def provider_type(self) -> ProviderType:
+        return ProviderType.SLACK
+
+    @property
+    def is_configured(self) -> bool:
+        return True
+
+    async def send(self, payload: NotificationPayload) -> bool:
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak_in_flight = max(cls.peak_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(cls.delay)
+            if cls.fail_times > 0:
+                cls.fail_times -= 1
+                return False
+            cls.sent.append(payload)
+            return True
+        finally:
+            cls.in_flight -= 1
+
+    async def validate_config(self):
+        return {"valid": True}
+
+
+@pytest.fixture
+def registry():
+    FakeProvider.delay = 0.0
+    FakeProvider.fail_times = 0
+    FakeProvider.sent = []
+    FakeProvider.in_flight = 0
+    FakeProvider.peak_in_flight = 0
+
+    reg = object.__new__(NotificationProviderRegistry)  # Bypass the singleton
+    reg._initialized = False
+    reg.__init__()
+    reg.register(ProviderType.SLACK, FakeProvider)
+    return reg
+
+
+def _payload(i: int = 0) -> NotificationPayload:
+    return NotificationPayload(title=f"Alert {i}", message="Spend exceeded", org_slug="acme_corp")
+
+
+# ============================================
+# Enqueue
+# ============================================
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_before_delivery(registry):
+    FakeProvider.delay = 0.5
+    outbox = NotificationOutbox(registry=registry)
+
+    start = time.perf_counter()
+    results = await outbox.enqueue(_payload(), ["slack"])
+    assert time.perf_counter() - start < 0.1
+    assert results == {"slack": True}
+    assert outbox.queue_depth() == {"slack": 1}
+
+    assert await outbox.drain(timeout=5)
+    assert len(FakeProvider.sent) == 1
+    assert outbox.queue_depth() == {}
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_unconfigured_channel_not_queued(registry):
+    outbox = NotificationOutbox(registry=registry)
+
+    assert await outbox.enqueue(_payload(), ["pagerduty", "webhook"]) == {"pagerduty": False, "webhook": False}
+    assert outbox.queue_depth() == {}
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_notifications_suppressed(registry):
+    outbox = NotificationOutbox(registry=registry)
+
+    await outbox.enqueue(_payload(1), ["slack"])
+    await outbox.enqueue(_payload(1), ["slack"])
+    await outbox.enqueue(_payload(2), ["slack"], dedup_key="custom")
+    await outbox.enqueue(_payload(3), ["slack"], dedup_key="custom")
+    await outbox.drain(timeout=5)
+
+    # Delivered keys still suppress repeats within the window
+    await outbox.enqueue(_payload(1), ["slack"])
+    await outbox.drain(timeout=5)
+
+    assert [p.title for p in FakeProvider.sent] == ["Alert 1", "Alert 2"]
+    await outbox.stop()
+
+
+# ============================================
+# Dispatcher
+# ============================================
+
+@pytest.mark.asyncio
+async def test_per_channel_concurrency_limit(registry):
+    FakeProvider.delay = 0.02
+    outbox = NotificationOutbox(registry=registry, channel_concurrency={"slack": 3})
+
+    for i in range(12):
+        await outbox.enqueue(_payload(i), ["slack"])
+    await outbox.drain(timeout=5)
+
+    assert len(FakeProvider.sent) == 12
+    assert FakeProvider.peak_in_flight == 3
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_retried_then_succeeds(registry):
+    FakeProvider.fail_times = 2
+    outbox = NotificationOutbox(registry=registry, base_retry_delay_seconds=0.01)
+
+    await outbox.enqueue(_payload(), ["slack"])
+    for _ in range(100):
+        await outbox.drain(timeout=5)
+        if FakeProvider.sent:
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(FakeProvider.sent) == 1
+    assert outbox.store.list_dead_letters() == []
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_dead_lettered_and_requeued(registry):
+    FakeProvider.fail_times = 3
+    outbox = NotificationOutbox(registry=registry, max_attempts=3, base_retry_delay_seconds=0.0)
+
+    await outbox.enqueue(_payload(), ["slack"])
+    for _ in range(100):
+        await outbox.drain(timeout=5)
+        if outbox.store.list_dead_letters():
+            break
+        await asyncio.sleep(0.01)
+
+    [dead] = outbox.store.list_dead_letters()
+    assert dead.attempts == 3
+    assert dead.last_error == "Provider reported failure"
+    assert FakeProvider.sent == []
+
+    assert outbox.store.requeue(dead.entry_id, time.time())
+    outbox.start()
+    await outbox.drain(timeout=5)
+    assert len(FakeProvider.sent) == 1
+    await outbox.stop()
+
+
+class FakeEmailProvider(FakeProvider):
+    """Email stub recording send_batch calls; rejects payloads titled 'bounce'."""
+
+    batches: List[List[NotificationPayload]] = []
+
+    @property
+    def provider_type(self) -> ProviderType:
+        return ProviderType.EMAIL
+
+    async def send(self, payload: NotificationPayload) -> bool:
+        raise AssertionError("emails from the outbox must go through send_batch")
+
+    async def send_batch(self, payloads: List[NotificationPayload]) -> List[bool]:
+        type(self).batches.append(list(payloads))
+        return [p.title != "bounce" for p in payloads]
+
+
+@pytest.mark.asyncio
+async def test_emails_delivered_in_batches(registry):
+    FakeEmailProvider.batches = []
+    registry.register(ProviderType.EMAIL, FakeEmailProvider)
+    outbox = NotificationOutbox(registry=registry, max_attempts=1)
+
+    for i in range(5):
+        await outbox.enqueue(_payload(i), ["email"])
+    await outbox.enqueue(NotificationPayload(title="bounce", message="x", org_slug="acme_corp"), ["email"])
+    assert await outbox.drain(timeout=5)
+
+    assert sum(len(b) for b in FakeEmailProvider.batches) == 6
+    assert len(FakeEmailProvider.batches) < 6
+    dead = outbox.store.list_dead_letters()
+    assert [e.payload.title for e in dead] == ["bounce"]
+
+
+# ============================================
+# Destinations
+# ============================================
+
+class FakeWebhookProvider(FakeProvider):
+    """Webhook stub recording (url, headers, title) per delivery."""
+
+    deliveries: List[tuple] = []
+
+    def __init__(self, config=None):
+        self.config = config
+
+    @property
+    def provider_type(self) -> ProviderType:
+        return ProviderType.WEBHOOK
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.config and self.config.url)
+
+    async def send(self, payload: NotificationPayload) -> bool:
+        await asyncio.sleep(0)
+        type(self).deliveries.append((self.config.url, self.config.headers, payload.title))
+        return True
+
+
+@pytest.mark.asyncio
+async def test_per_alert_destinations_stored_with_entry(registry, tmp_path):
+    FakeWebhookProvider.deliveries = []
+    registry.register(ProviderType.WEBHOOK, FakeWebhookProvider)
+    shared = WebhookProviderConfig(url="https://org.example/hook")
+    registry.set_config(ProviderType.WEBHOOK, shared, org_slug="acme_corp")
+    outbox = NotificationOutbox(store=SQLiteOutboxStore(str(tmp_path / "outbox.sqlite3")), registry=registry)
+
+    await outbox.enqueue(_payload(1), ["webhook"], configs={
+        "webhook": WebhookProviderConfig(url="https://a.example/hook", headers={"X-Token": "a"}),
+    })
+    await outbox.enqueue(_payload(2), ["webhook"], configs={
+        "webhook": WebhookProviderConfig(url="https://b.example/hook"),
+    })
+    await outbox.enqueue(_payload(3), ["webhook"])
+    assert await outbox.drain(timeout=5)
+    await outbox.stop()
+
+    assert sorted(FakeWebhookProvider.deliveries) == [
+        ("https://a.example/hook", {"X-Token": "a"}, "Alert 1"),
+        ("https://b.example/hook", {}, "Alert 2"),
+        ("https://org.example/hook", {}, "Alert 3"),
+    ]
+    # The shared org config is never replaced by a per-alert destination
+    assert registry.get_config(ProviderType.WEBHOOK, "acme_corp") is shared
+
+
+def test_outbox_requires_durable_store(monkeypatch):
+    from src.app.config import settings
+
+    monkeypatch.setattr(settings, "notification_outbox_enabled", True)
+    monkeypatch.setattr(settings, "notification_outbox_store", "sqlite")
+    monkeypatch.setattr(settings, "notification_outbox_path", None)
+    assert outbox_enabled() is False
+    monkeypatch.setattr(settings, "notification_outbox_path", "/var/lib/cloudact/outbox.sqlite3")
+    assert outbox_enabled() is True
+    # The shared BigQuery store needs no local path
+    monkeypatch.setattr(settings, "notification_outbox_store", "bigquery")
+    monkeypatch.setattr(settings, "notification_outbox_path", None)
+    assert outbox_enabled() is True
+
+
+# ============================================
+# Durability
+# ============================================
+
+@pytest.mark.asyncio
+async def test_sqlite_store_redelivers_after_restart(registry, tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+
+    store = SQLiteOutboxStore(path)
+    first = NotificationOutbox(store=store, registry=registry)
+    await first.enqueue(_payload(7), ["slack"])
+    # Simulate a crash mid-delivery: claimed but never completed
+    claimed = store.claim_due(time.time(), 10)
+    assert [e.status for e in claimed] == [OutboxStatus.IN_FLIGHT]
+    await first.stop()
+    store.close()
+
+    restarted = NotificationOutbox(store=SQLiteOutboxStore(path), registry=registry)
+    restarted.start()
+    await restarted.drain(timeout=5)
+
+    assert [p.title for p in FakeProvider.sent] == ["Alert 7"]
+    assert restarted.queue_depth() == {}
+    await restarted.stop()
+
+
+def test_in_memory_store_claims_only_due_entries():
+    store = InMemoryOutboxStore()
+    now = time.time()
+    for i, due in enumerate([now - 1, now + 60]):
+        store.add(
+            OutboxEntry(
+                entry_id=str(i), channel="slack", org_slug=None, payload=_payload(i),
+                dedup_key=str(i), enqueued_at=now, next_attempt_at=due,
+            ),
+            dedup_since=now - 3600,
+        )
+
+    assert [e.entry_id for e in store.claim_due(now, 10)] == ["0"]
+    assert store.depth() == {"slack": 2}
+
+
+class SlowStore(InMemoryOutboxStore):
+    """In-memory store whose calls block like a remote store."""
+
+    def add(self, entry, dedup_since):
+        time.sleep(0.2)
+        return super().add(entry, dedup_since)
+
+
+@pytest.mark.asyncio
+async def test_store_calls_do_not_block_the_event_loop(registry):
+    outbox = NotificationOutbox(store=SlowStore(), registry=registry)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await outbox.enqueue(_payload(), ["slack"])
+    task.cancel()
+
+    assert ticks >= 5
+    assert await outbox.drain(timeout=5)
+    assert len(FakeProvider.sent) == 1
+    await outbox.stop()
+
+
+# ============================================
+# Shared BigQuery store
+# ============================================
+
+@pytest.fixture
+def bq_client():
+    pytest.importorskip("duckdb")
+    from src.core.engine.local_bq import LocalBigQueryClient
+
+    client = LocalBigQueryClient("test-project")
+    client.create_dataset("test-project.organizations")
+    yield client
+    client.close()
+
+
+def _entry(i: int, now: float, **kwargs) -> OutboxEntry:
+    return OutboxEntry(
+        entry_id=str(i), channel="slack", org_slug="acme_corp", payload=_payload(i),
+        dedup_key=f"key-{i}", enqueued_at=now, next_attempt_at=now, **kwargs,
+    )
+
+
+def test_bigquery_store_claims_are_shared_leases(bq_client):
+    # Two instances on the same table
+    first = BigQueryOutboxStore(bq_client, "test-project", lease_seconds=60)
+    second = BigQueryOutboxStore(bq_client, "test-project", lease_seconds=60)
+    now = time.time()
+
+    assert first.add(_entry(1, now), dedup_since=now - 3600)
+    assert not second.add(_entry(1, now), dedup_since=now - 3600)
+    assert second.depth() == {"slack": 1}
+
+    [claimed] = second.claim_due(now, 10)
+    assert claimed.payload.title == "Alert 1"
+    assert claimed.status == OutboxStatus.IN_FLIGHT
+    # A live claim is neither claimable nor reset by another instance
+    assert first.claim_due(now + 1, 10) == []
+    assert first.recover_in_flight() == 0
+
+    # The claiming instance died; once the lease runs out the entry is due again
+    assert first.next_due_at() == pytest.approx(now + 60)
+    [reclaimed] = first.claim_due(now + 61, 10)
+    assert reclaimed.entry_id == claimed.entry_id
+
+    first.mark_delivered(reclaimed.entry_id, now + 62)
+    assert first.depth() == {}
+    assert not first.add(_entry(1, now + 63), dedup_since=now - 3600)
+
+
+def test_bigquery_store_retries_and_dead_letters(bq_client):
+    store = BigQueryOutboxStore(bq_client, "test-project")
+    now = time.time()
+    store.add(_entry(1, now), dedup_since=now - 3600)
+
+    [entry] = store.claim_due(now, 10)
+    store.reschedule(entry.entry_id, 1, now + 30, "timeout")
+    assert store.claim_due(now + 1, 10) == []
+    assert store.next_due_at() == pytest.approx(now + 30)
+
+    [entry] = store.claim_due(now + 30, 10)
+    assert entry.attempts == 1
+    store.dead_letter(entry.entry_id, 2, "timeout")
+    [dead] = store.list_dead_letters()
+    assert (dead.attempts, dead.last_error) == (2, "timeout")
+
+    assert store.requeue(dead.entry_id, now + 40)
+    assert not store.requeue("missing", now + 40)
+    [entry] = store.claim_due(now + 40, 10)
+    store.mark_delivered(entry.entry_id, now + 41)
+    assert store.prune_delivered(now + 42) == 1
+    assert store.depth() == {}
+
+
+def test_bigquery_store_handles_concurrent_update_conflicts(bq_client, monkeypatch):
+    from google.api_core.exceptions import BadRequest
+
+    from src.core.notifications import outbox as outbox_module
+
+    monkeypatch.setattr(outbox_module, "BQ_CONFLICT_RETRY_DELAY_SECONDS", 0.0)
+    store = BigQueryOutboxStore(bq_client, "test-project")
+    now = time.time()
+    store.add(_entry(1, now), dedup_since=now - 3600)
+
+    conflicts = {"left": 1}
+    query = bq_client.query
+
+    def conflicting_query(sql, **kwargs):
+        if conflicts["left"] and ("UPDATE" in sql or "TRANSACTION" in sql):
+            conflicts["left"] -= 1
+            raise BadRequest("Could not serialize access to table notification_outbox due to concurrent update")
+        return query(sql, **kwargs)
+
+    monkeypatch.setattr(bq_client, "query", conflicting_query)
+
+    # A claim that loses the race returns nothing; the entry stays due
+    assert store.claim_due(now, 10) == []
+    [entry] = store.claim_due(now, 10)
+
+    # Other updates are retried
+    conflicts["left"] = 1
+    store.mark_delivered(entry.entry_id, now + 1)
+    assert store.depth() == {}
+
+
+@pytest.mark.asyncio
+async def test_outbox_delivers_through_bigquery_store(registry, bq_client):
+    outbox = NotificationOutbox(store=BigQueryOutboxStore(bq_client, "test-project"), registry=registry)
+
+    for i in range(3):
+        await outbox.enqueue(_payload(i), ["slack"])
+    await outbox.enqueue(_payload(0), ["slack"])
+    assert await outbox.drain(timeout=10)
+    await outbox.stop()
+
+    assert sorted(p.title for p in FakeProvider.sent) == ["Alert 0", "Alert 1", "Alert 2"]
+    assert outbox.queue_depth() == {}
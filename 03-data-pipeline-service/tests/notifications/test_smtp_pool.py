@@ -0,0 +1,257 @@
+"""
+Tests for pooled SMTP delivery (SMTPConnectionPool + EmailNotificationAdapter).
+
+Runs against a local in-process SMTP stand-in that records connections and
+messages, and can drop connections or reject recipients on demand.
+
+Benchmark (compares per-message connections with pooled batch delivery):
+    RUN_BENCHMARKS=1 pytest tests/notifications/test_smtp_pool.py -k benchmark -s
+"""
+
+import os
+import socketserver
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.core.notifications.adapters import EmailNotificationAdapter
+from src.core.notifications.registry import EmailProviderConfig, NotificationPayload
+from src.core.notifications.smtp_pool import SMTPConnectionPool, close_smtp_pool
+
+
+# ============================================
+# Local SMTP stand-in
+# ============================================
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server: "LocalSMTPServer" = self.server.owner
+        with server.lock:
+            server.connections += 1
+        if server.handshake_delay:
+            time.sleep(server.handshake_delay)
+        self._reply("220 localhost ESMTP stand-in")
+        served = 0
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO"):
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif verb == "MAIL":
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                if any(bad in command for bad in server.reject_recipients):
+                    self._reply("550 No such user")
+                else:
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                served += 1
+                with server.lock:
+                    server.messages += 1
+                self._reply("250 Queued")
+                if server.drop_after and served >= server.drop_after:
+                    return  # Server-side disconnect
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class LocalSMTPServer:
+    """Threaded SMTP stand-in bound to an ephemeral localhost port."""
+
+    def __init__(self, drop_after: int = 0, handshake_delay: float = 0.0):
+        self.drop_after = drop_after
+        self.handshake_delay = handshake_delay
+        self.reject_recipients: List[str] = []
+        self.connections = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _config(port: int, **overrides) -> EmailProviderConfig:
+    values = dict(
+        smtp_host="127.0.0.1",
+        smtp_port=port,
+        smtp_use_tls=False,
+        from_email="alerts@cloudact.ai",
+        timeout_seconds=5,
+        retry_max_attempts=2,
+    )
+    values.update(overrides)
+    return EmailProviderConfig(**values)
+
+
+def _payload(i: int, recipient: str = "ops@example.com") -> NotificationPayload:
+    return NotificationPayload(
+        title=f"Cost alert {i}",
+        message="Daily spend exceeded threshold",
+        org_slug="acme_corp",
+        recipients=[recipient],
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    close_smtp_pool()
+    yield
+    close_smtp_pool()
+
+
+# ============================================
+# Connection reuse
+# ============================================
+
+@pytest.mark.asyncio
+async def test_sequential_sends_reuse_one_connection():
+    with LocalSMTPServer() as smtp:
+        adapter = EmailNotificationAdapter(_config(smtp.port))
+        for i in range(5):
+            assert await adapter.send(_payload(i)) is True
+
+    assert smtp.messages == 5
+    assert smtp.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_one_connection_per_chunk():
+    with LocalSMTPServer() as smtp:
+        adapter = EmailNotificationAdapter(_config(smtp.port, smtp_batch_size=10, smtp_pool_size=2))
+        results = await adapter.send_batch([_payload(i) for i in range(40)])
+
+    assert results == [True] * 40
+    assert smtp.messages == 40
+    assert smtp.connections <= 2
+
+
+def test_connection_recycled_after_message_cap():
+    pool = SMTPConnectionPool()
+    with LocalSMTPServer() as smtp:
+        config = _config(smtp.port, smtp_max_messages_per_connection=3)
+        adapter = EmailNotificationAdapter(config)
+        messages = [adapter._build_message(_payload(i)) for i in range(7)]
+        assert pool.send_messages_sync(config, messages) == [None] * 7
+        pool.close()
+
+    assert smtp.connections == 3
+    assert pool.stats.messages_sent == 7
+
+
+# ============================================
+# Failure handling
+# ============================================
+
+def test_reconnects_when_server_drops_connection():
+    pool = SMTPConnectionPool()
+    with LocalSMTPServer(drop_after=2) as smtp:
+        config = _config(smtp.port)
+        adapter = EmailNotificationAdapter(config)
+        messages = [adapter._build_message(_payload(i)) for i in range(5)]
+        results = pool.send_messages_sync(config, messages)
+        pool.close()
+
+    assert results == [None] * 5
+    assert smtp.messages == 5
+    assert pool.stats.reconnects >= 1
+
+
+def test_stale_idle_connection_fails_health_check(monkeypatch):
+    monkeypatch.setattr("src.core.notifications.smtp_pool.HEALTH_CHECK_AFTER_SECONDS", 0.0)
+    pool = SMTPConnectionPool()
+    with LocalSMTPServer(drop_after=1) as smtp:
+        config = _config(smtp.port)
+        adapter = EmailNotificationAdapter(config)
+        message = adapter._build_message(_payload(0))
+        assert pool.send_messages_sync(config, [message]) == [None]
+        time.sleep(0.05)  # Server has closed the pooled connection
+        assert pool.send_messages_sync(config, [message]) == [None]
+        pool.close()
+
+    assert pool.stats.health_check_failures == 1
+    assert smtp.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_recipient_fails_only_that_message():
+    with LocalSMTPServer() as smtp:
+        smtp.reject_recipients.append("ghost@example.com")
+        adapter = EmailNotificationAdapter(_config(smtp.port))
+        payloads = [_payload(0), _payload(1, "ghost@example.com"), _payload(2)]
+        results = await adapter.send_batch(payloads)
+
+    assert results == [True, False, True]
+    assert smtp.messages == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failure_when_relay_unreachable():
+    with LocalSMTPServer() as smtp:
+        port = smtp.port
+    adapter = EmailNotificationAdapter(_config(port, retry_max_attempts=1))
+
+    assert await adapter.send_batch([_payload(0), _payload(1)]) == [False, False]
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Benchmark - set RUN_BENCHMARKS=1 to run")
+@pytest.mark.asyncio
+async def test_benchmark_pooled_batch_vs_per_message_connections():
+    total = int(os.environ.get("BENCH_TOTAL_EMAILS", "500"))
+    # Simulates TCP + STARTTLS + AUTH round trips to a remote relay
+    handshake_delay = 0.02
+
+    with LocalSMTPServer(handshake_delay=handshake_delay) as smtp:
+        config = _config(smtp.port, smtp_max_messages_per_connection=1, smtp_pool_size=4)
+        start = time.perf_counter()
+        await EmailNotificationAdapter(config).send_batch([_payload(i) for i in range(total)])
+        unpooled = time.perf_counter() - start
+        unpooled_connections = smtp.connections
+
+        close_smtp_pool()
+        smtp.connections = 0
+        config = _config(smtp.port, smtp_pool_size=4)
+        start = time.perf_counter()
+        results = await EmailNotificationAdapter(config).send_batch([_payload(i) for i in range(total)])
+        pooled = time.perf_counter() - start
+
+    assert all(results)
+    print(f"\nSMTP {total} emails: per-message connections {unpooled:.2f}s "
+          f"({total / unpooled:,.0f}/s, {unpooled_connections} connections) | "
+          f"pooled batches {pooled:.2f}s ({total / pooled:,.0f}/s, {smtp.connections} connections)")
@@ -0,0 +1,203 @@
+"""
+Tests for the compiled pipeline plan cache (src/core/pipeline/plan_cache.py).
+
+Benchmark (executor config start-up, uncached vs cached plan):
+    RUN_BENCHMARKS=1 pytest tests/pipeline/test_plan_cache.py -k benchmark -s
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.app.config import settings
+from src.core.abstractor.models import PipelineConfig
+from src.core.pipeline.async_executor import AsyncPipelineExecutor
+from src.core.pipeline.plan_cache import (
+    WATCHFILES_AVAILABLE,
+    PipelinePlanCache,
+    compile_dag,
+    get_pipeline_plan_cache,
+    reset_pipeline_plan_cache,
+)
+from src.core.pipeline.template_resolver import TemplateResolver, compile_template, resolve_template
+from src.core.utils.logging import create_structured_logger
+
+CONFIGS = Path(settings.configs_base_path)
+VARIABLES = {"org_slug": "acme_corp", "provider": "gcp", "domain": "cost", "pipeline_id": "acme_corp-gcp-billing"}
+
+PIPELINE_YAML = """
+pipeline_id: "{org_slug}-test"
+name: "Test"
+provider: "gcp"
+domain: "cost"
+steps:
+  - step_id: "extract"
+    name: "extract"
+    ps_type: "generic.api_extractor"
+  - step_id: "load_a"
+    name: "load_a"
+    ps_type: "generic.bq_loader"
+    depends_on: ["extract"]
+  - step_id: "load_b"
+    name: "load_b"
+    ps_type: "generic.bq_loader"
+    depends_on: ["extract"]
+  - step_id: "finalize"
+    name: "finalize"
+    ps_type: "generic.bq_loader"
+    depends_on: ["load_a", "load_b"]
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    reset_pipeline_plan_cache()
+    yield
+    reset_pipeline_plan_cache()
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+# ============================================
+# Compiled templates
+# ============================================
+
+def test_compiled_template_matches_resolver_on_shipped_configs():
+    paths = sorted(CONFIGS.glob("**/*.yml"))[:80]
+    assert paths
+    for path in paths:
+        raw = yaml.safe_load(path.read_text())
+        if raw is None:
+            continue
+        assert compile_template(raw).render(VARIABLES) == TemplateResolver(VARIABLES).resolve(raw), path
+
+
+def test_renders_do_not_share_containers():
+    template = compile_template({"steps": [{"query": "SELECT * FROM {org_slug}.t {unknown}"}]})
+    first = template.render({"org_slug": "acme"})
+    first["steps"][0]["query"] = "mutated"
+
+    assert template.render({"org_slug": "acme"})["steps"][0]["query"] == "SELECT * FROM acme.t {unknown}"
+    assert template.variables == {"org_slug", "unknown"}
+
+
+def test_resolve_template_reads_file_once(tmp_path):
+    path = _write(tmp_path / "billing.yml", "table: '{org_slug}.billing'\n")
+    assert resolve_template(str(path), {"org_slug": "a"}) == {"table": "a.billing"}
+    assert resolve_template(str(path), {"org_slug": "b"}) == {"table": "b.billing"}
+    assert get_pipeline_plan_cache().stats.compiles == 1
+    with pytest.raises(FileNotFoundError):
+        resolve_template(str(tmp_path / "missing.yml"), {})
+
+
+# ============================================
+# Plans
+# ============================================
+
+def test_dag_levels_follow_config_order_and_implicit_dependencies():
+    steps = [{"step_id": "a"}, {"step_id": "b"}, {"step_id": "c", "depends_on": []}, {"step_id": "d", "depends_on": ["b", "c"]}]
+    step_ids, dependencies, levels = compile_dag(steps)
+
+    assert dependencies["b"] == {"a"} and dependencies["c"] == frozenset()
+    assert levels == (("a", "c"), ("b",), ("d",))
+    with pytest.raises(ValueError, match="Circular"):
+        compile_dag([{"step_id": "x", "depends_on": ["y"]}, {"step_id": "y", "depends_on": ["x"]}])
+
+
+def test_plan_recompiles_only_when_content_changes(tmp_path):
+    path = _write(tmp_path / "p.yml", PIPELINE_YAML)
+    cache = PipelinePlanCache()
+
+    plan = cache.get_plan_for_path(str(path))
+    assert cache.get_plan_for_path(str(path)) is plan
+    assert plan.levels == (("extract",), ("load_a", "load_b"), ("finalize",))
+
+    # Touched, same content: new version, no recompile
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    touched = cache.get_plan_for_path(str(path))
+    assert touched.model is plan.model and cache.stats.revalidations == 1
+
+    _write(path, PIPELINE_YAML.replace('name: "Test"', 'name: "Changed"'))
+    assert cache.get_plan_for_path(str(path)).model.name == "Changed"
+    assert cache.stats.compiles == 2
+
+
+async def test_executor_loads_cached_plan():
+    def executor():
+        ex = object.__new__(AsyncPipelineExecutor)
+        ex.org_slug, ex.pipeline_id = "acme_corp", "cloud/gcp/cost/billing"
+        ex.logger = create_structured_logger(__name__, org_slug=ex.org_slug, pipeline_id=ex.pipeline_id)
+        ex.step_dag, ex._execution_levels = {}, ()
+        return ex
+
+    first, second = executor(), executor()
+    config = await first.load_config({"start_date": "2026-01-01"})
+    await second.load_config()
+
+    assert config["parameters"]["start_date"] == "2026-01-01"
+    assert "start_date" not in second.config.get("parameters", {})
+    assert config["steps"] is not second.config["steps"]
+    assert first.step_dag.keys() == second.step_dag.keys()
+    assert first._get_execution_levels() == [list(level) for level in second._execution_levels]
+    stats = get_pipeline_plan_cache().get_stats()
+    assert (stats["compiles"], stats["hits"], stats["path_lookups"]) == (1, 1, 1)
+
+
+@pytest.mark.skipif(not WATCHFILES_AVAILABLE, reason="watchfiles not installed")
+async def test_watcher_invalidates_changed_files(tmp_path):
+    path = _write(tmp_path / "cloud" / "p.yml", PIPELINE_YAML)
+    cache = PipelinePlanCache()
+    cache.get_plan_for_path(str(path))
+
+    assert cache.start_watching(str(tmp_path))
+    await asyncio.sleep(0.2)
+    _write(path, PIPELINE_YAML.replace('name: "Test"', 'name: "Changed"'))
+    for _ in range(100):
+        if cache.get_stats()["plans"] == 0:
+            break
+        await asyncio.sleep(0.05)
+    await cache.stop_watching()
+
+    assert cache.get_stats()["plans"] == 0
+    assert cache.stats.invalidations == 1
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Benchmark - set RUN_BENCHMARKS=1 to run")
+def test_benchmark_executor_config_startup():
+    runs = int(os.environ.get("BENCH_PLAN_RUNS", "200"))
+    pipeline_id = "cloud/gcp/cost/billing"
+
+    def uncached():
+        # Per-run work before the plan cache: lookup, parse, validate, dump, DAG
+        path = settings.find_pipeline_path("acme_corp", pipeline_id)
+        with open(path) as f:
+            config = PipelineConfig(**yaml.safe_load(f)).model_dump()
+        compile_dag(config["steps"])
+        return config
+
+    def cached():
+        return get_pipeline_plan_cache().get_plan("acme_corp", pipeline_id).render()
+
+    assert uncached() == cached()
+    timings = {}
+    for name, fn in (("uncached", uncached), ("cached", cached)):
+        start = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        timings[name] = (time.perf_counter() - start) / runs * 1000
+
+    print(f"\nExecutor config start-up ({pipeline_id}, {runs} runs): "
+          f"uncached {timings['uncached']:.2f}ms | cached plan {timings['cached']:.3f}ms "
+          f"({timings['uncached'] / timings['cached']:.0f}x)")
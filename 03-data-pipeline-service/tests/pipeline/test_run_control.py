@@ -0,0 +1,304 @@
+"""
+Tests for pipeline run control (src/core/pipeline/run_control.py):
+push-based cancellation and coalesced run status UPDATEs.
+
+BigQuery is replaced by recording fetch/update callables.
+
+Benchmark (per-step bookkeeping overhead, per-level SELECT vs registry):
+    RUN_BENCHMARKS=1 pytest tests/pipeline/test_run_control.py -k benchmark -s
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.metadata import MetadataLogger
+from src.core.metadata.flush_engine import MetadataFlushEngine, set_metadata_flush_engine
+from src.core.pipeline import run_control
+from src.core.pipeline.async_executor import BQ_EXECUTOR, AsyncPipelineExecutor
+from src.core.pipeline.plan_cache import compile_dag
+from src.core.pipeline.run_control import RunRegistry, RunStatusWriter
+from src.core.utils.logging import create_structured_logger
+
+
+@pytest.fixture(autouse=True)
+def fresh_singletons():
+    run_control.reset_run_registry()
+    run_control.reset_run_status_writer()
+    yield
+    run_control.reset_run_registry()
+    run_control.reset_run_status_writer()
+
+
+class RecordingUpdater:
+    """UPDATE stand-in: rows match while they are in the expected status."""
+
+    def __init__(self, statuses, latency: float = 0.0):
+        self.statuses = statuses
+        self.latency = latency
+        self.calls = []
+
+    def __call__(self, from_status, to_status, ids, orgs):
+        time.sleep(self.latency)
+        self.calls.append((from_status, to_status, list(ids)))
+        updated = []
+        for run_id in ids:
+            if self.statuses.get(run_id) == from_status:
+                self.statuses[run_id] = to_status
+                updated.append(run_id)
+        return updated
+
+
+# ============================================
+# Cancellation registry
+# ============================================
+
+async def test_request_cancel_signals_local_run_without_io():
+    registry = RunRegistry(poll_interval_seconds=60, fetcher=lambda ids: pytest.fail("unexpected poll"))
+    handle = registry.register("run-1", "acme_corp")
+
+    assert registry.request_cancel("run-1") is True
+    assert registry.request_cancel("other-instance-run") is False
+    assert registry.is_cancelled("run-1") and handle.cancel_source == "api"
+    await asyncio.wait_for(handle.cancelled.wait(), timeout=1)
+
+    registry.unregister("run-1")
+    assert not registry.is_cancelled("run-1")
+    await registry.close()
+
+
+async def test_poll_reads_all_active_runs_in_one_query():
+    calls = []
+
+    def fetcher(ids):
+        calls.append(sorted(ids))
+        return {
+            "run-1": ("acme_corp", "CANCELLING"),
+            "run-2": ("acme_corp", "RUNNING"),
+            "run-3": ("other_org", "CANCELLING"),  # org mismatch: ignored
+        }
+
+    registry = RunRegistry(poll_interval_seconds=60, fetcher=fetcher)
+    for run_id in ("run-1", "run-2", "run-3"):
+        registry.register(run_id, "acme_corp")
+
+    assert await registry.poll_once() == 1
+    assert calls == [["run-1", "run-2", "run-3"]]
+    assert registry.is_cancelled("run-1") and not registry.is_cancelled("run-3")
+    assert registry.get("run-2").status == "RUNNING"
+    assert registry.get_stats()["poll_cancels"] == 1
+
+    # Cancelled runs are not polled again
+    await registry.poll_once()
+    assert calls[-1] == ["run-2", "run-3"]
+    await registry.close()
+
+
+async def test_background_poll_stops_when_no_runs_remain():
+    statuses = {"run-1": ("acme_corp", "RUNNING")}
+    registry = RunRegistry(poll_interval_seconds=0.01, fetcher=lambda ids: dict(statuses))
+    registry.register("run-1", "acme_corp")
+
+    statuses["run-1"] = ("acme_corp", "CANCELLING")
+    for _ in range(100):
+        if registry.is_cancelled("run-1"):
+            break
+        await asyncio.sleep(0.01)
+    assert registry.is_cancelled("run-1")
+
+    registry.unregister("run-1")
+    await asyncio.sleep(0.05)
+    assert registry.get_stats()["polling"] is False
+
+
+async def test_poll_errors_do_not_cancel_runs():
+    def fetcher(ids):
+        raise RuntimeError("bigquery unavailable")
+
+    registry = RunRegistry(poll_interval_seconds=60, fetcher=fetcher)
+    registry.register("run-1", "acme_corp")
+
+    assert await registry.poll_once() == 0
+    assert not registry.is_cancelled("run-1")
+    assert registry.stats.poll_errors == 1
+    await registry.close()
+
+
+# ============================================
+# Coalesced status updates
+# ============================================
+
+async def test_concurrent_transitions_share_one_update():
+    statuses = {f"run-{i}": "PENDING" for i in range(20)}
+    updater = RecordingUpdater(statuses)
+    writer = RunStatusWriter(linger_ms=20, updater=updater)
+
+    results = await asyncio.gather(*(
+        writer.transition(run_id, "acme_corp", "PENDING", "RUNNING") for run_id in statuses
+    ))
+
+    assert all(results)
+    assert len(updater.calls) == 1 and sorted(updater.calls[0][2]) == sorted(statuses)
+    assert set(statuses.values()) == {"RUNNING"}
+
+
+async def test_partial_match_and_failures_are_reported_to_callers():
+    statuses = {"run-1": "PENDING", "run-2": "CANCELLING"}
+    writer = RunStatusWriter(linger_ms=10, updater=RecordingUpdater(statuses))
+
+    results = await asyncio.gather(
+        writer.transition("run-1", "acme_corp", "PENDING", "RUNNING"),
+        writer.transition("run-2", "acme_corp", "PENDING", "RUNNING"),
+    )
+    # Only the stale run fails; the run that moved is reported as updated
+    assert results == [True, False]
+
+    def failing(*args):
+        raise RuntimeError("quota exceeded")
+
+    writer = RunStatusWriter(linger_ms=10, updater=failing)
+    with pytest.raises(RuntimeError, match="quota"):
+        await writer.transition("run-3", "acme_corp", "PENDING", "RUNNING")
+
+
+def test_update_run_statuses_returns_only_the_runs_it_moved(monkeypatch):
+    pytest.importorskip("duckdb")
+    from src.core.engine.local_bq import LocalBigQueryClient
+
+    client = LocalBigQueryClient("proj")
+    client.create_dataset("proj.organizations")
+    client.query(
+        "CREATE TABLE `proj.organizations.org_meta_pipeline_runs` "
+        "(pipeline_logging_id STRING, org_slug STRING, status STRING)"
+    ).result()
+    client.query(
+        "INSERT INTO `proj.organizations.org_meta_pipeline_runs` VALUES "
+        "('run-1', 'acme_corp', 'PENDING'), ('run-2', 'acme_corp', 'CANCELLING'), ('run-3', 'acme_corp', 'PENDING')"
+    ).result()
+    monkeypatch.setattr(run_control.settings, "gcp_project_id", "proj")
+    monkeypatch.setattr("src.core.engine.bq_client.get_bigquery_client", lambda: SimpleNamespace(client=client))
+
+    moved = run_control.update_run_statuses("PENDING", "RUNNING", ["run-1", "run-2", "run-3"], ["acme_corp"])
+
+    assert sorted(moved) == ["run-1", "run-3"]
+    rows = client.query("SELECT status FROM `proj.organizations.org_meta_pipeline_runs` ORDER BY pipeline_logging_id").result()
+    assert [r.status for r in rows] == ["RUNNING", "CANCELLING", "RUNNING"]
+
+
+# ============================================
+# Executor integration
+# ============================================
+
+def _executor(pipeline_logging_id: str, num_steps: int) -> AsyncPipelineExecutor:
+    ex = object.__new__(AsyncPipelineExecutor)
+    ex.org_slug, ex.pipeline_id = "acme_corp", "bench"
+    ex.tracking_pipeline_id = ex.pipeline_id
+    ex.pipeline_logging_id = pipeline_logging_id
+    ex.trigger_type, ex.trigger_by, ex.user_id = "api", "test", None
+    ex.logger = create_structured_logger(__name__, org_slug=ex.org_slug, pipeline_id=ex.pipeline_id)
+    set_metadata_flush_engine(MetadataFlushEngine(writer=lambda table_id, rows, row_ids: [], spill_dir=None))
+    ex.metadata_logger = MetadataLogger(bq_client=None, org_slug=ex.org_slug)
+    ex.start_time, ex.end_time, ex.status = datetime.now(timezone.utc), None, "RUNNING"
+    ex.step_results, ex._step_execution_results = [], {}
+    steps = [{"step_id": f"s{i}", "ps_type": "generic.noop"} for i in range(num_steps)]
+    _, dependencies, levels = compile_dag(steps)
+    ex._set_dag(steps, dependencies, levels)
+
+    async def noop_step(step_config, step_id, step_type):
+        return {"status": "SUCCESS"}
+
+    ex._execute_step_internal = noop_step
+    return ex
+
+
+async def test_executor_stops_at_next_level_after_push_cancel(monkeypatch):
+    statuses = {"run-1": "PENDING"}
+    monkeypatch.setattr(run_control, "_status_writer", RunStatusWriter(linger_ms=0, updater=RecordingUpdater(statuses)))
+    run_control.get_run_registry().register("run-1", "acme_corp")
+    ex = _executor("run-1", num_steps=3)
+
+    original = ex._execute_step_internal
+
+    async def cancel_during_first_step(step_config, step_id, step_type):
+        run_control.get_run_registry().request_cancel("run-1")
+        return await original(step_config, step_id, step_type)
+
+    ex._execute_step_internal = cancel_during_first_step
+    with pytest.raises(ValueError, match="Pipeline cancelled before level 2/3"):
+        await ex._execute_pipeline_internal()
+
+    assert statuses["run-1"] == "RUNNING"
+    assert [s["step_id"] for s in ex.step_results] == ["s0"]
+    assert ex.status == "CANCELLED"
+    await run_control.get_run_registry().close()
+
+
+async def test_one_stale_run_does_not_fail_runs_sharing_its_update(monkeypatch):
+    statuses = {f"run-{i}": "PENDING" for i in range(5)}
+    statuses["run-2"] = "CANCELLING"
+    updater = RecordingUpdater(statuses)
+    monkeypatch.setattr(run_control, "_status_writer", RunStatusWriter(linger_ms=20, updater=updater))
+    registry = run_control.get_run_registry()
+    for run_id in statuses:
+        registry.register(run_id, "acme_corp")
+
+    await asyncio.gather(*(_executor(run_id, num_steps=1)._update_pipeline_status_to_running() for run_id in statuses))
+
+    assert len(updater.calls) == 1
+    started = {run_id: registry.get(run_id).status for run_id in statuses}
+    assert started == {"run-0": "RUNNING", "run-1": "RUNNING", "run-2": None, "run-3": "RUNNING", "run-4": "RUNNING"}
+    await registry.close()
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Benchmark - set RUN_BENCHMARKS=1 to run")
+async def test_benchmark_per_step_bookkeeping_overhead(monkeypatch):
+    latency = float(os.environ.get("BENCH_BQ_LATENCY_MS", "30")) / 1000
+    runs, num_steps = int(os.environ.get("BENCH_RUNS", "8")), int(os.environ.get("BENCH_STEPS", "10"))
+    loop = asyncio.get_running_loop()
+    round_trips = {"before": 0, "after": 0}
+
+    async def bq_round_trip(mode):
+        round_trips[mode] += 1
+        await loop.run_in_executor(BQ_EXECUTOR, time.sleep, latency)
+
+    async def run_all(mode):
+        executors = [_executor(f"{mode}-{i}", num_steps) for i in range(runs)]
+        if mode == "before":
+            # Previous behaviour: one UPDATE per run, one SELECT per run per level
+            for ex in executors:
+                ex._update_pipeline_status_to_running = lambda: bq_round_trip("before")
+                ex._check_cancellation = lambda: _false_after(bq_round_trip("before"))
+        else:
+            statuses = {ex.pipeline_logging_id: "PENDING" for ex in executors}
+            updater = RecordingUpdater(statuses, latency=latency)
+            monkeypatch.setattr(run_control, "_status_writer", RunStatusWriter(updater=updater))
+            for ex in executors:
+                run_control.get_run_registry().register(ex.pipeline_logging_id, ex.org_slug)
+        start = time.perf_counter()
+        await asyncio.gather(*(ex._execute_pipeline_internal() for ex in executors))
+        elapsed = time.perf_counter() - start
+        if mode == "after":
+            round_trips["after"] = len(updater.calls)
+            await run_control.get_run_registry().close()
+        return elapsed / num_steps * 1000
+
+    per_step = {mode: await run_all(mode) for mode in ("before", "after")}
+
+    print(f"\nPer-step bookkeeping ({runs} concurrent runs x {num_steps} no-op steps, "
+          f"{latency * 1000:.0f}ms BigQuery latency): "
+          f"before {per_step['before']:.2f}ms/step ({round_trips['before']} queries) | "
+          f"after {per_step['after']:.2f}ms/step ({round_trips['after']} queries)")
+    assert per_step["after"] < per_step["before"]
+
+
+async def _false_after(awaitable):
+    await awaitable
+    return False
@@ -0,0 +1,262 @@
+"""
+Tests for resumable API extraction (CommitTracker + AsyncCheckpointWriter).
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.engine.extract_pipeline import (
+    CheckpointMismatchError,
+    CommitTracker,
+    ResumePoint,
+    run_extract_pipeline,
+)
+from src.core.utils.checkpoint import AsyncCheckpointWriter
+
+
+@dataclass
+class FakeInsertResult:
+    success: bool
+    rows_inserted: int
+    rows_failed: int = 0
+    error: Optional[str] = None
+
+
+SOURCE = [{"id": i} for i in range(95)]
+PAGE_SIZE = 10
+
+
+async def source_pages(resume_state=None):
+    """Offset-paginated source yielding (rows, next_state)."""
+    offset = (resume_state or {}).get("offset", 0)
+    while offset < len(SOURCE):
+        rows = SOURCE[offset:offset + PAGE_SIZE]
+        offset += PAGE_SIZE
+        yield rows, {"offset": offset}
+
+
+async def tracked(tracker):
+    async for rows, state in source_pages(tracker.resume_point().page_state):
+        rows = tracker.page_fetched(rows, state)
+        if rows:
+            yield rows
+
+
+# ============================================
+# CommitTracker
+# ============================================
+
+def test_watermark_waits_for_contiguous_batches():
+    tracker = CommitTracker(batch_size=4)
+    tracker.page_fetched(SOURCE[:10], {"offset": 10})
+
+    tracker.batch_done(4, 4, success=True)
+    assert tracker.watermark == 0
+    assert tracker.resume_point().committed_ahead == [[4, 4]]
+
+    tracker.batch_done(0, 4, success=True)
+    assert tracker.watermark == 8
+    assert tracker.resume_point().committed_ahead == []
+
+
+def test_resume_point_uses_last_fully_committed_page():
+    tracker = CommitTracker(batch_size=15)
+    tracker.page_fetched(SOURCE[:10], {"offset": 10})
+    tracker.page_fetched(SOURCE[10:20], {"offset": 20})
+    tracker.batch_done(0, 15, success=True)
+
+    point = tracker.resume_point()
+    assert point.page_state == {"offset": 10}
+    assert point.page_end_row == 10
+    assert point.rows_committed == 15
+
+
+def test_resume_skips_committed_rows_and_verifies_boundary():
+    first = CommitTracker(batch_size=15)
+    first.page_fetched(SOURCE[:10], {"offset": 10})
+    first.page_fetched(SOURCE[10:20], {"offset": 20})
+    first.batch_done(0, 15, success=True)
+    point = ResumePoint.from_json(first.resume_point().to_json())
+
+    resumed = CommitTracker(batch_size=15, resume=point)
+    assert resumed.page_fetched(SOURCE[10:20], {"offset": 20}) == SOURCE[15:20]
+
+    tampered = CommitTracker(batch_size=15, resume=point)
+    with pytest.raises(CheckpointMismatchError):
+        tampered.page_fetched([{"id": -1}] * 10, {"offset": 20})
+
+
+# ============================================
+# Crash and resume end-to-end
+# ============================================
+
+@pytest.mark.asyncio
+async def test_resume_after_failure_writes_each_row_exactly_once():
+    table = []
+    fail_start = {40}
+
+    def make_write(fail):
+        async def write(rows, start_row):
+            await asyncio.sleep(0)
+            if fail and rows[0]["id"] in fail_start:
+                return FakeInsertResult(success=False, rows_inserted=0, rows_failed=len(rows))
+            table.extend(rows)
+            return FakeInsertResult(success=True, rows_inserted=len(rows))
+        return write
+
+    first = CommitTracker(batch_size=20)
+    stats = await run_extract_pipeline(
+        pages=tracked(first), transform=lambda r: r, write=make_write(fail=True),
+        batch_size=20, max_inflight_writes=3, tracker=first,
+    )
+    assert stats.batches_failed == 1
+    assert first.watermark == 40
+
+    resumed = CommitTracker(batch_size=20, resume=ResumePoint.from_json(first.resume_point().to_json()))
+    stats = await run_extract_pipeline(
+        pages=tracked(resumed), transform=lambda r: r, write=make_write(fail=False),
+        batch_size=20, max_inflight_writes=3, tracker=resumed,
+    )
+
+    assert stats.batches_failed == 0
+    assert sorted(r["id"] for r in table) == [r["id"] for r in SOURCE]
+    assert resumed.watermark == len(SOURCE)
+
+
+@pytest.mark.asyncio
+async def test_crash_before_checkpoint_flush_skips_ledger_rows():
+    """Batches committed after the last checkpoint write are skipped via the ledger."""
+    table, ledger = [], []
+
+    async def write(rows, start_row):
+        await asyncio.sleep(0)
+        if start_row >= 60:
+            raise RuntimeError("worker killed")
+        # Destination rows and ledger entry commit together
+        table.extend(rows)
+        ledger.append([start_row, len(rows)])
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    first = CommitTracker(batch_size=20)
+    with pytest.raises(RuntimeError):
+        await run_extract_pipeline(
+            pages=tracked(first), transform=lambda r: r, write=write,
+            batch_size=20, max_inflight_writes=2, tracker=first,
+        )
+    assert len(table) == 60
+
+    async def write_rest(rows, start_row):
+        table.extend(rows)
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    # The coalesced checkpoint never flushed; only the ledger survived
+    resumed = CommitTracker(batch_size=25, resume=None, committed=ledger)
+    stats = await run_extract_pipeline(
+        pages=tracked(resumed), transform=lambda r: r, write=write_rest,
+        batch_size=25, tracker=resumed,
+    )
+
+    assert stats.rows_skipped == 60
+    assert sorted(r["id"] for r in table) == [r["id"] for r in SOURCE]
+    assert resumed.watermark == len(SOURCE)
+
+
+def test_split_committed_covers_partial_overlaps():
+    tracker = CommitTracker(batch_size=10, committed=[[5, 10], [30, 5]])
+    assert tracker.split_committed(0, 20) == [(0, 5, False), (5, 10, True), (15, 5, False)]
+    assert tracker.split_committed(30, 5) == [(30, 5, True)]
+    assert tracker.split_committed(40, 10) == [(40, 10, False)]
+
+
+def test_commit_batch_writes_rows_and_ledger_atomically():
+    pytest.importorskip("duckdb")
+    from google.cloud import bigquery
+
+    from src.core.engine.local_bq import LocalBigQueryClient
+    from src.core.utils.checkpoint import CheckpointManager
+
+    client = LocalBigQueryClient("bench-project")
+    try:
+        client.create_table(bigquery.Table("bench-project.acme_local.vendor_users_raw", schema=[
+            bigquery.SchemaField("id", "INTEGER"),
+        ]))
+        manager = CheckpointManager(client, "bench-project")
+        key = ("acme", "pipe", "extract", "https://api#abc")
+        assert manager.commit_batch(*key, "bench-project.acme_local.vendor_users_raw", SOURCE[:20], 0) == 20
+        assert manager.commit_batch(*key, "bench-project.acme_local.vendor_users_raw", SOURCE[40:50], 40) == 10
+
+        assert manager.get_committed_batches(*key) == [[0, 20], [40, 10]]
+        rows = list(client.query("SELECT COUNT(*) AS n FROM `bench-project.acme_local.vendor_users_raw`").result())
+        assert rows[0].n == 30
+        # Staging tables are dropped once committed
+        assert [t.table_id for t in client.list_tables("acme_local")] == ["vendor_users_raw"]
+
+        assert manager.mark_complete(*key)
+        assert manager.get_committed_batches(*key) == []
+    finally:
+        client.close()
+
+
+def test_commit_batch_costs_one_load_and_one_query_job():
+    pytest.importorskip("duckdb")
+    from google.cloud import bigquery
+
+    from src.core.engine.local_bq import LocalBigQueryClient
+    from src.core.utils.checkpoint import CheckpointManager
+
+    client = LocalBigQueryClient("bench-project")
+    try:
+        table_id = "bench-project.acme_local.vendor_users_raw"
+        client.create_table(bigquery.Table(table_id, schema=[bigquery.SchemaField("id", "INTEGER")]))
+        manager = CheckpointManager(client, "bench-project")
+
+        calls = []
+
+        class CountingClient:
+            def __getattr__(self, name):
+                calls.append(name)
+                return getattr(client, name)
+
+        manager.bq_client = CountingClient()
+
+        key = ("acme", "pipe", "extract", "https://api#abc")
+        for start in range(0, 60, 20):
+            manager.commit_batch(*key, table_id, SOURCE[start:start + 20], start)
+
+        # Schema looked up once; staging dropped inside the commit script
+        assert calls.count("get_table") == 1
+        assert calls.count("load_table_from_file") == 3
+        assert calls.count("query") == 3
+        assert "delete_table" not in calls
+        assert [t.table_id for t in client.list_tables("acme_local")] == ["vendor_users_raw"]
+    finally:
+        client.close()
+
+
+# ============================================
+# AsyncCheckpointWriter
+# ============================================
+
+@pytest.mark.asyncio
+async def test_checkpoint_writer_coalesces_updates():
+    manager = MagicMock()
+    manager.save_checkpoint.return_value = True
+    writer = AsyncCheckpointWriter(
+        manager, "acme", "pipe", "extract", "https://api#abc", flush_interval_seconds=0.05
+    )
+    writer.start()
+
+    for i in range(50):
+        writer.update(cursor=f"state-{i}", page_number=i, total_fetched=i * 10)
+    await asyncio.sleep(0.15)
+    await writer.close(complete=True)
+
+    assert writer.updates == 50
+    assert manager.save_checkpoint.call_count == 1
+    saved = manager.save_checkpoint.call_args[0][0]
+    assert saved.cursor == "state-49" and saved.total_fetched == 490
+    manager.mark_complete.assert_called_once_with("acme", "pipe", "extract", "https://api#abc")
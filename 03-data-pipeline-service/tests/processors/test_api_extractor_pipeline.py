@@ -0,0 +1,196 @@
+"""
+Tests for the pipelined fetch -> transform -> write extraction engine.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+
+from src.core.engine.extract_pipeline import (
+    ArrowBatchBuilder,
+    batch_to_rows,
+    run_extract_pipeline,
+)
+
+
+@dataclass
+class FakeInsertResult:
+    success: bool
+    rows_inserted: int
+    rows_failed: int = 0
+    error: Optional[str] = None
+
+
+async def _pages(num_pages: int, page_size: int, delay: float = 0.0):
+    for p in range(num_pages):
+        if delay:
+            await asyncio.sleep(delay)
+        yield [{"id": p * page_size + i} for i in range(page_size)]
+
+
+# ============================================
+# ArrowBatchBuilder
+# ============================================
+
+def test_builder_emits_exact_batches_and_keeps_remainder():
+    builder = ArrowBatchBuilder(batch_size=4)
+    builder.append([{"id": i} for i in range(10)])
+
+    batches = builder.drain()
+    assert [len(b) for b in batches] == [4, 4]
+    assert builder.pending_rows == 2
+
+    final = builder.drain(final=True)
+    assert [batch_to_rows(b) for b in final] == [[{"id": 8}, {"id": 9}]]
+    assert builder.pending_rows == 0
+
+
+def test_builder_preserves_order_across_pages():
+    builder = ArrowBatchBuilder(batch_size=3)
+    builder.append([{"id": 0}, {"id": 1}])
+    assert builder.drain() == []
+    builder.append([{"id": 2}, {"id": 3}])
+
+    rows = [r for b in builder.drain(final=True) for r in batch_to_rows(b)]
+    assert [r["id"] for r in rows] == [0, 1, 2, 3]
+
+
+def test_builder_widens_field_types_across_pages():
+    builder = ArrowBatchBuilder(batch_size=4)
+    builder.append([{"id": 0, "cost": 1}, {"id": 1, "cost": 2}])
+    builder.append([{"id": 2, "cost": 2.5, "unit": "USD"}, {"id": 3, "cost": None}])
+
+    batches = builder.drain()
+    assert len(batches) == 1
+    assert batches[0].schema.field("cost").type == pa.float64()
+    assert batch_to_rows(batches[0])[0] == {"id": 0, "cost": 1.0, "unit": None}
+
+
+def test_builder_keeps_keys_first_seen_in_a_later_row_of_a_page():
+    builder = ArrowBatchBuilder(batch_size=10)
+    builder.append([{"id": 0}, {"id": 1, "tag": "x"}, {"id": 2, "meta": {"zone": "a"}}])
+
+    [batch] = builder.drain(final=True)
+    assert batch_to_rows(batch) == [
+        {"id": 0, "tag": None, "meta": None},
+        {"id": 1, "tag": "x", "meta": None},
+        {"id": 2, "tag": None, "meta": {"zone": "a"}},
+    ]
+
+
+def test_builder_starts_new_batch_for_incompatible_pages():
+    builder = ArrowBatchBuilder(batch_size=3)
+    builder.append([{"id": 0, "code": 1}, {"id": 1, "code": 2}])
+    builder.append([{"id": 2, "code": "A-3"}])
+
+    batches = builder.drain()
+    assert [len(b) for b in batches] == [2]
+    assert builder.pending_rows == 1
+
+    final = builder.drain(final=True)
+    assert batch_to_rows(final[0]) == [{"id": 2, "code": "A-3"}]
+
+
+def test_builder_falls_back_to_rows_for_mixed_types():
+    builder = ArrowBatchBuilder(batch_size=2)
+    builder.append([{"v": 1}])
+    builder.append([{"v": "not-an-int"}, {"v": {"nested": True}}])
+
+    rows = [r for b in builder.drain(final=True) for r in batch_to_rows(b)]
+    assert rows == [{"v": 1}, {"v": "not-an-int"}, {"v": {"nested": True}}]
+
+
+# ============================================
+# run_extract_pipeline
+# ============================================
+
+@pytest.mark.asyncio
+async def test_pipeline_writes_all_rows_in_batches():
+    written = []
+
+    async def write(rows):
+        written.append(rows)
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    stats = await run_extract_pipeline(
+        pages=_pages(num_pages=7, page_size=30),
+        transform=lambda rows: rows,
+        write=write,
+        batch_size=50,
+    )
+
+    assert stats.rows_written == 210
+    assert stats.batches_written == 5
+    assert sorted(r["id"] for batch in written for r in batch) == list(range(210))
+    assert stats.stages["fetch"].items == 7
+    assert stats.stages["transform"].rows == 210
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_writes_with_fetching():
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def slow_write(rows):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    stats = await run_extract_pipeline(
+        pages=_pages(num_pages=10, page_size=10, delay=0.005),
+        transform=lambda rows: rows,
+        write=slow_write,
+        batch_size=10,
+        max_inflight_writes=3,
+    )
+
+    assert stats.rows_written == 100
+    assert peak_in_flight > 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_counts_failed_batches_without_raising():
+    calls = 0
+
+    async def flaky_write(rows):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return FakeInsertResult(success=False, rows_inserted=0, rows_failed=len(rows), error="boom")
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    stats = await run_extract_pipeline(
+        pages=_pages(num_pages=2, page_size=10),
+        transform=lambda rows: rows,
+        write=flaky_write,
+        batch_size=10,
+        max_inflight_writes=1,
+    )
+
+    assert stats.batches_failed == 1
+    assert stats.rows_failed == 10
+    assert stats.rows_written == 10
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_fetch_errors():
+    async def broken_pages():
+        yield [{"id": 1}]
+        raise RuntimeError("API Error 500")
+
+    async def write(rows):
+        return FakeInsertResult(success=True, rows_inserted=len(rows))
+
+    with pytest.raises(RuntimeError, match="API Error 500"):
+        await run_extract_pipeline(
+            pages=broken_pages(),
+            transform=lambda rows: rows,
+            write=write,
+            batch_size=10,
+        )
@@ -0,0 +1,265 @@
+"""
+Tests for streaming, vectorised AWS CUR ingestion (cur_stream + AWSCURExtractor).
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.app.config import settings
+from src.core.processors.cloud.aws import cur_extractor
+from src.core.engine.arrow_loader import ArrowBigQueryAppender, conform_to_schema
+from src.core.processors.cloud.aws.cur_stream import (
+    CURColumnMap,
+    iter_cur_batches,
+    map_cur_batch,
+)
+
+
+CSV_ROWS = [
+    {
+        "lineItem/UsageStartDate": "2026-01-15T00:00:00Z",
+        "lineItem/UsageEndDate": "2026-01-15T01:00:00Z",
+        "lineItem/UsageAccountId": "111122223333",
+        "lineItem/UnblendedCost": "1.25",
+        "lineItem/UsageAmount": "",
+        "lineItem/CurrencyCode": "",
+        "bill/PayerAccountId": "999988887777",
+        "bill/BillingPeriodStartDate": "2026-01-01T00:00:00Z",
+        "product/region": "us-east-1",
+        "resourceTags/user:team": 'data "eng"',
+        "resourceTags/user:env": "",
+        "costCategory/Project": "atlas",
+        "lineItem/LineItemDescription": "not mapped",
+    },
+    {
+        "lineItem/UsageStartDate": "2026-01-16T00:00:00Z",
+        "lineItem/UsageEndDate": "2026-01-16T01:00:00Z",
+        "lineItem/UsageAccountId": "",
+        "lineItem/UnblendedCost": "abc",
+        "lineItem/UsageAmount": "3",
+        "lineItem/CurrencyCode": "EUR",
+        "bill/PayerAccountId": "999988887777",
+        "bill/BillingPeriodStartDate": "2026-01-01T00:00:00Z",
+        "product/region": "eu-west-1",
+        "resourceTags/user:team": "",
+        "resourceTags/user:env": "prod",
+        "costCategory/Project": "",
+        "lineItem/LineItemDescription": "not mapped",
+    },
+]
+
+CONSTANTS = {"x_org_slug": "acme_corp", "x_run_id": "run-1"}
+
+
+def _write_csv(path, rows, compress=False):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    data = buffer.getvalue().encode()
+    with open(path, "wb") as f:
+        f.write(gzip.compress(data) if compress else data)
+
+
+def _map_file(path, fmt, is_gzip=False, batch_size=1024):
+    rows = []
+    for column_map, batch in iter_cur_batches(str(path), fmt, is_gzip=is_gzip, batch_size=batch_size):
+        rows.extend(map_cur_batch(batch, column_map, CONSTANTS).to_pylist())
+    return rows
+
+
+# ============================================
+# Mapping
+# ============================================
+
+def test_csv_mapping_matches_row_semantics(tmp_path):
+    path = tmp_path / "cur.csv"
+    _write_csv(path, CSV_ROWS)
+
+    first, second = _map_file(path, "csv")
+
+    assert first["usage_date"] == "2026-01-15"
+    assert first["usage_start_time"] == "2026-01-15T00:00:00Z"
+    assert first["billing_period_start"] == "2026-01-01"
+    assert first["linked_account_id"] == "111122223333"
+    assert first["unblended_cost"] == 1.25
+    assert first["usage_amount"] == 0.0
+    assert first["currency"] == "USD"
+    assert first["region"] == "us-east-1"
+    assert first["reservation_arn"] is None
+    assert first["discount_amount"] == 0.0
+    assert json.loads(first["resource_tags_json"]) == {"user:team": 'data "eng"'}
+    assert json.loads(first["cost_category_json"]) == {"Project": "atlas"}
+    assert first["x_org_slug"] == "acme_corp" and first["x_run_id"] == "run-1"
+
+    assert second["linked_account_id"] == ""
+    assert second["unblended_cost"] == 0.0  # Unparseable -> 0.0
+    assert second["usage_amount"] == 3.0
+    assert second["currency"] == "EUR"
+    assert json.loads(second["resource_tags_json"]) == {"user:env": "prod"}
+    assert second["cost_category_json"] is None
+
+
+def test_gzip_csv_streams_in_batches(tmp_path):
+    path = tmp_path / "cur.csv.gz"
+    _write_csv(path, CSV_ROWS * 50, compress=True)
+
+    batches = list(iter_cur_batches(str(path), "csv", is_gzip=True, batch_size=16))
+    assert sum(b.num_rows for _, b in batches) == 100
+    assert "lineItem/LineItemDescription" not in batches[0][1].schema.names
+
+    rows = _map_file(path, "csv", is_gzip=True)
+    assert [r["unblended_cost"] for r in rows[:2]] == [1.25, 0.0]
+
+
+def test_parquet_projection_and_native_types(tmp_path):
+    path = tmp_path / "cur.parquet"
+    start = datetime(2026, 1, 15, 6, tzinfo=timezone.utc)
+    table = pa.table({
+        "line_item_usage_start_date": pa.array([start] * 3, pa.timestamp("ms", tz="UTC")),
+        "line_item_usage_account_id": ["1", None, "3"],
+        "line_item_unblended_cost": pa.array([1.5, None, 2.0]),
+        "line_item_usage_amount": pa.array([1, 2, 3], pa.int64()),
+        "resource_tags_user_owner": ["alice", None, ""],
+        "product_sku": ["a", "b", "c"],
+    })
+    pq.write_table(table, path, row_group_size=2)
+
+    column_map = CURColumnMap(table.schema.names, {"product_sku": "sku", "line_item_usage_amount": "usage_amount"})
+    assert "product_sku" in column_map.projection
+    assert column_map.extra == {"sku": "product_sku"}  # usage_amount is already mapped
+    assert "product_sku" not in CURColumnMap(table.schema.names).projection
+
+    rows = _map_file(path, "parquet", batch_size=2)
+    assert len(rows) == 3
+    assert rows[0]["usage_date"] == "2026-01-15"
+    assert rows[0]["usage_start_time"] == start
+    assert [r["linked_account_id"] for r in rows] == ["1", "", "3"]
+    assert [r["unblended_cost"] for r in rows] == [1.5, 0.0, 2.0]
+    assert [r["usage_amount"] for r in rows] == [1.0, 2.0, 3.0]
+    assert [r["resource_tags_json"] for r in rows] == ['{"user_owner": "alice"}', None, None]
+
+
+# ============================================
+# BigQuery append
+# ============================================
+
+def _schema():
+    return [
+        SimpleNamespace(name="usage_date", field_type="DATE", mode="REQUIRED"),
+        SimpleNamespace(name="usage_start_time", field_type="TIMESTAMP", mode="NULLABLE"),
+        SimpleNamespace(name="unblended_cost", field_type="FLOAT64", mode="REQUIRED"),
+        SimpleNamespace(name="x_org_slug", field_type="STRING", mode="REQUIRED"),
+        SimpleNamespace(name="x_cloud_provider", field_type="STRING", mode="REQUIRED"),
+        SimpleNamespace(name="pricing_quantity", field_type="FLOAT64", mode="NULLABLE"),
+    ]
+
+
+class FakeLoadClient:
+    def __init__(self):
+        self.loads = []
+
+    def load_table_from_file(self, file_obj, table_id, job_config=None):
+        self.loads.append((table_id, pq.read_table(file_obj)))
+        return SimpleNamespace(result=lambda: None)
+
+
+def test_conform_casts_orders_and_fills_defaults():
+    table = pa.table({
+        "unblended_cost": [1.0],
+        "usage_date": ["2026-01-15"],
+        "usage_start_time": ["2026-01-15T00:00:00Z"],
+        "x_org_slug": ["acme_corp"],
+        "provider": ["aws"],
+    })
+    conformed = conform_to_schema(table, _schema(), {"x_cloud_provider": "AWS"})
+
+    assert conformed.schema.names == [f.name for f in _schema()]
+    assert conformed.schema.field("usage_date").type == pa.date32()
+    assert not conformed.schema.field("usage_date").nullable
+    assert conformed.column("usage_start_time")[0].as_py() == datetime(2026, 1, 15, tzinfo=timezone.utc)
+    assert conformed.column("x_cloud_provider").to_pylist() == ["AWS"]
+    assert conformed.column("pricing_quantity").to_pylist() == [None]
+
+
+@pytest.mark.asyncio
+async def test_appender_flushes_in_bounded_chunks(tmp_path):
+    path = tmp_path / "cur.csv"
+    _write_csv(path, CSV_ROWS * 5)
+    client = FakeLoadClient()
+    appender = ArrowBigQueryAppender(
+        client, "proj.acme_corp_prod.cloud_aws_billing_raw_daily", _schema(),
+        defaults={"x_cloud_provider": "AWS"}, flush_rows=4,
+    )
+
+    for column_map, batch in iter_cur_batches(str(path), "csv"):
+        mapped = map_cur_batch(batch, column_map, CONSTANTS)
+        for offset in range(0, mapped.num_rows, 3):
+            await appender.append(mapped.slice(offset, 3))
+    assert await appender.close() == 10
+
+    assert [t.num_rows for _, t in client.loads] == [6, 4]
+    loaded = pa.concat_tables([t for _, t in client.loads])
+    assert loaded.num_rows == 10
+    assert sorted(set(loaded.column("usage_date").to_pylist()))[0].isoformat() == "2026-01-15"
+
+
+# ============================================
+# Extractor
+# ============================================
+
+class FakeS3:
+    def __init__(self, files):
+        self.files = files
+
+    def get_paginator(self, _):
+        contents = [{"Key": k, "ETag": f'"{k}"', "Size": os.path.getsize(p)} for k, p in self.files.items()]
+        return SimpleNamespace(paginate=lambda **kw: [{"Contents": contents}])
+
+    def get_object(self, Bucket, Key, **kwargs):
+        return {"Body": open(self.files[Key], "rb")}
+
+
+@pytest.mark.asyncio
+async def test_extractor_streams_files_into_context(tmp_path, monkeypatch):
+    csv_path = tmp_path / "cur.csv.gz"
+    _write_csv(csv_path, CSV_ROWS, compress=True)
+    s3 = FakeS3({"cur/202601/part-1.csv.gz": str(csv_path), "cur/202601/part-2.csv.gz": str(csv_path)})
+
+    class FakeAuth:
+        def __init__(self, org_slug):
+            pass
+
+        async def get_s3_client(self):
+            return s3
+
+    monkeypatch.setattr(cur_extractor, "AWSAuthenticator", FakeAuth)
+    monkeypatch.setattr(settings, "step_output_dir", str(tmp_path / "outputs"))
+    context = {"org_slug": "acme_corp", "pipeline_id": "acme_corp-aws-billing", "run_id": "run-1"}
+    step_config = {
+        "step_id": "extract_billing",
+        "source": {"bucket": "acme-cur", "prefix": "cur", "format": "csv"},
+        "config": {"batch_size": 1},
+    }
+
+    result = await cur_extractor.AWSCURExtractor("acme_corp").execute(step_config, context)
+
+    assert result["status"] == "SUCCESS", result
+    assert result["row_count"] == 4 and result["file_count"] == 2
+    # Rows are spilled to disk; only the handle travels in context/result
+    dataset = context["extracted_dataset"]
+    assert result["output_dataset"] == dataset.to_dict() and "rows" not in result
+    assert dataset.num_rows == 4 and dataset.path.startswith(str(tmp_path / "outputs" / "run-1"))
+    rows = [row for chunk in dataset.iter_rows() for row in chunk]
+    assert len(rows) == 4
+    assert {r["x_pipeline_id"] for r in rows} == {"acme_corp-aws-billing"}
+    assert rows[0]["x_org_slug"] == "acme_corp" and rows[0]["provider"] == "aws"
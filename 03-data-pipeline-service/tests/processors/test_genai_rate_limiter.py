@@ -0,0 +1,231 @@
+"""
+Tests for the shared GenAI provider rate limiter
+(src/core/processors/genai/provider_adapters/rate_limiter.py) and
+concurrent per-day extraction in the provider adapters.
+
+Runs against MockUsageProvider, a local stand-in for the OpenAI usage API
+served through httpx.MockTransport: it enforces its own token-bucket limit
+per API key, answers over-limit requests with 429 + Retry-After and sends
+x-ratelimit-* headers on every response.
+
+Benchmark (per-adapter sequential fetching vs shared bucket + concurrent days):
+    RUN_BENCHMARKS=1 pytest tests/processors/test_genai_rate_limiter.py -k benchmark -s
+"""
+
+import asyncio
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from src.core.processors.genai.provider_adapters import OpenAIAdapter
+from src.core.processors.genai.provider_adapters.rate_limiter import (
+    AdaptiveTokenBucket,
+    get_rate_limit_stats,
+    parse_rate_limit_headers,
+    parse_reset_seconds,
+    reset_rate_limit_buckets,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets():
+    reset_rate_limit_buckets()
+    yield
+    reset_rate_limit_buckets()
+
+
+class MockUsageProvider:
+    """OpenAI usage API stand-in enforcing requests_per_second per API key."""
+
+    def __init__(self, requests_per_second: float = 1000.0, burst: int = 100, latency: float = 0.0):
+        self.rate = requests_per_second
+        self.burst = burst
+        self.latency = latency
+        self.requests = 0
+        self.throttled = 0
+        self.unauthorized_keys = set()
+        self._buckets = {}
+
+    def _take(self, key: str):
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        headers = {
+            "x-ratelimit-limit-requests": str(int(self.rate * 60)),
+            "x-ratelimit-remaining-requests": str(int(tokens)),
+            "x-ratelimit-reset-requests": f"{(self.burst - tokens) / self.rate:.3f}s",
+        }
+        return allowed, headers
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        key = request.headers["Authorization"]
+        if key in self.unauthorized_keys:
+            return httpx.Response(401)
+        allowed, headers = self._take(key)
+        if not allowed:
+            self.throttled += 1
+            return httpx.Response(429, headers={**headers, "Retry-After": "1"})
+        await asyncio.sleep(self.latency)
+        day = request.url.params["date"]
+        return httpx.Response(200, headers=headers, json={"data": [{
+            "snapshot_id": "gpt-4o-2024-08-06",
+            "n_context_tokens_total": 1000,
+            "n_generated_tokens_total": 200,
+            "n_requests": 10,
+            "day": day,
+        }]})
+
+
+def _adapter(provider: MockUsageProvider, api_key: str = "sk-shared", org_slug: str = "acme_corp", **kwargs):
+    adapter = OpenAIAdapter({"api_key": api_key, "credential_id": f"cred-{org_slug}"}, org_slug, **kwargs)
+    adapter._get_http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(provider.handler))
+    return adapter
+
+
+# ============================================
+# Header parsing
+# ============================================
+
+def test_parse_rate_limit_headers_across_providers():
+    now = time.time()
+
+    openai = parse_rate_limit_headers({"x-ratelimit-remaining-requests": "59", "x-ratelimit-reset-requests": "1m0.5s"})
+    assert openai.remaining == 59 and openai.reset_seconds == pytest.approx(60.5)
+
+    reset_at = datetime.fromtimestamp(now + 30, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+    anthropic = parse_rate_limit_headers({
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "10",
+        "anthropic-ratelimit-requests-reset": reset_at,
+    })
+    assert anthropic.limit == 50 and anthropic.reset_seconds == pytest.approx(30, abs=1)
+
+    assert parse_reset_seconds("20ms") == pytest.approx(0.02)
+    assert parse_reset_seconds(str(int(now) + 5), now=now) == pytest.approx(5, abs=1)
+    assert parse_reset_seconds("soon") is None
+    assert parse_rate_limit_headers({"content-type": "application/json"}) is None
+
+
+# ============================================
+# Token bucket
+# ============================================
+
+async def test_bucket_paces_requests_beyond_burst():
+    bucket = AdaptiveTokenBucket(rate_per_second=50, burst=2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bucket.acquire() for _ in range(7)))
+
+    # First request immediate, 6 more at 50/s
+    assert time.perf_counter() - start == pytest.approx(0.12, abs=0.05)
+    assert bucket.get_stats()["requests"] == 7
+
+
+async def test_bucket_adapts_to_throttling_and_headers():
+    bucket = AdaptiveTokenBucket(rate_per_second=10, burst=5, min_rate_per_second=1)
+
+    bucket.on_throttled(0.05)
+    assert bucket.rate == 5 and bucket.get_stats()["blocked_for_seconds"] > 0
+    assert await bucket.acquire() >= 0.04
+
+    # Spread the remaining quota until reset
+    bucket.on_response({"x-ratelimit-remaining-requests": "30", "x-ratelimit-reset-requests": "10s"})
+    assert bucket.rate == pytest.approx(3)
+
+    # Without quota headers the rate recovers additively to the configured rate
+    for _ in range(20):
+        bucket.on_response({})
+    assert bucket.rate == 10
+
+
+# ============================================
+# Adapters
+# ============================================
+
+async def test_adapters_sharing_a_credential_share_a_bucket():
+    provider = MockUsageProvider()
+    url = f"{OpenAIAdapter.BASE_URL}/usage"
+
+    org_a = _adapter(provider, org_slug="org_a")
+    org_b = _adapter(provider, org_slug="org_b")
+    other_account = _adapter(provider, api_key="sk-other", org_slug="org_c")
+
+    assert org_a._get_rate_limit_bucket(url) is org_b._get_rate_limit_bucket(url)
+    assert org_a._get_rate_limit_bucket(url) is not other_account._get_rate_limit_bucket(url)
+    assert org_a._get_rate_limit_bucket(url) is not org_a._get_rate_limit_bucket(f"{OpenAIAdapter.BASE_URL}/models")
+    assert all("sk-shared" not in key for key in get_rate_limit_stats())
+
+
+async def test_days_are_fetched_concurrently_in_date_order():
+    provider = MockUsageProvider(latency=0.05)
+    adapter = _adapter(provider, request_delay_seconds=0.0, batch_delay_seconds=0.0, burst_limit=20, day_concurrency=8)
+    start_date = date(2026, 1, 1)
+
+    start = time.perf_counter()
+    records = await adapter.extract_payg_usage(start_date, start_date + timedelta(days=7))
+    elapsed = time.perf_counter() - start
+
+    assert [r["usage_date"] for r in records] == [start_date + timedelta(days=i) for i in range(8)]
+    assert elapsed < 8 * 0.05
+    assert provider.throttled == 0
+
+
+async def test_authentication_failure_stops_remaining_days():
+    provider = MockUsageProvider()
+    provider.unauthorized_keys.add("Bearer sk-revoked")
+    adapter = _adapter(provider, api_key="sk-revoked", day_concurrency=2)
+
+    records = await adapter.extract_payg_usage(date(2026, 1, 1), date(2026, 1, 30))
+
+    assert records == []
+    assert provider.requests <= 2
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Benchmark - set RUN_BENCHMARKS=1 to run")
+async def test_benchmark_concurrent_adapters_on_one_provider_account(monkeypatch):
+    orgs = int(os.environ.get("BENCH_ORGS", "6"))
+    days = int(os.environ.get("BENCH_DAYS", "15"))
+    provider_rps = float(os.environ.get("BENCH_PROVIDER_RPS", "8"))
+    latency = float(os.environ.get("BENCH_LATENCY_MS", "100")) / 1000
+    start_date = date(2026, 1, 1)
+    end_date = start_date + timedelta(days=days - 1)
+
+    async def run(mode):
+        reset_rate_limit_buckets()
+        provider = MockUsageProvider(requests_per_second=provider_rps, burst=5, latency=latency)
+        adapters = [
+            _adapter(provider, org_slug=f"org_{i}", day_concurrency=1 if mode == "before" else 4)
+            for i in range(orgs)
+        ]
+        if mode == "before":
+            # Previous behaviour: every adapter instance limits itself alone
+            for adapter in adapters:
+                monkeypatch.setattr(adapter, "_credential_fingerprint", lambda a=adapter: f"instance-{id(a)}")
+        start = time.perf_counter()
+        results = await asyncio.gather(*(a.extract_payg_usage(start_date, end_date) for a in adapters))
+        elapsed = time.perf_counter() - start
+        # Days whose retries ran out are logged and missing from the result
+        missing = orgs * days - sum(len(records) for records in results)
+        return elapsed, provider.throttled, missing
+
+    before = await run("before")
+    after = await run("after")
+
+    print(f"\n{orgs} orgs x {days} days on one provider account limited to {provider_rps:.0f} req/s "
+          f"({latency * 1000:.0f}ms latency): "
+          f"before {before[0]:.2f}s ({before[1]} x 429, {before[2]} days missing) | "
+          f"after {after[0]:.2f}s ({after[1]} x 429, {after[2]} days missing)")
+    assert after[2] == 0
+    assert after[1] < before[1]
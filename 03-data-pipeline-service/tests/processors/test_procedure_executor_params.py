@@ -0,0 +1,170 @@
+"""
+Tests for procedure_executor parameter building, including ARRAY<...> types
+used to pass subscription_ids to targeted subscription cost recomputes, and
+retries of procedures aborted by concurrent DML conflicts.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.api_core.exceptions import BadRequest
+from google.cloud import bigquery
+
+from src.app.routers.pipelines import TriggerPipelineRequest
+from src.core.processors.generic import procedure_executor
+from src.core.processors.generic.procedure_executor import ProcedureExecutorProcessor
+
+MODULE = "src.core.processors.generic.procedure_executor"
+
+STEP_CONFIG = {
+    "config": {
+        "procedure": {"name": "sp_subscription_4_run_pipeline", "dataset": "organizations"},
+        "parameters": [
+            {"name": "p_dataset_id", "type": "STRING", "value": "${org_dataset}"},
+            {"name": "p_start_date", "type": "DATE", "value": "${start_date}"},
+            {"name": "p_subscription_ids", "type": "ARRAY<STRING>", "value": "${subscription_ids}", "optional": True},
+        ],
+    }
+}
+
+
+@pytest.fixture
+def processor():
+    return ProcedureExecutorProcessor()
+
+
+def test_array_parameter_from_list_and_csv(processor):
+    param = processor._create_bq_parameter("ids", "ARRAY<STRING>", ["sub_a", "sub_b"])
+    assert isinstance(param, bigquery.ArrayQueryParameter)
+    assert param.array_type == "STRING" and param.values == ["sub_a", "sub_b"]
+
+    dates = processor._create_bq_parameter("days", "ARRAY<DATE>", "2026-01-01, 2026-01-02")
+    assert dates.values == [date(2026, 1, 1), date(2026, 1, 2)]
+
+
+def test_array_parameter_rejects_bad_elements(processor):
+    assert processor._create_bq_parameter("n", "ARRAY<INT64>", ["1", "x"]) is None
+    assert processor._create_bq_parameter("ids", "ARRAY<STRING>", 42) is None
+
+
+async def _call(processor, context):
+    bq = MagicMock()
+    bq.client.query.return_value.result.return_value = []
+    with patch(f"{MODULE}.BigQueryClient", return_value=bq), patch(f"{MODULE}.log_execute", AsyncMock()):
+        result = await processor.execute(STEP_CONFIG, {"org_slug": "acme", **context})
+    sql = bq.client.query.call_args.args[0]
+    params = {p.name: p for p in bq.client.query.call_args.kwargs["job_config"].query_parameters}
+    return result, sql, params
+
+
+async def test_targeted_run_passes_subscription_ids(processor):
+    _, sql, params = await _call(processor, {"start_date": "2026-03-01", "subscription_ids": ["sub_a", "sub_b"]})
+
+    assert sql.endswith("(@p_dataset_id, @p_start_date, @p_subscription_ids)")
+    assert params["p_subscription_ids"].values == ["sub_a", "sub_b"]
+
+
+async def test_scheduled_run_passes_empty_array(processor):
+    _, _, params = await _call(processor, {"start_date": "2026-03-01"})
+
+    assert isinstance(params["p_subscription_ids"], bigquery.ArrayQueryParameter)
+    assert params["p_subscription_ids"].array_type == "STRING"
+    assert params["p_subscription_ids"].values == []
+
+
+FOCUS_STEP_CONFIG = {
+    "config": {
+        "procedure": {"name": "sp_cloud_1_convert_to_focus", "dataset": "organizations"},
+        "parameters": [
+            {"name": "p_dataset_id", "type": "STRING", "value": "${org_dataset}"},
+            {"name": "p_provider", "type": "STRING", "value": "${provider}"},
+        ],
+    }
+}
+
+
+class PartitionConflictBigQuery:
+    """
+    BigQuery stand-in with partition-level DML conflict detection.
+
+    Every CALL rewrites the same cost_data_standard_1_3 partitions. A job
+    whose partitions were committed by another job while it ran fails the
+    way BigQuery does, and only one job commits at a time.
+    """
+
+    def __init__(self, run_seconds: float = 0.05):
+        self.run_seconds = run_seconds
+        self.version = 0
+        self.calls = []
+        self.conflicts = 0
+        self._lock = threading.Lock()
+        self.client = MagicMock()
+        self.client.query.side_effect = self._query
+
+    def _query(self, sql, job_config=None):
+        params = {p.name: p.value for p in job_config.query_parameters}
+        with self._lock:
+            self.calls.append(params["p_provider"])
+            started_at = self.version
+        job = MagicMock()
+        job.job_id = f"job-{len(self.calls)}"
+        job.result.side_effect = lambda timeout=None: self._result(started_at)
+        return job
+
+    def _result(self, started_at):
+        time.sleep(self.run_seconds)
+        with self._lock:
+            if self.version != started_at:
+                self.conflicts += 1
+                raise BadRequest(
+                    "sp_cloud_1_convert_to_focus Failed: Could not serialize access to table "
+                    "p:acme_prod.cost_data_standard_1_3 due to concurrent update"
+                )
+            self.version += 1
+        return []
+
+
+async def test_concurrent_provider_conversions_retry_partition_conflicts(processor, monkeypatch):
+    monkeypatch.setattr(procedure_executor, "CONCURRENT_UPDATE_BASE_DELAY_SECONDS", 0.01)
+    bq = PartitionConflictBigQuery()
+
+    with patch(f"{MODULE}.BigQueryClient", return_value=bq), patch(f"{MODULE}.log_execute", AsyncMock()):
+        results = await asyncio.gather(
+            processor.execute(FOCUS_STEP_CONFIG, {"org_slug": "acme", "provider": "aws"}),
+            processor.execute(FOCUS_STEP_CONFIG, {"org_slug": "acme", "provider": "azure"}),
+        )
+
+    assert [r["status"] for r in results] == ["SUCCESS", "SUCCESS"]
+    assert bq.conflicts >= 1
+    assert bq.version == 2
+    assert len(bq.calls) == 2 + bq.conflicts
+
+
+async def test_conflicts_are_not_retried_for_other_procedures_or_forever(processor, monkeypatch):
+    monkeypatch.setattr(procedure_executor, "CONCURRENT_UPDATE_BASE_DELAY_SECONDS", 0)
+    bq = MagicMock()
+    bq.client.query.return_value.result.side_effect = BadRequest("Could not serialize access to table t")
+
+    with patch(f"{MODULE}.BigQueryClient", return_value=bq), patch(f"{MODULE}.log_execute", AsyncMock()):
+        other = await processor.execute(STEP_CONFIG, {"org_slug": "acme", "start_date": "2026-03-01"})
+        assert bq.client.query.call_count == 1
+
+        focus = await processor.execute(FOCUS_STEP_CONFIG, {"org_slug": "acme", "provider": "gcp"})
+
+    assert other["status"] == focus["status"] == "FAILED"
+    assert bq.client.query.call_count == 1 + procedure_executor.CONCURRENT_UPDATE_MAX_ATTEMPTS
+
+
+def test_trigger_request_normalises_subscription_ids():
+    request = TriggerPipelineRequest(start_date="2026-03-01", subscription_ids=[" sub_a", "sub_a", "", "sub_b"])
+    assert request.subscription_ids == ["sub_a", "sub_b"]
+    assert TriggerPipelineRequest(subscription_ids=[]).subscription_ids is None
+
+    with pytest.raises(ValueError):
+        TriggerPipelineRequest(subscription_ids=["x" * 300])
+    with pytest.raises(ValueError):
+        TriggerPipelineRequest(subscription_ids=[f"sub_{i}" for i in range(501)])
@@ -0,0 +1,284 @@
+"""
+Tests for async S3 fetching and the CUR ingestion manifest.
+
+Runs against LocalS3, an in-process stand-in for the boto3 S3 client API
+(list_objects_v2 paginator, get_object with Range / IfMatch) with a
+configurable per-request latency to model network round trips.
+
+Benchmark (sequential vs concurrent downloads of 120 objects):
+    RUN_BENCHMARKS=1 pytest tests/processors/test_s3_fetch.py -k benchmark -s
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.core.processors.cloud.aws import cur_extractor
+from src.core.processors.cloud.aws.s3_fetch import AsyncS3Fetcher, CURFileManifest, S3Object
+
+
+# ============================================
+# Local S3 stand-in
+# ============================================
+
+class PreconditionFailed(Exception):
+    """Mirrors the 412 boto3 raises for a failed IfMatch."""
+
+
+class LocalS3:
+    """Thread-safe in-memory S3 bucket speaking the boto3 client API."""
+
+    def __init__(self, latency: float = 0.0, page_size: int = 1000):
+        self.latency = latency
+        self.page_size = page_size
+        self.objects: Dict[str, bytes] = {}
+        self.requests: List[dict] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def put(self, key: str, data: bytes) -> None:
+        self.objects[key] = data
+
+    def etag(self, key: str) -> str:
+        return hashlib.md5(self.objects[key]).hexdigest()
+
+    def get_paginator(self, operation: str):
+        assert operation == "list_objects_v2"
+
+        def paginate(Bucket: str, Prefix: str = ""):
+            keys = sorted(k for k in self.objects if k.startswith(Prefix))
+            for i in range(0, max(len(keys), 1), self.page_size):
+                yield {
+                    "Contents": [
+                        {"Key": k, "ETag": f'"{self.etag(k)}"', "Size": len(self.objects[k])}
+                        for k in keys[i:i + self.page_size]
+                    ]
+                }
+
+        return SimpleNamespace(paginate=paginate)
+
+    def get_object(self, Bucket: str, Key: str, Range: str = None, IfMatch: str = None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.requests.append({"key": Key, "range": Range, "thread": threading.current_thread().name})
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            data = self.objects[Key]
+            if IfMatch and IfMatch.strip('"') != self.etag(Key):
+                raise PreconditionFailed(Key)
+            if Range:
+                start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", Range).groups())
+                data = data[start:end + 1]
+            return {"Body": io.BytesIO(data), "ContentLength": len(data)}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _populate(s3: LocalS3, count: int, size: int = 2048, prefix: str = "cur/202601") -> None:
+    for i in range(count):
+        s3.put(f"{prefix}/part-{i:04d}.parquet", os.urandom(size))
+
+
+async def _drain(fetcher: AsyncS3Fetcher, objects, tmp_path) -> Dict[str, bytes]:
+    received = {}
+    async for obj, path in fetcher.iter_downloads("bucket", objects, str(tmp_path)):
+        with open(path, "rb") as f:
+            received[obj.key] = f.read()
+    return received
+
+
+# ============================================
+# Fetcher
+# ============================================
+
+@pytest.mark.asyncio
+async def test_listing_returns_etags_and_sizes_across_pages():
+    s3 = LocalS3(page_size=7)
+    _populate(s3, 20)
+    s3.put("cur/202601/manifest.json", b"{}")
+    fetcher = AsyncS3Fetcher(s3)
+
+    objects = await fetcher.list_objects("bucket", "cur/202601")
+    fetcher.close()
+
+    assert len(objects) == 20
+    assert objects[0] == S3Object(key="cur/202601/part-0000.parquet", etag=s3.etag(objects[0].key), size=2048)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_are_bounded(tmp_path):
+    s3 = LocalS3(latency=0.02)
+    _populate(s3, 24)
+    fetcher = AsyncS3Fetcher(s3, max_concurrent_downloads=4)
+    objects = await fetcher.list_objects("bucket", "cur")
+
+    received = await _drain(fetcher, objects, tmp_path)
+    fetcher.close()
+
+    assert received == {k: v for k, v in s3.objects.items()}
+    assert s3.peak_in_flight == 4
+    assert all(r["thread"].startswith("s3-fetch") for r in s3.requests)
+    assert os.listdir(tmp_path) == []  # Files removed once consumed
+
+
+@pytest.mark.asyncio
+async def test_large_objects_use_parallel_ranged_gets(tmp_path):
+    s3 = LocalS3(latency=0.01)
+    s3.put("cur/big.parquet", os.urandom(1000))
+    s3.put("cur/small.parquet", os.urandom(100))
+    fetcher = AsyncS3Fetcher(s3, multipart_threshold=500, part_size=128, max_part_concurrency=3)
+    objects = await fetcher.list_objects("bucket", "cur")
+
+    received = await _drain(fetcher, objects, tmp_path)
+    fetcher.close()
+
+    assert received == s3.objects
+    ranged = [r for r in s3.requests if r["range"]]
+    assert len(ranged) == 8 and {r["key"] for r in ranged} == {"cur/big.parquet"}
+    assert fetcher.stats.ranged_parts == 8
+    assert fetcher.stats.bytes_downloaded == 1100
+
+
+@pytest.mark.asyncio
+async def test_object_rewritten_mid_download_fails(tmp_path):
+    s3 = LocalS3()
+    s3.put("cur/big.parquet", os.urandom(1000))
+    fetcher = AsyncS3Fetcher(s3, multipart_threshold=500, part_size=128)
+    objects = await fetcher.list_objects("bucket", "cur")
+    s3.put("cur/big.parquet", os.urandom(1000))  # New version after listing
+
+    with pytest.raises(PreconditionFailed):
+        await _drain(fetcher, objects, tmp_path)
+    fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_download_overlaps_consumer_work(tmp_path):
+    s3 = LocalS3(latency=0.05)
+    _populate(s3, 8)
+    fetcher = AsyncS3Fetcher(s3, max_concurrent_downloads=4)
+    objects = await fetcher.list_objects("bucket", "cur")
+
+    start = time.perf_counter()
+    async for _ in fetcher.iter_downloads("bucket", objects, str(tmp_path)):
+        await asyncio.sleep(0.05)  # Parsing / loading the file
+    elapsed = time.perf_counter() - start
+    fetcher.close()
+
+    # Sequential download-then-process would take 8 * (0.05 + 0.05) = 0.8s
+    assert elapsed < 0.6
+
+
+# ============================================
+# Manifest
+# ============================================
+
+def test_manifest_skips_unchanged_and_picks_up_rewritten_objects():
+    manifest = CURFileManifest()
+    a = S3Object("cur/202601/a.parquet", "etag-a", 10)
+    b = S3Object("cur/202601/b.parquet", "etag-b", 10)
+    manifest.record("acme_corp", "bucket", [a, b])
+
+    rewritten = S3Object(b.key, "etag-b2", 12)
+    new = S3Object("cur/202601/c.parquet", "etag-c", 10)
+    assert manifest.pending("acme_corp", "bucket", "cur/202601", [a, rewritten, new]) == [rewritten, new]
+    # Manifests are per org
+    assert manifest.pending("globex", "bucket", "cur/202601", [a]) == [a]
+
+
+@pytest.mark.asyncio
+async def test_extractor_skips_files_already_in_manifest(tmp_path, monkeypatch):
+    s3 = LocalS3()
+    buffer = io.BytesIO()
+    pq.write_table(pa.table({
+        "line_item_usage_start_date": ["2026-01-15T00:00:00Z"],
+        "line_item_unblended_cost": [1.0],
+    }), buffer)
+    for i in range(3):
+        s3.put(f"cur/202601/part-{i}.parquet", buffer.getvalue())
+
+    class FakeAuth:
+        def __init__(self, org_slug):
+            pass
+
+        async def get_s3_client(self):
+            return s3
+
+    class FakeAppender:
+        table_id = "proj.acme_corp_prod.cloud_aws_billing_raw_daily"
+        load_jobs = 1
+
+        def __init__(self):
+            self.rows = 0
+
+        async def append(self, batch):
+            self.rows += batch.num_rows
+
+        async def close(self):
+            return self.rows
+
+    async def create_appender(self, destination, run_id, flush_rows):
+        return FakeAppender()
+
+    monkeypatch.setattr(cur_extractor, "AWSAuthenticator", FakeAuth)
+    monkeypatch.setattr(cur_extractor.AWSCURExtractor, "_create_appender", create_appender)
+    manifest = CURFileManifest()
+    step_config = {
+        "source": {"bucket": "acme-cur", "prefix": "cur", "skip_ingested": True},
+        "destination": {"table": "cloud_aws_billing_raw_daily"},
+        "config": {"date_filter": "2026-01-15"},
+    }
+
+    first = await cur_extractor.AWSCURExtractor("acme_corp", manifest=manifest).execute(step_config, {})
+    assert first["status"] == "SUCCESS", first
+    assert (first["file_count"], first["files_skipped"], first["rows_loaded"]) == (3, 0, 3)
+
+    s3.put("cur/202601/part-3.parquet", buffer.getvalue())
+    second = await cur_extractor.AWSCURExtractor("acme_corp", manifest=manifest).execute(step_config, {})
+    assert (second["file_count"], second["files_skipped"], second["rows_loaded"]) == (1, 3, 1)
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="Benchmark - set RUN_BENCHMARKS=1 to run")
+@pytest.mark.asyncio
+async def test_benchmark_sequential_vs_concurrent_downloads(tmp_path):
+    files = int(os.environ.get("BENCH_S3_FILES", "120"))
+    size = int(os.environ.get("BENCH_S3_FILE_BYTES", str(256 * 1024)))
+    # Per-request round trip to a remote S3 region
+    s3 = LocalS3(latency=0.03)
+    _populate(s3, files, size=size)
+
+    sequential = AsyncS3Fetcher(s3, max_concurrent_downloads=1, max_part_concurrency=1)
+    objects = await sequential.list_objects("bucket", "cur")
+    start = time.perf_counter()
+    await _drain(sequential, objects, tmp_path)
+    seq_elapsed = time.perf_counter() - start
+    sequential.close()
+
+    concurrent = AsyncS3Fetcher(s3, max_concurrent_downloads=16)
+    start = time.perf_counter()
+    await _drain(concurrent, objects, tmp_path)
+    conc_elapsed = time.perf_counter() - start
+    concurrent.close()
+
+    total_mb = files * size / 1e6
+    print(f"\nS3 {files} files ({total_mb:,.0f} MB): sequential {seq_elapsed:.2f}s "
+          f"({files / seq_elapsed:,.0f} files/s) | concurrent x16 {conc_elapsed:.2f}s "
+          f"({files / conc_elapsed:,.0f} files/s, {total_mb / conc_elapsed:,.1f} MB/s)")
@@ -0,0 +1,124 @@
+"""
+Tests for the shared HTTP client pool (src/core/utils/http_pool.py).
+
+Requests go to a local keep-alive HTTP/1.1 server that counts accepted
+connections, so reuse is observed on real sockets.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.notifications.adapters import WebhookNotificationAdapter
+from src.core.notifications.registry import NotificationPayload, WebhookProviderConfig
+from src.core.processors.genai.provider_adapters.openai_adapter import OpenAIAdapter
+from src.core.utils.http_pool import HttpClientPool, close_http_client_pool, get_http_client_pool, set_http_client_pool
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 server: answers every request with 200 "ok"."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def pool():
+    pool = HttpClientPool(max_connections_per_host=4, http2=False)
+    set_http_client_pool(pool)
+    yield pool
+    await close_http_client_pool()
+
+
+async def test_connections_are_reused_across_clients(pool):
+    async with KeepAliveServer() as server:
+        for _ in range(5):
+            # Each caller closes its client; the pooled connection survives
+            async with pool.client(timeout=5.0) as client:
+                response = await client.get(f"{server.url}/v1/usage")
+                assert response.text == "ok"
+
+        stats = pool.get_stats()["127.0.0.1"]
+        assert server.connections == 1
+        assert stats["requests"] == 5 and stats["connections_opened"] == 1
+        assert stats["reuse_ratio"] == 0.8
+
+
+async def test_per_host_connection_limit(pool):
+    async with KeepAliveServer(delay=0.05) as server:
+        async with pool.client(timeout=5.0) as client:
+            await asyncio.gather(*(client.get(server.url) for _ in range(12)))
+
+        assert server.requests == 12
+        assert server.connections == 4
+
+
+async def test_adapters_and_webhooks_share_the_loop_pool(pool):
+    assert get_http_client_pool() is pool
+
+    async with KeepAliveServer() as server:
+        async with object.__new__(OpenAIAdapter)._get_http_client() as client:
+            await client.get(server.url)
+
+        adapter = WebhookNotificationAdapter(WebhookProviderConfig(enabled=True, url=f"{server.url}/hook"))
+        sent = await adapter.send(NotificationPayload(title="Pipeline failed", message="step extract failed"))
+
+        assert sent is True
+        assert server.connections == 1
+        assert pool.get_stats()["127.0.0.1"]["requests"] == 2
+
+
+async def test_closed_pool_rejects_requests_and_is_replaced():
+    pool = get_http_client_pool()
+    await close_http_client_pool()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        async with pool.client() as client:
+            await client.get("http://127.0.0.1:1")
+    assert get_http_client_pool() is not pool
+    await close_http_client_pool()
+
+
+async def test_http2_requires_h2():
+    from src.core.utils import http_pool
+
+    assert HttpClientPool(http2=True).http2 is http_pool.H2_AVAILABLE
+    assert HttpClientPool(http2=False).http2 is False
+    assert isinstance(HttpClientPool().transport, httpx.AsyncBaseTransport)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Benchmark Fixture Generator for CloudAct
+Writes demo data as Parquet fixtures for the local DuckDB BigQuery stand-in
+(BIGQUERY_BACKEND=duckdb), so pipelines and read services can be benchmarked
+offline.
+
+Reuses generate-demo-data.py for realistic rows and conforms every table to
+its BigQuery schema JSON (api-service configs/setup), so the stand-in sees the
+same column names and types as production.
+
+Output layout (LOCAL_BIGQUERY_DATA_DIR):
+    {output}/organizations/org_profiles.parquet
+    {output}/organizations/org_hierarchy.parquet
+    {output}/{org}_{env}/cloud_{gcp,aws,azure,oci}_billing_raw_daily.parquet
+    {output}/{org}_{env}/genai_payg_usage_raw.parquet
+    {output}/{org}_{env}/genai_payg_pricing.parquet
+    {output}/{org}_{env}/subscription_plans.parquet
+
+--scale N replicates every raw cloud/GenAI row N times across extra projects
+and hierarchy teams (cost jittered per replica) to reach 1M/10M-row volumes.
+
+Usage:
+    python generate-bench-fixtures.py --output-dir /tmp/bench --days 30
+    python generate-bench-fixtures.py --orgs 3 --start-date 2025-01-01 --end-date 2025-12-31 --scale 20
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import random
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Configuration
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+REPO_ROOT = SCRIPT_DIR.parents[2]
+BOOTSTRAP_SCHEMAS = REPO_ROOT / "02-api-service" / "configs" / "setup" / "bootstrap" / "schemas"
+ORG_SCHEMAS = REPO_ROOT / "02-api-service" / "configs" / "setup" / "organizations" / "onboarding" / "schemas"
+DEFAULT_OUTPUT_DIR = DATA_DIR / "bench"
+DEFAULT_ORG_PREFIX = "bench_org"
+
+CLOUD_PROVIDERS = ["gcp", "aws", "azure", "oci"]
+TEAMS = ["TEAM-BACKEND", "TEAM-FRONTEND", "TEAM-MLOPS", "TEAM-DATAENG"]
+
+# Columns varied per --scale replica (first match per table wins)
+REPLICA_ACCOUNT_COLUMNS = ["project_id", "linked_account_id", "subscription_id", "compartment_id", "model"]
+REPLICA_COST_COLUMNS = [
+    "cost", "unblended_cost", "blended_cost", "amortized_cost", "net_unblended_cost",
+    "cost_in_billing_currency", "cost_in_pricing_currency", "cost_at_list", "my_cost", "attributed_cost",
+]
+
+BQ_TO_ARROW = {
+    "STRING": pa.string(),
+    "BYTES": pa.binary(),
+    "INTEGER": pa.int64(),
+    "INT64": pa.int64(),
+    "FLOAT": pa.float64(),
+    "FLOAT64": pa.float64(),
+    "NUMERIC": pa.decimal128(38, 9),
+    "BIGNUMERIC": pa.decimal128(38, 9),
+    "BOOLEAN": pa.bool_(),
+    "BOOL": pa.bool_(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "DATETIME": pa.timestamp("us"),
+    "JSON": pa.string(),
+}
+
+
+def _load_module(name: str, path: Path):
+    """Import a sibling script with a hyphenated file name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+demo = _load_module("generate_demo_data", SCRIPT_DIR / "generate-demo-data.py")
+hierarchy = _load_module("populate_hierarchy_in_data", SCRIPT_DIR.parent / "scripts" / "populate_hierarchy_in_data.py")
+
+
+# ============================================
+# Schema Conformance
+# ============================================
+
+def load_schema(schema_dir: Path, table: str) -> List[Dict]:
+    """BigQuery JSON schema fields for a table."""
+    with open(schema_dir / f"{table}.json") as f:
+        return json.load(f)
+
+
+def _arrow_type(field: Dict) -> pa.DataType:
+    if field["type"] in ("RECORD", "STRUCT"):
+        data_type = pa.struct([pa.field(sub["name"], _arrow_type(sub)) for sub in field.get("fields", [])])
+    else:
+        data_type = BQ_TO_ARROW[field["type"]]
+    return pa.list_(data_type) if field.get("mode") == "REPEATED" else data_type
+
+
+def _bool(value) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "1", "yes")
+
+
+def _column(values: List, field: Dict) -> pa.Array:
+    """Build one schema-typed column from generator values ('' = NULL)."""
+    data_type = _arrow_type(field)
+    if field.get("mode") == "REPEATED":
+        return pa.array([v if isinstance(v, list) or v is None else [v] for v in values], type=data_type)
+
+    values = [None if v == "" else v for v in values]
+    bq_type = field["type"]
+    if bq_type in ("DATE", "TIMESTAMP", "DATETIME"):
+        text = pa.array([None if v is None else str(v).replace(" ", "T") for v in values], type=pa.string())
+        if bq_type == "TIMESTAMP":
+            text = pc.if_else(pc.match_substring_regex(text, r"(Z|[+-]\d\d:?\d\d)$"), text, pc.binary_join_element_wise(text, "Z", ""))
+            text = pc.if_else(pc.match_substring(text, "T"), text, pc.binary_join_element_wise(text, "T00:00:00Z", ""))
+        return text.cast(data_type)
+    if bq_type in ("BOOLEAN", "BOOL"):
+        return pa.array([_bool(v) for v in values], type=data_type)
+    if bq_type in ("INTEGER", "INT64"):
+        return pa.array([None if v is None else int(float(v)) for v in values], type=data_type)
+    if bq_type in ("FLOAT", "FLOAT64"):
+        return pa.array([None if v is None else float(v) for v in values], type=data_type)
+    if bq_type in ("NUMERIC", "BIGNUMERIC"):
+        return pa.array([None if v is None else round(float(v), 9) for v in values], type=pa.float64()).cast(data_type)
+    if bq_type == "JSON":
+        return pa.array([None if v is None or isinstance(v, str) else json.dumps(v) for v in values], type=data_type)
+    return pa.array([None if v is None else str(v) for v in values], type=data_type)
+
+
+def conform(records: List[Dict], schema: List[Dict]) -> pa.Table:
+    """Records → Arrow table with exactly the BigQuery schema's columns and types."""
+    return pa.table({
+        field["name"]: _column([record.get(field["name"]) for record in records], field)
+        for field in schema
+    })
+
+
+def write_table(table: pa.Table, out_dir: Path, dataset: str, name: str) -> None:
+    path = out_dir / dataset / f"{name}.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path, compression="zstd")
+    print(f"  Wrote {table.num_rows:>12,} rows to {path}")
+
+
+# ============================================
+# Scaling
+# ============================================
+
+def replicate(table: pa.Table, scale: int, rng: np.random.Generator) -> pa.Table:
+    """
+    Repeat every row scale times. Replica k > 0 gets its own account/project
+    id, a rotated hierarchy team and costs jittered by ±10%.
+    """
+    if scale <= 1 or table.num_rows == 0:
+        return table
+
+    names = table.column_names
+    account = next((c for c in REPLICA_ACCOUNT_COLUMNS if c in names), None)
+    costs = [c for c in REPLICA_COST_COLUMNS if c in names and pa.types.is_floating(table.schema.field(c).type)]
+    has_hierarchy = "x_hierarchy_entity_id" in names
+    team_index = {team: i for i, team in enumerate(TEAMS)}
+    base_team = pc.fill_null(table.column("x_hierarchy_entity_id"), TEAMS[0]).to_pylist() if has_hierarchy else None
+
+    replicas = [table]
+    for k in range(1, scale):
+        replica = table
+        if account:
+            column = replica.column(account)
+            suffixed = pc.binary_join_element_wise(pc.cast(column, pa.string()), pa.scalar(f"-r{k}"), "")
+            replica = replica.set_column(names.index(account), account, suffixed)
+        jitter = rng.uniform(0.9, 1.1, table.num_rows)
+        for name in costs:
+            replica = replica.set_column(names.index(name), name, pc.multiply(replica.column(name), pa.array(jitter)))
+        if has_hierarchy:
+            teams = [TEAMS[(team_index.get(team, 0) + k) % len(TEAMS)] for team in base_team]
+            for field_name, key in (
+                ("x_hierarchy_entity_id", "entity_id"),
+                ("x_hierarchy_entity_name", "entity_name"),
+                ("x_hierarchy_level_code", "level_code"),
+                ("x_hierarchy_path", "path"),
+                ("x_hierarchy_path_names", "path_names"),
+            ):
+                if field_name in names:
+                    values = pa.array([hierarchy.HIERARCHY[team][key] for team in teams], type=pa.string())
+                    replica = replica.set_column(names.index(field_name), field_name, values)
+        replicas.append(replica)
+    return pa.concat_tables(replicas)
+
+
+# ============================================
+# Tables
+# ============================================
+
+def org_profile(org_slug: str, env: str, created: date) -> Dict:
+    return {
+        "org_slug": org_slug,
+        "company_name": org_slug.replace("_", " ").title(),
+        "admin_email": f"admin@{org_slug}.example.com",
+        "org_dataset_id": f"{org_slug}_{env}",
+        "status": "ACTIVE",
+        "subscription_plan": "ENTERPRISE",
+        "default_currency": "USD",
+        "default_country": "US",
+        "default_language": "en",
+        "default_timezone": "UTC",
+        "fiscal_year_start_month": 1,
+        "created_at": f"{created.isoformat()}T00:00:00Z",
+        "updated_at": f"{created.isoformat()}T00:00:00Z",
+    }
+
+
+def org_hierarchy_rows(org_slug: str, created: date) -> List[Dict]:
+    """Demo hierarchy (data/hierarchy/org_hierarchy.csv) for one org."""
+    with open(DATA_DIR / "hierarchy" / "org_hierarchy.csv") as f:
+        rows = list(csv.DictReader(f))
+    out = []
+    for i, row in enumerate(rows):
+        path_ids = [part for part in row["path"].split("/") if part]
+        out.append({
+            "id": f"{org_slug}_{row['entity_id']}",
+            "org_slug": org_slug,
+            "entity_id": row["entity_id"],
+            "entity_name": row["entity_name"],
+            "level": row["level"],
+            "level_code": row["level_code"],
+            "parent_id": row["parent_id"],
+            "path": row["path"],
+            "path_ids": path_ids,
+            "path_names": row["path_names"].split(" > "),
+            "depth": row["depth"],
+            "owner_name": row["owner_name"],
+            "owner_email": row["owner_email"],
+            "description": row["description"],
+            "sort_order": i,
+            "is_active": row["is_active"],
+            "created_at": f"{created.isoformat()}T00:00:00Z",
+            "created_by": "bench-fixtures",
+            "version": 1,
+        })
+    return out
+
+
+def pricing_rows(org_slug: str) -> List[Dict]:
+    with open(DATA_DIR / "pricing" / "genai_payg_pricing.csv") as f:
+        return [dict(row, x_org_slug=org_slug) for row in csv.DictReader(f)]
+
+
+def generate_org(org_slug: str, env: str, start_date: date, end_date: date, scale: int, seed: int, out_dir: Path) -> Dict[str, int]:
+    """Generate and write every fixture table for one org."""
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    demo.ORG_SLUG = org_slug
+    dataset = f"{org_slug}_{env}"
+    counts: Dict[str, int] = {}
+
+    print(f"\n[{org_slug}] {start_date} → {end_date} (scale ×{scale})")
+
+    cloud_generators = {
+        "gcp": demo.generate_gcp_billing_data,
+        "aws": demo.generate_aws_billing_data,
+        "azure": demo.generate_azure_billing_data,
+        "oci": demo.generate_oci_billing_data,
+    }
+    for provider in CLOUD_PROVIDERS:
+        team = hierarchy.CLOUD_PROVIDER_MAP[provider]
+        records = [
+            hierarchy.update_cloud_tags(hierarchy.set_hierarchy_fields(record, team), team, provider)
+            for record in cloud_generators[provider](start_date, end_date)
+        ]
+        table_name = f"cloud_{provider}_billing_raw_daily"
+        table = replicate(conform(records, load_schema(ORG_SCHEMAS, table_name)), scale, rng)
+        write_table(table, out_dir, dataset, table_name)
+        counts[table_name] = table.num_rows
+
+    genai_records = []
+    for provider, records in demo.generate_genai_data(start_date, end_date).items():
+        team = hierarchy.GENAI_PROVIDER_MAP.get(provider, TEAMS[0])
+        genai_records.extend(hierarchy.set_hierarchy_fields(record, team) for record in records)
+    table = replicate(conform(genai_records, load_schema(ORG_SCHEMAS, "genai_payg_usage_raw")), scale, rng)
+    write_table(table, out_dir, dataset, "genai_payg_usage_raw")
+    counts["genai_payg_usage_raw"] = table.num_rows
+
+    table = conform(pricing_rows(org_slug), load_schema(ORG_SCHEMAS, "genai_payg_pricing"))
+    write_table(table, out_dir, dataset, "genai_payg_pricing")
+
+    table = conform(demo.generate_subscription_plans_data(start_date), load_schema(ORG_SCHEMAS, "subscription_plans"))
+    write_table(table, out_dir, dataset, "subscription_plans")
+    counts["subscription_plans"] = table.num_rows
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Parquet fixtures for the local DuckDB BigQuery stand-in")
+    parser.add_argument("--output-dir", type=str, default=str(DEFAULT_OUTPUT_DIR), help="Fixture root (LOCAL_BIGQUERY_DATA_DIR)")
+    parser.add_argument("--orgs", type=int, default=1, help="Number of orgs ({prefix}_001, {prefix}_002, ...)")
+    parser.add_argument("--org-prefix", type=str, default=DEFAULT_ORG_PREFIX, help="Org slug prefix")
+    parser.add_argument("--env", type=str, default="local", help="Dataset suffix ({org}_{env})")
+    parser.add_argument("--start-date", type=str, default=None, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=str, default=None, help="End date (YYYY-MM-DD, default today)")
+    parser.add_argument("--days", type=int, default=30, help="Days ending at --end-date when --start-date is not set")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate raw cloud/GenAI rows N times")
+    parser.add_argument("--seed", type=int, default=demo.RANDOM_SEED, help="Random seed for reproducibility")
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date else date.today()
+    if args.start_date:
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+    else:
+        start_date = end_date - timedelta(days=args.days - 1)
+    if start_date > end_date:
+        sys.exit("--start-date must be on or before --end-date")
+
+    out_dir = Path(args.output_dir)
+    org_slugs = [f"{args.org_prefix}_{i:03d}" for i in range(1, args.orgs + 1)]
+
+    print("=" * 70)
+    print("  CloudAct Benchmark Fixture Generator (Parquet)")
+    print(f"  Orgs: {', '.join(org_slugs)}")
+    print(f"  Date Range: {start_date} to {end_date}")
+    print(f"  Output: {out_dir}")
+    print("=" * 70)
+
+    totals: Dict[str, int] = {}
+    for i, org_slug in enumerate(org_slugs):
+        for table, rows in generate_org(org_slug, args.env, start_date, end_date, args.scale, args.seed + i, out_dir).items():
+            totals[table] = totals.get(table, 0) + rows
+
+    print("\n[organizations]")
+    write_table(conform([org_profile(o, args.env, start_date) for o in org_slugs], load_schema(BOOTSTRAP_SCHEMAS, "org_profiles")),
+                out_dir, "organizations", "org_profiles")
+    write_table(conform([row for o in org_slugs for row in org_hierarchy_rows(o, start_date)], load_schema(BOOTSTRAP_SCHEMAS, "org_hierarchy")),
+                out_dir, "organizations", "org_hierarchy")
+
+    print()
+    print("=" * 70)
+    print(f"  Raw rows: {sum(rows for table, rows in totals.items() if table != 'subscription_plans'):,}")
+    print("=" * 70)
+    print()
+    print("Next steps:")
+    print(f"  export BIGQUERY_BACKEND=duckdb LOCAL_BIGQUERY_DATA_DIR={out_dir}")
+    print("  Run pipelines/read services as usual; tables not in the fixtures are")
+    print("  created from the schema JSONs by LocalBigQueryClient.create_tables_from_schemas")
+    print()
+
+
+if __name__ == "__main__":
+    main()
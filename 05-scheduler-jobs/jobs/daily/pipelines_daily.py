@@ -5,10 +5,14 @@ Daily Pipelines Job
 Runs cost pipelines for all organizations with valid integrations.
 
 Calls the API service's /api/v1/admin/pipelines/run-all endpoint which:
-1. Gets all active organizations from BigQuery
-2. For each org, finds active/validated integration credentials
-3. Maps provider → pipeline path, decrypts org API key
-4. Triggers each pipeline via Pipeline Service (quota-aware)
+1. Resolves active orgs, validated integration credentials and org API keys
+   in one query
+2. Maps provider → pipeline path
+3. In the background, decrypts org API keys in parallel and triggers the
+   pipelines via Pipeline Service with bounded concurrency (quota-aware)
+
+The endpoint returns a batch_run_id immediately; this job then polls
+/api/v1/admin/pipelines/run-all/{batch_run_id} until the batch finishes.
 
 Run at 06:00 UTC daily (before alerts at 08:00 so alert data is fresh).
 
@@ -30,9 +34,13 @@ import argparse
 import asyncio
 import os
 import sys
+import time
 from datetime import datetime, timezone
 import httpx
 
+POLL_INTERVAL_SECONDS = 10
+MAX_WAIT_SECONDS = 3600
+
 
 def get_api_service_url(project_id: str) -> str:
     """Get API service URL based on environment."""
@@ -111,22 +119,43 @@ async def main():
     if args.date:
         body["date"] = args.date
 
-    # Call the pipeline run-all endpoint
-    async with httpx.AsyncClient(timeout=600.0) as client:
+    headers = {
+        "X-CA-Root-Key": root_api_key,
+        "Content-Type": "application/json",
+    }
+
+    # Start the run-all batch, then poll it until it finishes
+    async with httpx.AsyncClient(timeout=60.0) as client:
         try:
             print(f"Running cost pipelines for {mode}...")
 
-            response = await client.post(
-                endpoint,
-                headers={
-                    "X-CA-Root-Key": root_api_key,
-                    "Content-Type": "application/json",
-                },
-                json=body,
-            )
+            response = await client.post(endpoint, headers=headers, json=body)
 
             if response.status_code == 200:
                 result = response.json()
+                batch_run_id = result.get("batch_run_id")
+                print(f"Batch run started: {batch_run_id} "
+                      f"({result.get('total_integrations', 0)} integrations)")
+
+                deadline = time.monotonic() + MAX_WAIT_SECONDS
+                while result.get("status") == "RUNNING":
+                    if time.monotonic() > deadline:
+                        print(f"\n❌ Batch {batch_run_id} still running after {MAX_WAIT_SECONDS}s")
+                        sys.exit(1)
+                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                    poll = await client.get(f"{endpoint}/{batch_run_id}", headers=headers)
+                    if poll.status_code != 200:
+                        print(f"  Poll failed ({poll.status_code}), retrying...")
+                        continue
+                    result = poll.json()
+                    print(f"  {result.get('message', '')}")
+
+                if result.get("status") == "FAILED":
+                    print(f"\n❌ Pipeline run-all batch {batch_run_id} failed!")
+                    for org_error in result.get("errors", [])[:20]:
+                        print(f"  - {org_error.get('org_slug')}: {org_error.get('error')}")
+                    sys.exit(1)
+
                 dry_label = " (DRY RUN)" if args.dry_run else ""
                 print(f"\n✅ Pipeline run-all completed successfully!{dry_label}")
                 print(f"  - Organizations processed: {result.get('orgs_processed', 0)}")
@@ -158,7 +187,7 @@ async def main():
                 sys.exit(1)
 
         except httpx.TimeoutException:
-            print("\n❌ Request timed out after 600 seconds")
+            print("\n❌ Request timed out after 60 seconds")
             sys.exit(1)
 
         except httpx.RequestError as e:
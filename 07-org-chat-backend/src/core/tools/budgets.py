@@ -95,15 +95,8 @@ def budget_summary(
         ),
         actual_costs AS (
             SELECT
-                CASE
-                    WHEN LOWER(ServiceProviderName) IN ('gcp', 'aws', 'azure', 'google', 'amazon', 'microsoft', 'oci', 'oracle')
-                         OR LOWER(x_source_system) LIKE '%cloud%' OR LOWER(x_source_system) LIKE '%billing%' THEN 'cloud'
-                    WHEN LOWER(ServiceProviderName) IN ('openai', 'anthropic', 'gemini', 'claude', 'deepseek', 'cohere', 'mistral')
-                         OR LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning')
-                         OR LOWER(x_source_system) LIKE '%genai%' THEN 'genai'
-                    WHEN LOWER(x_source_system) = 'subscription_costs_daily' THEN 'subscription'
-                    ELSE 'cloud'
-                END AS cost_category,
+                -- Materialised at ingestion by the FOCUS conversion procedures
+                COALESCE(x_cost_category, 'other') AS cost_category,
                 ROUND(SUM(BilledCost), 2) AS actual_spend
             FROM `{org_dataset}.cost_data_standard_1_3`
             WHERE ChargePeriodStart >= (SELECT MIN(period_start) FROM budgets)
@@ -178,15 +171,8 @@ def budget_variance(
         actual_by_entity AS (
             SELECT
                 x_hierarchy_entity_id AS entity_id,
-                CASE
-                    WHEN LOWER(ServiceProviderName) IN ('gcp', 'aws', 'azure', 'google', 'amazon', 'microsoft', 'oci', 'oracle')
-                         OR LOWER(x_source_system) LIKE '%cloud%' OR LOWER(x_source_system) LIKE '%billing%' THEN 'cloud'
-                    WHEN LOWER(ServiceProviderName) IN ('openai', 'anthropic', 'gemini', 'claude', 'deepseek', 'cohere', 'mistral')
-                         OR LOWER(ServiceCategory) IN ('genai', 'llm', 'ai and machine learning')
-                         OR LOWER(x_source_system) LIKE '%genai%' THEN 'genai'
-                    WHEN LOWER(x_source_system) = 'subscription_costs_daily' THEN 'subscription'
-                    ELSE 'cloud'
-                END AS cost_category,
+                -- Materialised at ingestion by the FOCUS conversion procedures
+                COALESCE(x_cost_category, 'other') AS cost_category,
                 ROUND(SUM(BilledCost), 2) AS actual_spend
             FROM `{org_dataset}.cost_data_standard_1_3`
             WHERE ChargePeriodStart >= (SELECT MIN(period_start) FROM budgets)